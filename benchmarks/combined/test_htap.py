@@ -7,17 +7,23 @@ hammer scan_many over base tables and dashboard views at one SAL cut. The hard
 invariant: an atomic commit is never observed torn (every writer order present
 has all K lineitems), and the group view never leads the base at the same cut —
 so torn_reads must be 0.
+
+test_htap_open_loop offers the dashboard scan_many at a constant arrival rate
+(helpers/openloop.py) against the same writers, stepping the rate up to trace
+the reader latency-vs-throughput curve.
 """
 
 from __future__ import annotations
 
 import os
+import random
 import time
 
 import pytest
 
 import gnitz
-from helpers.datagen import HTAP_SIZES, NATIONS, STATUS, push_rows, zipf_choice
+from helpers.datagen import HTAP_OPEN_LOOP, HTAP_SIZES, NATIONS, STATUS, push_rows, zipf_choice
+from helpers.openloop import record_curve, run_open_loop
 from helpers.timing import percentiles, run_htap
 
 pytestmark = pytest.mark.multiworker
@@ -27,13 +33,9 @@ N_CUST = 200
 SKEW_S = 1.1
 
 
-def test_htap(client, socket_path, schema_name, bench_timer, scale_mode):
-    import random
-
-    sn = schema_name
-    sz = HTAP_SIZES[scale_mode]
-    K, products, base_orders = sz["K_lines"], sz["products"], sz["base_orders"]
-
+def _setup(client, sn, sz):
+    """Base tables, dashboard views and the seeded base rows."""
+    products, base_orders = sz["products"], sz["base_orders"]
     client.execute_sql("CREATE TABLE customer (c_key BIGINT NOT NULL PRIMARY KEY, "
                        "c_nation BIGINT NOT NULL)", schema_name=sn)
     client.execute_sql("CREATE TABLE orders (o_key BIGINT NOT NULL PRIMARY KEY, "
@@ -67,6 +69,10 @@ def test_htap(client, socket_path, schema_name, bench_timer, scale_mode):
     inv_tid, inv_sch = client.resolve_table(sn, "inventory")
     push_rows(client, inv_tid, inv_sch, [{"pk": p, "qty": 1_000_000} for p in range(1, products + 1)])
 
+
+def _writer(sn, K, products):
+    """Writer load: atomic {order + K lineitems} commits, then an OCC RMW on a
+    Zipf-hot inventory row."""
     def writer_fn(conn, deadline):
         wo_tid, wo_sch = conn.resolve_table(sn, "orders")
         wl_tid, wl_sch = conn.resolve_table(sn, "lineitem")
@@ -99,6 +105,15 @@ def test_htap(client, socket_path, schema_name, bench_timer, scale_mode):
                     conflicts += 1
             lat.append((time.perf_counter() - start) * 1000.0)
         return {"commits": commits, "conflicts": conflicts, "latencies": lat}
+    return writer_fn
+
+
+def test_htap(client, socket_path, schema_name, bench_timer, scale_mode):
+    sn = schema_name
+    sz = HTAP_SIZES[scale_mode]
+    K = sz["K_lines"]
+    _setup(client, sn, sz)
+    writer_fn = _writer(sn, K, sz["products"])
 
     def reader_fn(conn, deadline):
         ro_tid, _ = conn.resolve_table(sn, "orders")
@@ -149,3 +164,27 @@ def test_htap(client, socket_path, schema_name, bench_timer, scale_mode):
     assert res["writer_commits"] > 0, "no writer commits"
     assert res["reader_ops"] > 0, "no reader ops"
     assert res["torn_reads"] == 0, f"observed {res['torn_reads']} torn/inconsistent snapshots"
+
+
+def test_htap_open_loop(client, socket_path, schema_name, bench_timer, scale_mode):
+    sn = schema_name
+    sz = HTAP_SIZES[scale_mode]
+    ol = HTAP_OPEN_LOOP[scale_mode]
+    _setup(client, sn, sz)
+    rels = [client.resolve_table(sn, name)[0]
+            for name in ("orders", "lineitem", "rev_by_nation", "orders_by_status")]
+
+    async def dashboard_op(conn, rng):
+        await conn.scan_many(rels)
+
+    res = run_open_loop(socket_path, dashboard_op, ol["rates"], ol["step_s"], drivers=ol["drivers"],
+                        background=_writer(sn, sz["K_lines"], sz["products"]),
+                        n_background=sz["writers"])
+    bench_timer.num_clients = ol["drivers"] + sz["writers"]
+    record_curve(bench_timer, res)
+    commits = sum(b["commits"] for b in res["background"])
+    bench_timer.extra.update(writer_txns_per_sec=round(commits / (ol["step_s"] * len(ol["rates"])), 1))
+
+    assert commits > 0, "no writer commits"
+    assert res["curve"][0]["achieved_rps"] > 0, "no open-loop dashboard reads completed"
+    assert all(p["errors"] == 0 for p in res["curve"]), "open-loop dashboard reads failed"
@@ -6,6 +6,10 @@ streams push() updates to the base while N reader clients push to their OWN
 disjoint key and immediately seek it, asserting the seek reflects their own
 just-ACKed write (read-your-writes, staleness 0) under the concurrent tick storm.
 Reports seek p50/p99; staleness (reported as torn_reads) must be 0.
+
+test_serving_open_loop drives the same natural-key seeks at a constant arrival
+rate (helpers/openloop.py) under the same writer, stepping the rate up to
+trace the seek latency-vs-throughput curve.
 """
 
 from __future__ import annotations
@@ -17,7 +21,8 @@ import time
 import pytest
 
 import gnitz
-from helpers.datagen import SERVING_SIZES, push_one
+from helpers.datagen import SERVING_OPEN_LOOP, SERVING_SIZES, push_one
+from helpers.openloop import record_curve, run_open_loop
 from helpers.timing import percentiles, run_htap
 
 pytestmark = pytest.mark.multiworker
@@ -130,3 +135,23 @@ def test_serving_passthrough(client, socket_path, schema_name, bench_timer, scal
 
     res = run_htap(socket_path, _bg_writer(sn, sz["groups"]), reader_fn, 1, READERS, dur)
     _record(bench_timer, res, dur)
+
+
+def test_serving_open_loop(client, socket_path, schema_name, bench_timer, scale_mode):
+    sn = schema_name
+    sz = SERVING_SIZES[scale_mode]
+    ol = SERVING_OPEN_LOOP[scale_mode]
+    _setup(client, sn, sz["groups"])
+    vid, _ = client.resolve_table(sn, "rev")
+    groups = sz["groups"]
+
+    async def seek_op(conn, rng):
+        await conn.seek(vid, rng.randint(1, groups))
+
+    res = run_open_loop(socket_path, seek_op, ol["rates"], ol["step_s"], drivers=ol["drivers"],
+                        background=_bg_writer(sn, groups), n_background=1)
+    bench_timer.num_clients = ol["drivers"] + 1
+    record_curve(bench_timer, res)
+
+    assert res["curve"][0]["achieved_rps"] > 0, "no open-loop seeks completed"
+    assert all(p["errors"] == 0 for p in res["curve"]), "open-loop seeks failed"
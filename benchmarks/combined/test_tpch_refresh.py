@@ -0,0 +1,163 @@
+"""TPC-H refresh streams against standing query views.
+
+Every TPC-H query the subset schema expresses (helpers/tpch.py VIEW_DDLS +
+EXTRA_VIEW_DDLS) is registered as a view over a bulk-loaded base, then RF1
+(new orders + lineitems) and RF2 (the oldest orders + their lineitems,
+retracted) alternate, optionally paced to `rate` pairs/s. After each refresh
+function is ACKed, VIEW_STATS_TAB is polled — without draining, so the tick
+task's own schedule is measured — until each view's lag is 0. Polls back off
+exponentially from POLL_MIN_S to POLL_MAX_S so the poller does not compete
+with the tick it is waiting on.
+
+Reported per refresh function: end-to-end latency until every view is fresh
+(headline), and per view: freshness p50/p99 and the last tick's evaluation
+time, from VIEW_STATS_TAB. Freshness is only as exact as the poll: the
+observed gap between consecutive polls is reported next to it
+(poll_gap_p50_ms / poll_gap_max_ms). Storage amplification compares the derived state
+to the base both logically (rows across all views / base rows) and on disk
+(bytes under view directories / base table directories; runs still in memory
+are not on disk yet, so this lags at small scale factors). Run it across
+worker counts with `make bench-tpch-refresh` (W = 1, 2, 4, 8, 16).
+"""
+
+from __future__ import annotations
+
+import time
+
+import gnitz
+from helpers import tpch
+from helpers.datagen import build_batch
+from helpers.timing import percentiles
+
+FRESH_TIMEOUT_S = 60.0
+POLL_MIN_S = 0.001
+POLL_MAX_S = 0.005
+
+
+def _lagging(client, vids: dict[int, str]) -> set[int]:
+    return {r["view_id"] for r in client.scan(gnitz.VIEW_STATS_TAB)
+            if r["view_id"] in vids and r["lag_lsn"] != 0}
+
+
+def _wait_fresh(client, vids: dict[int, str], start: float,
+                gaps: list[float] | None = None) -> dict[int, float]:
+    """Poll until no view in `vids` lags; per view, ms from `start` to the
+    first poll that saw it fresh. The ms between consecutive polls are
+    appended to `gaps` when given."""
+    fresh: dict[int, float] = {}
+    deadline = time.perf_counter() + FRESH_TIMEOUT_S
+    pause = POLL_MIN_S
+    last = None
+    while True:
+        lagging = _lagging(client, vids)
+        polled = time.perf_counter()
+        now = (polled - start) * 1000.0
+        if gaps is not None and last is not None:
+            gaps.append((polled - last) * 1000.0)
+        last = polled
+        for vid in vids:
+            if vid not in lagging and vid not in fresh:
+                fresh[vid] = now
+        if len(fresh) == len(vids):
+            return fresh
+        assert polled < deadline, \
+            f"views still lagging after {FRESH_TIMEOUT_S}s: {sorted(vids[v] for v in lagging)}"
+        time.sleep(pause)
+        pause = min(pause * 2, POLL_MAX_S)
+
+
+def _refresh(client, tables, orders, lines, weight, vids, gaps):
+    """Push one refresh function; returns (ms until all views fresh, per-view ms).
+
+    RF1 inserts orders before their lineitems and RF2 deletes lineitems
+    before their orders, as the TPC-H spec orders them.
+    """
+    (o_tid, o_sch), (l_tid, l_sch) = tables
+    ob, lb = build_batch(o_sch, orders, weight), build_batch(l_sch, lines, weight)
+    pushes = [(o_tid, ob), (l_tid, lb)] if weight > 0 else [(l_tid, lb), (o_tid, ob)]
+    start = time.perf_counter()
+    for tid, b in pushes:
+        client.push(tid, b)
+    fresh = _wait_fresh(client, vids, start, gaps)
+    return max(fresh.values()), fresh
+
+
+def _dir_bytes(path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def test_tpch_refresh(client, schema_name, bench_timer, tpch_refresh_cfg, data_dir, num_workers):
+    sn = schema_name
+    cfg = tpch_refresh_cfg
+    tpch.create_tables(client, sn)
+    ddls = tpch.VIEW_DDLS + tpch.EXTRA_VIEW_DDLS
+    for ddl in ddls:
+        client.execute_sql(ddl, schema_name=sn)
+    all_views = [ddl.split()[2] for ddl in ddls]
+    query_views = tpch.READ_VIEWS + tpch.EXTRA_READ_VIEWS
+    vids = {client.resolve_table(sn, v)[0]: v for v in query_views}
+
+    data = tpch.generate_all(cfg["sf"], skew=True)
+    tpch.bulk_load(client, sn, data)
+    _wait_fresh(client, vids, time.perf_counter())
+
+    tables = (client.resolve_table(sn, "orders"), client.resolve_table(sn, "lineitem"))
+    stream = tpch.RefreshStream(data, cfg["rf_orders"])
+    per_view: dict[int, list[float]] = {vid: [] for vid in vids}
+    tick_ms: dict[int, list[float]] = {vid: [] for vid in vids}
+    rf_lat: dict[str, list[float]] = {"rf1": [], "rf2": []}
+    poll_gaps: list[float] = []
+    rows = 0
+    t0 = time.perf_counter()
+    for pair in range(cfg["pairs"]):
+        if cfg["rate"] > 0:
+            delay = t0 + pair / cfg["rate"] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        for rf, (orders, lines), weight in (("rf1", stream.rf1(), 1), ("rf2", stream.rf2(), -1)):
+            total, fresh = _refresh(client, tables, orders, lines, weight, vids, poll_gaps)
+            rf_lat[rf].append(total)
+            for vid, ms in fresh.items():
+                per_view[vid].append(ms)
+            rows += len(orders) + len(lines)
+            for r in client.scan(gnitz.VIEW_STATS_TAB):
+                if r["view_id"] in vids:
+                    tick_ms[r["view_id"]].append(r["last_tick_ns"] / 1e6)
+    elapsed = time.perf_counter() - t0
+
+    bench_timer.add_latencies(rf_lat["rf1"] + rf_lat["rf2"], rows=rows)
+
+    views = {}
+    for vid, name in vids.items():
+        p50, _, p99 = percentiles(per_view[vid])
+        t50, _, t99 = percentiles(tick_ms[vid])
+        views[name] = {"fresh_p50_ms": round(p50, 3), "fresh_p99_ms": round(p99, 3),
+                       "tick_p50_ms": round(t50, 3), "tick_p99_ms": round(t99, 3)}
+
+    base_rows = sum(len(client.scan(client.resolve_table(sn, t)[0])) for t in tpch.TABLES)
+    view_rows = sum(len(client.scan(client.resolve_table(sn, v)[0])) for v in all_views)
+    schema_dir = data_dir / sn
+    base_bytes = view_bytes = 0
+    if schema_dir.is_dir():
+        for d in schema_dir.iterdir():
+            if d.is_dir():
+                if d.name.startswith("view_"):
+                    view_bytes += _dir_bytes(d)
+                else:
+                    base_bytes += _dir_bytes(d)
+
+    extra = {"workers": num_workers, "sf": cfg["sf"], "refresh_pairs": cfg["pairs"],
+             "refresh_rows_per_sec": round(rows / elapsed, 1) if elapsed else 0.0,
+             "views": views,
+             "poll_gap_p50_ms": round(percentiles(poll_gaps)[0], 3) if poll_gaps else None,
+             "poll_gap_max_ms": round(max(poll_gaps), 3) if poll_gaps else None,
+             "storage_amp_rows": round(view_rows / base_rows, 3) if base_rows else 0.0,
+             "storage_amp_disk": round(view_bytes / base_bytes, 3) if base_bytes else None}
+    for rf, xs in rf_lat.items():
+        p50, _, p99 = percentiles(xs)
+        extra[f"{rf}_p50_ms"], extra[f"{rf}_p99_ms"] = round(p50, 3), round(p99, 3)
+    bench_timer.extra.update(extra)
+
+    for v in tpch.READ_VIEWS:
+        vid, _ = client.resolve_table(sn, v)
+        assert len(client.scan(vid)) > 0, f"{v} empty after the refresh stream"
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+compare.py — diff a benchmark run against a named baseline, flag regressions.
+
+Usage:
+    uv run python benchmarks/compare.py save main                # latest run → baselines/main
+    uv run python benchmarks/compare.py save main <results-dir>  # specific run → baselines/main
+    uv run python benchmarks/compare.py list                     # stored baselines
+    uv run python benchmarks/compare.py diff main                # baselines/main vs latest run
+    uv run python benchmarks/compare.py diff main <results-dir> --threshold 5 --format html -o diff.html
+
+BASE and CANDIDATE of `diff` are each a baseline name or a results directory.
+Benchmarks are paired by worker/client combo and name; for each pair the
+relative change of p50, p99 and rows/s gets a bootstrap confidence interval,
+resampled from the per-iteration latencies in samples.json. A metric is a
+regression when its whole interval is worse than --threshold percent, so
+noise alone does not trip it. Runs without samples.json (older than this
+script) fall back to comparing the point estimates.
+
+Exit status: 0 when nothing regressed, 1 on any regression, 2 on bad input.
+"""
+
+import argparse
+import html
+import json
+import random
+import shutil
+import sys
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+from report import RESULTS_ROOT, find_latest_run, find_subdirs
+
+BASELINES_ROOT = Path(__file__).parent / "baselines"
+
+
+def die(msg: str):
+    print(msg, file=sys.stderr)
+    sys.exit(2)
+
+
+# (summary key, label, higher_is_better)
+METRICS = [
+    ("p50_ms", "p50 ms", False),
+    ("p99_ms", "p99 ms", False),
+    ("rows_per_sec", "rows/s", True),
+]
+
+
+# ---------------------------------------------------------------------------
+# Loading runs and baselines
+# ---------------------------------------------------------------------------
+
+def resolve_run(spec: str | None) -> Path:
+    """A baseline name, a results directory, or None for the latest run."""
+    if spec is None:
+        return find_latest_run()
+    named = BASELINES_ROOT / spec
+    if named.is_dir():
+        return named
+    path = Path(spec)
+    if path.is_dir():
+        return path
+    die(f"Neither a baseline nor a results directory: {spec}")
+
+
+def load_run(run_dir: Path) -> dict:
+    """{(combo, name): benchmark dict with a `samples` list (maybe empty)}."""
+    out = {}
+    for sub in find_subdirs(run_dir):
+        summary_file = sub / "summary.json"
+        if not summary_file.exists():
+            continue
+        with open(summary_file) as f:
+            data = json.load(f)
+        samples = {}
+        samples_file = sub / "samples.json"
+        if samples_file.exists():
+            with open(samples_file) as f:
+                samples = json.load(f)
+        for b in data.get("benchmarks", []):
+            b["samples"] = samples.get(b["name"], [])
+            out[(sub.name, b["name"])] = b
+    if not out:
+        die(f"No summary.json found under {run_dir}")
+    return out
+
+
+def run_label(run_dir: Path) -> str:
+    if run_dir.parent == BASELINES_ROOT:
+        return f"baseline {run_dir.name}"
+    return str(run_dir)
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+
+def _stats(latencies: list[float], rows_per_iter: float) -> tuple[float, float, float]:
+    """(p50, p99, rows/s) of one latency sample, using helpers.timing's
+    percentile rule so a full-sample estimate matches summary.json."""
+    s = sorted(latencies)
+    n = len(s)
+    mean_ms = sum(s) / n
+    rps = rows_per_iter * 1000.0 / mean_ms if mean_ms > 0 else 0.0
+    return s[int(n * 0.50)], s[min(int(n * 0.99), n - 1)], rps
+
+
+def _rel(new: float, old: float) -> float | None:
+    return new / old - 1.0 if old > 0 else None
+
+
+def bootstrap(base: dict, cand: dict, resamples: int, confidence: float,
+              rng: random.Random) -> dict:
+    """Percentile-bootstrap CI on the relative change of every metric.
+
+    The two runs are resampled independently (their iterations are not
+    paired). rows/s is derived from the resampled mean latency at the run's
+    fixed rows-per-iteration, which is exactly how BenchTimer computes it.
+    Returns {metric: (lo, hi)}; empty when either side has no samples.
+    """
+    bs, cs = base["samples"], cand["samples"]
+    if not bs or not cs:
+        return {}
+    b_rpi = base["rows"] / len(bs) if base["rows"] else 0.0
+    c_rpi = cand["rows"] / len(cs) if cand["rows"] else 0.0
+
+    deltas: list[list[float]] = [[] for _ in METRICS]
+    for _ in range(resamples):
+        b = _stats(rng.choices(bs, k=len(bs)), b_rpi)
+        c = _stats(rng.choices(cs, k=len(cs)), c_rpi)
+        for i in range(len(METRICS)):
+            d = _rel(c[i], b[i])
+            if d is not None:
+                deltas[i].append(d)
+
+    alpha = (1.0 - confidence) / 2.0
+    out = {}
+    for (key, _, _), ds in zip(METRICS, deltas):
+        if not ds:
+            continue
+        ds.sort()
+        lo = ds[int(alpha * (len(ds) - 1))]
+        hi = ds[int((1.0 - alpha) * (len(ds) - 1))]
+        out[key] = (lo, hi)
+    return out
+
+
+def verdict(delta: float, ci: tuple[float, float] | None, threshold: float,
+            higher_is_better: bool) -> str:
+    """Judge one metric: "regression" / "improvement" when the interval (or,
+    without one, the point estimate) clears the threshold that way, else "same"."""
+    lo, hi = ci if ci else (delta, delta)
+    if higher_is_better:
+        lo, hi = -hi, -lo
+    # Now positive means worse.
+    if lo > threshold:
+        return "regression"
+    if hi < -threshold:
+        return "improvement"
+    return "same"
+
+
+def compare(base_run: dict, cand_run: dict, threshold: float, resamples: int,
+            confidence: float, seed: int) -> tuple[list[dict], list, list]:
+    """Pair the runs' benchmarks and judge every metric.
+
+    Returns (rows, only_in_base, only_in_candidate); each row carries its
+    combo, name and one {key, base, cand, delta, ci, verdict} per metric.
+    """
+    rng = random.Random(seed)
+    rows = []
+    for key in sorted(base_run.keys() & cand_run.keys()):
+        base, cand = base_run[key], cand_run[key]
+        cis = bootstrap(base, cand, resamples, confidence, rng)
+        metrics = []
+        for m, _, higher in METRICS:
+            delta = _rel(cand[m], base[m])
+            if delta is None:
+                # rows/s of a latency-only bench, or an empty run: nothing to judge.
+                continue
+            ci = cis.get(m)
+            metrics.append({
+                "key": m, "base": base[m], "cand": cand[m], "delta": delta, "ci": ci,
+                "verdict": verdict(delta, ci, threshold, higher),
+            })
+        rows.append({"combo": key[0], "name": key[1], "metrics": metrics})
+    only_base = sorted(base_run.keys() - cand_run.keys())
+    only_cand = sorted(cand_run.keys() - base_run.keys())
+    return rows, only_base, only_cand
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+_MARK = {"regression": "REGRESSED", "improvement": "improved", "same": ""}
+
+
+def _fmt_value(v: float) -> str:
+    return f"{v:,.0f}" if v >= 1000 else f"{v:.3f}"
+
+
+def _fmt_change(m: dict) -> str:
+    s = f"{m['delta'] * 100:+.1f}%"
+    if m["ci"]:
+        lo, hi = m["ci"]
+        s += f" [{lo * 100:+.1f}, {hi * 100:+.1f}]"
+    return s
+
+
+def _table_rows(rows: list[dict]):
+    labels = {k: label for k, label, _ in METRICS}
+    for r in rows:
+        for m in r["metrics"]:
+            yield (r["combo"], r["name"], labels[m["key"]], _fmt_value(m["base"]),
+                   _fmt_value(m["cand"]), _fmt_change(m), _MARK[m["verdict"]])
+
+
+HEADERS = ["combo", "benchmark", "metric", "base", "candidate", "change [CI]", ""]
+
+
+def _counts(rows: list[dict]) -> tuple[int, int]:
+    vs = [m["verdict"] for r in rows for m in r["metrics"]]
+    return vs.count("regression"), vs.count("improvement")
+
+
+def render_markdown(rows, only_base, only_cand, meta: dict, file) -> None:
+    regressed, improved = _counts(rows)
+    print("## Benchmark comparison\n", file=file)
+    print(f"- base: {meta['base']}", file=file)
+    print(f"- candidate: {meta['cand']}", file=file)
+    print(f"- threshold: {meta['threshold']:.1f}%, {meta['confidence']:.0%} bootstrap CI "
+          f"({meta['resamples']} resamples)", file=file)
+    print(f"- **{regressed} regressed**, {improved} improved\n", file=file)
+    print("| " + " | ".join(HEADERS) + " |", file=file)
+    print("|" + "|".join(["---"] * 3 + ["---:"] * 3 + ["---"]) + "|", file=file)
+    for cells in _table_rows(rows):
+        cells = list(cells)
+        if cells[-1] == "REGRESSED":
+            cells[-1] = "**REGRESSED**"
+        print("| " + " | ".join(cells) + " |", file=file)
+    for title, keys in (("Only in base", only_base), ("Only in candidate", only_cand)):
+        if keys:
+            print(f"\n{title}: " + ", ".join(f"{c}/{n}" for c, n in keys), file=file)
+
+
+_CSS = """
+body { font-family: sans-serif; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ccc; padding: 2px 8px; }
+td.num { text-align: right; font-variant-numeric: tabular-nums; }
+tr.regression { background: #fdd; }
+tr.improvement { background: #dfd; }
+"""
+
+
+def render_html(rows, only_base, only_cand, meta: dict, file) -> None:
+    esc = html.escape
+    regressed, improved = _counts(rows)
+    print(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+          f"<title>Benchmark comparison</title><style>{_CSS}</style></head><body>", file=file)
+    print("<h2>Benchmark comparison</h2><ul>", file=file)
+    print(f"<li>base: {esc(meta['base'])}</li><li>candidate: {esc(meta['cand'])}</li>", file=file)
+    print(f"<li>threshold: {meta['threshold']:.1f}%, {meta['confidence']:.0%} bootstrap CI "
+          f"({meta['resamples']} resamples)</li>", file=file)
+    print(f"<li><b>{regressed} regressed</b>, {improved} improved</li></ul>", file=file)
+    print("<table><tr>" + "".join(f"<th>{esc(h)}</th>" for h in HEADERS) + "</tr>", file=file)
+    verdicts = [m["verdict"] for r in rows for m in r["metrics"]]
+    for v, cells in zip(verdicts, _table_rows(rows)):
+        tds = "".join(
+            f"<td class=\"num\">{esc(c)}</td>" if 3 <= i <= 5 else f"<td>{esc(c)}</td>"
+            for i, c in enumerate(cells)
+        )
+        print(f"<tr class=\"{v}\">{tds}</tr>", file=file)
+    print("</table>", file=file)
+    for title, keys in (("Only in base", only_base), ("Only in candidate", only_cand)):
+        if keys:
+            print(f"<p>{title}: " + esc(", ".join(f"{c}/{n}" for c, n in keys)) + "</p>", file=file)
+    print("</body></html>", file=file)
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+
+def cmd_save(args) -> int:
+    run_dir = Path(args.run_dir) if args.run_dir else find_latest_run()
+    if not run_dir.is_dir():
+        die(f"Not a directory: {run_dir}")
+    dest = BASELINES_ROOT / args.name
+    if dest.exists():
+        if not args.force:
+            die(f"Baseline {args.name!r} exists (use --force to replace it)")
+        shutil.rmtree(dest)
+
+    saved = 0
+    for sub in find_subdirs(run_dir):
+        if not (sub / "summary.json").exists():
+            continue
+        (dest / sub.name).mkdir(parents=True, exist_ok=True)
+        for fname in ("summary.json", "samples.json"):
+            if (sub / fname).exists():
+                shutil.copy(sub / fname, dest / sub.name / fname)
+        saved += 1
+    if not saved:
+        die(f"No summary.json found under {run_dir}")
+    with open(dest / "baseline.json", "w") as f:
+        json.dump({
+            "name": args.name,
+            "source": str(run_dir),
+            "saved": datetime.now(timezone.utc).isoformat(),
+        }, f, indent=2)
+    print(f"Saved baseline {args.name!r} ({saved} combos) from {run_dir}")
+    return 0
+
+
+def cmd_list(args) -> int:
+    if not BASELINES_ROOT.is_dir():
+        print("No baselines.")
+        return 0
+    for d in sorted(p for p in BASELINES_ROOT.iterdir() if p.is_dir()):
+        combos = [s for s in find_subdirs(d) if (s / "summary.json").exists()]
+        commit = "unknown"
+        if combos:
+            with open(combos[0] / "summary.json") as f:
+                commit = json.load(f).get("commit", "unknown")
+        saved = ""
+        if (d / "baseline.json").exists():
+            with open(d / "baseline.json") as f:
+                saved = json.load(f).get("saved", "")[:19].replace("T", " ")
+        print(f"{d.name:<24} commit={commit:<10} saved={saved}  "
+              f"combos={','.join(s.name for s in combos)}")
+    return 0
+
+
+def cmd_diff(args) -> int:
+    if not 0.0 < args.confidence < 1.0:
+        die("--confidence must be in (0, 1)")
+    base_dir = resolve_run(args.base)
+    cand_dir = resolve_run(args.candidate)
+    rows, only_base, only_cand = compare(
+        load_run(base_dir), load_run(cand_dir),
+        threshold=args.threshold / 100.0, resamples=args.resamples,
+        confidence=args.confidence, seed=args.seed,
+    )
+    if not rows:
+        die(f"No benchmarks in common between {base_dir} and {cand_dir}")
+
+    meta = {
+        "base": run_label(base_dir), "cand": run_label(cand_dir),
+        "threshold": args.threshold, "confidence": args.confidence,
+        "resamples": args.resamples,
+    }
+    output = StringIO()
+    render = render_html if args.format == "html" else render_markdown
+    render(rows, only_base, only_cand, meta, output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output.getvalue())
+        print(f"Comparison written to: {args.output}")
+    else:
+        print(output.getvalue(), end="")
+
+    regressed, _ = _counts(rows)
+    if regressed:
+        print(f"{regressed} metric(s) regressed beyond {args.threshold:.1f}%", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("save", help="Store a run as a named baseline")
+    p.add_argument("name", help="Baseline name")
+    p.add_argument("run_dir", nargs="?", help=f"Results directory (default: latest in {RESULTS_ROOT})")
+    p.add_argument("--force", action="store_true", help="Replace an existing baseline")
+    p.set_defaults(fn=cmd_save)
+
+    p = sub.add_parser("list", help="List stored baselines")
+    p.set_defaults(fn=cmd_list)
+
+    p = sub.add_parser("diff", help="Compare a candidate run against a base")
+    p.add_argument("base", help="Baseline name or results directory")
+    p.add_argument("candidate", nargs="?", help="Baseline name or results directory (default: latest run)")
+    p.add_argument("--threshold", type=float, default=5.0,
+                   help="Regression threshold in percent (default: 5)")
+    p.add_argument("--confidence", type=float, default=0.95,
+                   help="Bootstrap confidence level (default: 0.95)")
+    p.add_argument("--resamples", type=int, default=1000,
+                   help="Bootstrap resamples per benchmark (default: 1000)")
+    p.add_argument("--seed", type=int, default=0, help="RNG seed, for reproducible intervals")
+    p.add_argument("--format", choices=("md", "html"), default="md", help="Output format (default: md)")
+    p.add_argument("-o", "--output", help="Write the diff to a file instead of stdout")
+    p.set_defaults(fn=cmd_diff)
+
+    args = parser.parse_args()
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,13 +16,13 @@ from pathlib import Path
 import pytest
 
 import gnitz
-from helpers.datagen import SCALES
+from helpers.datagen import SCALES, TPCH_REFRESH_SIZES, YCSB_SIZES
 from helpers.timing import BenchTimer, get_all_results, record_result
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
 # Per-tier schema-name prefix, keyed by the test file's parent directory (tier).
-_TIER_PREFIX = {"micro": "bench", "combined": "comb", "features": "feat"}
+_TIER_PREFIX = {"micro": "bench", "combined": "comb", "features": "feat", "ycsb": "ycsb"}
 _schema_counter = itertools.count()
 
 
@@ -58,6 +58,26 @@ def scale(scale_mode):
     return SCALES[scale_mode]
 
 
+@pytest.fixture
+def ycsb_cfg(request, scale_mode):
+    cfg = dict(YCSB_SIZES[scale_mode])
+    for key in ("records", "field_count", "field_len", "seed"):
+        override = request.config.getoption(f"--ycsb-{key.replace('_', '-')}")
+        if override is not None:
+            cfg[key] = override
+    return cfg
+
+
+@pytest.fixture
+def tpch_refresh_cfg(request, scale_mode):
+    cfg = dict(TPCH_REFRESH_SIZES[scale_mode])
+    for key, opt in (("sf", "--tpch-sf"), ("rate", "--tpch-rf-rate")):
+        override = request.config.getoption(opt)
+        if override is not None:
+            cfg[key] = override
+    return cfg
+
+
 def pytest_addoption(parser):
     parser.addoption("--full", action="store_true", default=False,
                      help="Run full-scale benchmarks (150k rows)")
@@ -71,8 +91,22 @@ def pytest_addoption(parser):
                      help="Enable perf record with --call-graph=dwarf for full userspace stacks")
     parser.addoption("--perf-stat", action="store_true", default=False,
                      help="Enable perf stat during benchmarks")
+    parser.addoption("--zone-profile", action="store_true", default=False,
+                     help="Enable the server's built-in CPU-zone profiler (no perf needed)")
     parser.addoption("--results-dir", type=str, default=None,
                      help="Override results output directory")
+    parser.addoption("--ycsb-records", type=int, default=None,
+                     help="YCSB usertable record count (default: per scale)")
+    parser.addoption("--ycsb-field-count", type=int, default=None,
+                     help="YCSB fields per record (default: 10)")
+    parser.addoption("--ycsb-field-len", type=int, default=None,
+                     help="YCSB bytes per field (default: 100)")
+    parser.addoption("--ycsb-seed", type=int, default=None,
+                     help="YCSB base RNG seed; client i uses seed + i (default: 42)")
+    parser.addoption("--tpch-sf", type=float, default=None,
+                     help="TPC-H refresh-stream scale factor (default: per scale)")
+    parser.addoption("--tpch-rf-rate", type=float, default=None,
+                     help="TPC-H RF1+RF2 pairs per second, 0 = back to back (default: 0)")
 
 
 @pytest.fixture(scope="session")
@@ -143,6 +177,12 @@ def server(request, results_dir):
         perf_stat = PerfStat(proc.pid)
         perf_stat.start()
 
+    zone_profiler = None
+    if request.config.getoption("--zone-profile"):
+        from helpers.perf import ZoneProfiler
+        zone_profiler = ZoneProfiler(str(sock_path), results_dir)
+        zone_profiler.start()
+
     yield str(sock_path), proc.pid, proc
 
     if perf_recorder:
@@ -150,6 +190,8 @@ def server(request, results_dir):
         perf_recorder.flamegraph()
     if perf_stat:
         perf_stat.stop()
+    if zone_profiler:
+        zone_profiler.flamegraph(zone_profiler.stop())
 
     proc.kill()
     proc.wait()
@@ -187,6 +229,12 @@ def server_pid(server) -> int:
     return server[1]
 
 
+@pytest.fixture(scope="session")
+def data_dir(server) -> Path:
+    """The server's data directory (next to its socket), for on-disk sizes."""
+    return Path(server[0]).parent / "data"
+
+
 @pytest.fixture(scope="session")
 def _server_proc(server):
     return server[2]
@@ -228,7 +276,7 @@ def results_dir(request) -> Path:
 
 @pytest.fixture(scope="session", autouse=True)
 def write_results(results_dir, request):
-    """Session finalizer: write summary.json + timings.csv from all BenchResults."""
+    """Session finalizer: write summary.json, samples.json + timings.csv from all BenchResults."""
     yield
 
     results = get_all_results()
@@ -282,6 +330,11 @@ def write_results(results_dir, request):
     with open(results_dir / "summary.json", "w") as f:
         json.dump(summary, f, indent=2)
 
+    # Raw per-iteration latencies, kept out of summary.json so it stays
+    # readable; compare.py bootstraps its confidence intervals from these.
+    with open(results_dir / "samples.json", "w") as f:
+        json.dump({r.name: r.latencies_ms for r in results}, f)
+
     with open(results_dir / "timings.csv", "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow([
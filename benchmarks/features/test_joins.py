@@ -104,6 +104,27 @@ def test_multiway3(client, schema_name, bench_timer, scale_mode):
     _run(client, bench_timer, sn, "a", stream, "v_mw3", sz)
 
 
+# ---------------------------------------------------------------------------
+# Three-way multiway, delta strategy: the same a ⋈ b ⋈ d on k as one flat join;
+# each delta probes the base traces directly, with no h0 intermediate
+# ---------------------------------------------------------------------------
+
+def test_multiway3_delta(client, schema_name, bench_timer, scale_mode):
+    sn, sz = schema_name, feature_sz(scale_mode)
+    _make_ab(client, sn)
+    client.execute_sql("CREATE TABLE d (pk BIGINT NOT NULL PRIMARY KEY, "
+                       "k BIGINT NOT NULL, dv BIGINT NOT NULL)", schema_name=sn)
+    client.execute_sql(
+        "CREATE VIEW v_mw3d WITH (join_strategy = 'delta') AS SELECT a.k AS k, "
+        "a.av AS av, b.bv AS bv, d.dv AS dv FROM a JOIN b ON a.k = b.k "
+        "JOIN d ON a.k = d.k", schema_name=sn)
+    _load_dim_b(client, sn, sz["dim"])
+    _seed(client, sn, "d", lambda b, i: b.append(pk=i + 1, k=i + 1, dv=(i * 3) % 1000), sz["dim"])
+    base, stream = _fact_ab(sz["dim"])
+    _seed(client, sn, "a", base, sz["base"])
+    _run(client, bench_timer, sn, "a", stream, "v_mw3d", sz)
+
+
 # ---------------------------------------------------------------------------
 # Self join: emp(id, mgr, sal) e ⋈ emp m ON e.mgr = m.id
 # ---------------------------------------------------------------------------
@@ -47,6 +47,15 @@ TPCH_SIZES = {
     "full": {"sf": 10, "delta": 2_000, "iters": 50, "skew_s": 1.1},
 }
 
+# TPC-H refresh-stream sizing (combined/test_tpch_refresh.py): `rf_orders`
+# orders inserted by each RF1 and deleted by each RF2, `pairs` RF1+RF2 pairs,
+# offered at `rate` pairs/s (0 = back to back). --tpch-sf / --tpch-rf-rate
+# override `sf` / `rate`.
+TPCH_REFRESH_SIZES = {
+    "quick": {"sf": 0.5, "rf_orders": 15, "pairs": 10, "rate": 0.0},
+    "full": {"sf": 10, "rf_orders": 150, "pairs": 40, "rate": 0.0},
+}
+
 # Transaction sizing (txn/ tier). Contention sweep knobs live alongside.
 TXN_SIZES = {
     "quick": {"ops": 200, "K_lines": 4},
@@ -69,6 +78,28 @@ HTAP_SIZES = {
              "products": 5_000, "base_orders": 20_000},
 }
 
+# YCSB tier (ycsb/): usertable shape and total operations per workload, split
+# over --clients processes; aio clients pipeline `aio_concurrency` ops each.
+# --ycsb-records / --ycsb-field-count / --ycsb-field-len override the shape;
+# client i seeds its RNG with `seed` + i (--ycsb-seed).
+YCSB_SIZES = {
+    "quick": {"records": 10_000, "field_count": 10, "field_len": 100, "ops": 10_000,
+              "aio_concurrency": 8, "seed": 42},
+    "full": {"records": 100_000, "field_count": 10, "field_len": 100, "ops": 200_000,
+             "aio_concurrency": 16, "seed": 42},
+}
+
+# Open-loop latency-vs-throughput sweeps (helpers/openloop.py): offered req/s
+# per step (summed over `drivers` aio processes) and seconds per step.
+SERVING_OPEN_LOOP = {
+    "quick": {"rates": [250, 500, 1_000], "step_s": 2.0, "drivers": 2},
+    "full": {"rates": [1_000, 2_000, 4_000, 8_000, 16_000, 32_000], "step_s": 5.0, "drivers": 4},
+}
+HTAP_OPEN_LOOP = {
+    "quick": {"rates": [25, 50, 100], "step_s": 2.0, "drivers": 1},
+    "full": {"rates": [50, 100, 200, 400, 800], "step_s": 5.0, "drivers": 2},
+}
+
 # ---------------------------------------------------------------------------
 # String pools (all <=12 chars to stay inline in German Strings)
 # ---------------------------------------------------------------------------
@@ -0,0 +1,96 @@
+"""HDR latency histogram (pure Python, after Gil Tene's HdrHistogram).
+
+Values are integers (the harness records microseconds) bucketed log-linearly:
+every power-of-two range is split into the same number of linear sub-buckets,
+so any recorded value is reported within 10**-significant_figures of itself at
+a memory cost that does not grow with the sample count. Counts are kept in a
+sparse dict, which makes a histogram cheap to pickle across `run_pool` and to
+merge.
+"""
+
+from __future__ import annotations
+
+import math
+
+
+class HdrHistogram:
+    def __init__(self, highest: int = 3_600_000_000, significant_figures: int = 3):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be in 1..5")
+        self.highest = highest
+        self.significant_figures = significant_figures
+        largest_single_unit = 2 * 10 ** significant_figures
+        sub_bucket_count_magnitude = math.ceil(math.log2(largest_single_unit))
+        self._half_magnitude = max(sub_bucket_count_magnitude, 1) - 1
+        self._half_count = 1 << self._half_magnitude
+        self._sub_bucket_mask = (2 * self._half_count) - 1
+        self.counts: dict[int, int] = {}
+        self.total_count = 0
+        self.min = 0
+        self.max = 0
+
+    # -- indexing -------------------------------------------------------------
+
+    def _index(self, value: int) -> int:
+        bucket = (value | self._sub_bucket_mask).bit_length() - (self._half_magnitude + 1)
+        sub_bucket = value >> bucket
+        return ((bucket + 1) << self._half_magnitude) + (sub_bucket - self._half_count)
+
+    def _bounds(self, index: int) -> tuple[int, int]:
+        """Smallest and largest value that land in counts slot `index`."""
+        bucket = (index >> self._half_magnitude) - 1
+        sub_bucket = (index & (self._half_count - 1)) + self._half_count
+        if bucket < 0:
+            sub_bucket -= self._half_count
+            bucket = 0
+        lo = sub_bucket << bucket
+        return lo, lo + (1 << bucket) - 1
+
+    # -- recording ------------------------------------------------------------
+
+    def record(self, value: int, count: int = 1) -> None:
+        """Record `value` `count` times; negatives clamp to 0 and values past
+        `highest` to `highest`, so an outlier skews the tail, never raises."""
+        value = min(max(int(value), 0), self.highest)
+        idx = self._index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + count
+        if self.total_count == 0 or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.total_count += count
+
+    def merge(self, other: HdrHistogram) -> None:
+        if (other.highest, other.significant_figures) != (self.highest, self.significant_figures):
+            raise ValueError("cannot merge histograms of different precision")
+        for idx, c in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + c
+        if other.total_count:
+            if self.total_count == 0 or other.min < self.min:
+                self.min = other.min
+            self.max = max(self.max, other.max)
+        self.total_count += other.total_count
+
+    # -- queries --------------------------------------------------------------
+
+    def value_at_percentile(self, percentile: float) -> int:
+        """Smallest recorded value (to histogram precision) that `percentile`
+        percent of the recorded values are at or below; 0 when empty."""
+        if self.total_count == 0:
+            return 0
+        target = max(1, math.ceil(percentile / 100.0 * self.total_count))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= target:
+                return min(self._bounds(idx)[1], self.max)
+        return self.max
+
+    def mean(self) -> float:
+        if self.total_count == 0:
+            return 0.0
+        total = 0
+        for idx, c in self.counts.items():
+            lo, hi = self._bounds(idx)
+            total += c * (lo + hi) / 2
+        return total / self.total_count
@@ -0,0 +1,167 @@
+"""Open-loop (constant-arrival-rate) load over `gnitz.aio`.
+
+The closed-loop drivers in helpers.timing issue the next request only after
+the previous one answered, so when the server stalls the client stalls with
+it and the stall is recorded once instead of for every request that should
+have been sent meanwhile (coordinated omission). Here request i of a step is
+due at `step_start + i / rate` whether or not earlier ones have answered, and
+its latency is measured from that due time: queueing delay on either side
+lands in the histogram. A second histogram measures from the actual send
+(service time) so the two can be told apart.
+
+`run_open_loop` steps through a list of offered rates and returns one point
+per rate — the latency-versus-throughput curve.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+
+from helpers.hdr import HdrHistogram
+from helpers.timing import _htap_worker, run_pool
+
+# A step counts as sustained when the server completed at least this share of
+# the offered rate; past the first unsustained step latencies only measure
+# the backlog growing.
+SUSTAINED = 0.95
+
+
+async def _drive_step(conn, op, rng, rate, start, step_s, max_inflight):
+    """Offer `rate` req/s of `op` from `start` for `step_s`; wait out the stragglers."""
+    response = HdrHistogram()
+    service = HdrHistogram()
+    slots = asyncio.Semaphore(max_inflight)
+    errors = 0
+    last_done = start
+
+    async def one(due):
+        nonlocal errors, last_done
+        async with slots:
+            sent = time.perf_counter()
+            try:
+                await op(conn, rng)
+            except Exception:
+                errors += 1
+                return
+        done = time.perf_counter()
+        last_done = max(last_done, done)
+        response.record((done - due) * 1e6)
+        service.record((done - sent) * 1e6)
+
+    tasks = []
+    interval = 1.0 / rate
+    for i in range(int(step_s * rate)):
+        due = start + i * interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(due)))
+    await asyncio.gather(*tasks)
+    return {
+        "response": response, "service": service, "errors": errors,
+        "elapsed_s": max(last_done - start, step_s),
+    }
+
+
+def _open_loop_worker(socket_path, op, rates, step_s, max_inflight, barrier, queue):
+    """Child: one `gnitz.aio` connection driving every step of the sweep."""
+    import gnitz.aio
+
+    async def sweep():
+        async with gnitz.aio.connect(socket_path) as conn:
+            rng = random.Random()
+            barrier.wait()
+            t0 = time.perf_counter()
+            # Steps start on a schedule shared by every driver so their offered
+            # rates add up; a step that overruns only delays this driver's next.
+            return [await _drive_step(conn, op, rng, rate, max(t0 + k * step_s, time.perf_counter()),
+                                      step_s, max_inflight)
+                    for k, rate in enumerate(rates)]
+
+    queue.put({"steps": asyncio.run(sweep())})
+
+
+def _ms(us: int) -> float:
+    return round(us / 1000.0, 3)
+
+
+def run_open_loop(
+    socket_path: str,
+    op,
+    rates: list[float],
+    step_s: float,
+    *,
+    drivers: int = 1,
+    background=None,
+    n_background: int = 0,
+    max_inflight: int = 256,
+) -> dict:
+    """Sweep the offered request rate over `rates` (req/s, summed across
+    `drivers` forked processes), `step_s` seconds per rate.
+
+    `op(conn, rng)` is a coroutine function issuing one request on a
+    `gnitz.aio` connection. `background(conn, deadline)`, if given, runs in
+    `n_background` blocking-client processes for the whole sweep (the
+    `run_htap` writer contract) to put the server under write load.
+
+    Returns {"curve": [point per rate], "hists": [merged response
+    HdrHistogram per rate], "background": [background result dicts]}. A point
+    carries target/achieved req/s, response-time p50/p90/p99/p99.9/max and
+    service-time p99 in ms, the error count and whether it was sustained.
+    """
+    per_driver = [r / drivers for r in rates]
+    specs = [(_open_loop_worker, (socket_path, op, per_driver, step_s, max_inflight))
+             for _ in range(drivers)]
+    if background is not None:
+        specs += [(_htap_worker, (socket_path, background, step_s * len(rates)))
+                  for _ in range(n_background)]
+    parts = run_pool(specs, timeout=max(300.0, step_s * len(rates) * 4))
+    sweeps = [p["steps"] for p in parts if "steps" in p]
+
+    curve, hists = [], []
+    for k, rate in enumerate(rates):
+        response, service = HdrHistogram(), HdrHistogram()
+        achieved = 0.0
+        errors = 0
+        for steps in sweeps:
+            s = steps[k]
+            response.merge(s["response"])
+            service.merge(s["service"])
+            achieved += s["response"].total_count / s["elapsed_s"]
+            errors += s["errors"]
+        curve.append({
+            "target_rps": rate,
+            "achieved_rps": round(achieved, 1),
+            "p50_ms": _ms(response.value_at_percentile(50)),
+            "p90_ms": _ms(response.value_at_percentile(90)),
+            "p99_ms": _ms(response.value_at_percentile(99)),
+            "p999_ms": _ms(response.value_at_percentile(99.9)),
+            "max_ms": _ms(response.max),
+            "service_p99_ms": _ms(service.value_at_percentile(99)),
+            "errors": errors,
+            "sustained": errors == 0 and achieved >= SUSTAINED * rate,
+        })
+        hists.append(response)
+    return {
+        "curve": curve,
+        "hists": hists,
+        "background": [p for p in parts if "steps" not in p],
+    }
+
+
+def record_curve(bench_timer, res: dict, rows_per_op: int = 1) -> None:
+    """Report a sweep through `bench_timer`: the headline latency/throughput is
+    the highest sustained step (the capacity point; the first step if none
+    was sustained), the whole curve goes to extra["latency_curve"]."""
+    curve = res["curve"]
+    sustained = [k for k, p in enumerate(curve) if p["sustained"]]
+    k = sustained[-1] if sustained else 0
+    hist, achieved = res["hists"][k], curve[k]["achieved_rps"]
+    elapsed = hist.total_count / achieved if achieved else 0.0
+    bench_timer.add_histogram(hist, rows=hist.total_count * rows_per_op, elapsed_s=elapsed)
+    bench_timer.extra.update(
+        latency_curve=curve,
+        capacity_rps=curve[k]["achieved_rps"] if sustained else 0.0,
+    )
@@ -1,4 +1,5 @@
-"""perf record / perf stat wrappers + flamegraph generation."""
+"""perf record / perf stat wrappers + flamegraph generation, and the
+server's built-in CPU-zone profiler for hosts where perf is not allowed."""
 
 from __future__ import annotations
 
@@ -218,3 +219,48 @@ class PerfStat:
                 event = m.group(2)
                 counters[event] = count
         return counters
+
+
+class ZoneProfiler:
+    """The server's own CPU-zone profiler (`client.profile`): CPU time per
+    subsystem path (tick, exchange, reduce, join, compaction, commit,
+    client_io, apply) in every process, with no perf privileges needed.
+
+    Writes <output_dir>/zones.folded — one `process;zone;... <us>` line per
+    path, what inferno-flamegraph / flamegraph.pl take directly — and renders
+    zones.svg when either is installed.
+    """
+
+    def __init__(self, socket_path: str, output_dir: Path | str):
+        self._socket_path = socket_path
+        self._output_dir = Path(output_dir)
+
+    def _profile(self, action: str) -> list[dict]:
+        import gnitz
+
+        with gnitz.connect(self._socket_path) as c:
+            return c.profile(action)
+
+    def start(self) -> None:
+        self._profile("start")
+
+    def stop(self) -> Path:
+        stacks = self._profile("stop")
+        folded = self._output_dir / "zones.folded"
+        folded.write_text("".join(s["folded"] + "\n" for s in stacks))
+        print(f"[zones] {len(stacks)} folded stacks written to {folded}")
+        return folded
+
+    def flamegraph(self, folded: Path) -> Path | None:
+        svg_path = folded.with_suffix(".svg")
+        for tool in ("inferno-flamegraph", "flamegraph.pl"):
+            if not shutil.which(tool):
+                continue
+            try:
+                with open(folded) as src, open(svg_path, "w") as dst:
+                    subprocess.run([tool, "--countname", "us"], stdin=src, stdout=dst, timeout=60, check=True)
+                print(f"[zones] Flamegraph written to {svg_path}")
+                return svg_path
+            except Exception as e:
+                print(f"[zones] {tool} failed: {e}")
+        return None
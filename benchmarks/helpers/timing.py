@@ -40,6 +40,8 @@ class BenchTimer:
         self._category = category
         self._warmup = warmup
         self._latencies: list[float] = []
+        self._hist = None
+        self._hist_elapsed = 0.0
         self._rows = 0
         self._iterations = 0
         # Public, writable by the test: non-latency scalars and client count.
@@ -66,9 +68,25 @@ class BenchTimer:
         self._latencies.extend(latencies_ms)
         self._rows += rows
 
+    def add_histogram(self, hist, rows: int, elapsed_s: float) -> None:
+        """Report an open-loop run (helpers.openloop) from its HdrHistogram of
+        microsecond latencies instead of a raw list. `elapsed_s` is the wall
+        time the ops were offered over: open-loop requests overlap, so summing
+        latencies would not give throughput.
+        """
+        self._hist = hist
+        self._hist_elapsed = elapsed_s
+        self._rows += rows
+
     def result(self) -> BenchResult:
-        p50, p90, p99 = percentiles(self._latencies)
-        elapsed = sum(self._latencies) / 1000.0 if self._latencies else 0.0
+        if self._hist is not None:
+            p50, p90, p99 = (self._hist.value_at_percentile(p) / 1000.0 for p in (50, 90, 99))
+            elapsed = self._hist_elapsed
+            iterations = self._hist.total_count
+        else:
+            p50, p90, p99 = percentiles(self._latencies)
+            elapsed = sum(self._latencies) / 1000.0 if self._latencies else 0.0
+            iterations = len(self._latencies)
         rps = self._rows / elapsed if elapsed > 0 else 0.0
         return BenchResult(
             name=self._name,
@@ -76,7 +94,7 @@ class BenchTimer:
             elapsed_s=round(elapsed, 4),
             rows=self._rows,
             rows_per_sec=round(rps, 1),
-            iterations=len(self._latencies),
+            iterations=iterations,
             latencies_ms=[round(x, 3) for x in self._latencies],
             p50_ms=round(p50, 3),
             p90_ms=round(p90, 3),
@@ -9,6 +9,8 @@ Tables (rows scale with SF): region(5), nation(25), customer(~150*SF),
 orders(~1500*SF), lineitem(~5000*SF, compound PK (l_order, l_line)).
 
 Rows are dicts keyed by column name so a test can `batch.append(**row)`.
+VIEW_DDLS / EXTRA_VIEW_DDLS hold the standing query views; RefreshStream
+models the TPC-H refresh functions (RF1 inserts, RF2 deletes).
 Independent of crates/gnitz-py/tests/tpch_gen.py (that one feeds circuit-builder
 correctness tests and lacks these columns/skew).
 """
@@ -16,8 +18,9 @@ correctness tests and lacks these columns/skew).
 from __future__ import annotations
 
 import random
+from collections import deque
 
-from helpers.datagen import NAME, NATIONS, SHIPMODES, STATUS, zipf_choice
+from helpers.datagen import NAME, NATIONS, SHIPMODES, STATUS, push_rows, zipf_choice
 
 REGIONS = ["AMERICA", "ASIA", "EUROPE", "AFRICA", "MIDEAST"]
 
@@ -41,12 +44,88 @@ TABLE_DDL = {
 }
 
 
+TABLES = ("region", "nation", "customer", "orders", "lineitem")
+
+# Standing query views (Appendix A, R1/R4-staged): Q1/Q3/Q6/Q12/Q4-style.
+VIEW_DDLS = [
+    # Q1 pricing summary (R4-staged: projection then aggregate).
+    "CREATE VIEW q1_base AS SELECT l_rflag, l_lstatus, l_qty, l_price, "
+    "l_price*(1-l_disc) AS disc_price, l_price*(1-l_disc)*(1+l_tax) AS charge, l_disc "
+    "FROM lineitem WHERE l_ship <= 900",
+    "CREATE VIEW q1 AS SELECT l_rflag, l_lstatus, SUM(l_qty) AS sum_qty, SUM(l_price) AS sum_base, "
+    "SUM(disc_price) AS sum_disc, SUM(charge) AS sum_charge, AVG(l_qty) AS avg_qty, "
+    "AVG(l_disc) AS avg_disc, COUNT(*) AS cnt FROM q1_base GROUP BY l_rflag, l_lstatus",
+    # Q3 shipping priority (join-body CTE projects col-refs only, per R1).
+    "CREATE VIEW q3_j AS WITH co AS (SELECT customer.c_key AS c_key, orders.o_key AS o_key, "
+    "orders.o_date AS o_date FROM customer JOIN orders ON orders.o_cust = customer.c_key "
+    "WHERE orders.o_status = 'O') SELECT co.o_key AS o_key, co.o_date AS o_date, "
+    "lineitem.l_price AS l_price, lineitem.l_disc AS l_disc "
+    "FROM co JOIN lineitem ON lineitem.l_order = co.o_key",
+    "CREATE VIEW q3_rev AS SELECT o_key, o_date, l_price*(1-l_disc) AS rev FROM q3_j",
+    "CREATE VIEW q3 AS SELECT o_key, o_date, SUM(rev) AS revenue FROM q3_rev GROUP BY o_key, o_date",
+    # Q6 forecasting revenue (filter + projection then global SUM).
+    "CREATE VIEW q6_base AS SELECT l_price*l_disc AS rev FROM lineitem "
+    "WHERE l_ship >= 100 AND l_ship < 400 AND l_disc BETWEEN 0.05 AND 0.07 AND l_qty < 24",
+    "CREATE VIEW q6 AS SELECT SUM(rev) AS revenue FROM q6_base",
+    # Q12 shipping modes (join col-refs only; CASE in a downstream projection view, per R1).
+    "CREATE VIEW q12_j AS SELECT lineitem.l_mode AS l_mode, orders.o_status AS o_status "
+    "FROM orders JOIN lineitem ON lineitem.l_order = orders.o_key "
+    "WHERE lineitem.l_mode IN ('MAIL','SHIP')",
+    "CREATE VIEW q12_p AS SELECT l_mode, CASE WHEN o_status='O' THEN 1 ELSE 0 END AS hi, "
+    "CASE WHEN o_status='O' THEN 0 ELSE 1 END AS lo FROM q12_j",
+    "CREATE VIEW q12 AS SELECT l_mode, SUM(hi) AS high_line, SUM(lo) AS low_line "
+    "FROM q12_p GROUP BY l_mode",
+    # Q4-style (correlated EXISTS filter view, no outer GROUP BY/JOIN; group downstream).
+    "CREATE VIEW q4_x AS SELECT orders.o_key AS o_key, orders.o_status AS o_status "
+    "FROM orders WHERE EXISTS (SELECT 1 FROM lineitem WHERE lineitem.l_order = orders.o_key)",
+    "CREATE VIEW q4 AS SELECT o_status, COUNT(*) AS order_count FROM q4_x GROUP BY o_status",
+]
+
+READ_VIEWS = ["q1", "q3", "q6", "q12", "q4"]
+
+# The remaining queries the subset schema can express, for the refresh-stream
+# benchmark: Q3's top-10, Q10, Q13 and Q18.
+EXTRA_VIEW_DDLS = [
+    # Q3 proper: the top 10 unshipped orders by revenue.
+    "CREATE VIEW q3_top AS SELECT o_key, o_date, revenue FROM q3 ORDER BY revenue DESC LIMIT 10",
+    # Q10 returned-item reporting (join col-refs only, revenue in a projection view).
+    "CREATE VIEW q10_j AS WITH co AS (SELECT customer.c_key AS c_key, orders.o_key AS o_key "
+    "FROM customer JOIN orders ON orders.o_cust = customer.c_key "
+    "WHERE orders.o_date >= 500 AND orders.o_date < 700) SELECT co.c_key AS c_key, "
+    "lineitem.l_price AS l_price, lineitem.l_disc AS l_disc "
+    "FROM co JOIN lineitem ON lineitem.l_order = co.o_key WHERE lineitem.l_rflag = 'R'",
+    "CREATE VIEW q10_rev AS SELECT c_key, l_price*(1-l_disc) AS rev FROM q10_j",
+    "CREATE VIEW q10 AS SELECT c_key, SUM(rev) AS revenue FROM q10_rev GROUP BY c_key",
+    # Q13 customer distribution (outer join, then two grouping levels).
+    "CREATE VIEW q13_j AS SELECT customer.c_key AS c_key, orders.o_key AS o_key "
+    "FROM customer LEFT JOIN orders ON orders.o_cust = customer.c_key",
+    "CREATE VIEW q13_c AS SELECT c_key, COUNT(o_key) AS c_count FROM q13_j GROUP BY c_key",
+    "CREATE VIEW q13 AS SELECT c_count, COUNT(*) AS custdist FROM q13_c GROUP BY c_count",
+    # Q18 large-volume customer (HAVING over lineitem, joined back to orders).
+    "CREATE VIEW q18_big AS SELECT l_order, SUM(l_qty) AS sum_qty FROM lineitem "
+    "GROUP BY l_order HAVING SUM(l_qty) > 300",
+    "CREATE VIEW q18 AS SELECT orders.o_key AS o_key, orders.o_cust AS o_cust, "
+    "orders.o_date AS o_date, orders.o_price AS o_price, q18_big.sum_qty AS sum_qty "
+    "FROM orders JOIN q18_big ON q18_big.l_order = orders.o_key",
+]
+EXTRA_READ_VIEWS = ["q3_top", "q10", "q13", "q18"]
+
+
 def create_tables(client, sn: str) -> None:
     """Create region/nation/customer/orders/lineitem in schema `sn`."""
-    for name in ("region", "nation", "customer", "orders", "lineitem"):
+    for name in TABLES:
         client.execute_sql(TABLE_DDL[name], schema_name=sn)
 
 
+def bulk_load(client, sn: str, data, chunk: int = 250_000) -> None:
+    """Push every table of `generate_all` output in `chunk`-row batches."""
+    for name in TABLES:
+        tid, schema = client.resolve_table(sn, name)
+        rows = data[name]
+        for i in range(0, len(rows), chunk):
+            push_rows(client, tid, schema, rows[i:i + chunk])
+
+
 def generate_region():
     return [{"r_key": i, "r_name": REGIONS[i]} for i in range(len(REGIONS))]
 
@@ -145,3 +224,54 @@ def generate_incremental(orders, n, seed, line_base, skew=True, skew_s=1.1):
         okey = orders[oidx - 1]["o_key"]
         rows.append(_lineitem_row(rng, okey, line_base + i))
     return rows
+
+
+class RefreshStream:
+    """TPC-H refresh functions over a loaded `generate_all` dataset.
+
+    `rf1()` is RF1: `n_orders` new orders (keys past the current maximum,
+    Zipfian customers if skew) with 1–7 lineitems each. `rf2()` is RF2: the
+    oldest `n_orders` live orders and all their lineitems, returned as the
+    exact rows so the caller retracts them (push at weight -1). Each call
+    returns (order_rows, lineitem_rows).
+    """
+
+    def __init__(self, data, n_orders: int, seed: int = 100, skew=True, skew_s=1.1):
+        self._rng = random.Random(seed)
+        self._customers = data["customer"]
+        self._n = n_orders
+        self._skew, self._skew_s = skew, skew_s
+        lines: dict[int, list[dict]] = {}
+        for r in data["lineitem"]:
+            lines.setdefault(r["l_order"], []).append(r)
+        # Live orders oldest-first, each with its lineitems.
+        self._live = deque((o, lines.get(o["o_key"], [])) for o in data["orders"])
+        self._next_okey = max(o["o_key"] for o in data["orders"]) + 1
+
+    def rf1(self):
+        rng, n_cust = self._rng, len(self._customers)
+        orders, lines = [], []
+        for _ in range(self._n):
+            okey = self._next_okey
+            self._next_okey += 1
+            cidx = zipf_choice(rng, n_cust, self._skew_s) if self._skew else rng.randint(1, n_cust)
+            o = {
+                "o_key": okey,
+                "o_cust": self._customers[cidx - 1]["c_key"],
+                "o_status": rng.choice(STATUS),
+                "o_date": rng.randint(1, 2000),
+                "o_price": rng.randint(1000, 500000),
+            }
+            ls = [_lineitem_row(rng, okey, ln) for ln in range(1, rng.randint(1, 7) + 1)]
+            self._live.append((o, ls))
+            orders.append(o)
+            lines.extend(ls)
+        return orders, lines
+
+    def rf2(self):
+        orders, lines = [], []
+        for _ in range(min(self._n, len(self._live))):
+            o, ls = self._live.popleft()
+            orders.append(o)
+            lines.extend(ls)
+        return orders, lines
@@ -0,0 +1,285 @@
+"""YCSB core workloads A–F over the native push/seek API.
+
+One `usertable` (U64 key, a U64 `bucket` column, `field_count` TEXT fields of
+`field_len` bytes) is loaded, then each client process runs its share of the
+operation mix against it through the blocking client or `gnitz.aio`:
+
+    A  50% read / 50% update            zipfian
+    B  95% read /  5% update            zipfian
+    C 100% read                         zipfian
+    D  95% read /  5% insert            latest
+    E  95% scan /  5% insert            zipfian
+    F  50% read / 50% read-modify-write zipfian
+
+Deviations from the reference implementation, forced by the API:
+- update writes the whole record (push is a row upsert), not one field;
+- the native API has no key-range scan, so E's short scan is a secondary-index
+  seek on `bucket = key // SCAN_SPAN` — SCAN_SPAN consecutive keys, YCSB's
+  mean scan length. `gnitz.aio` has no index seek, so E is blocking-only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import string
+import time
+
+import gnitz
+from helpers.timing import run_pool
+
+SCAN_SPAN = 50
+BUCKET_COL = 1      # usertable column index of `bucket`, the scan index key
+ZIPF_THETA = 0.99   # YCSB's default zipfian constant
+
+WORKLOADS = {
+    "a": ({"read": 0.50, "update": 0.50}, "zipfian"),
+    "b": ({"read": 0.95, "update": 0.05}, "zipfian"),
+    "c": ({"read": 1.00}, "zipfian"),
+    "d": ({"read": 0.95, "insert": 0.05}, "latest"),
+    "e": ({"scan": 0.95, "insert": 0.05}, "zipfian"),
+    "f": ({"read": 0.50, "rmw": 0.50}, "zipfian"),
+}
+
+
+# ---------------------------------------------------------------------------
+# Key choosers
+# ---------------------------------------------------------------------------
+
+class Zipfian:
+    """Gray et al.'s constant-time zipfian draw over [0, n) ("Quickly
+    generating billion-record synthetic databases"), as YCSB implements it:
+    one O(n) zeta sum up front, then O(1) per draw."""
+
+    def __init__(self, n: int, theta: float = ZIPF_THETA):
+        self.n = n
+        self.theta = theta
+        zetan = sum(1.0 / (i ** theta) for i in range(1, n + 1))
+        self._zetan = zetan
+        self._half_pow = 0.5 ** theta
+        zeta2 = 1.0 + self._half_pow
+        self._alpha = 1.0 / (1.0 - theta)
+        self._eta = (1.0 - (2.0 / n) ** (1.0 - theta)) / (1.0 - zeta2 / zetan)
+
+    def next(self, rng: random.Random) -> int:
+        u = rng.random()
+        uz = u * self._zetan
+        if uz < 1.0:
+            return 0
+        if uz < 1.0 + self._half_pow:
+            return 1
+        return min(int(self.n * (self._eta * u - self._eta + 1.0) ** self._alpha), self.n - 1)
+
+
+def _fnv64(v: int) -> int:
+    h = 0xCBF29CE484222325
+    for _ in range(8):
+        h ^= v & 0xFF
+        h = (h * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+        v >>= 8
+    return h
+
+
+class KeyChooser:
+    """Picks the key of the next read/update/scan.
+
+    "zipfian" scrambles the zipfian rank through FNV so the hot keys spread
+    over the keyspace rather than clustering at its start; "latest" skews to
+    the most recently inserted keys (rank 0 = newest).
+    """
+
+    def __init__(self, dist: str, records: int):
+        self.dist = dist
+        self.records = records
+        self._zipf = Zipfian(records)
+
+    def next(self, rng: random.Random, key_count: int) -> int:
+        rank = self._zipf.next(rng)
+        if self.dist == "latest":
+            return max(key_count - 1 - rank, 0)
+        return _fnv64(rank) % self.records
+
+
+# ---------------------------------------------------------------------------
+# Table and records
+# ---------------------------------------------------------------------------
+
+def create_usertable(client, sn: str, field_count: int) -> None:
+    fields = ", ".join(f"field{i} TEXT NOT NULL" for i in range(field_count))
+    client.execute_sql("CREATE TABLE usertable (ycsb_key BIGINT UNSIGNED NOT NULL PRIMARY KEY, "
+                       f"bucket BIGINT UNSIGNED NOT NULL, {fields})", schema_name=sn)
+    client.execute_sql("CREATE INDEX ON usertable(bucket)", schema_name=sn)
+
+
+def value_pool(rng: random.Random, field_len: int, size: int = 256) -> list[str]:
+    """Pre-generated field values: building fresh random strings per op would
+    cost more client CPU than the op itself."""
+    alphabet = string.ascii_letters + string.digits
+    return ["".join(rng.choices(alphabet, k=field_len)) for _ in range(size)]
+
+
+def append_record(batch, key: int, field_count: int, pool: list[str], rng: random.Random) -> None:
+    row = {f"field{i}": rng.choice(pool) for i in range(field_count)}
+    batch.append(ycsb_key=key, bucket=key // SCAN_SPAN, **row, weight=1)
+
+
+def load(client, tid, schema, records: int, field_count: int, field_len: int,
+         chunk: int = 10_000, measure=None) -> None:
+    """Insert keys [0, records) in `chunk`-row pushes. `measure(fn, *args,
+    rows_per_call=)` (a BenchTimer.measure) times each push when given."""
+    rng = random.Random(42)
+    pool = value_pool(rng, field_len)
+    for start in range(0, records, chunk):
+        end = min(start + chunk, records)
+        b = gnitz.ZSetBatch(schema)
+        for k in range(start, end):
+            append_record(b, k, field_count, pool, rng)
+        if measure is None:
+            client.push(tid, b)
+        else:
+            measure(client.push, tid, b, rows_per_call=end - start)
+
+
+# ---------------------------------------------------------------------------
+# Client processes
+# ---------------------------------------------------------------------------
+
+def _op_picker(mix: dict):
+    ops = list(mix)
+    cum, acc = [], 0.0
+    for op in ops:
+        acc += mix[op]
+        cum.append(acc)
+
+    def pick(rng: random.Random) -> str:
+        u = rng.random() * acc
+        for op, c in zip(ops, cum):
+            if u < c:
+                return op
+        return ops[-1]
+    return pick
+
+
+class _ClientState:
+    """Per-process workload state: key chooser, insert key stream, values."""
+
+    def __init__(self, workload, cfg, client_idx, n_clients):
+        mix, dist = WORKLOADS[workload]
+        self.pick = _op_picker(mix)
+        # Client i draws from seed + i: runs repeat op for op, and no two
+        # clients share a stream.
+        self.rng = random.Random(cfg["seed"] + client_idx)
+        self.chooser = KeyChooser(dist, cfg["records"])
+        self.pool = value_pool(self.rng, cfg["field_len"])
+        self.field_count = cfg["field_count"]
+        # Inserted keys interleave across clients: client i owns
+        # records + i, records + i + n_clients, ...
+        self.next_insert = cfg["records"] + client_idx
+        self.stride = n_clients
+        self.inserted = 0
+        self.n_clients = n_clients
+        self.records = cfg["records"]
+
+    def key_count(self) -> int:
+        # Other clients insert at about the same pace, so this estimates the
+        # global key count the "latest" distribution skews towards.
+        return self.records + self.inserted * self.n_clients
+
+    def read_key(self) -> int:
+        return self.chooser.next(self.rng, self.key_count())
+
+    def insert_key(self) -> int:
+        k = self.next_insert
+        self.next_insert += self.stride
+        self.inserted += 1
+        return k
+
+    def record(self, schema, key):
+        b = gnitz.ZSetBatch(schema)
+        append_record(b, key, self.field_count, self.pool, self.rng)
+        return b
+
+
+def _sync_client(socket_path, sn, workload, cfg, client_idx, n_clients, barrier, queue):
+    st = _ClientState(workload, cfg, client_idx, n_clients)
+    lat: dict[str, list[float]] = {}
+    with gnitz.connect(socket_path) as c:
+        tid, schema = c.resolve_table(sn, "usertable")
+        barrier.wait()
+        t0 = time.perf_counter()
+        for _ in range(cfg["ops"] // n_clients):
+            op = st.pick(st.rng)
+            start = time.perf_counter()
+            if op == "read":
+                c.seek(tid, st.read_key())
+            elif op == "update":
+                c.push(tid, st.record(schema, st.read_key()))
+            elif op == "insert":
+                c.push(tid, st.record(schema, st.insert_key()))
+            elif op == "scan":
+                c.seek_by_index(tid, [BUCKET_COL], [st.read_key() // SCAN_SPAN])
+            else:  # rmw
+                k = st.read_key()
+                c.seek(tid, k)
+                c.push(tid, st.record(schema, k))
+            lat.setdefault(op, []).append((time.perf_counter() - start) * 1000.0)
+        elapsed = time.perf_counter() - t0
+    queue.put({"latencies": lat, "elapsed_s": elapsed})
+
+
+def _aio_client(socket_path, sn, workload, cfg, client_idx, n_clients, barrier, queue):
+    """`cfg["aio_concurrency"]` coroutines share one pipelined gnitz.aio connection."""
+    import gnitz.aio
+
+    st = _ClientState(workload, cfg, client_idx, n_clients)
+    lat: dict[str, list[float]] = {}
+    with gnitz.connect(socket_path) as c:
+        tid, schema = c.resolve_table(sn, "usertable")
+    per_task = cfg["ops"] // n_clients // cfg["aio_concurrency"]
+
+    async def worker(conn):
+        for _ in range(per_task):
+            op = st.pick(st.rng)
+            start = time.perf_counter()
+            if op == "read":
+                await conn.seek(tid, st.read_key())
+            elif op == "update":
+                await conn.push(tid, st.record(schema, st.read_key()))
+            elif op == "insert":
+                await conn.push(tid, st.record(schema, st.insert_key()))
+            else:  # rmw
+                k = st.read_key()
+                await conn.seek(tid, k)
+                await conn.push(tid, st.record(schema, k))
+            lat.setdefault(op, []).append((time.perf_counter() - start) * 1000.0)
+
+    async def main():
+        async with gnitz.aio.connect(socket_path) as conn:
+            barrier.wait()
+            t0 = time.perf_counter()
+            await asyncio.gather(*(worker(conn) for _ in range(cfg["aio_concurrency"])))
+            return time.perf_counter() - t0
+
+    elapsed = asyncio.run(main())
+    queue.put({"latencies": lat, "elapsed_s": elapsed})
+
+
+def run_workload(socket_path: str, sn: str, workload: str, cfg: dict, n_clients: int,
+                 api: str = "sync") -> dict:
+    """Fork `n_clients` processes splitting `cfg["ops"]` operations of
+    `workload` against the loaded usertable.
+
+    Returns {latencies: {op: [ms]}, ops, elapsed_s}; elapsed is the slowest
+    client's wall time, so ops / elapsed_s is the aggregate throughput.
+    """
+    fn = _aio_client if api == "aio" else _sync_client
+    parts = run_pool([(fn, (socket_path, sn, workload, cfg, i, n_clients)) for i in range(n_clients)])
+    lat: dict[str, list[float]] = {}
+    for p in parts:
+        for op, xs in p["latencies"].items():
+            lat.setdefault(op, []).extend(xs)
+    return {
+        "latencies": lat,
+        "ops": sum(len(xs) for xs in lat.values()),
+        "elapsed_s": max((p["elapsed_s"] for p in parts), default=0.0),
+    }
@@ -29,6 +29,7 @@ TIERS = [
     ("micro", "micro — SQL client-path latency"),
     ("features", "features — per-feature incremental-maintenance cost"),
     ("txn", "txn — transactions"),
+    ("ycsb", "ycsb — key-value workloads A–F (native API)"),
     ("combined", "combined — realistic end-to-end"),
 ]
 
@@ -225,6 +226,55 @@ def report_htap_serving(benchmarks: list[dict], file=None):
     )
 
 
+def report_view_maintenance(benchmarks: list[dict], file=None):
+    """Per-view freshness and tick cost of refresh-stream benches."""
+    for b in benchmarks:
+        e = b.get("extra") or {}
+        views = e.get("views")
+        if not views:
+            continue
+        rows = []
+        for name, v in views.items():
+            rows.append((name, f"{v['fresh_p50_ms']:.2f}", f"{v['fresh_p99_ms']:.2f}",
+                         f"{v['tick_p50_ms']:.2f}", f"{v['tick_p99_ms']:.2f}"))
+        disk = e.get("storage_amp_disk")
+        gap = e.get("poll_gap_p50_ms")
+        print_table(
+            f"View maintenance — {b['name']} (W={e.get('workers', '?')}, SF={e.get('sf', '?')}, "
+            f"{e.get('refresh_rows_per_sec', 0):,.0f} refresh rows/s, storage amp "
+            f"{e.get('storage_amp_rows', 0):.2f}x rows / "
+            f"{f'{disk:.2f}x' if disk is not None else '-'} disk, "
+            f"freshness polled every {f'{gap:.2f}' if gap is not None else '-'}ms p50 / "
+            f"{e.get('poll_gap_max_ms') or '-'}ms max)",
+            ["view", "fresh p50ms", "fresh p99ms", "tick p50ms", "tick p99ms"],
+            rows,
+            file=file,
+        )
+
+
+def report_latency_curves(benchmarks: list[dict], file=None):
+    """One table per open-loop sweep: response time (from each request's due
+    time) against offered and achieved rate, service-time p99 alongside."""
+    for b in benchmarks:
+        curve = (b.get("extra") or {}).get("latency_curve")
+        if not curve:
+            continue
+        rows = []
+        for p in curve:
+            rows.append((
+                f"{p['target_rps']:,.0f}", f"{p['achieved_rps']:,.0f}",
+                f"{p['p50_ms']:.2f}", f"{p['p99_ms']:.2f}", f"{p['p999_ms']:.2f}",
+                f"{p['max_ms']:.2f}", f"{p['service_p99_ms']:.2f}",
+                "yes" if p["sustained"] else "no",
+            ))
+        print_table(
+            f"Latency vs throughput — {b['name']}",
+            ["offered/s", "achieved/s", "p50ms", "p99ms", "p99.9ms", "maxms", "svc p99ms", "sustained"],
+            rows,
+            file=file,
+        )
+
+
 def report_perf(perf_data: Path, top_n: int = 15, file=None):
     if not perf_data.exists():
         print("\n(no perf.data found or perf not available)", file=file)
@@ -277,6 +327,8 @@ def report_one(subdir: Path, file=None):
     report_throughput(benchmarks, file=file)
     report_transactions(benchmarks, file=file)
     report_htap_serving(benchmarks, file=file)
+    report_latency_curves(benchmarks, file=file)
+    report_view_maintenance(benchmarks, file=file)
 
     perf_data = subdir / "perf.data"
     if perf_data.exists():
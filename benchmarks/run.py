@@ -32,8 +32,22 @@ def parse_args():
                    help="Enable perf record with --call-graph=dwarf for full userspace stacks")
     p.add_argument("--perf-stat", action="store_true",
                    help="Enable perf stat")
+    p.add_argument("--zone-profile", action="store_true",
+                   help="Enable the server's built-in CPU-zone profiler")
     p.add_argument("-k", type=str, default=None,
                    help="pytest -k expression")
+    p.add_argument("--ycsb-records", type=int, default=None,
+                   help="YCSB usertable record count")
+    p.add_argument("--ycsb-field-count", type=int, default=None,
+                   help="YCSB fields per record")
+    p.add_argument("--ycsb-field-len", type=int, default=None,
+                   help="YCSB bytes per field")
+    p.add_argument("--ycsb-seed", type=int, default=None,
+                   help="YCSB base RNG seed (client i uses seed + i)")
+    p.add_argument("--tpch-sf", type=float, default=None,
+                   help="TPC-H refresh-stream scale factor")
+    p.add_argument("--tpch-rf-rate", type=float, default=None,
+                   help="TPC-H RF1+RF2 pairs per second (0 = back to back)")
     return p.parse_args()
 
 
@@ -139,7 +153,13 @@ def main():
                 *(["--perf"] if args.perf else []),
                 *(["--perf-dwarf"] if args.perf_dwarf else []),
                 *(["--perf-stat"] if args.perf_stat else []),
+                *(["--zone-profile"] if args.zone_profile else []),
                 *(["-k", args.k] if args.k else []),
+                *(f"--ycsb-{opt.replace('_', '-')}={val}"
+                  for opt in ("records", "field_count", "field_len", "seed")
+                  if (val := getattr(args, f"ycsb_{opt}")) is not None),
+                *([f"--tpch-sf={args.tpch_sf}"] if args.tpch_sf is not None else []),
+                *([f"--tpch-rf-rate={args.tpch_rf_rate}"] if args.tpch_rf_rate is not None else []),
                 "-q", "--tb=short",
             ]
             print(f"\n=== Running: workers={workers} clients={clients} ===")
@@ -160,6 +180,8 @@ def main():
         if flame.exists():
             print(f"flamegraph: {flame}")
         print(f"  inspect: perf report -i {perf_data}")
+    for folded in sorted(output_dir.rglob("zones.folded")):
+        print(f"\nzone profile: {folded}")
 
 
 if __name__ == "__main__":
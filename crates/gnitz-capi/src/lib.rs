@@ -717,13 +717,17 @@ pub unsafe extern "C" fn gnitz_create_table(
     match c.0.create_table(
         cstr(schema_name),
         cstr(table_name),
-        // `false`/`0` = partitioned, default full-PK distribution; the C API has
-        // no REPLICATED or CLUSTER BY surface (those ride on SQL DDL).
+        // `false`/`false`/`0` = partitioned, not append-only, default full-PK
+        // distribution; the C API has no REPLICATED, APPEND_ONLY or CLUSTER BY
+        // surface (those ride on SQL DDL).
         &s.0.columns,
         &pk_slice,
         unique_pk != 0,
         false,
+        false,
         0,
+        // Default (leveled) compaction; per-table policy rides on SQL DDL too.
+        Default::default(),
         // No inline UNIQUE constraint surface in the C API (those ride on SQL DDL).
         &[],
     ) {
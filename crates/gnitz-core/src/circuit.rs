@@ -201,6 +201,20 @@ impl CircuitBuilder {
         nid
     }
 
+    /// Compute map with a declared payload: the output keeps the input's PK
+    /// region, and its payload columns are `out_cols` — `(type, nullable)` each,
+    /// in order — filled by `program`'s COPY_COL / EMIT instructions. Unlike
+    /// `map_expr` (whose output is the view's own schema) it may sit anywhere in
+    /// the circuit, so it can append a computed column for a downstream operator.
+    pub fn map_compute(&mut self, input: NodeId, program: ExprProgram, out_cols: &[(crate::TypeCode, bool)]) -> NodeId {
+        let nid = self.alloc_node(OpNode::Map(MapKind::Compute {
+            program: program.encode(),
+            out_cols: out_cols.iter().map(|&(tc, nullable)| (tc as u8, nullable)).collect(),
+        }));
+        self.connect(input, nid, gnitz_wire::PORT_IN);
+        nid
+    }
+
     /// Map with PK reindexing (equijoin pre-indexing). The new synthetic PK is built
     /// from `reindex_cols` of the input schema, in the given order. Pass a one-element
     /// slice for a single-column join key.
@@ -443,6 +457,46 @@ impl CircuitBuilder {
         self.reduce_node(input, group_cols, agg_specs, global_ground, out_key)
     }
 
+    /// Incremental top-K with automatic shard insertion: per group of
+    /// `group_cols` (one global group when empty), keep the first `limit` rows
+    /// ordered by `order_col` (`desc`, NULL placement `nulls_first`), ties broken
+    /// by PK then payload. Rows shard by the group columns first, so each group's
+    /// candidates meet on one worker. The output keeps the input schema and PK.
+    pub fn top_k(
+        &mut self,
+        input: NodeId,
+        group_cols: &[usize],
+        order_col: usize,
+        desc: bool,
+        nulls_first: bool,
+        limit: u64,
+    ) -> NodeId {
+        let sharded = self.shard(input, group_cols);
+        let nid = self.alloc_node(OpNode::TopK {
+            group_cols: group_cols.iter().map(|&c| c as u16).collect(),
+            order_col: order_col as u16,
+            desc,
+            nulls_first,
+            limit,
+        });
+        self.connect(sharded, nid, gnitz_wire::PORT_IN);
+        nid
+    }
+
+    /// Watermark retention on integer column `col`: once a row's `col` falls more
+    /// than `horizon` below the largest `col` seen, the row is dropped on arrival
+    /// or retracted if it passed earlier. No shard is inserted — the watermark is
+    /// kept per worker over whatever partition reaches it. The output keeps the
+    /// input schema and PK.
+    pub fn retain(&mut self, input: NodeId, col: usize, horizon: u64) -> NodeId {
+        let nid = self.alloc_node(OpNode::Retain {
+            col: col as u16,
+            horizon,
+        });
+        self.connect(input, nid, gnitz_wire::PORT_IN);
+        nid
+    }
+
     /// Exchange shard: routes rows to workers by hashing the given columns.
     pub fn shard(&mut self, input: NodeId, shard_cols: &[usize]) -> NodeId {
         let cols: Vec<u16> = shard_cols.iter().map(|&c| c as u16).collect();
@@ -624,6 +678,56 @@ mod tests {
         }
     }
 
+    /// `top_k` shards on its group columns first and its params survive
+    /// into_rows → from_rows.
+    #[test]
+    fn top_k_shards_on_group_and_roundtrips() {
+        let mut cb = CircuitBuilder::new(5, 100);
+        let input = cb.input_delta();
+        let top = cb.top_k(input, &[2], 1, true, false, 10);
+        cb.sink(top);
+        let decoded = Circuit::from_rows(5, cb.build().into_rows()).expect("from_rows");
+        assert!(decoded
+            .nodes
+            .values()
+            .any(|n| matches!(n, OpNode::ExchangeShard { shard_cols } if shard_cols == &[2])));
+        assert_eq!(
+            decoded.nodes.get(&top),
+            Some(&OpNode::TopK {
+                group_cols: vec![2],
+                order_col: 1,
+                desc: true,
+                nulls_first: false,
+                limit: 10,
+            })
+        );
+    }
+
+    /// A compute map keeps its declared payload and a retain node its params
+    /// through into_rows → from_rows; neither inserts a shard.
+    #[test]
+    fn map_compute_and_retain_roundtrip() {
+        use crate::TypeCode;
+        let mut cb = CircuitBuilder::new(5, 100);
+        let input = cb.input_delta();
+        let map = cb.map_compute(input, empty_prog(), &[(TypeCode::I64, false), (TypeCode::I64, true)]);
+        let kept = cb.retain(map, 2, 600);
+        cb.sink(kept);
+        let decoded = Circuit::from_rows(5, cb.build().into_rows()).expect("from_rows");
+        assert!(!decoded
+            .nodes
+            .values()
+            .any(|n| matches!(n, OpNode::ExchangeShard { .. })));
+        match decoded.nodes.get(&map) {
+            Some(OpNode::Map(MapKind::Compute { out_cols, .. })) => assert_eq!(
+                *out_cols,
+                vec![(TypeCode::I64 as u8, false), (TypeCode::I64 as u8, true)]
+            ),
+            other => panic!("expected Map(Compute), got {other:?}"),
+        }
+        assert_eq!(decoded.nodes.get(&kept), Some(&OpNode::Retain { col: 2, horizon: 600 }));
+    }
+
     /// The `global_ground` discriminator rides as one param row and survives
     /// into_rows → from_rows: set for an ungrouped global aggregate, clear for an
     /// ordinary grouped reduce (so existing reduce circuits are byte-identical).
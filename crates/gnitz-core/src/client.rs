@@ -159,6 +159,147 @@ pub struct IndexMeta {
     pub is_unique: bool,
 }
 
+/// Kind of a [`MetricSample`].
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum MetricKind {
+    Counter,
+    Gauge,
+    Histogram,
+}
+
+/// One server metric series from [`GnitzClient::stats`]. `process` is
+/// `master`, `worker<N>`, or `all` (the cross-process total). A histogram's
+/// `value` is its sample count, with `sum`, the quantiles and `max` in the
+/// recorded unit (`_ns` names are nanoseconds); they are zero otherwise.
+#[derive(Clone, Debug, PartialEq)]
+pub struct MetricSample {
+    pub name: String,
+    pub process: String,
+    pub kind: MetricKind,
+    pub value: i64,
+    pub sum: u64,
+    pub p50: u64,
+    pub p90: u64,
+    pub p99: u64,
+    pub max: u64,
+}
+
+/// What [`GnitzClient::profile`] does to the server's CPU-zone profiler before
+/// reading it back.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub enum ProfileAction {
+    /// Read what has been collected; the profiler keeps its state.
+    Dump,
+    /// Clear every process's profile and start timing zones.
+    Start,
+    /// Stop timing zones; the collected profile stays readable.
+    Stop,
+}
+
+/// One folded stack from [`GnitzClient::profile`]: the CPU time `process`
+/// (`master` / `worker<N>`) spent in the zone path `stack` (`tick;join`, root
+/// first) outside any zone nested below it, over `calls` zone exits. Time a
+/// process spent on paths past its table's capacity is reported on the stack
+/// `[untracked]`.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub struct ZoneStack {
+    pub process: String,
+    pub stack: String,
+    pub cpu_ns: u64,
+    pub calls: u64,
+}
+
+impl ZoneStack {
+    /// The stack as one line of the folded format `flamegraph.pl`, inferno
+    /// and speedscope read: `worker0;tick;join 1234`, in microseconds.
+    pub fn folded(&self) -> String {
+        format!("{};{} {}", self.process, self.stack, self.cpu_ns / 1000)
+    }
+}
+
+/// One span of a traced request, from [`GnitzClient::traces`]: `process`
+/// (`master` / `worker<N>`) spent `dur_ns` in `stage` (`request`, `enqueue`,
+/// `sal_write`, `fsync`, `worker_apply`, `reply`) starting at `start_ns` on the
+/// server's monotonic clock. A commit group applied once for several merged
+/// pushes reports its `worker_apply` span under each of their trace ids.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub struct TraceSpan {
+    pub trace_id: u64,
+    pub process: String,
+    pub stage: String,
+    pub start_ns: u64,
+    pub dur_ns: u64,
+}
+
+/// Render `spans` in the Chrome trace-event JSON format (`chrome://tracing`,
+/// Perfetto): one complete (`"ph":"X"`) event per span, a track per process
+/// and, within it, a row per trace id.
+pub fn chrome_trace_json(spans: &[TraceSpan]) -> String {
+    let mut pids: Vec<&str> = spans.iter().map(|s| s.process.as_str()).collect();
+    pids.sort_unstable();
+    pids.dedup();
+    let pid = |p: &str| pids.binary_search(&p).unwrap_or(0);
+    // Trace ids are 64-bit, past what a JSON number holds exactly: rows are
+    // numbered instead, and the id rides in `args` as hex.
+    let mut tids: Vec<u64> = spans.iter().map(|s| s.trace_id).collect();
+    tids.sort_unstable();
+    tids.dedup();
+    let tid = |t: u64| tids.binary_search(&t).unwrap_or(0) + 1;
+    let mut events: Vec<String> = pids
+        .iter()
+        .enumerate()
+        .map(|(i, p)| format!(r#"{{"ph":"M","name":"process_name","pid":{i},"args":{{"name":"{p}"}}}}"#))
+        .collect();
+    for s in spans {
+        events.push(format!(
+            r#"{{"ph":"X","name":"{}","pid":{},"tid":{},"ts":{:.3},"dur":{:.3},"args":{{"trace_id":"{:016x}"}}}}"#,
+            s.stage,
+            pid(&s.process),
+            tid(s.trace_id),
+            s.start_ns as f64 / 1000.0,
+            s.dur_ns as f64 / 1000.0,
+            s.trace_id,
+        ));
+    }
+    format!(r#"{{"traceEvents":[{}]}}"#, events.join(","))
+}
+
+/// One operator of a view's circuit on one worker, from
+/// [`GnitzClient::explain_analyze`]. `phase` is `main` for a single-phase plan,
+/// else `post`, `pre <N>` (an exchanged side) or `exchange` — the shard relay,
+/// whose `rows_*`/`bytes_*` count what the worker received (`_in`) and sent
+/// (`_out`) over `calls` rounds. `depth` nests an operator's inputs below it.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub struct OperatorProfile {
+    pub worker: u32,
+    pub phase: String,
+    pub pc: u32,
+    pub depth: u32,
+    pub op: String,
+    pub calls: u64,
+    pub rows_in: u64,
+    pub rows_out: u64,
+    pub time_ns: u64,
+    pub seeks: u64,
+    pub bytes_in: u64,
+    pub bytes_out: u64,
+}
+
+/// One heap attribution from [`GnitzClient::memory`]: `process` (`master` /
+/// `worker<N>`) holds `bytes` in `component` of relation `relation_id` —
+/// `memtable`, `ram_tier`, `index`, `arrangement` or `unique_filter`, or
+/// `operator` for view state kept by the operator `op` at `pc`. Process-wide
+/// pools (`batch_pool`, `block_cache`) report under relation 0.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub struct MemoryUsage {
+    pub process: String,
+    pub relation_id: u64,
+    pub component: String,
+    pub pc: u32,
+    pub op: String,
+    pub bytes: u64,
+}
+
 /// One inline `UNIQUE` constraint to fold into a `CREATE TABLE`'s atomic DDL
 /// bundle. `col_indices` are the constrained columns (a 1-element list for a
 /// single-column UNIQUE); `name` is the resolved catalog index name that
@@ -556,6 +697,144 @@ impl GnitzClient {
         Ok(rc)
     }
 
+    /// The server's counters, gauges and latency histograms (GET_STATS), per
+    /// process and totalled across processes.
+    pub fn stats(&mut self) -> Result<Vec<MetricSample>, ClientError> {
+        let Some(b) = self.session.fetch_stats(0, gnitz_wire::STATS_METRICS)? else {
+            return Ok(Vec::new());
+        };
+        let mut out = Vec::with_capacity(b.len());
+        for i in b.live_rows() {
+            let text = |c: usize| col_str(&b.columns[c], i).map(|s| s.unwrap_or_default().to_string());
+            let kind = match col_u64(&b.columns[3], i)? {
+                0 => MetricKind::Counter,
+                1 => MetricKind::Gauge,
+                2 => MetricKind::Histogram,
+                k => return Err(ClientError::ServerError(format!("stats: unknown metric kind {k}"))),
+            };
+            out.push(MetricSample {
+                name: text(1)?,
+                process: text(2)?,
+                kind,
+                value: col_u64(&b.columns[4], i)? as i64,
+                sum: col_u64(&b.columns[5], i)?,
+                p50: col_u64(&b.columns[6], i)?,
+                p90: col_u64(&b.columns[7], i)?,
+                p99: col_u64(&b.columns[8], i)?,
+                max: col_u64(&b.columns[9], i)?,
+            });
+        }
+        Ok(out)
+    }
+
+    /// Start, stop or read the server's CPU-zone profiler (GET_STATS with a
+    /// profiler selector), returning every process's folded stacks as they
+    /// stand after `action`.
+    pub fn profile(&mut self, action: ProfileAction) -> Result<Vec<ZoneStack>, ClientError> {
+        let selector = match action {
+            ProfileAction::Dump => gnitz_wire::STATS_PROFILE_DUMP,
+            ProfileAction::Start => gnitz_wire::STATS_PROFILE_START,
+            ProfileAction::Stop => gnitz_wire::STATS_PROFILE_STOP,
+        };
+        let Some(b) = self.session.fetch_stats(0, selector)? else {
+            return Ok(Vec::new());
+        };
+        let mut out = Vec::with_capacity(b.len());
+        for i in b.live_rows() {
+            let text = |c: usize| col_str(&b.columns[c], i).map(|s| s.unwrap_or_default().to_string());
+            out.push(ZoneStack {
+                process: text(1)?,
+                stack: text(2)?,
+                cpu_ns: col_u64(&b.columns[3], i)?,
+                calls: col_u64(&b.columns[4], i)?,
+            });
+        }
+        Ok(out)
+    }
+
+    /// Trace every `every`-th push, scan and seek this client sends (0: off).
+    pub fn set_tracing(&mut self, every: u32) {
+        self.session.set_tracing(every);
+    }
+
+    /// Trace id of the most recent sampled request, if any was sampled.
+    pub fn last_trace_id(&self) -> Option<u64> {
+        self.session.last_trace_id()
+    }
+
+    /// The spans the server still holds for sampled requests, across every
+    /// process, ordered by trace id and then start time. Each process keeps
+    /// its most recent spans only, so old traces age out.
+    pub fn traces(&mut self) -> Result<Vec<TraceSpan>, ClientError> {
+        let Some(b) = self.session.fetch_stats(0, gnitz_wire::STATS_TRACES)? else {
+            return Ok(Vec::new());
+        };
+        let mut out = Vec::with_capacity(b.len());
+        for i in b.live_rows() {
+            let text = |c: usize| col_str(&b.columns[c], i).map(|s| s.unwrap_or_default().to_string());
+            out.push(TraceSpan {
+                trace_id: col_u64(&b.columns[1], i)?,
+                process: text(2)?,
+                stage: text(3)?,
+                start_ns: col_u64(&b.columns[4], i)?,
+                dur_ns: col_u64(&b.columns[5], i)?,
+            });
+        }
+        Ok(out)
+    }
+
+    /// Heap bytes every process attributes to each relation, view operator
+    /// and pool, the master's entries first. Memory-mapped shard files are
+    /// page cache and are not counted.
+    pub fn memory(&mut self) -> Result<Vec<MemoryUsage>, ClientError> {
+        let Some(b) = self.session.fetch_stats(0, gnitz_wire::STATS_MEMORY)? else {
+            return Ok(Vec::new());
+        };
+        let mut out = Vec::with_capacity(b.len());
+        for i in b.live_rows() {
+            let text = |c: usize| col_str(&b.columns[c], i).map(|s| s.unwrap_or_default().to_string());
+            out.push(MemoryUsage {
+                process: text(1)?,
+                relation_id: col_u64(&b.columns[2], i)?,
+                component: text(3)?,
+                pc: col_u64(&b.columns[4], i)? as u32,
+                op: text(5)?,
+                bytes: col_u64(&b.columns[6], i)?,
+            });
+        }
+        Ok(out)
+    }
+
+    /// `EXPLAIN ANALYZE`: the cumulative per-operator counters of `view_id`'s
+    /// compiled circuit, one entry per operator per worker, in each worker's
+    /// tree order. Counters run from the plan's last compile on that worker and
+    /// advance only while the profiler runs ([`Self::profile`]).
+    pub fn explain_analyze(&mut self, view_id: u64) -> Result<Vec<OperatorProfile>, ClientError> {
+        let Some(b) = self.session.fetch_stats(view_id, 0)? else {
+            return Ok(Vec::new());
+        };
+        let mut out = Vec::with_capacity(b.len());
+        for i in b.live_rows() {
+            let text = |c: usize| col_str(&b.columns[c], i).map(|s| s.unwrap_or_default().to_string());
+            let num = |c: usize| col_u64(&b.columns[c], i);
+            out.push(OperatorProfile {
+                worker: num(1)? as u32,
+                phase: text(2)?,
+                pc: num(3)? as u32,
+                depth: num(4)? as u32,
+                op: text(5)?,
+                calls: num(6)?,
+                rows_in: num(7)?,
+                rows_out: num(8)?,
+                time_ns: num(9)?,
+                seeks: num(10)?,
+                bytes_in: num(11)?,
+                bytes_out: num(12)?,
+            });
+        }
+        Ok(out)
+    }
+
     /// Persist a secondary-index catalog row over an already-resolved base table.
     ///
     /// Resolution and view-rejection are the caller's responsibility: an index
@@ -876,6 +1155,15 @@ impl GnitzClient {
     /// to the pre-distribution-key behavior. The SQL planner validates `k` against
     /// the PK before calling this; the single-PK Python/test surfaces pass `0`.
     ///
+    /// `append_only` marks a table that only ever grows (`WITH (append_only =
+    /// true)`): the server rejects its deletes and PK-conflicting inserts, and
+    /// views over it skip their retraction machinery. Non-SQL surfaces pass
+    /// `false`.
+    ///
+    /// `compaction` selects the table's LSM compaction strategy and L0 trigger
+    /// (`WITH (compaction = …, l0_trigger = …)`); non-SQL surfaces pass
+    /// `CompactionOptions::default()` (leveled, strategy-default trigger).
+    ///
     /// `unique_indexes` are the table's inline `UNIQUE` constraints, folded into
     /// the same atomic DDL bundle as `[COL_TAB, TABLE_TAB, IDX_TAB]` so a failure
     /// rolls the whole `CREATE` back — never a table left missing its unique
@@ -889,7 +1177,9 @@ impl GnitzClient {
         pk_cols: &[u32],
         unique_pk: bool,
         replicated: bool,
+        append_only: bool,
         dist_prefix_len: usize,
+        compaction: gnitz_wire::CompactionOptions,
         unique_indexes: &[InlineUniqueIndex],
     ) -> Result<u64, ClientError> {
         // Gateway backstop for non-SQL front ends (capi): enforce the ASCII
@@ -941,7 +1231,13 @@ impl GnitzClient {
             .str_val("")
             .u64_val(pk_packed)
             .u64_val(0)
-            .u64_val(gnitz_wire::pack_table_flags(unique_pk, replicated, dist_prefix_len));
+            .u64_val(gnitz_wire::pack_table_flags(
+                unique_pk,
+                replicated,
+                append_only,
+                dist_prefix_len,
+                compaction,
+            ));
 
         // IDX_TAB family — every inline UNIQUE index as one multi-row batch
         // (`hook_index_register` loops over rows). Allocate ids and validate up
@@ -1814,6 +2110,30 @@ mod tests {
         b
     }
 
+    #[test]
+    fn chrome_trace_json_numbers_processes_and_traces() {
+        let span = |trace_id: u64, process: &str, stage: &str, start_ns: u64| TraceSpan {
+            trace_id,
+            process: process.into(),
+            stage: stage.into(),
+            start_ns,
+            dur_ns: 1500,
+        };
+        let json = chrome_trace_json(&[
+            span(u64::MAX, "master", "request", 2000),
+            span(u64::MAX, "worker1", "worker_apply", 3000),
+            span(5, "master", "request", 1000),
+        ]);
+        assert!(json.starts_with(r#"{"traceEvents":["#));
+        assert!(json.contains(r#"{"ph":"M","name":"process_name","pid":0,"args":{"name":"master"}}"#));
+        assert!(json.contains(r#"{"ph":"M","name":"process_name","pid":1,"args":{"name":"worker1"}}"#));
+        assert!(json.contains(
+            r#"{"ph":"X","name":"worker_apply","pid":1,"tid":2,"ts":3.000,"dur":1.500,"args":{"trace_id":"ffffffffffffffff"}}"#
+        ));
+        assert!(json.contains(r#""name":"request","pid":0,"tid":1,"ts":1.000"#));
+        assert_eq!(chrome_trace_json(&[]), r#"{"traceEvents":[]}"#);
+    }
+
     #[test]
     fn empty_push_opens_no_family() {
         let s = kv_schema();
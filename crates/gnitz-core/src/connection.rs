@@ -9,13 +9,14 @@ use crate::protocol::{
     wire_flags_set_conflict_mode, wire_flags_set_index_version, wire_flags_set_schema_version, ClientTransport,
     Message, PkTuple, ProtocolError, Schema, WireConflictMode, ZSetBatch, FLAG_ALLOCATE_INDEX_ID,
     FLAG_ALLOCATE_SCHEMA_ID, FLAG_ALLOCATE_SERIAL_RANGE, FLAG_ALLOCATE_TABLE_ID, FLAG_CONTINUATION, FLAG_GET_INDICES,
-    FLAG_PUSH, FLAG_SEEK, FLAG_SEEK_BY_INDEX, FLAG_SEEK_BY_INDEX_RANGE, STATUS_ERROR, STATUS_NO_INDEX,
+    FLAG_GET_STATS, FLAG_PUSH, FLAG_SEEK, FLAG_SEEK_BY_INDEX, FLAG_SEEK_BY_INDEX_RANGE, STATUS_ERROR, STATUS_NO_INDEX,
     STATUS_SCHEMA_MISMATCH, STATUS_TXN_CONFLICT,
 };
 use lru::LruCache;
 
 pub use gnitz_wire::{
-    COL_TAB, DEP_TAB, FIRST_USER_SCHEMA_ID, FIRST_USER_TABLE_ID, IDX_TAB, SCHEMA_TAB, SEQ_TAB, TABLE_TAB, VIEW_TAB,
+    COL_TAB, DEP_TAB, FIRST_USER_SCHEMA_ID, FIRST_USER_TABLE_ID, IDX_TAB, SCHEMA_TAB, SEQ_TAB, TABLE_TAB,
+    VIEW_STATS_TAB, VIEW_TAB,
 };
 
 /// Per-connection schema LRU capacity. Sized to comfortably hold a session's
@@ -89,6 +90,11 @@ pub struct Session {
     /// client to allocate up to the historical 256 MB ceiling.
     max_payload_len: usize,
     schema_cache: LruCache<u64, (Arc<Schema>, u16)>,
+    /// Sample every `trace_every`-th push / scan / seek for tracing (0: off).
+    /// A sampled request carries a nonzero trace id in its control block.
+    trace_every: u32,
+    trace_seq: u64,
+    last_trace_id: Option<u64>,
 }
 
 impl Session {
@@ -116,9 +122,44 @@ impl Session {
             client_id,
             max_payload_len,
             schema_cache: LruCache::new(SCHEMA_CACHE_CAP),
+            trace_every: 0,
+            trace_seq: 0,
+            last_trace_id: None,
         }
     }
 
+    /// Trace every `every`-th push, scan and seek this session sends; 0 turns
+    /// tracing off. The server records each sampled request's stages under its
+    /// trace id (see [`crate::GnitzClient::traces`]).
+    pub fn set_tracing(&mut self, every: u32) {
+        self.trace_every = every;
+        self.trace_seq = 0;
+    }
+
+    /// Trace id of the most recent sampled request, if any was sampled.
+    pub fn last_trace_id(&self) -> Option<u64> {
+        self.last_trace_id
+    }
+
+    /// Count one traceable request and return its trace id: nonzero when the
+    /// sampling rate picks it, else 0. Ids mix the client id with the
+    /// request's sequence number, so concurrent sessions do not collide.
+    fn next_trace_id(&mut self) -> u64 {
+        if self.trace_every == 0 {
+            return 0;
+        }
+        self.trace_seq += 1;
+        if self.trace_seq % self.trace_every as u64 != 0 {
+            return 0;
+        }
+        let mut z = self.client_id ^ self.trace_seq.wrapping_mul(0x9E37_79B9_7F4A_7C15);
+        z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+        z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+        let id = (z ^ (z >> 31)).max(1);
+        self.last_trace_id = Some(id);
+        id
+    }
+
     pub fn close(self) {
         // The transport is dropped here, which closes the connection.
     }
@@ -233,7 +274,8 @@ impl Session {
     }
 
     pub fn scan(&mut self, target_id: u64) -> ScanResult {
-        let parts = self.pack_scan(target_id);
+        let mut parts = self.pack_scan(target_id);
+        stamp_trace(&mut parts, self.next_trace_id());
         self.transport.send_framed_iov(&parts.segments())?;
         self.recv_scan(target_id)
     }
@@ -287,8 +329,9 @@ impl Session {
     }
 
     pub fn seek(&mut self, target_id: u64, pk: &PkTuple) -> ScanResult {
-        let flags = self.versioned_flags(target_id, FLAG_SEEK);
-        send_message(&mut self.transport, target_id, self.client_id, flags, pk, 0, None, None)?;
+        let mut parts = self.pack_seek(target_id, pk);
+        stamp_trace(&mut parts, self.next_trace_id());
+        self.transport.send_framed_iov(&parts.segments())?;
         let msg = self.recv_checked(target_id)?;
         self.recover_schema(target_id, msg)
     }
@@ -378,6 +421,28 @@ impl Session {
         Ok((msg.data_batch, wire_flags_get_index_version(msg.flags)))
     }
 
+    /// Pure transport for GET_STATS: a control-only request answered with the
+    /// server's metrics, one row per metric and process, or its CPU-zone
+    /// profile (`target_id = 0`, as `selector` — a `STATS_*` constant — picks),
+    /// or a view's per-operator profile (`target_id` = the view, selector 0).
+    /// Like GET_INDICES the reply carries its own schema block and bypasses the
+    /// `schema_cache`; `GnitzClient::stats` / `profile` / `explain_analyze`
+    /// decode it.
+    pub(crate) fn fetch_stats(&mut self, target_id: u64, selector: u64) -> Result<Option<ZSetBatch>, ClientError> {
+        send_message(
+            &mut self.transport,
+            target_id,
+            self.client_id,
+            FLAG_GET_STATS,
+            &PkTuple::EMPTY,
+            selector,
+            None,
+            None,
+        )?;
+        let msg = check_response(recv_message(&mut self.transport, None, self.max_payload_len)?)?;
+        Ok(msg.data_batch)
+    }
+
     // ── Async-shared protocol surface ──────────────────────────────────────
     //
     // Build/receive helpers the gnitz-py async I/O loop drives directly: it
@@ -572,11 +637,12 @@ impl Session {
         // an empty batch (a legitimate empty Z-set delta) is ACKed as a no-op
         // push instead of being mistaken for a scan request.
         let base_flags = wire_flags_set_conflict_mode(FLAG_PUSH, mode);
+        let trace_id = self.next_trace_id();
         let warm_version: Option<u16> = match self.schema_cache.peek(&target_id) {
             Some((cached_schema, v)) if *v != 0 && schema.types_match(cached_schema.as_ref()) => Some(*v),
             _ => None,
         };
-        let parts = match warm_version {
+        let mut parts = match warm_version {
             // Warm path: omit schema block, embed cached version.
             Some(cached_version) => {
                 let flags = wire_flags_set_schema_version(base_flags, cached_version);
@@ -593,12 +659,13 @@ impl Session {
                 Some(batch),
             ),
         };
+        stamp_trace(&mut parts, trace_id);
         self.transport.send_framed_iov(&parts.segments())?;
         let ack = match self.recv_checked(target_id) {
             Err(ClientError::SchemaMismatch) => {
                 // Stale cache: evict and retry with full schema.
                 self.schema_cache.pop(&target_id);
-                let parts = encode_message_parts(
+                let mut parts = encode_message_parts(
                     target_id,
                     self.client_id,
                     base_flags,
@@ -607,6 +674,7 @@ impl Session {
                     Some(schema),
                     Some(batch),
                 );
+                stamp_trace(&mut parts, trace_id);
                 self.transport.send_framed_iov(&parts.segments())?;
                 self.recv_checked(target_id)?
             }
@@ -625,6 +693,13 @@ impl Session {
     }
 }
 
+/// Patch a sampled request's trace id into its (checksummed) control block.
+fn stamp_trace(parts: &mut MessageParts, trace_id: u64) {
+    if trace_id != 0 {
+        gnitz_wire::control::set_ctrl_trace_id(&mut parts.ctrl, trace_id, true);
+    }
+}
+
 #[cfg(test)]
 mod cache_tests {
     use crate::protocol::{ColumnDef, Schema, TypeCode};
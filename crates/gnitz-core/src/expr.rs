@@ -1,11 +1,11 @@
 use gnitz_wire::{
     EXPR_BOOL_AND, EXPR_BOOL_NOT, EXPR_BOOL_OR, EXPR_CMP_EQ, EXPR_CMP_GE, EXPR_CMP_GT, EXPR_CMP_LE, EXPR_CMP_LT,
     EXPR_CMP_NE, EXPR_COPY_COL, EXPR_EMIT, EXPR_FCMP_EQ, EXPR_FCMP_GE, EXPR_FCMP_GT, EXPR_FCMP_LE, EXPR_FCMP_LT,
-    EXPR_FCMP_NE, EXPR_FLOAT_ADD, EXPR_FLOAT_DIV, EXPR_FLOAT_MUL, EXPR_FLOAT_NEG, EXPR_FLOAT_SUB, EXPR_INT_ADD,
-    EXPR_INT_DIV, EXPR_INT_MOD, EXPR_INT_MUL, EXPR_INT_NEG, EXPR_INT_SUB, EXPR_INT_TO_FLOAT, EXPR_IS_NOT_NULL,
-    EXPR_IS_NULL, EXPR_LOAD_COL_FLOAT, EXPR_LOAD_COL_INT, EXPR_LOAD_CONST, EXPR_LOAD_NULL, EXPR_SELECT,
-    EXPR_STR_COL_EQ_COL, EXPR_STR_COL_EQ_CONST, EXPR_STR_COL_LE_COL, EXPR_STR_COL_LE_CONST, EXPR_STR_COL_LT_COL,
-    EXPR_STR_COL_LT_CONST,
+    EXPR_FCMP_NE, EXPR_FLOAT_ADD, EXPR_FLOAT_DIV, EXPR_FLOAT_MUL, EXPR_FLOAT_NEG, EXPR_FLOAT_SQRT, EXPR_FLOAT_SUB,
+    EXPR_INT_ADD, EXPR_INT_DIV, EXPR_INT_MOD, EXPR_INT_MUL, EXPR_INT_NEG, EXPR_INT_SUB, EXPR_INT_TO_FLOAT,
+    EXPR_IS_NOT_NULL, EXPR_IS_NULL, EXPR_LOAD_COL_FLOAT, EXPR_LOAD_COL_INT, EXPR_LOAD_CONST, EXPR_LOAD_NULL,
+    EXPR_SELECT, EXPR_STR_COL_EQ_COL, EXPR_STR_COL_EQ_CONST, EXPR_STR_COL_IN_CONST, EXPR_STR_COL_LE_COL,
+    EXPR_STR_COL_LE_CONST, EXPR_STR_COL_LIKE_CONST, EXPR_STR_COL_LT_COL, EXPR_STR_COL_LT_CONST,
 };
 
 /// A compiled expression program: a flat list of 4-word instructions
@@ -132,6 +132,10 @@ impl ExprBuilder {
         self.unary_op(EXPR_FLOAT_NEG, a)
     }
 
+    pub fn float_sqrt(&mut self, a: u32) -> u32 {
+        self.unary_op(EXPR_FLOAT_SQRT, a)
+    }
+
     // --- Integer comparison ---
 
     pub fn cmp_eq(&mut self, a: u32, b: u32) -> u32 {
@@ -273,6 +277,19 @@ impl ExprBuilder {
         self.binary_op(EXPR_STR_COL_LE_COL, col_a as u32, col_b as u32)
     }
 
+    /// `col LIKE pattern`, the pattern a string constant (`%`, `_`, `\` escape).
+    pub fn str_col_like_const(&mut self, col_idx: usize, const_idx: u32) -> u32 {
+        self.binary_op(EXPR_STR_COL_LIKE_CONST, col_idx as u32, const_idx)
+    }
+
+    /// `col IN (…)` over the `count` string constants starting at `first`. Both
+    /// indices must fit 16 bits.
+    pub fn str_col_in_consts(&mut self, col_idx: usize, first: u32, count: u32) -> u32 {
+        debug_assert!(first <= 0xFFFF && (1..=0xFFFF).contains(&count));
+        let run = gnitz_wire::encode_str_in_operands(first, count);
+        self.binary_op(EXPR_STR_COL_IN_CONST, col_idx as u32, run)
+    }
+
     pub fn build(self, result_reg: u32) -> ExprProgram {
         ExprProgram {
             num_regs: self.next_reg,
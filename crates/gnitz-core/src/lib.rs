@@ -14,18 +14,19 @@ pub use circuit::{
     ReduceOutKey, TableId,
 };
 pub use client::{
-    hidden_view_name, retraction_batch, GnitzClient, IndexMeta, InlineUniqueIndex, PlannedView, TxnBuffer,
+    chrome_trace_json, hidden_view_name, retraction_batch, GnitzClient, IndexMeta, InlineUniqueIndex, MemoryUsage,
+    MetricKind, MetricSample, OperatorProfile, PlannedView, ProfileAction, TraceSpan, TxnBuffer, ZoneStack,
     MAX_CHAIN_SEGMENTS,
 };
 pub use connection::{
     MultiScanResult, ScanResult, Session, COL_TAB, DEP_TAB, FIRST_USER_SCHEMA_ID, FIRST_USER_TABLE_ID, IDX_TAB,
-    SCHEMA_TAB, SEQ_TAB, TABLE_TAB, VIEW_TAB,
+    SCHEMA_TAB, SEQ_TAB, TABLE_TAB, VIEW_STATS_TAB, VIEW_TAB,
 };
 pub use error::ClientError;
 pub use expr::{ExprBuilder, ExprProgram};
 pub use gnitz_wire::{
-    index_key_types, pack_table_flags, table_flags_dist_prefix, validate_dist_prefix, validate_user_identifier, Cut,
-    PkColList, RangeDescriptor, FK_INDEX_INFIX,
+    index_key_types, pack_table_flags, table_flags_compaction, table_flags_dist_prefix, validate_dist_prefix,
+    validate_user_identifier, CompactionOptions, CompactionStrategy, Cut, PkColList, RangeDescriptor, FK_INDEX_INFIX,
 };
 pub use protocol::{
     batch_to_schema, decode_wal_block, encode_message_noschema_parts, encode_message_parts, encode_wal_block,
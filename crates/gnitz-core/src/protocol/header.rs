@@ -2,8 +2,8 @@ pub use gnitz_wire::{
     wire_flags_get_conflict_mode, wire_flags_get_index_version, wire_flags_get_schema_version,
     wire_flags_set_conflict_mode, wire_flags_set_index_version, wire_flags_set_schema_version, WireConflictMode,
     FLAG_ALLOCATE_INDEX_ID, FLAG_ALLOCATE_SCHEMA_ID, FLAG_ALLOCATE_SERIAL_RANGE, FLAG_ALLOCATE_TABLE_ID,
-    FLAG_CONTINUATION, FLAG_DDL_SYNC, FLAG_DDL_TXN, FLAG_EXCHANGE, FLAG_GET_INDICES, FLAG_HAS_DATA, FLAG_HAS_PK,
-    FLAG_HAS_SCHEMA, FLAG_PUSH, FLAG_PUSH_TXN, FLAG_SCAN_MULTI, FLAG_SEEK, FLAG_SEEK_BY_INDEX,
+    FLAG_CONTINUATION, FLAG_DDL_SYNC, FLAG_DDL_TXN, FLAG_EXCHANGE, FLAG_GET_INDICES, FLAG_GET_STATS, FLAG_HAS_DATA,
+    FLAG_HAS_PK, FLAG_HAS_SCHEMA, FLAG_PUSH, FLAG_PUSH_TXN, FLAG_SCAN_MULTI, FLAG_SEEK, FLAG_SEEK_BY_INDEX,
     FLAG_SEEK_BY_INDEX_RANGE, FLAG_SHUTDOWN, IPC_CONTROL_TID, MAX_COLUMNS, META_FLAG_HIDDEN, META_FLAG_IS_PK,
     META_FLAG_NULLABLE, META_FLAG_PK_POS_MASK, META_FLAG_PK_POS_SHIFT, SCAN_MULTI_MAX_RELATIONS, STATUS_ERROR,
     STATUS_NO_INDEX, STATUS_OK, STATUS_SCHEMA_MISMATCH, STATUS_TXN_CONFLICT, WAL_HEADER_SIZE as WAL_BLOCK_HEADER_SIZE,
@@ -13,7 +13,7 @@ pub use header::{
     wire_flags_set_conflict_mode, wire_flags_set_index_version, wire_flags_set_schema_version, Header,
     WireConflictMode, FLAG_ALLOCATE_INDEX_ID, FLAG_ALLOCATE_SCHEMA_ID, FLAG_ALLOCATE_SERIAL_RANGE,
     FLAG_ALLOCATE_TABLE_ID, FLAG_CONTINUATION, FLAG_DDL_SYNC, FLAG_DDL_TXN, FLAG_EXCHANGE, FLAG_GET_INDICES,
-    FLAG_HAS_DATA, FLAG_HAS_PK, FLAG_HAS_SCHEMA, FLAG_PUSH, FLAG_PUSH_TXN, FLAG_SCAN_MULTI, FLAG_SEEK,
+    FLAG_GET_STATS, FLAG_HAS_DATA, FLAG_HAS_PK, FLAG_HAS_SCHEMA, FLAG_PUSH, FLAG_PUSH_TXN, FLAG_SCAN_MULTI, FLAG_SEEK,
     FLAG_SEEK_BY_INDEX, FLAG_SEEK_BY_INDEX_RANGE, FLAG_SHUTDOWN, IPC_CONTROL_TID, MAX_COLUMNS, META_FLAG_IS_PK,
     META_FLAG_NULLABLE, SCAN_MULTI_MAX_RELATIONS, STATUS_ERROR, STATUS_NO_INDEX, STATUS_OK, STATUS_SCHEMA_MISMATCH,
     STATUS_TXN_CONFLICT, WAL_BLOCK_HEADER_SIZE,
@@ -503,7 +503,7 @@ pub(crate) fn recv_framed(sock_fd: RawFd, max_payload_len: usize) -> Result<Vec<
 /// length (`!= HELLO_ACK_PAYLOAD_LEN`) and surfaces the embedded error
 /// string.
 pub fn hello_handshake(t: &mut ClientTransport) -> Result<(u32, u64), ProtocolError> {
-    let payload = gnitz_wire::encode_hello_payload(gnitz_wire::WAL_FORMAT_VERSION as u16);
+    let payload = gnitz_wire::encode_hello_payload(gnitz_wire::WIRE_PROTOCOL_VERSION);
     t.send_framed(&payload)?;
 
     // ACK ⇒ 12 bytes, STATUS_ERROR control block ⇒ ≥ 248.
@@ -532,8 +532,15 @@ pub fn hello_handshake(t: &mut ClientTransport) -> Result<(u32, u64), ProtocolEr
     }
 
     // Not an ACK — the server sent a STATUS_ERROR control block. Surface
-    // the embedded error.
-    let msg = super::message::parse_response(&buf, None)?;
+    // the embedded error. A server on another wire version rejects the HELLO
+    // in its own control-block layout, which this client may not parse.
+    let msg = super::message::parse_response(&buf, None).map_err(|e| {
+        ProtocolError::DecodeError(format!(
+            "HELLO rejected with an unreadable reply ({e}); the server likely speaks \
+             a wire version other than {}",
+            gnitz_wire::WIRE_PROTOCOL_VERSION,
+        ))
+    })?;
     let err = msg.error_text.unwrap_or_else(|| "HELLO rejected".into());
     Err(ProtocolError::DecodeError(err))
 }
@@ -40,7 +40,9 @@ fn client_with_table(target: &str) -> (GnitzClient, String, u64, Schema) {
         ColumnDef::new("a", TypeCode::I64, false),
         ColumnDef::new("b", TypeCode::I64, false),
     ];
-    client.create_table(&sn, "t", &cols, &[0], true, false, 0, &[]).unwrap();
+    client
+        .create_table(&sn, "t", &cols, &[0], true, false, false, 0, Default::default(), &[])
+        .unwrap();
     let (tid, schema) = client.resolve_table_id(&sn, "t").unwrap();
     (client, sn, tid, schema)
 }
@@ -287,19 +289,25 @@ fn unix_and_tls_clients_share_a_table() {
 #[test]
 fn wire_version_mismatch_hello_gets_status_error() {
     let Some(srv) = ServerHandle::start_tls(1) else { return };
-    let mut t = ClientTransport::connect(&srv.tls_target()).unwrap();
-    let payload = gnitz_wire::encode_hello_payload(gnitz_wire::WAL_FORMAT_VERSION as u16 + 1);
-    t.send_framed(&payload).unwrap();
-    let buf = t.recv_framed(gnitz_wire::MAX_FRAME_PAYLOAD_CLIENT).unwrap();
-    let msg = parse_response(&buf, None).unwrap();
-    assert_eq!(msg.status, STATUS_ERROR);
-    let text = msg.error_text.unwrap_or_default();
-    assert!(
-        text.contains("version"),
-        "STATUS_ERROR must name the version mismatch, got: {text}"
-    );
-    // Clean close follows the error frame.
-    assert!(t.recv_framed(gnitz_wire::MAX_FRAME_PAYLOAD_CLIENT).is_err());
+    // A newer peer, and a pre-trace_id one (it sent the WAL format version, 6).
+    for version in [
+        gnitz_wire::WIRE_PROTOCOL_VERSION + 1,
+        gnitz_wire::WAL_FORMAT_VERSION as u16,
+    ] {
+        let mut t = ClientTransport::connect(&srv.tls_target()).unwrap();
+        let payload = gnitz_wire::encode_hello_payload(version);
+        t.send_framed(&payload).unwrap();
+        let buf = t.recv_framed(gnitz_wire::MAX_FRAME_PAYLOAD_CLIENT).unwrap();
+        let msg = parse_response(&buf, None).unwrap();
+        assert_eq!(msg.status, STATUS_ERROR);
+        let text = msg.error_text.unwrap_or_default();
+        assert!(
+            text.contains("version"),
+            "STATUS_ERROR must name the version mismatch, got: {text}"
+        );
+        // Clean close follows the error frame.
+        assert!(t.recv_framed(gnitz_wire::MAX_FRAME_PAYLOAD_CLIENT).is_err());
+    }
 }
 
 // ── 7. restart: fail fast, same port, fresh connect works ─────────────────
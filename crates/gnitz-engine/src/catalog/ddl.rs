@@ -210,8 +210,9 @@ impl CatalogEngine {
         let directory = table_dir(&self.base_dir, schema_name, table_name, tid);
         // This in-process test shortcut always builds partitioned, full-PK-distributed
         // tables (`replicated = false`, `k = 0` = default). REPLICATED and CLUSTER BY
-        // routing are exercised through the catalog hook / SQL planner, not here.
-        let flags = gnitz_wire::pack_table_flags(unique_pk, false, 0);
+        // routing are exercised through the catalog hook / SQL planner, not here,
+        // and so is the per-table compaction policy (leveled default).
+        let flags = gnitz_wire::pack_table_flags(unique_pk, false, false, 0, gnitz_wire::CompactionOptions::default());
 
         // Write columns first (table hook reads them via sys_columns)
         self.write_column_records(tid, OWNER_KIND_TABLE, col_defs)?;
@@ -386,12 +387,16 @@ impl CatalogEngine {
                 .is_none_or(|e| e.kind.recovery_source() != RecoverySource::SalReplay),
             "backfill_view on durable relation {vid}: would double-count loaded shards",
         );
+        // The compile attaches shared arrangements by the source fed first.
+        let source_ids = self.dag.get_source_ids(vid);
+        if let Some(&first) = source_ids.first() {
+            self.dag.backfill_source_begin(vid, first);
+        }
         if !self.dag.ensure_compiled(vid) {
             return;
         }
 
         let chunk_rows = self.ddl_scan_chunk_rows;
-        let source_ids = self.dag.get_source_ids(vid);
         for source_id in source_ids {
             // Feed the source chunk-wise through the incremental plan — the
             // normal delta push path, so the chunk sum equals the whole-batch
@@ -399,6 +404,7 @@ impl CatalogEngine {
             // while epochs ingest into the view family; the scanned source
             // itself is never written here.
             let Some(mut handle) = self.open_source_cursor(vid, source_id) else {
+                self.dag.backfill_source_done(vid, source_id);
                 continue;
             };
             let mut touched = false;
@@ -435,6 +441,7 @@ impl CatalogEngine {
             if touched {
                 self.dag.flush_view_or_abort(vid);
             }
+            self.dag.backfill_source_done(vid, source_id);
         }
 
         // execute_epoch clears deltas only at epoch start, so each chunk's
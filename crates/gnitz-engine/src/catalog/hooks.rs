@@ -320,6 +320,12 @@ impl CatalogEngine {
                 // Rides on the SchemaDescriptor so the write scatter, read gather,
                 // join co-partition analyzer, and bootstrap trim all see it.
                 let is_replicated = gnitz_wire::table_flags_replicated(flags);
+                // Append-only: the master's write gate rejects retractions, and
+                // the compiler picks insert-only operators for views over it.
+                let is_append_only = gnitz_wire::table_flags_append_only(flags);
+                // Per-table compaction policy (`WITH (compaction = …)`). Unknown
+                // strategy bytes decode as leveled, so no validation is needed.
+                let compaction = gnitz_wire::table_flags_compaction(flags);
 
                 // REPLICATED and a non-default CLUSTER BY prefix are mutually
                 // exclusive — a hash-distribution prefix is meaningless when every
@@ -343,7 +349,8 @@ impl CatalogEngine {
                 let directory = table_dir(&self.base_dir, &schema_name, &name, tid);
                 let tbl_schema = self
                     .build_schema_from_col_defs(&col_defs, pk.as_slice(), dist_prefix_len)
-                    .with_replicated(is_replicated);
+                    .with_replicated(is_replicated)
+                    .with_append_only(is_append_only);
 
                 // One kind drives the whole property bundle: durability and
                 // Pk-unique tagging.
@@ -357,9 +364,10 @@ impl CatalogEngine {
                 );
                 // Staged so that if Stage-A fails after the table directory
                 // is created, compensate_stage_a's drain removes it.
-                let pt = self.with_staged_dir(directory.clone(), |s| {
+                let mut pt = self.with_staged_dir(directory.clone(), |s| {
                     s.build_partitioned_storage(kind, &directory, &name, tid, tbl_schema, is_replicated)
                 })?;
+                pt.set_compaction_options(compaction);
 
                 fsync_dir(&schema_dir(&self.base_dir, &schema_name));
                 self.dag.register_table(
@@ -213,8 +213,21 @@ impl CatalogEngine {
         // cannot diverge on the weight-consolidation subtleties. The `.filter`
         // maps the cursor's `Some(empty)` ("in-range entries, none resolved")
         // back to this API's `None`.
+        let idx_cursor = ic.table_mut().open_cursor();
+        // A point lookup pinning every indexed column probes the index shards'
+        // key-prefix filters first: a value no run holds skips the seek and
+        // never opens the owner cursor.
+        if range.eq_vals().len() + 1 == ic.col_indices.as_slice().len()
+            && range.start == gnitz_wire::Cut::Before(range.start.value())
+            && range.end == gnitz_wire::Cut::After(range.start.value())
+        {
+            let span = ic.index_schema.leading_key_size(ic.col_indices.as_slice().len());
+            if !idx_cursor.may_contain_prefix(&start.pk_bytes()[..span]) {
+                return Ok((None, src_schema));
+            }
+        }
         let mut cur = BoundedIndexCursor::new(
-            ic.table_mut().open_cursor(),
+            idx_cursor,
             entry.handle.open_cursor(),
             start,
             end,
@@ -83,6 +83,10 @@ pub(crate) const SEQ_TAB_ID: i64 = gnitz_wire::SEQ_TAB as i64;
 pub(super) const CIRCUIT_NODES_TAB_ID: i64 = gnitz_wire::CIRCUIT_NODES_TAB as i64;
 pub(super) const CIRCUIT_EDGES_TAB_ID: i64 = gnitz_wire::CIRCUIT_EDGES_TAB as i64;
 pub(super) const CIRCUIT_NODE_COLUMNS_TAB_ID: i64 = gnitz_wire::CIRCUIT_NODE_COLUMNS_TAB as i64;
+/// Per-view freshness. Not a [`SysFamily`]: it has no store and no COL_TAB
+/// rows — the master assembles it on every scan, so it is read-only by
+/// construction.
+pub(crate) const VIEW_STATS_TAB_ID: i64 = gnitz_wire::VIEW_STATS_TAB as i64;
 
 // PK list encoding lives in gnitz-wire so the client and engine cannot
 // drift on the on-disk format. Re-export under the historical paths so
@@ -363,6 +367,9 @@ static SCHEMAS: [SchemaDescriptor; SysFamily::COUNT] = {
     arr
 };
 
+/// `VIEW_STATS_TAB`'s schema: PK `view_id`, every column a non-null U64.
+pub(crate) static VIEW_STATS_SCHEMA: SchemaDescriptor = from_wire_cols(gnitz_wire::VIEW_STATS_TAB_COLS, &[0]);
+
 // ---------------------------------------------------------------------------
 // PK packing helpers
 // ---------------------------------------------------------------------------
@@ -633,6 +640,16 @@ mod tests {
         }
     }
 
+    #[test]
+    fn view_stats_tab_is_a_computed_relation_not_a_family() {
+        // In the system id range (so scans take the system path) but with no
+        // store behind it: `scan_family` must never be asked for it.
+        assert!(VIEW_STATS_TAB_ID < FIRST_USER_TABLE_ID);
+        assert!(SysFamily::from_id(VIEW_STATS_TAB_ID).is_none());
+        assert_eq!(VIEW_STATS_SCHEMA.num_columns(), gnitz_wire::VIEW_STATS_TAB_COLS.len());
+        assert_eq!(VIEW_STATS_SCHEMA.pk_indices(), &[0]);
+    }
+
     #[test]
     fn pack_view_pk_at_rest_is_view_id_leading_opk() {
         // The at-rest OPK image (extend_pk → big-endian) is view_id_BE then
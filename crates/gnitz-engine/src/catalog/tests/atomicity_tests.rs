@@ -748,7 +748,7 @@ fn ddl_txn_hook_failure_negates_applied_not_enqueued() {
     engine.apply_and_enqueue_family(COL_TAB_ID, col_batch).unwrap();
 
     // REPLICATED + dist_prefix = 1: passes precheck, rejected by hook_table_register.
-    let flags = gnitz_wire::pack_table_flags(false, true, 1);
+    let flags = gnitz_wire::pack_table_flags(false, true, false, 1, Default::default());
     let table_batch = build_table_tab_row_flags(&dir, new_tid, pack_pk_cols(&[0]), "hooktbl", flags);
     engine
         .precheck_family(TABLE_TAB_ID, &table_batch)
@@ -157,6 +157,32 @@ impl CatalogEngine {
         Ok(())
     }
 
+    /// Append-only write gate, shared by the plain-push and transaction arms.
+    /// Returns the conflict mode a push to `table_id` must run under. For an
+    /// ordinary table that is `mode` unchanged. An append-only table accepts
+    /// only insertions of new keys: a batch carrying any retraction (DELETE,
+    /// UPDATE) is rejected, and the push is forced to `Error` mode so an insert
+    /// of an existing key fails as a duplicate instead of upserting — the
+    /// retraction `enforce_unique_pk` would otherwise emit.
+    pub(crate) fn append_only_push_mode(
+        &self,
+        table_id: i64,
+        batch: &Batch,
+        mode: gnitz_wire::WireConflictMode,
+    ) -> Result<gnitz_wire::WireConflictMode, String> {
+        let entry = self.table_entry(table_id)?;
+        if !entry.schema.append_only() {
+            return Ok(mode);
+        }
+        if (0..batch.count).any(|r| batch.get_weight(r) < 0) {
+            let (sn, tn) = self.get_qualified_name(table_id).unwrap_or(("?", "?"));
+            return Err(format!(
+                "table \"{sn}.{tn}\" is append-only: rows cannot be deleted or updated"
+            ));
+        }
+        Ok(gnitz_wire::WireConflictMode::Error)
+    }
+
     /// Validate unique index constraints (single-worker path).
     /// For each unique index on this table, checks that no positive-weight row
     /// in the batch introduces a duplicate index key.
@@ -8,8 +8,9 @@
 use std::cmp::Ordering;
 
 use super::program::{CmpOp, Instr, ResolvedProgram, StrOp};
+use super::strmatch::{LikeMatcher, StrInSet};
 use crate::foundation::codec::read_u64_le;
-use crate::schema::{compare_german_strings, PAYLOAD_MAPPING_PK_SENTINEL};
+use crate::schema::{compare_german_strings, german_string_content, PAYLOAD_MAPPING_PK_SENTINEL};
 use crate::storage::MemBatch;
 
 pub(in crate::expr) const MORSEL: usize = 256;
@@ -418,6 +419,99 @@ fn eval_str_col_vs_col(
     );
 }
 
+/// Shared frame of the LIKE and IN-list kernels over payload string column
+/// `pi_byte`: null bits from the column, then `decide` fills the morsel's 0/1
+/// lanes from its 16-byte cells (and the blob), then NULL rows are cleared.
+#[allow(clippy::too_many_arguments)]
+fn eval_str_pred(
+    scratch: &mut EvalScratch,
+    mb: &MemBatch,
+    prog: &ResolvedProgram,
+    dst: usize,
+    morsel_start: usize,
+    m: usize,
+    pi_byte: u8,
+    decide: impl FnOnce(&mut [i64], &[u8], &[u8]),
+) {
+    debug_assert!(
+        pi_byte != PAYLOAD_MAPPING_PK_SENTINEL,
+        "eval_str_pred: PK column is never a string",
+    );
+    let pi = pi_byte as usize;
+    fill_null_bits_mask(scratch, dst, mb.null_bmp(), morsel_start, m, 1u64 << pi);
+    let cells = &mb.col_data(pi, 16)[morsel_start * 16..(morsel_start + m) * 16];
+    let base_d = dst * MORSEL;
+    decide(&mut scratch.regs[base_d..base_d + m], cells, mb.blob);
+    zero_null_rows(scratch, dst, m);
+    maybe_pack_bool_bits(scratch, prog, dst, m);
+}
+
+/// LIKE in two passes: every row is screened on its cell alone (length and
+/// inline prefix, see `CellScreen`) in a branch-free loop, then only the
+/// survivors whose pattern needs it read their content.
+#[allow(clippy::too_many_arguments)]
+fn eval_str_like(
+    scratch: &mut EvalScratch,
+    mb: &MemBatch,
+    prog: &ResolvedProgram,
+    dst: usize,
+    morsel_start: usize,
+    m: usize,
+    pi_byte: u8,
+    pat: &LikeMatcher,
+) {
+    let screen = pat.screen();
+    let verify = pat.needs_content();
+    eval_str_pred(
+        scratch,
+        mb,
+        prog,
+        dst,
+        morsel_start,
+        m,
+        pi_byte,
+        |lanes, cells, blob| {
+            for (lane, cell) in lanes.iter_mut().zip(cells.chunks_exact(16)) {
+                *lane = screen.pass(cell) as i64;
+            }
+            if verify {
+                for (lane, cell) in lanes.iter_mut().zip(cells.chunks_exact(16)) {
+                    if *lane != 0 {
+                        *lane = pat.matches(german_string_content(cell, blob)) as i64;
+                    }
+                }
+            }
+        },
+    );
+}
+
+#[allow(clippy::too_many_arguments)]
+fn eval_str_in(
+    scratch: &mut EvalScratch,
+    mb: &MemBatch,
+    prog: &ResolvedProgram,
+    dst: usize,
+    morsel_start: usize,
+    m: usize,
+    pi_byte: u8,
+    set: &StrInSet,
+) {
+    eval_str_pred(
+        scratch,
+        mb,
+        prog,
+        dst,
+        morsel_start,
+        m,
+        pi_byte,
+        |lanes, cells, blob| {
+            for (lane, cell) in lanes.iter_mut().zip(cells.chunks_exact(16)) {
+                *lane = set.contains(cell, blob) as i64;
+            }
+        },
+    );
+}
+
 /// Reinterpret a register's raw i64 bits as the `f64` they encode, and back.
 /// `#[inline(always)]` so each use folds into its per-row loop with no call,
 /// keeping every float arm branch-free and vectorizable.
@@ -705,6 +799,17 @@ pub(in crate::expr) fn eval_batch(
                 null_copy1(scratch, dst, ai, m);
                 maybe_pack_bool_bits(scratch, prog, dst, m);
             }
+            Instr::FloatSqrt { dst, a } => {
+                let dst = dst as usize;
+                let ai = a as usize;
+                let base_a = ai * MORSEL;
+                let base_d = dst * MORSEL;
+                for i in 0..m {
+                    scratch.regs[base_d + i] = encode_f64(decode_f64(scratch.regs[base_a + i]).sqrt());
+                }
+                null_copy1(scratch, dst, ai, m);
+                maybe_pack_bool_bits(scratch, prog, dst, m);
+            }
 
             // ----------------------------------------------------------------
             // Integer comparisons
@@ -968,6 +1073,14 @@ pub(in crate::expr) fn eval_batch(
                     }),
                 }
             }
+            Instr::StrColLike { dst, pi, pat } => {
+                let pat = &prog.like_pats[pat as usize];
+                eval_str_like(scratch, mb, prog, dst as usize, morsel_start, m, pi, pat);
+            }
+            Instr::StrColIn { dst, pi, set } => {
+                let set = &prog.in_sets[set as usize];
+                eval_str_in(scratch, mb, prog, dst as usize, morsel_start, m, pi, set);
+            }
         }
     }
 }
@@ -0,0 +1,406 @@
+//! Compile-time constant folding and predicate simplification over a
+//! `LogicalProgram`, run once per view node before `ScalarFunc` resolution.
+//!
+//! The SQL binder already skips a filter that is literally `TRUE`, but mark
+//! builders, `IS [NOT] NULL` over NOT NULL columns, and CASE lowering leave
+//! constants nested inside AND/OR/NOT/CASE, and every such instruction is
+//! otherwise re-evaluated per morsel. The pass is one forward sweep — fold
+//! instructions whose operands are all known, short-circuit AND/OR/CASE on a
+//! known operand by forwarding reads to the surviving register — then one
+//! backward liveness sweep that drops whatever no longer reaches
+//! `result_reg` or an `Emit`. Folded values follow `batch.rs` exactly:
+//! wrapping integer ops, NULL on a zero divisor, Kleene AND/OR.
+
+use super::program::{CmpOp, LogicalInstr, LogicalProgram, MAX_REGS};
+use crate::schema::{type_code, SchemaDescriptor};
+
+/// What [`LogicalProgram::fold`] changed: instructions replaced by a constant,
+/// instructions bypassed by an identity or short-circuit, and instructions
+/// removed as dead.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub struct FoldStats {
+    pub folded: u32,
+    pub simplified: u32,
+    pub dead: u32,
+}
+
+impl FoldStats {
+    pub fn add(&mut self, o: FoldStats) {
+        self.folded += o.folded;
+        self.simplified += o.simplified;
+        self.dead += o.dead;
+    }
+}
+
+/// A register's compile-time value: unknown, a constant bit pattern, or NULL.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+enum Known {
+    Unknown,
+    Const(i64),
+    Null,
+}
+
+/// Per-instruction outcome of the forward sweep.
+enum Step {
+    Keep,
+    Value(Known),
+    /// `dst` is always equal (value and null bit) to this register.
+    Alias(u16),
+}
+
+#[inline]
+fn bit(r: u16) -> u64 {
+    1u64 << r
+}
+
+#[inline]
+fn f(v: i64) -> f64 {
+    f64::from_bits(v as u64)
+}
+
+#[inline]
+fn fbits(x: f64) -> i64 {
+    x.to_bits() as i64
+}
+
+fn cmp<T: PartialOrd>(op: CmpOp, x: T, y: T) -> i64 {
+    (match op {
+        CmpOp::Eq => x == y,
+        CmpOp::Ne => x != y,
+        CmpOp::Gt => x > y,
+        CmpOp::Ge => x >= y,
+        CmpOp::Lt => x < y,
+        CmpOp::Le => x <= y,
+    }) as i64
+}
+
+impl LogicalInstr {
+    /// The register this instruction writes, if any.
+    fn dst(&self) -> Option<u16> {
+        use LogicalInstr::*;
+        match *self {
+            LoadColInt { dst, .. }
+            | LoadColFloat { dst, .. }
+            | LoadConst { dst, .. }
+            | IntAdd { dst, .. }
+            | IntSub { dst, .. }
+            | IntMul { dst, .. }
+            | IntDiv { dst, .. }
+            | IntMod { dst, .. }
+            | IntNeg { dst, .. }
+            | FloatAdd { dst, .. }
+            | FloatSub { dst, .. }
+            | FloatMul { dst, .. }
+            | FloatDiv { dst, .. }
+            | FloatNeg { dst, .. }
+            | FloatSqrt { dst, .. }
+            | Cmp { dst, .. }
+            | FCmp { dst, .. }
+            | IntToFloat { dst, .. }
+            | Select { dst, .. }
+            | LoadNull { dst }
+            | BoolAnd { dst, .. }
+            | BoolOr { dst, .. }
+            | BoolNot { dst, .. }
+            | IsNull { dst, .. }
+            | IsNotNull { dst, .. }
+            | StrColConst { dst, .. }
+            | StrColCol { dst, .. }
+            | StrColLike { dst, .. }
+            | StrColIn { dst, .. } => Some(dst),
+            CopyCol { .. } | Emit { .. } => None,
+        }
+    }
+
+    /// This instruction with every register it reads passed through `m`.
+    fn map_reads(mut self, mut m: impl FnMut(u16) -> u16) -> Self {
+        use LogicalInstr::*;
+        match &mut self {
+            IntAdd { a, b, .. }
+            | IntSub { a, b, .. }
+            | IntMul { a, b, .. }
+            | IntDiv { a, b, .. }
+            | IntMod { a, b, .. }
+            | FloatAdd { a, b, .. }
+            | FloatSub { a, b, .. }
+            | FloatMul { a, b, .. }
+            | FloatDiv { a, b, .. }
+            | Cmp { a, b, .. }
+            | FCmp { a, b, .. }
+            | BoolAnd { a, b, .. }
+            | BoolOr { a, b, .. } => {
+                *a = m(*a);
+                *b = m(*b);
+            }
+            Select { cond, a, b, .. } => {
+                *cond = m(*cond);
+                *a = m(*a);
+                *b = m(*b);
+            }
+            IntNeg { a, .. } | FloatNeg { a, .. } | FloatSqrt { a, .. } | IntToFloat { a, .. } | BoolNot { a, .. } => {
+                *a = m(*a)
+            }
+            Emit { src, .. } => *src = m(*src),
+            LoadColInt { .. }
+            | LoadColFloat { .. }
+            | LoadConst { .. }
+            | LoadNull { .. }
+            | IsNull { .. }
+            | IsNotNull { .. }
+            | StrColConst { .. }
+            | StrColCol { .. }
+            | StrColLike { .. }
+            | StrColIn { .. }
+            | CopyCol { .. } => {}
+        }
+        self
+    }
+
+    /// Whether the result is always 0, 1, or NULL.
+    fn is_boolean(&self) -> bool {
+        use LogicalInstr::*;
+        match *self {
+            LoadConst { val, .. } => val == 0 || val == 1,
+            Cmp { .. }
+            | FCmp { .. }
+            | BoolAnd { .. }
+            | BoolOr { .. }
+            | BoolNot { .. }
+            | IsNull { .. }
+            | IsNotNull { .. }
+            | StrColConst { .. }
+            | StrColCol { .. }
+            | StrColLike { .. }
+            | StrColIn { .. } => true,
+            _ => false,
+        }
+    }
+}
+
+impl LogicalProgram {
+    /// Fold constants, simplify, and drop dead instructions in place. `schema`
+    /// is the input schema the program validated against; `is_filter` roots
+    /// liveness at `result_reg` (a map's `result_reg` is unused). The program
+    /// still validates afterwards and evaluates identically on every row.
+    pub(crate) fn fold(&mut self, schema: &SchemaDescriptor, is_filter: bool) -> FoldStats {
+        let mut stats = FoldStats::default();
+        if self.num_regs == 0 {
+            return stats;
+        }
+        // An alias target must keep its value for the rest of the program.
+        let mut last_write = [0usize; MAX_REGS];
+        for (i, li) in self.instrs.iter().enumerate() {
+            if let Some(d) = li.dst() {
+                last_write[d as usize] = i;
+            }
+        }
+        let mut known = [Known::Unknown; MAX_REGS];
+        let mut alias: [u16; MAX_REGS] = std::array::from_fn(|r| r as u16);
+        // Mirrors `resolve`'s per-register U64 tracking, so folded compares and
+        // divisions pick the variant the evaluator would have.
+        let mut unsigned = 0u64;
+        let mut boolean = 0u64;
+
+        for i in 0..self.instrs.len() {
+            let li = self.instrs[i].map_reads(|r| alias[r as usize]);
+            self.instrs[i] = li;
+            let Some(dst) = li.dst() else { continue };
+            let k = move |r: u16| known[r as usize];
+            let u = move |r: u16| unsigned & bit(r) != 0;
+            let is_bool = move |r: u16| boolean & bit(r) != 0;
+            let step = self.fold_step(li, schema, &k, &u, &is_bool);
+
+            let d = dst as usize;
+            alias[d] = dst;
+            let prev_unsigned = u(dst);
+            match step {
+                // `x != dst` (validate forbids it for AND/OR/Select), so a last
+                // write at or before `i` means none follows.
+                Step::Alias(x) if last_write[x as usize] <= i => {
+                    stats.simplified += 1;
+                    alias[d] = x;
+                    known[d] = known[x as usize];
+                    boolean = (boolean & !bit(dst)) | if is_bool(x) { bit(dst) } else { 0 };
+                    unsigned = (unsigned & !bit(dst)) | if u(x) { bit(dst) } else { 0 };
+                    continue;
+                }
+                Step::Value(v @ (Known::Const(_) | Known::Null)) => {
+                    if !matches!(li, LogicalInstr::LoadConst { .. } | LogicalInstr::LoadNull { .. }) {
+                        self.instrs[i] = match v {
+                            Known::Const(val) => LogicalInstr::LoadConst { dst, val },
+                            _ => LogicalInstr::LoadNull { dst },
+                        };
+                        stats.folded += 1;
+                    }
+                    known[d] = v;
+                }
+                _ => known[d] = Known::Unknown,
+            }
+            let now = self.instrs[i];
+            boolean = if now.is_boolean() {
+                boolean | bit(dst)
+            } else {
+                boolean & !bit(dst)
+            };
+            let now_unsigned = match now {
+                LogicalInstr::LoadColInt { col, .. } => schema.columns[col as usize].type_code == type_code::U64,
+                LogicalInstr::IntAdd { a, b, .. }
+                | LogicalInstr::IntSub { a, b, .. }
+                | LogicalInstr::IntMul { a, b, .. }
+                | LogicalInstr::IntDiv { a, b, .. }
+                | LogicalInstr::IntMod { a, b, .. }
+                | LogicalInstr::Select { a, b, .. } => u(a) || u(b),
+                LogicalInstr::IntNeg { a, .. } => u(a),
+                LogicalInstr::LoadColFloat { .. }
+                | LogicalInstr::LoadConst { .. }
+                | LogicalInstr::LoadNull { .. }
+                | LogicalInstr::Cmp { .. }
+                | LogicalInstr::IntToFloat { .. } => false,
+                // `resolve` leaves the tracked type of every other writer as is.
+                _ => prev_unsigned,
+            };
+            unsigned = (unsigned & !bit(dst)) | if now_unsigned { bit(dst) } else { 0 };
+        }
+
+        self.result_reg = alias[self.result_reg as usize] as u32;
+        stats.dead = self.eliminate_dead(is_filter);
+        debug_assert_eq!(self.validate(Some(schema), None), Ok(()));
+        stats
+    }
+
+    /// The outcome for one instruction whose reads are already forwarded.
+    fn fold_step(
+        &self,
+        li: LogicalInstr,
+        schema: &SchemaDescriptor,
+        k: &impl Fn(u16) -> Known,
+        u: &impl Fn(u16) -> bool,
+        is_bool: &impl Fn(u16) -> bool,
+    ) -> Step {
+        use Known::*;
+        use LogicalInstr as L;
+        let c = |v: i64| Step::Value(Const(v));
+        // Any NULL operand makes an arithmetic or compare result NULL.
+        let bin = |a: u16, b: u16, op: &dyn Fn(i64, i64) -> Known| match (k(a), k(b)) {
+            (Null, _) | (_, Null) => Step::Value(Null),
+            (Const(x), Const(y)) => Step::Value(op(x, y)),
+            _ => Step::Keep,
+        };
+        let un = |a: u16, op: &dyn Fn(i64) -> i64| match k(a) {
+            Null => Step::Value(Null),
+            Const(x) => c(op(x)),
+            Unknown => Step::Keep,
+        };
+        match li {
+            L::LoadConst { val, .. } => c(val),
+            L::LoadNull { .. } => Step::Value(Null),
+            L::IntAdd { a, b, .. } => bin(a, b, &|x, y| Const(x.wrapping_add(y))),
+            L::IntSub { a, b, .. } => bin(a, b, &|x, y| Const(x.wrapping_sub(y))),
+            L::IntMul { a, b, .. } => bin(a, b, &|x, y| Const(x.wrapping_mul(y))),
+            L::IntDiv { a, b, .. } | L::IntMod { a, b, .. } => {
+                let is_div = matches!(li, L::IntDiv { .. });
+                let unsigned = u(a) || u(b);
+                bin(a, b, &|x, y| match (y, unsigned, is_div) {
+                    (0, ..) => Null,
+                    (_, false, true) => Const(x.wrapping_div(y)),
+                    (_, false, false) => Const(x.wrapping_rem(y)),
+                    (_, true, true) => Const(((x as u64) / (y as u64)) as i64),
+                    (_, true, false) => Const(((x as u64) % (y as u64)) as i64),
+                })
+            }
+            L::IntNeg { a, .. } => un(a, &|x| x.wrapping_neg()),
+            L::FloatAdd { a, b, .. } => bin(a, b, &|x, y| Const(fbits(f(x) + f(y)))),
+            L::FloatSub { a, b, .. } => bin(a, b, &|x, y| Const(fbits(f(x) - f(y)))),
+            L::FloatMul { a, b, .. } => bin(a, b, &|x, y| Const(fbits(f(x) * f(y)))),
+            L::FloatDiv { a, b, .. } => bin(a, b, &|x, y| {
+                if f(y) == 0.0 {
+                    Null
+                } else {
+                    Const(fbits(f(x) / f(y)))
+                }
+            }),
+            L::FloatNeg { a, .. } => un(a, &|x| fbits(-f(x))),
+            L::FloatSqrt { a, .. } => un(a, &|x| fbits(f(x).sqrt())),
+            L::IntToFloat { a, .. } => {
+                let unsigned = u(a);
+                un(a, &|x| fbits(if unsigned { x as u64 as f64 } else { x as f64 }))
+            }
+            L::Cmp { op, a, b, .. } => {
+                let unsigned = !matches!(op, CmpOp::Eq | CmpOp::Ne) && (u(a) || u(b));
+                bin(a, b, &|x, y| {
+                    Const(if unsigned {
+                        cmp(op, x as u64, y as u64)
+                    } else {
+                        cmp(op, x, y)
+                    })
+                })
+            }
+            L::FCmp { op, a, b, .. } => bin(a, b, &|x, y| Const(cmp(op, f(x), f(y)))),
+            L::BoolNot { a, .. } => un(a, &|x| (x == 0) as i64),
+            L::BoolAnd { a, b, .. } | L::BoolOr { a, b, .. } => {
+                let or = matches!(li, L::BoolOr { .. });
+                // The dominating operand decides alone; the identity operand
+                // leaves the other side, which must already be 0/1/NULL.
+                let truth = |r: u16| match k(r) {
+                    Const(v) => Some(v != 0),
+                    _ => None,
+                };
+                match (truth(a), truth(b)) {
+                    (Some(x), _) | (_, Some(x)) if x == or => c(or as i64),
+                    (Some(_), Some(_)) => c(or as i64 ^ 1),
+                    (Some(_), None) if is_bool(b) => Step::Alias(b),
+                    (None, Some(_)) if is_bool(a) => Step::Alias(a),
+                    _ if k(a) == Null && k(b) == Null => Step::Value(Null),
+                    _ => Step::Keep,
+                }
+            }
+            L::Select { dst: _, cond, a, b } => {
+                let take = match k(cond) {
+                    Const(v) if v != 0 => a,
+                    Const(_) | Null => b,
+                    Unknown => return Step::Keep,
+                };
+                // `resolve` types the result U64 if either branch is; forwarding
+                // to the taken branch must not change what readers see.
+                if u(take) == (u(a) || u(b)) {
+                    Step::Alias(take)
+                } else {
+                    Step::Keep
+                }
+            }
+            L::IsNull { col, .. } if schema.columns[col as usize].nullable == 0 => c(0),
+            L::IsNotNull { col, .. } if schema.columns[col as usize].nullable == 0 => c(1),
+            _ => Step::Keep,
+        }
+    }
+
+    /// Drop every instruction whose result no later instruction, `Emit`, or
+    /// (for a filter) `result_reg` reads. Returns the number dropped.
+    fn eliminate_dead(&mut self, is_filter: bool) -> u32 {
+        let mut live = if is_filter { bit(self.result_reg as u16) } else { 0 };
+        let before = self.instrs.len();
+        let mut kept = Vec::with_capacity(before);
+        for li in self.instrs.drain(..).rev() {
+            if let Some(d) = li.dst() {
+                if live & bit(d) == 0 {
+                    continue;
+                }
+                live &= !bit(d);
+            }
+            li.map_reads(|r| {
+                live |= bit(r);
+                r
+            });
+            kept.push(li);
+        }
+        kept.reverse();
+        self.instrs = kept;
+        (before - self.instrs.len()) as u32
+    }
+
+    /// True when the program is a filter that passes every row: the whole
+    /// program is one non-zero constant into `result_reg`.
+    pub(crate) fn is_const_true(&self) -> bool {
+        matches!(self.instrs[..], [LogicalInstr::LoadConst { dst, val }] if dst as u32 == self.result_reg && val != 0)
+    }
+}
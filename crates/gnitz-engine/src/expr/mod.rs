@@ -1,6 +1,8 @@
 mod batch;
+mod fold;
 mod plan;
 mod program;
+mod strmatch;
 
 #[cfg(test)]
 mod tests;
@@ -8,6 +10,7 @@ mod tests;
 // The whole external surface: the VM/compiler builds a `LogicalProgram` from the
 // wire blob and hands it to a `ScalarFunc` (filter, map, or projection). The
 // resolved form and its instruction model never leave this module.
+pub use fold::FoldStats;
 pub use plan::ScalarFunc;
 pub use program::LogicalProgram;
 
@@ -7,17 +7,18 @@
 //! type: a missing or mis-routed opcode is a compile error, not a silent
 //! miscompute.
 
+use super::strmatch::{LikeMatcher, StrInSet};
 use crate::schema::{encode_german_string, ColumnLocator, SchemaDescriptor};
-// Wire opcodes (1–45) the client emits, matched as arms in `from_wire`. They are
+// Wire opcodes (1–47) the client emits, matched as arms in `from_wire`. They are
 // `pub const … : u32` in gnitz-wire, so a plain `use` binds them for pattern use.
 use gnitz_wire::{
     EXPR_BOOL_AND, EXPR_BOOL_NOT, EXPR_BOOL_OR, EXPR_CMP_EQ, EXPR_CMP_GE, EXPR_CMP_GT, EXPR_CMP_LE, EXPR_CMP_LT,
     EXPR_CMP_NE, EXPR_COPY_COL, EXPR_EMIT, EXPR_FCMP_EQ, EXPR_FCMP_GE, EXPR_FCMP_GT, EXPR_FCMP_LE, EXPR_FCMP_LT,
-    EXPR_FCMP_NE, EXPR_FLOAT_ADD, EXPR_FLOAT_DIV, EXPR_FLOAT_MUL, EXPR_FLOAT_NEG, EXPR_FLOAT_SUB, EXPR_INT_ADD,
-    EXPR_INT_DIV, EXPR_INT_MOD, EXPR_INT_MUL, EXPR_INT_NEG, EXPR_INT_SUB, EXPR_INT_TO_FLOAT, EXPR_IS_NOT_NULL,
-    EXPR_IS_NULL, EXPR_LOAD_COL_FLOAT, EXPR_LOAD_COL_INT, EXPR_LOAD_CONST, EXPR_LOAD_NULL, EXPR_SELECT,
-    EXPR_STR_COL_EQ_COL, EXPR_STR_COL_EQ_CONST, EXPR_STR_COL_LE_COL, EXPR_STR_COL_LE_CONST, EXPR_STR_COL_LT_COL,
-    EXPR_STR_COL_LT_CONST,
+    EXPR_FCMP_NE, EXPR_FLOAT_ADD, EXPR_FLOAT_DIV, EXPR_FLOAT_MUL, EXPR_FLOAT_NEG, EXPR_FLOAT_SQRT, EXPR_FLOAT_SUB,
+    EXPR_INT_ADD, EXPR_INT_DIV, EXPR_INT_MOD, EXPR_INT_MUL, EXPR_INT_NEG, EXPR_INT_SUB, EXPR_INT_TO_FLOAT,
+    EXPR_IS_NOT_NULL, EXPR_IS_NULL, EXPR_LOAD_COL_FLOAT, EXPR_LOAD_COL_INT, EXPR_LOAD_CONST, EXPR_LOAD_NULL,
+    EXPR_SELECT, EXPR_STR_COL_EQ_COL, EXPR_STR_COL_EQ_CONST, EXPR_STR_COL_IN_CONST, EXPR_STR_COL_LE_COL,
+    EXPR_STR_COL_LE_CONST, EXPR_STR_COL_LIKE_CONST, EXPR_STR_COL_LT_COL, EXPR_STR_COL_LT_CONST,
 };
 
 /// The register file is capped at 64: the BOOL_AND/BOOL_OR 3VL paths, the
@@ -36,6 +37,7 @@ pub(crate) enum ExprValidateErr {
     RegOutOfRange { reg: u16, num_regs: u32 },
     RegisterAliasing { dst: u16, a: u16, b: u16 },
     ConstIdxOutOfRange { const_idx: u32, n: usize },
+    EmptyInList,
     ColOutOfRange { col: u32, num_columns: usize },
     ColNotPayload { col: u32 },
     ColTooWideForRegister { col: u32, size: usize },
@@ -138,6 +140,10 @@ pub(crate) enum LogicalInstr {
         dst: u16,
         a: u16,
     },
+    FloatSqrt {
+        dst: u16,
+        a: u16,
+    },
     Cmp {
         op: CmpOp,
         dst: u16,
@@ -201,6 +207,19 @@ pub(crate) enum LogicalInstr {
         col_a: u32,
         col_b: u32,
     },
+    /// `col LIKE const_strings[const_idx]`.
+    StrColLike {
+        dst: u16,
+        col: u32,
+        const_idx: u32,
+    },
+    /// `col IN (const_strings[first .. first + count])`.
+    StrColIn {
+        dst: u16,
+        col: u32,
+        first: u32,
+        count: u32,
+    },
     CopyCol {
         src_col: u32,
         out: u32,
@@ -314,6 +333,10 @@ pub(in crate::expr) enum Instr {
         dst: u16,
         a: u16,
     },
+    FloatSqrt {
+        dst: u16,
+        a: u16,
+    },
     IntToFloat {
         dst: u16,
         a: u16,
@@ -365,6 +388,18 @@ pub(in crate::expr) enum Instr {
         pi_a: u8,
         pi_b: u8,
     },
+    /// LIKE against the program's `like_pats[pat]`, classified at resolve.
+    StrColLike {
+        dst: u16,
+        pi: u8,
+        pat: u32,
+    },
+    /// Membership in the program's hashed `in_sets[set]`.
+    StrColIn {
+        dst: u16,
+        pi: u8,
+        set: u32,
+    },
     /// Verbatim column copy into output payload slot `out`. `src` carries the
     /// PK-vs-payload distinction plus width/type — the one resolved-column
     /// record (`schema::ColumnLocator`) shared with the reduce/index paths.
@@ -383,10 +418,10 @@ pub(in crate::expr) enum Instr {
 // ---------------------------------------------------------------------------
 
 pub struct LogicalProgram {
-    instrs: Vec<LogicalInstr>,
-    num_regs: u32,
-    result_reg: u32,
-    const_strings: Vec<Vec<u8>>,
+    pub(in crate::expr) instrs: Vec<LogicalInstr>,
+    pub(in crate::expr) num_regs: u32,
+    pub(in crate::expr) result_reg: u32,
+    pub(in crate::expr) const_strings: Vec<Vec<u8>>,
 }
 
 impl LogicalProgram {
@@ -490,6 +525,7 @@ impl LogicalProgram {
                 EXPR_FLOAT_MUL => LogicalInstr::FloatMul { dst, a, b },
                 EXPR_FLOAT_DIV => LogicalInstr::FloatDiv { dst, a, b },
                 EXPR_FLOAT_NEG => LogicalInstr::FloatNeg { dst, a },
+                EXPR_FLOAT_SQRT => LogicalInstr::FloatSqrt { dst, a },
                 EXPR_CMP_EQ => cmp(CmpOp::Eq),
                 EXPR_CMP_NE => cmp(CmpOp::Ne),
                 EXPR_CMP_GT => cmp(CmpOp::Gt),
@@ -559,6 +595,20 @@ impl LogicalProgram {
                     col_a: q[2],
                     col_b: q[3],
                 },
+                EXPR_STR_COL_LIKE_CONST => LogicalInstr::StrColLike {
+                    dst,
+                    col: q[2],
+                    const_idx: q[3],
+                },
+                EXPR_STR_COL_IN_CONST => {
+                    let (first, count) = gnitz_wire::decode_str_in_operands(q[3]);
+                    LogicalInstr::StrColIn {
+                        dst,
+                        col: q[2],
+                        first: first as u32,
+                        count: count as u32,
+                    }
+                }
                 _ => return Err(ExprValidateErr::UnknownOpcode(op)),
             });
         }
@@ -610,6 +660,8 @@ impl LogicalProgram {
         let mut reg_tc = [0u8; MAX_REGS];
         let is_u64 = |tc: u8| tc == type_code::U64;
         let mut instrs = Vec::with_capacity(self.instrs.len());
+        let mut like_pats = Vec::new();
+        let mut in_sets = Vec::new();
         for li in self.instrs {
             match li {
                 L::LoadColInt { dst, col } => {
@@ -678,6 +730,7 @@ impl LogicalProgram {
                 L::FloatMul { dst, a, b } => instrs.push(I::FloatMul { dst, a, b }),
                 L::FloatDiv { dst, a, b } => instrs.push(I::FloatDiv { dst, a, b }),
                 L::FloatNeg { dst, a } => instrs.push(I::FloatNeg { dst, a }),
+                L::FloatSqrt { dst, a } => instrs.push(I::FloatSqrt { dst, a }),
                 L::Cmp { op, dst, a, b } => {
                     // EQ/NE are bit-identical signed/unsigned; ordered compares
                     // pick the unsigned form when either operand is U64.
@@ -755,6 +808,31 @@ impl LogicalProgram {
                         pi_b: schema.payload_mapping_byte(col_b as usize),
                     });
                 }
+                L::StrColLike { dst, col, const_idx } => {
+                    debug_assert!(
+                        !schema.is_pk_col(col as usize),
+                        "resolve: STR_COL_LIKE references PK column {col} (payload-only opcode)"
+                    );
+                    like_pats.push(LikeMatcher::compile(&self.const_strings[const_idx as usize]));
+                    instrs.push(I::StrColLike {
+                        dst,
+                        pi: schema.payload_mapping_byte(col as usize),
+                        pat: like_pats.len() as u32 - 1,
+                    });
+                }
+                L::StrColIn { dst, col, first, count } => {
+                    debug_assert!(
+                        !schema.is_pk_col(col as usize),
+                        "resolve: STR_COL_IN references PK column {col} (payload-only opcode)"
+                    );
+                    let members = &self.const_strings[first as usize..(first + count) as usize];
+                    in_sets.push(StrInSet::new(members.iter().map(Vec::as_slice)));
+                    instrs.push(I::StrColIn {
+                        dst,
+                        pi: schema.payload_mapping_byte(col as usize),
+                        set: in_sets.len() as u32 - 1,
+                    });
+                }
                 L::CopyCol { src_col, out } => {
                     // The source's location, width, and type — dropped from the wire
                     // `CopyCol` — resolve to the one canonical record.
@@ -782,6 +860,8 @@ impl LogicalProgram {
             result_reg: self.result_reg,
             const_cells,
             const_blob,
+            like_pats,
+            in_sets,
             no_nulls: false,
             bit_only_mask: 0,
             bool_input_mask: 0,
@@ -835,6 +915,15 @@ impl LogicalProgram {
             }
             Ok(())
         };
+        let check_const = |const_idx: u32| -> Result<(), E> {
+            if const_idx as usize >= self.const_strings.len() {
+                return Err(E::ConstIdxOutOfRange {
+                    const_idx,
+                    n: self.const_strings.len(),
+                });
+            }
+            Ok(())
+        };
         for instr in &self.instrs {
             match *instr {
                 // Binary register ops (the 13 opcodes `reg3` splits): bound every
@@ -870,7 +959,11 @@ impl LogicalProgram {
                     }
                 }
                 // Unary register readers that write dst.
-                L::IntNeg { dst, a } | L::FloatNeg { dst, a } | L::IntToFloat { dst, a } | L::BoolNot { dst, a } => {
+                L::IntNeg { dst, a }
+                | L::FloatNeg { dst, a }
+                | L::FloatSqrt { dst, a }
+                | L::IntToFloat { dst, a }
+                | L::BoolNot { dst, a } => {
                     check_reg(dst, num_regs)?;
                     check_reg(a, num_regs)?;
                 }
@@ -902,12 +995,7 @@ impl LogicalProgram {
                     dst, col, const_idx, ..
                 } => {
                     check_reg(dst, num_regs)?;
-                    if const_idx as usize >= self.const_strings.len() {
-                        return Err(E::ConstIdxOutOfRange {
-                            const_idx,
-                            n: self.const_strings.len(),
-                        });
-                    }
+                    check_const(const_idx)?;
                     check_col_payload(in_schema, col)?;
                 }
                 L::StrColCol { dst, col_a, col_b, .. } => {
@@ -915,6 +1003,20 @@ impl LogicalProgram {
                     check_col_payload(in_schema, col_a)?;
                     check_col_payload(in_schema, col_b)?;
                 }
+                L::StrColLike { dst, col, const_idx } => {
+                    check_reg(dst, num_regs)?;
+                    check_const(const_idx)?;
+                    check_col_payload(in_schema, col)?;
+                }
+                // The run's last index bounds the whole run.
+                L::StrColIn { dst, col, first, count } => {
+                    check_reg(dst, num_regs)?;
+                    if count == 0 {
+                        return Err(E::EmptyInList);
+                    }
+                    check_const(first + count - 1)?;
+                    check_col_payload(in_schema, col)?;
+                }
                 // dst-writers whose other operands are data / none.
                 L::LoadConst { dst, .. } | L::LoadNull { dst } => check_reg(dst, num_regs)?,
                 // CopyCol: any (payload or PK) source column, one output payload slot.
@@ -998,6 +1100,10 @@ pub(in crate::expr) struct ResolvedProgram {
     /// engine-wide `compare_german_strings`.
     pub(in crate::expr) const_cells: Vec<[u8; 16]>,
     pub(in crate::expr) const_blob: Vec<u8>,
+    /// Compiled LIKE patterns, indexed by `StrColLike::pat`.
+    pub(in crate::expr) like_pats: Vec<LikeMatcher>,
+    /// Hashed IN-lists, indexed by `StrColIn::set`.
+    pub(in crate::expr) in_sets: Vec<StrInSet>,
     /// True iff no instruction can produce a NULL against the schema this program
     /// was resolved against, so the evaluator skips null-bit tracking entirely.
     /// Resolved once — the answer is only meaningful for that one schema, since
@@ -1043,7 +1149,7 @@ fn each_reg_read(i: &Instr, mut f: impl FnMut(u16)) {
             f(a);
             f(b);
         }
-        IntNeg { a, .. } | FloatNeg { a, .. } | IntToFloat { a, .. } | BoolNot { a, .. } => f(a),
+        IntNeg { a, .. } | FloatNeg { a, .. } | FloatSqrt { a, .. } | IntToFloat { a, .. } | BoolNot { a, .. } => f(a),
         Emit { src, .. } => f(src),
         LoadPayloadInt { .. }
         | LoadPayloadFloat { .. }
@@ -1054,6 +1160,8 @@ fn each_reg_read(i: &Instr, mut f: impl FnMut(u16)) {
         | IsNotNull { .. }
         | StrColConst { .. }
         | StrColCol { .. }
+        | StrColLike { .. }
+        | StrColIn { .. }
         | CopyCol { .. } => {}
     }
 }
@@ -1167,7 +1275,12 @@ impl ResolvedProgram {
                     non_bool_read |= (1u64 << a) | (1u64 << b);
                 }
                 // Bool producers whose operands are payload columns, not regs.
-                StrColConst { dst, .. } | StrColCol { dst, .. } | IsNull { dst, .. } | IsNotNull { dst, .. } => {
+                StrColConst { dst, .. }
+                | StrColCol { dst, .. }
+                | StrColLike { dst, .. }
+                | StrColIn { dst, .. }
+                | IsNull { dst, .. }
+                | IsNotNull { dst, .. } => {
                     bool_produced |= 1u64 << dst;
                 }
                 // Binary bool consumers: producer + bool_input (not non_bool_read).
@@ -1181,7 +1294,7 @@ impl ResolvedProgram {
                     bool_input |= 1u64 << a;
                 }
                 // Unary register readers (non-bool).
-                IntNeg { a, .. } | FloatNeg { a, .. } | IntToFloat { a, .. } => {
+                IntNeg { a, .. } | FloatNeg { a, .. } | FloatSqrt { a, .. } | IntToFloat { a, .. } => {
                     non_bool_read |= 1u64 << a;
                 }
                 // Ternary select: `cond` is read as a boolean (its producer must
@@ -1239,7 +1352,11 @@ impl ResolvedProgram {
                 // LoadNull manufactures a NULL for every row — forces the nullable path.
                 LoadNull { .. } => return false,
                 // Column reads: null when the underlying column is nullable.
-                LoadPayloadInt { pi, .. } | LoadPayloadFloat { pi, .. } | StrColConst { pi, .. }
+                LoadPayloadInt { pi, .. }
+                | LoadPayloadFloat { pi, .. }
+                | StrColConst { pi, .. }
+                | StrColLike { pi, .. }
+                | StrColIn { pi, .. }
                     if nullable_payload(pi) =>
                 {
                     return false
@@ -1251,6 +1368,8 @@ impl ResolvedProgram {
                 | LoadPayloadFloat { .. }
                 | StrColConst { .. }
                 | StrColCol { .. }
+                | StrColLike { .. }
+                | StrColIn { .. }
                 | LoadPk { .. }
                 | LoadConst { .. }
                 | IntAdd { .. }
@@ -1261,6 +1380,7 @@ impl ResolvedProgram {
                 | FloatSub { .. }
                 | FloatMul { .. }
                 | FloatNeg { .. }
+                | FloatSqrt { .. }
                 | Cmp { .. }
                 | FCmp { .. }
                 | IntToFloat { .. }
@@ -0,0 +1,273 @@
+//! LIKE patterns and string IN-lists, compiled once at resolve into the forms
+//! the batch kernels in `batch.rs` run.
+//!
+//! Both lean on the 16-byte German-string cell: its first eight bytes are the
+//! length and a zero-padded 4-byte prefix, so most rows are decided — or
+//! rejected — without touching the blob. A LIKE pattern is classified into the
+//! cheapest matcher that decides it; exact, prefix, suffix, and substring
+//! patterns (the overwhelming majority) never backtrack, and only `_` or an
+//! interior `%` reaches the general matcher.
+
+use rustc_hash::{FxHashMap, FxHashSet};
+
+use crate::foundation::codec::read_u32_le;
+use crate::schema::SHORT_STRING_THRESHOLD;
+
+/// One LIKE pattern element. `One` is a single UTF-8 character, `Any` a run of
+/// zero or more.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(in crate::expr) enum LikeTok {
+    Byte(u8),
+    One,
+    Any,
+}
+
+/// A compiled LIKE pattern.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub(in crate::expr) enum LikeMatcher {
+    /// No wildcard: plain equality.
+    Exact(Vec<u8>),
+    /// `lit%`.
+    Prefix(Vec<u8>),
+    /// `%lit` (and the bare `%`, an empty suffix).
+    Suffix(Vec<u8>),
+    /// `%lit%`.
+    Contains(Vec<u8>),
+    General(Vec<LikeTok>),
+}
+
+/// The cell-only screen a kernel runs over every row before any content
+/// access: `len - min_len` (wrapping) must be `<= len_slack` — `0` demands an
+/// exact length, `u32::MAX - min_len` any length `>= min_len` — and the
+/// prefix word masked by `head_mask` must equal `head_want`. One compare each,
+/// no branch, so the loop vectorizes.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(in crate::expr) struct CellScreen {
+    pub(in crate::expr) min_len: u32,
+    pub(in crate::expr) len_slack: u32,
+    pub(in crate::expr) head_mask: u32,
+    pub(in crate::expr) head_want: u32,
+}
+
+impl CellScreen {
+    #[inline(always)]
+    pub(in crate::expr) fn pass(&self, cell: &[u8]) -> bool {
+        let len = read_u32_le(cell, 0);
+        let head = read_u32_le(cell, 4);
+        (len.wrapping_sub(self.min_len) <= self.len_slack) & (head & self.head_mask == self.head_want)
+    }
+}
+
+impl LikeMatcher {
+    /// Parse and classify `pattern`. `\` escapes the next byte (a trailing `\`
+    /// is literal); consecutive `%` collapse.
+    pub(in crate::expr) fn compile(pattern: &[u8]) -> Self {
+        use LikeTok::*;
+        let mut toks = Vec::with_capacity(pattern.len());
+        let mut it = pattern.iter().copied();
+        while let Some(b) = it.next() {
+            toks.push(match b {
+                b'%' if toks.last() == Some(&Any) => continue,
+                b'%' => Any,
+                b'_' => One,
+                b'\\' => Byte(it.next().unwrap_or(b'\\')),
+                _ => Byte(b),
+            });
+        }
+        let lead = toks.first() == Some(&Any);
+        let start = lead as usize;
+        let trail = toks.len() > start && toks.last() == Some(&Any);
+        let body: Option<Vec<u8>> = toks[start..toks.len() - trail as usize]
+            .iter()
+            .map(|t| match *t {
+                Byte(b) => Some(b),
+                One | Any => None,
+            })
+            .collect();
+        match (body, lead, trail) {
+            (Some(lit), false, false) => LikeMatcher::Exact(lit),
+            (Some(lit), false, true) => LikeMatcher::Prefix(lit),
+            (Some(lit), true, false) => LikeMatcher::Suffix(lit),
+            (Some(lit), true, true) => LikeMatcher::Contains(lit),
+            (None, ..) => LikeMatcher::General(toks),
+        }
+    }
+
+    /// The cell screen for this pattern. Exact and prefix patterns also check
+    /// the inline prefix — sound because every cell zero-pads it past the
+    /// string's length.
+    pub(in crate::expr) fn screen(&self) -> CellScreen {
+        let (min_len, exact, head) = match self {
+            LikeMatcher::Exact(lit) => (lit.len(), true, &lit[..lit.len().min(4)]),
+            LikeMatcher::Prefix(lit) => (lit.len(), false, &lit[..lit.len().min(4)]),
+            LikeMatcher::Suffix(lit) | LikeMatcher::Contains(lit) => (lit.len(), false, &[][..]),
+            // Every non-`%` element consumes at least one byte.
+            LikeMatcher::General(toks) => (toks.iter().filter(|t| **t != LikeTok::Any).count(), false, &[][..]),
+        };
+        let min_len = min_len.min(u32::MAX as usize) as u32;
+        let mut want = [0u8; 4];
+        want[..head.len()].copy_from_slice(head);
+        let head_mask = if head.len() == 4 {
+            u32::MAX
+        } else {
+            (1u32 << (8 * head.len())) - 1
+        };
+        CellScreen {
+            min_len,
+            len_slack: if exact { 0 } else { u32::MAX - min_len },
+            head_mask,
+            head_want: u32::from_le_bytes(want),
+        }
+    }
+
+    /// Whether a row that passed [`screen`](Self::screen) still needs its
+    /// content checked. Exact/prefix literals of at most four bytes are fully
+    /// decided by the prefix word; an empty suffix/substring by the length.
+    pub(in crate::expr) fn needs_content(&self) -> bool {
+        match self {
+            LikeMatcher::Exact(lit) | LikeMatcher::Prefix(lit) => lit.len() > 4,
+            LikeMatcher::Suffix(lit) | LikeMatcher::Contains(lit) => !lit.is_empty(),
+            LikeMatcher::General(_) => true,
+        }
+    }
+
+    /// Full match of `s` against the pattern.
+    pub(in crate::expr) fn matches(&self, s: &[u8]) -> bool {
+        match self {
+            LikeMatcher::Exact(lit) => s == &lit[..],
+            LikeMatcher::Prefix(lit) => s.starts_with(lit),
+            LikeMatcher::Suffix(lit) => s.ends_with(lit),
+            LikeMatcher::Contains(lit) => contains(s, lit),
+            LikeMatcher::General(toks) => like_general(toks, s),
+        }
+    }
+}
+
+/// Substring search: scan for the needle's first byte, then compare the rest.
+fn contains(hay: &[u8], needle: &[u8]) -> bool {
+    let Some((&first, rest)) = needle.split_first() else {
+        return true;
+    };
+    if hay.len() < needle.len() {
+        return false;
+    }
+    let last_start = hay.len() - needle.len();
+    let mut i = 0;
+    while let Some(p) = hay[i..=last_start].iter().position(|&b| b == first) {
+        let at = i + p;
+        if &hay[at + 1..at + needle.len()] == rest {
+            return true;
+        }
+        i = at + 1;
+    }
+    false
+}
+
+/// Byte length of the UTF-8 character starting at `s[0]` (1 for an invalid
+/// lead byte, so a BLOB still advances).
+#[inline]
+fn utf8_char_len(s: &[u8]) -> usize {
+    let lead = s[0];
+    let n = if lead < 0x80 {
+        1
+    } else if lead >= 0xF0 {
+        4
+    } else if lead >= 0xE0 {
+        3
+    } else if lead >= 0xC0 {
+        2
+    } else {
+        1
+    };
+    n.min(s.len())
+}
+
+/// Iterative wildcard match with single-star backtracking: on a mismatch,
+/// retry from the most recent `%`, letting it absorb one more character.
+/// Linear in practice, `O(|s| · |toks|)` worst case.
+fn like_general(toks: &[LikeTok], s: &[u8]) -> bool {
+    let (mut t, mut i) = (0, 0);
+    // (token index after the last `%`, string index it resumes from)
+    let mut star: Option<(usize, usize)> = None;
+    while i < s.len() {
+        match toks.get(t) {
+            Some(LikeTok::Byte(b)) if *b == s[i] => {
+                t += 1;
+                i += 1;
+                continue;
+            }
+            Some(LikeTok::One) => {
+                t += 1;
+                i += utf8_char_len(&s[i..]);
+                continue;
+            }
+            Some(LikeTok::Any) => {
+                t += 1;
+                star = Some((t, i));
+                continue;
+            }
+            _ => {}
+        }
+        match star {
+            Some((st, si)) => {
+                let ni = si + utf8_char_len(&s[si..]);
+                star = Some((st, ni));
+                t = st;
+                i = ni;
+            }
+            None => return false,
+        }
+    }
+    toks[t..].iter().all(|t| *t == LikeTok::Any)
+}
+
+/// A string IN-list, hashed on the cell. A member of at most
+/// `SHORT_STRING_THRESHOLD` bytes lives wholly in its cell, so one probe of the
+/// masked 16 cell bytes decides a short row; a long member is keyed by its
+/// length ‖ prefix and confirmed against the content.
+#[derive(Debug, Default)]
+pub(in crate::expr) struct StrInSet {
+    short: FxHashSet<u128>,
+    long: FxHashMap<u64, Vec<Vec<u8>>>,
+}
+
+/// The cell bytes a short string of `len` bytes occupies (length, then
+/// `len` content bytes), as a little-endian `u128` with the tail masked off.
+#[inline(always)]
+fn short_key(cell: &[u8], len: usize) -> u128 {
+    let v = u128::from_le_bytes(cell[..16].try_into().unwrap());
+    v & (u128::MAX >> (128 - 8 * (4 + len)))
+}
+
+impl StrInSet {
+    pub(in crate::expr) fn new<'a>(members: impl IntoIterator<Item = &'a [u8]>) -> Self {
+        let mut set = StrInSet::default();
+        for m in members {
+            let cell = crate::schema::encode_german_string(m, &mut Vec::new());
+            if m.len() <= SHORT_STRING_THRESHOLD {
+                set.short.insert(short_key(&cell, m.len()));
+            } else {
+                let head = u64::from_le_bytes(cell[..8].try_into().unwrap());
+                let bucket = set.long.entry(head).or_default();
+                if !bucket.iter().any(|b| b == m) {
+                    bucket.push(m.to_vec());
+                }
+            }
+        }
+        set
+    }
+
+    /// Membership of the string in `cell` (over `blob`).
+    #[inline]
+    pub(in crate::expr) fn contains(&self, cell: &[u8], blob: &[u8]) -> bool {
+        let len = read_u32_le(cell, 0) as usize;
+        if len <= SHORT_STRING_THRESHOLD {
+            return self.short.contains(&short_key(cell, len));
+        }
+        let head = u64::from_le_bytes(cell[..8].try_into().unwrap());
+        self.long.get(&head).is_some_and(|bucket| {
+            let s = crate::schema::german_string_content(cell, blob);
+            bucket.iter().any(|b| b == s)
+        })
+    }
+}
@@ -312,6 +312,42 @@ fn golden_float_div_zero_divisor_single_row() {
     );
 }
 
+#[test]
+fn float_sqrt_propagates_null_and_value() {
+    let schema = SchemaDescriptor::new(
+        &[
+            SchemaColumn::new(type_code::U64, 0),
+            SchemaColumn::new(type_code::F64, 1),
+        ],
+        &[0],
+    );
+    let mut b = Batch::with_schema(schema, 2);
+    for (pk, v, null) in [(1u128, 6.25f64, 0u64), (2, 0.0, 1)] {
+        b.extend_pk(pk);
+        b.extend_weight(&1i64.to_le_bytes());
+        b.extend_null_bmp(&null.to_le_bytes());
+        b.extend_col(0, &v.to_bits().to_le_bytes());
+        b.count += 1;
+    }
+    let mb = b.as_mem_batch();
+
+    let instrs = vec![
+        LogicalInstr::LoadColFloat { dst: 0, col: 1 },
+        LogicalInstr::FloatSqrt { dst: 1, a: 0 },
+    ];
+    let prog = LogicalProgram::new(instrs, 2, 1, vec![]).resolve(&schema, false);
+
+    let mut scratch = EvalScratch::default();
+    scratch.ensure_capacity(2, false, 2);
+    eval_batch(&prog, &mb, 0, 2, &mut scratch);
+    assert_eq!(f64::from_bits(scratch.regs[MORSEL] as u64), 2.5);
+    assert_eq!(
+        scratch.null_bits[NULL_WORDS_PER_REG] & 0b11,
+        0b10,
+        "a NULL operand stays NULL"
+    );
+}
+
 /// Build a 1-row batch with two nullable I64 columns plus a u64 PK.
 fn make_two_int_row(schema: &SchemaDescriptor, v1: i64, v2: i64, nulls: u64) -> Batch {
     let mut b = Batch::with_schema(*schema, 1);
@@ -459,6 +495,167 @@ fn golden_str_col_eq_const_null_row() {
     );
 }
 
+/// `[U64 pk, STRING nullable]` batch, one row per entry (`None` = NULL).
+fn str_rows(rows: &[Option<&str>]) -> (SchemaDescriptor, Batch) {
+    let schema = SchemaDescriptor::new(
+        &[
+            SchemaColumn::new(type_code::U64, 0),
+            SchemaColumn::new(type_code::STRING, 1),
+        ],
+        &[0],
+    );
+    let mut b = Batch::with_schema(schema, rows.len().max(1));
+    for (i, r) in rows.iter().enumerate() {
+        b.extend_pk(i as u128);
+        b.extend_weight(&1i64.to_le_bytes());
+        b.extend_null_bmp(&(r.is_none() as u64).to_le_bytes());
+        let gs = crate::test_support::german_string(r.unwrap_or("").as_bytes(), &mut b.blob);
+        b.extend_col(0, &gs);
+        b.count += 1;
+    }
+    (schema, b)
+}
+
+/// Rows of `b` passing the one-instruction filter `instr` over `consts`.
+fn passing_rows(schema: &SchemaDescriptor, b: &Batch, instr: LogicalInstr, consts: &[&str]) -> Vec<usize> {
+    use crate::expr::ScalarFunc;
+    let consts = consts.iter().map(|c| c.as_bytes().to_vec()).collect();
+    let func = ScalarFunc::from_predicate(LogicalProgram::new(vec![instr], 1, 0, consts), schema);
+    let mut out = Vec::new();
+    func.run_filter(&b.as_mem_batch(), b.count, |s, e| out.extend(s..e));
+    out
+}
+
+/// Reference LIKE over characters: `%`, `_`, `\` escape.
+fn like_reference(s: &[char], p: &[char]) -> bool {
+    match p.split_first() {
+        None => s.is_empty(),
+        Some(('%', rest)) => (0..=s.len()).any(|k| like_reference(&s[k..], rest)),
+        Some(('_', rest)) => !s.is_empty() && like_reference(&s[1..], rest),
+        Some(('\\', rest)) if !rest.is_empty() => s.first() == Some(&rest[0]) && like_reference(&s[1..], &rest[1..]),
+        Some((c, rest)) => s.first() == Some(c) && like_reference(&s[1..], rest),
+    }
+}
+
+/// Every LIKE kernel (exact, prefix, suffix, substring, general) agrees with a
+/// character-level reference across short, boundary-length (4, 12, 13), long,
+/// multi-byte, empty, and NULL cells, over several morsels.
+#[test]
+fn str_col_like_matches_reference() {
+    use super::super::strmatch::LikeMatcher;
+    let corpus = [
+        "",
+        "a",
+        "abc",
+        "abcd",
+        "abcdefghijkl",
+        "abcdefghijklm",
+        "xxabcdefghijklmnopxx",
+        "héllo wörld",
+        "100% pure",
+        "a_c",
+        "aXc",
+        "mid-mid-midpoint of a long string",
+        "suffix_tail",
+        "tail",
+    ];
+    // Cycle the corpus (and a NULL) across more than two morsels.
+    let rows: Vec<Option<&str>> = (0..3 * MORSEL + 5)
+        .map(|i| corpus.get(i % (corpus.len() + 1)).copied())
+        .collect();
+    let (schema, b) = str_rows(&rows);
+    for pat in [
+        "",
+        "abc",
+        "abcdefghijkl",
+        "ab%",
+        "abcdefghijklm%",
+        "%tail",
+        "%_tail",
+        "%mid%",
+        "%def%",
+        "%",
+        "%%",
+        "a_c",
+        "a%c",
+        "%a%b%",
+        "_",
+        "h_llo%",
+        "100\\%%",
+        "%\\_%",
+        "_bc%",
+        "%ö%",
+    ] {
+        let got = passing_rows(
+            &schema,
+            &b,
+            LogicalInstr::StrColLike {
+                dst: 0,
+                col: 1,
+                const_idx: 0,
+            },
+            &[pat],
+        );
+        let pc: Vec<char> = pat.chars().collect();
+        let want: Vec<usize> = rows
+            .iter()
+            .enumerate()
+            .filter(|(_, r)| r.is_some_and(|s| like_reference(&s.chars().collect::<Vec<_>>(), &pc)))
+            .map(|(i, _)| i)
+            .collect();
+        assert_eq!(got, want, "LIKE {pat:?} ({:?})", LikeMatcher::compile(pat.as_bytes()));
+    }
+}
+
+#[test]
+fn like_pattern_classification() {
+    use super::super::strmatch::LikeMatcher::{self, *};
+    let c = |p: &str| LikeMatcher::compile(p.as_bytes());
+    assert_eq!(c("abc"), Exact(b"abc".to_vec()));
+    assert_eq!(c("ab%"), Prefix(b"ab".to_vec()));
+    assert_eq!(c("ab%%"), Prefix(b"ab".to_vec()));
+    assert_eq!(c("%ab"), Suffix(b"ab".to_vec()));
+    assert_eq!(c("%"), Suffix(vec![]));
+    assert_eq!(c("%ab%"), Contains(b"ab".to_vec()));
+    assert_eq!(c("50\\%"), Exact(b"50%".to_vec()));
+    assert!(matches!(c("a_c"), General(_)));
+    assert!(matches!(c("a%c"), General(_)));
+    // A short exact/prefix literal is decided by the cell alone.
+    assert!(!c("abcd%").needs_content());
+    assert!(c("abcde%").needs_content());
+}
+
+/// The hashed IN-list: short members decided by the cell, long members that
+/// share a length and prefix with a non-member confirmed on content, NULL
+/// excluded.
+#[test]
+fn str_col_in_hashed_membership() {
+    let long_in = "long-member-string-one";
+    let long_out = "long-member-string-two";
+    let rows = [
+        Some("red"),
+        Some("blue"),
+        Some(""),
+        Some("abcdefghijkl"),
+        Some(long_in),
+        Some(long_out),
+        None,
+        Some("re"),
+        Some("redd"),
+    ];
+    let (schema, b) = str_rows(&rows);
+    let in_list = |first, count| LogicalInstr::StrColIn {
+        dst: 0,
+        col: 1,
+        first,
+        count,
+    };
+    let consts = ["unused", "red", "", "abcdefghijkl", long_in, "blue"];
+    assert_eq!(passing_rows(&schema, &b, in_list(1, 5), &consts), vec![0, 1, 2, 3, 4]);
+    // A sub-run of the pool.
+    assert_eq!(passing_rows(&schema, &b, in_list(1, 1), &consts), vec![0]);
+}
+
 #[test]
 fn golden_is_null_and_is_not_null_single_row() {
     use crate::expr::ScalarFunc;
@@ -1454,8 +1651,8 @@ fn and_chain_skip_bench() {
 }
 
 /// Regression guard for the shared German-string comparator on the
-/// `col <op> 'const'` filter loop — ~1M rows, non-nullable STRING, mixed
-/// short/long cells. `#[ignore]`; run release:
+/// `col <op> 'const'` filter loop, and for the LIKE and IN-list kernels — ~1M
+/// rows, non-nullable STRING, mixed short/long cells. `#[ignore]`; run release:
 ///   cargo test -p gnitz-engine --release str_const_filter_bench \
 ///       -- --ignored --nocapture --test-threads=1
 #[test]
@@ -1492,17 +1689,35 @@ fn str_const_filter_bench() {
     }
     let mb = batch.as_mem_batch();
 
-    for (name, op) in [("eq", StrOp::Eq), ("lt", StrOp::Lt)] {
-        let instrs = vec![LogicalInstr::StrColConst {
-            op,
-            dst: 0,
-            col: 1,
-            const_idx: 0,
-        }];
-        let func = ScalarFunc::from_predicate(
-            LogicalProgram::new(instrs, 1, 0, vec![b"match_target".to_vec()]),
-            &schema,
-        );
+    let cmp = |op| LogicalInstr::StrColConst {
+        op,
+        dst: 0,
+        col: 1,
+        const_idx: 0,
+    };
+    let like = LogicalInstr::StrColLike {
+        dst: 0,
+        col: 1,
+        const_idx: 0,
+    };
+    let in_list = LogicalInstr::StrColIn {
+        dst: 0,
+        col: 1,
+        first: 0,
+        count: 3,
+    };
+    let cases: [(&str, LogicalInstr, Vec<&[u8]>); 7] = [
+        ("eq", cmp(StrOp::Eq), vec![b"match_target"]),
+        ("lt", cmp(StrOp::Lt), vec![b"match_target"]),
+        ("like prefix", like, vec![b"match%"]),
+        ("like suffix", like, vec![b"%target"]),
+        ("like contains", like, vec![b"%number%"]),
+        ("like general", like, vec![b"%n_mber_1%"]),
+        ("in", in_list, vec![b"k3", b"match_target", b"k40"]),
+    ];
+    for (name, instr, consts) in cases {
+        let consts = consts.into_iter().map(<[u8]>::to_vec).collect();
+        let func = ScalarFunc::from_predicate(LogicalProgram::new(vec![instr], 1, 0, consts), &schema);
 
         // Warm-up, then report the FASTEST of many timed passes — the minimum
         // is robust against thermal throttling and scheduler noise, unlike a
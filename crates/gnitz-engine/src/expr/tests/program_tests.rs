@@ -1719,18 +1719,18 @@ fn wire_err(r: Result<LogicalProgram, ExprValidateErr>) -> ExprValidateErr {
 
 #[test]
 fn test_from_wire_rejects_unknown_opcode() {
-    // Valid opcodes are 1..=46; 0, 37/38/39, and every >= 47 are holes.
+    // Valid opcodes are 1..=47; 0, 38/39, and every >= 48 are holes.
     assert_eq!(
-        wire_err(LogicalProgram::from_wire(&[47, 0, 0, 0], 1, 0, vec![])),
-        ExprValidateErr::UnknownOpcode(47)
+        wire_err(LogicalProgram::from_wire(&[48, 0, 0, 0], 1, 0, vec![])),
+        ExprValidateErr::UnknownOpcode(48)
     );
     assert_eq!(
         wire_err(LogicalProgram::from_wire(&[0, 0, 0, 0], 1, 0, vec![])),
         ExprValidateErr::UnknownOpcode(0)
     );
     assert_eq!(
-        wire_err(LogicalProgram::from_wire(&[37, 0, 0, 0], 1, 0, vec![])),
-        ExprValidateErr::UnknownOpcode(37)
+        wire_err(LogicalProgram::from_wire(&[38, 0, 0, 0], 1, 0, vec![])),
+        ExprValidateErr::UnknownOpcode(38)
     );
     // A valid opcode lowers (control): LOAD_COL_INT dst0 col0.
     assert!(LogicalProgram::from_wire(&[1, 0, 0, 0], 1, 0, vec![]).is_ok());
@@ -1780,6 +1780,29 @@ fn test_from_wire_rejects_const_idx_out_of_range() {
     );
 }
 
+#[test]
+fn test_from_wire_str_in_list_run() {
+    let pool = || vec![b"a".to_vec(), b"b".to_vec()];
+    // STR_COL_IN_CONST (47) dst0 col1, run (first 0, count 2): in range.
+    let run = gnitz_wire::encode_str_in_operands(0, 2);
+    assert!(LogicalProgram::from_wire(&[47, 0, 1, run], 1, 0, pool()).is_ok());
+    // The run's last index overruns the pool.
+    let run = gnitz_wire::encode_str_in_operands(1, 2);
+    assert_eq!(
+        wire_err(LogicalProgram::from_wire(&[47, 0, 1, run], 1, 0, pool())),
+        ExprValidateErr::ConstIdxOutOfRange { const_idx: 2, n: 2 }
+    );
+    assert_eq!(
+        wire_err(LogicalProgram::from_wire(&[47, 0, 1, 0], 1, 0, pool())),
+        ExprValidateErr::EmptyInList
+    );
+    // STR_COL_LIKE_CONST (46) bounds its pattern index like the compares.
+    assert_eq!(
+        wire_err(LogicalProgram::from_wire(&[46, 0, 1, 5], 1, 0, pool())),
+        ExprValidateErr::ConstIdxOutOfRange { const_idx: 5, n: 2 }
+    );
+}
+
 #[test]
 fn test_validate_rejects_out_of_range_column() {
     // LOAD_COL_INT (1) col=200 against a 3-column schema.
@@ -1807,10 +1830,12 @@ fn test_validate_rejects_pk_column_for_payload_only_opcode() {
     );
     // Each payload-only opcode that routes a PK column to the pi=255 sentinel.
     let cases: &[(&[u32], Vec<Vec<u8>>)] = &[
-        (&[2, 0, 0, 0], vec![]),               // LOAD_COL_FLOAT col0
-        (&[30, 0, 0, 0], vec![]),              // IS_NULL col0
-        (&[40, 0, 0, 0], vec![b"x".to_vec()]), // STR_COL_EQ_CONST col0
-        (&[43, 0, 0, 1], vec![]),              // STR_COL_EQ_COL col_a=0
+        (&[2, 0, 0, 0], vec![]),                     // LOAD_COL_FLOAT col0
+        (&[30, 0, 0, 0], vec![]),                    // IS_NULL col0
+        (&[40, 0, 0, 0], vec![b"x".to_vec()]),       // STR_COL_EQ_CONST col0
+        (&[43, 0, 0, 1], vec![]),                    // STR_COL_EQ_COL col_a=0
+        (&[46, 0, 0, 0], vec![b"x".to_vec()]),       // STR_COL_LIKE_CONST col0
+        (&[47, 0, 0, 1 << 16], vec![b"x".to_vec()]), // STR_COL_IN_CONST col0
     ];
     for (code, consts) in cases {
         let prog = LogicalProgram::from_wire(code, 1, 0, consts.clone()).unwrap();
@@ -1873,3 +1898,192 @@ fn test_new_panics_on_aliased_register() {
     // A compiler-built (trusted) aliased-register program still panics from `new`.
     let _ = LogicalProgram::new(vec![LogicalInstr::IntAdd { dst: 0, a: 0, b: 1 }], 2, 0, vec![]);
 }
+
+/// Fold `instrs` as a filter over `schema`, then check it evaluates exactly as
+/// the unfolded program on every row of `batch` (the value under a NULL is
+/// unspecified and not compared). Returns the folded program's
+/// instructions and the stats.
+fn fold_equivalent(
+    schema: &SchemaDescriptor,
+    instrs: Vec<LogicalInstr>,
+    num_regs: u32,
+    result_reg: u32,
+    batch: &Batch,
+) -> (Vec<LogicalInstr>, crate::expr::FoldStats) {
+    let plain = make_prog(schema, instrs.clone(), num_regs, result_reg, vec![]);
+    let mut folded = LogicalProgram::new(instrs, num_regs, result_reg, vec![]);
+    let stats = folded.fold(schema, /* is_filter = */ true);
+    let out = folded.instrs.clone();
+    let folded = folded.resolve(schema, false);
+    let mb = batch.as_mem_batch();
+    for row in 0..batch.count {
+        let (want, want_null) = eval_predicate(&plain, &mb, row);
+        let (got, got_null) = eval_predicate(&folded, &mb, row);
+        assert_eq!(want_null, got_null, "row {row}");
+        if !want_null {
+            assert_eq!(want, got, "row {row}");
+        }
+    }
+    (out, stats)
+}
+
+#[test]
+fn test_fold_constant_arithmetic() {
+    let schema = make_schema(0, &[8, 9]);
+    let batch = make_int_batch(&schema, &[(1, 1, 0, &[5])]);
+    // (7 - 10) * 3 compared with col1: the arithmetic folds to one constant.
+    let instrs = vec![
+        LogicalInstr::LoadConst { dst: 0, val: 7 },
+        LogicalInstr::LoadConst { dst: 1, val: 10 },
+        LogicalInstr::IntSub { dst: 2, a: 0, b: 1 },
+        LogicalInstr::LoadConst { dst: 3, val: 3 },
+        LogicalInstr::IntMul { dst: 4, a: 2, b: 3 },
+        LogicalInstr::LoadColInt { dst: 5, col: 1 },
+        LogicalInstr::Cmp {
+            op: CmpOp::Gt,
+            dst: 6,
+            a: 5,
+            b: 4,
+        },
+    ];
+    let (out, stats) = fold_equivalent(&schema, instrs, 7, 6, &batch);
+    assert_eq!(out[0], LogicalInstr::LoadConst { dst: 4, val: -9 });
+    assert_eq!(out.len(), 3);
+    assert_eq!((stats.folded, stats.dead), (2, 4));
+
+    // A constant zero divisor folds to NULL, exactly as the evaluator marks it.
+    let instrs = vec![
+        LogicalInstr::LoadConst { dst: 0, val: 7 },
+        LogicalInstr::LoadConst { dst: 1, val: 0 },
+        LogicalInstr::IntDiv { dst: 2, a: 0, b: 1 },
+    ];
+    let (out, _) = fold_equivalent(&schema, instrs, 3, 2, &batch);
+    assert_eq!(out, vec![LogicalInstr::LoadNull { dst: 2 }]);
+}
+
+#[test]
+fn test_fold_boolean_short_circuits() {
+    // col1, col2 nullable; rows cover T/F/NULL for the compare.
+    let schema = make_schema(0, &[8, 9, 9]);
+    let batch = make_int_batch(&schema, &[(1, 1, 0, &[5, 0]), (2, 1, 0, &[1, 0]), (3, 1, 1, &[0, 0])]);
+    let cmp = LogicalInstr::Cmp {
+        op: CmpOp::Gt,
+        dst: 1,
+        a: 0,
+        b: 2,
+    };
+    let prefix = |tail: Vec<LogicalInstr>| {
+        let mut v = vec![
+            LogicalInstr::LoadColInt { dst: 0, col: 1 },
+            LogicalInstr::LoadConst { dst: 2, val: 3 },
+            cmp,
+        ];
+        v.extend(tail);
+        v
+    };
+
+    // x AND TRUE → x: the AND and its constant disappear.
+    let instrs = prefix(vec![
+        LogicalInstr::LoadConst { dst: 3, val: 1 },
+        LogicalInstr::BoolAnd { dst: 4, a: 1, b: 3 },
+    ]);
+    let (out, stats) = fold_equivalent(&schema, instrs, 5, 4, &batch);
+    assert_eq!(out.last(), Some(&cmp));
+    assert_eq!(stats.simplified, 1);
+
+    // x OR TRUE → TRUE: the whole filter passes every row.
+    let instrs = prefix(vec![
+        LogicalInstr::LoadConst { dst: 3, val: 1 },
+        LogicalInstr::BoolOr { dst: 4, a: 1, b: 3 },
+    ]);
+    let mut prog = LogicalProgram::new(instrs.clone(), 5, 4, vec![]);
+    prog.fold(&schema, true);
+    assert!(prog.is_const_true());
+    fold_equivalent(&schema, instrs, 5, 4, &batch);
+
+    // x AND NULL stays: it is FALSE or NULL depending on x.
+    let instrs = prefix(vec![
+        LogicalInstr::LoadNull { dst: 3 },
+        LogicalInstr::BoolAnd { dst: 4, a: 1, b: 3 },
+    ]);
+    let (out, stats) = fold_equivalent(&schema, instrs, 5, 4, &batch);
+    assert_eq!(out.len(), 5);
+    assert_eq!(stats, crate::expr::FoldStats::default());
+
+    // A non-boolean operand is not forwarded through AND TRUE (AND yields 0/1).
+    let instrs = vec![
+        LogicalInstr::LoadColInt { dst: 0, col: 1 },
+        LogicalInstr::LoadConst { dst: 1, val: 1 },
+        LogicalInstr::BoolAnd { dst: 2, a: 0, b: 1 },
+    ];
+    let (out, _) = fold_equivalent(&schema, instrs, 3, 2, &batch);
+    assert_eq!(out.len(), 3);
+}
+
+#[test]
+fn test_fold_is_null_and_select() {
+    use crate::schema::type_code;
+    // col1 NOT NULL, col2 nullable.
+    let schema = SchemaDescriptor::new(
+        &[
+            SchemaColumn::new(type_code::U64, 0),
+            SchemaColumn::new(type_code::I64, 0),
+            SchemaColumn::new(type_code::I64, 1),
+        ],
+        &[0],
+    );
+    let batch = make_int_batch(&schema, &[(1, 1, 0, &[4, 9]), (2, 1, 2, &[6, 0])]);
+    // CASE WHEN col1 IS NULL THEN col2 ELSE col1 END > 5
+    let instrs = vec![
+        LogicalInstr::IsNull { dst: 0, col: 1 },
+        LogicalInstr::LoadColInt { dst: 1, col: 2 },
+        LogicalInstr::LoadColInt { dst: 2, col: 1 },
+        LogicalInstr::Select {
+            dst: 3,
+            cond: 0,
+            a: 1,
+            b: 2,
+        },
+        LogicalInstr::LoadConst { dst: 4, val: 5 },
+        LogicalInstr::Cmp {
+            op: CmpOp::Gt,
+            dst: 5,
+            a: 3,
+            b: 4,
+        },
+    ];
+    let (out, stats) = fold_equivalent(&schema, instrs, 6, 5, &batch);
+    assert_eq!(
+        out,
+        vec![
+            LogicalInstr::LoadColInt { dst: 2, col: 1 },
+            LogicalInstr::LoadConst { dst: 4, val: 5 },
+            LogicalInstr::Cmp {
+                op: CmpOp::Gt,
+                dst: 5,
+                a: 2,
+                b: 4,
+            },
+        ]
+    );
+    assert_eq!((stats.folded, stats.simplified, stats.dead), (1, 1, 3));
+}
+
+#[test]
+fn test_fold_keeps_map_emits() {
+    let schema = make_schema(0, &[8, 9]);
+    // Map: EMIT(col1 + (2 * 3)); result_reg is unused by a map.
+    let instrs = vec![
+        LogicalInstr::LoadColInt { dst: 0, col: 1 },
+        LogicalInstr::LoadConst { dst: 1, val: 2 },
+        LogicalInstr::LoadConst { dst: 2, val: 3 },
+        LogicalInstr::IntMul { dst: 3, a: 1, b: 2 },
+        LogicalInstr::IntAdd { dst: 4, a: 0, b: 3 },
+        LogicalInstr::Emit { src: 4, out: 0 },
+    ];
+    let mut prog = LogicalProgram::new(instrs, 5, 0, vec![]);
+    let stats = prog.fold(&schema, false);
+    assert_eq!((stats.folded, stats.dead), (1, 2));
+    assert_eq!(prog.instrs[1], LogicalInstr::LoadConst { dst: 3, val: 6 });
+    assert_eq!(prog.instrs.len(), 4);
+}
@@ -0,0 +1,577 @@
+//! Server metrics: counters, gauges and latency histograms, one cache of plain
+//! atomics per process.
+//!
+//! The master maps a shared region of `1 + num_workers` [`Slot`]s before the
+//! fork and each forked worker rebinds to its own slot, so a worker's updates
+//! land where the master reads them — no IPC, no locks. Until `init_shared`
+//! runs (unit tests, standalone embedding) every update hits a static
+//! process-local slot. An update is one relaxed `fetch_add` (a histogram
+//! record four); reads are master-side only, on a GET_STATS request or a
+//! scrape, and tolerate the torn view a concurrent update can leave.
+//!
+//! Histograms are log-linear: four sub-buckets per power of two (≤ 25%
+//! relative error), 252 buckets covering the whole `u64` range.
+
+use std::sync::atomic::{AtomicI64, AtomicPtr, AtomicU64, AtomicUsize, Ordering::Relaxed};
+use std::time::Instant;
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(crate) enum Counter {
+    Ticks,
+    CommitBatches,
+    CommitRows,
+    Checkpoints,
+    Requests,
+    Connections,
+    RowsIngested,
+    Compactions,
+    CompactedBytes,
+}
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(crate) enum Gauge {
+    OpenConnections,
+    SalUsedBytes,
+    ViewLagLsn,
+    L0Runs,
+    ProfilerRunning,
+}
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(crate) enum Hist {
+    TickNs,
+    RequestNs,
+    CommitBatchRows,
+    FsyncNs,
+    DagEvalNs,
+    CompactionNs,
+}
+
+/// `(name, help)`, indexed by discriminant.
+const COUNTERS: [(&str, &str); 9] = [
+    ("ticks", "View maintenance ticks completed."),
+    ("commit_batches", "Commit zones written to the SAL."),
+    ("commit_rows", "Rows committed through the SAL."),
+    ("checkpoints", "Checkpoint sequences run."),
+    ("requests", "Client requests handled."),
+    ("connections", "Client connections accepted."),
+    ("rows_ingested", "Rows ingested into worker partitions."),
+    ("compactions", "LSM compactions finished."),
+    ("compacted_bytes", "Bytes written by LSM compactions."),
+];
+const GAUGES: [(&str, &str); 5] = [
+    ("open_connections", "Client connections currently open."),
+    ("sal_used_bytes", "Bytes of the shared append-only log in use."),
+    ("view_lag_lsn", "Published LSNs not yet reflected in views."),
+    ("l0_runs", "Unmerged L0 runs across all LSM tables."),
+    (
+        "profiler_running",
+        "1 while the CPU-zone profiler (and EXPLAIN ANALYZE counting) is on.",
+    ),
+];
+/// A `_ns` name marks a duration; the Prometheus renderer reports it in
+/// seconds.
+const HISTS: [(&str, &str); 6] = [
+    ("tick_ns", "View maintenance tick latency."),
+    ("request_ns", "Client request handling latency."),
+    ("commit_batch_rows", "Rows per committed SAL zone."),
+    ("fsync_ns", "SAL fdatasync wait."),
+    ("dag_eval_ns", "Worker DAG evaluation latency."),
+    ("compaction_ns", "L0 compaction latency."),
+];
+
+const NC: usize = COUNTERS.len();
+const NG: usize = GAUGES.len();
+const NH: usize = HISTS.len();
+const NB: usize = 252;
+
+/// Bucket of `v`: values below 4 are exact; above, the octave's top two bits
+/// below the leading one pick one of four sub-buckets.
+#[inline]
+fn bucket_of(v: u64) -> usize {
+    if v < 4 {
+        return v as usize;
+    }
+    let e = 63 - v.leading_zeros() as usize;
+    4 * (e - 1) + ((v >> (e - 2)) & 3) as usize
+}
+
+/// Smallest value that lands in bucket `b`.
+fn bucket_lower(b: usize) -> u64 {
+    if b < 4 {
+        return b as u64;
+    }
+    let (e, sub) = (b / 4 + 1, (b % 4) as u64);
+    (4 + sub) << (e - 2)
+}
+
+struct HistCells {
+    buckets: [AtomicU64; NB],
+    count: AtomicU64,
+    sum: AtomicU64,
+    max: AtomicU64,
+}
+
+impl HistCells {
+    const fn new() -> Self {
+        HistCells {
+            buckets: [const { AtomicU64::new(0) }; NB],
+            count: AtomicU64::new(0),
+            sum: AtomicU64::new(0),
+            max: AtomicU64::new(0),
+        }
+    }
+}
+
+/// One process's metrics. All-zero bytes are a valid empty slot, which is what
+/// a fresh shared mapping reads as.
+#[repr(C)]
+pub(crate) struct Slot {
+    counters: [AtomicU64; NC],
+    gauges: [AtomicI64; NG],
+    hists: [HistCells; NH],
+}
+
+impl Slot {
+    pub(crate) const fn new() -> Self {
+        Slot {
+            counters: [const { AtomicU64::new(0) }; NC],
+            gauges: [const { AtomicI64::new(0) }; NG],
+            hists: [const { HistCells::new() }; NH],
+        }
+    }
+
+    #[inline]
+    fn add(&self, c: Counter, n: u64) {
+        self.counters[c as usize].fetch_add(n, Relaxed);
+    }
+
+    #[inline]
+    fn gauge_add(&self, g: Gauge, d: i64) {
+        self.gauges[g as usize].fetch_add(d, Relaxed);
+    }
+
+    #[inline]
+    fn record(&self, h: Hist, v: u64) {
+        let cells = &self.hists[h as usize];
+        cells.buckets[bucket_of(v)].fetch_add(1, Relaxed);
+        cells.count.fetch_add(1, Relaxed);
+        cells.sum.fetch_add(v, Relaxed);
+        cells.max.fetch_max(v, Relaxed);
+    }
+
+    fn read(&self) -> SlotView {
+        SlotView {
+            counters: std::array::from_fn(|i| self.counters[i].load(Relaxed)),
+            gauges: std::array::from_fn(|i| self.gauges[i].load(Relaxed)),
+            hists: std::array::from_fn(|i| {
+                let c = &self.hists[i];
+                HistView {
+                    buckets: std::array::from_fn(|b| c.buckets[b].load(Relaxed)),
+                    count: c.count.load(Relaxed),
+                    sum: c.sum.load(Relaxed),
+                    max: c.max.load(Relaxed),
+                }
+            }),
+        }
+    }
+}
+
+static LOCAL: Slot = Slot::new();
+/// This process's slot; null until `init_shared` / `attach`.
+static CURRENT: AtomicPtr<Slot> = AtomicPtr::new(std::ptr::null_mut());
+static REGION: AtomicPtr<Slot> = AtomicPtr::new(std::ptr::null_mut());
+static NSLOTS: AtomicUsize = AtomicUsize::new(0);
+
+#[inline]
+fn slot() -> &'static Slot {
+    let p = CURRENT.load(Relaxed);
+    if p.is_null() {
+        &LOCAL
+    } else {
+        // SAFETY: `p` points into the process-lifetime shared mapping.
+        unsafe { &*p }
+    }
+}
+
+/// Map the shared region (slot 0 for the master, `w + 1` for worker `w`) and
+/// move the master onto slot 0, carrying over everything it counted during
+/// boot. Called once, before the fork. On failure metrics stay process-local
+/// and workers report nothing.
+pub(crate) fn init_shared(nslots: usize) -> bool {
+    let size = nslots * std::mem::size_of::<Slot>();
+    let fd = super::posix_io::memfd_create(b"metrics");
+    if fd < 0 {
+        return false;
+    }
+    let ptr = match super::posix_io::ftruncate(fd, size as i64) {
+        Ok(()) => super::posix_io::mmap_shared(fd, size) as *mut Slot,
+        Err(_) => std::ptr::null_mut(),
+    };
+    // SAFETY: our own fd; the mapping stays valid after it is closed.
+    unsafe { libc::close(fd) };
+    if ptr.is_null() {
+        return false;
+    }
+    // SAFETY: slot 0 of the fresh, zero-filled mapping.
+    copy_into(&LOCAL, unsafe { &*ptr }, true);
+    REGION.store(ptr, Relaxed);
+    NSLOTS.store(nslots, Relaxed);
+    CURRENT.store(ptr, Relaxed);
+    true
+}
+
+/// Rebind a forked child to its own `slot`. The child keeps the gauges it
+/// inherited (its copies of the master's tables, say) so its own later
+/// deltas net out; counters and histograms start from zero.
+pub(crate) fn attach(slot_idx: usize) {
+    let base = REGION.load(Relaxed);
+    if base.is_null() || slot_idx >= NSLOTS.load(Relaxed) {
+        return;
+    }
+    // SAFETY: in bounds of the shared mapping; no other process writes it.
+    let own = unsafe { &*base.add(slot_idx) };
+    copy_into(slot(), own, false);
+    CURRENT.store(own as *const Slot as *mut Slot, Relaxed);
+}
+
+fn copy_into(from: &Slot, to: &Slot, all: bool) {
+    for (f, t) in from.gauges.iter().zip(&to.gauges) {
+        t.store(f.load(Relaxed), Relaxed);
+    }
+    if !all {
+        return;
+    }
+    for (f, t) in from.counters.iter().zip(&to.counters) {
+        t.store(f.load(Relaxed), Relaxed);
+    }
+    for (f, t) in from.hists.iter().zip(&to.hists) {
+        for (fb, tb) in f.buckets.iter().zip(&t.buckets) {
+            tb.store(fb.load(Relaxed), Relaxed);
+        }
+        t.count.store(f.count.load(Relaxed), Relaxed);
+        t.sum.store(f.sum.load(Relaxed), Relaxed);
+        t.max.store(f.max.load(Relaxed), Relaxed);
+    }
+}
+
+#[inline]
+pub(crate) fn inc(c: Counter) {
+    slot().add(c, 1);
+}
+
+#[inline]
+pub(crate) fn add(c: Counter, n: u64) {
+    slot().add(c, n);
+}
+
+#[inline]
+pub(crate) fn gauge_set(g: Gauge, v: i64) {
+    slot().gauges[g as usize].store(v, Relaxed);
+}
+
+#[inline]
+pub(crate) fn gauge_add(g: Gauge, d: i64) {
+    slot().gauge_add(g, d);
+}
+
+#[inline]
+pub(crate) fn record(h: Hist, v: u64) {
+    slot().record(h, v);
+}
+
+/// Record the nanoseconds elapsed since `t0`.
+#[inline]
+pub(crate) fn record_since(h: Hist, t0: Instant) {
+    slot().record(h, t0.elapsed().as_nanos().min(u64::MAX as u128) as u64);
+}
+
+/// Holds a gauge one higher for its lifetime.
+pub(crate) struct GaugeHold(Gauge);
+
+pub(crate) fn hold(g: Gauge) -> GaugeHold {
+    gauge_add(g, 1);
+    GaugeHold(g)
+}
+
+impl Drop for GaugeHold {
+    fn drop(&mut self) {
+        gauge_add(self.0, -1);
+    }
+}
+
+// ---------------------------------------------------------------------------
+// Snapshots
+// ---------------------------------------------------------------------------
+
+#[derive(Clone)]
+struct HistView {
+    buckets: [u64; NB],
+    count: u64,
+    sum: u64,
+    max: u64,
+}
+
+impl HistView {
+    fn merge(&mut self, o: &HistView) {
+        for (a, b) in self.buckets.iter_mut().zip(&o.buckets) {
+            *a += b;
+        }
+        self.count += o.count;
+        self.sum = self.sum.wrapping_add(o.sum);
+        self.max = self.max.max(o.max);
+    }
+
+    /// The `q` quantile, as the top of the bucket holding it (never an
+    /// under-estimate), capped at the observed maximum.
+    fn quantile(&self, q: f64) -> u64 {
+        let total: u64 = self.buckets.iter().sum();
+        if total == 0 {
+            return 0;
+        }
+        let rank = ((q * total as f64).ceil() as u64).max(1);
+        let mut seen = 0;
+        for (b, &n) in self.buckets.iter().enumerate() {
+            seen += n;
+            if seen >= rank {
+                let top = if b + 1 < NB { bucket_lower(b + 1) - 1 } else { u64::MAX };
+                return top.min(self.max);
+            }
+        }
+        self.max
+    }
+}
+
+struct SlotView {
+    counters: [u64; NC],
+    gauges: [i64; NG],
+    hists: [HistView; NH],
+}
+
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(crate) enum MetricKind {
+    Counter = 0,
+    Gauge = 1,
+    Histogram = 2,
+}
+
+/// One reported series. `value` is the count of a histogram; `sum` and the
+/// quantiles are zero for counters and gauges.
+#[derive(Clone, Debug, PartialEq)]
+pub(crate) struct Sample {
+    pub name: &'static str,
+    pub help: &'static str,
+    /// `master`, `worker<N>`, or `all` for the cross-process total.
+    pub process: String,
+    pub kind: MetricKind,
+    pub value: i64,
+    pub sum: u64,
+    pub p50: u64,
+    pub p90: u64,
+    pub p99: u64,
+    pub max: u64,
+}
+
+/// Every process's metrics, read from the shared region (or the local slot
+/// when there is none).
+pub(crate) fn snapshot() -> Vec<Sample> {
+    let base = REGION.load(Relaxed);
+    let views: Vec<SlotView> = if base.is_null() {
+        vec![LOCAL.read()]
+    } else {
+        // SAFETY: every index is in bounds of the shared mapping.
+        (0..NSLOTS.load(Relaxed))
+            .map(|i| unsafe { &*base.add(i) }.read())
+            .collect()
+    };
+    samples(&views)
+}
+
+pub(crate) fn process_name(i: usize) -> String {
+    match i {
+        0 => "master".to_string(),
+        w => format!("worker{}", w - 1),
+    }
+}
+
+/// One row per metric per process that has anything to report, then — with
+/// more than one process — an `all` row per metric.
+fn samples(views: &[SlotView]) -> Vec<Sample> {
+    let mut out = Vec::new();
+    let multi = views.len() > 1;
+    let scalar = |name, help, process, kind, value| Sample {
+        name,
+        help,
+        process,
+        kind,
+        value,
+        sum: 0,
+        p50: 0,
+        p90: 0,
+        p99: 0,
+        max: 0,
+    };
+    for (c, &(name, help)) in COUNTERS.iter().enumerate() {
+        let mut total = 0u64;
+        for (i, v) in views.iter().enumerate() {
+            total = total.wrapping_add(v.counters[c]);
+            if v.counters[c] != 0 || i == 0 {
+                out.push(scalar(
+                    name,
+                    help,
+                    process_name(i),
+                    MetricKind::Counter,
+                    v.counters[c] as i64,
+                ));
+            }
+        }
+        if multi {
+            out.push(scalar(name, help, "all".to_string(), MetricKind::Counter, total as i64));
+        }
+    }
+    for (g, &(name, help)) in GAUGES.iter().enumerate() {
+        let mut total = 0i64;
+        for (i, v) in views.iter().enumerate() {
+            total = total.wrapping_add(v.gauges[g]);
+            if v.gauges[g] != 0 || i == 0 {
+                out.push(scalar(name, help, process_name(i), MetricKind::Gauge, v.gauges[g]));
+            }
+        }
+        if multi {
+            out.push(scalar(name, help, "all".to_string(), MetricKind::Gauge, total));
+        }
+    }
+    let hist = |name, help, process, h: &HistView| Sample {
+        name,
+        help,
+        process,
+        kind: MetricKind::Histogram,
+        value: h.count as i64,
+        sum: h.sum,
+        p50: h.quantile(0.5),
+        p90: h.quantile(0.9),
+        p99: h.quantile(0.99),
+        max: h.max,
+    };
+    for (h, &(name, help)) in HISTS.iter().enumerate() {
+        let mut total = views[0].hists[h].clone();
+        for (i, v) in views.iter().enumerate() {
+            if i > 0 {
+                total.merge(&v.hists[h]);
+            }
+            if v.hists[h].count != 0 || i == 0 {
+                out.push(hist(name, help, process_name(i), &v.hists[h]));
+            }
+        }
+        if multi {
+            out.push(hist(name, help, "all".to_string(), &total));
+        }
+    }
+    out
+}
+
+/// Prometheus text exposition (format 0.0.4) of `samples`. Per-process series
+/// only — the `all` rows are what a PromQL `sum` computes anyway. Histograms
+/// render as summaries; `_ns` durations in seconds.
+pub(crate) fn render_prometheus(samples: &[Sample]) -> String {
+    use std::fmt::Write;
+    let mut out = String::new();
+    let mut last = "";
+    for s in samples.iter().filter(|s| s.process != "all") {
+        let (family, scale) = match (s.kind, s.name.strip_suffix("_ns")) {
+            (MetricKind::Counter, _) => (format!("gnitz_{}_total", s.name), 1.0),
+            (MetricKind::Histogram, Some(stem)) => (format!("gnitz_{stem}_seconds"), 1e-9),
+            _ => (format!("gnitz_{}", s.name), 1.0),
+        };
+        if s.name != last {
+            let ty = match s.kind {
+                MetricKind::Counter => "counter",
+                MetricKind::Gauge => "gauge",
+                MetricKind::Histogram => "summary",
+            };
+            let _ = writeln!(out, "# HELP {family} {}", s.help);
+            let _ = writeln!(out, "# TYPE {family} {ty}");
+            last = s.name;
+        }
+        let p = &s.process;
+        if s.kind != MetricKind::Histogram {
+            let _ = writeln!(out, "{family}{{process=\"{p}\"}} {}", s.value);
+            continue;
+        }
+        for (q, v) in [("0.5", s.p50), ("0.9", s.p90), ("0.99", s.p99), ("1", s.max)] {
+            let _ = writeln!(out, "{family}{{process=\"{p}\",quantile=\"{q}\"}} {}", v as f64 * scale);
+        }
+        let _ = writeln!(out, "{family}_sum{{process=\"{p}\"}} {}", s.sum as f64 * scale);
+        let _ = writeln!(out, "{family}_count{{process=\"{p}\"}} {}", s.value);
+    }
+    out
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn bucket_bounds_are_contiguous() {
+        for v in [0u64, 1, 3, 4, 5, 7, 8, 9, 15, 16, 1000, 1 << 40, u64::MAX] {
+            let b = bucket_of(v);
+            assert!(bucket_lower(b) <= v, "{v} below its bucket {b}");
+            if b + 1 < NB {
+                assert!(bucket_lower(b + 1) > v, "{v} past its bucket {b}");
+            }
+        }
+        assert_eq!(bucket_of(u64::MAX), NB - 1);
+        for b in 0..NB {
+            assert_eq!(bucket_of(bucket_lower(b)), b);
+        }
+    }
+
+    #[test]
+    fn quantiles_stay_within_a_quarter_octave() {
+        let s = Slot::new();
+        for v in 1..=1000u64 {
+            s.record(Hist::TickNs, v * 1000);
+        }
+        let h = &s.read().hists[Hist::TickNs as usize];
+        assert_eq!((h.count, h.max), (1000, 1_000_000));
+        for (q, want) in [(0.5, 500_000u64), (0.9, 900_000), (0.99, 990_000)] {
+            let got = h.quantile(q);
+            assert!(got >= want && got <= want + want / 4, "q{q}: {got} vs {want}");
+        }
+        assert_eq!(h.quantile(1.0), 1_000_000);
+    }
+
+    #[test]
+    fn samples_report_each_process_and_the_total() {
+        let (m, w) = (Slot::new(), Slot::new());
+        m.add(Counter::Ticks, 3);
+        w.add(Counter::RowsIngested, 5);
+        w.gauge_add(Gauge::L0Runs, 2);
+        w.record(Hist::DagEvalNs, 100);
+        let all = samples(&[m.read(), w.read()]);
+        let find = |name: &str, process: &str| all.iter().find(|s| s.name == name && s.process == process);
+        assert_eq!(find("ticks", "master").unwrap().value, 3);
+        // Zero series are left out, except the master's.
+        assert!(find("ticks", "worker0").is_none());
+        assert_eq!(find("rows_ingested", "master").unwrap().value, 0);
+        assert_eq!(find("rows_ingested", "all").unwrap().value, 5);
+        assert_eq!(find("l0_runs", "all").unwrap().value, 2);
+        let h = find("dag_eval_ns", "all").unwrap();
+        assert_eq!((h.value, h.sum, h.max), (1, 100, 100));
+    }
+
+    #[test]
+    fn prometheus_text_shape() {
+        let s = Slot::new();
+        s.add(Counter::Requests, 7);
+        s.record(Hist::RequestNs, 2_000_000_000);
+        let text = render_prometheus(&samples(&[s.read()]));
+        assert!(text.contains("# TYPE gnitz_requests_total counter\n"));
+        assert!(text.contains("gnitz_requests_total{process=\"master\"} 7\n"));
+        assert!(text.contains("# TYPE gnitz_request_seconds summary\n"));
+        assert!(text.contains("gnitz_request_seconds_sum{process=\"master\"} 2\n"));
+        assert!(text.contains("gnitz_request_seconds_count{process=\"master\"} 1\n"));
+        assert!(text.contains("gnitz_request_seconds{process=\"master\",quantile=\"1\"} 2\n"));
+        assert!(text.contains("# TYPE gnitz_commit_batch_rows summary\n"));
+    }
+}
@@ -7,10 +7,16 @@
 //!   - `posix_io`   — POSIX I/O and Linux syscall wrappers (file I/O, sockets,
 //!     mmap, eventfd/futex/memfd IPC)
 //!   - `worker_ctx` — per-process worker rank / count
+//!   - `metrics`    — server counters, gauges and histograms in shared memory
+//!   - `profile`    — per-subsystem CPU timing zones, folded, in shared memory
+//!   - `trace`      — per-stage spans of sampled requests, in shared memory
 
 #[macro_use]
 pub(crate) mod log;
 pub(crate) mod codec;
+pub(crate) mod metrics;
 pub(crate) mod posix_io;
+pub(crate) mod profile;
+pub(crate) mod trace;
 pub(crate) mod worker_ctx;
 pub(crate) mod xxh;
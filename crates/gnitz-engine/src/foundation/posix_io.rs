@@ -510,6 +510,19 @@ pub(crate) fn fd_size(fd: c_int) -> std::io::Result<usize> {
     Ok(st.st_size as usize)
 }
 
+/// The system page size (`_SC_PAGE_SIZE`), read once; 4 KiB if unavailable.
+fn page_size() -> usize {
+    static PAGE: std::sync::OnceLock<usize> = std::sync::OnceLock::new();
+    *PAGE.get_or_init(|| {
+        let sz = unsafe { libc::sysconf(libc::_SC_PAGE_SIZE) };
+        if sz > 0 {
+            sz as usize
+        } else {
+            4096
+        }
+    })
+}
+
 /// RAII handle for a read-only mmap'd file region, so the unmap path lives in
 /// exactly one place — no consumer's error return or Drop repeats the `munmap`.
 pub(crate) struct Mmap {
@@ -518,38 +531,57 @@ pub(crate) struct Mmap {
 }
 
 impl Mmap {
-    /// mmap `[0, len)` of `fd` read-only with a sequential-access hint.
-    /// `len` must be `> 0`. The mapping holds its own reference to the inode,
-    /// so the caller may close `fd` immediately after.
-    pub(crate) fn from_fd(fd: c_int, len: usize) -> std::io::Result<Self> {
+    /// mmap `[0, len)` of `fd` read-only, with no access-pattern hint.
+    fn map_ro(fd: c_int, len: usize) -> std::io::Result<Self> {
         debug_assert!(len > 0);
         let raw = unsafe { libc::mmap(std::ptr::null_mut(), len, libc::PROT_READ, libc::MAP_SHARED, fd, 0) };
         if raw == libc::MAP_FAILED {
             return Err(std::io::Error::last_os_error());
         }
-        // Best-effort sequential read-ahead hint; errors are ignored.
-        unsafe {
-            libc::madvise(raw, len, libc::MADV_SEQUENTIAL);
-        }
         Ok(Mmap {
             ptr: raw as *mut u8,
             len,
         })
     }
 
-    /// Open `path` read-only, mmap the whole (non-empty) file, and apply
-    /// huge-page + sequential madvise hints.
+    /// mmap `[0, len)` of `fd` read-only with a sequential-access hint.
+    /// `len` must be `> 0`. The mapping holds its own reference to the inode,
+    /// so the caller may close `fd` immediately after.
+    pub(crate) fn from_fd(fd: c_int, len: usize) -> std::io::Result<Self> {
+        let map = Self::map_ro(fd, len)?;
+        map.advise(0, len, libc::MADV_SEQUENTIAL);
+        Ok(map)
+    }
+
+    /// Open `path` read-only, mmap the whole (non-empty) file, and apply the
+    /// huge-page hint. No access-pattern hint: a shard mapping serves point
+    /// seeks as well as scans, so readers [`advise`](Self::advise) the ranges
+    /// they are about to stream instead.
     pub(crate) fn open_ro(path: &std::ffi::CStr) -> std::io::Result<Self> {
         let fd = open_owned(path, libc::O_RDONLY).ok_or_else(std::io::Error::last_os_error)?;
         let len = fd_size(std::os::fd::AsRawFd::as_raw_fd(&fd))?;
         if len == 0 {
             return Err(std::io::Error::from(std::io::ErrorKind::UnexpectedEof));
         }
-        let map = Self::from_fd(std::os::fd::AsRawFd::as_raw_fd(&fd), len)?;
+        let map = Self::map_ro(std::os::fd::AsRawFd::as_raw_fd(&fd), len)?;
         madvise_hugepage(map.ptr, map.len);
         Ok(map)
     }
 
+    /// `madvise(advice)` over `[offset, offset + len)` of the mapping, widened
+    /// down to a page boundary and clamped to the mapping. Best-effort: errors
+    /// are ignored and an empty range is a no-op.
+    pub(crate) fn advise(&self, offset: usize, len: usize, advice: c_int) {
+        let end = offset.saturating_add(len).min(self.len);
+        let start = offset & !(page_size() - 1);
+        if start >= end {
+            return;
+        }
+        unsafe {
+            libc::madvise(self.ptr.add(start) as *mut libc::c_void, end - start, advice);
+        }
+    }
+
     #[inline]
     pub(crate) fn len(&self) -> usize {
         self.len
@@ -0,0 +1,437 @@
+//! Continuous CPU profiler: scoped timing zones attributed to named
+//! subsystems, one shared table per process.
+//!
+//! A [`zone`] guard charges the thread CPU time spent inside it, less the time
+//! of the zones nested in it, to the path of zones enclosing it (`tick;join`).
+//! A dump is therefore a set of folded stacks — `worker0;tick;join 1234`, the
+//! format `flamegraph.pl`, inferno and speedscope read — with the self time of
+//! each path. CPU time (`CLOCK_THREAD_CPUTIME_ID`), not wall time: a worker
+//! parked in an exchange wait or an fsync is charged nothing, and CPU spent
+//! outside every zone is not reported.
+//!
+//! The region is laid out and handed across the fork exactly like `metrics`
+//! (slot 0 the master, `w + 1` worker `w`). Each slot carries its own enable
+//! flag, written by the master for every slot at once, so a toggle reaches the
+//! workers without IPC. Off, a guard costs one relaxed load; on, two clock
+//! reads and a short probe of the slot's path table.
+//!
+//! A guard must not live across an `.await`: the zone stack is per thread and
+//! the master's tasks interleave on one thread.
+
+use std::cell::RefCell;
+use std::marker::PhantomData;
+use std::sync::atomic::{AtomicBool, AtomicPtr, AtomicU64, AtomicUsize, Ordering::Relaxed};
+
+/// Subsystems CPU is attributed to. Discriminants start at 1: a path packs
+/// one zone per nibble, root lowest, and 0 is the empty path.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(crate) enum Zone {
+    Tick = 1,
+    Exchange,
+    Reduce,
+    Join,
+    Compaction,
+    Commit,
+    ClientIo,
+    /// A worker applying a pushed batch to its partitions — the worker's side
+    /// of ingest, kept apart from the master's `Commit`.
+    Apply,
+}
+
+/// Names, indexed by discriminant − 1.
+const ZONES: [&str; 8] = [
+    "tick",
+    "exchange",
+    "reduce",
+    "join",
+    "compaction",
+    "commit",
+    "client_io",
+    "apply",
+];
+
+/// Paths nest at most this deep; a zone entered deeper is charged to its
+/// deepest representable ancestor path.
+const MAX_DEPTH: u32 = 16;
+/// Distinct paths one process can hold; time on paths past it is still
+/// counted, as `[untracked]`.
+const ENTRIES: usize = 256;
+const HASH_SHIFT: u32 = 64 - ENTRIES.trailing_zeros();
+
+#[repr(C)]
+struct Entry {
+    path: AtomicU64,
+    cpu_ns: AtomicU64,
+    calls: AtomicU64,
+}
+
+/// One process's profile. All-zero bytes are a valid disabled, empty slot.
+#[repr(C)]
+pub(crate) struct Slot {
+    enabled: AtomicBool,
+    untracked_ns: AtomicU64,
+    entries: [Entry; ENTRIES],
+}
+
+impl Slot {
+    pub(crate) const fn new() -> Self {
+        Slot {
+            enabled: AtomicBool::new(false),
+            untracked_ns: AtomicU64::new(0),
+            entries: [const {
+                Entry {
+                    path: AtomicU64::new(0),
+                    cpu_ns: AtomicU64::new(0),
+                    calls: AtomicU64::new(0),
+                }
+            }; ENTRIES],
+        }
+    }
+
+    /// Add one exit of `path` with `ns` of self time. Open addressing with
+    /// linear probing; a free entry is claimed by CAS, and entries are never
+    /// freed short of a `reset`.
+    fn charge(&self, path: u64, ns: u64) {
+        let mut i = (path.wrapping_mul(0x9E37_79B9_7F4A_7C15) >> HASH_SHIFT) as usize;
+        for _ in 0..ENTRIES {
+            let e = &self.entries[i];
+            let mut k = e.path.load(Relaxed);
+            if k == 0 {
+                k = match e.path.compare_exchange(0, path, Relaxed, Relaxed) {
+                    Ok(_) => path,
+                    Err(cur) => cur,
+                };
+            }
+            if k == path {
+                e.cpu_ns.fetch_add(ns, Relaxed);
+                e.calls.fetch_add(1, Relaxed);
+                return;
+            }
+            i = (i + 1) % ENTRIES;
+        }
+        self.untracked_ns.fetch_add(ns, Relaxed);
+    }
+
+    /// Forget every path. Racing a concurrent `charge` can lose or misfile
+    /// that one exit — the price of a lock-free reset.
+    fn reset(&self) {
+        for e in &self.entries {
+            e.path.store(0, Relaxed);
+            e.cpu_ns.store(0, Relaxed);
+            e.calls.store(0, Relaxed);
+        }
+        self.untracked_ns.store(0, Relaxed);
+    }
+}
+
+static LOCAL: Slot = Slot::new();
+/// This process's slot; null until `init_shared` / `attach`.
+static CURRENT: AtomicPtr<Slot> = AtomicPtr::new(std::ptr::null_mut());
+static REGION: AtomicPtr<Slot> = AtomicPtr::new(std::ptr::null_mut());
+static NSLOTS: AtomicUsize = AtomicUsize::new(0);
+
+#[inline]
+fn slot() -> &'static Slot {
+    let p = CURRENT.load(Relaxed);
+    if p.is_null() {
+        &LOCAL
+    } else {
+        // SAFETY: `p` points into the process-lifetime shared mapping.
+        unsafe { &*p }
+    }
+}
+
+/// Every process's slot: the shared region, or the local slot when there is
+/// none.
+fn slots() -> Vec<&'static Slot> {
+    let base = REGION.load(Relaxed);
+    if base.is_null() {
+        return vec![&LOCAL];
+    }
+    // SAFETY: every index is in bounds of the shared mapping.
+    (0..NSLOTS.load(Relaxed)).map(|i| unsafe { &*base.add(i) }).collect()
+}
+
+/// Map the shared region and move the master onto slot 0. Called once, before
+/// the fork. On failure profiling stays process-local: the master profiles
+/// itself and the workers are never switched on.
+pub(crate) fn init_shared(nslots: usize) -> bool {
+    let size = nslots * std::mem::size_of::<Slot>();
+    let fd = super::posix_io::memfd_create(b"profile");
+    if fd < 0 {
+        return false;
+    }
+    let ptr = match super::posix_io::ftruncate(fd, size as i64) {
+        Ok(()) => super::posix_io::mmap_shared(fd, size) as *mut Slot,
+        Err(_) => std::ptr::null_mut(),
+    };
+    // SAFETY: our own fd; the mapping stays valid after it is closed.
+    unsafe { libc::close(fd) };
+    if ptr.is_null() {
+        return false;
+    }
+    REGION.store(ptr, Relaxed);
+    NSLOTS.store(nslots, Relaxed);
+    CURRENT.store(ptr, Relaxed);
+    true
+}
+
+/// Rebind a forked child to its own `slot_idx`.
+pub(crate) fn attach(slot_idx: usize) {
+    let base = REGION.load(Relaxed);
+    if base.is_null() || slot_idx >= NSLOTS.load(Relaxed) {
+        return;
+    }
+    // SAFETY: in bounds of the shared mapping.
+    CURRENT.store(unsafe { base.add(slot_idx) }, Relaxed);
+}
+
+/// Clear every process's profile and start timing zones.
+pub(crate) fn start() {
+    for s in slots() {
+        s.reset();
+        s.enabled.store(true, Relaxed);
+    }
+}
+
+/// Stop timing zones everywhere; what was collected stays for a dump.
+pub(crate) fn stop() {
+    for s in slots() {
+        s.enabled.store(false, Relaxed);
+    }
+}
+
+#[inline]
+fn thread_cpu_ns() -> u64 {
+    let mut ts = libc::timespec { tv_sec: 0, tv_nsec: 0 };
+    // SAFETY: valid out-pointer; the clock exists on every supported kernel.
+    unsafe { libc::clock_gettime(libc::CLOCK_THREAD_CPUTIME_ID, &mut ts) };
+    ts.tv_sec as u64 * 1_000_000_000 + ts.tv_nsec as u64
+}
+
+/// `parent` extended by `z`, unless it is already `MAX_DEPTH` deep.
+fn push_path(parent: u64, z: Zone) -> u64 {
+    let depth = (64 - parent.leading_zeros()).div_ceil(4);
+    if depth >= MAX_DEPTH {
+        parent
+    } else {
+        parent | (z as u64) << (4 * depth)
+    }
+}
+
+/// `tick;join` for a packed path.
+fn path_name(mut path: u64) -> String {
+    let mut out = String::new();
+    while path != 0 {
+        if !out.is_empty() {
+            out.push(';');
+        }
+        out.push_str(ZONES[(path & 0xF) as usize - 1]);
+        path >>= 4;
+    }
+    out
+}
+
+struct Frame {
+    path: u64,
+    start_ns: u64,
+    child_ns: u64,
+}
+
+thread_local! {
+    static STACK: RefCell<Vec<Frame>> = const { RefCell::new(Vec::new()) };
+}
+
+/// An open zone; charges its self time on drop. `!Send`: the zone stack is
+/// the creating thread's.
+#[must_use = "a zone covers the scope of its guard"]
+pub(crate) struct ZoneGuard {
+    live: bool,
+    _thread: PhantomData<*const ()>,
+}
+
+/// Whether this process's profiler is running. Also gates the VM's
+/// per-operator counters (`EXPLAIN ANALYZE VIEW`).
+#[inline]
+pub(crate) fn running() -> bool {
+    slot().enabled.load(Relaxed)
+}
+
+/// Serializes the tests that start or stop the profiler: without a shared
+/// region they all flip the one process-local slot.
+#[cfg(test)]
+pub(crate) static TEST_SWITCH: std::sync::Mutex<()> = std::sync::Mutex::new(());
+
+/// Open zone `z` until the returned guard drops. A no-op while the profiler
+/// is stopped; a guard opened while it runs is charged even if it stops
+/// meanwhile.
+#[inline]
+pub(crate) fn zone(z: Zone) -> ZoneGuard {
+    let live = running();
+    if live {
+        STACK.with_borrow_mut(|s| {
+            let path = push_path(s.last().map_or(0, |f| f.path), z);
+            s.push(Frame {
+                path,
+                start_ns: thread_cpu_ns(),
+                child_ns: 0,
+            });
+        });
+    }
+    ZoneGuard {
+        live,
+        _thread: PhantomData,
+    }
+}
+
+impl Drop for ZoneGuard {
+    fn drop(&mut self) {
+        if !self.live {
+            return;
+        }
+        let now = thread_cpu_ns();
+        STACK.with_borrow_mut(|s| {
+            let Some(f) = s.pop() else { return };
+            let total = now.saturating_sub(f.start_ns);
+            slot().charge(f.path, total.saturating_sub(f.child_ns));
+            if let Some(parent) = s.last_mut() {
+                parent.child_ns += total;
+            }
+        });
+    }
+}
+
+// ---------------------------------------------------------------------------
+// Dump
+// ---------------------------------------------------------------------------
+
+/// One folded stack: `process` (`master` / `worker<N>`), the zone path below
+/// it (`tick;join`), the self CPU time charged to it and how many zone exits
+/// contributed.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub(crate) struct FoldedStack {
+    pub process: String,
+    pub stack: String,
+    pub cpu_ns: u64,
+    pub calls: u64,
+}
+
+/// Every process's non-empty paths, sorted by process then stack, each
+/// process's `[untracked]` time last.
+pub(crate) fn snapshot() -> Vec<FoldedStack> {
+    let mut out = Vec::new();
+    for (i, s) in slots().into_iter().enumerate() {
+        fold_into(s, &super::metrics::process_name(i), &mut out);
+    }
+    out
+}
+
+fn fold_into(s: &Slot, process: &str, out: &mut Vec<FoldedStack>) {
+    let start = out.len();
+    for e in &s.entries {
+        let (path, cpu_ns, calls) = (e.path.load(Relaxed), e.cpu_ns.load(Relaxed), e.calls.load(Relaxed));
+        if path != 0 && calls != 0 {
+            out.push(FoldedStack {
+                process: process.to_string(),
+                stack: path_name(path),
+                cpu_ns,
+                calls,
+            });
+        }
+    }
+    out[start..].sort_by(|a, b| a.stack.cmp(&b.stack));
+    let untracked = s.untracked_ns.load(Relaxed);
+    if untracked != 0 {
+        out.push(FoldedStack {
+            process: process.to_string(),
+            stack: "[untracked]".to_string(),
+            cpu_ns: untracked,
+            calls: 0,
+        });
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn paths_pack_root_first_and_cap_their_depth() {
+        let p = push_path(push_path(0, Zone::Tick), Zone::Join);
+        assert_eq!(path_name(p), "tick;join");
+        assert_eq!(path_name(push_path(p, Zone::Compaction)), "tick;join;compaction");
+        let mut deep = 0;
+        for _ in 0..MAX_DEPTH + 3 {
+            deep = push_path(deep, Zone::ClientIo);
+        }
+        assert_eq!(path_name(deep).split(';').count(), MAX_DEPTH as usize);
+    }
+
+    #[test]
+    fn charges_fold_per_path_and_overflow_to_untracked() {
+        let s = Box::new(Slot::new());
+        let tick = push_path(0, Zone::Tick);
+        s.charge(tick, 5);
+        s.charge(tick, 7);
+        s.charge(push_path(tick, Zone::Reduce), 3);
+        let mut out = Vec::new();
+        fold_into(&s, "worker0", &mut out);
+        let stacks: Vec<_> = out.iter().map(|f| (f.stack.as_str(), f.cpu_ns, f.calls)).collect();
+        assert_eq!(stacks, [("tick", 12, 2), ("tick;reduce", 3, 1)]);
+
+        // Overfill the table: path k spells k in base 7, one zone per digit.
+        for k in 1..=ENTRIES as u64 + 10 {
+            let (mut path, mut rest, mut shift) = (0, k, 0);
+            while rest > 0 {
+                path |= (rest % 7 + 1) << shift;
+                rest /= 7;
+                shift += 4;
+            }
+            s.charge(path, 1);
+        }
+        out.clear();
+        fold_into(&s, "worker0", &mut out);
+        assert_eq!(out.len(), ENTRIES + 1);
+        assert_eq!(out.last().unwrap().stack, "[untracked]");
+
+        s.reset();
+        out.clear();
+        fold_into(&s, "worker0", &mut out);
+        assert!(out.is_empty());
+    }
+
+    #[test]
+    fn nested_zones_charge_self_time_to_their_path() {
+        let spin = |ns: u64| {
+            let t0 = thread_cpu_ns();
+            while thread_cpu_ns() - t0 < ns {
+                std::hint::black_box(0u64);
+            }
+        };
+        let _switch = TEST_SWITCH.lock().unwrap_or_else(|e| e.into_inner());
+        // Paths no engine code produces, so tests running alongside cannot
+        // add to them.
+        drop(zone(Zone::Reduce));
+        start();
+        {
+            let _io = zone(Zone::ClientIo);
+            let _outer = zone(Zone::Exchange);
+            spin(2_000_000);
+            {
+                let _inner = zone(Zone::Reduce);
+                spin(4_000_000);
+            }
+        }
+        stop();
+        drop(zone(Zone::Reduce)); // stopped: records nothing
+        let all = snapshot();
+        let get = |stack: &str| all.iter().find(|f| f.process == "master" && f.stack == stack);
+        assert!(get("reduce").is_none());
+        let outer = get("client_io;exchange").unwrap();
+        let inner = get("client_io;exchange;reduce").unwrap();
+        assert_eq!((outer.calls, inner.calls), (1, 1));
+        assert!(inner.cpu_ns >= 4_000_000, "{inner:?}");
+        // The inner zone's time is not charged again to its parent.
+        assert!(outer.cpu_ns >= 2_000_000 && outer.cpu_ns < inner.cpu_ns, "{outer:?}");
+    }
+}
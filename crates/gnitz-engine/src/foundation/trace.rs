@@ -0,0 +1,380 @@
+//! Request tracing: timed spans of the stages a sampled request passes
+//! through, one ring per process in a shared region.
+//!
+//! A client samples a request by stamping a non-zero `trace_id` into its
+//! control block. The master records the stages it runs for that request —
+//! the whole `request`, the wait in the committer queue (`enqueue`), the SAL
+//! emission (`sal_write`), the `fsync` and the `reply` send — and stamps the
+//! id on the SAL groups carrying the request's rows, so each worker records
+//! its `worker_apply` as well. Spans are timed on `CLOCK_MONOTONIC`, which all
+//! processes on the host share, so spans from different processes line up.
+//!
+//! The committer coalesces concurrent pushes to one table into one SAL group,
+//! which carries only one of their ids. A dump therefore attributes a worker
+//! span to every trace committed to the same table in the same zone as the
+//! trace it carries.
+//!
+//! The region is laid out and handed across the fork like `metrics` and
+//! `profile` (slot 0 the master, `w + 1` worker `w`). Each slot is a ring of
+//! the process's last `SPANS` spans. An untraced request reads no clock and
+//! records nothing.
+
+use std::collections::HashMap;
+use std::sync::atomic::{
+    fence, AtomicPtr, AtomicU64, AtomicUsize,
+    Ordering::{Acquire, Relaxed, Release},
+};
+
+/// The stages a traced request is timed through.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(crate) enum Stage {
+    Request,
+    Enqueue,
+    SalWrite,
+    Fsync,
+    WorkerApply,
+    Reply,
+}
+
+/// Names, indexed by discriminant.
+const STAGES: [&str; 6] = ["request", "enqueue", "sal_write", "fsync", "worker_apply", "reply"];
+
+/// Spans one process keeps; older ones are overwritten.
+const SPANS: usize = 4096;
+
+/// One span. `seq` is 0 while the span is being written and the span's
+/// ring position + 1 once it is complete, so a reader can detect a torn read.
+#[repr(C)]
+struct Rec {
+    seq: AtomicU64,
+    trace_id: AtomicU64,
+    lsn: AtomicU64,
+    table: AtomicU64,
+    stage: AtomicU64,
+    start_ns: AtomicU64,
+    dur_ns: AtomicU64,
+}
+
+/// One process's ring. All-zero bytes are a valid empty slot.
+#[repr(C)]
+pub(crate) struct Slot {
+    head: AtomicU64,
+    spans: [Rec; SPANS],
+}
+
+/// A span as read back out of a ring.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+struct Raw {
+    process: usize,
+    trace_id: u64,
+    lsn: u64,
+    table: u64,
+    stage: Stage,
+    start_ns: u64,
+    dur_ns: u64,
+}
+
+impl Slot {
+    pub(crate) const fn new() -> Self {
+        Slot {
+            head: AtomicU64::new(0),
+            spans: [const {
+                Rec {
+                    seq: AtomicU64::new(0),
+                    trace_id: AtomicU64::new(0),
+                    lsn: AtomicU64::new(0),
+                    table: AtomicU64::new(0),
+                    stage: AtomicU64::new(0),
+                    start_ns: AtomicU64::new(0),
+                    dur_ns: AtomicU64::new(0),
+                }
+            }; SPANS],
+        }
+    }
+
+    fn push(&self, trace_id: u64, lsn: u64, table: u64, stage: Stage, start_ns: u64, dur_ns: u64) {
+        let n = self.head.fetch_add(1, Relaxed);
+        let r = &self.spans[(n % SPANS as u64) as usize];
+        r.seq.store(0, Relaxed);
+        fence(Release);
+        r.trace_id.store(trace_id, Relaxed);
+        r.lsn.store(lsn, Relaxed);
+        r.table.store(table, Relaxed);
+        r.stage.store(stage as u64, Relaxed);
+        r.start_ns.store(start_ns, Relaxed);
+        r.dur_ns.store(dur_ns, Relaxed);
+        r.seq.store(n + 1, Release);
+    }
+
+    /// Every complete span, skipping any caught mid-overwrite.
+    fn read_into(&self, process: usize, out: &mut Vec<Raw>) {
+        for r in &self.spans {
+            let seq = r.seq.load(Acquire);
+            if seq == 0 {
+                continue;
+            }
+            let raw = Raw {
+                process,
+                trace_id: r.trace_id.load(Relaxed),
+                lsn: r.lsn.load(Relaxed),
+                table: r.table.load(Relaxed),
+                stage: STAGE_OF[r.stage.load(Relaxed) as usize % STAGES.len()],
+                start_ns: r.start_ns.load(Relaxed),
+                dur_ns: r.dur_ns.load(Relaxed),
+            };
+            fence(Acquire);
+            if r.seq.load(Relaxed) == seq {
+                out.push(raw);
+            }
+        }
+    }
+}
+
+const STAGE_OF: [Stage; 6] = [
+    Stage::Request,
+    Stage::Enqueue,
+    Stage::SalWrite,
+    Stage::Fsync,
+    Stage::WorkerApply,
+    Stage::Reply,
+];
+
+static LOCAL: Slot = Slot::new();
+/// This process's slot; null until `init_shared` / `attach`.
+static CURRENT: AtomicPtr<Slot> = AtomicPtr::new(std::ptr::null_mut());
+static REGION: AtomicPtr<Slot> = AtomicPtr::new(std::ptr::null_mut());
+static NSLOTS: AtomicUsize = AtomicUsize::new(0);
+
+#[inline]
+fn slot() -> &'static Slot {
+    let p = CURRENT.load(Relaxed);
+    if p.is_null() {
+        &LOCAL
+    } else {
+        // SAFETY: `p` points into the process-lifetime shared mapping.
+        unsafe { &*p }
+    }
+}
+
+/// Map the shared region and move the master onto slot 0. Called once, before
+/// the fork. On failure tracing stays process-local: only the master's spans
+/// are reported.
+pub(crate) fn init_shared(nslots: usize) -> bool {
+    let size = nslots * std::mem::size_of::<Slot>();
+    let fd = super::posix_io::memfd_create(b"trace");
+    if fd < 0 {
+        return false;
+    }
+    let ptr = match super::posix_io::ftruncate(fd, size as i64) {
+        Ok(()) => super::posix_io::mmap_shared(fd, size) as *mut Slot,
+        Err(_) => std::ptr::null_mut(),
+    };
+    // SAFETY: our own fd; the mapping stays valid after it is closed.
+    unsafe { libc::close(fd) };
+    if ptr.is_null() {
+        return false;
+    }
+    REGION.store(ptr, Relaxed);
+    NSLOTS.store(nslots, Relaxed);
+    CURRENT.store(ptr, Relaxed);
+    true
+}
+
+/// Rebind a forked child to its own `slot_idx`.
+pub(crate) fn attach(slot_idx: usize) {
+    let base = REGION.load(Relaxed);
+    if base.is_null() || slot_idx >= NSLOTS.load(Relaxed) {
+        return;
+    }
+    // SAFETY: in bounds of the shared mapping.
+    CURRENT.store(unsafe { base.add(slot_idx) }, Relaxed);
+}
+
+/// `CLOCK_MONOTONIC` in nanoseconds.
+#[inline]
+pub(crate) fn now_ns() -> u64 {
+    let mut ts = libc::timespec { tv_sec: 0, tv_nsec: 0 };
+    // SAFETY: valid out-pointer; the clock exists on every supported kernel.
+    unsafe { libc::clock_gettime(libc::CLOCK_MONOTONIC, &mut ts) };
+    ts.tv_sec as u64 * 1_000_000_000 + ts.tv_nsec as u64
+}
+
+/// Record `stage` of `trace_id` as running from `start_ns` until now. `lsn`
+/// is the SAL zone the stage committed into and `table` the table it wrote,
+/// or 0. A no-op for an untraced (`trace_id == 0`) request.
+pub(crate) fn record(trace_id: u64, lsn: u64, table: u64, stage: Stage, start_ns: u64) {
+    if trace_id != 0 {
+        slot().push(trace_id, lsn, table, stage, start_ns, now_ns().saturating_sub(start_ns));
+    }
+}
+
+/// An open span; records itself on drop. Unlike a profiler zone it may live
+/// across an `.await` — it holds no per-thread state.
+#[must_use = "a span covers the scope of its guard"]
+pub(crate) struct SpanGuard {
+    trace_id: u64,
+    table: u64,
+    stage: Stage,
+    start_ns: u64,
+}
+
+/// Time `stage` of `trace_id` until the returned guard drops.
+#[inline]
+pub(crate) fn span(trace_id: u64, stage: Stage) -> SpanGuard {
+    span_on(trace_id, 0, stage)
+}
+
+/// `span`, for a stage that writes `table`.
+#[inline]
+pub(crate) fn span_on(trace_id: u64, table: u64, stage: Stage) -> SpanGuard {
+    let start_ns = if trace_id != 0 { now_ns() } else { 0 };
+    SpanGuard {
+        trace_id,
+        table,
+        stage,
+        start_ns,
+    }
+}
+
+impl Drop for SpanGuard {
+    fn drop(&mut self) {
+        record(self.trace_id, 0, self.table, self.stage, self.start_ns);
+    }
+}
+
+// ---------------------------------------------------------------------------
+// Dump
+// ---------------------------------------------------------------------------
+
+/// One recorded span: `stage` of request `trace_id`, run by `process`
+/// (`master` / `worker<N>`) for `dur_ns` from `start_ns` (`CLOCK_MONOTONIC`).
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub(crate) struct TraceSpan {
+    pub trace_id: u64,
+    pub process: String,
+    pub stage: &'static str,
+    pub start_ns: u64,
+    pub dur_ns: u64,
+}
+
+/// Every process's retained spans, sorted by trace, then start time.
+pub(crate) fn snapshot() -> Vec<TraceSpan> {
+    let mut raw = Vec::new();
+    let base = REGION.load(Relaxed);
+    if base.is_null() {
+        LOCAL.read_into(0, &mut raw);
+    } else {
+        for i in 0..NSLOTS.load(Relaxed) {
+            // SAFETY: every index is in bounds of the shared mapping.
+            unsafe { &*base.add(i) }.read_into(i, &mut raw);
+        }
+    }
+    attribute(raw)
+}
+
+/// Resolve raw spans into per-trace spans: a worker span of trace `t` on
+/// table `T` is reported under every trace that committed to `T` in the same
+/// SAL zone as `t` — the pushes merged into the group it applied.
+fn attribute(raw: Vec<Raw>) -> Vec<TraceSpan> {
+    let mut zone_of: HashMap<u64, u64> = HashMap::new();
+    let mut traces_in: HashMap<(u64, u64), Vec<u64>> = HashMap::new();
+    for r in raw.iter().filter(|r| r.lsn != 0) {
+        if zone_of.insert(r.trace_id, r.lsn).is_none() {
+            traces_in.entry((r.lsn, r.table)).or_default().push(r.trace_id);
+        }
+    }
+    let mut out = Vec::with_capacity(raw.len());
+    for r in &raw {
+        let own = [r.trace_id];
+        let traces = match r.stage {
+            Stage::WorkerApply => zone_of
+                .get(&r.trace_id)
+                .and_then(|&z| traces_in.get(&(z, r.table)))
+                .map_or(&own[..], |v| v.as_slice()),
+            _ => &own[..],
+        };
+        for &trace_id in traces {
+            out.push(TraceSpan {
+                trace_id,
+                process: super::metrics::process_name(r.process),
+                stage: STAGES[r.stage as usize],
+                start_ns: r.start_ns,
+                dur_ns: r.dur_ns,
+            });
+        }
+    }
+    out.sort_by(|a, b| (a.trace_id, a.start_ns, &a.process).cmp(&(b.trace_id, b.start_ns, &b.process)));
+    out
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn raw(process: usize, trace_id: u64, lsn: u64, table: u64, stage: Stage, start_ns: u64) -> Raw {
+        Raw {
+            process,
+            trace_id,
+            lsn,
+            table,
+            stage,
+            start_ns,
+            dur_ns: 1,
+        }
+    }
+
+    #[test]
+    fn ring_keeps_the_latest_spans() {
+        let s = Box::new(Slot::new());
+        for i in 0..SPANS as u64 + 5 {
+            s.push(i + 1, 0, 0, Stage::Reply, i, 1);
+        }
+        let mut out = Vec::new();
+        s.read_into(3, &mut out);
+        assert_eq!(out.len(), SPANS);
+        let oldest = out.iter().map(|r| r.trace_id).min().unwrap();
+        assert_eq!(oldest, 6);
+        assert!(out.iter().all(|r| r.process == 3 && r.stage == Stage::Reply));
+    }
+
+    #[test]
+    fn worker_spans_fan_out_to_every_trace_in_their_group() {
+        let spans = attribute(vec![
+            raw(0, 7, 40, 100, Stage::SalWrite, 10),
+            raw(0, 9, 40, 100, Stage::SalWrite, 10),
+            // Same zone, another table: a different group.
+            raw(0, 15, 40, 200, Stage::SalWrite, 10),
+            raw(0, 11, 41, 100, Stage::Fsync, 30),
+            raw(0, 9, 0, 0, Stage::Request, 5),
+            // Table 100's group of zone 40, stamped with trace 7 only.
+            raw(1, 7, 0, 100, Stage::WorkerApply, 20),
+            // A trace whose master spans were overwritten keeps its own.
+            raw(2, 13, 0, 100, Stage::WorkerApply, 50),
+        ]);
+        let got: Vec<_> = spans
+            .iter()
+            .map(|s| (s.trace_id, s.process.as_str(), s.stage, s.start_ns))
+            .collect();
+        assert_eq!(
+            got,
+            [
+                (7, "master", "sal_write", 10),
+                (7, "worker0", "worker_apply", 20),
+                (9, "master", "request", 5),
+                (9, "master", "sal_write", 10),
+                (9, "worker0", "worker_apply", 20),
+                (11, "master", "fsync", 30),
+                (13, "worker1", "worker_apply", 50),
+                (15, "master", "sal_write", 10),
+            ]
+        );
+    }
+
+    #[test]
+    fn untraced_spans_record_nothing() {
+        let before = slot().head.load(Relaxed);
+        drop(span(0, Stage::Request));
+        record(0, 5, 0, Stage::Fsync, now_ns());
+        assert_eq!(slot().head.load(Relaxed), before);
+    }
+}
@@ -57,6 +57,10 @@ Options:
                        filesystem permissions.
   --tls-max-conns=N    Global cap on concurrent TLS connections (default 256).
                        A connection accepted past the cap is closed immediately.
+  --metrics-listen=IP:PORT
+                       Serve Prometheus text metrics over plain HTTP on this
+                       TCP address (port 0 = ephemeral). The bound address is
+                       written to <data_dir>/metrics_endpoint.
   --help, -h           Show this help message and exit
 
 Environment:
@@ -106,6 +110,7 @@ fn main() {
     // `Option` so "unset" is distinguishable from an explicit value; defaulted
     // to 256 at construction.
     let mut tls_max_conns: Option<u32> = None;
+    let mut metrics_listen: Option<std::net::SocketAddr> = None;
     let mut pos = 0;
 
     let mut i = 1;
@@ -148,6 +153,14 @@ fn main() {
                     process::exit(1);
                 }
             }
+        } else if let Some(val) = arg.strip_prefix("--metrics-listen=") {
+            match val.parse::<std::net::SocketAddr>() {
+                Ok(a) => metrics_listen = Some(a),
+                Err(_) => {
+                    eprintln!("Error: invalid --metrics-listen address {val:?} (expected IP:PORT)");
+                    process::exit(1);
+                }
+            }
         } else if pos == 0 {
             data_dir = arg.clone();
             pos += 1;
@@ -197,7 +210,7 @@ fn main() {
     };
 
     foundation::log::init(level, b"M");
-    let rc = runtime::server_main(&data_dir, &socket_path, num_workers, level, tls_cli);
+    let rc = runtime::server_main(&data_dir, &socket_path, num_workers, level, tls_cli, metrics_listen);
     process::exit(rc);
 }
 
@@ -83,6 +83,11 @@ impl<'a> BatchCursor<'a> {
 /// the merge-walk paid; `cogroup_left` self-positions the same way on its first
 /// group's `advance_to`.
 ///
+/// **Filter pruning.** Before galloping the match side forward, the skip asks
+/// `m.may_contain_prefix(dk)`: a sparse delta against a large trace mostly
+/// probes keys the on-disk runs' filters reject, and those groups cost one
+/// XOR8 probe per run instead of a seek.
+///
 /// **Callback contract.** `on_match` reads its match group by walking the
 /// forward-only `m` with the cursor's own step (`while m.valid &&
 /// m.current_pk_eq(key) { … m.advance() }`) and must walk the *whole* group to
@@ -107,7 +112,11 @@ pub(crate) fn cogroup_intersection(
         let dk = delta.get_pk_bytes(i);
         match dk.cmp(m.current_pk_bytes()) {
             Ordering::Less => i = delta.advance_to(m.current_pk_bytes(), i), // skip delta
-            Ordering::Greater => m.advance_to(dk),                           // skip match side
+            // Skip the match side — unless no run can hold `dk` (every shard's
+            // key range / XOR8 rejects it), in which case the delta group is
+            // dropped without a seek and `m` stays put for the next key.
+            Ordering::Greater if m.may_contain_prefix(dk) => m.advance_to(dk),
+            Ordering::Greater => i = pk_group_end(delta, i),
             Ordering::Equal => {
                 let j = pk_group_end(delta, i); // delta group
                 on_match(dk, i..j, m); // walks match group
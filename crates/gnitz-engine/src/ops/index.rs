@@ -153,11 +153,21 @@ pub fn op_integrate_with_indexes(
                 // encodes identically to the same value in a payload column (and
                 // to the batch-walk accumulator's `step_from_batch`, which reads
                 // through the same accessor).
-                let av_u64 = super::util::encode_ordered(
-                    loc.native_le_bytes(&mb, row, &mut pk_scratch),
-                    d.col_type_code as u8,
-                    d.agg_op == AggOp::Max,
-                );
+                // A sketch aggregate indexes the row's sketch cell instead of its
+                // value (`agg::sketch_cell`, the same cell the replay path steps);
+                // a value outside the sketch's domain writes no entry.
+                let av_u64 = if d.agg_op.is_sketch() {
+                    match crate::ops::reduce::sketch_cell(d.agg_op, &mb, row, *loc) {
+                        Some(cell) => cell,
+                        None => continue,
+                    }
+                } else {
+                    super::util::encode_ordered(
+                        loc.native_le_bytes(&mb, row, &mut pk_scratch),
+                        d.col_type_code as u8,
+                        d.agg_op == AggOp::Max,
+                    )
+                };
                 // Serialise the order-encoded value big-endian: the index orders
                 // entries by raw lexicographic byte comparison, so big-endian
                 // bytes make lexicographic order match the encoded value's order.
@@ -6,7 +6,9 @@ mod join;
 mod linear;
 mod reduce;
 mod reindex;
+mod retain;
 mod scan;
+mod top_k;
 mod util;
 
 #[cfg(test)]
@@ -26,5 +28,7 @@ pub(crate) use index::make_avi_schema;
 pub(crate) use join::{op_join_delta_trace, op_join_delta_trace_range};
 pub(crate) use linear::{op_filter, op_map, op_negate, op_null_extend, op_union, ReindexSpec};
 pub(crate) use reduce::{op_reduce, AggDescriptor, AggOp, ReducePlan};
+pub(crate) use retain::{op_retain, RetainBake};
 pub(crate) use scan::op_scan_trace;
+pub(crate) use top_k::{op_top_k, TopKBake};
 pub(crate) use util::{all_payload_null_mask, global_group_key, AVI_AV_BYTES};
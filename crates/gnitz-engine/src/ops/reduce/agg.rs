@@ -1,8 +1,12 @@
 //! Aggregate opcodes, descriptors, accumulator state, and AVI lookup.
 
+use std::collections::BTreeMap;
+
 use crate::schema::{ColumnLocator, TypeCode};
 use crate::storage::{MemBatch, ReadCursor};
 
+use super::sketch;
+
 // ---------------------------------------------------------------------------
 // Aggregate opcodes
 // ---------------------------------------------------------------------------
@@ -24,6 +28,14 @@ pub enum AggOp {
     /// two-phase global-aggregate combine sums per-worker partial count columns
     /// with this (a COUNT's empty value is `0`, not NULL).
     SumZero = 6,
+    /// Counting-HLL distinct estimate (see `sketch`).
+    ApproxCountDistinct = 7,
+    /// Log-bucket quantile estimate at `permyriad / 10000` (see `sketch`).
+    ApproxPercentile(u16) = 8,
+    /// `Σ value² × weight`: the second-moment state of VAR_* / STDDEV_*. Linear,
+    /// NULL identity; always an `f64` sum, whatever the source type, so an
+    /// integer square never wraps.
+    SumSquares = 9,
 }
 
 impl From<gnitz_wire::AggFunc> for AggOp {
@@ -35,31 +47,49 @@ impl From<gnitz_wire::AggFunc> for AggOp {
             gnitz_wire::AggFunc::Max => AggOp::Max,
             gnitz_wire::AggFunc::CountNonNull => AggOp::CountNonNull,
             gnitz_wire::AggFunc::SumZero => AggOp::SumZero,
+            gnitz_wire::AggFunc::ApproxCountDistinct => AggOp::ApproxCountDistinct,
+            gnitz_wire::AggFunc::ApproxPercentile(q) => AggOp::ApproxPercentile(q),
+            gnitz_wire::AggFunc::SumSquares => AggOp::SumSquares,
         }
     }
 }
 
 impl AggOp {
     pub fn is_linear(self) -> bool {
-        matches!(self, AggOp::Count | AggOp::Sum | AggOp::CountNonNull | AggOp::SumZero)
+        matches!(
+            self,
+            AggOp::Count | AggOp::Sum | AggOp::CountNonNull | AggOp::SumZero | AggOp::SumSquares
+        )
     }
 
     /// True iff an untouched accumulator renders `0`, not NULL — the
     /// zero-identity family. COUNT / COUNT_NON_NULL count rows (empty = 0);
     /// SumZero is Sum's fold under Count's 0 identity (the two-phase
     /// partial-count combine). SUM / MIN / MAX have a NULL empty value.
+    /// APPROX_COUNT_DISTINCT estimates a count (empty = 0); APPROX_PERCENTILE
+    /// of nothing is NULL.
     pub fn empty_renders_zero(self) -> bool {
-        matches!(self, AggOp::Count | AggOp::CountNonNull | AggOp::SumZero)
+        matches!(
+            self,
+            AggOp::Count | AggOp::CountNonNull | AggOp::SumZero | AggOp::ApproxCountDistinct
+        )
     }
 
     /// True iff this aggregate is maintained through the combined AggValueIndex —
-    /// the order-encodable extremes MIN/MAX. This is the single source of truth
-    /// for "which aggregates the value index serves, and in what ordinal order":
-    /// the index write side (`op_integrate_with_indexes`) and the reduce read
-    /// side (`op_reduce`) both select and order their entries by this predicate
-    /// over `agg_descs`, so the two agree by construction.
+    /// the order-encodable extremes MIN/MAX, and the sketches, whose index
+    /// entries are sketch cells rather than values. This is the single source
+    /// of truth for "which aggregates the value index serves, and in what
+    /// ordinal order": the index write side (`op_integrate_with_indexes`) and
+    /// the reduce read side (`op_reduce`) both select and order their entries by
+    /// this predicate over `agg_descs`, so the two agree by construction.
     pub fn uses_value_index(self) -> bool {
-        matches!(self, AggOp::Min | AggOp::Max)
+        matches!(self, AggOp::Min | AggOp::Max) || self.is_sketch()
+    }
+
+    /// True for the retraction-aware sketch aggregates: state is a Z-set of
+    /// sketch cells (`Accumulator::cells`), the value an estimate over it.
+    pub fn is_sketch(self) -> bool {
+        matches!(self, AggOp::ApproxCountDistinct | AggOp::ApproxPercentile(_))
     }
 }
 
@@ -84,6 +114,9 @@ pub(super) struct Accumulator {
     /// accumulator's decode/encode dispatch.
     loc: ColumnLocator,
     has_value: bool,
+    /// Sketch aggregates only: live cell → net count. Empty (and allocation-free)
+    /// for every other op.
+    cells: BTreeMap<u64, i64>,
 }
 
 impl Accumulator {
@@ -96,6 +129,7 @@ impl Accumulator {
             has_value: false,
             agg_op: desc.agg_op,
             loc,
+            cells: BTreeMap::new(),
         }
     }
 
@@ -107,6 +141,7 @@ impl Accumulator {
     pub(super) fn reset(&mut self) {
         self.acc = 0;
         self.has_value = false;
+        self.cells.clear();
     }
 
     pub(super) fn is_linear(&self) -> bool {
@@ -135,7 +170,15 @@ impl Accumulator {
 
     pub(super) fn get_value_bits(&self) -> u64 {
         // MIN/MAX hold the MIN-oriented order-preserving encoding; decode back to
-        // native value bits for emit. Linear aggregates store the value verbatim.
+        // native value bits for emit. Linear aggregates store the value verbatim;
+        // a sketch estimates from its live cells.
+        match self.agg_op {
+            AggOp::ApproxCountDistinct => return sketch::estimate_distinct(self.cells.iter()) as u64,
+            AggOp::ApproxPercentile(q) => {
+                return sketch::estimate_quantile(&self.cells, q).map_or(0, f64::to_bits);
+            }
+            _ => {}
+        }
         if self.agg_op.uses_value_index() {
             super::super::util::decode_ordered(self.acc as u64, self.col_type_code(), false)
         } else {
@@ -173,6 +216,17 @@ impl Accumulator {
         }
     }
 
+    /// Fold `count` copies of a sketch cell. A cell that nets to zero is dropped
+    /// so the map stays bounded by the live cells.
+    fn fold_cell(&mut self, cell: u64, count: i64) {
+        let c = self.cells.entry(cell).or_insert(0);
+        *c += count;
+        if *c == 0 {
+            self.cells.remove(&cell);
+        }
+        self.has_value = !self.cells.is_empty();
+    }
+
     fn is_float(&self) -> bool {
         self.col_type_code().is_float()
     }
@@ -201,6 +255,13 @@ impl Accumulator {
             return;
         }
 
+        if self.agg_op.is_sketch() {
+            if let Some(cell) = sketch_cell(self.agg_op, mb, row, self.loc) {
+                self.fold_cell(cell, weight);
+            }
+            return;
+        }
+
         let tc = self.col_type_code();
         let cs = self.loc.size();
         // SUM accumulates into an i64/u64 slot via decode_signed/decode_float;
@@ -236,6 +297,13 @@ impl Accumulator {
                     self.acc = self.acc.wrapping_add(val.wrapping_mul(weight));
                 }
             }
+            // Squared before weighting, in f64: exact for every integer square
+            // below 2^53, and never wrapped above it.
+            AggOp::SumSquares => {
+                let val_f = decode_as_f64(bytes, tc);
+                let cur_f = f64::from_bits(self.acc as u64);
+                self.acc = f64::to_bits(cur_f + val_f * val_f * weight as f64) as i64;
+            }
             // MIN/MAX hold the AVI's MIN-oriented order-preserving encoding
             // (`encode_ordered`, `for_max=false`), so the extreme test is one
             // unsigned `u64` compare — the U64-unsigned and float-total-order
@@ -251,7 +319,9 @@ impl Accumulator {
                     self.acc = enc as i64;
                 }
             }
-            AggOp::Count | AggOp::CountNonNull => unreachable!("handled by early return above"),
+            AggOp::Count | AggOp::CountNonNull | AggOp::ApproxCountDistinct | AggOp::ApproxPercentile(_) => {
+                unreachable!("handled by early return above")
+            }
         }
     }
 
@@ -261,15 +331,17 @@ impl Accumulator {
     /// family: `fold_old_aggs` skips the non-linear MIN/MAX (whose extreme the
     /// AVI owns and overwrites), so those arms are unreachable. COUNT must
     /// integer-fold even over a float source column, so the COUNT-vs-SUM split is
-    /// load-bearing — it cannot collapse to a single `is_float` branch.
+    /// load-bearing — it cannot collapse to a single `is_float` branch. A stored
+    /// SUM_SQ is already a sum of squares and always an `f64`, so it folds like
+    /// a float SUM.
     pub(super) fn merge_accumulated(&mut self, value_bits: u64) {
         match self.agg_op {
             AggOp::Count | AggOp::CountNonNull => {
                 self.acc = self.acc.wrapping_add(value_bits as i64);
                 self.has_value = true;
             }
-            AggOp::Sum | AggOp::SumZero => {
-                if self.is_float() {
+            AggOp::Sum | AggOp::SumZero | AggOp::SumSquares => {
+                if self.is_float() || self.agg_op == AggOp::SumSquares {
                     let cur_f = f64::from_bits(self.acc as u64);
                     self.acc = f64::to_bits(cur_f + f64::from_bits(value_bits)) as i64;
                 } else {
@@ -277,13 +349,43 @@ impl Accumulator {
                 }
                 self.has_value = true;
             }
-            AggOp::Min | AggOp::Max => {
+            AggOp::Min | AggOp::Max | AggOp::ApproxCountDistinct | AggOp::ApproxPercentile(_) => {
                 unreachable!("fold_old_aggs folds only linear aggregates")
             }
         }
     }
 }
 
+/// The sketch cell one non-null row contributes to a sketch aggregate, or
+/// `None` when the value sits outside the sketch's domain (a NaN percentile
+/// input). Shared by the accumulator's row step and the value-index write side
+/// (`op_integrate_with_indexes`), so an index entry and a replayed row land in
+/// the same cell by construction.
+///
+/// Distinct counting hashes the value's canonical form (the group-key hash
+/// material: strings by content, a PK column like the same payload value);
+/// the percentile reads it as an `f64` (integers convert, F32 widens).
+pub(crate) fn sketch_cell(op: AggOp, mb: &MemBatch, row: usize, loc: ColumnLocator) -> Option<u64> {
+    match op {
+        AggOp::ApproxCountDistinct => Some(sketch::hll_cell(super::super::util::value_hash64(mb, row, loc))),
+        AggOp::ApproxPercentile(_) => {
+            let tc = TypeCode::from_validated_u8(loc.type_code());
+            let mut pk_scratch = [0u8; 16];
+            let bytes = loc.native_le_bytes(mb, row, &mut pk_scratch);
+            sketch::percentile_cell(decode_as_f64(bytes, tc))
+        }
+        AggOp::Count
+        | AggOp::Sum
+        | AggOp::Min
+        | AggOp::Max
+        | AggOp::CountNonNull
+        | AggOp::SumZero
+        | AggOp::SumSquares => {
+            unreachable!("sketch_cell on a non-sketch aggregate")
+        }
+    }
+}
+
 /// Decode a column's bytes into an `i64`-shaped accumulator slot.
 ///
 /// For sub-64-bit unsigned types (`U8`/`U16`/`U32`) the value is
@@ -337,6 +439,19 @@ fn decode_float(bytes: &[u8], tc: TypeCode) -> f64 {
     }
 }
 
+/// Decode a numeric column's bytes as f64: floats widen, integers convert (a
+/// U64 as unsigned).
+#[inline]
+fn decode_as_f64(bytes: &[u8], tc: TypeCode) -> f64 {
+    if tc.is_float() {
+        decode_float(bytes, tc)
+    } else if tc == TypeCode::U64 {
+        decode_signed(bytes, tc) as u64 as f64
+    } else {
+        decode_signed(bytes, tc) as f64
+    }
+}
+
 /// Reconstruct the 8-byte `i64` accumulator bits from an emitted agg column.
 ///
 /// `bytes.len()` is the *output* column width. An 8-byte column (SUM, COUNT,
@@ -461,6 +576,24 @@ pub(super) fn apply_agg_from_value_index(
     false
 }
 
+/// Rebuild a sketch accumulator from the group's live cells in the value index:
+/// every positive-weight entry under `group_key` (= `group_cols ‖ ordinal`)
+/// is one cell at its net count. The walk is bounded by the sketch size, not the
+/// group size, and the index is integrated before the reduce reads it, so the
+/// result already reflects the delta.
+pub(super) fn apply_sketch_from_value_index(avi_cursor: &mut ReadCursor, group_key: &[u8], acc: &mut Accumulator) {
+    use super::super::util::AVI_AV_BYTES;
+    debug_assert!(acc.agg_op.is_sketch());
+    acc.reset();
+    let av_start = group_key.len();
+    avi_cursor.for_each_positive_with_prefix(group_key, |c| {
+        let k = c.current_pk_bytes();
+        let cell = u64::from_be_bytes(k[av_start..av_start + AVI_AV_BYTES].try_into().unwrap());
+        acc.cells.insert(cell, c.current_weight);
+    });
+    acc.has_value = !acc.cells.is_empty();
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
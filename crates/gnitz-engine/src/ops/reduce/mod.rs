@@ -4,11 +4,13 @@ mod agg;
 mod emit;
 mod op_reduce;
 mod plan;
+mod sketch;
 mod sort;
 
 #[cfg(test)]
 mod tests;
 
+pub(crate) use agg::sketch_cell;
 pub use agg::{AggDescriptor, AggOp};
 pub use op_reduce::op_reduce;
 pub use plan::ReducePlan;
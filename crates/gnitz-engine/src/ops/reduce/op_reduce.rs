@@ -3,7 +3,10 @@
 use crate::storage::{pk_bytes_eq, scatter_copy, Batch, DrainGuard, MemBatch, ReadCursor};
 
 use super::super::util::{extract_group_key, global_group_key};
-use super::agg::{apply_agg_from_value_index, fold_old_aggs, read_old_minmax_encoded, Accumulator, AggOp};
+use super::agg::{
+    apply_agg_from_value_index, apply_sketch_from_value_index, fold_old_aggs, read_old_minmax_encoded, Accumulator,
+    AggOp,
+};
 use super::emit::{emit_global_ground, emit_reduce_row};
 use super::plan::ReducePlan;
 use super::sort::{argsort_delta, argsort_pk_canonical, compare_by_group_cols};
@@ -99,8 +102,10 @@ fn walk_group_rows(
         // path, only for positive rows, only while the group stays all-insert
         // and under the pre-step cap — beyond it the group force-probes and the
         // partial `pos` is discarded. A mixed-in float MIN/MAX pre-stepped here
-        // is likewise discarded by its unconditional probe below.
-        let prestep_nonlinear = plan.track_nonlinear && w > 0 && !saw_negative && (idx - start) < SKIP_TRACK_CAP;
+        // is likewise discarded by its unconditional probe below. An
+        // insert-only plan has no probe to fall back on, so it is uncapped.
+        let prestep_nonlinear =
+            plan.track_nonlinear && w > 0 && !saw_negative && (plan.insert_only || (idx - start) < SKIP_TRACK_CAP);
         for acc in accs.iter_mut() {
             if acc.is_linear() || prestep_nonlinear {
                 acc.step_from_batch(mb, curr_idx, w);
@@ -217,7 +222,7 @@ pub fn op_reduce(
     // non-linear replay branch runs: it consumes `sorted_indices` slices for
     // `scatter_copy`, and it IS reachable on the identity path (natural-PK
     // MIN/MAX without an AVI), so that shape materializes the identity order.
-    let need_replay_order = !all_linear && avi_cursor.is_none();
+    let need_replay_order = !all_linear && avi_cursor.is_none() && !plan.insert_only;
     let sorted_indices: Option<Vec<u32>> = if group_by_pk && working.sorted_verified(input_schema) {
         need_replay_order.then(|| (0..n as u32).collect())
     } else if group_by_pk {
@@ -248,7 +253,7 @@ pub fn op_reduce(
 
     // Hoist replay batch outside the group loop: reuse the allocation across groups
     // rather than allocating and dropping once per group (can be 100k+ times per epoch).
-    let mut replay = (!all_linear && avi.is_none()).then(|| Batch::with_schema(*input_schema, 32));
+    let mut replay = need_replay_order.then(|| Batch::with_schema(*input_schema, 32));
 
     // Single-scan trace gather for the non-linear, non-PK, no-index fallback.
     // Replaces the per-group full-trace rescan (O(groups × trace)) with one
@@ -268,7 +273,7 @@ pub fn op_reduce(
         /// per group as usual.
         keys: Vec<u128>,
     }
-    let fallback_state: Option<FallbackScan> = if !all_linear && avi.is_none() && !group_by_pk {
+    let fallback_state: Option<FallbackScan> = if need_replay_order && !group_by_pk {
         trace_in.as_deref_mut().map(|ti_cursor| {
             // This pre-pass is gated `!group_by_pk`, so the argsort order is
             // always materialized here.
@@ -542,7 +547,23 @@ pub fn op_reduce(
             // still-positioned trace cursor into the accumulators.
             fold_old_aggs(&mut accs, trace_out_cursor, agg_descs, agg_col_widths, cbase);
         } else if !all_linear {
-            if let (Some(ref mut avi_c), Some(extractor)) = (&mut avi, &plan.avi_extractor) {
+            if plan.insert_only {
+                // Insert-only input: no extreme ever recedes, so every MIN/MAX is
+                // `combine(old, pos)` — `pos` pre-stepped uncapped in the group
+                // walk, `old` read off the still-positioned trace_out cursor
+                // alongside the linear companions. A new group is `pos` alone.
+                debug_assert!(!saw_negative, "insert-only reduce input carried a retraction");
+                if has_old {
+                    fold_old_aggs(&mut accs, trace_out_cursor, agg_descs, agg_col_widths, cbase);
+                    for (k, d) in agg_descs.iter().enumerate().filter(|(_, d)| !d.agg_op.is_linear()) {
+                        if let Some(enc) =
+                            read_old_minmax_encoded(trace_out_cursor, cbase + k, agg_col_widths[k], d.col_type_code)
+                        {
+                            accs[k].merge_encoded_extreme(enc);
+                        }
+                    }
+                }
+            } else if let (Some(ref mut avi_c), Some(extractor)) = (&mut avi, &plan.avi_extractor) {
                 // Combined-index path. Fold the linear companions (SUM / the
                 // cardinality COUNT) off the still-positioned trace_out cursor —
                 // `new = old + Σdelta` — into their accumulators (a no-op for a new
@@ -581,7 +602,12 @@ pub fn op_reduce(
                     // a retraction, a float source, a capped group, or a new group
                     // (`!has_old`, no `old` to combine; the index is its own source
                     // of truth) — byte-for-byte the old behavior.
-                    if saw_negative || d.col_type_code.is_float() || capped || !has_old {
+                    if d.agg_op.is_sketch() {
+                        // A sketch has no `combine(old, pos)` shortcut: its
+                        // estimate is re-derived from the group's live cells.
+                        gk[gstride] = j as u8;
+                        apply_sketch_from_value_index(avi_c, &gk[..gstride + 1], &mut accs[k]);
+                    } else if saw_negative || d.col_type_code.is_float() || capped || !has_old {
                         gk[gstride] = j as u8;
                         apply_agg_from_value_index(avi_c, &gk[..gstride + 1], d.agg_op == AggOp::Max, &mut accs[k]);
                     } else if let Some(enc) = read_old_minmax_encoded(
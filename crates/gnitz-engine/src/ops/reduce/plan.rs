@@ -44,9 +44,16 @@ pub struct ReducePlan {
     /// retraction probe can gallop from the live position.
     pub(crate) monotone_out_pk: bool,
     /// Pre-step MIN/MAX accumulators during the group walk for the AVI
-    /// probe-skip path (only meaningful with an AVI; a float MIN/MAX always
-    /// probes, so an all-float extreme set never benefits).
+    /// probe-skip path (only meaningful with an AVI or `insert_only`; a float
+    /// MIN/MAX always probes, so an all-float extreme set never benefits, and a
+    /// sketch always rebuilds from the index).
     pub(crate) track_nonlinear: bool,
+    /// The input carries insertions only (it reads append-only tables through
+    /// retraction-free operators), and every non-linear aggregate is an integer
+    /// MIN/MAX. An extreme then never recedes, so each group's new value is
+    /// `combine(old, pos)` — no value index, no input trace, no replay, and no
+    /// pre-step cap.
+    pub(crate) insert_only: bool,
     /// Position of the NULL-blind COUNT that carries a group's net cardinality
     /// for the emission gate. `Some` only for the planner shapes that promise a
     /// companion COUNT (all-linear, grouped, or global-ground); a genuinely
@@ -80,6 +87,9 @@ impl ReducePlan {
     /// Bake a reduce plan. `has_avi` states whether the instruction carries a
     /// combined value-index table (the exec dispatch then always opens its
     /// cursor, so the compile-time flag and the runtime cursor agree).
+    /// `insert_only` selects the index-free MIN/MAX path; the compiler sets it
+    /// only for an insert-only input whose non-linear aggregates are all integer
+    /// MIN/MAX, and never together with `has_avi`.
     #[allow(clippy::too_many_arguments)]
     pub fn new(
         input_schema: &SchemaDescriptor,
@@ -88,9 +98,20 @@ impl ReducePlan {
         agg_descs: &[AggDescriptor],
         out_key: ReduceOutKey,
         has_avi: bool,
+        insert_only: bool,
         global_ground: bool,
         i_am_owner: bool,
     ) -> Self {
+        debug_assert!(
+            !(insert_only && has_avi),
+            "the insert-only reduce path replaces the value index"
+        );
+        debug_assert!(
+            !insert_only
+                || agg_descs.iter().all(|d| d.agg_op.is_linear()
+                    || (matches!(d.agg_op, AggOp::Min | AggOp::Max) && !d.col_type_code.is_float())),
+            "the insert-only reduce path folds integer MIN/MAX only"
+        );
         let num_aggs = agg_descs.len();
         let num_out_cols = output_schema.num_columns();
         let cbase = num_out_cols - num_aggs;
@@ -102,10 +123,10 @@ impl ReducePlan {
         // Either natural kind keys the emitted row by the group value itself, so
         // the output schema carries no group-exemplar columns.
         let use_natural_pk = out_key != ReduceOutKey::SyntheticFold;
-        let track_nonlinear = has_avi
+        let track_nonlinear = (has_avi || insert_only)
             && agg_descs
                 .iter()
-                .any(|d| d.agg_op.uses_value_index() && !d.col_type_code.is_float());
+                .any(|d| matches!(d.agg_op, AggOp::Min | AggOp::Max) && !d.col_type_code.is_float());
 
         // A group exists iff its net cardinality (row weight) is positive; the
         // unique NULL-blind COUNT carries that signal. All three disjuncts are
@@ -126,8 +147,8 @@ impl ReducePlan {
             .map(|d| input_schema.locate(d.col_idx as usize))
             .collect();
         let avi_extractor = has_avi.then(|| GroupKeyExtractor::new(input_schema, group_by_cols));
-        let fallback_keys =
-            (!all_linear && !has_avi && !group_by_pk).then(|| GroupKeyCols::new(input_schema, group_by_cols));
+        let fallback_keys = (!all_linear && !has_avi && !insert_only && !group_by_pk)
+            .then(|| GroupKeyCols::new(input_schema, group_by_cols));
 
         let agg_col_widths: Vec<usize> = (0..num_aggs)
             .map(|k| output_schema.columns[cbase + k].size() as usize)
@@ -168,6 +189,7 @@ impl ReducePlan {
             group_by_pk,
             monotone_out_pk,
             track_nonlinear,
+            insert_only,
             cardinality_idx,
             sort_descs,
             packed_sort,
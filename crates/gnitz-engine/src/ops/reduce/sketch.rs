@@ -0,0 +1,228 @@
+//! Retraction-aware sketches behind APPROX_COUNT_DISTINCT / APPROX_PERCENTILE.
+//!
+//! A classic HLL register or KLL compactor throws away what a deletion would
+//! need to undo. Here the sketch state is instead a Z-set of *cells* — one
+//! small integer per input row — whose weights are signed counters, so a
+//! retracted row cancels its own cell exactly and the estimate is a pure
+//! function of the group's live rows (order- and history-independent). The
+//! number of distinct cells is bounded by the sketch size, not the group size:
+//! the reduce keeps them in its combined value index (cell in the `av` slot)
+//! and re-derives a touched group's estimate by walking that group's cells.
+//!
+//! * Distinct count: a counting HyperLogLog. Cell = `register ‖ rank`; a
+//!   register's value is the largest rank with a positive count.
+//! * Percentile: a DDSketch-style log-bucket histogram with relative accuracy
+//!   [`PERCENTILE_ALPHA`]. Cells are order-preserving in the value, so an
+//!   ascending cell walk is the CDF.
+
+use std::collections::BTreeMap;
+
+/// HLL precision: `2^HLL_P` registers (standard error ≈ 1.04 / √512 ≈ 4.6%).
+const HLL_P: u32 = 9;
+const HLL_M: usize = 1 << HLL_P;
+
+/// The HLL cell of a 64-bit value hash: the top `HLL_P` bits pick the register,
+/// the rank is one plus the leading-zero run of the rest.
+#[inline]
+pub(super) fn hll_cell(hash: u64) -> u64 {
+    let register = hash >> (64 - HLL_P);
+    let rank = (hash << HLL_P).leading_zeros().min(64 - HLL_P) + 1;
+    (register << 8) | rank as u64
+}
+
+/// Distinct-count estimate over `(cell, count)` pairs; non-positive counts are
+/// dead cells and contribute nothing. Raw HLL with the linear-counting
+/// small-range correction (the 64-bit hash needs no large-range one).
+pub(super) fn estimate_distinct<'a>(cells: impl Iterator<Item = (&'a u64, &'a i64)>) -> i64 {
+    let mut registers = [0u8; HLL_M];
+    for (&cell, &count) in cells {
+        if count > 0 {
+            let r = &mut registers[(cell >> 8) as usize];
+            *r = (*r).max(cell as u8);
+        }
+    }
+    let m = HLL_M as f64;
+    let zeros = registers.iter().filter(|&&r| r == 0).count();
+    let harmonic: f64 = registers.iter().map(|&r| (-(r as f64)).exp2()).sum();
+    let alpha = 0.7213 / (1.0 + 1.079 / m);
+    let raw = alpha * m * m / harmonic;
+    let est = if raw <= 2.5 * m && zeros > 0 {
+        m * (m / zeros as f64).ln()
+    } else {
+        raw
+    };
+    est.round() as i64
+}
+
+/// Relative accuracy of a percentile estimate: the returned value is within
+/// `PERCENTILE_ALPHA · |v|` of some value whose rank is the requested one.
+const PERCENTILE_ALPHA: f64 = 0.01;
+/// `γ = (1 + α) / (1 − α)`: bucket `k` covers `(γ^(k−1), γ^k]`.
+const PERCENTILE_GAMMA: f64 = (1.0 + PERCENTILE_ALPHA) / (1.0 - PERCENTILE_ALPHA);
+/// Magnitudes below this land in the zero bucket (keeps `k` finite and small).
+const PERCENTILE_MIN_INDEXABLE: f64 = 1e-300;
+
+/// Sign classes in the cell's high word, ascending in value order.
+const CLASS_NEG: u64 = 0;
+const CLASS_ZERO: u64 = 1;
+const CLASS_POS: u64 = 2;
+const INDEX_BIAS: i64 = 1 << 31;
+
+/// The percentile cell of `v`, or `None` for NaN (unordered, so it is left out
+/// of the distribution the way NULL is). Layout `class << 32 | biased index`,
+/// with the negative class's index reversed, so cell order is value order.
+#[inline]
+pub(super) fn percentile_cell(v: f64) -> Option<u64> {
+    if v.is_nan() {
+        return None;
+    }
+    let mag = v.abs();
+    if mag < PERCENTILE_MIN_INDEXABLE {
+        return Some(CLASS_ZERO << 32);
+    }
+    // The clamp pins ±∞ to the outermost bucket, past every finite one.
+    let k = (mag.ln() / PERCENTILE_GAMMA.ln())
+        .ceil()
+        .clamp(-INDEX_BIAS as f64, (INDEX_BIAS - 1) as f64) as i64;
+    Some(if v < 0.0 {
+        (CLASS_NEG << 32) | (INDEX_BIAS - 1 - k) as u64
+    } else {
+        (CLASS_POS << 32) | (k + INDEX_BIAS) as u64
+    })
+}
+
+/// The bucket midpoint a percentile cell stands for.
+fn percentile_value(cell: u64) -> f64 {
+    let low = (cell & 0xFFFF_FFFF) as i64;
+    let (sign, k) = match cell >> 32 {
+        CLASS_NEG => (-1.0, INDEX_BIAS - 1 - low),
+        CLASS_POS => (1.0, low - INDEX_BIAS),
+        _ => return 0.0,
+    };
+    sign * 2.0 * PERCENTILE_GAMMA.powi(k as i32) / (PERCENTILE_GAMMA + 1.0)
+}
+
+/// The `permyriad / 10000` quantile over `(cell, count)` pairs in ascending
+/// cell order, or `None` when no cell is live. Nearest-rank on the 0-based
+/// rank `q · (n − 1)`, as DDSketch defines it.
+pub(super) fn estimate_quantile(cells: &BTreeMap<u64, i64>, permyriad: u16) -> Option<f64> {
+    let n: i64 = cells.values().filter(|&&c| c > 0).sum();
+    if n == 0 {
+        return None;
+    }
+    let rank = (permyriad as f64 / 10_000.0 * (n - 1) as f64).floor() as i64;
+    let mut seen = 0i64;
+    for (&cell, &count) in cells {
+        if count <= 0 {
+            continue;
+        }
+        seen += count;
+        if seen > rank {
+            return Some(percentile_value(cell));
+        }
+    }
+    unreachable!("rank < n")
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use xxhash_rust::xxh3::xxh3_64;
+
+    fn fold(cells: &mut BTreeMap<u64, i64>, cell: u64, w: i64) {
+        *cells.entry(cell).or_insert(0) += w;
+    }
+
+    #[test]
+    fn distinct_estimate_within_error_and_exact_under_retraction() {
+        let mut cells = BTreeMap::new();
+        for v in 0u64..20_000 {
+            fold(&mut cells, hll_cell(xxh3_64(&v.to_le_bytes())), 1);
+        }
+        let full = estimate_distinct(cells.iter());
+        assert!((full - 20_000).abs() < 20_000 * 15 / 100, "estimate {full}");
+
+        // Duplicates do not move the estimate.
+        for v in 0u64..5_000 {
+            fold(&mut cells, hll_cell(xxh3_64(&v.to_le_bytes())), 1);
+        }
+        assert_eq!(estimate_distinct(cells.iter()), full);
+
+        // Retract everything above 100 (both copies of the duplicated ones): the
+        // sketch is the one a fresh build over 0..100 would produce.
+        for v in 100u64..20_000 {
+            let w = if v < 5_000 { -2 } else { -1 };
+            fold(&mut cells, hll_cell(xxh3_64(&v.to_le_bytes())), w);
+        }
+        let mut fresh = BTreeMap::new();
+        for v in 0u64..100 {
+            fold(&mut fresh, hll_cell(xxh3_64(&v.to_le_bytes())), 1);
+        }
+        assert_eq!(estimate_distinct(cells.iter()), estimate_distinct(fresh.iter()));
+        assert!((estimate_distinct(fresh.iter()) - 100).abs() <= 5);
+        assert_eq!(estimate_distinct(std::iter::empty()), 0);
+    }
+
+    #[test]
+    fn percentile_cells_preserve_order() {
+        let vals = [
+            f64::NEG_INFINITY,
+            -1e9,
+            -3.5,
+            -1.0,
+            -1e-9,
+            0.0,
+            1e-9,
+            1.0,
+            1.02,
+            3.5,
+            1e9,
+            f64::INFINITY,
+        ];
+        let cells: Vec<u64> = vals.iter().map(|&v| percentile_cell(v).unwrap()).collect();
+        assert!(cells.windows(2).all(|w| w[0] < w[1]), "{cells:?}");
+        assert_eq!(percentile_cell(f64::NAN), None);
+    }
+
+    #[test]
+    fn percentile_estimate_within_relative_error() {
+        let mut cells = BTreeMap::new();
+        for v in 1..=1000 {
+            fold(&mut cells, percentile_cell(v as f64).unwrap(), 1);
+        }
+        for (q, want) in [
+            (0u16, 1.0),
+            (5_000, 500.0),
+            (9_000, 900.0),
+            (9_900, 990.0),
+            (10_000, 1000.0),
+        ] {
+            let got = estimate_quantile(&cells, q).unwrap();
+            assert!(
+                (got - want).abs() <= want * PERCENTILE_ALPHA * 1.01,
+                "q={q}: {got} vs {want}"
+            );
+        }
+        // Retracting the top half moves the median down to the new middle.
+        for v in 501..=1000 {
+            fold(&mut cells, percentile_cell(v as f64).unwrap(), -1);
+        }
+        let median = estimate_quantile(&cells, 5_000).unwrap();
+        assert!((median - 250.0).abs() <= 250.0 * PERCENTILE_ALPHA * 1.01, "{median}");
+        for v in 1..=500 {
+            fold(&mut cells, percentile_cell(v as f64).unwrap(), -1);
+        }
+        assert_eq!(estimate_quantile(&cells, 5_000), None);
+    }
+
+    #[test]
+    fn percentile_handles_signs_and_zero() {
+        let mut cells = BTreeMap::new();
+        for v in [-100.0, -10.0, 0.0, 10.0, 100.0] {
+            fold(&mut cells, percentile_cell(v).unwrap(), 1);
+        }
+        assert_eq!(estimate_quantile(&cells, 5_000), Some(0.0));
+        let lo = estimate_quantile(&cells, 0).unwrap();
+        assert!((lo + 100.0).abs() <= 100.0 * PERCENTILE_ALPHA * 1.01, "{lo}");
+    }
+}
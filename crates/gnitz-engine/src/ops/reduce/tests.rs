@@ -69,6 +69,7 @@ fn make_plan(
         agg_descs,
         input_schema.reduce_out_key(group_by_cols),
         has_avi,
+        false,
         global_ground,
         i_am_owner,
     )
@@ -218,6 +219,114 @@ fn test_reduce_sum_retraction() {
     assert_eq!(out2.count, 2);
 }
 
+/// Drive a grouped SUM_SQ reduce (all rows in group 10) through two ticks and
+/// return the F64 Σx² of each tick's inserted row.
+fn sum_squares_two_ticks(t1: &[(u64, i64, i64)], t2: &[(u64, i64, i64)]) -> (f64, f64) {
+    use crate::storage::ReadCursor;
+    use std::rc::Rc;
+
+    let in_schema = SchemaDescriptor::new(
+        &[
+            SchemaColumn::new(type_code::U64, 0),
+            SchemaColumn::new(type_code::I64, 0),
+            SchemaColumn::new(type_code::I64, 0),
+        ],
+        &[0],
+    );
+    let out_schema = SchemaDescriptor::new(
+        &[
+            SchemaColumn::new(type_code::U128, 0),
+            SchemaColumn::new(type_code::I64, 0),
+            SchemaColumn::new(type_code::F64, 1),
+            SchemaColumn::new(type_code::I64, 0),
+        ],
+        &[0],
+    );
+    let aggs = [
+        AggDescriptor {
+            col_idx: 2,
+            agg_op: AggOp::SumSquares,
+            col_type_code: TypeCode::I64,
+        },
+        AggDescriptor {
+            col_idx: 0,
+            agg_op: AggOp::Count,
+            col_type_code: TypeCode::I64,
+        },
+    ];
+    let delta = |rows: &[(u64, i64, i64)]| {
+        let mut b = Batch::with_schema(in_schema, rows.len());
+        for &(pk, w, val) in rows {
+            b.extend_pk(pk as u128);
+            b.extend_weight(&w.to_le_bytes());
+            b.extend_null_bmp(&0u64.to_le_bytes());
+            b.extend_col(0, &10i64.to_le_bytes());
+            b.extend_col(1, &val.to_le_bytes());
+            b.count += 1;
+        }
+        b.set_layout_unchecked(Layout::Consolidated);
+        b
+    };
+    let sum_sq = |out: &Batch| {
+        let row = (0..out.count).find(|&i| out.get_weight(i) > 0).expect("insert row");
+        f64::from_bits(read_i64_le(out.col_data(1), row * 8) as u64)
+    };
+
+    let empty_out = Rc::new(Batch::empty_with_schema(&out_schema));
+    let mut to_ch = ReadCursor::from_owned(&[empty_out], out_schema);
+    let out1 = op_reduce(
+        &delta(t1),
+        None,
+        &mut to_ch,
+        &in_schema,
+        &out_schema,
+        &[1u32],
+        &aggs,
+        None,
+        false,
+        false,
+    );
+    assert_eq!(out1.count, 1);
+    let first = sum_sq(&out1);
+
+    let mut to_ch2 = ReadCursor::from_owned(&[Rc::new(out1)], out_schema);
+    let out2 = op_reduce(
+        &delta(t2),
+        None,
+        &mut to_ch2,
+        &in_schema,
+        &out_schema,
+        &[1u32],
+        &aggs,
+        None,
+        false,
+        false,
+    );
+    (first, sum_sq(&out2))
+}
+
+/// SUM_SQ folds like SUM: a retraction subtracts its square, and the next tick's
+/// new value is the stored sum of squares plus the delta's (3² + 4² → 4² + 5²).
+#[test]
+fn sum_squares_folds_linearly_across_ticks() {
+    let (t1, t2) = sum_squares_two_ticks(&[(1, 1, 3), (2, 1, -4)], &[(1, -1, 3), (3, 1, 5)]);
+    assert_eq!(t1, 25.0);
+    assert_eq!(t2, 41.0);
+}
+
+/// An integer source squares in f64, so Σx² past `i64::MAX` neither wraps nor
+/// goes negative: x just above √i64::MAX has x² > i64::MAX, two of them sum
+/// to 2x², and retracting one leaves exactly x².
+#[test]
+fn sum_squares_of_large_integers_does_not_wrap() {
+    let x: i64 = 3_037_000_500;
+    assert!(x.checked_mul(x).is_none());
+    let xf = x as f64;
+    let (t1, t2) = sum_squares_two_ticks(&[(1, 1, x), (2, 1, -x)], &[(1, -1, x)]);
+    assert_eq!(t1, 2.0 * xf * xf);
+    assert_eq!(t2, xf * xf);
+}
+
 /// All-linear gate: a non-nullable SUM-only group driven to empty must emit only
 /// the −1 retraction of its stored row — no +1 zombie carrying SUM=0. The reduce
 /// carries the appended Count cardinality companion; once the group's net
@@ -8459,3 +8568,188 @@ fn avi_skip_global_aggregate() {
         "retract-the-max global recedes via probe"
     );
 }
+
+// Sketch aggregates through the production value-index write and read paths:
+// APPROX_COUNT_DISTINCT (ordinal 0) and APPROX_PERCENTILE (ordinal 1) over one
+// group, built by two ingests (200 inserts, then 100 retractions). The index
+// walk must land on exactly the estimate a replay of the surviving rows gives —
+// the retraction cancels its cells rather than leaving a stale register.
+#[test]
+fn avi_full_path_sketches_match_replay_under_retraction() {
+    use super::agg::apply_sketch_from_value_index;
+    use crate::ops::index::{make_avi_schema, op_integrate_with_indexes, AviBake, AviDesc};
+    use crate::storage::Table;
+
+    let in_schema = SchemaDescriptor::new(
+        &[
+            SchemaColumn::new(type_code::U64, 0), // pk
+            SchemaColumn::new(type_code::U64, 0), // g (group)
+            SchemaColumn::new(type_code::I64, 0), // val (agg)
+        ],
+        &[0],
+    );
+    let rows = |range: std::ops::RangeInclusive<u64>, w: i64| {
+        let mut b = Batch::with_schema(in_schema, 200);
+        for pk in range {
+            b.extend_pk(pk as u128);
+            b.extend_weight(&w.to_le_bytes());
+            b.extend_null_bmp(&0u64.to_le_bytes());
+            b.extend_col(in_schema.try_payload_idx(1).unwrap(), &5u64.to_le_bytes());
+            b.extend_col(in_schema.try_payload_idx(2).unwrap(), &(pk as i64).to_le_bytes());
+            b.count += 1;
+        }
+        b
+    };
+    let inserts = rows(1..=200, 1);
+    let retracts = rows(101..=200, -1);
+    let survivors = rows(1..=100, 1);
+
+    let aggs = [
+        AggDescriptor {
+            col_idx: 2,
+            agg_op: AggOp::ApproxCountDistinct,
+            col_type_code: TypeCode::I64,
+        },
+        AggDescriptor {
+            col_idx: 2,
+            agg_op: AggOp::ApproxPercentile(5_000),
+            col_type_code: TypeCode::I64,
+        },
+    ];
+    let tmp = tempfile::tempdir().unwrap();
+    let mut avi_t = Table::new(
+        tmp.path().to_str().unwrap(),
+        make_avi_schema(&in_schema, &[1]),
+        0,
+        1 << 20,
+        crate::storage::RecoverySource::Rederive,
+    )
+    .unwrap();
+    let bake = AviBake::new(&in_schema, &[1], &aggs);
+    let avi = AviDesc {
+        table: &mut avi_t as *mut Table,
+        bake: &bake,
+    };
+    op_integrate_with_indexes(&inserts, None, Some(&avi)).unwrap();
+    op_integrate_with_indexes(&retracts, None, Some(&avi)).unwrap();
+
+    let mut ch = avi_t.open_cursor();
+    let mut gk = [0u8; crate::schema::MAX_PK_BYTES];
+    bake.extractor.gather(&inserts.as_mem_batch(), 0, &mut gk);
+    let stride = bake.extractor.stride;
+    let smb = survivors.as_mem_batch();
+    for (j, agg) in aggs.iter().enumerate() {
+        gk[stride] = j as u8;
+        let mut from_index = Accumulator::new(agg, in_schema.locate(2));
+        apply_sketch_from_value_index(&mut ch, &gk[..stride + 1], &mut from_index);
+        let mut replayed = Accumulator::new(agg, in_schema.locate(2));
+        for row in 0..survivors.count {
+            replayed.step_from_batch(&smb, row, 1);
+        }
+        assert_eq!(from_index.get_value_bits(), replayed.get_value_bits(), "aggregate {j}");
+    }
+
+    gk[stride] = 0;
+    let mut distinct = Accumulator::new(&aggs[0], in_schema.locate(2));
+    apply_sketch_from_value_index(&mut ch, &gk[..stride + 1], &mut distinct);
+    let n = distinct.get_value_bits() as i64;
+    assert!((90..=110).contains(&n), "distinct estimate {n}");
+    gk[stride] = 1;
+    let mut median = Accumulator::new(&aggs[1], in_schema.locate(2));
+    apply_sketch_from_value_index(&mut ch, &gk[..stride + 1], &mut median);
+    let m = f64::from_bits(median.get_value_bits());
+    assert!((m - 50.0).abs() <= 1.0, "median estimate {m}");
+}
+
+// ===========================================================================
+// Insert-only MIN/MAX: no value index and no input trace — each extreme folds
+// `combine(old, pos)` off trace_out.
+// ===========================================================================
+
+/// One insert-only tick over `cg3_src()` (MIN + COUNT grouped by `g`), with
+/// neither an index nor a trace_in cursor. Returns the output rows as sorted
+/// `(g, weight, min, count)`, `min = None` for NULL.
+fn cg3_insert_only_tick(delta: &Batch, trace_out: &[std::rc::Rc<Batch>]) -> (Batch, Vec<(i32, i64, Option<i64>, i64)>) {
+    let in_schema = cg3_src();
+    let out_schema = cg3_out();
+    let plan = ReducePlan::new(
+        &in_schema,
+        &out_schema,
+        &[1u32],
+        &[CG3_MIN, CG3_COUNT],
+        in_schema.reduce_out_key(&[1u32]),
+        false,
+        true,
+        false,
+        false,
+    );
+    let mut to = ReadCursor::from_owned(trace_out, out_schema);
+    let out = super::op_reduce::op_reduce(delta, None, &mut to, None, &plan);
+    let mb = out.as_mem_batch();
+    let mut rows: Vec<(i32, i64, Option<i64>, i64)> = (0..out.count)
+        .map(|r| {
+            let g = i32::from_le_bytes(out.col_data(0)[r * 4..r * 4 + 4].try_into().unwrap());
+            let min = (out.get_null_word(r) & 0b10 == 0).then(|| read_i64_le(out.col_data(1), r * 8));
+            (g, mb.get_weight(r), min, read_i64_le(out.col_data(2), r * 8))
+        })
+        .collect();
+    rows.sort_unstable();
+    (out, rows)
+}
+
+#[test]
+fn insert_only_min_folds_old_extreme_without_index() {
+    use std::rc::Rc;
+    let empty = Rc::new(Batch::empty_with_schema(&cg3_out()));
+    let d1 = cg3_delta(&[
+        (1, 1, 7, 5, false),
+        (2, 1, 7, 8, false),
+        (3, 1, 7, 0, true),
+        (4, 1, 9, 0, true),
+    ]);
+    let (out1, rows) = cg3_insert_only_tick(&d1, &[empty.clone()]);
+    assert_eq!(rows, vec![(7, 1, Some(5), 3), (9, 1, None, 1)]);
+
+    // g=7 gains a larger value (MIN kept, COUNT grows); the all-NULL g=9 gains
+    // its first value.
+    let trace = vec![empty, Rc::new(out1)];
+    let d2 = cg3_delta(&[(5, 1, 7, 6, false), (6, 1, 9, 4, false)]);
+    let (out2, rows) = cg3_insert_only_tick(&d2, &trace);
+    assert_eq!(
+        rows,
+        vec![
+            (7, -1, Some(5), 3),
+            (7, 1, Some(5), 4),
+            (9, -1, None, 1),
+            (9, 1, Some(4), 2)
+        ]
+    );
+
+    // A new lower value replaces the stored extreme.
+    let mut trace = trace;
+    trace.push(Rc::new(out2));
+    let (_, rows) = cg3_insert_only_tick(&cg3_delta(&[(7, 1, 9, -3, false)]), &trace);
+    assert_eq!(rows, vec![(9, -1, Some(4), 2), (9, 1, Some(-3), 3)]);
+}
+
+/// A group longer than the AVI pre-step cap still folds every row: the
+/// insert-only path has no probe to fall back on.
+#[test]
+fn insert_only_min_uncapped_long_group() {
+    use std::rc::Rc;
+    let empty = Rc::new(Batch::empty_with_schema(&cg3_out()));
+    let n = 3 * 128u64;
+    let rows: Vec<(u64, i64, i32, i64, bool)> = (0..n).map(|i| (i, 1, 7, 1000 - i as i64, false)).collect();
+    let (out1, got) = cg3_insert_only_tick(&cg3_delta(&rows), &[empty.clone()]);
+    assert_eq!(got, vec![(7, 1, Some(1001 - n as i64), n as i64)]);
+
+    let rows: Vec<(u64, i64, i32, i64, bool)> = (n..2 * n).map(|i| (i, 1, 7, -(i as i64), false)).collect();
+    let (_, got) = cg3_insert_only_tick(&cg3_delta(&rows), &[empty, Rc::new(out1)]);
+    assert_eq!(
+        got,
+        vec![
+            (7, -1, Some(1001 - n as i64), n as i64),
+            (7, 1, Some(1 - 2 * n as i64), 2 * n as i64)
+        ]
+    );
+}
@@ -0,0 +1,270 @@
+//! Watermark retention (`OpNode::Retain`): bounds a windowed aggregate's state
+//! by expiring rows whose window has closed.
+
+use std::cell::Cell;
+
+use crate::schema::{ColumnLocator, SchemaDescriptor};
+use crate::storage::{Batch, ReadCursor};
+
+use super::top_k::make_top_k_schema;
+use super::util::{encode_ordered, AVI_AV_BYTES};
+
+/// The null-rank byte every retain index key leads with. NULL rows are never
+/// indexed (they never expire), so the byte is constant; it is kept so the
+/// index shares the top-K order index layout.
+const NON_NULL_RANK: u8 = 1;
+
+/// Index key bytes ahead of the input PK: the rank byte and the encoded value.
+const PREFIX_LEN: usize = 1 + AVI_AV_BYTES;
+
+// ---------------------------------------------------------------------------
+// Baked resources
+// ---------------------------------------------------------------------------
+
+/// The compile-time-baked retain resources (`Program::retain_bakes`): the index
+/// schema — a group-less top-K order index on the retained column, so the rows
+/// that expire first sit first — the column's locator, the horizon, and the
+/// watermark.
+///
+/// The watermark is the largest retained value this worker has passed, in the
+/// order-encoded domain (where the horizon subtracts exactly: the integer
+/// encoding is an offset). It is not persisted: after a restart the first tick
+/// re-derives it from the index's last live row.
+pub struct RetainBake {
+    pub(crate) schema: SchemaDescriptor,
+    col_loc: ColumnLocator,
+    horizon: u64,
+    watermark: Cell<Option<u64>>,
+}
+
+impl RetainBake {
+    pub(crate) fn new(src: &SchemaDescriptor, col: u32, horizon: u64) -> Self {
+        RetainBake {
+            schema: make_top_k_schema(src, &[]),
+            col_loc: src.locate(col as usize),
+            horizon,
+            watermark: Cell::new(None),
+        }
+    }
+
+    /// The lowest retained value under `watermark`; every row below it has
+    /// expired.
+    fn floor(&self, watermark: Option<u64>) -> u64 {
+        watermark.map_or(0, |w| w.saturating_sub(self.horizon))
+    }
+}
+
+// ---------------------------------------------------------------------------
+// op_retain
+// ---------------------------------------------------------------------------
+
+/// Watermark retention. Advances the watermark to the largest retained value
+/// among `delta`'s insertions, drops every delta row that lands below the new
+/// floor (`watermark − horizon`), and — when the floor moves — retracts the
+/// index rows it moved past by walking the index (`cursor`, the integral before
+/// this tick) from its low end. The output, in the input schema, is the
+/// surviving delta plus those retractions; a row with a NULL retained value
+/// always passes and is never indexed.
+///
+/// A late deletion of an already-expired row is dropped like a late insertion:
+/// its row was retracted when it expired, so the view holds nothing to remove.
+/// The per-tick cost is O(|Δ|) plus the rows that expire, each of which is
+/// visited once.
+///
+/// Returns `(output, index_delta)`; the caller ingests `index_delta` into the
+/// index table, like `op_top_k`.
+pub fn op_retain(
+    delta: &Batch,
+    cursor: &mut ReadCursor,
+    in_schema: &SchemaDescriptor,
+    bake: &RetainBake,
+) -> (Batch, Batch) {
+    if delta.count == 0 {
+        return (
+            Batch::empty_with_schema(in_schema),
+            Batch::empty_with_schema(&bake.schema),
+        );
+    }
+    let prev = bake.watermark.get().or_else(|| index_watermark(cursor));
+
+    let mb = delta.as_mem_batch();
+    let mut scratch = [0u8; 16];
+    let values: Vec<Option<u64>> = (0..delta.count)
+        .map(|row| {
+            (!bake.col_loc.is_null(&mb, row)).then(|| {
+                let bytes = bake.col_loc.native_le_bytes(&mb, row, &mut scratch);
+                encode_ordered(bytes, bake.col_loc.type_code(), false)
+            })
+        })
+        .collect();
+    let newest = (0..delta.count)
+        .filter(|&row| mb.get_weight(row) > 0)
+        .filter_map(|row| values[row])
+        .max();
+    let watermark = prev.max(newest);
+    bake.watermark.set(watermark);
+    let floor = bake.floor(watermark);
+
+    let mut output = Batch::with_schema(*in_schema, delta.count);
+    let mut index_delta = Batch::with_schema(bake.schema, delta.count);
+    let mut key = [0u8; crate::schema::MAX_PK_BYTES];
+    key[0] = NON_NULL_RANK;
+    for (row, value) in values.iter().enumerate() {
+        let pk = mb.get_pk_bytes(row);
+        let w = mb.get_weight(row);
+        match *value {
+            None => output.append_row_from_source_bytes(pk, w, &mb, row, None),
+            Some(v) if v < floor => {}
+            Some(v) => {
+                output.append_row_from_source_bytes(pk, w, &mb, row, None);
+                key[1..PREFIX_LEN].copy_from_slice(&v.to_be_bytes());
+                key[PREFIX_LEN..PREFIX_LEN + pk.len()].copy_from_slice(pk);
+                index_delta.append_row_from_source_bytes(&key[..PREFIX_LEN + pk.len()], w, &mb, row, None);
+            }
+        }
+    }
+
+    // Nothing below the previous floor is still indexed, so the walk only runs
+    // when the floor moves, and stops at the first row it keeps.
+    if floor > bake.floor(prev) {
+        let mut hit = cursor.seek_first_positive_with_prefix(&[NON_NULL_RANK]);
+        while hit && indexed_value(cursor.current_pk_bytes()) < floor {
+            let w = cursor.current_weight;
+            cursor.copy_current_row_into(&mut index_delta, -w);
+            let (src, row) = cursor.current_row_source();
+            output.append_row_from_source_bytes(&cursor.current_pk_bytes()[PREFIX_LEN..], -w, src, row, None);
+            cursor.advance();
+            hit = cursor.walk_to_positive_with_prefix(&[NON_NULL_RANK]);
+        }
+    }
+
+    (
+        output.into_consolidated(in_schema),
+        index_delta.into_consolidated(&bake.schema),
+    )
+}
+
+/// The retained value an index key carries.
+fn indexed_value(key: &[u8]) -> u64 {
+    u64::from_be_bytes(key[1..PREFIX_LEN].try_into().unwrap())
+}
+
+/// The largest retained value still indexed — the watermark a restarted
+/// operator resumes from. The index is bounded by the horizon, so the one-off
+/// walk is too.
+fn index_watermark(cursor: &mut ReadCursor) -> Option<u64> {
+    let mut newest = None;
+    cursor.for_each_positive_with_prefix(&[NON_NULL_RANK], |c| newest = Some(indexed_value(c.current_pk_bytes())));
+    newest
+}
+
+// ---------------------------------------------------------------------------
+// Tests
+// ---------------------------------------------------------------------------
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::schema::{type_code, SchemaColumn};
+    use std::rc::Rc;
+
+    /// `(pk U64, ts I64 NULL)`.
+    fn schema() -> SchemaDescriptor {
+        SchemaDescriptor::new(
+            &[
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::I64, 1),
+            ],
+            &[0],
+        )
+    }
+
+    /// Rows `(pk, weight, ts)`; `ts = None` is NULL.
+    fn batch(rows: &[(u64, i64, Option<i64>)]) -> Batch {
+        let mut b = Batch::with_schema(schema(), rows.len());
+        for &(pk, w, ts) in rows {
+            b.extend_pk(pk as u128);
+            b.extend_weight(&w.to_le_bytes());
+            b.extend_null_bmp(&(if ts.is_none() { 1u64 } else { 0 }).to_le_bytes());
+            b.extend_col(0, &ts.unwrap_or(0).to_le_bytes());
+            b.count += 1;
+        }
+        b
+    }
+
+    /// Drives `op_retain` tick by tick over an in-memory integral of the index.
+    struct Harness {
+        bake: RetainBake,
+        index: Vec<Rc<Batch>>,
+    }
+
+    impl Harness {
+        fn new(horizon: u64) -> Self {
+            Harness {
+                bake: RetainBake::new(&schema(), 1, horizon),
+                index: Vec::new(),
+            }
+        }
+
+        /// One tick; returns the output as sorted `(pk, weight)`.
+        fn tick(&mut self, rows: &[(u64, i64, Option<i64>)]) -> Vec<(u64, i64)> {
+            let mut cursor = ReadCursor::from_owned(&self.index, self.bake.schema);
+            let (out, index_delta) = op_retain(&batch(rows), &mut cursor, &schema(), &self.bake);
+            drop(cursor);
+            self.index.push(Rc::new(index_delta));
+            let mb = out.as_mem_batch();
+            let mut got: Vec<(u64, i64)> = (0..out.count)
+                .map(|r| {
+                    (
+                        u64::from_be_bytes(mb.get_pk_bytes(r).try_into().unwrap()),
+                        mb.get_weight(r),
+                    )
+                })
+                .collect();
+            got.sort_unstable();
+            got
+        }
+    }
+
+    /// Rows pass while within the horizon of the watermark, are retracted once
+    /// it moves past them, and arrive dropped when already behind it.
+    #[test]
+    fn retain_expires_passed_rows_and_drops_late_ones() {
+        let mut h = Harness::new(10);
+        assert_eq!(
+            h.tick(&[(1, 1, Some(-5)), (2, 1, Some(0)), (3, 1, Some(5))]),
+            vec![(1, 1), (2, 1), (3, 1)]
+        );
+        // Watermark 12 → floor 2: pks 1 and 2 expire; pk 5 (ts 1) is late.
+        assert_eq!(
+            h.tick(&[(4, 1, Some(12)), (5, 1, Some(1))]),
+            vec![(1, -1), (2, -1), (4, 1)]
+        );
+        // A deletion of an expired row is dropped; one of a live row passes.
+        assert_eq!(h.tick(&[(2, -1, Some(0)), (3, -1, Some(5))]), vec![(3, -1)]);
+    }
+
+    /// NULL rows always pass and never expire; a row inserted and expired in the
+    /// same tick never appears.
+    #[test]
+    fn retain_passes_nulls_and_nets_same_tick_expiry() {
+        let mut h = Harness::new(0);
+        assert_eq!(
+            h.tick(&[(1, 1, None), (2, 1, Some(3)), (3, 1, Some(7))]),
+            vec![(1, 1), (3, 1)]
+        );
+        assert_eq!(h.tick(&[(4, 1, Some(8))]), vec![(3, -1), (4, 1)]);
+        assert_eq!(h.tick(&[(1, -1, None)]), vec![(1, -1)]);
+    }
+
+    /// A fresh bake over an existing index (a restart) resumes from the index's
+    /// newest value instead of re-admitting rows older than the old floor.
+    #[test]
+    fn retain_resumes_watermark_from_index() {
+        let mut h = Harness::new(5);
+        h.tick(&[(1, 1, Some(10)), (2, 1, Some(20))]);
+        h.bake = RetainBake::new(&schema(), 1, 5);
+        assert_eq!(h.tick(&[(3, 1, Some(12))]), vec![]);
+        assert_eq!(h.tick(&[(4, 1, Some(26))]), vec![(2, -1), (4, 1)]);
+    }
+}
@@ -0,0 +1,359 @@
+//! DBSP incremental top-K operator (`ORDER BY … LIMIT n [BY …]` views).
+
+use crate::schema::{type_code, ColumnLocator, SchemaColumn, SchemaDescriptor};
+use crate::storage::{compare_rows, Batch, ReadCursor};
+
+use super::util::{encode_ordered, GroupKeyExtractor, AVI_AV_BYTES};
+
+// ---------------------------------------------------------------------------
+// Baked resources
+// ---------------------------------------------------------------------------
+
+/// The compile-time-baked top-K resources (`Program::top_k_bakes`): the order
+/// index schema, the group-key gatherer, the order column's locator, and the
+/// operator's parameters. The index is the top-K's only state; its key
+/// `group ‖ null_rank ‖ order_encoded ‖ input PK` lays every group's rows out
+/// in output order, so the first `limit` live rows under a group prefix are the
+/// group's current top K.
+pub struct TopKBake {
+    pub(crate) extractor: GroupKeyExtractor,
+    pub(crate) schema: SchemaDescriptor,
+    order_loc: ColumnLocator,
+    desc: bool,
+    nulls_first: bool,
+    limit: u64,
+}
+
+impl TopKBake {
+    pub(crate) fn new(
+        src: &SchemaDescriptor,
+        group_cols: &[u32],
+        order_col: u32,
+        desc: bool,
+        nulls_first: bool,
+        limit: u64,
+    ) -> Self {
+        TopKBake {
+            extractor: GroupKeyExtractor::new(src, group_cols),
+            schema: make_top_k_schema(src, group_cols),
+            order_loc: src.locate(order_col as usize),
+            desc,
+            nulls_first,
+            limit,
+        }
+    }
+
+    /// Bytes of the index key that precede the input PK: the group key, the
+    /// null-rank byte, and the order-encoded value.
+    fn prefix_len(&self) -> usize {
+        self.extractor.stride + 1 + AVI_AV_BYTES
+    }
+}
+
+/// Top-K index schema: the group columns (as in [`super::make_avi_schema`]), a
+/// `u8` null rank, the order-encoded value (U64, big-endian so byte order is
+/// value order), then the input's PK columns; the input's payload columns
+/// follow verbatim as the index payload. The input PK sits inside the index
+/// key, so ties on the order value break by PK and an index row's trailing key
+/// bytes *are* the input row's PK bytes — an index row converts back to the
+/// input row with no decode.
+///
+/// The null rank keeps SQL NULL placement out of the value encoding: NULL rows
+/// rank `0` (NULLS FIRST) or `2` (NULLS LAST) around every non-NULL row's `1`.
+pub(crate) fn make_top_k_schema(src: &SchemaDescriptor, group_cols: &[u32]) -> SchemaDescriptor {
+    let mut cols = Vec::with_capacity(group_cols.len() + 2 + src.num_columns());
+    for &c in group_cols {
+        cols.push(SchemaColumn::new(src.columns[c as usize].type_code, 0));
+    }
+    cols.push(SchemaColumn::new(type_code::U8, 0)); // null rank
+    cols.push(SchemaColumn::new(type_code::U64, 0)); // order_encoded
+    for &pi in src.pk_indices() {
+        cols.push(src.columns[pi as usize]);
+    }
+    let pk: Vec<u32> = (0..cols.len() as u32).collect();
+    for (_, _, col) in src.payload_columns() {
+        cols.push(*col);
+    }
+    let schema = SchemaDescriptor::new(&cols, &pk);
+    // The compiler gates on the same budget (`top_k_index_eligible`).
+    debug_assert!(
+        schema.pk_stride() as usize <= crate::schema::MAX_PK_BYTES,
+        "make_top_k_schema: composite key {} exceeds MAX_PK_BYTES",
+        schema.pk_stride(),
+    );
+    schema
+}
+
+// ---------------------------------------------------------------------------
+// op_top_k
+// ---------------------------------------------------------------------------
+
+/// DBSP incremental top-K. Re-keys `delta` into the order index's layout, then
+/// for every group the delta touches reads the group's old top K off the
+/// index (`cursor`, the integral *before* this tick) and its new top K off the
+/// index merged with the delta, emitting `new − old` in the input schema.
+/// Multiplicity counts: a row of weight `w` fills `w` of the `limit` slots,
+/// the same logical-row LIMIT the client ordering sink applies.
+///
+/// Per touched group the walk reads at most `limit` index rows for the old set
+/// and `limit` plus the group's delta rows for the new one, so a tick costs
+/// O(|Δ| + groups·K) row visits plus one seek per group — independent of how
+/// many rows each group holds.
+///
+/// Returns `(output, index_delta)`; the caller ingests the consolidated
+/// `index_delta` into the index table, exactly like `op_weight_clamp`'s
+/// history.
+pub fn op_top_k(
+    delta: &Batch,
+    cursor: &mut ReadCursor,
+    in_schema: &SchemaDescriptor,
+    bake: &TopKBake,
+) -> (Batch, Batch) {
+    let idx_schema = &bake.schema;
+    let index_delta = rekey_into_index(delta, bake).into_consolidated(idx_schema);
+    if index_delta.count == 0 {
+        return (Batch::empty_with_schema(in_schema), index_delta);
+    }
+
+    let gstride = bake.extractor.stride;
+    let dmb = index_delta.as_mem_batch();
+    // `−old_top_k + new_top_k` per touched group, in index layout; consolidation
+    // below cancels every row that stays in its group's top K.
+    let mut changes = Batch::with_schema(*idx_schema, 2 * index_delta.count);
+
+    let mut start = 0;
+    while start < index_delta.count {
+        let group = &dmb.get_pk_bytes(start)[..gstride];
+        let mut end = start + 1;
+        while end < index_delta.count && &dmb.get_pk_bytes(end)[..gstride] == group {
+            end += 1;
+        }
+
+        // Old top K: the first `limit` live copies under the group prefix.
+        let mut left = bake.limit;
+        let mut hit = cursor.seek_first_positive_with_prefix(group);
+        while hit && left > 0 {
+            let take = (cursor.current_weight as u64).min(left);
+            cursor.copy_current_row_into(&mut changes, -(take as i64));
+            left -= take;
+            cursor.advance();
+            hit = cursor.walk_to_positive_with_prefix(group);
+        }
+
+        // New top K: merge the group's index rows with its delta rows in
+        // (key, payload) order, netting equal rows, and keep the first `limit`
+        // live copies. The walk stops as soon as the K slots are filled.
+        let mut left = bake.limit;
+        let mut i = start;
+        let mut on_group = cursor.seek_first_positive_with_prefix(group);
+        while left > 0 && (on_group || i < end) {
+            let ord = match (on_group, i < end) {
+                (true, true) => {
+                    let (src, row) = cursor.current_row_source();
+                    cursor
+                        .current_pk_bytes()
+                        .cmp(dmb.get_pk_bytes(i))
+                        .then_with(|| compare_rows(idx_schema, src, row, &dmb, i))
+                }
+                (true, false) => std::cmp::Ordering::Less,
+                _ => std::cmp::Ordering::Greater,
+            };
+            let (w, from_trace) = match ord {
+                std::cmp::Ordering::Less => (cursor.current_weight, true),
+                std::cmp::Ordering::Greater => (dmb.get_weight(i), false),
+                std::cmp::Ordering::Equal => (cursor.current_weight.wrapping_add(dmb.get_weight(i)), true),
+            };
+            if w > 0 {
+                let take = (w as u64).min(left);
+                if from_trace {
+                    cursor.copy_current_row_into(&mut changes, take as i64);
+                } else {
+                    changes.append_row_from_source_bytes(dmb.get_pk_bytes(i), take as i64, &dmb, i, None);
+                }
+                left -= take;
+            }
+            if ord != std::cmp::Ordering::Less {
+                i += 1;
+            }
+            if ord != std::cmp::Ordering::Greater {
+                cursor.advance();
+                on_group = cursor.valid && cursor.current_pk_bytes().starts_with(group);
+            }
+        }
+        start = end;
+    }
+
+    // Back to the input schema: an index row's key suffix is the input PK and
+    // its payload is the input payload, so each surviving change is one append.
+    let changes = changes.into_consolidated(idx_schema);
+    let cmb = changes.as_mem_batch();
+    let prefix = bake.prefix_len();
+    let mut output = Batch::with_schema(*in_schema, changes.count);
+    for r in 0..changes.count {
+        output.append_row_from_source_bytes(&cmb.get_pk_bytes(r)[prefix..], cmb.get_weight(r), &cmb, r, None);
+    }
+    (output, index_delta)
+}
+
+/// Re-key `delta` into the order index's layout: `group ‖ null_rank ‖
+/// order_encoded ‖ input PK` over the unchanged payload. Unconsolidated.
+fn rekey_into_index(delta: &Batch, bake: &TopKBake) -> Batch {
+    let mut out = Batch::with_schema(bake.schema, delta.count);
+    if delta.count == 0 {
+        return out;
+    }
+    let mb = delta.as_mem_batch();
+    let gstride = bake.extractor.stride;
+    let prefix = bake.prefix_len();
+    let null_rank = if bake.nulls_first { 0 } else { 2 };
+    let mut key = [0u8; crate::schema::MAX_PK_BYTES];
+    let mut scratch = [0u8; 16];
+    for row in 0..delta.count {
+        bake.extractor.gather(&mb, row, &mut key);
+        let (rank, av) = if bake.order_loc.is_null(&mb, row) {
+            (null_rank, 0)
+        } else {
+            // `for_max` inverts the encoding, so DESC walks the largest first.
+            let bytes = bake.order_loc.native_le_bytes(&mb, row, &mut scratch);
+            (1, encode_ordered(bytes, bake.order_loc.type_code(), bake.desc))
+        };
+        key[gstride] = rank;
+        key[gstride + 1..prefix].copy_from_slice(&av.to_be_bytes());
+        let pk = mb.get_pk_bytes(row);
+        key[prefix..prefix + pk.len()].copy_from_slice(pk);
+        out.append_row_from_source_bytes(&key[..prefix + pk.len()], mb.get_weight(row), &mb, row, None);
+    }
+    out
+}
+
+// ---------------------------------------------------------------------------
+// Tests
+// ---------------------------------------------------------------------------
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::rc::Rc;
+
+    /// `(pk U64, grp I64, score I64 NULL)`.
+    fn schema() -> SchemaDescriptor {
+        SchemaDescriptor::new(
+            &[
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::I64, 0),
+                SchemaColumn::new(type_code::I64, 1),
+            ],
+            &[0],
+        )
+    }
+
+    /// Rows `(pk, weight, grp, score)`; `score = None` is NULL.
+    fn batch(rows: &[(u64, i64, i64, Option<i64>)]) -> Batch {
+        let mut b = Batch::with_schema(schema(), rows.len());
+        for &(pk, w, grp, score) in rows {
+            b.extend_pk(pk as u128);
+            b.extend_weight(&w.to_le_bytes());
+            b.extend_null_bmp(&(if score.is_none() { 2u64 } else { 0 }).to_le_bytes());
+            b.extend_col(0, &grp.to_le_bytes());
+            b.extend_col(1, &score.unwrap_or(0).to_le_bytes());
+            b.count += 1;
+        }
+        b
+    }
+
+    /// Drives `op_top_k` tick by tick over an in-memory integral of the index.
+    struct Harness {
+        bake: TopKBake,
+        index: Vec<Rc<Batch>>,
+    }
+
+    impl Harness {
+        fn new(group: &[u32], desc: bool, nulls_first: bool, limit: u64) -> Self {
+            Harness {
+                bake: TopKBake::new(&schema(), group, 2, desc, nulls_first, limit),
+                index: Vec::new(),
+            }
+        }
+
+        /// One tick; returns the output as sorted `(pk, weight)`.
+        fn tick(&mut self, rows: &[(u64, i64, i64, Option<i64>)]) -> Vec<(u64, i64)> {
+            let mut cursor = ReadCursor::from_owned(&self.index, self.bake.schema);
+            let (out, index_delta) = op_top_k(&batch(rows), &mut cursor, &schema(), &self.bake);
+            drop(cursor);
+            self.index.push(Rc::new(index_delta));
+            let mb = out.as_mem_batch();
+            let mut got: Vec<(u64, i64)> = (0..out.count)
+                .map(|r| {
+                    (
+                        u64::from_be_bytes(mb.get_pk_bytes(r).try_into().unwrap()),
+                        mb.get_weight(r),
+                    )
+                })
+                .collect();
+            got.sort_unstable();
+            got
+        }
+    }
+
+    /// A global top-2 DESC admits the two best rows, swaps in a better one, and
+    /// refills from the index when a member is retracted.
+    #[test]
+    fn top_k_global_desc_admits_evicts_and_refills() {
+        let mut h = Harness::new(&[], true, false, 2);
+        assert_eq!(
+            h.tick(&[(1, 1, 0, Some(10)), (2, 1, 0, Some(30)), (3, 1, 0, Some(20))]),
+            vec![(2, 1), (3, 1)]
+        );
+        // 40 beats 20: pk 3 leaves, pk 4 enters.
+        assert_eq!(h.tick(&[(4, 1, 0, Some(40))]), vec![(3, -1), (4, 1)]);
+        // A row below the cut changes nothing.
+        assert_eq!(h.tick(&[(5, 1, 0, Some(5))]), vec![]);
+        // Retracting the leader refills from the index (pk 3, score 20).
+        assert_eq!(h.tick(&[(4, -1, 0, Some(40))]), vec![(3, 1), (4, -1)]);
+    }
+
+    /// Per-group cuts are independent, ties break by PK, a weight-2 row fills
+    /// two slots, and NULLs follow the requested placement.
+    #[test]
+    fn top_k_per_group_ties_multiplicity_and_nulls() {
+        let mut h = Harness::new(&[1], false, false, 2);
+        // Group 7: ASC with a tie at 1 — pks 1 and 2 win over pk 3.
+        // Group 8: pk 4 has weight 2 and fills both slots alone.
+        assert_eq!(
+            h.tick(&[
+                (3, 1, 7, Some(1)),
+                (1, 1, 7, Some(1)),
+                (2, 1, 7, Some(1)),
+                (4, 2, 8, Some(9)),
+                (5, 1, 8, Some(10)),
+            ]),
+            vec![(1, 1), (2, 1), (4, 2)]
+        );
+        // NULLS LAST: a NULL score never displaces group 8's members, but it is
+        // next in line once one copy of pk 4 is retracted — after pk 5.
+        assert_eq!(h.tick(&[(6, 1, 8, None)]), vec![]);
+        assert_eq!(h.tick(&[(4, -1, 8, Some(9))]), vec![(4, -1), (5, 1)]);
+
+        let mut first = Harness::new(&[1], false, true, 1);
+        first.tick(&[(1, 1, 7, Some(1))]);
+        assert_eq!(first.tick(&[(2, 1, 7, None)]), vec![(1, -1), (2, 1)]);
+    }
+
+    /// An update (retract + insert of the same PK in one tick) moves the row
+    /// within the order without a spurious change when its rank is unchanged.
+    #[test]
+    fn top_k_update_in_place_is_silent_unless_rank_changes() {
+        let mut h = Harness::new(&[], true, false, 1);
+        h.tick(&[(1, 1, 0, Some(10)), (2, 1, 0, Some(5))]);
+        // pk 1's score drops 10 → 8: still first, new payload replaces old.
+        assert_eq!(
+            h.tick(&[(1, -1, 0, Some(10)), (1, 1, 0, Some(8))]),
+            vec![(1, -1), (1, 1)]
+        );
+        // pk 1 drops to 1: pk 2 takes over.
+        assert_eq!(
+            h.tick(&[(1, -1, 0, Some(8)), (1, 1, 0, Some(1))]),
+            vec![(1, -1), (2, 1)]
+        );
+    }
+}
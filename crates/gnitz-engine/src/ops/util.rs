@@ -339,6 +339,17 @@ fn hash_group_col<R: ColumnarSource>(
     }
 }
 
+/// 64-bit hash of one non-null column value — APPROX_COUNT_DISTINCT's sketch
+/// input. Streams the same canonical per-column material as the group-key fold
+/// ([`hash_group_col`]), so values that group together also count as one
+/// distinct value.
+#[inline]
+pub(super) fn value_hash64<R: ColumnarSource>(src: &R, row: usize, loc: ColumnLocator) -> u64 {
+    let mut hasher = Xxh3Default::new();
+    hash_group_col(&mut hasher, src, row, 0, loc, false);
+    hasher.digest()
+}
+
 /// Extract the 128-bit group key of one row — the one group-key hash body,
 /// generic over any [`ColumnarSource`] row: a `MemBatch` row and a
 /// `ReadCursor`'s current row hash byte-identically, so a trace row routes to
@@ -0,0 +1,562 @@
+//! Shared arrangements: one operator trace serving every view that would
+//! otherwise build an identical copy of it.
+//!
+//! An equi-join view integrates each side's reindexed delta into a trace table
+//! (`IntegrateTrace`). Twenty views joining `orders` on `customer_id` would keep
+//! twenty byte-identical traces and integrate every `orders` delta twenty times.
+//! The compiler fingerprints each shareable trace by its source, the operator
+//! chain between the source scan and the trace (filters, reindex/projection
+//! maps, with their programs), and the delta routing the view gets for that
+//! source; views with equal fingerprints attach to one `SharedArrangement`.
+//!
+//! Lifecycle is reference counting: every compiled plan that reads the
+//! arrangement holds an `Rc`, and so does the registry on behalf of each view
+//! whose last compile attached it (`settle`). A plan invalidation therefore
+//! keeps the arrangement — and the history only a backfill could rebuild —
+//! for the recompile to re-attach; the view's next compile or its DROP VIEW
+//! (`release`) hands the reference back, and the last one to go drops the
+//! table and removes its scratch directory. The registry is the worker's
+//! catalog of live arrangements (`DagEngine::arrangements`).
+//!
+//! Integration happens once per DAG tick, by whichever consumer runs first: all
+//! consumers see the same delta for the source (the routing is part of the
+//! fingerprint), and no consumer reads the arrangement against a delta of its
+//! own source (the compiler only shares non-self-join traces), so a later
+//! consumer observing the already-integrated state in the same tick reads
+//! nothing it would have read differently. Outside a tick — a view-scoped
+//! backfill — the arrangement integrates only while it is still being seeded.
+//!
+//! The same fingerprinting also names shared *prefixes*: a stateless
+//! filter/map chain over a source scan that several views evaluate on the same
+//! delta. Their output is memoized for the length of one tick (`SharedPrefix`),
+//! so the first view to run the chain computes it and the rest take a copy.
+
+use std::cell::{Cell, RefCell, UnsafeCell};
+use std::collections::HashMap;
+use std::mem::ManuallyDrop;
+use std::rc::{Rc, Weak};
+
+use crate::schema::SchemaDescriptor;
+use crate::storage::{Batch, RecoverySource, Table};
+
+/// The identity of a shareable trace. `chain` is the canonical encoding of
+/// everything between the source scan and the trace — the delta routing the
+/// view applies to the source, then each operator's wire encoding in
+/// scan-to-trace order — so equal keys integrate equal deltas.
+#[derive(Clone, PartialEq, Eq, Hash, Debug)]
+pub(crate) struct ArrangementKey {
+    pub source: i64,
+    pub chain: Vec<u8>,
+}
+
+impl ArrangementKey {
+    /// Stable 64-bit fingerprint naming the on-disk directory. Mixes in the
+    /// worker topology so a re-sharded restart opens a fresh directory instead
+    /// of a checkpoint laid out for another partition map.
+    pub fn fingerprint(&self) -> u64 {
+        let mut h = xxhash_rust::xxh3::Xxh3Default::new();
+        h.update(&self.source.to_le_bytes());
+        h.update(&crate::storage::topology_word(crate::foundation::worker_ctx::num_workers()).to_le_bytes());
+        h.update(&self.chain);
+        h.digest()
+    }
+}
+
+thread_local! {
+    /// The current DAG tick, `0` outside one. Bumped by `TickScope::begin`.
+    static TICK: Cell<u64> = const { Cell::new(0) };
+    static NEXT_TICK: Cell<u64> = const { Cell::new(1) };
+    /// This tick's shared-prefix outputs, by `SharedPrefix::id`. Emptied when
+    /// the tick ends so no batch outlives it.
+    static TICK_MEMO: RefCell<HashMap<u64, Batch>> = RefCell::new(HashMap::new());
+    static NEXT_PREFIX: Cell<u64> = const { Cell::new(1) };
+}
+
+/// Marks one DAG evaluation: every shared arrangement integrates at most once
+/// while the scope is alive. Restores "no tick" on drop.
+pub(crate) struct TickScope(());
+
+impl TickScope {
+    pub fn begin() -> Self {
+        let t = NEXT_TICK.with(|n| {
+            let t = n.get();
+            n.set(t + 1);
+            t
+        });
+        TICK.with(|c| c.set(t));
+        TickScope(())
+    }
+}
+
+impl Drop for TickScope {
+    fn drop(&mut self) {
+        TICK.with(|c| c.set(0));
+        TICK_MEMO.with(|m| m.borrow_mut().clear());
+    }
+}
+
+/// One trace table shared by every plan with the same `ArrangementKey`.
+pub(crate) struct SharedArrangement {
+    key: ArrangementKey,
+    /// Dropped explicitly in `Drop`, before the directory is removed.
+    table: UnsafeCell<ManuallyDrop<Table>>,
+    directory: String,
+    /// Tick of the last integration (see `admit`).
+    last_tick: Cell<u64>,
+    /// The table reflects the source's full history: loaded from a checkpoint
+    /// at the committed generation, or filled by a completed backfill.
+    seeded: Cell<bool>,
+    integrations: Cell<u64>,
+    deduped: Cell<u64>,
+}
+
+impl SharedArrangement {
+    pub fn source(&self) -> i64 {
+        self.key.source
+    }
+
+    pub fn is_seeded(&self) -> bool {
+        self.seeded.get()
+    }
+
+    /// The backfill that fills this arrangement from its source has completed.
+    pub fn mark_seeded(&self) {
+        self.seeded.set(true);
+    }
+
+    /// Interior-mutable access to the shared table. Single-threaded; the VM
+    /// holds no other `&mut` into it while an instruction runs.
+    #[allow(clippy::mut_from_ref)]
+    pub fn table_mut(&self) -> &mut Table {
+        unsafe { &mut *self.table.get() }
+    }
+
+    /// Whether the integrate about to run should write. Inside a tick the first
+    /// consumer integrates and the rest skip; outside one (a backfill) only an
+    /// arrangement still being seeded accepts rows — a seeded one already holds
+    /// everything the backfill would feed it.
+    pub fn admit(&self) -> bool {
+        let tick = TICK.with(Cell::get);
+        let admit = if tick == 0 {
+            !self.seeded.get()
+        } else if self.last_tick.get() == tick {
+            false
+        } else {
+            self.last_tick.set(tick);
+            true
+        };
+        if admit {
+            self.integrations.set(self.integrations.get() + 1);
+        } else {
+            self.deduped.set(self.deduped.get() + 1);
+        }
+        admit
+    }
+}
+
+impl Drop for SharedArrangement {
+    fn drop(&mut self) {
+        // Last consumer gone: the arrangement is derived state nobody reads.
+        unsafe { ManuallyDrop::drop(self.table.get_mut()) };
+        let _ = std::fs::remove_dir_all(&self.directory);
+    }
+}
+
+/// A filter/map node whose output is a function of one source's delta alone,
+/// shared by every plan with the same `ArrangementKey`. Inside a tick the
+/// first consumer to run computes the output and offers it; later consumers
+/// take a copy instead of evaluating the chain again. Outside a tick (a
+/// backfill) nothing is memoized.
+pub(crate) struct SharedPrefix {
+    key: ArrangementKey,
+    id: u64,
+    computed: Cell<u64>,
+    reused: Cell<u64>,
+}
+
+impl SharedPrefix {
+    /// This tick's output, if another consumer already computed it.
+    pub fn reuse(&self) -> Option<Batch> {
+        if TICK.with(Cell::get) == 0 {
+            return None;
+        }
+        let hit = TICK_MEMO.with(|m| m.borrow().get(&self.id).cloned());
+        if hit.is_some() {
+            self.reused.set(self.reused.get() + 1);
+        }
+        hit
+    }
+
+    /// Record this tick's output for the consumers still to run. Skipped when
+    /// no other plan holds the prefix: nobody would read the copy.
+    pub fn offer(self: &Rc<Self>, out: &Batch) {
+        self.computed.set(self.computed.get() + 1);
+        if TICK.with(Cell::get) != 0 && Rc::strong_count(self) > 1 {
+            TICK_MEMO.with(|m| m.borrow_mut().insert(self.id, out.clone()));
+        }
+    }
+}
+
+/// One live shared prefix as listed by `DagEngine::shared_prefixes`.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub(crate) struct PrefixInfo {
+    pub source: i64,
+    pub fingerprint: u64,
+    pub consumers: usize,
+    /// Evaluations of the chain, and evaluations saved by taking another
+    /// consumer's output.
+    pub computed: u64,
+    pub reused: u64,
+}
+
+/// One live arrangement as listed by `DagEngine::arrangements`.
+#[derive(Clone, Debug, PartialEq, Eq)]
+pub(crate) struct ArrangementInfo {
+    pub source: i64,
+    pub fingerprint: u64,
+    /// Compiled plans currently attached (not counting the registry's
+    /// per-view references).
+    pub consumers: usize,
+    pub seeded: bool,
+    /// Integrations performed, and integrations skipped because another
+    /// consumer had already applied the tick's delta (or the arrangement was
+    /// already seeded during a backfill).
+    pub integrations: u64,
+    pub deduped: u64,
+}
+
+/// Everything a view compile needs to attach shared arrangements. `None` at
+/// the compile entry point means "never share" (transients, index circuits).
+pub(crate) struct ShareScope {
+    /// Taken from the `DagEngine` for the compile and handed back after.
+    pub registry: ArrangementRegistry,
+    /// Directory of each base-table source of the view; arrangements live in a
+    /// rank-stamped scratch dir under it, outliving any single consumer.
+    pub source_dirs: HashMap<i64, String>,
+    /// `Some(first source)` when the view is compiled for its own backfill,
+    /// which feeds its sources in dependency order starting with this one.
+    pub backfill_first: Option<i64>,
+}
+
+/// The worker's live arrangements, keyed by fingerprint input.
+#[derive(Default)]
+pub(crate) struct ArrangementRegistry {
+    live: HashMap<ArrangementKey, Weak<SharedArrangement>>,
+    prefixes: HashMap<ArrangementKey, Weak<SharedPrefix>>,
+    /// The arrangements each registered view's last compile attached, kept
+    /// across plan invalidation until the view recompiles or is dropped.
+    held: HashMap<i64, Vec<Rc<SharedArrangement>>>,
+}
+
+impl ArrangementRegistry {
+    /// The live arrangement for `key`, pruning the entry if its last consumer
+    /// has dropped.
+    fn get(&mut self, key: &ArrangementKey) -> Option<Rc<SharedArrangement>> {
+        let rc = self.live.get(key)?.upgrade();
+        if rc.is_none() {
+            self.live.remove(key);
+        }
+        rc
+    }
+
+    /// Attach a consumer to the arrangement for `key`, opening it at `dir` if
+    /// none is live. `None` means the view must keep a private trace instead:
+    ///
+    /// * a view that is not backfilling (it resumes from a checkpoint or is
+    ///   already running) needs the arrangement to hold the source's full
+    ///   history, so it takes only a seeded one;
+    /// * a backfilling view feeds its sources in order, and a join term reads
+    ///   another source's trace as of the sources fed so far. A seeded
+    ///   arrangement already holds its whole source, so it is only correct if
+    ///   that source is the first one fed; an unseeded one is filled by this
+    ///   very backfill.
+    ///
+    /// The checkpoint is peeked before opening so a refused arrangement never
+    /// opens (and, on drop, removes) a directory other consumers may load.
+    pub fn attach(
+        &mut self,
+        key: &ArrangementKey,
+        schema: SchemaDescriptor,
+        dir: &str,
+        recovery: RecoverySource,
+        backfill_first: Option<i64>,
+    ) -> Option<Rc<SharedArrangement>> {
+        let acceptable = |seeded: bool| match backfill_first {
+            None => seeded,
+            Some(first) => !seeded || first == key.source,
+        };
+        if let Some(arr) = self.get(key) {
+            return acceptable(arr.is_seeded()).then_some(arr);
+        }
+        if self
+            .live
+            .values()
+            .any(|w| w.upgrade().is_some_and(|a| a.directory == dir))
+        {
+            // Fingerprint collision with a different live key: never share a directory.
+            return None;
+        }
+        let RecoverySource::RederiveCheckpointed { committed } = recovery else {
+            return None;
+        };
+        let manifest = std::ffi::CString::new(format!("{dir}/manifest.bin")).ok()?;
+        let seeded = matches!(crate::storage::peek_generation(&manifest), Ok(Some(g)) if g == committed);
+        if !acceptable(seeded) {
+            return None;
+        }
+        let table = Table::new(dir, schema, key.source as u32, 256 * 1024, recovery).ok()?;
+        let arr = Rc::new(SharedArrangement {
+            key: key.clone(),
+            table: UnsafeCell::new(ManuallyDrop::new(table)),
+            directory: dir.to_string(),
+            last_tick: Cell::new(0),
+            seeded: Cell::new(seeded),
+            integrations: Cell::new(0),
+            deduped: Cell::new(0),
+        });
+        gnitz_debug!(
+            "arrangement: opened source={} fingerprint={:016x} seeded={}",
+            key.source,
+            key.fingerprint(),
+            seeded
+        );
+        self.live.insert(key.clone(), Rc::downgrade(&arr));
+        Some(arr)
+    }
+
+    /// Record the arrangements `view`'s fresh compile attached, releasing the
+    /// ones its previous compile held and this one no longer reads. Called
+    /// after every view compile, successful or not.
+    pub fn settle(&mut self, view: i64, attached: Vec<Rc<SharedArrangement>>) {
+        if attached.is_empty() {
+            self.held.remove(&view);
+        } else {
+            self.held.insert(view, attached);
+        }
+    }
+
+    /// `view` is gone (DROP VIEW): release the arrangements it held.
+    pub fn release(&mut self, view: i64) {
+        self.held.remove(&view);
+    }
+
+    /// Attach a consumer to the shared prefix for `key`, creating it if none is
+    /// live. A prefix holds no state across ticks, so any plan may join.
+    pub fn attach_prefix(&mut self, key: &ArrangementKey) -> Rc<SharedPrefix> {
+        if let Some(p) = self.prefixes.get(key).and_then(Weak::upgrade) {
+            return p;
+        }
+        self.prefixes.retain(|_, w| w.strong_count() > 0);
+        let id = NEXT_PREFIX.with(|n| {
+            let id = n.get();
+            n.set(id + 1);
+            id
+        });
+        let p = Rc::new(SharedPrefix {
+            key: key.clone(),
+            id,
+            computed: Cell::new(0),
+            reused: Cell::new(0),
+        });
+        self.prefixes.insert(key.clone(), Rc::downgrade(&p));
+        p
+    }
+
+    /// The live shared prefixes, ordered by (source, fingerprint).
+    pub fn prefix_infos(&self) -> Vec<PrefixInfo> {
+        let mut out: Vec<PrefixInfo> = self
+            .prefixes
+            .values()
+            .filter_map(Weak::upgrade)
+            .map(|p| PrefixInfo {
+                source: p.key.source,
+                fingerprint: p.key.fingerprint(),
+                consumers: Rc::strong_count(&p) - 1,
+                computed: p.computed.get(),
+                reused: p.reused.get(),
+            })
+            .collect();
+        out.sort_unstable_by_key(|i| (i.source, i.fingerprint));
+        out
+    }
+
+    /// Every live arrangement, for checkpoint flushes and write-buffer sweeps.
+    pub fn live(&self) -> impl Iterator<Item = Rc<SharedArrangement>> + '_ {
+        self.live.values().filter_map(Weak::upgrade)
+    }
+
+    /// The catalog listing, ordered by (source, fingerprint).
+    pub fn infos(&self) -> Vec<ArrangementInfo> {
+        let held = |a: &Rc<SharedArrangement>| self.held.values().flatten().filter(|h| Rc::ptr_eq(h, a)).count();
+        let mut out: Vec<ArrangementInfo> = self
+            .live()
+            .map(|a| ArrangementInfo {
+                source: a.key.source,
+                fingerprint: a.key.fingerprint(),
+                // Neither the `Rc` from `live()` nor a per-view one is a plan.
+                consumers: Rc::strong_count(&a) - 1 - held(&a),
+                seeded: a.seeded.get(),
+                integrations: a.integrations.get(),
+                deduped: a.deduped.get(),
+            })
+            .collect();
+        out.sort_unstable_by_key(|i| (i.source, i.fingerprint));
+        out
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use crate::schema::{type_code, SchemaColumn};
+
+    fn schema() -> SchemaDescriptor {
+        SchemaDescriptor::new(
+            &[
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::I64, 0),
+            ],
+            &[0],
+        )
+    }
+
+    fn recovery() -> RecoverySource {
+        RecoverySource::RederiveCheckpointed {
+            committed: crate::foundation::worker_ctx::committed_generation(),
+        }
+    }
+
+    fn key(source: i64) -> ArrangementKey {
+        ArrangementKey {
+            source,
+            chain: vec![1, 2, 3],
+        }
+    }
+
+    /// A fresh arrangement opens only for a backfilling view, is shared by
+    /// later consumers once seeded, and removes its directory when the last
+    /// consumer drops.
+    #[test]
+    fn attach_rules_and_lifecycle() {
+        let tmp = tempfile::tempdir().unwrap();
+        let dir = tmp.path().join("arr").to_str().unwrap().to_string();
+        let mut reg = ArrangementRegistry::default();
+
+        assert!(
+            reg.attach(&key(7), schema(), &dir, recovery(), None).is_none(),
+            "a resuming view cannot start from an empty arrangement"
+        );
+        let a = reg.attach(&key(7), schema(), &dir, recovery(), Some(9)).unwrap();
+        assert!(!a.is_seeded());
+        let b = reg
+            .attach(&key(7), schema(), &dir, recovery(), Some(9))
+            .expect("another backfill may join the seeding");
+        assert!(Rc::ptr_eq(&a, &b));
+        assert!(reg.attach(&key(7), schema(), &dir, recovery(), None).is_none());
+
+        a.mark_seeded();
+        assert!(reg.attach(&key(7), schema(), &dir, recovery(), None).is_some());
+        assert!(
+            reg.attach(&key(7), schema(), &dir, recovery(), Some(9)).is_none(),
+            "a seeded arrangement is only safe as the first source a backfill feeds"
+        );
+        assert!(reg.attach(&key(7), schema(), &dir, recovery(), Some(7)).is_some());
+        assert_eq!(reg.infos()[0].consumers, 2);
+
+        drop(a);
+        drop(b);
+        assert!(reg.infos().is_empty());
+        assert!(
+            !std::path::Path::new(&dir).exists(),
+            "last consumer removes the directory"
+        );
+    }
+
+    /// A view's reference keeps a seeded arrangement across plan invalidation,
+    /// so the recompile re-attaches it instead of falling back to an empty
+    /// private trace; DROP VIEW hands the last reference back.
+    #[test]
+    fn held_arrangement_survives_invalidation() {
+        let tmp = tempfile::tempdir().unwrap();
+        let dir = tmp.path().join("arr").to_str().unwrap().to_string();
+        let mut reg = ArrangementRegistry::default();
+
+        let a = reg.attach(&key(7), schema(), &dir, recovery(), Some(7)).unwrap();
+        a.mark_seeded();
+        reg.settle(1, vec![a.clone()]);
+        drop(a);
+        assert_eq!(reg.infos()[0].consumers, 0, "the view's reference is not a plan");
+        assert!(std::path::Path::new(&dir).exists());
+
+        let b = reg
+            .attach(&key(7), schema(), &dir, recovery(), None)
+            .expect("the recompile re-attaches the seeded arrangement");
+        assert!(b.is_seeded());
+        reg.settle(1, vec![b.clone()]);
+        drop(b);
+        reg.release(1);
+        assert!(reg.infos().is_empty());
+        assert!(!std::path::Path::new(&dir).exists(), "DROP VIEW removes the directory");
+    }
+
+    /// Inside a tick the first consumer integrates and the rest skip; outside
+    /// one only an unseeded arrangement integrates.
+    #[test]
+    fn admit_once_per_tick() {
+        let tmp = tempfile::tempdir().unwrap();
+        let dir = tmp.path().join("arr").to_str().unwrap().to_string();
+        let mut reg = ArrangementRegistry::default();
+        let a = reg.attach(&key(3), schema(), &dir, recovery(), Some(3)).unwrap();
+
+        assert!(a.admit() && a.admit(), "backfill seeding integrates every chunk");
+        a.mark_seeded();
+        assert!(!a.admit(), "a seeded arrangement ignores a later backfill");
+        {
+            let _t = TickScope::begin();
+            assert!(a.admit());
+            assert!(!a.admit());
+        }
+        {
+            let _t = TickScope::begin();
+            assert!(a.admit(), "a new tick integrates again");
+        }
+        let info = &reg.infos()[0];
+        assert_eq!((info.integrations, info.deduped), (4, 2));
+    }
+
+    /// A prefix output is handed on only within the tick that computed it, and
+    /// only when a second consumer exists to take it.
+    #[test]
+    fn prefix_memo_lives_for_one_tick() {
+        let mut reg = ArrangementRegistry::default();
+        let a = reg.attach_prefix(&key(5));
+        let mut out = Batch::with_schema(schema(), 1);
+        out.extend_pk(1);
+        out.extend_weight(&1i64.to_le_bytes());
+        out.extend_null_bmp(&0u64.to_le_bytes());
+        out.extend_col(0, &9i64.to_le_bytes());
+        out.count = 1;
+        {
+            let _t = TickScope::begin();
+            a.offer(&out);
+            assert!(a.reuse().is_none(), "a lone consumer caches nothing");
+        }
+        let b = reg.attach_prefix(&key(5));
+        assert!(Rc::ptr_eq(&a, &b));
+        a.offer(&out);
+        assert!(b.reuse().is_none(), "no memo outside a tick");
+        {
+            let _t = TickScope::begin();
+            a.offer(&out);
+            assert_eq!(b.reuse().map(|r| r.count), Some(1));
+        }
+        {
+            let _t = TickScope::begin();
+            assert!(b.reuse().is_none(), "the memo ends with its tick");
+        }
+        let info = &reg.prefix_infos()[0];
+        assert_eq!((info.consumers, info.computed, info.reused), (2, 3, 1));
+        drop((a, b));
+        assert!(reg.prefix_infos().is_empty());
+    }
+}
@@ -2,6 +2,8 @@
 //! constructors, and `build_plan` (one plan, pre or post exchange).
 
 use super::*;
+use std::rc::Rc;
+
 use crate::query::vm::{reads_reg, Instr, IntegrateAvi, ReindexOperand};
 
 // ---------------------------------------------------------------------------
@@ -129,6 +131,9 @@ pub(super) struct EmitCtx<'a> {
     // Consumed by the `PartitionFilter` emit arm to bake the trim as a keep-all
     // identity (an all-replicated view runs correct-local on every worker).
     pub all_sources_replicated: bool,
+    /// Nodes whose output is insertions only (`compute_insert_only`): their
+    /// consumers pick the retraction-free operator variants.
+    pub insert_only: HashSet<i32>,
     pub builder: ProgramBuilder,
     pub out_reg_of: HashMap<i32, i32>,
     pub reg_meta: Vec<RegisterMeta>,
@@ -139,9 +144,24 @@ pub(super) struct EmitCtx<'a> {
     pub source_reg_map: HashMap<i64, i32>,
     pub sink_reg_id: i32,
     pub scratch: ScratchGuard,
+    /// The registry to attach shared state from, and the nodes eligible:
+    /// `IntegrateTrace` nodes (`compute_shared_traces`) and filter/map prefixes (`compute_shared_prefixes`).
+    pub share: Option<(&'a ShareKeys, &'a mut ShareScope)>,
+    pub shared: Vec<Rc<SharedArrangement>>,
+    pub shared_trace_regs: Vec<(u16, usize)>,
+    /// What the expression folder and prefix sharing did in this plan.
+    pub stats: OptimizerStats,
 }
 
 impl EmitCtx<'_> {
+    /// True iff the node feeding `nid`'s `port` emits insertions only.
+    fn input_insert_only(&self, nid: i32, port: i32) -> bool {
+        self.loaded
+            .incoming
+            .get(&nid)
+            .is_some_and(|ins| ins.iter().any(|&(src, p)| p == port && self.insert_only.contains(&src)))
+    }
+
     /// Box `func`, keep it alive in `owned_funcs`, and return a raw pointer into
     /// the box. Valid for the box's lifetime — the heap `ScalarFunc` is stable
     /// across the `Vec`'s growth — which is what the VM's raw `*const ScalarFunc`
@@ -157,11 +177,15 @@ impl EmitCtx<'_> {
         &mut self,
         dep: gnitz_wire::ExprBlob,
         schema: &SchemaDescriptor,
-    ) -> Result<*const ScalarFunc, CompileError> {
-        let prog = LogicalProgram::from_wire(&dep.code, dep.num_regs, dep.result_reg, dep.const_strings)
+    ) -> Result<Option<*const ScalarFunc>, CompileError> {
+        let mut prog = LogicalProgram::from_wire(&dep.code, dep.num_regs, dep.result_reg, dep.const_strings)
             .and_then(|p| p.validate(Some(schema), None).map(|()| p))
             .map_err(expr_reject("filter: invalid predicate program"))?;
-        Ok(self.push_func(ScalarFunc::from_predicate(prog, schema)))
+        self.stats.fold.add(prog.fold(schema, true));
+        if prog.is_const_true() {
+            return Ok(None);
+        }
+        Ok(Some(self.push_func(ScalarFunc::from_predicate(prog, schema))))
     }
 
     /// A MAP whose program is all-`CopyCol`: output payload `i` ← input column
@@ -227,6 +251,36 @@ impl EmitCtx<'_> {
         id
     }
 
+    /// Attach trace node `nid` to its shared arrangement, if it has a key and
+    /// the registry accepts this view (see `ArrangementRegistry::attach`).
+    /// Returns the index into `shared` and whether this plan already held it —
+    /// a second identical trace in one view must not integrate twice.
+    fn attach_shared_trace(&mut self, nid: i32, schema: SchemaDescriptor) -> Option<(usize, bool)> {
+        let (keys, scope) = self.share.as_mut()?;
+        let key = keys.traces.get(&nid)?;
+        let dir = child_scratch_dir(
+            scope.source_dirs.get(&key.source)?,
+            &format!("arr_{:016x}", key.fingerprint()),
+        );
+        let arr = scope
+            .registry
+            .attach(key, schema, &dir, self.recovery, scope.backfill_first)?;
+        if let Some(idx) = self.shared.iter().position(|a| Rc::ptr_eq(a, &arr)) {
+            return Some((idx, true));
+        }
+        self.shared.push(arr);
+        Some((self.shared.len() - 1, false))
+    }
+
+    /// The `Program::prefixes` index of node `nid`'s shared prefix, if it has
+    /// a key (`compute_shared_prefixes`).
+    fn shared_prefix(&mut self, nid: i32) -> Option<u16> {
+        let (keys, scope) = self.share.as_mut()?;
+        let prefix = scope.registry.attach_prefix(keys.prefixes.get(&nid)?);
+        self.stats.shared_prefixes += 1;
+        Some(self.builder.prefix_idx(prefix))
+    }
+
     /// A plain integrate of `in_reg` into `table` (null = sink integrate).
     fn push_integrate(&mut self, in_reg: u16, table: *mut Table) {
         let table_idx = self.builder.table_idx(table);
@@ -329,17 +383,24 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
                 return Ok(());
             };
             let in_schema = ctx.reg_meta[in_reg as usize].schema;
-            ctx.reg_meta[reg_id as usize] = RegisterMeta::delta(in_schema);
             // A present-but-corrupt blob, or a rejected program, is catalog
             // corruption. Falling back to pass-all would silently turn a WHERE
             // into WHERE TRUE; fail the compile instead.
             let dep = gnitz_wire::decode_expr_blob(blob).ok_or(CompileError::Rejected("filter: corrupt expr blob"))?;
-            let func_ptr = ctx.create_expr_predicate(dep, &in_schema)?;
+            let Some(func_ptr) = ctx.create_expr_predicate(dep, &in_schema)? else {
+                // The predicate folded to TRUE: a pass-through, as if absent.
+                ctx.stats.filters_elided += 1;
+                ctx.out_reg_of.insert(nid, in_reg);
+                return Ok(());
+            };
+            ctx.reg_meta[reg_id as usize] = RegisterMeta::delta(in_schema);
             let func_idx = ctx.builder.func_idx(func_ptr);
+            let prefix = ctx.shared_prefix(nid);
             ctx.builder.push(Instr::Filter {
                 in_reg: in_reg as u16,
                 out_reg: reg_id as u16,
                 func_idx,
+                prefix,
             });
         }
 
@@ -430,6 +491,8 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
                     // rather than re-lowering the blob a second time.
                     prog.validate(Some(&in_reg_schema), Some(&node_schema))
                         .map_err(expr_reject("map: program/schema mismatch"))?;
+                    let mut prog = prog;
+                    ctx.stats.fold.add(prog.fold(&in_reg_schema, false));
                     let fp = ctx.push_func(ScalarFunc::from_map(prog, &in_reg_schema, &node_schema));
                     ctx.reg_meta[reg_id as usize] = RegisterMeta::delta(node_schema);
                     let func_idx = ctx.builder.func_idx(fp);
@@ -442,11 +505,39 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
                         let (off, cnt) = ctx.builder.add_reindex_cols(&cols_u32, reindex_target_tcs);
                         ReindexOperand::Pack { off, cnt }
                     };
+                    let prefix = ctx.shared_prefix(nid);
                     ctx.builder.push(Instr::Map {
                         in_reg: in_reg as u16,
                         out_reg: reg_id as u16,
                         func_idx,
                         reindex,
+                        prefix,
+                    });
+                }
+
+                gnitz_wire::MapKind::Compute { program, out_cols } => {
+                    // The node declares its own payload, so the output schema is
+                    // the input PK region plus `out_cols` — never the view's.
+                    let dep = gnitz_wire::decode_expr_blob(program)
+                        .ok_or(CompileError::Rejected("compute map: corrupt expr blob"))?;
+                    let prog = LogicalProgram::from_wire(&dep.code, dep.num_regs, 0, dep.const_strings)
+                        .map_err(expr_reject("compute map: invalid program"))?;
+                    let node_schema = compute_map_output_schema(&in_reg_schema, out_cols)
+                        .ok_or(CompileError::Rejected("compute map: output exceeds MAX_COLUMNS"))?;
+                    prog.validate(Some(&in_reg_schema), Some(&node_schema))
+                        .map_err(expr_reject("compute map: program/schema mismatch"))?;
+                    let mut prog = prog;
+                    ctx.stats.fold.add(prog.fold(&in_reg_schema, false));
+                    let fp = ctx.push_func(ScalarFunc::from_map(prog, &in_reg_schema, &node_schema));
+                    ctx.reg_meta[reg_id as usize] = RegisterMeta::delta(node_schema);
+                    let func_idx = ctx.builder.func_idx(fp);
+                    let prefix = ctx.shared_prefix(nid);
+                    ctx.builder.push(Instr::Map {
+                        in_reg: in_reg as u16,
+                        out_reg: reg_id as u16,
+                        func_idx,
+                        reindex: ReindexOperand::None,
+                        prefix,
                     });
                 }
 
@@ -475,11 +566,13 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
                     let fp = ctx.create_universal_projection(&src_indices, &in_reg_schema, &node_schema);
                     ctx.reg_meta[reg_id as usize] = RegisterMeta::delta(node_schema);
                     let func_idx = ctx.builder.func_idx(fp);
+                    let prefix = ctx.shared_prefix(nid);
                     ctx.builder.push(Instr::Map {
                         in_reg: in_reg as u16,
                         out_reg: reg_id as u16,
                         func_idx,
                         reindex: ReindexOperand::HashRow { branch_id: *branch_id },
+                        prefix,
                     });
                 }
 
@@ -492,11 +585,13 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
                     let fp = ctx.create_universal_projection(&src_indices, &in_reg_schema, &schema);
                     ctx.reg_meta[reg_id as usize] = RegisterMeta::delta(schema);
                     let func_idx = ctx.builder.func_idx(fp);
+                    let prefix = ctx.shared_prefix(nid);
                     ctx.builder.push(Instr::Map {
                         in_reg: in_reg as u16,
                         out_reg: reg_id as u16,
                         func_idx,
                         reindex: ReindexOperand::None,
+                        prefix,
                     });
                 }
             }
@@ -529,8 +624,11 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
             let in_reg_schema = ctx.reg_meta[in_reg as usize].schema;
             // `distinct` is the only one the optimizer elides (its input is already
             // distinct); `positive_part` is never seeded into the skip set, so
-            // this check is simply false for it.
-            if ctx.skip_nodes.contains(&nid) {
+            // this check is simply false for it. Over an insert-only input,
+            // `positive_part` is the identity (no weight can go negative), so it
+            // is elided the same way.
+            let insert_only_in = ctx.input_insert_only(nid, PORT_IN);
+            if ctx.skip_nodes.contains(&nid) || (insert_only_in && matches!(op, gnitz_wire::OpNode::PositivePart)) {
                 ctx.out_reg_of.insert(nid, in_reg);
                 return Ok(());
             }
@@ -554,6 +652,81 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
                 hist_table_idx,
                 lo,
                 hi,
+                // An insert-only `distinct` keeps set membership, not
+                // multiplicities: the history integrates the +1 per new element.
+                hist_from_output: insert_only_in,
+            });
+        }
+
+        gnitz_wire::OpNode::TopK {
+            group_cols,
+            order_col,
+            desc,
+            nulls_first,
+            limit,
+        } => {
+            let in_reg = in_reg(&in_regs, PORT_IN, "top-k: missing input port")?;
+            let in_reg_schema = ctx.reg_meta[in_reg as usize].schema;
+            if oob_cols(group_cols, &in_reg_schema) || *order_col as usize >= in_reg_schema.num_columns() {
+                return Err(CompileError::Rejected("top-k: column out of range"));
+            }
+            let gcols_u32: Vec<u32> = group_cols.iter().map(|&c| c as u32).collect();
+            // The order index is the operator's only state, so an input it
+            // cannot key (nullable/float group column, non-orderable order
+            // column, over-budget key) fails the compile — there is no trace-scan
+            // fallback as there is for MIN/MAX.
+            if !top_k_index_eligible(&in_reg_schema, &gcols_u32, *order_col as u32) {
+                return Err(CompileError::Rejected(
+                    "top-k: order index key is not byte-form-eligible",
+                ));
+            }
+            let bake = crate::ops::TopKBake::new(
+                &in_reg_schema,
+                &gcols_u32,
+                *order_col as u32,
+                *desc,
+                *nulls_first,
+                *limit,
+            );
+            let child_name = format!("_topk_{}_{nid}", ctx.view_id);
+            let index_table_ptr = ctx.add_owned_trace_table(&child_name, bake.schema, Some(reg_id))?;
+            let out_delta_id = ctx.push_delta_reg(in_reg_schema);
+            ctx.out_reg_of.insert(nid, out_delta_id);
+            let index_table_idx = ctx.builder.table_idx(index_table_ptr) as u16;
+            let bake_idx = ctx.builder.add_top_k_bake(bake);
+            ctx.builder.push(Instr::TopK {
+                in_reg: in_reg as u16,
+                index_reg: reg_id as u16,
+                out_reg: out_delta_id as u16,
+                index_table_idx,
+                bake_idx,
+            });
+        }
+
+        gnitz_wire::OpNode::Retain { col, horizon } => {
+            let in_reg = in_reg(&in_regs, PORT_IN, "retain: missing input port")?;
+            let in_reg_schema = ctx.reg_meta[in_reg as usize].schema;
+            if *col as usize >= in_reg_schema.num_columns() {
+                return Err(CompileError::Rejected("retain: column out of range"));
+            }
+            // As for top-K, the index is the only record of what was passed, so
+            // an input it cannot key fails the compile.
+            if !retain_index_eligible(&in_reg_schema, *col as u32) {
+                return Err(CompileError::Rejected("retain: index key is not byte-form-eligible"));
+            }
+            let bake = crate::ops::RetainBake::new(&in_reg_schema, *col as u32, *horizon);
+            let child_name = format!("_retain_{}_{nid}", ctx.view_id);
+            let index_table_ptr = ctx.add_owned_trace_table(&child_name, bake.schema, Some(reg_id))?;
+            let out_delta_id = ctx.push_delta_reg(in_reg_schema);
+            ctx.out_reg_of.insert(nid, out_delta_id);
+            let index_table_idx = ctx.builder.table_idx(index_table_ptr) as u16;
+            let bake_idx = ctx.builder.add_retain_bake(bake);
+            ctx.builder.push(Instr::Retain {
+                in_reg: in_reg as u16,
+                index_reg: reg_id as u16,
+                out_reg: out_delta_id as u16,
+                index_table_idx,
+                bake_idx,
             });
         }
 
@@ -621,12 +794,24 @@ pub(super) fn emit_node(ctx: &mut EmitCtx, nid: i32, reg_id: i32) -> Result<(),
         gnitz_wire::OpNode::IntegrateTrace => {
             let in_reg = in_reg(&in_regs, PORT_IN, "integrate-trace: missing input port")?;
             let in_reg_schema = ctx.reg_meta[in_reg as usize].schema;
-            let child_name = format!("_int_{}_{nid}", ctx.view_id);
-            // Must fail the compile on a table-open error: emitting the view without
-            // the Integrate would compile a view that never persists its differential
-            // state, leaving its output permanently empty.
-            let table_ptr = ctx.add_owned_trace_table(&child_name, in_reg_schema, Some(reg_id))?;
-            ctx.push_integrate(in_reg as u16, table_ptr);
+            if let Some((idx, held)) = ctx.attach_shared_trace(nid, in_reg_schema) {
+                ctx.reg_meta[reg_id as usize] = RegisterMeta::trace(in_reg_schema);
+                ctx.shared_trace_regs.push((reg_id as u16, idx));
+                if !held {
+                    let arrangement_idx = ctx.builder.arrangement_idx(Rc::as_ptr(&ctx.shared[idx]));
+                    ctx.builder.push(Instr::IntegrateShared {
+                        in_reg: in_reg as u16,
+                        arrangement_idx,
+                    });
+                }
+            } else {
+                let child_name = format!("_int_{}_{nid}", ctx.view_id);
+                // Must fail the compile on a table-open error: emitting the view without
+                // the Integrate would compile a view that never persists its differential
+                // state, leaving its output permanently empty.
+                let table_ptr = ctx.add_owned_trace_table(&child_name, in_reg_schema, Some(reg_id))?;
+                ctx.push_integrate(in_reg as u16, table_ptr);
+            }
         }
 
         gnitz_wire::OpNode::ExchangeShard { .. } => {
@@ -748,17 +933,20 @@ pub(super) fn emit_reduce(
         .collect();
 
     // Every aggregate that decodes its column value needs an order-encodable
-    // (≤8-byte int/float) scalar. SUM/SUM_ZERO sum it — a 16-byte source would abort
+    // (≤8-byte int/float) scalar. SUM/SUM_ZERO/SUM_SQ sum it — a 16-byte source would abort
     // at the first push in `decode_signed` (`unreachable!`) and a string would
     // silently mis-sum; MIN/MAX compare it via `encode_ordered`, which has no
-    // monotone key for STRING / U128 / UUID / BLOB. COUNT / COUNT_NON_NULL never
-    // read the value. The SQL binder already rejects these,
+    // monotone key for STRING / U128 / UUID / BLOB; APPROX_PERCENTILE reads it as
+    // a number. COUNT / COUNT_NON_NULL never read the value, and
+    // APPROX_COUNT_DISTINCT hashes any type. The SQL binder already rejects these,
     // so this is the defensive guard for the low-level CircuitBuilder path that
     // bypasses it: a failure fails the compile (so the view compiles to nothing)
     // rather than panicking a worker at execution.
     if agg_descs.iter().any(|ad| {
-        matches!(ad.agg_op, AggOp::Sum | AggOp::SumZero | AggOp::Min | AggOp::Max)
-            && !agg_value_idx_eligible(ad.col_type_code)
+        matches!(
+            ad.agg_op,
+            AggOp::Sum | AggOp::SumZero | AggOp::SumSquares | AggOp::Min | AggOp::Max | AggOp::ApproxPercentile(_)
+        ) && !agg_value_idx_eligible(ad.col_type_code)
     }) {
         return Err(CompileError::Rejected(
             "reduce: aggregate column is not order-encodable",
@@ -794,21 +982,36 @@ pub(super) fn emit_reduce(
     // order-encodable — the combined value-decode guard above rejected any that
     // were not — so AVI use turns only on the group key. The empty global key is
     // eligible, so a global MIN/MAX always resolves via the index; nothing
-    // value-indexed is left on the trace-scan fallback below.
+    // value-indexed is left on the trace-scan fallback below. The sketch
+    // aggregates ride the same index with a sketch cell in the value slot, so a
+    // touched group re-derives its estimate from at most a sketch's worth of
+    // entries; over a non-byte-form group key they replay the group instead.
     //
     // No nullable check on the aggregate columns: NULL aggregate values never
     // reach the AVI. The reduce accumulator skips NULL inputs (ops/reduce/agg.rs)
     // and AVI population skips a NULL aggregate value before encoding the index
     // key (ops/index.rs), whose value column is a non-nullable PK. Moving either
     // filter without revisiting this would write a zeroed key and corrupt MIN/MAX.
-    let use_avi = has_value_indexed && avi_group_key_eligible(&in_reg_schema, &gcols_u32);
+    //
+    // An insert-only input whose non-linear aggregates are all integer MIN/MAX
+    // needs neither the index nor the input trace: an extreme that can never
+    // recede folds as `combine(old, Δ)` off trace_out. Floats keep the index
+    // (their widened output slot does not read back losslessly), and a sketch
+    // always re-derives from its cells.
+    let insert_only = !all_linear
+        && !in_regs.contains_key(&PORT_TRACE)
+        && ctx.input_insert_only(nid, PORT_IN)
+        && agg_descs.iter().all(|a| {
+            a.agg_op.is_linear() || (matches!(a.agg_op, AggOp::Min | AggOp::Max) && !a.col_type_code.is_float())
+        });
+    let use_avi = !insert_only && has_value_indexed && avi_group_key_eligible(&in_reg_schema, &gcols_u32);
 
     let mut tr_in_reg_id: i32 = -1;
     let mut tr_in_table_ptr: *mut Table = std::ptr::null_mut();
 
     if let Some(&existing) = in_regs.get(&PORT_TRACE) {
         tr_in_reg_id = existing;
-    } else if !all_linear && !use_avi {
+    } else if !all_linear && !use_avi && !insert_only {
         tr_in_reg_id = ctx.reg_meta.len() as i32;
         ctx.reg_meta.push(RegisterMeta::delta(in_reg_schema)); // overwritten to trace below
         tr_in_table_ptr = ctx.add_owned_trace_table(
@@ -899,6 +1102,7 @@ pub(super) fn emit_reduce(
         &agg_descs,
         out_key,
         avi_table_idx.is_some(),
+        insert_only,
         global_ground,
         i_am_owner,
     ));
@@ -914,7 +1118,7 @@ pub(super) fn emit_reduce(
 
     // The trace_in integrate (non-linear, non-AVI fallback) carries no value
     // index — tr_in and the AVI are mutually exclusive (the tr_in gate is
-    // `!all_linear && !use_avi`).
+    // `!all_linear && !use_avi && !insert_only`).
     if !tr_in_table_ptr.is_null() {
         ctx.push_integrate(in_reg_id as u16, tr_in_table_ptr);
     }
@@ -938,6 +1142,7 @@ pub(super) fn build_plan(
     recovery: RecoverySource,
     output_node_id: Option<i32>,
     exchange_inputs: &[(i32, SchemaDescriptor)],
+    share: Option<(&ShareKeys, &mut ShareScope)>,
 ) -> Result<PlanBuildResult, CompileError> {
     let mut out_reg_of: HashMap<i32, i32> = HashMap::new();
     let mut next_reg: i32 = 0;
@@ -1003,6 +1208,7 @@ pub(super) fn build_plan(
         view_id,
         recovery,
         all_sources_replicated,
+        insert_only: compute_insert_only(loaded, ext_tables),
         builder: ProgramBuilder::new(),
         out_reg_of,
         reg_meta,
@@ -1013,6 +1219,10 @@ pub(super) fn build_plan(
         source_reg_map: HashMap::new(),
         sink_reg_id: -1,
         scratch: ScratchGuard::new(),
+        share,
+        shared: Vec::new(),
+        shared_trace_regs: Vec::new(),
+        stats: OptimizerStats::default(),
     };
 
     for &nid in ordered {
@@ -1105,9 +1315,19 @@ pub(super) fn build_plan(
         ext_trace_regs,
         source_reg_map,
         scratch,
+        shared,
+        shared_trace_regs,
+        stats,
         ..
     } = ctx;
-    let vm = builder.build_with_owned(reg_meta, owned_tables, owned_funcs, owned_trace_regs);
+    let vm = builder.build_with_owned(
+        reg_meta,
+        owned_tables,
+        owned_funcs,
+        owned_trace_regs,
+        shared,
+        shared_trace_regs,
+    );
 
     Ok(PlanBuildResult {
         vm,
@@ -1117,6 +1337,7 @@ pub(super) fn build_plan(
         source_reg_map,
         exchange_input_regs,
         scratch,
+        stats,
     })
 }
 
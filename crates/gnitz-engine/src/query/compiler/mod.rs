@@ -3,9 +3,11 @@
 
 use std::collections::{HashMap, HashSet, VecDeque};
 
-use crate::expr::{ExprValidateErr, LogicalProgram, ScalarFunc};
+use crate::expr::{ExprValidateErr, FoldStats, LogicalProgram, ScalarFunc};
 use crate::foundation::worker_ctx::{num_workers, worker_rank};
 use crate::ops::{AggDescriptor, AggOp};
+use crate::query::arrangement::{ArrangementKey, ShareScope, SharedArrangement};
+use crate::query::vm::profile::ExchangeCounts;
 use crate::query::vm::{Instr, ProgramBuilder, RegisterMeta, VmHandle};
 use crate::schema::{is_fixed_int, type_code, SchemaColumn, SchemaDescriptor, TypeCode};
 use crate::storage::{ReadCursor, RecoverySource, Table};
@@ -207,6 +209,36 @@ pub(crate) struct CompileOutput {
     /// access hint**: `None` means "full-scan", which is always correct, and the
     /// circuit's `Filter` carries the full predicate either way.
     pub source_bound: Option<(i64, gnitz_wire::ScanBound)>,
+    /// What the optimizer passes did to this view, summed over its sub-plans.
+    pub optimizer: OptimizerStats,
+    /// Exchange traffic of this plan's multi-worker steps (`EXPLAIN ANALYZE`).
+    pub exchange: ExchangeCounts,
+}
+
+/// Per-view optimizer gains, logged at compile and surfaced by EXPLAIN.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub(crate) struct OptimizerStats {
+    /// Expression folding over every filter predicate and map program.
+    pub fold: FoldStats,
+    /// Filters whose predicate folded to TRUE, compiled as pass-throughs.
+    pub filters_elided: u32,
+    /// Filter/map nodes attached to a cross-view shared prefix.
+    pub shared_prefixes: u32,
+    /// Trailing payload columns projected away before a shard exchange.
+    pub pruned_cols: u32,
+}
+
+impl OptimizerStats {
+    pub fn add(&mut self, o: OptimizerStats) {
+        self.fold.add(o.fold);
+        self.filters_elided += o.filters_elided;
+        self.shared_prefixes += o.shared_prefixes;
+        self.pruned_cols += o.pruned_cols;
+    }
+
+    pub fn is_empty(&self) -> bool {
+        *self == OptimizerStats::default()
+    }
 }
 
 impl CompileOutput {
@@ -219,6 +251,14 @@ impl CompileOutput {
         };
         sides.iter_mut().map(|s| &mut s.plan).chain(single).chain(post)
     }
+
+    pub fn sub_plans(&self) -> impl Iterator<Item = &SubPlan> {
+        let (sides, single, post) = match &self.shape {
+            PlanShape::Single(sub) => (&[][..], Some(sub), None),
+            PlanShape::Exchanged { sides, post } => (&sides[..], None, Some(post)),
+        };
+        sides.iter().map(|s| &s.plan).chain(single).chain(post)
+    }
 }
 
 // ---------------------------------------------------------------------------
@@ -239,6 +279,7 @@ pub(super) struct PlanBuildResult {
     // plan, an `Err` return from `compile_view`) removes them; `into_sub_plan`
     // defuses the guard — from then on the VM's owned tables keep them alive.
     scratch: emit::ScratchGuard,
+    stats: OptimizerStats,
 }
 
 impl PlanBuildResult {
@@ -328,10 +369,11 @@ pub(crate) unsafe fn compile_view(
     view_schema: &SchemaDescriptor,
     ext_tables: &ExtTables,
     recovery: RecoverySource,
+    share: Option<&mut ShareScope>,
 ) -> Result<CompileOutput, CompileError> {
     let loaded =
         load_circuit(sys_nodes, sys_edges, sys_node_cols, view_id, *view_schema).ok_or(CompileError::LoadFailed)?;
-    compile_loaded(loaded, view_dir, view_id, ext_tables, recovery)
+    compile_loaded(loaded, view_dir, view_id, ext_tables, recovery, share)
 }
 
 /// Compile an already-loaded circuit into a runnable plan. The sys-table-free
@@ -342,12 +384,17 @@ pub(crate) unsafe fn compile_view(
 /// transient executor (which builds the `LoadedCircuit` from a delivered
 /// `FLAG_RUN_TRANSIENT` frame — `load::build_loaded_from_batches` — and never
 /// touches the sys tables).
+///
+/// `share` lets a single-phase equi-join attach its eligible traces to the
+/// worker's shared arrangements (`compute_shared_traces`); `None` keeps every
+/// trace private.
 pub(crate) fn compile_loaded(
     mut loaded: LoadedCircuit,
     view_dir: &str,
     view_id: u64,
     ext_tables: &ExtTables,
     recovery: RecoverySource,
+    mut share: Option<&mut ShareScope>,
 ) -> Result<CompileOutput, CompileError> {
     if loaded.nodes.is_empty() {
         return Err(CompileError::EmptyCircuit);
@@ -363,14 +410,9 @@ pub(crate) fn compile_loaded(
     // `build_plan` once per side plus post — so an emit-sourced value would need
     // a cross-sub-plan merge.
     let source_bound = circuit_source_bound(&loaded);
-
-    let annotated = |shape: PlanShape| CompileOutput {
-        shape,
-        co_partitioned,
-        join_shard_map,
-        range_join_n_eq,
-        skips_exchange,
-        source_bound,
+    let mut optimizer = OptimizerStats {
+        pruned_cols: prune_exchange_columns(&mut loaded, ext_tables)? as u32,
+        ..Default::default()
     };
 
     let exchange_nids: Vec<i32> = loaded
@@ -380,6 +422,38 @@ pub(crate) fn compile_loaded(
         .filter(|&nid| matches!(loaded.nodes.get(&nid), Some(gnitz_wire::OpNode::ExchangeShard { .. })))
         .collect();
 
+    // A range join's traces and filtered deltas are trimmed per worker by its
+    // band-slot partition filter, so it shares nothing. Traces are shared only
+    // by single-phase plans; prefixes also by the sides of an exchanged one.
+    let shared_keys = match (&share, range_join_n_eq) {
+        (Some(_), None) => ShareKeys {
+            traces: if exchange_nids.is_empty() {
+                compute_shared_traces(&loaded, &join_shard_map, &co_partitioned, ext_tables)
+            } else {
+                HashMap::new()
+            },
+            prefixes: compute_shared_prefixes(
+                &loaded,
+                &join_shard_map,
+                &co_partitioned,
+                ext_tables,
+                !exchange_nids.is_empty(),
+            ),
+        },
+        _ => ShareKeys::default(),
+    };
+
+    let annotated = |shape: PlanShape, optimizer: OptimizerStats| CompileOutput {
+        shape,
+        co_partitioned,
+        join_shard_map,
+        range_join_n_eq,
+        skips_exchange,
+        source_bound,
+        optimizer,
+        exchange: ExchangeCounts::default(),
+    };
+
     // On any `?` below, the failing/finished `PlanBuildResult`s drop and their
     // ScratchGuards remove every scratch directory the sibling plans created —
     // a rejected compile leaks no inodes.
@@ -396,8 +470,10 @@ pub(crate) fn compile_loaded(
                 recovery,
                 None,
                 &[],
+                share.map(|s| (&shared_keys, s)),
             )?;
-            Ok(annotated(PlanShape::Single(plan.into_sub_plan())))
+            optimizer.add(plan.stats);
+            Ok(annotated(PlanShape::Single(plan.into_sub_plan()), optimizer))
         }
         // One or two exchange boundaries: carve each side out by the ancestors
         // of its exchange input (a binary set-op's two independent
@@ -433,8 +509,10 @@ pub(crate) fn compile_loaded(
                     recovery,
                     Some(ex_in),
                     &[],
+                    share.as_deref_mut().map(|s| (&shared_keys, s)),
                 )?;
                 let schema = finalize_side(&plan, &loaded, ex_nid)?;
+                optimizer.add(plan.stats);
                 side_plans.push(plan);
                 exchange_inputs.push((ex_nid, schema));
             }
@@ -449,7 +527,9 @@ pub(crate) fn compile_loaded(
                 recovery,
                 None,
                 &exchange_inputs,
+                None,
             )?;
+            optimizer.add(post.stats);
 
             let sides: Vec<Side> = side_plans
                 .into_iter()
@@ -461,10 +541,13 @@ pub(crate) fn compile_loaded(
                 })
                 .collect();
 
-            Ok(annotated(PlanShape::Exchanged {
-                sides,
-                post: post.into_sub_plan(),
-            }))
+            Ok(annotated(
+                PlanShape::Exchanged {
+                    sides,
+                    post: post.into_sub_plan(),
+                },
+                optimizer,
+            ))
         }
         _ => {
             // More than two exchange boundaries is not produced by any current
@@ -754,6 +837,19 @@ mod tests {
         // stays total, hence these asserts still hold.
         assert_eq!(agg_output_type(AggOp::Max, TypeCode::String), type_code::I64);
         assert_eq!(agg_output_type(AggOp::Min, TypeCode::U128), type_code::I64);
+        // Sketch estimates are typed by what they estimate, not by the source.
+        assert_eq!(
+            agg_output_type(AggOp::ApproxCountDistinct, TypeCode::String),
+            type_code::I64
+        );
+        assert_eq!(
+            agg_output_type(AggOp::ApproxPercentile(5_000), TypeCode::I32),
+            type_code::F64
+        );
+        // SUM_SQ is a float sum of squares for every source.
+        assert_eq!(agg_output_type(AggOp::SumSquares, TypeCode::I64), type_code::F64);
+        assert_eq!(agg_output_type(AggOp::SumSquares, TypeCode::U64), type_code::F64);
+        assert_eq!(agg_output_type(AggOp::SumSquares, TypeCode::F32), type_code::F64);
     }
 
     #[test]
@@ -927,6 +1023,7 @@ mod tests {
             test_recovery(),
             None,
             &[],
+            None,
         );
         assert!(result.is_err(), "build_plan must fail when child table creation fails");
     }
@@ -957,6 +1054,7 @@ mod tests {
             test_recovery(),
             None,
             &[],
+            None,
         );
         assert!(
             result.is_err(),
@@ -1016,6 +1114,7 @@ mod tests {
                 test_recovery(),
                 Some(2),
                 &[],
+                None,
             )
             .is_ok();
             let _ = std::fs::remove_dir_all(&view_dir);
@@ -1075,6 +1174,7 @@ mod tests {
                 test_recovery(),
                 Some(2),
                 &[],
+                None,
             )
             .is_ok();
             let _ = std::fs::remove_dir_all(&view_dir);
@@ -1165,6 +1265,7 @@ mod tests {
             test_recovery(),
             Some(2),
             &[],
+            None,
         );
         assert!(
             result.is_ok(),
@@ -1196,6 +1297,7 @@ mod tests {
             test_recovery(),
             None,
             &[],
+            None,
         );
         assert!(
             result.is_err(),
@@ -1232,7 +1334,18 @@ mod tests {
         );
         let ext: ExtTables = HashMap::from([(99, in_schema)]);
         let ordered = loaded.ordered.clone();
-        let result = build_plan(&loaded, &no_skips(), &ordered, &ext, "", 99, test_recovery(), None, &[]);
+        let result = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            99,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        );
         assert!(result.is_err(), "type-mismatched sink schema must be rejected");
     }
 
@@ -1255,7 +1368,18 @@ mod tests {
         loaded.out_schema = in_schema;
         let ext: ExtTables = HashMap::from([(99, in_schema)]);
         let ordered = loaded.ordered.clone();
-        let result = build_plan(&loaded, &no_skips(), &ordered, &ext, "", 99, test_recovery(), None, &[]);
+        let result = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            99,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        );
         assert!(result.is_err(), "corrupt Filter blob must abort compilation");
     }
 
@@ -1279,7 +1403,18 @@ mod tests {
         let in_schema = SchemaDescriptor::new(&[SchemaColumn::new(type_code::U64, 0)], &[0]);
         let ext: ExtTables = HashMap::from([(99, in_schema)]);
         let ordered = loaded.ordered.clone();
-        let result = build_plan(&loaded, &no_skips(), &ordered, &ext, "", 99, test_recovery(), None, &[]);
+        let result = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            99,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        );
         assert!(result.is_err(), "corrupt Map blob must abort compilation");
     }
 
@@ -1419,7 +1554,18 @@ mod tests {
         loaded.out_schema = reindex_output_schema(&in_schema, &[0u16, 1u16], &[], &[0, 1]);
         let ext: ExtTables = HashMap::from([(99, in_schema)]);
         let ordered = loaded.ordered.clone();
-        let result = build_plan(&loaded, &no_skips(), &ordered, &ext, "", 99, test_recovery(), None, &[]);
+        let result = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            99,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        );
         assert!(
             result.is_ok(),
             "compound (len > 1) reindex must compile after the gate lift"
@@ -1456,7 +1602,18 @@ mod tests {
         let loaded = make_loaded(nodes, edges);
         let ext: ExtTables = HashMap::from([(99, in_schema)]);
         let ordered = loaded.ordered.clone();
-        let result = build_plan(&loaded, &no_skips(), &ordered, &ext, "", 99, test_recovery(), None, &[]);
+        let result = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            99,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        );
         assert!(result.is_err(), "reindex list > MAX_PK_COLUMNS must fail the compile");
     }
 
@@ -1494,7 +1651,18 @@ mod tests {
         loaded.out_schema = reindex_output_schema(&in_schema, &[0u16], &[], &[2]);
         let ext: ExtTables = HashMap::from([(99, in_schema)]);
         let ordered = loaded.ordered.clone();
-        let result = build_plan(&loaded, &no_skips(), &ordered, &ext, "", 99, test_recovery(), None, &[]);
+        let result = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            99,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        );
         assert!(result.is_ok(), "pruned reindex must compile to the derived schema");
     }
 
@@ -1529,7 +1697,18 @@ mod tests {
         );
         let ext: ExtTables = HashMap::from([(99, in_schema)]);
         let ordered = loaded.ordered.clone();
-        let result = build_plan(&loaded, &no_skips(), &ordered, &ext, "", 99, test_recovery(), None, &[]);
+        let result = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            99,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        );
         assert!(result.is_err(), "out-of-range program copy must fail the compile");
     }
 
@@ -1579,6 +1758,7 @@ mod tests {
             test_recovery(),
             Some(2),
             &[],
+            None,
         );
         assert!(result.is_err(), "IntegrateTrace failure must fail the compile");
 
@@ -1820,6 +2000,7 @@ mod tests {
             test_recovery(),
             Some(2),
             &[],
+            None,
         )
         .is_ok();
         let _ = std::fs::remove_dir_all(&view_dir);
@@ -1876,6 +2057,70 @@ mod tests {
         assert!(!compiles_mid_node(schema(type_code::STRING), reduce, "sum_str"));
     }
 
+    #[test]
+    fn test_top_k_rejects_unkeyable_order_index() {
+        use gnitz_wire::OpNode;
+        // col 0 = U64 PK, col 1 = I64 group, col 2 = nullable F64 order,
+        // col 3 = nullable I64, col 4 = STRING.
+        let schema = SchemaDescriptor::new(
+            &[
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::I64, 0),
+                SchemaColumn::new(type_code::F64, 1),
+                SchemaColumn::new(type_code::I64, 1),
+                SchemaColumn::new(type_code::STRING, 0),
+            ],
+            &[0],
+        );
+        let top_k = |group_cols: Vec<u16>, order_col: u16| OpNode::TopK {
+            group_cols,
+            order_col,
+            desc: true,
+            nulls_first: false,
+            limit: 3,
+        };
+        assert!(compiles_mid_node(schema, top_k(vec![], 2), "topk_global"));
+        assert!(compiles_mid_node(schema, top_k(vec![1], 2), "topk_grp"));
+        // A nullable group column has no byte-form key.
+        assert!(!compiles_mid_node(schema, top_k(vec![3], 2), "topk_null_grp"));
+        // A STRING has no order-preserving u64 encoding.
+        assert!(!compiles_mid_node(schema, top_k(vec![1], 4), "topk_str_order"));
+        assert!(!compiles_mid_node(schema, top_k(vec![200], 2), "topk_grp_oob"));
+        assert!(!compiles_mid_node(schema, top_k(vec![1], 200), "topk_order_oob"));
+    }
+
+    #[test]
+    fn test_compute_map_and_retain_guards() {
+        use gnitz_wire::{MapKind, OpNode};
+        // col 0 = U64 PK, col 1 = nullable I64, col 2 = F64.
+        let schema = SchemaDescriptor::new(
+            &[
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::I64, 1),
+                SchemaColumn::new(type_code::F64, 0),
+            ],
+            &[0],
+        );
+        let compute = |n: usize| {
+            OpNode::Map(MapKind::Compute {
+                program: gnitz_wire::encode_expr_blob(0, 0, &[], &[]),
+                out_cols: vec![(type_code::I64, true); n],
+            })
+        };
+        assert!(compiles_mid_node(schema, compute(3), "compute_ok"));
+        assert!(!compiles_mid_node(
+            schema,
+            compute(crate::schema::MAX_COLUMNS),
+            "compute_too_wide"
+        ));
+        let retain = |col: u16| OpNode::Retain { col, horizon: 60 };
+        // A nullable integer is retainable (NULL rows pass unindexed).
+        assert!(compiles_mid_node(schema, retain(1), "retain_int"));
+        // The float encoding is not an offset, so a horizon cannot subtract in it.
+        assert!(!compiles_mid_node(schema, retain(2), "retain_float"));
+        assert!(!compiles_mid_node(schema, retain(9), "retain_oob"));
+    }
+
     #[test]
     fn test_projection_col_out_of_bounds_rejected() {
         use gnitz_wire::{MapKind, OpNode};
@@ -2109,6 +2354,7 @@ mod tests {
             test_recovery(),
             Some(3),
             &[],
+            None,
         );
         let _ = std::fs::remove_dir_all(&view_dir);
         assert!(
@@ -2135,6 +2381,7 @@ mod tests {
             test_recovery(),
             Some(3),
             &[],
+            None,
         );
         assert!(
             result.is_err(),
@@ -2170,6 +2417,7 @@ mod tests {
             test_recovery(),
             Some(3),
             &[],
+            None,
         );
         let _ = std::fs::remove_dir_all(&view_dir);
         assert!(
@@ -2213,6 +2461,7 @@ mod tests {
             test_recovery(),
             Some(2), // bypass out_schema mismatch check; sink_reg already set by IntegrateSink
             &[],
+            None,
         );
         let plan = result.expect("build_plan must succeed for this circuit");
 
@@ -2264,6 +2513,7 @@ mod tests {
             test_recovery(),
             Some(2), // bypass out_schema mismatch check
             &[],
+            None,
         );
         let plan = result.expect("build_plan must succeed");
 
@@ -2327,6 +2577,7 @@ mod tests {
             test_recovery(),
             Some(2), // bypass out_schema mismatch; sink_reg set by IntegrateSink
             &[],
+            None,
         )
         .expect("build_plan must succeed for the ScanDelta→Join(DT)←ScanTrace→sink circuit");
 
@@ -2408,6 +2659,7 @@ mod tests {
             test_recovery(),
             Some(2), // bypass out_schema mismatch; sink_reg set by IntegrateSink
             &[],
+            None,
         );
         let _ = std::fs::remove_dir_all(&view_dir);
         let plan = result.expect("build_plan must succeed for the join→IntegrateTrace+sink circuit");
@@ -2434,6 +2686,239 @@ mod tests {
         );
     }
 
+    /// Two views with the same `ScanDelta(10) → IntegrateTrace` join trace
+    /// attach one shared arrangement and own no private trace; a self-join's
+    /// trace is never shared.
+    #[test]
+    fn test_identical_join_traces_share_one_arrangement() {
+        use crate::query::arrangement::ArrangementRegistry;
+
+        // ScanDelta(20) --PORT_IN_A--> Join(DT)(2) --> IntegrateSink(3)
+        // ScanDelta(10) --> IntegrateTrace(1) --PORT_TRACE--> Join(DT)(2)
+        let schema = two_col_schema();
+        let mut nodes = HashMap::new();
+        nodes.insert(0, scan_delta(10));
+        nodes.insert(1, gnitz_wire::OpNode::IntegrateTrace);
+        nodes.insert(2, gnitz_wire::OpNode::Join(gnitz_wire::JoinKind::DeltaTrace));
+        nodes.insert(3, gnitz_wire::OpNode::IntegrateSink);
+        nodes.insert(4, scan_delta(20));
+        let edges = vec![(0, 1, PORT_IN), (4, 2, PORT_IN_A), (1, 2, PORT_TRACE), (2, 3, PORT_IN)];
+        let loaded = make_loaded(nodes, edges);
+        let ext: ExtTables = HashMap::from([(10, schema), (20, schema)]);
+        let (join_shard_map, co_partitioned) = annotate(&loaded, &ext);
+        let traces = compute_shared_traces(&loaded, &join_shard_map, &co_partitioned, &ext);
+        assert_eq!(traces.keys().copied().collect::<Vec<_>>(), vec![1]);
+        let keys = ShareKeys {
+            traces,
+            ..Default::default()
+        };
+
+        let tmp = tempfile::tempdir().unwrap();
+        let view_dir = tmp.path().to_str().unwrap().to_string();
+        std::fs::create_dir_all(format!("{view_dir}/t10")).unwrap();
+        let mut scope = ShareScope {
+            registry: ArrangementRegistry::default(),
+            source_dirs: HashMap::from([(10, format!("{view_dir}/t10"))]),
+            backfill_first: Some(10),
+        };
+        let ordered = loaded.ordered.clone();
+        let mut build = |vid: u64| {
+            build_plan(
+                &loaded,
+                &no_skips(),
+                &ordered,
+                &ext,
+                &view_dir,
+                vid,
+                test_recovery(),
+                Some(2),
+                &[],
+                Some((&keys, &mut scope)),
+            )
+            .expect("join plan must compile")
+        };
+        let a = build(1);
+        let b = build(2);
+        assert!(std::rc::Rc::ptr_eq(&a.vm.shared[0], &b.vm.shared[0]));
+        assert!(a.vm.owned_tables.is_empty() && b.vm.owned_tables.is_empty());
+        assert_eq!(scope.registry.infos()[0].consumers, 2);
+        drop((a, b));
+        assert!(
+            scope.registry.infos().is_empty(),
+            "the last consumer releases the arrangement"
+        );
+
+        // Self-join: the trace's own source feeds the delta side.
+        let mut nodes = HashMap::new();
+        nodes.insert(0, scan_delta(10));
+        nodes.insert(1, gnitz_wire::OpNode::IntegrateTrace);
+        nodes.insert(2, gnitz_wire::OpNode::Join(gnitz_wire::JoinKind::DeltaTrace));
+        nodes.insert(3, gnitz_wire::OpNode::IntegrateSink);
+        let edges = vec![(0, 1, PORT_IN), (0, 2, PORT_IN_A), (1, 2, PORT_TRACE), (2, 3, PORT_IN)];
+        let loaded = make_loaded(nodes, edges);
+        let (join_shard_map, co_partitioned) = annotate(&loaded, &ext);
+        assert!(compute_shared_traces(&loaded, &join_shard_map, &co_partitioned, &ext).is_empty());
+    }
+
+    /// A `col1 > k` predicate over `two_col_schema`.
+    fn gt_filter_blob(k: i64) -> Vec<u8> {
+        let mut eb = gnitz_core::ExprBuilder::new();
+        let c = eb.load_col_int(1);
+        let k = eb.load_const(k);
+        let r = eb.cmp_gt(c, k);
+        eb.build(r).encode()
+    }
+
+    /// Two views filtering one source by the same predicate key the filter
+    /// alike and attach one shared prefix; a different constant keys apart.
+    #[test]
+    fn test_identical_filter_prefixes_share_one_memo() {
+        use crate::query::arrangement::ArrangementRegistry;
+
+        let schema = two_col_schema();
+        let filtered = |k: i64| {
+            let mut nodes = HashMap::new();
+            nodes.insert(0, scan_delta(10));
+            nodes.insert(1, gnitz_wire::OpNode::Filter(Some(gt_filter_blob(k))));
+            nodes.insert(2, gnitz_wire::OpNode::IntegrateSink);
+            let mut loaded = make_loaded(nodes, vec![(0, 1, PORT_IN), (1, 2, PORT_IN)]);
+            loaded.out_schema = schema;
+            loaded
+        };
+        let ext: ExtTables = HashMap::from([(10, schema)]);
+        let keys_of = |loaded: &LoadedCircuit| {
+            let (join_shard_map, co_partitioned) = annotate(loaded, &ext);
+            ShareKeys {
+                prefixes: compute_shared_prefixes(loaded, &join_shard_map, &co_partitioned, &ext, false),
+                ..Default::default()
+            }
+        };
+        let loaded = filtered(5);
+        let keys = keys_of(&loaded);
+        assert_eq!(keys.prefixes.keys().copied().collect::<Vec<_>>(), vec![1]);
+        assert_ne!(keys.prefixes[&1], keys_of(&filtered(6)).prefixes[&1]);
+
+        let mut scope = ShareScope {
+            registry: ArrangementRegistry::default(),
+            source_dirs: HashMap::new(),
+            backfill_first: None,
+        };
+        let ordered = loaded.ordered.clone();
+        let mut build = |vid: u64| {
+            build_plan(
+                &loaded,
+                &no_skips(),
+                &ordered,
+                &ext,
+                "",
+                vid,
+                test_recovery(),
+                None,
+                &[],
+                Some((&keys, &mut scope)),
+            )
+            .expect("filter plan must compile")
+        };
+        let a = build(1);
+        let b = build(2);
+        assert!(std::rc::Rc::ptr_eq(
+            &a.vm.program.prefixes[0],
+            &b.vm.program.prefixes[0]
+        ));
+        assert_eq!(a.stats.shared_prefixes, 1);
+        assert_eq!(scope.registry.prefix_infos()[0].consumers, 2);
+        drop((a, b));
+        assert!(scope.registry.prefix_infos().is_empty());
+    }
+
+    /// A predicate that folds to TRUE compiles to no `Filter` at all.
+    #[test]
+    fn test_constant_true_filter_elided() {
+        let mut eb = gnitz_core::ExprBuilder::new();
+        let a = eb.load_const(2);
+        let b = eb.load_const(1);
+        let r = eb.cmp_gt(a, b);
+        let blob = eb.build(r).encode();
+
+        let schema = two_col_schema();
+        let mut nodes = HashMap::new();
+        nodes.insert(0, scan_delta(10));
+        nodes.insert(1, gnitz_wire::OpNode::Filter(Some(blob)));
+        nodes.insert(2, gnitz_wire::OpNode::IntegrateSink);
+        let mut loaded = make_loaded(nodes, vec![(0, 1, PORT_IN), (1, 2, PORT_IN)]);
+        loaded.out_schema = schema;
+        let ext: ExtTables = HashMap::from([(10, schema)]);
+        let ordered = loaded.ordered.clone();
+        let plan = build_plan(
+            &loaded,
+            &no_skips(),
+            &ordered,
+            &ext,
+            "",
+            1,
+            test_recovery(),
+            None,
+            &[],
+            None,
+        )
+        .expect("plan must compile");
+        assert_eq!(plan.stats.filters_elided, 1);
+        assert!(!plan
+            .vm
+            .program
+            .instructions
+            .iter()
+            .any(|i| matches!(i, Instr::Filter { .. })));
+    }
+
+    /// A GROUP BY over the leading columns relays only those: a projection is
+    /// spliced in before the exchange, and one reading the last column is left.
+    #[test]
+    fn test_prune_exchange_columns_cuts_unread_suffix() {
+        use gnitz_wire::{AggFunc, MapKind, OpNode, ReduceOutKey};
+
+        let schema = SchemaDescriptor::new(
+            &[
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::I64, 0),
+                SchemaColumn::new(type_code::I64, 0),
+                SchemaColumn::new(type_code::I64, 0),
+            ],
+            &[0],
+        );
+        let ext: ExtTables = HashMap::from([(10, schema)]);
+        let grouped = |agg_col: u16| {
+            let mut nodes = HashMap::new();
+            nodes.insert(0, scan_delta(10));
+            nodes.insert(1, OpNode::Filter(Some(gt_filter_blob(0))));
+            nodes.insert(2, OpNode::ExchangeShard { shard_cols: vec![1] });
+            nodes.insert(
+                3,
+                OpNode::Reduce {
+                    group_cols: vec![1],
+                    agg: vec![(AggFunc::Sum, agg_col)],
+                    global_ground: false,
+                    out_key: ReduceOutKey::SyntheticFold,
+                },
+            );
+            nodes.insert(4, OpNode::IntegrateSink);
+            make_loaded(
+                nodes,
+                vec![(0, 1, PORT_IN), (1, 2, PORT_IN), (2, 3, PORT_IN), (3, 4, PORT_IN)],
+            )
+        };
+
+        let mut loaded = grouped(2);
+        assert_eq!(prune_exchange_columns(&mut loaded, &ext).unwrap(), 1);
+        assert_eq!(loaded.nodes[&5], OpNode::Map(MapKind::Projection(vec![1, 2])));
+        assert_eq!(loaded.incoming[&2], vec![(5, PORT_IN)]);
+        assert_eq!(loaded.ordered, vec![0, 1, 5, 2, 3, 4]);
+
+        let mut loaded = grouped(3);
+        assert_eq!(prune_exchange_columns(&mut loaded, &ext).unwrap(), 0);
+        assert_eq!(loaded.nodes.len(), 5);
+    }
+
     // ── compute_join_shard_map covers ScanDelta (SQL-planner join pattern) ──
 
     /// compute_join_shard_map must find ScanDelta → Map(reindex) chains, not
@@ -1,6 +1,6 @@
 //! Annotation + optimization passes and the schema-construction helpers:
-//! co-partition analysis, distinct elision, and the join/reduce/map output
-//! schemas.
+//! co-partition analysis, distinct elision, cross-view sharing keys,
+//! pre-exchange column pruning, and the join/reduce/map output schemas.
 
 use super::*;
 use gnitz_wire::ReduceOutKey;
@@ -108,10 +108,282 @@ pub(super) fn compute_skips_exchange(loaded: &LoadedCircuit, ext_tables: &ExtTab
         .is_some_and(|schema| schema.shard_cols_match_dist_key(&shard_cols))
 }
 
+/// Append `op`'s wire encoding (the form the catalog stores it in) to `out`,
+/// length-prefixing the variable parts so adjacent ops cannot alias.
+fn encode_chain_op(op: &gnitz_wire::OpNode, out: &mut Vec<u8>) {
+    let ((opcode, tid, blob), cols) = gnitz_wire::encode_op_node(op.clone());
+    out.extend_from_slice(&opcode.to_le_bytes());
+    out.extend_from_slice(&tid.unwrap_or(u64::MAX).to_le_bytes());
+    let blob = blob.unwrap_or_default();
+    out.extend_from_slice(&(blob.len() as u64).to_le_bytes());
+    out.extend_from_slice(&blob);
+    out.extend_from_slice(&(cols.len() as u64).to_le_bytes());
+    for (kind, idx, v1, v2) in cols {
+        out.extend_from_slice(&kind.to_le_bytes());
+        out.extend_from_slice(&idx.to_le_bytes());
+        out.extend_from_slice(&v1.to_le_bytes());
+        out.extend_from_slice(&v2.to_le_bytes());
+    }
+}
+
+/// The `IntegrateTrace` nodes another view could share, keyed by what their
+/// content is a function of (see `query::arrangement`). Called only for a
+/// single-phase equi-join view whose sources are all base tables. A trace
+/// qualifies when
+///
+/// * its input is a linear `Filter`/`Map` chain straight from a `ScanDelta`
+///   of a base table — so the trace holds that source's rows under that
+///   chain and nothing view-specific (a reduce trace or a trace over a join
+///   output stays private);
+/// * every consumer is an equi `Join` reading it on `PORT_TRACE` with a delta
+///   side that does not descend from the same source. A self-join would read
+///   the trace against its own source's delta, where a sibling view's earlier
+///   integrate in the same tick would be visible.
+///
+/// The key also carries the source's delta routing (co-partition verdict,
+/// join-shard columns, all-replicated flag): consumers integrate the delta the
+/// DAG hands them, so only views that receive the same per-worker delta may
+/// share a trace.
+pub(super) fn compute_shared_traces(
+    loaded: &LoadedCircuit,
+    join_shard_map: &JoinShardMap,
+    co_partitioned: &HashSet<i64>,
+    ext_tables: &ExtTables,
+) -> HashMap<i32, ArrangementKey> {
+    let all_replicated = all_scans_replicated(loaded, ext_tables);
+    let mut keys = HashMap::new();
+    for (&nid, op) in &loaded.nodes {
+        if !matches!(op, gnitz_wire::OpNode::IntegrateTrace) {
+            continue;
+        }
+        // Walk the input chain back to its scan.
+        let mut chain: Vec<&gnitz_wire::OpNode> = Vec::new();
+        let mut cur = nid;
+        let source = loop {
+            let Some(&[(src, PORT_IN)]) = loaded.incoming.get(&cur).map(Vec::as_slice) else {
+                break None;
+            };
+            match loaded.nodes.get(&src) {
+                Some(gnitz_wire::OpNode::ScanDelta { source, .. }) => break Some(*source as i64),
+                Some(op @ (gnitz_wire::OpNode::Filter(_) | gnitz_wire::OpNode::Map(_))) => chain.push(op),
+                _ => break None,
+            }
+            cur = src;
+        };
+        let Some(source) = source else { continue };
+        let consumers = loaded.outgoing.get(&nid).map_or(&[][..], Vec::as_slice);
+        let shareable = !consumers.is_empty()
+            && consumers.iter().all(|&(dst, port)| {
+                port == PORT_TRACE
+                    && matches!(
+                        loaded.nodes.get(&dst),
+                        Some(gnitz_wire::OpNode::Join(gnitz_wire::JoinKind::DeltaTrace))
+                    )
+                    && loaded.incoming.get(&dst).is_some_and(|ins| {
+                        ins.iter().filter(|&&(_, p)| p == PORT_IN_A).all(|&(delta, _)| {
+                            !ancestors_inclusive(loaded, delta).iter().any(|a| {
+                                matches!(
+                                    loaded.nodes.get(a),
+                                    Some(gnitz_wire::OpNode::ScanDelta { source: s, .. }) if *s as i64 == source
+                                )
+                            })
+                        })
+                    })
+            });
+        if !shareable {
+            continue;
+        }
+        let mut bytes = delta_routing(source, join_shard_map, co_partitioned, all_replicated);
+        for op in chain.iter().rev() {
+            encode_chain_op(op, &mut bytes);
+        }
+        keys.insert(nid, ArrangementKey { source, chain: bytes });
+    }
+    keys
+}
+
+fn all_scans_replicated(loaded: &LoadedCircuit, ext_tables: &ExtTables) -> bool {
+    loaded
+        .nodes
+        .values()
+        .filter_map(|op| match op {
+            gnitz_wire::OpNode::ScanDelta { source, .. } => Some(*source as i64),
+            _ => None,
+        })
+        .all(|tid| ext_tables.get(&tid).is_some_and(|s| s.replicated()))
+}
+
+/// The key prefix naming how the DAG routes `source`'s delta to this view:
+/// co-partition verdict, all-replicated flag, and join-shard columns.
+fn delta_routing(
+    source: i64,
+    join_shard_map: &JoinShardMap,
+    co_partitioned: &HashSet<i64>,
+    all_replicated: bool,
+) -> Vec<u8> {
+    let mut bytes = vec![co_partitioned.contains(&source) as u8, all_replicated as u8];
+    let shard_cols = join_shard_map.get(&source).map_or(&[][..], Vec::as_slice);
+    bytes.extend_from_slice(&(shard_cols.len() as u64).to_le_bytes());
+    for &(col, tc) in shard_cols {
+        bytes.extend_from_slice(&col.to_le_bytes());
+        bytes.push(tc);
+    }
+    bytes
+}
+
+/// Everything `build_plan` attaches to shared state: `IntegrateTrace` nodes
+/// (`compute_shared_traces`) and filter/map prefixes (`compute_shared_prefixes`).
+#[derive(Default)]
+pub(crate) struct ShareKeys {
+    pub traces: HashMap<i32, ArrangementKey>,
+    pub prefixes: HashMap<i32, ArrangementKey>,
+}
+
+/// The `Filter`/`Map` nodes whose output another view could reuse within a
+/// tick, keyed like a shared trace (see `compute_shared_traces`) by source,
+/// delta routing, and the operator chain from the scan through the node. A
+/// node qualifies when it sits on a single-input chain of such nodes straight
+/// from a `ScanDelta`, so its output is a function of that source's delta and
+/// the chain alone. `exchanged` is the plan shape: an exchanged view's pre
+/// phase reads the raw per-worker delta whatever its join-shard columns, a
+/// single-phase one may first have it scattered by them, so the two never
+/// share. A plain expression map is excluded — its output schema is the view's
+/// own — as are filters with no predicate and identity maps, which emit
+/// nothing to share.
+pub(super) fn compute_shared_prefixes(
+    loaded: &LoadedCircuit,
+    join_shard_map: &JoinShardMap,
+    co_partitioned: &HashSet<i64>,
+    ext_tables: &ExtTables,
+    exchanged: bool,
+) -> HashMap<i32, ArrangementKey> {
+    use gnitz_wire::{MapKind, OpNode};
+    let emits_shareable = |op: &OpNode| match op {
+        OpNode::Filter(blob) => blob.is_some(),
+        OpNode::Map(MapKind::Expression { reindex_cols, .. }) => !reindex_cols.is_empty(),
+        OpNode::Map(MapKind::Compute { .. } | MapKind::Projection(_) | MapKind::HashRow(..)) => true,
+        _ => false,
+    };
+    let all_replicated = all_scans_replicated(loaded, ext_tables);
+    let mut keys = HashMap::new();
+    for &nid in &loaded.ordered {
+        if !loaded.nodes.get(&nid).is_some_and(&emits_shareable) {
+            continue;
+        }
+        // Walk the input chain back to its scan; a pass-through filter may sit
+        // anywhere on it.
+        let mut chain: Vec<&OpNode> = Vec::new();
+        let mut cur = nid;
+        let source = loop {
+            let Some(&[(src, PORT_IN)]) = loaded.incoming.get(&cur).map(Vec::as_slice) else {
+                break None;
+            };
+            chain.push(&loaded.nodes[&cur]);
+            match loaded.nodes.get(&src) {
+                Some(OpNode::ScanDelta { source, .. }) => break Some(*source as i64),
+                Some(op @ (OpNode::Filter(_) | OpNode::Map(_)))
+                    if matches!(op, OpNode::Filter(None)) || emits_shareable(op) =>
+                {
+                    cur = src
+                }
+                _ => break None,
+            }
+        };
+        let Some(source) = source else { continue };
+        let mut bytes = vec![exchanged as u8];
+        bytes.extend(delta_routing(source, join_shard_map, co_partitioned, all_replicated));
+        for op in chain.iter().rev() {
+            encode_chain_op(op, &mut bytes);
+        }
+        keys.insert(nid, ArrangementKey { source, chain: bytes });
+    }
+    keys
+}
+
 // ---------------------------------------------------------------------------
 // Optimization passes
 // ---------------------------------------------------------------------------
 
+/// Drop the trailing source columns nothing after the exchange reads. A
+/// GROUP BY ships `ScanDelta → Filter* → ExchangeShard → Reduce`, relaying
+/// every source column although the reduce reads only its group and
+/// aggregate columns. When the source's PK region leads its columns, a
+/// `Projection` of the PK plus payload up to the highest column the shard or
+/// the reduce names is inserted before the exchange. Only a suffix is cut, so
+/// every surviving column keeps its index: the reduce, and the shard columns
+/// the master routes the relay by (read from the circuit as stored), stay
+/// valid unchanged. Returns the number of columns dropped; re-sorts `loaded`
+/// when it changed.
+pub(super) fn prune_exchange_columns(
+    loaded: &mut LoadedCircuit,
+    ext_tables: &ExtTables,
+) -> Result<usize, CompileError> {
+    use gnitz_wire::{MapKind, OpNode};
+    // (exchange input, exchange, columns dropped, PK width, columns kept)
+    let mut inserts: Vec<(i32, i32, usize, u16, u16)> = Vec::new();
+    for (&enid, op) in &loaded.nodes {
+        let OpNode::ExchangeShard { shard_cols } = op else {
+            continue;
+        };
+        let (Some(&[(ex_in, PORT_IN)]), Some(&[(reduce, _)])) = (
+            loaded.incoming.get(&enid).map(Vec::as_slice),
+            loaded.outgoing.get(&enid).map(Vec::as_slice),
+        ) else {
+            continue;
+        };
+        let Some(OpNode::Reduce { group_cols, agg, .. }) = loaded.nodes.get(&reduce) else {
+            continue;
+        };
+        // The exchange input must carry the source schema verbatim.
+        let Some(tid) = scan_tid_through_filters(loaded, enid) else {
+            continue;
+        };
+        let mut cur = enid;
+        while let Some(&[(src, _)]) = loaded.incoming.get(&cur).map(Vec::as_slice) {
+            cur = src;
+        }
+        if !matches!(loaded.nodes.get(&cur), Some(OpNode::ScanDelta { .. })) {
+            continue;
+        }
+        let Some(schema) = ext_tables.get(&tid) else { continue };
+        let pk_n = schema.pk_indices().len();
+        if schema.pk_indices().iter().enumerate().any(|(i, &c)| c as usize != i) {
+            continue;
+        }
+        let Some(&last) = shard_cols
+            .iter()
+            .chain(group_cols)
+            .chain(agg.iter().map(|(_, c)| c))
+            .max()
+        else {
+            continue;
+        };
+        let keep = (last as usize + 1).max(pk_n);
+        if keep < schema.num_columns() {
+            inserts.push((ex_in, enid, schema.num_columns() - keep, pk_n as u16, keep as u16));
+        }
+    }
+    let mut dropped = 0;
+    let mut next = loaded.nodes.keys().max().map_or(0, |m| m + 1);
+    for (ex_in, enid, n, pk_n, keep) in inserts {
+        loaded
+            .nodes
+            .insert(next, OpNode::Map(MapKind::Projection((pk_n..keep).collect())));
+        for e in loaded.edges.iter_mut() {
+            if *e == (ex_in, enid, PORT_IN) {
+                e.1 = next;
+            }
+        }
+        loaded.edges.push((next, enid, PORT_IN));
+        next += 1;
+        dropped += n;
+    }
+    if dropped > 0 {
+        topo_sort(loaded)?;
+    }
+    Ok(dropped)
+}
+
 /// Distinct nodes elided because their input is already distinct. One forward
 /// pass along the topological order, maintaining the set of nodes whose output
 /// is known distinct: a Reduce or Distinct establishes it; a Filter preserves
@@ -153,6 +425,49 @@ pub(super) fn compute_skip_nodes(loaded: &LoadedCircuit) -> HashSet<i32> {
     skip
 }
 
+/// Nodes whose output carries insertions only — every weight positive, in every
+/// tick — because each source they read is an append-only base table. One
+/// forward pass along the topological order, like `compute_skip_nodes`: a scan
+/// of an append-only table establishes it; the row-wise operators and the
+/// positive-weight combinators (union, inner join, distinct, positive_part)
+/// preserve it when every input has it. Anything that can emit a retraction —
+/// negate, reduce, top-K, retain, an outer join's null-extension — breaks it.
+/// `loaded` is the whole circuit, so the set is phase-independent.
+pub(super) fn compute_insert_only(loaded: &LoadedCircuit, ext_tables: &ExtTables) -> HashSet<i32> {
+    use gnitz_wire::OpNode;
+    let append_only = |tid: &gnitz_wire::TableId| {
+        ext_tables
+            .get(&(*tid as i64))
+            .is_some_and(|schema| schema.append_only())
+    };
+    let mut insert_only: HashSet<i32> = HashSet::new();
+    for &nid in &loaded.ordered {
+        let inputs_insert_only = loaded
+            .incoming
+            .get(&nid)
+            .is_some_and(|ins| !ins.is_empty() && ins.iter().all(|(src, _)| insert_only.contains(src)));
+        let holds = match loaded.nodes.get(&nid) {
+            Some(OpNode::ScanDelta { source, .. }) | Some(OpNode::ScanTrace(source)) => append_only(source),
+            Some(
+                OpNode::Filter(_)
+                | OpNode::Map(_)
+                | OpNode::Union
+                | OpNode::Distinct
+                | OpNode::PositivePart
+                | OpNode::Join(_)
+                | OpNode::IntegrateTrace
+                | OpNode::ExchangeShard { .. }
+                | OpNode::PartitionFilter,
+            ) => inputs_insert_only,
+            _ => false,
+        };
+        if holds {
+            insert_only.insert(nid);
+        }
+    }
+    insert_only
+}
+
 // ---------------------------------------------------------------------------
 // Schema construction helpers
 // ---------------------------------------------------------------------------
@@ -214,6 +529,25 @@ pub(super) fn build_map_output_schema(input: &SchemaDescriptor, src_indices: &[i
     SchemaDescriptor::new(&cols[..n], &pk_idx[..pk_len])
 }
 
+/// Output schema of a `MapKind::Compute` node: the input's PK region, then the
+/// node's declared payload columns. `None` when the total would overflow the
+/// fixed `[_; MAX_COLUMNS]` layout — a corrupt/forged node the caller rejects.
+pub(super) fn compute_map_output_schema(input: &SchemaDescriptor, out_cols: &[(u8, bool)]) -> Option<SchemaDescriptor> {
+    let mut cols = [SchemaColumn::new(0, 0); crate::schema::MAX_COLUMNS];
+    let mut pk_idx = [0u32; crate::schema::MAX_PK_COLUMNS];
+    let pk_len = copy_pk_columns_into(input, &mut cols, &mut pk_idx);
+    if pk_len + out_cols.len() > crate::schema::MAX_COLUMNS {
+        return None;
+    }
+    for (slot, &(tc, nullable)) in cols[pk_len..].iter_mut().zip(out_cols) {
+        *slot = SchemaColumn::new(tc, nullable as u8);
+    }
+    Some(SchemaDescriptor::new(
+        &cols[..pk_len + out_cols.len()],
+        &pk_idx[..pk_len],
+    ))
+}
+
 /// True iff any carried cross-width promotion target in `target_tcs` is invalid
 /// for its source column in `cols`. A carried target `t` must be exactly the
 /// promotion the planner derives for a key of this source type: rather than
@@ -329,6 +663,9 @@ pub(super) const fn agg_output_type(agg_op: AggOp, col_type_code: TypeCode) -> u
         AggOp::Sum => gnitz_wire::AggFunc::Sum,
         AggOp::Min => gnitz_wire::AggFunc::Min,
         AggOp::Max => gnitz_wire::AggFunc::Max,
+        AggOp::ApproxCountDistinct => gnitz_wire::AggFunc::ApproxCountDistinct,
+        AggOp::ApproxPercentile(q) => gnitz_wire::AggFunc::ApproxPercentile(q),
+        AggOp::SumSquares => gnitz_wire::AggFunc::SumSquares,
     };
     gnitz_wire::agg_output_type(func, col_type_code as u8)
 }
@@ -396,6 +733,34 @@ pub(super) fn agg_value_idx_eligible(tc: TypeCode) -> bool {
     is_fixed_int(tc as u8) || tc.is_float()
 }
 
+/// A top-K order index (`ops::make_top_k_schema`) is keyed `group_cols ‖
+/// null_rank(u8) ‖ order_encoded ‖ input PK` over the input payload. It is
+/// buildable iff the group key is byte-form-eligible under the same column
+/// rules as the AVI's, the order column is order-encodable, and the key — now
+/// carrying the input PK as well — still fits the composite PK budget.
+pub(super) fn top_k_index_eligible(schema: &SchemaDescriptor, gcols: &[u32], order_col: u32) -> bool {
+    let order_tc = TypeCode::from_validated_u8(schema.columns[order_col as usize].type_code);
+    if !agg_value_idx_eligible(order_tc) || !avi_group_key_eligible(schema, gcols) {
+        return false;
+    }
+    let n_pk = schema.pk_indices().len();
+    if gcols.len() + 2 + n_pk > crate::schema::MAX_PK_COLUMNS
+        || gcols.len() + 2 + schema.num_columns() > crate::schema::MAX_COLUMNS
+    {
+        return false;
+    }
+    let gstride: usize = gcols.iter().map(|&c| schema.columns[c as usize].size() as usize).sum();
+    gstride + 1 + crate::ops::AVI_AV_BYTES + schema.pk_stride() as usize <= crate::schema::MAX_PK_BYTES
+}
+
+/// A retain index is the top-K order index with no group columns, keyed on the
+/// retained column. Its horizon is subtracted in the order-encoded domain, which
+/// is offset-preserving only for the fixed-width integers (the float encoding
+/// is monotone but not linear), so those are the only retainable columns.
+pub(super) fn retain_index_eligible(schema: &SchemaDescriptor, col: u32) -> bool {
+    is_fixed_int(schema.columns[col as usize].type_code) && top_k_index_eligible(schema, &[], col)
+}
+
 /// The combined AVI stores its key as a fixed-width byte prefix
 /// `group_cols ‖ ordinal(u8) ‖ av_encoded`. A group key is byte-form-eligible
 /// iff every group column is a non-nullable, fixed-width, non-float scalar (a
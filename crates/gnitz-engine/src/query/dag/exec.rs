@@ -2,7 +2,10 @@
 //! compiled shape runs through, and the DAG evaluation driver.
 
 use super::*;
+use crate::query::arrangement::TickScope;
 use crate::query::compiler::{ExtCursorScratch, PlanShape};
+use crate::query::vm::profile::ExchangeCounts;
+use std::time::Instant;
 
 pub(super) struct PendingEntry {
     pub depth: i32,
@@ -339,11 +342,22 @@ impl DagEngine {
             && plan.join_shard_map.get(&src_id).is_some_and(|c| !c.is_empty())
             && !plan.co_partitioned.contains(&src_id);
 
-        if is_range_join {
+        // While the profiler runs, every relay round is charged to the view's
+        // exchange counters, like its per-operator ones.
+        let profiling = crate::foundation::profile::running();
+        let mut traffic = ExchangeCounts::default();
+        let mut relay = |batch: &Batch, key: i64| {
+            let out = exchange.do_exchange(view_id, batch, key);
+            if profiling {
+                traffic.record(batch, &out);
+            }
+            out
+        };
+        let out = if is_range_join {
             // Arm 2 — relay the input delta first, then the exchanged pipeline.
             let input = self.ensure_wire_schema(input, src_id);
-            let bc = exchange.do_exchange(view_id, &input, src_id);
-            self.run_view_epoch(view_id, bc, src_id, |pre, key| exchange.do_exchange(view_id, &pre, key))
+            let bc = relay(&input, src_id);
+            self.run_view_epoch(view_id, bc, src_id, |pre, key| relay(&pre, key))
         } else if sides > 0 {
             // Arms 3 + 4 — the exchanged pipeline; the relay elides the IPC when
             // the unary output shuffle is a proven no-op.
@@ -351,18 +365,24 @@ impl DagEngine {
                 if skip_output_exchange {
                     pre
                 } else {
-                    exchange.do_exchange(view_id, &pre, key)
+                    relay(&pre, key)
                 }
             })
         } else if join_scatter {
             // Arm 5 — scatter the delta by the join-shard cols before the pipeline.
             let input = self.ensure_wire_schema(input, src_id);
-            let exchanged = exchange.do_exchange(view_id, &input, src_id);
+            let exchanged = relay(&input, src_id);
             self.execute_epoch(view_id, exchanged, src_id)
         } else {
             // Arm 6 — single-phase execute.
             self.execute_epoch(view_id, input, src_id)
+        };
+        if profiling {
+            if let Some(plan) = self.cache.get_mut(&view_id) {
+                plan.exchange.add(traffic);
+            }
         }
+        out
     }
 
     /// Drive ONE view's epoch for a distributed-backfill chunk and ingest its
@@ -411,6 +431,11 @@ impl DagEngine {
             return;
         }
 
+        // A live tick means no view backfill is in progress; every shared
+        // arrangement integrates this tick's delta at most once.
+        self.backfilling = None;
+        let _tick = TickScope::begin();
+
         let (mut pending, mut pending_pos) = self.build_pending(&view_ids, source_id, delta);
         let mut dirty_views: FxHashSet<i64> = FxHashSet::default();
 
@@ -425,8 +450,14 @@ impl DagEngine {
                 continue;
             }
 
+            let t0 = Instant::now();
             let out_delta = self.execute_multi_worker_step(view_id, input, src_id, exchange);
-            let has_output = out_delta.as_ref().is_some_and(|b| b.count > 0);
+            let rows = out_delta.as_ref().map_or(0, |b| b.count as u64);
+            self.tick_stats
+                .entry(view_id)
+                .or_default()
+                .record(t0.elapsed().as_nanos() as u64, rows);
+            let has_output = rows > 0;
 
             if has_output {
                 dirty_views.insert(view_id);
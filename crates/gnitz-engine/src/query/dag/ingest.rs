@@ -187,6 +187,82 @@ impl DagEngine {
         for ic in &mut entry.index_circuits {
             ic.table_mut().flush()?;
         }
+        if crate::foundation::log::is_debug() {
+            let amp = entry.handle.amplification();
+            crate::gnitz_debug!(
+                "dag: flushed table_id={} write_amp={:.2} runs_per_lookup={} compactions={} flushed_bytes={}",
+                table_id,
+                amp.write_amplification(),
+                amp.runs_per_lookup,
+                amp.compactions,
+                amp.flushed_bytes,
+            );
+            if let Some(bc) = crate::storage::block_cache_stats() {
+                crate::gnitz_debug!(
+                    "dag: block cache hits={} misses={} hit_ratio={:.3} rejected={} evicted={} resident={}/{}",
+                    bc.hits,
+                    bc.misses,
+                    bc.hit_ratio(),
+                    bc.rejected,
+                    bc.evicted,
+                    bc.resident_bytes,
+                    bc.budget_bytes,
+                );
+            }
+            let wb = crate::storage::write_buffer_stats();
+            crate::gnitz_debug!(
+                "dag: write buffers used={}/{} tables={} requested={} stalls={} swept={} largest={:?}",
+                wb.used_bytes,
+                wb.budget_bytes,
+                wb.tables,
+                wb.requested,
+                wb.stalls,
+                wb.swept,
+                crate::storage::write_buffer_largest(4),
+            );
+            for a in self.arrangements() {
+                crate::gnitz_debug!(
+                    "dag: arrangement source={} fingerprint={:016x} consumers={} seeded={} integrations={} deduped={}",
+                    a.source,
+                    a.fingerprint,
+                    a.consumers,
+                    a.seeded,
+                    a.integrations,
+                    a.deduped,
+                );
+            }
+            for p in self.shared_prefixes() {
+                crate::gnitz_debug!(
+                    "dag: shared prefix source={} fingerprint={:016x} consumers={} computed={} reused={}",
+                    p.source,
+                    p.fingerprint,
+                    p.consumers,
+                    p.computed,
+                    p.reused,
+                );
+            }
+        }
+        Ok(())
+    }
+
+    /// Release every write buffer the worker's budget manager has asked back,
+    /// across the relations a checkpoint would visit: base partitions, index
+    /// circuits, and checkpointed views' traces and outputs. Transients are
+    /// not visited (RAM-only by policy). A no-op unless a request is
+    /// outstanding, so it is cheap to call after every push and tick. The
+    /// idle batch-buffer pool is freed along with them.
+    pub(crate) fn release_requested_write_buffers(&mut self) -> Result<(), StorageError> {
+        if !crate::storage::write_buffer_has_requests() {
+            return Ok(());
+        }
+        crate::storage::batch_pool::trim();
+        let base = self.collect_base_flush_tables();
+        let (traces, outputs) = self.collect_ephemeral_flush_tables();
+        for t in base.into_iter().chain(traces).chain(outputs) {
+            // SAFETY: same validity argument as the checkpoint collectors —
+            // a synchronous pass on the single-threaded worker.
+            unsafe { &mut *t }.release_write_buffer_if_requested()?;
+        }
         Ok(())
     }
 
@@ -240,8 +316,9 @@ impl DagEngine {
     }
 
     /// Collect the tables the ephemeral checkpoint round force-persists, in two
-    /// disjoint sets: (1) every compiled view plan's operator-trace tables, and
-    /// (2) every view's output-store partitions. The worker flushes set 1 fully
+    /// disjoint sets: (1) every compiled view plan's operator-trace tables plus
+    /// the shared arrangements they read, and (2) every view's output-store
+    /// partitions. The worker flushes set 1 fully
     /// durable before set 2 (the flush-ordering invariant: any output manifest at
     /// generation G implies that view's traces are durable at G).
     ///
@@ -278,6 +355,11 @@ impl DagEngine {
                 }
             }
         }
+        // Shared arrangements once each, however many plans hold them (every
+        // holder is a checkpointed view, whose cursors were nulled above).
+        for arr in self.arrangements.live() {
+            traces.push(arr.table_mut() as *mut Table);
+        }
 
         let mut outputs: Vec<*mut Table> = Vec::new();
         for entry in self.tables.values() {
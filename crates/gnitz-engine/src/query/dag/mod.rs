@@ -4,9 +4,11 @@
 
 use rustc_hash::{FxHashMap, FxHashSet};
 use std::cell::UnsafeCell;
+use std::collections::HashMap;
 use std::rc::Rc;
 
 use crate::ops;
+use crate::query::arrangement::{ArrangementInfo, ArrangementRegistry, PrefixInfo, ShareScope};
 use crate::query::compiler::{self, CompileOutput, SubPlan};
 use crate::query::vm;
 use crate::schema::SchemaDescriptor;
@@ -194,6 +196,74 @@ impl TableEntry {
     }
 }
 
+/// One line of a view's `EXPLAIN ANALYZE` profile on one worker: an operator
+/// of a plan phase with its cumulative counters, or (`phase == "exchange"`) the
+/// view's relay totals — `rows_in`/`bytes_in` received, `*_out` sent.
+pub struct ProfileLine {
+    pub phase: String,
+    pub pc: u32,
+    pub depth: u32,
+    pub op: &'static str,
+    pub calls: u64,
+    pub rows_in: u64,
+    pub rows_out: u64,
+    pub nanos: u64,
+    pub seeks: u64,
+    pub bytes_in: u64,
+    pub bytes_out: u64,
+}
+
+impl ProfileLine {
+    fn op(phase: String, op: vm::profile::ProfiledOp) -> Self {
+        let c = op.counts;
+        ProfileLine {
+            phase,
+            pc: op.pc,
+            depth: op.depth,
+            op: op.op,
+            calls: c.calls,
+            rows_in: c.rows_in,
+            rows_out: c.rows_out,
+            nanos: c.nanos,
+            seeks: c.seeks,
+            bytes_in: 0,
+            bytes_out: 0,
+        }
+    }
+}
+
+/// One view's live-tick counters on one worker, read back through
+/// `VIEW_STATS_TAB`. A view stepped by several changed sources in one tick
+/// counts each step.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub struct ViewTickStats {
+    pub ticks: u64,
+    pub last_tick_ns: u64,
+    pub last_rows: u64,
+    pub total_rows: u64,
+}
+
+impl ViewTickStats {
+    fn record(&mut self, nanos: u64, rows: u64) {
+        self.ticks += 1;
+        self.last_tick_ns = nanos;
+        self.last_rows = rows;
+        self.total_rows += rows;
+    }
+}
+
+/// One heap-memory attribution on one worker: `bytes` held by `component` of
+/// relation `relation_id` — its `"memtable"` or `"ram_tier"` runs, its
+/// secondary `"index"` tables, a view `"operator"`'s state at `pc`, or an
+/// `"arrangement"` keyed on it.
+pub struct MemoryLine {
+    pub relation_id: i64,
+    pub component: &'static str,
+    pub pc: u32,
+    pub op: &'static str,
+    pub bytes: u64,
+}
+
 // ---------------------------------------------------------------------------
 // System table references
 // ---------------------------------------------------------------------------
@@ -249,6 +319,14 @@ pub struct DagEngine {
     meta: FxHashMap<i64, Rc<ViewMeta>>,
     pub(crate) tables: FxHashMap<i64, TableEntry>,
     sys: SysTableRefs,
+    /// Join traces shared across views; each compiled plan holds a reference,
+    /// and the registry one per view that outlives plan invalidation.
+    arrangements: ArrangementRegistry,
+    /// `(view, first source)` of the view backfill in progress, if any — it
+    /// decides which arrangements the view may attach (see `attach`).
+    backfilling: Option<(i64, i64)>,
+    /// Per-view live-tick counters; backfill steps are not ticks.
+    tick_stats: FxHashMap<i64, ViewTickStats>,
 }
 
 // SAFETY: DagEngine is only accessed from a single thread.
@@ -262,6 +340,9 @@ impl DagEngine {
             meta: FxHashMap::default(),
             tables: FxHashMap::default(),
             sys: SysTableRefs::null(),
+            arrangements: ArrangementRegistry::default(),
+            backfilling: None,
+            tick_stats: FxHashMap::default(),
         }
     }
 
@@ -302,6 +383,8 @@ impl DagEngine {
         let invalidate = self.tables.get(&table_id).is_none_or(|e| e.kind.in_dep_tab());
         self.tables.remove(&table_id);
         self.cache.remove(&table_id);
+        self.arrangements.release(table_id);
+        self.tick_stats.remove(&table_id);
         self.evict_meta(table_id);
         if invalidate {
             self.dep.invalidate();
@@ -313,10 +396,13 @@ impl DagEngine {
         table_id: i64,
         col_indices: &[u32],
         index_id: i64,
-        index_table: Box<Table>,
+        mut index_table: Box<Table>,
         index_schema: SchemaDescriptor,
         is_unique: bool,
     ) {
+        // Point lookups probe by the full indexed value — the leading-key span —
+        // so that is the prefix every flushed/compacted index shard filters on.
+        index_table.set_prefix_filter_len(index_schema.leading_key_size(col_indices.len()) as u8);
         if let Some(entry) = self.tables.get_mut(&table_id) {
             entry.index_circuits.push(IndexCircuitEntry {
                 col_indices: PkColList::from_slice(col_indices),
@@ -438,6 +524,7 @@ impl DagEngine {
             tid as u64,
             &ext_tables,
             RelationKind::Transient.recovery_source(),
+            None,
         )
         .map_err(|e| e.describe().to_string())?;
         self.cache.insert(tid, output);
@@ -450,6 +537,129 @@ impl DagEngine {
         self.cache.contains_key(&id)
     }
 
+    /// `EXPLAIN ANALYZE` profile of `view_id`'s cached plan on this worker, in
+    /// display order: the post-combine operator tree (`"main"` for a
+    /// single-phase plan), the exchange totals, then each pre-exchange side.
+    /// `None` when no plan is cached (never compiled here, or invalidated).
+    pub fn view_profile(&self, view_id: i64) -> Option<Vec<ProfileLine>> {
+        let plan = self.cache.get(&view_id)?;
+        let mut lines = Vec::new();
+        let mut push_tree = |phase: String, sub: &SubPlan| {
+            for op in vm::profile::profile_tree(&sub.vm.program, sub.out_reg) {
+                lines.push(ProfileLine::op(phase.clone(), op));
+            }
+        };
+        match &plan.shape {
+            compiler::PlanShape::Single(sub) => push_tree("main".to_string(), sub),
+            compiler::PlanShape::Exchanged { sides, post } => {
+                push_tree("post".to_string(), post);
+                for (i, side) in sides.iter().enumerate() {
+                    push_tree(format!("pre {i}"), &side.plan);
+                }
+            }
+        }
+        let x = plan.exchange;
+        if x.rounds > 0 {
+            // Below the tree it feeds: the relay sits between the post phase
+            // and the sides (or under a single phase whose input it scatters).
+            let at = lines
+                .iter()
+                .take_while(|l| l.phase == "post" || l.phase == "main")
+                .count();
+            lines.insert(
+                at,
+                ProfileLine {
+                    phase: "exchange".to_string(),
+                    pc: 0,
+                    depth: 0,
+                    op: "Exchange",
+                    calls: x.rounds,
+                    rows_in: x.rows_recv,
+                    rows_out: x.rows_sent,
+                    nanos: 0,
+                    seeks: 0,
+                    bytes_in: x.bytes_recv,
+                    bytes_out: x.bytes_sent,
+                },
+            );
+        }
+        Some(lines)
+    }
+
+    /// Every view's live-tick counters on this worker, by view id. Views that
+    /// have not ticked since boot are absent.
+    pub fn view_tick_stats(&self) -> impl Iterator<Item = (i64, ViewTickStats)> + '_ {
+        self.tick_stats.iter().map(|(&v, &s)| (v, s))
+    }
+
+    /// Heap bytes held by every relation's stores and every cached plan's
+    /// operator state on this worker, by relation id. Empty components are
+    /// omitted.
+    pub fn memory_usage(&self) -> Vec<MemoryLine> {
+        let mut lines = Vec::new();
+        let mut push = |relation_id, component, pc, op, bytes: usize| {
+            if bytes > 0 {
+                lines.push(MemoryLine {
+                    relation_id,
+                    component,
+                    pc,
+                    op,
+                    bytes: bytes as u64,
+                });
+            }
+        };
+        let mut ids: Vec<i64> = self.tables.keys().copied().collect();
+        ids.sort_unstable();
+        for &id in &ids {
+            let entry = &self.tables[&id];
+            let (memtable, ram_tier) = entry.handle.heap_bytes();
+            push(id, "memtable", 0, "", memtable);
+            push(id, "ram_tier", 0, "", ram_tier);
+            let index: usize = entry
+                .index_circuits
+                .iter()
+                .map(|ic| {
+                    let (m, r) = ic.table_mut().heap_bytes();
+                    m + r
+                })
+                .sum();
+            push(id, "index", 0, "", index);
+        }
+        let mut views: Vec<i64> = self.cache.keys().copied().collect();
+        views.sort_unstable();
+        for view_id in views {
+            let mut ops: Vec<((u32, &'static str), usize)> = Vec::new();
+            for sub in self.cache[&view_id].sub_plans() {
+                let owners = vm::profile::owned_table_ops(&sub.vm);
+                for (table, owner) in sub.vm.owned_tables.iter().zip(owners) {
+                    let (m, r) = table.heap_bytes();
+                    let key = owner.unwrap_or((0, ""));
+                    match ops.iter_mut().find(|(k, _)| *k == key) {
+                        Some((_, bytes)) => *bytes += m + r,
+                        None => ops.push((key, m + r)),
+                    }
+                }
+            }
+            ops.sort_unstable_by_key(|&(k, _)| k);
+            for ((pc, op), bytes) in ops {
+                push(view_id, "operator", pc, op, bytes);
+            }
+        }
+        let mut arranged: Vec<(i64, usize)> = self
+            .arrangements
+            .live()
+            .map(|a| {
+                let (m, r) = a.table_mut().heap_bytes();
+                (a.source(), m + r)
+            })
+            .collect();
+        arranged.sort_unstable_by_key(|&(source, _)| source);
+        for (source, bytes) in arranged {
+            push(source, "arrangement", 0, "", bytes);
+        }
+        lines
+    }
+
     /// Master-side transient preparation, derived from the delivered circuit
     /// families alone — **without compiling or registering anything** (the master
     /// never holds a `CompileOutput`; compiling would create rank-stamped scratch
@@ -523,15 +733,17 @@ impl DagEngine {
     }
 
     /// Compile a view by reading system tables and calling `compiler::compile_view`.
-    fn compile_view_internal(&self, view_id: i64) -> Option<CompileOutput> {
+    fn compile_view_internal(&mut self, view_id: i64) -> Option<CompileOutput> {
         let entry = self.tables.get(&view_id)?;
-        let view_schema = &entry.schema;
+        let view_schema = entry.schema;
         let view_dir = entry.directory.clone();
         // The relation's own kind decides how its operator-trace child tables
         // recover — checkpointed for a View, `Rederive` for a Transient.
         let recovery = entry.kind.recovery_source();
+        let is_view = matches!(entry.kind, RelationKind::View);
 
         let ext_tables = self.ext_tables();
+        let mut share = if is_view { self.share_scope(view_id) } else { None };
 
         let result = unsafe {
             compiler::compile_view(
@@ -540,15 +752,38 @@ impl DagEngine {
                 self.sys.edges,
                 self.sys.node_columns,
                 &view_dir,
-                view_schema,
+                &view_schema,
                 &ext_tables,
                 recovery,
+                share.as_mut(),
             )
         };
+        if let Some(scope) = share {
+            self.arrangements = scope.registry;
+            let attached = result
+                .as_ref()
+                .map(|o| o.sub_plans().flat_map(|sub| sub.vm.shared.iter().cloned()).collect())
+                .unwrap_or_default();
+            self.arrangements.settle(view_id, attached);
+        }
 
         match result {
             Ok(output) => {
-                gnitz_debug!("dag: compiled view_id={}", view_id);
+                let o = output.optimizer;
+                if o.is_empty() {
+                    gnitz_debug!("dag: compiled view_id={}", view_id);
+                } else {
+                    gnitz_debug!(
+                        "dag: compiled view_id={} folded={} simplified={} dead_instrs={} filters_elided={} shared_prefixes={} pruned_cols={}",
+                        view_id,
+                        o.fold.folded,
+                        o.fold.simplified,
+                        o.fold.dead,
+                        o.filters_elided,
+                        o.shared_prefixes,
+                        o.pruned_cols
+                    );
+                }
                 Some(output)
             }
             Err(err) => {
@@ -558,6 +793,61 @@ impl DagEngine {
         }
     }
 
+    /// What a view compile may share: `None` unless every source is a base
+    /// table. A view over views can be driven more than once per tick (once
+    /// per changed input), and whether a sibling's integrate has landed before
+    /// each of those steps would depend on scheduling; a base-only view is
+    /// driven exactly once per tick, by the one source that changed.
+    fn share_scope(&mut self, view_id: i64) -> Option<ShareScope> {
+        let sources = self.get_source_ids(view_id);
+        let mut source_dirs = HashMap::with_capacity(sources.len());
+        for &s in &sources {
+            let e = self.tables.get(&s)?;
+            if !matches!(e.kind, RelationKind::BaseTable { .. }) {
+                return None;
+            }
+            source_dirs.insert(s, e.directory.clone());
+        }
+        Some(ShareScope {
+            registry: std::mem::take(&mut self.arrangements),
+            source_dirs,
+            backfill_first: self.backfilling.filter(|&(v, _)| v == view_id).map(|(_, first)| first),
+        })
+    }
+
+    // ── Shared arrangements ─────────────────────────────────────────────
+
+    /// A backfill of `view_id` is about to feed `source_id`. The first source
+    /// fed opens the backfill; a live tick ends it (`evaluate_dag_multi_worker`).
+    pub(crate) fn backfill_source_begin(&mut self, view_id: i64, source_id: i64) {
+        if self.backfilling.is_none_or(|(v, _)| v != view_id) {
+            self.backfilling = Some((view_id, source_id));
+        }
+    }
+
+    /// A backfill of `view_id` has fed all of `source_id`: every arrangement
+    /// over that source the view's plan holds now has its full history.
+    pub(crate) fn backfill_source_done(&mut self, view_id: i64, source_id: i64) {
+        let Some(plan) = self.cache.get_mut(&view_id) else {
+            return;
+        };
+        for sub in plan.sub_plans_mut() {
+            for arr in sub.vm.shared.iter().filter(|a| a.source() == source_id) {
+                arr.mark_seeded();
+            }
+        }
+    }
+
+    /// The worker's live shared arrangements.
+    pub(crate) fn arrangements(&self) -> Vec<ArrangementInfo> {
+        self.arrangements.infos()
+    }
+
+    /// The worker's live shared filter/map prefixes.
+    pub(crate) fn shared_prefixes(&self) -> Vec<PrefixInfo> {
+        self.arrangements.prefix_infos()
+    }
+
     /// Close the DagEngine, dropping all cached plans. Test-only, like the
     /// `CatalogEngine::close` that drives it: the server never closes gracefully.
     #[cfg(test)]
@@ -4,7 +4,7 @@
 //! owned by `CatalogEngine`. There is no custom `Drop`: the `Partitioned`
 //! box is freed by the default drop glue when its registry entry is removed.
 
-use crate::storage::{Batch, PartitionedTable, ReadCursor, StorageError, Table};
+use crate::storage::{AmplificationReport, Batch, PartitionedTable, ReadCursor, StorageError, Table};
 use std::cell::UnsafeCell;
 
 /// Storage handle of a registered relation. `Partitioned` owns its boxed
@@ -114,6 +114,27 @@ impl StoreHandle {
         }
     }
 
+    /// Dispatched write/read amplification report of the store's shards.
+    pub fn amplification(&self) -> AmplificationReport {
+        match self {
+            StoreHandle::Borrowed(ptr) => unsafe { &**ptr }.amplification(),
+            StoreHandle::Partitioned(cell) => unsafe { (**cell.get()).amplification() },
+        }
+    }
+
+    /// Dispatched `(memtable, ram_tier)` heap bytes, summed over the store's
+    /// partitions (see `Table::heap_bytes`).
+    pub fn heap_bytes(&self) -> (usize, usize) {
+        match self {
+            StoreHandle::Borrowed(ptr) => unsafe { &**ptr }.heap_bytes(),
+            StoreHandle::Partitioned(cell) => unsafe { &**cell.get() }
+                .partitions()
+                .iter()
+                .map(Table::heap_bytes)
+                .fold((0, 0), |(m, r), (dm, dr)| (m + dm, r + dr)),
+        }
+    }
+
     /// Dispatched durable ingest of a borrowed `Batch` — the single-copy path
     /// for callers that keep reading the batch (see
     /// `Table::ingest_borrowed_batch`).
@@ -4,13 +4,15 @@
 //! `dag` is the de-facto facade: it owns the plan cache and the epoch
 //! evaluator, and is the single inbound target catalog + runtime reach for.
 //! `compiler` (view → circuit → VM program) and `vm` (program execution) are
-//! query-internal — only `dag` and each other name them.
+//! query-internal — only `dag` and each other name them. `arrangement` holds
+//! the trace tables views share, attached by the compiler and owned by plans.
 
+mod arrangement;
 mod compiler;
 mod dag;
 mod vm;
 
 pub(crate) use dag::{
-    is_worker_scratch_dir_name, DagEngine, ExchangeCallback, IndexCircuitEntry, RelationKind, StoreHandle,
-    SysTableRefs, TableEntry,
+    is_worker_scratch_dir_name, DagEngine, ExchangeCallback, IndexCircuitEntry, MemoryLine, RelationKind, StoreHandle,
+    SysTableRefs, TableEntry, ViewTickStats,
 };
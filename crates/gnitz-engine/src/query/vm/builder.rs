@@ -8,6 +8,7 @@
 use super::*;
 use crate::expr::ScalarFunc;
 use crate::storage::Table;
+use std::rc::Rc;
 
 pub(crate) struct ProgramBuilder {
     instructions: Vec<Instr>,
@@ -19,6 +20,10 @@ pub(crate) struct ProgramBuilder {
     reindex_target_tcs: Vec<u8>,
     reduce_plans: Vec<crate::ops::ReducePlan>,
     avi_bakes: Vec<crate::ops::AviBake>,
+    top_k_bakes: Vec<crate::ops::TopKBake>,
+    retain_bakes: Vec<crate::ops::RetainBake>,
+    arrangements: Vec<*const SharedArrangement>,
+    prefixes: Vec<Rc<SharedPrefix>>,
 }
 
 // SAFETY: Same justification as Program — single-thread access, stable pointers.
@@ -34,6 +39,10 @@ impl ProgramBuilder {
             reindex_target_tcs: Vec::new(),
             reduce_plans: Vec::new(),
             avi_bakes: Vec::new(),
+            top_k_bakes: Vec::new(),
+            retain_bakes: Vec::new(),
+            arrangements: Vec::new(),
+            prefixes: Vec::new(),
         }
     }
 
@@ -74,6 +83,22 @@ impl ProgramBuilder {
         idx
     }
 
+    pub fn arrangement_idx(&mut self, ptr: *const SharedArrangement) -> u16 {
+        if let Some(i) = self.arrangements.iter().position(|&a| a == ptr) {
+            return i as u16;
+        }
+        self.arrangements.push(ptr);
+        (self.arrangements.len() - 1) as u16
+    }
+
+    pub fn prefix_idx(&mut self, prefix: Rc<SharedPrefix>) -> u16 {
+        if let Some(i) = self.prefixes.iter().position(|p| Rc::ptr_eq(p, &prefix)) {
+            return i as u16;
+        }
+        self.prefixes.push(prefix);
+        (self.prefixes.len() - 1) as u16
+    }
+
     /// Store a baked reduce plan, returning its `Instr::Reduce::plan_idx`.
     pub fn add_reduce_plan(&mut self, plan: crate::ops::ReducePlan) -> u16 {
         let idx = self.reduce_plans.len() as u16;
@@ -89,6 +114,20 @@ impl ProgramBuilder {
         idx
     }
 
+    /// Store a baked top-K operator, returning its `Instr::TopK::bake_idx`.
+    pub fn add_top_k_bake(&mut self, bake: crate::ops::TopKBake) -> u16 {
+        let idx = self.top_k_bakes.len() as u16;
+        self.top_k_bakes.push(bake);
+        idx
+    }
+
+    /// Store a baked retain operator, returning its `Instr::Retain::bake_idx`.
+    pub fn add_retain_bake(&mut self, bake: crate::ops::RetainBake) -> u16 {
+        let idx = self.retain_bakes.len() as u16;
+        self.retain_bakes.push(bake);
+        idx
+    }
+
     pub fn add_reindex_cols(&mut self, cols: &[u32], target_tcs: &[u8]) -> (u32, u16) {
         let offset = self.reindex_cols.len() as u32;
         // This is the only mutator of either pool, so they enter in lockstep.
@@ -113,11 +152,19 @@ impl ProgramBuilder {
     /// Used by test code — production code uses `build_with_owned`.
     #[cfg(test)]
     pub(crate) fn build(self, reg_meta: &[RegisterMeta]) -> Box<VmHandle> {
-        self.build_with_owned(reg_meta.to_vec(), Vec::new(), Vec::new(), Vec::new())
+        self.build_with_owned(
+            reg_meta.to_vec(),
+            Vec::new(),
+            Vec::new(),
+            Vec::new(),
+            Vec::new(),
+            Vec::new(),
+        )
     }
 
     /// Consume the builder, producing a VmHandle that owns the child tables and
-    /// scalar functions created by the compiler.
+    /// scalar functions created by the compiler, and holds a reference on each
+    /// shared arrangement it reads.
     #[allow(clippy::vec_box)]
     pub fn build_with_owned(
         self,
@@ -125,15 +172,18 @@ impl ProgramBuilder {
         owned_tables: Vec<Box<Table>>,
         owned_funcs: Vec<Box<ScalarFunc>>,
         owned_trace_regs: Vec<(u16, usize)>,
+        shared: Vec<Rc<SharedArrangement>>,
+        shared_trace_regs: Vec<(u16, usize)>,
     ) -> Box<VmHandle> {
         // Bake ownership into the metas so the per-epoch `bind_cursors` does no
         // per-register scan of the owned list.
-        for &(reg_id, _) in &owned_trace_regs {
+        for &(reg_id, _) in owned_trace_regs.iter().chain(&shared_trace_regs) {
             reg_meta[reg_id as usize].is_owned = true;
         }
         let regfile = RegisterFile::new(&reg_meta);
 
         let program = Program {
+            profile: self.instructions.iter().map(|_| Default::default()).collect(),
             instructions: self.instructions,
             reg_meta,
             funcs: self.funcs,
@@ -142,15 +192,21 @@ impl ProgramBuilder {
             reindex_target_tcs: self.reindex_target_tcs,
             reduce_plans: self.reduce_plans,
             avi_bakes: self.avi_bakes,
+            top_k_bakes: self.top_k_bakes,
+            retain_bakes: self.retain_bakes,
+            arrangements: self.arrangements,
+            prefixes: self.prefixes,
         };
 
-        let num_owned = owned_trace_regs.len();
+        let num_owned = owned_trace_regs.len() + shared_trace_regs.len();
         Box::new(VmHandle {
             program,
             regfile,
             owned_tables,
             owned_funcs,
             owned_trace_regs,
+            shared,
+            shared_trace_regs,
             owned_cursor_handles: Vec::with_capacity(num_owned),
         })
     }
@@ -2,7 +2,10 @@
 //! dispatch loop — kept whole: boxing per-opcode handlers or splitting the
 //! match arms would break monomorphization of the dispatch loop.
 
+use std::time::Instant;
+
 use super::*;
+use crate::foundation::profile::{zone, Zone};
 use crate::ops::{self, AviDesc};
 use crate::storage::{Batch, ReadCursor};
 
@@ -29,6 +32,27 @@ fn fatal_on_tick_ingest_err(op: &str, table_idx: i32, r: Result<(), crate::stora
     }
 }
 
+/// Another view's output for this node's shared prefix, if it ran first this
+/// tick. An empty input is never memoized: a multi-source plan sees empty
+/// deltas for the sources the tick did not touch.
+#[inline]
+fn shared_prefix_hit(program: &Program, prefix: Option<u16>, input: &Batch) -> Option<Batch> {
+    let p = &program.prefixes[prefix? as usize];
+    if input.count == 0 {
+        return None;
+    }
+    p.reuse()
+}
+
+#[inline]
+fn offer_shared_prefix(program: &Program, prefix: Option<u16>, input: &Batch, out: &Batch) {
+    if let Some(i) = prefix {
+        if input.count > 0 {
+            program.prefixes[i as usize].offer(out);
+        }
+    }
+}
+
 /// Execute one epoch of a compiled program with a single input register —
 /// a test-only convenience over `execute_epoch_multi` (production seeds
 /// through the multi entry point).
@@ -142,8 +166,43 @@ pub(crate) fn execute_epoch_multi(
         }};
     }
 
-    // 3. Dispatch loop
-    for instr in &program.instructions {
+    // Trace-cursor seeks so far across `traces`, for the per-op profile.
+    macro_rules! trace_seeks {
+        ($traces:expr) => {
+            $traces
+                .iter()
+                .flatten()
+                .map(|&r| {
+                    let p = reg!(r).cursor_ptr;
+                    if p.is_null() {
+                        0
+                    } else {
+                        unsafe { (*p).seeks() }
+                    }
+                })
+                .sum::<u64>()
+        };
+    }
+
+    // 3. Dispatch loop. While the profiler runs, every executed instruction is
+    // charged to its `program.profile` slot (see `profile::ports` for what
+    // counts as in/out) and joins and grouped aggregates open their CPU-profiler
+    // zone; otherwise the loop reads no clock and counts nothing.
+    let profiling = crate::foundation::profile::running();
+    for (pc, instr) in program.instructions.iter().enumerate() {
+        let probe = if profiling {
+            let ports = profile::ports(instr);
+            let rows_in: u64 = ports.ins.iter().flatten().map(|&r| reg!(r).batch.count as u64).sum();
+            let seeks_before = trace_seeks!(ports.traces);
+            let zone = match instr {
+                Instr::JoinDT { .. } | Instr::JoinDTRange { .. } => Some(zone(Zone::Join)),
+                Instr::Reduce { .. } | Instr::TopK { .. } => Some(zone(Zone::Reduce)),
+                _ => None,
+            };
+            Some((ports, rows_in, seeks_before, zone, Instant::now()))
+        } else {
+            None
+        };
         match instr {
             Instr::Halt => break,
 
@@ -159,15 +218,24 @@ pub(crate) fn execute_epoch_multi(
                 in_reg,
                 out_reg,
                 func_idx,
+                prefix,
             } => {
                 debug_assert_ne!(*in_reg, *out_reg, "Filter: in_reg and out_reg must be distinct");
-                let func_ptr = program.funcs[*func_idx as usize];
-                // A predicate-less Filter (no WHERE clause) is elided at emit
-                // time by register aliasing; every emitted Filter carries a func.
-                debug_assert!(!func_ptr.is_null(), "Filter: null predicate must be elided at emit");
-                let func = unsafe { &*func_ptr };
-                let schema = &program.reg_meta[*in_reg as usize].schema;
-                let result = ops::op_filter(&reg!(*in_reg).batch, func, schema);
+                let result = match shared_prefix_hit(program, *prefix, &reg!(*in_reg).batch) {
+                    Some(hit) => hit,
+                    None => {
+                        let func_ptr = program.funcs[*func_idx as usize];
+                        // A predicate-less Filter (no WHERE clause) is elided at
+                        // emit time by register aliasing; every emitted Filter
+                        // carries a func.
+                        debug_assert!(!func_ptr.is_null(), "Filter: null predicate must be elided at emit");
+                        let func = unsafe { &*func_ptr };
+                        let schema = &program.reg_meta[*in_reg as usize].schema;
+                        let result = ops::op_filter(&reg!(*in_reg).batch, func, schema);
+                        offer_shared_prefix(program, *prefix, &reg!(*in_reg).batch, &result);
+                        result
+                    }
+                };
                 reg_mut!(*out_reg).batch = result;
             }
 
@@ -176,26 +244,34 @@ pub(crate) fn execute_epoch_multi(
                 out_reg,
                 func_idx,
                 reindex,
+                prefix,
             } => {
                 debug_assert_ne!(*in_reg, *out_reg, "Map: in_reg and out_reg must be distinct");
-                let func_ptr = program.funcs[*func_idx as usize];
-                // Identity MAPs are elided at emit time by register aliasing;
-                // every emitted Map carries a func.
-                debug_assert!(!func_ptr.is_null(), "Map: identity map must be elided at emit");
-                let func = unsafe { &*func_ptr };
-                let in_schema = &program.reg_meta[*in_reg as usize].schema;
-                let reindex = match *reindex {
-                    ReindexOperand::None => ops::ReindexSpec::None,
-                    ReindexOperand::HashRow { branch_id } => ops::ReindexSpec::HashRow { branch_id },
-                    ReindexOperand::Pack { off, cnt } => {
-                        let (off, cnt) = (off as usize, cnt as usize);
-                        ops::ReindexSpec::Pack {
-                            cols: &program.reindex_cols[off..off + cnt],
-                            target_tcs: &program.reindex_target_tcs[off..off + cnt],
-                        }
+                let result = match shared_prefix_hit(program, *prefix, &reg!(*in_reg).batch) {
+                    Some(hit) => hit,
+                    None => {
+                        let func_ptr = program.funcs[*func_idx as usize];
+                        // Identity MAPs are elided at emit time by register
+                        // aliasing; every emitted Map carries a func.
+                        debug_assert!(!func_ptr.is_null(), "Map: identity map must be elided at emit");
+                        let func = unsafe { &*func_ptr };
+                        let in_schema = &program.reg_meta[*in_reg as usize].schema;
+                        let reindex = match *reindex {
+                            ReindexOperand::None => ops::ReindexSpec::None,
+                            ReindexOperand::HashRow { branch_id } => ops::ReindexSpec::HashRow { branch_id },
+                            ReindexOperand::Pack { off, cnt } => {
+                                let (off, cnt) = (off as usize, cnt as usize);
+                                ops::ReindexSpec::Pack {
+                                    cols: &program.reindex_cols[off..off + cnt],
+                                    target_tcs: &program.reindex_target_tcs[off..off + cnt],
+                                }
+                            }
+                        };
+                        let result = ops::op_map(&reg!(*in_reg).batch, func, in_schema, reindex);
+                        offer_shared_prefix(program, *prefix, &reg!(*in_reg).batch, &result);
+                        result
                     }
                 };
-                let result = ops::op_map(&reg!(*in_reg).batch, func, in_schema, reindex);
                 reg_mut!(*out_reg).batch = result;
             }
 
@@ -228,17 +304,23 @@ pub(crate) fn execute_epoch_multi(
                 hist_table_idx,
                 lo,
                 hi,
+                hist_from_output,
             } => {
                 let cursor = cursor_mut!(*hist_reg).expect("weight-clamp: history cursor unbound");
                 let schema = &program.reg_meta[*in_reg as usize].schema;
                 let delta = reg_mut!(*in_reg).batch.take();
                 let (output, consolidated) = ops::op_weight_clamp(delta, cursor, schema, *lo, *hi);
-                reg_mut!(*out_reg).batch = output;
-                // Ingest consolidated delta into history table
+                // Ingest the consolidated delta (or, for an insert-only distinct,
+                // the output) into the history table.
                 let ptr = program.tables[*hist_table_idx as usize];
                 let table = unsafe { &mut *ptr };
-                let res = table.ingest_owned_batch(consolidated);
+                let res = if *hist_from_output {
+                    table.ingest_borrowed_batch(&output)
+                } else {
+                    table.ingest_owned_batch(consolidated)
+                };
                 fatal_on_tick_ingest_err("weight-clamp history", *hist_table_idx as i32, res);
+                reg_mut!(*out_reg).batch = output;
             }
 
             Instr::JoinDT {
@@ -332,6 +414,28 @@ pub(crate) fn execute_epoch_multi(
                 fatal_on_tick_ingest_err("integrate", *table_idx, res);
             }
 
+            Instr::IntegrateShared {
+                in_reg,
+                arrangement_idx,
+            } => {
+                // An empty delta is no integration: it must not claim the tick.
+                let batch = &reg!(*in_reg).batch;
+                if batch.count > 0 {
+                    let arr = unsafe { &*program.arrangements[*arrangement_idx as usize] };
+                    let admit = arr.admit();
+                    gnitz_debug!(
+                        "vm: INTEGRATE_SHARED in_count={} source={} admit={}",
+                        batch.count,
+                        arr.source(),
+                        admit
+                    );
+                    if admit {
+                        let res = ops::op_integrate_with_indexes(batch, Some(arr.table_mut()), None);
+                        fatal_on_tick_ingest_err("integrate_shared", *arrangement_idx as i32, res);
+                    }
+                }
+            }
+
             Instr::Reduce {
                 in_reg,
                 trace_in_reg,
@@ -404,6 +508,51 @@ pub(crate) fn execute_epoch_multi(
 
                 reg_mut!(*out_reg).batch = raw_out;
             }
+
+            Instr::TopK {
+                in_reg,
+                index_reg,
+                out_reg,
+                index_table_idx,
+                bake_idx,
+            } => {
+                let cursor = cursor_mut!(*index_reg).expect("top-k: index cursor unbound");
+                let schema = &program.reg_meta[*in_reg as usize].schema;
+                let bake = &program.top_k_bakes[*bake_idx as usize];
+                let (output, index_delta) = ops::op_top_k(&reg!(*in_reg).batch, cursor, schema, bake);
+                reg_mut!(*out_reg).batch = output;
+                // The order index advances only after both walks read the
+                // pre-tick integral through `cursor`.
+                let ptr = program.tables[*index_table_idx as usize];
+                let table = unsafe { &mut *ptr };
+                let res = table.ingest_owned_batch(index_delta);
+                fatal_on_tick_ingest_err("top-k index", *index_table_idx as i32, res);
+            }
+
+            Instr::Retain {
+                in_reg,
+                index_reg,
+                out_reg,
+                index_table_idx,
+                bake_idx,
+            } => {
+                let cursor = cursor_mut!(*index_reg).expect("retain: index cursor unbound");
+                let schema = &program.reg_meta[*in_reg as usize].schema;
+                let bake = &program.retain_bakes[*bake_idx as usize];
+                let (output, index_delta) = ops::op_retain(&reg!(*in_reg).batch, cursor, schema, bake);
+                reg_mut!(*out_reg).batch = output;
+                let ptr = program.tables[*index_table_idx as usize];
+                let table = unsafe { &mut *ptr };
+                let res = table.ingest_owned_batch(index_delta);
+                fatal_on_tick_ingest_err("retain index", *index_table_idx as i32, res);
+            }
+        }
+        if let Some((ports, rows_in, seeks_before, zone, started)) = probe {
+            let nanos = started.elapsed().as_nanos() as u64;
+            drop(zone);
+            let rows_out = ports.out.map_or(rows_in, |r| reg!(r).batch.count as u64);
+            let seeks = trace_seeks!(ports.traces).saturating_sub(seeks_before);
+            program.profile[pc].record(rows_in, rows_out, nanos, seeks);
         }
     }
 
@@ -1,11 +1,15 @@
 //! DBSP VM: executes compiled circuit programs entirely in Rust.
 
+use std::rc::Rc;
+
 use crate::expr::ScalarFunc;
+use crate::query::arrangement::{SharedArrangement, SharedPrefix};
 use crate::schema::SchemaDescriptor;
 use crate::storage::{Batch, ReadCursor, Table};
 
 mod builder;
 mod exec;
+pub(crate) mod profile;
 
 pub(crate) use builder::ProgramBuilder;
 #[cfg(test)]
@@ -36,16 +40,20 @@ pub(crate) enum Instr {
         trace_reg: u16,
         out_reg: u16,
     },
+    /// `prefix`: index into `Program::prefixes` when this node's output is
+    /// shared with other views (see `SharedPrefix`).
     Filter {
         in_reg: u16,
         out_reg: u16,
         func_idx: u16,
+        prefix: Option<u16>,
     },
     Map {
         in_reg: u16,
         out_reg: u16,
         func_idx: u16,
         reindex: ReindexOperand,
+        prefix: Option<u16>,
     },
     Negate {
         in_reg: u16,
@@ -59,7 +67,10 @@ pub(crate) enum Instr {
     /// Shared instruction for `distinct` and `positive_part`: per consolidated
     /// (PK, payload), emit `clamp(w_new, lo, hi) − clamp(w_old, lo, hi)`. Bounds
     /// `(-1, 1)` ⇒ `distinct` (set membership); `(0, i64::MAX)` ⇒ `positive_part`
-    /// (bag multiplicity).
+    /// (bag multiplicity). The history integrates the consolidated input, or —
+    /// `hist_from_output`, for a `distinct` over an insert-only input — the
+    /// output, so it holds each element once at weight 1 and a repeat insertion
+    /// writes nothing.
     WeightClamp {
         in_reg: u16,
         hist_reg: u16,
@@ -67,6 +78,7 @@ pub(crate) enum Instr {
         hist_table_idx: u16,
         lo: i64,
         hi: i64,
+        hist_from_output: bool,
     },
     JoinDT {
         delta_reg: u16,
@@ -95,6 +107,12 @@ pub(crate) enum Instr {
         table_idx: i32, // index into Program::tables, -1 = no target (sink)
         avi: Option<IntegrateAvi>,
     },
+    /// Integrate into a shared arrangement (index into `Program::arrangements`).
+    /// Only the tick's first consumer writes; see `SharedArrangement::admit`.
+    IntegrateShared {
+        in_reg: u16,
+        arrangement_idx: u16,
+    },
     Reduce {
         in_reg: u16,
         trace_in_reg: Option<u16>,
@@ -108,6 +126,28 @@ pub(crate) enum Instr {
         // `None` means the operator has no value index (all-linear or fallback).
         avi_table_idx: Option<u16>,
     },
+    /// Incremental top-K: `index_reg` is the order index's trace register (its
+    /// cursor reads the integral before this tick) and `index_table_idx` the
+    /// table the re-keyed delta is ingested into afterwards.
+    TopK {
+        in_reg: u16,
+        index_reg: u16,
+        out_reg: u16,
+        index_table_idx: u16,
+        /// Index into `Program::top_k_bakes`.
+        bake_idx: u16,
+    },
+    /// Watermark retention: `index_reg` is the retain index's trace register
+    /// (its cursor reads the integral before this tick) and `index_table_idx`
+    /// the table the index delta is ingested into afterwards.
+    Retain {
+        in_reg: u16,
+        index_reg: u16,
+        out_reg: u16,
+        index_table_idx: u16,
+        /// Index into `Program::retain_bakes`.
+        bake_idx: u16,
+    },
 }
 
 /// Stored form of [`crate::ops::ReindexSpec`] — the `Instr::Map` PK-restamp
@@ -135,7 +175,10 @@ pub(crate) fn reads_reg(instr: &Instr, r: u16) -> bool {
         | Instr::NullExtend { in_reg, .. }
         | Instr::WeightClamp { in_reg, .. }
         | Instr::Integrate { in_reg, .. }
-        | Instr::Reduce { in_reg, .. } => *in_reg == r,
+        | Instr::IntegrateShared { in_reg, .. }
+        | Instr::Reduce { in_reg, .. }
+        | Instr::TopK { in_reg, .. }
+        | Instr::Retain { in_reg, .. } => *in_reg == r,
         Instr::Union { in_a, in_b, .. } => *in_a == r || *in_b == r,
         Instr::JoinDT { delta_reg, .. } | Instr::JoinDTRange { delta_reg, .. } => *delta_reg == r,
         Instr::ScanTrace { .. } | Instr::Halt => false,
@@ -171,9 +214,9 @@ pub(crate) struct VmHandle {
     pub program: Program,
     pub regfile: RegisterFile,
     /// Cursor handles for owned trace registers, kept alive across the epoch.
-    /// Indexed in parallel with `owned_trace_regs`. Cursor destructors
-    /// dereference the `Table` they were opened against, so this MUST drop
-    /// before `owned_tables`.
+    /// Indexed in parallel with `owned_trace_regs`, then `shared_trace_regs`.
+    /// Cursor destructors dereference the `Table` they were opened against, so
+    /// this MUST drop before `owned_tables` and `shared`.
     owned_cursor_handles: Vec<Option<Box<ReadCursor>>>,
     /// Child tables created during compilation (history, reduce-in, AVI).
     /// `program.tables` may point into these.  Dropped AFTER `program`.
@@ -186,6 +229,12 @@ pub(crate) struct VmHandle {
     /// Trace registers backed by owned tables: `(reg_id, index into owned_tables)`.
     /// `execute_epoch` creates cursors from these before dispatch.
     pub owned_trace_regs: Vec<(u16, usize)>,
+    /// Arrangements this plan shares with other views; `program.arrangements`
+    /// points into these. The table drops with the last consumer's handle.
+    pub shared: Vec<Rc<SharedArrangement>>,
+    /// Trace registers backed by shared arrangements: `(reg_id, index into
+    /// shared)`. Their cursors follow `owned_cursor_handles`' slots.
+    pub shared_trace_regs: Vec<(u16, usize)>,
 }
 
 // Compile-time proof that `program` precedes all owned resource vecs, so
@@ -195,6 +244,8 @@ const _: () = assert!(std::mem::offset_of!(VmHandle, program) < std::mem::offset
 // Cursor destructors dereference their owning `Table`; cursors MUST drop first.
 const _: () =
     assert!(std::mem::offset_of!(VmHandle, owned_cursor_handles) < std::mem::offset_of!(VmHandle, owned_tables));
+const _: () = assert!(std::mem::offset_of!(VmHandle, program) < std::mem::offset_of!(VmHandle, shared));
+const _: () = assert!(std::mem::offset_of!(VmHandle, owned_cursor_handles) < std::mem::offset_of!(VmHandle, shared));
 
 impl VmHandle {
     /// Compact owned tables and create fresh cursors for owned trace registers.
@@ -230,6 +281,13 @@ impl VmHandle {
             let ptr = self.owned_cursor_handles[slot].as_mut().unwrap().as_mut() as *mut ReadCursor;
             self.regfile.registers[reg_id as usize].cursor_ptr = ptr;
         }
+        for &(reg_id, idx) in &self.shared_trace_regs {
+            let table = self.shared[idx].table_mut();
+            let _ = table.compact_if_needed();
+            self.owned_cursor_handles.push(Some(Box::new(table.open_cursor())));
+            let ptr = self.owned_cursor_handles.last_mut().unwrap().as_mut().unwrap().as_mut() as *mut ReadCursor;
+            self.regfile.registers[reg_id as usize].cursor_ptr = ptr;
+        }
     }
 
     /// Clear the register file's delta batches (a disjoint-field borrow of the
@@ -246,12 +304,13 @@ impl VmHandle {
     /// keep their own `Rc<Batch>` / shard `Arc` clones (a fold produces a
     /// stale-not-dangling snapshot) and the next epoch calls
     /// `refresh_owned_cursors` before any deref — but nulling here keeps the
-    /// flush's safety local and obvious. Only `owned_trace_regs` are handled
-    /// (`_int_`/`_hist_`/`_reduce_`/`_reduce_in_`, all cross-epoch); the epoch-local
+    /// flush's safety local and obvious. Only `owned_trace_regs` (and the shared
+    /// arrangements' `shared_trace_regs`) are handled
+    /// (`_int_`/`_hist_`/`_reduce_`/`_reduce_in_`/`_topk_`/`_retain_`, all cross-epoch); the epoch-local
     /// `_avidx_` cursor is created and dropped inside the `Reduce` instruction.
     pub fn null_owned_cursors(&mut self) {
         self.owned_cursor_handles.clear(); // drops every held cursor
-        for &(reg_id, _table_idx) in &self.owned_trace_regs {
+        for &(reg_id, _) in self.owned_trace_regs.iter().chain(&self.shared_trace_regs) {
             self.regfile.registers[reg_id as usize].cursor_ptr = std::ptr::null_mut();
         }
     }
@@ -312,6 +371,18 @@ pub(crate) struct Program {
     pub reduce_plans: Vec<crate::ops::ReducePlan>,
     /// Baked AVI write-side resources, indexed by `IntegrateAvi::bake_idx`.
     pub avi_bakes: Vec<crate::ops::AviBake>,
+    /// Baked per-`Instr::TopK` resources, indexed by `Instr::TopK::bake_idx`.
+    pub top_k_bakes: Vec<crate::ops::TopKBake>,
+    /// Baked per-`Instr::Retain` resources, indexed by `Instr::Retain::bake_idx`.
+    pub retain_bakes: Vec<crate::ops::RetainBake>,
+    /// Shared arrangements, indexed by `Instr::IntegrateShared::arrangement_idx`.
+    pub arrangements: Vec<*const SharedArrangement>,
+    /// Shared filter/map outputs, indexed by `Instr::Filter::prefix` /
+    /// `Instr::Map::prefix`. Owned here: a prefix holds no table, so it has no
+    /// drop-order constraint, and its strong count is its consumer count.
+    pub prefixes: Vec<Rc<SharedPrefix>>,
+    /// Per-instruction execution counters, parallel to `instructions`.
+    pub profile: Vec<profile::OpStat>,
 }
 
 // SAFETY: Program is only accessed from a single thread (the worker thread
@@ -476,6 +547,7 @@ mod tests {
             false,
             false,
             false,
+            false,
         ));
         b.push(Instr::Reduce {
             in_reg,
@@ -577,6 +649,7 @@ mod tests {
             in_reg: 0,
             out_reg: 1,
             func_idx,
+            prefix: None,
         });
         builder.push(Instr::Negate { in_reg: 1, out_reg: 2 });
         builder.push(Instr::Halt);
@@ -798,6 +871,7 @@ mod tests {
             out_reg: 1,
             func_idx,
             reindex: ReindexOperand::None,
+            prefix: None,
         });
         builder.push(Instr::Halt);
 
@@ -850,6 +924,7 @@ mod tests {
             hist_table_idx,
             lo: -1,
             hi: 1,
+            hist_from_output: false,
         });
         builder.push(Instr::Halt);
 
@@ -1357,12 +1432,14 @@ mod tests {
             in_reg: 0,
             out_reg: 1,
             func_idx,
+            prefix: None,
         });
         let func_idx = builder.func_idx(func_ptr);
         builder.push(Instr::Filter {
             in_reg: 1,
             out_reg: 2,
             func_idx,
+            prefix: None,
         });
         builder.push(Instr::Halt);
 
@@ -1416,6 +1493,7 @@ mod tests {
             in_reg: 0,
             out_reg: 1,
             func_idx,
+            prefix: None,
         });
         builder.push(Instr::Halt);
 
@@ -1719,4 +1797,48 @@ mod tests {
             "external trace register must be null after epoch with null handle"
         );
     }
+
+    #[test]
+    fn test_profile_counts_and_tree() {
+        use crate::foundation::profile as cpu;
+        let _switch = cpu::TEST_SWITCH.lock().unwrap_or_else(|e| e.into_inner());
+        // r0 → Negate → r1; Union(r0, r1) → r2; Integrate(r2) sink.
+        let schema = schema_1i64();
+        let mut builder = ProgramBuilder::new();
+        builder.push(Instr::Negate { in_reg: 0, out_reg: 1 });
+        builder.push(Instr::Union {
+            in_a: 0,
+            in_b: 1,
+            out_reg: 2,
+        });
+        builder.push(Instr::Integrate {
+            in_reg: 2,
+            table_idx: -1,
+            avi: None,
+        });
+        builder.push(Instr::Halt);
+        let reg_meta = [RegisterMeta::delta(schema); 3];
+        let mut vm = builder.build(&reg_meta);
+        let cursors = vec![std::ptr::null_mut(); 3];
+        let epoch = |vm: &mut VmHandle| {
+            let input = make_batch(schema, &[(1u128, 1, 10), (2u128, 1, 20), (3u128, 1, 30)]);
+            execute_epoch(&vm.program, &mut vm.regfile, input, 0, 2, &cursors).unwrap();
+        };
+        // A stopped profiler counts nothing.
+        epoch(&mut vm);
+        assert_eq!(vm.program.profile[0].counts(), Default::default());
+        cpu::start();
+        epoch(&mut vm);
+        epoch(&mut vm);
+        cpu::stop();
+
+        let tree = profile::profile_tree(&vm.program, 2);
+        let shape: Vec<(&str, u32)> = tree.iter().map(|o| (o.op, o.depth)).collect();
+        assert_eq!(shape, [("Union", 0), ("Negate", 1), ("Integrate (sink)", 0)]);
+        let (union, negate, sink) = (tree[0].counts, tree[1].counts, tree[2].counts);
+        assert_eq!(union.calls, 2);
+        assert_eq!(union.rows_in, 12, "both inputs, both epochs");
+        assert_eq!((negate.rows_in, negate.rows_out), (6, 6));
+        assert_eq!(sink.rows_out, sink.rows_in, "a sink is charged its input");
+    }
 }
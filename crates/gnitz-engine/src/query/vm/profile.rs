@@ -0,0 +1,283 @@
+//! Per-instruction execution counters behind `EXPLAIN ANALYZE VIEW`.
+//!
+//! Every compiled `Program` carries one `OpStat` per instruction, bumped by the
+//! dispatch loop on each epoch while the profiler runs (GET_STATS
+//! `STATS_PROFILE_START` … `STATS_PROFILE_STOP`); a stopped profiler costs the
+//! loop one flag read per epoch. The counters sum every profiled epoch since the
+//! plan was compiled (a recompile — DDL, restart — starts them over).
+
+use std::cell::Cell;
+
+use super::{Instr, Program, VmHandle};
+use crate::storage::{Batch, Table};
+
+/// Cumulative counters for one instruction. `Cell`s: the dispatch loop only
+/// holds `&Program`.
+#[derive(Default)]
+pub(crate) struct OpStat {
+    calls: Cell<u64>,
+    rows_in: Cell<u64>,
+    rows_out: Cell<u64>,
+    nanos: Cell<u64>,
+    seeks: Cell<u64>,
+}
+
+impl OpStat {
+    #[inline]
+    pub fn record(&self, rows_in: u64, rows_out: u64, nanos: u64, seeks: u64) {
+        self.calls.set(self.calls.get() + 1);
+        self.rows_in.set(self.rows_in.get() + rows_in);
+        self.rows_out.set(self.rows_out.get() + rows_out);
+        self.nanos.set(self.nanos.get() + nanos);
+        self.seeks.set(self.seeks.get() + seeks);
+    }
+
+    pub fn counts(&self) -> OpCounts {
+        OpCounts {
+            calls: self.calls.get(),
+            rows_in: self.rows_in.get(),
+            rows_out: self.rows_out.get(),
+            nanos: self.nanos.get(),
+            seeks: self.seeks.get(),
+        }
+    }
+}
+
+/// A snapshot of one `OpStat`.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub(crate) struct OpCounts {
+    pub calls: u64,
+    pub rows_in: u64,
+    pub rows_out: u64,
+    pub nanos: u64,
+    pub seeks: u64,
+}
+
+/// Cumulative shard-exchange traffic of one view on one worker: every relay
+/// round its multi-worker step ran while the profiler did, with the rows and
+/// bytes this worker sent into the round and got back.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub(crate) struct ExchangeCounts {
+    pub rounds: u64,
+    pub rows_sent: u64,
+    pub bytes_sent: u64,
+    pub rows_recv: u64,
+    pub bytes_recv: u64,
+}
+
+impl ExchangeCounts {
+    pub fn record(&mut self, sent: &Batch, recv: &Batch) {
+        self.rounds += 1;
+        self.rows_sent += sent.count as u64;
+        self.bytes_sent += sent.total_bytes() as u64;
+        self.rows_recv += recv.count as u64;
+        self.bytes_recv += recv.total_bytes() as u64;
+    }
+
+    pub fn add(&mut self, o: ExchangeCounts) {
+        self.rounds += o.rounds;
+        self.rows_sent += o.rows_sent;
+        self.bytes_sent += o.bytes_sent;
+        self.rows_recv += o.rows_recv;
+        self.bytes_recv += o.bytes_recv;
+    }
+}
+
+/// The registers an instruction is charged for: the delta batches it reads
+/// (`rows_in`), the one it writes (`rows_out`; `None` for the integrate sinks,
+/// which are charged their input), and the trace cursors it probes (`seeks`).
+pub(crate) struct Ports {
+    pub ins: [Option<u16>; 2],
+    pub out: Option<u16>,
+    pub traces: [Option<u16>; 2],
+}
+
+pub(crate) fn ports(instr: &Instr) -> Ports {
+    let (ins, out, traces) = match *instr {
+        Instr::Halt => ([None, None], None, [None, None]),
+        Instr::ScanTrace { trace_reg, out_reg } => ([None, None], Some(out_reg), [Some(trace_reg), None]),
+        Instr::Filter { in_reg, out_reg, .. }
+        | Instr::Map { in_reg, out_reg, .. }
+        | Instr::Negate { in_reg, out_reg }
+        | Instr::PartitionFilter { in_reg, out_reg, .. }
+        | Instr::NullExtend { in_reg, out_reg } => ([Some(in_reg), None], Some(out_reg), [None, None]),
+        Instr::Union { in_a, in_b, out_reg } => {
+            // A self-union reads its one register twice; charge it once.
+            let b = (in_b != in_a).then_some(in_b);
+            ([Some(in_a), b], Some(out_reg), [None, None])
+        }
+        Instr::WeightClamp {
+            in_reg,
+            hist_reg,
+            out_reg,
+            ..
+        } => ([Some(in_reg), None], Some(out_reg), [Some(hist_reg), None]),
+        Instr::JoinDT {
+            delta_reg,
+            trace_reg,
+            out_reg,
+        }
+        | Instr::JoinDTRange {
+            delta_reg,
+            trace_reg,
+            out_reg,
+            ..
+        } => ([Some(delta_reg), None], Some(out_reg), [Some(trace_reg), None]),
+        Instr::Integrate { in_reg, .. } | Instr::IntegrateShared { in_reg, .. } => {
+            ([Some(in_reg), None], None, [None, None])
+        }
+        Instr::Reduce {
+            in_reg,
+            trace_in_reg,
+            trace_out_reg,
+            out_reg,
+            ..
+        } => ([Some(in_reg), None], Some(out_reg), [trace_in_reg, Some(trace_out_reg)]),
+        Instr::TopK {
+            in_reg,
+            index_reg,
+            out_reg,
+            ..
+        }
+        | Instr::Retain {
+            in_reg,
+            index_reg,
+            out_reg,
+            ..
+        } => ([Some(in_reg), None], Some(out_reg), [Some(index_reg), None]),
+    };
+    Ports { ins, out, traces }
+}
+
+/// Display name of an instruction in the `EXPLAIN ANALYZE` tree.
+fn label(instr: &Instr) -> &'static str {
+    match instr {
+        Instr::Halt => "Halt",
+        Instr::ScanTrace { .. } => "ScanTrace",
+        Instr::Filter { prefix: Some(_), .. } => "Filter (shared)",
+        Instr::Filter { .. } => "Filter",
+        Instr::Map { prefix: Some(_), .. } => "Map (shared)",
+        Instr::Map { .. } => "Map",
+        Instr::Negate { .. } => "Negate",
+        Instr::Union { .. } => "Union",
+        Instr::WeightClamp { lo: -1, hi: 1, .. } => "Distinct",
+        Instr::WeightClamp { .. } => "PositivePart",
+        Instr::JoinDT { .. } => "JoinDeltaTrace",
+        Instr::JoinDTRange { .. } => "JoinDeltaTraceRange",
+        Instr::PartitionFilter { .. } => "PartitionFilter",
+        Instr::NullExtend { .. } => "NullExtend",
+        Instr::Integrate { table_idx: -1, .. } => "Integrate (sink)",
+        Instr::Integrate { .. } => "Integrate",
+        Instr::IntegrateShared { .. } => "IntegrateShared",
+        Instr::Reduce { .. } => "Reduce",
+        Instr::TopK { .. } => "TopK",
+        Instr::Retain { .. } => "Retain",
+    }
+}
+
+/// The `Program::tables` slot an instruction keeps its own state in (a
+/// distinct's history, a reduce's value index, a top-K or retain index), and
+/// the slots an `Integrate` writes (its trace and value index).
+fn state_tables(instr: &Instr) -> (Option<usize>, [Option<usize>; 2]) {
+    match instr {
+        Instr::WeightClamp { hist_table_idx, .. } => (Some(*hist_table_idx as usize), [None; 2]),
+        Instr::Reduce { avi_table_idx, .. } => (avi_table_idx.map(usize::from), [None; 2]),
+        Instr::TopK { index_table_idx, .. } | Instr::Retain { index_table_idx, .. } => {
+            (Some(*index_table_idx as usize), [None; 2])
+        }
+        Instr::Integrate { table_idx, avi, .. } => (
+            None,
+            [
+                usize::try_from(*table_idx).ok(),
+                avi.as_ref().map(|a| a.table_idx as usize),
+            ],
+        ),
+        _ => (None, [None; 2]),
+    }
+}
+
+/// The operator each of `handle`'s owned tables belongs to, as `(pc, label)`
+/// by index into `owned_tables`: the operator that reads it as a trace or
+/// keeps it as its own state, else the `Integrate` that feeds it. `None` for
+/// a table no instruction names.
+pub(crate) fn owned_table_ops(handle: &VmHandle) -> Vec<Option<(u32, &'static str)>> {
+    let program = &handle.program;
+    let owned = |slot: usize| {
+        let p = *program.tables.get(slot)?;
+        handle
+            .owned_tables
+            .iter()
+            .position(|t| std::ptr::eq(&**t as *const Table, p))
+    };
+    let mut owner = vec![None; handle.owned_tables.len()];
+    let mut writer = vec![None; handle.owned_tables.len()];
+    for (pc, instr) in program.instructions.iter().enumerate() {
+        let at = (pc as u32, label(instr));
+        let (state, written) = state_tables(instr);
+        let traced = ports(instr).traces.into_iter().flatten().filter_map(|r| {
+            handle
+                .owned_trace_regs
+                .iter()
+                .find(|&&(reg, _)| reg == r)
+                .map(|&(_, i)| i)
+        });
+        for i in state.and_then(owned).into_iter().chain(traced) {
+            owner[i].get_or_insert(at);
+        }
+        for i in written.into_iter().flatten().filter_map(owned) {
+            writer[i].get_or_insert(at);
+        }
+    }
+    owner.into_iter().zip(writer).map(|(o, w)| o.or(w)).collect()
+}
+
+/// One instruction of a profiled program, in tree order.
+#[derive(Debug)]
+pub(crate) struct ProfiledOp {
+    pub pc: u32,
+    /// Nesting depth: an operator's inputs sit one level below it.
+    pub depth: u32,
+    pub op: &'static str,
+    pub counts: OpCounts,
+}
+
+/// Lay `program` out as its dataflow tree: the producer of `out_reg` first,
+/// each operator followed by the producers of its input registers one level
+/// deeper (pre-order). Operators off that path — the integrate sinks that feed
+/// traces — become further roots, latest first. A register read by several
+/// operators is shown under the first of them only.
+pub(crate) fn profile_tree(program: &Program, out_reg: u16) -> Vec<ProfiledOp> {
+    let instrs = &program.instructions;
+    let mut producer: Vec<Option<usize>> = vec![None; program.reg_meta.len()];
+    for (pc, instr) in instrs.iter().enumerate() {
+        if let Some(r) = ports(instr).out {
+            producer[r as usize] = Some(pc);
+        }
+    }
+
+    let mut seen = vec![false; instrs.len()];
+    let mut out = Vec::with_capacity(instrs.len());
+    let roots = producer[out_reg as usize].into_iter().chain((0..instrs.len()).rev());
+    for root in roots {
+        let mut stack = vec![(root, 0u32)];
+        while let Some((pc, depth)) = stack.pop() {
+            if seen[pc] || matches!(instrs[pc], Instr::Halt) {
+                continue;
+            }
+            seen[pc] = true;
+            out.push(ProfiledOp {
+                pc: pc as u32,
+                depth,
+                op: label(&instrs[pc]),
+                counts: program.profile[pc].counts(),
+            });
+            // Reversed so the first input is visited (printed) first.
+            for r in ports(&instrs[pc]).ins.iter().rev().flatten() {
+                if let Some(p) = producer[*r as usize] {
+                    stack.push((p, depth + 1));
+                }
+            }
+        }
+    }
+    out
+}
@@ -126,9 +126,17 @@ where
             Some(d) => d,
             None => continue,
         };
+        // A committed group that does not decode is committed data this
+        // binary cannot read; skipping it would drop it at boot.
         let decoded = match ipc::decode_wire(data) {
             Ok(d) => d,
-            Err(_) => continue,
+            Err(e) => crate::gnitz_fatal_abort!(
+                "SAL replay decode failed (table_id={}, lsn={}): {} — aborting \
+                 before the SAL sentinel is reset",
+                msg.target_id,
+                msg.lsn,
+                e,
+            ),
         };
         if apply(catalog, &msg, decoded) {
             applied += 1;
@@ -358,6 +366,7 @@ pub fn server_main(
     num_workers: u32,
     log_level: u32,
     tls_cli: Option<TlsCli>,
+    metrics_listen: Option<std::net::SocketAddr>,
 ) -> i32 {
     // Latch the Master role before any catalog work: the pre-fork replay hooks
     // in CatalogEngine::open must see Master so they skip the index backfill
@@ -523,6 +532,17 @@ pub fn server_main(
         boot_log(&format!("W{} m2w_efd={} w2m_fd={}\n", w, m2w_efds[w], w2m_fds[w]));
     }
 
+    // --- Metrics, profiler and trace regions (slot 0 master, slot w + 1 worker w) ---
+    if !crate::foundation::metrics::init_shared(nw + 1) {
+        gnitz_warn!("metrics region unavailable; worker metrics will not be reported");
+    }
+    if !crate::foundation::profile::init_shared(nw + 1) {
+        gnitz_warn!("profiler region unavailable; only the master will be profiled");
+    }
+    if !crate::foundation::trace::init_shared(nw + 1) {
+        gnitz_warn!("trace region unavailable; worker spans will not be reported");
+    }
+
     let master_pid = unsafe { libc::getpid() };
 
     // --- Fork workers ---
@@ -551,6 +571,10 @@ pub fn server_main(
             // per-rank subdir. Single owner of the rank — no longer set in
             // WorkerProcess::new.
             crate::foundation::worker_ctx::set_worker_rank(w as u32, num_workers);
+            crate::storage::write_buffer_attach_worker();
+            crate::foundation::metrics::attach(w + 1);
+            crate::foundation::profile::attach(w + 1);
+            crate::foundation::trace::attach(w + 1);
 
             // Redirect stdout/stderr to worker log file
             {
@@ -723,9 +747,34 @@ pub fn server_main(
         },
         None => None,
     };
+    let metrics_fd = match metrics_listen {
+        Some(addr) => match setup_metrics_listener(data_dir, &addr) {
+            Ok(fd) => Some(fd),
+            Err(e) => {
+                gnitz_error!("{e}");
+                return 1;
+            }
+        },
+        None => None,
+    };
     boot_log("GnitzDB ready\n");
 
-    ServerExecutor::run(catalog_ptr, dispatcher_ptr, server_fd, tls_init)
+    ServerExecutor::run(catalog_ptr, dispatcher_ptr, server_fd, tls_init, metrics_fd)
+}
+
+/// Bind the plain-HTTP Prometheus scrape listener and publish the bound
+/// address to `<data_dir>/metrics_endpoint` (tmp + rename, like
+/// `tls_endpoint`). The endpoint is read-only — it serves counters, never
+/// data — so unlike the TLS listener any bind address is accepted.
+fn setup_metrics_listener(data_dir: &str, addr: &std::net::SocketAddr) -> Result<i32, String> {
+    let fd = posix_io::tcp_bind(addr).map_err(|e| format!("failed to bind metrics listener {addr}: {e}"))?;
+    let bound = posix_io::tcp_local_addr(fd).unwrap_or(*addr);
+    let endpoint_path = format!("{data_dir}/metrics_endpoint");
+    let tmp_path = format!("{endpoint_path}.tmp");
+    std::fs::write(&tmp_path, format!("{bound}\n")).map_err(|e| format!("failed to write {tmp_path}: {e}"))?;
+    std::fs::rename(&tmp_path, &endpoint_path).map_err(|e| format!("failed to publish {endpoint_path}: {e}"))?;
+    gnitz_info!("Serving metrics on http://{}/metrics", bound);
+    Ok(fd)
 }
 
 /// Build the rustls server config (minting + persisting the public dev cert
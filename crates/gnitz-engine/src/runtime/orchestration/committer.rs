@@ -26,6 +26,9 @@
 
 use super::executor::{TickTrigger, TICK_COALESCE_ROWS};
 use super::guard_panic;
+use crate::foundation::metrics::{self, Counter, Hist};
+use crate::foundation::profile::{self, Zone};
+use crate::foundation::trace::{self, Stage};
 use crate::runtime::lsn::ZoneLsnAllocator;
 use crate::runtime::master::{first_worker_error_opt, MasterDispatcher, TxnFamily, TxnFit};
 use crate::runtime::reactor::{join_into, mpsc, oneshot, select2, AsyncMutex, Either, Reactor, ReplyFuture};
@@ -42,12 +45,16 @@ const MAX_PENDING_ROWS: usize = 100_000;
 #[allow(clippy::large_enum_variant)]
 pub enum CommitRequest {
     /// Buffer the batch for group commit. On completion, `done` resolves
-    /// to `Ok(lsn)` or `Err(error_message)`.
+    /// to `Ok(lsn)` or `Err(error_message)`. `trace_id` is the request's
+    /// trace context (0 = untraced) and `queued_ns` when it was sent here
+    /// (`trace::now_ns`, 0 when untraced).
     Push {
         tid: i64,
         batch: Batch,
         mode: WireConflictMode,
         done: oneshot::Sender<Result<u64, String>>,
+        trace_id: u64,
+        queued_ns: u64,
     },
     /// An atomic user-table transaction: N families emitted as N `FLAG_PUSH`
     /// groups inside one zone under one sentinel, with a single `done` for the
@@ -101,6 +108,8 @@ struct PendingPush {
     batch: Option<Batch>,
     mode: WireConflictMode,
     done: oneshot::Sender<Result<u64, String>>,
+    trace_id: u64,
+    queued_ns: u64,
 }
 
 /// Shared state between the committer task and the executor.
@@ -240,13 +249,22 @@ fn debounce_drain(rx: &mut mpsc::Receiver<CommitRequest>, first: CommitRequest)
     let mut barriers = Vec::new();
     let mut row_count: usize = 0;
     match first {
-        CommitRequest::Push { tid, batch, mode, done } => {
+        CommitRequest::Push {
+            tid,
+            batch,
+            mode,
+            done,
+            trace_id,
+            queued_ns,
+        } => {
             row_count = batch.count;
             pushes.push(PendingPush {
                 tid,
                 batch: Some(batch),
                 mode,
                 done,
+                trace_id,
+                queued_ns,
             });
         }
         // A transaction is one indivisible entry — its whole family set rides
@@ -259,13 +277,22 @@ fn debounce_drain(rx: &mut mpsc::Receiver<CommitRequest>, first: CommitRequest)
     }
     while row_count < MAX_PENDING_ROWS {
         match rx.try_recv() {
-            Some(CommitRequest::Push { tid, batch, mode, done }) => {
+            Some(CommitRequest::Push {
+                tid,
+                batch,
+                mode,
+                done,
+                trace_id,
+                queued_ns,
+            }) => {
                 row_count += batch.count;
                 pushes.push(PendingPush {
                     tid,
                     batch: Some(batch),
                     mode,
                     done,
+                    trace_id,
+                    queued_ns,
                 });
             }
             Some(CommitRequest::Txn(txn)) => {
@@ -357,6 +384,7 @@ async fn run_checkpoint_sequence(
     // Step 0: gen bump. From this instant every existing rederived manifest is
     // stale; a crash below rebuilds views instead of silently staleifying them.
     let gen = shared.disp().bump_checkpoint_generation();
+    metrics::inc(Counter::Checkpoints);
 
     // Step 1: base round. A failure is unrecoverable in-process (workers
     // already bumped their read epoch on FLAG_FLUSH but the master did not
@@ -459,12 +487,21 @@ async fn await_servicing(
                 let _ = done.send(());
             }
             Either::B(Some(CommitRequest::Barrier { kind, done })) => deferred.push((kind, done)),
-            Either::B(Some(CommitRequest::Push { tid, batch, mode, done })) => {
+            Either::B(Some(CommitRequest::Push {
+                tid,
+                batch,
+                mode,
+                done,
+                trace_id,
+                queued_ns,
+            })) => {
                 held_pushes.push(PendingPush {
                     tid,
                     batch: Some(batch),
                     mode,
                     done,
+                    trace_id,
+                    queued_ns,
                 });
             }
             Either::B(Some(CommitRequest::Txn(txn))) => held_txns.push(txn),
@@ -485,6 +522,9 @@ struct GroupInfo {
     req_ids: Vec<u64>,
     merged: Option<Batch>,
     write_err: Option<String>,
+    /// Trace context the workers apply the group under: the first traced
+    /// push of a merged run, else 0.
+    trace_id: u64,
 }
 
 /// One client-visible commit unit — the span of `groups` it emits and the `done`
@@ -530,6 +570,17 @@ async fn commit_pushes(
     // Sort by (tid, mode) so runs are homogeneous.
     pushes.sort_by_key(|p| (p.tid, p.mode.as_u8()));
 
+    // Traced pushes leave the queue here; every stage below is timed for each.
+    let traced: Vec<(u64, u64)> = pushes
+        .iter()
+        .filter(|p| p.trace_id != 0)
+        .map(|p| (p.trace_id, p.tid as u64))
+        .collect();
+    for p in pushes.iter().filter(|p| p.trace_id != 0) {
+        trace::record(p.trace_id, 0, p.tid as u64, Stage::Enqueue, p.queued_ns);
+    }
+    let trace_start = || if traced.is_empty() { 0 } else { trace::now_ns() };
+
     let nw = shared.num_workers;
     let mut groups: Vec<GroupInfo> = Vec::new();
     let mut units: Vec<CommitUnit> = Vec::with_capacity(txns.len());
@@ -549,6 +600,7 @@ async fn commit_pushes(
                 req_ids: alloc_req_ids(),
                 merged: Some(fam.batch),
                 write_err: None,
+                trace_id: 0,
             });
         }
         units.push(CommitUnit {
@@ -575,6 +627,7 @@ async fn commit_pushes(
         // mismatched pool entries are dropped and reallocated — without
         // this, append_batch writes rows under the wrong column layout.
         let built = guard_panic("commit_merge", || {
+            let _z = profile::zone(Zone::Commit);
             if run.len() == 1 {
                 Ok(run[0].batch.take().expect("PendingPush.batch already taken"))
             } else {
@@ -612,6 +665,7 @@ async fn commit_pushes(
             req_ids: alloc_req_ids(),
             merged: Some(merged),
             write_err,
+            trace_id: run.iter().map(|p| p.trace_id).find(|&t| t != 0).unwrap_or(0),
         });
         units.push(CommitUnit {
             groups: gstart..groups.len(),
@@ -630,6 +684,7 @@ async fn commit_pushes(
     // either every group applies or none do. The zone LSN is published once,
     // after fsync (Phase D), so clients only see durable LSNs.
     // ------------------------------------------------------------------
+    let t_write = trace_start();
     let (zone_lsn, fsync_fut) = {
         let _sal_excl = shared.sal_writer_excl.lock().await;
 
@@ -735,6 +790,9 @@ async fn commit_pushes(
         // and lets concurrent tick/relay tasks make progress sooner.
         (zone_lsn, shared.reactor.fsync(shared.sal_fd))
     };
+    for &(t, tid) in &traced {
+        trace::record(t, zone_lsn, tid, Stage::SalWrite, t_write);
+    }
 
     // Build per-worker reply futures into the caller-supplied scratch
     // buffer. Holds one block of `nw` entries for each group with
@@ -819,10 +877,16 @@ async fn commit_pushes(
     // after fsync so the client sees only durable data.
     // ------------------------------------------------------------------
     {
+        let t0 = std::time::Instant::now();
+        let t_fsync = trace_start();
         let fsync_rc = fsync_fut.await;
         if fsync_rc < 0 {
             crate::gnitz_fatal_abort!("SAL fdatasync (committer) failed rc={}", fsync_rc);
         }
+        metrics::record_since(Hist::FsyncNs, t0);
+        for &(t, tid) in &traced {
+            trace::record(t, zone_lsn, tid, Stage::Fsync, t_fsync);
+        }
     }
 
     // Publish the zone LSN exactly once, after fsync confirms durability.
@@ -830,6 +894,14 @@ async fn commit_pushes(
     // may see duplicate LSNs — only non-decreasing monotonicity is guaranteed.
     if groups.iter().any(|g| g.write_err.is_none()) {
         shared.lsn_alloc.publish(zone_lsn);
+        let rows: usize = groups
+            .iter()
+            .filter(|g| g.write_err.is_none())
+            .map(|g| g.merged.as_ref().map_or(0, |b| b.count))
+            .sum();
+        metrics::inc(Counter::CommitBatches);
+        metrics::add(Counter::CommitRows, rows as u64);
+        metrics::record(Hist::CommitBatchRows, rows as u64);
     }
 
     // Update unique-index filters now that fsync confirms durability.
@@ -877,10 +949,11 @@ async fn commit_pushes(
 /// in `guard_panic` so a malformed batch fails the group instead of the node.
 fn write_group(shared: &Rc<Shared>, g: &GroupInfo, zone_lsn: u64) -> Option<String> {
     let merged = g.merged.as_ref().expect("merged set in Phase A");
+    let _z = profile::zone(Zone::Commit);
     guard_panic("commit_write", || {
         Ok(shared
             .disp()
-            .write_commit_group(g.tid, zone_lsn, merged, g.mode, &g.req_ids)
+            .write_commit_group(g.tid, zone_lsn, merged, g.mode, &g.req_ids, g.trace_id)
             .err())
     })
     .unwrap_or_else(Some)
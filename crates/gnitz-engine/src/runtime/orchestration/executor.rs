@@ -22,12 +22,16 @@ use crate::storage::batch_pool::PooledSendBuf;
 use rustc_hash::{FxHashMap, FxHashSet};
 
 use super::guard_panic;
+use crate::foundation::metrics::{self, Counter, Gauge, Hist};
 use crate::foundation::posix_io;
+use crate::foundation::profile::{self, Zone};
+use crate::foundation::trace::{self, Stage};
+use crate::query::{MemoryLine, RelationKind, ViewTickStats};
 use crate::runtime::tls::{ConnCountGuard, TlsShared};
 
 use crate::catalog::{
     CatalogEngine, FIRST_USER_TABLE_ID, IDXTAB_PAY_IS_UNIQUE, IDXTAB_PAY_OWNER_ID, IDXTAB_PAY_SOURCE_COLS, IDX_TAB_ID,
-    SEQ_TAB_ID, TABLE_TAB_ID, TRANSIENT_ID_BASE, TRANSIENT_ID_LIMIT, VIEW_TAB_ID,
+    SEQ_TAB_ID, TABLE_TAB_ID, TRANSIENT_ID_BASE, TRANSIENT_ID_LIMIT, VIEW_STATS_SCHEMA, VIEW_STATS_TAB_ID, VIEW_TAB_ID,
 };
 use crate::runtime::committer::{self, BarrierKind, CommitRequest, PendingTxn};
 use crate::runtime::lsn::ZoneLsnAllocator;
@@ -43,12 +47,17 @@ use crate::runtime::sal::{BACKFILL_DECISION_CONTINUE, BACKFILL_DECISION_STOP};
 use crate::runtime::wire::{
     self as ipc, SchemaWithVersion, FLAG_GET_INDICES, STATUS_ERROR, STATUS_NO_INDEX, STATUS_OK, STATUS_SCHEMA_MISMATCH,
 };
-use crate::schema::{index_meta_schema_desc, validate_schema_match, SchemaDescriptor, INDEX_META_COL_NAMES};
-use crate::storage::{Batch, BatchBuilder};
+use crate::schema::{
+    index_meta_schema_desc, memory_schema_desc, op_profile_schema_desc, stats_schema_desc, trace_span_schema_desc,
+    validate_schema_match, view_tick_schema_desc, zone_profile_schema_desc, SchemaDescriptor, INDEX_META_COL_NAMES,
+    MEMORY_COL_NAMES, OP_PROFILE_COL_NAMES, STATS_COL_NAMES, TRACE_SPAN_COL_NAMES, ZONE_PROFILE_COL_NAMES,
+};
+use crate::storage::{batch_pool, Batch, BatchBuilder};
 
 pub(crate) const TICK_COALESCE_ROWS: usize = 10_000;
 const TICK_DEADLINE_MS: u64 = 20;
 const WORKER_WATCH_MS: u64 = 100;
+const METRICS_SCRAPE_TIMEOUT_MS: u64 = 5_000;
 
 use gnitz_wire::{
     FLAG_ALLOCATE_INDEX_ID, FLAG_ALLOCATE_SCHEMA_ID, FLAG_ALLOCATE_TABLE_ID, FLAG_SEEK, FLAG_SEEK_BY_INDEX,
@@ -122,6 +131,11 @@ pub struct Shared {
     /// entry reads as `boot_seed`. Single-threaded reactor — a plain `RefCell`,
     /// and no borrow is ever held across an `.await`.
     table_commit_lsn: RefCell<FxHashMap<i64, u64>>,
+    /// `tid → snapshot LSN of the last tick that drove it`, set by `run_tick`.
+    /// A miss reads as `boot_seed`. Read only by the `VIEW_STATS_TAB` scan: a
+    /// view is behind while one of its base tables' `table_commit_lsn` is ahead
+    /// of this.
+    table_tick_lsn: RefCell<FxHashMap<i64, u64>>,
     /// The default for a `table_commit_lsn` miss (a table not written this boot),
     /// seeded to `max_table_current_lsn()` — the same value `lsn_alloc.published()`
     /// starts at, so `boot_seed == published()` at boot. Soundness of the miss
@@ -249,12 +263,14 @@ pub struct ServerExecutor;
 impl ServerExecutor {
     /// `tls` is the optional TLS listener bootstrap from `server_main`:
     /// the bound TCP listen fd, the rustls server configuration, and the
-    /// global live-connection cap.
+    /// global live-connection cap. `metrics_fd` is the optional bound
+    /// Prometheus scrape listener.
     pub fn run(
         catalog: *mut CatalogEngine,
         dispatcher: *mut MasterDispatcher,
         server_fd: i32,
         tls: Option<TlsListener>,
+        metrics_fd: Option<i32>,
     ) -> i32 {
         let reactor = match Reactor::new(256) {
             Ok(r) => Rc::new(r),
@@ -275,6 +291,9 @@ impl ServerExecutor {
         if let Some(tl) = &tls {
             reactor.attach_listener(tl.fd);
         }
+        if let Some(fd) = metrics_fd {
+            reactor.attach_listener(fd);
+        }
         // Reactor-thread live-TLS-connection counter, incremented by an RAII
         // guard stored in each session's `TlsShared` and decremented on its
         // drop. Single-threaded, so no atomics.
@@ -283,6 +302,7 @@ impl ServerExecutor {
             unix_fd: server_fd,
             tls,
             tls_conn_count,
+            metrics_fd,
         };
 
         let sal_writer_excl = Rc::new(AsyncMutex::new(()));
@@ -333,6 +353,7 @@ impl ServerExecutor {
             table_locks: RefCell::new(FxHashMap::default()),
             draining: Rc::clone(&draining),
             table_commit_lsn: RefCell::new(FxHashMap::default()),
+            table_tick_lsn: RefCell::new(FxHashMap::default()),
             boot_seed: initial_lsn,
             drive_rwlock: Rc::new(AsyncRwLock::new()),
             next_transient_id: Rc::new(Cell::new(TRANSIENT_ID_BASE)),
@@ -373,6 +394,7 @@ struct AcceptCtx {
     unix_fd: i32,
     tls: Option<TlsListener>,
     tls_conn_count: Rc<Cell<u32>>,
+    metrics_fd: Option<i32>,
 }
 
 async fn accept_loop(shared: Rc<Shared>, ctx: AcceptCtx) {
@@ -381,6 +403,10 @@ async fn accept_loop(shared: Rc<Shared>, ctx: AcceptCtx) {
         if fd < 0 {
             continue;
         }
+        if ctx.metrics_fd == Some(listener) {
+            shared.reactor.spawn(serve_metrics(Rc::clone(&shared), fd));
+            continue;
+        }
         if listener == ctx.unix_fd {
             shared.reactor.register_conn(fd);
             let peer = Peer::unix(fd, Rc::clone(&shared.reactor));
@@ -462,6 +488,8 @@ enum HelloOutcome {
 /// first recv is raced against the deadline; everything after HELLO uses a
 /// plain `peer.recv().await`.
 async fn connection_loop(peer: Peer, shared: Rc<Shared>, first_frame_deadline: Option<Instant>) {
+    metrics::inc(Counter::Connections);
+    let _open = metrics::hold(Gauge::OpenConnections);
     // No HELLO in time (`Either::B`) → `None`, funnelling into the single close
     // site below. `select2` drops the losing recv (clears its waker) and the
     // losing timer (cancels its SQE), so the happy path leaves no timer behind.
@@ -483,7 +511,10 @@ async fn connection_loop(peer: Peer, shared: Rc<Shared>, first_frame_deadline: O
 
     loop {
         let Some(buf) = peer.recv().await else { break };
+        let t0 = Instant::now();
         handle_message(&peer, buf.as_slice(), &shared).await;
+        metrics::inc(Counter::Requests);
+        metrics::record_since(Hist::RequestNs, t0);
     }
     peer.close();
 }
@@ -503,7 +534,7 @@ async fn run_hello_handshake(peer: &Peer, shared: &Rc<Shared>, data: &[u8]) -> H
         return HelloOutcome::Reject;
     }
 
-    let server_version = gnitz_wire::WAL_FORMAT_VERSION as u16;
+    let server_version = gnitz_wire::WIRE_PROTOCOL_VERSION;
     if hello.version != server_version {
         let msg = format!(
             "unsupported wire version: peer={}, server={}",
@@ -755,6 +786,7 @@ async fn run_tick(
     // while we wait for tick ACKs, and setting last_tick_lsn to that
     // higher value would report an LSN that this tick never processed.
     let snapshot_lsn = shared.lsn_alloc.published();
+    let t0 = Instant::now();
 
     emit_groups_await_acks(
         shared,
@@ -772,6 +804,12 @@ async fn run_tick(
     )
     .await?;
     shared.last_tick_lsn.set(snapshot_lsn);
+    shared
+        .table_tick_lsn
+        .borrow_mut()
+        .extend(tids.iter().map(|&tid| (tid, snapshot_lsn)));
+    metrics::inc(Counter::Ticks);
+    metrics::record_since(Hist::TickNs, t0);
     Ok(())
 }
 
@@ -927,6 +965,8 @@ async fn handle_message(peer: &Peer, data: &[u8], shared: &Rc<Shared>) {
             return;
         }
     };
+    let trace_id = ctrl.trace_id;
+    let _request = trace::span(trace_id, Stage::Request);
 
     // Decode the frame. Schema-less PUSH frames (warm-cache path) have
     // FLAG_HAS_DATA but not FLAG_HAS_SCHEMA; they need a catalog hint.
@@ -1024,6 +1064,26 @@ async fn handle_message(peer: &Peer, data: &[u8], shared: &Rc<Shared>) {
         return;
     }
 
+    // ---------- Server metrics / profiler / traces / EXPLAIN ANALYZE ----------
+    // Control-only. `target_id = 0` is answered master-locally from the shared
+    // metrics, profiler or trace region, as `seek_col_idx` selects (the memory
+    // report also collects every worker's); a view id
+    // collects that view's per-operator profile from the workers. Routed
+    // before the alloc block like the frames above.
+    if flags & gnitz_wire::FLAG_GET_STATS != 0 {
+        if target_id == 0 {
+            match decoded.control.seek_col_idx {
+                gnitz_wire::STATS_METRICS => handle_get_stats(shared, peer, client_id).await,
+                gnitz_wire::STATS_TRACES => handle_traces(peer, client_id).await,
+                gnitz_wire::STATS_MEMORY => handle_memory(shared, peer, client_id).await,
+                sel => handle_zone_profile(peer, client_id, sel).await,
+            }
+        } else {
+            handle_view_profile(shared, peer, client_id, target_id).await;
+        }
+        return;
+    }
+
     // ---------- SERIAL range reservation ----------
     // Carries `target_id = seq_id (= table_id) ≠ 0` and the range `count` in
     // `seek_col_idx`, so it precedes the `target_id == 0` catalog-id block.
@@ -1181,6 +1241,15 @@ async fn handle_message(peer: &Peer, data: &[u8], shared: &Rc<Shared>) {
             _tlocks.push(shared.table_lock(tid).lock().await);
         }
 
+        // An append-only table takes insertions of new keys only.
+        let mode = match shared.cat().append_only_push_mode(target_id, &batch, mode) {
+            Ok(mode) => mode,
+            Err(e) => {
+                send_error(peer, target_id, client_id, e.as_bytes()).await;
+                return;
+            }
+        };
+
         // Local (catalog-resident) unique-index validation. Wrapped per V.4
         // so a malformed batch can't crash the server.
         let cat_ptr_raw = shared.catalog;
@@ -1220,8 +1289,11 @@ async fn handle_message(peer: &Peer, data: &[u8], shared: &Rc<Shared>) {
             batch,
             mode,
             done: tx,
+            trace_id,
+            queued_ns: if trace_id != 0 { trace::now_ns() } else { 0 },
         });
         let commit_result = rx.await;
+        let _reply = trace::span(trace_id, Stage::Reply);
         match commit_result {
             Ok(Ok(lsn)) => {
                 // Record the commit LSN for OCC while the table lock is still
@@ -1417,11 +1489,11 @@ async fn push_txn_body(shared: &Rc<Shared>, data: &[u8]) -> Result<PushTxnOutcom
         if batch.count == 0 {
             return Err(format!("TXN: empty batch for table {tid}"));
         }
-        families.push(TxnFamily {
-            tid,
-            mode: ipc::WireConflictMode::from_u8(fam.mode),
-            batch,
-        });
+        // Same append-only gate as the plain-push arm.
+        let mode = shared
+            .cat()
+            .append_only_push_mode(tid, &batch, ipc::WireConflictMode::from_u8(fam.mode))?;
+        families.push(TxnFamily { tid, mode, batch });
     }
     // Capture the family tids BEFORE `families` is moved into the commit request,
     // for the precondition-membership check and the post-commit map bump.
@@ -1508,6 +1580,7 @@ fn decode_client_wire(
     ctrl: ipc::DecodedControl,
     hint: Option<SchemaWithVersion<'_>>,
 ) -> Result<ipc::DecodedWire, &'static str> {
+    let _z = profile::zone(Zone::ClientIo);
     let mut decoded = ipc::decode_wire_with_ctrl(data, ctrl, hint)?;
     if let Some(b) = decoded.data_batch.as_mut() {
         b.downgrade();
@@ -1518,6 +1591,7 @@ fn decode_client_wire(
 /// `decode_client_wire`'s sibling for a raw WAL-block family batch inside a
 /// client FLAG_DDL_TXN bundle: decode + neutralize the layout claim.
 fn decode_client_batch(slice: &[u8], schema: &SchemaDescriptor) -> Result<Batch, &'static str> {
+    let _z = profile::zone(Zone::ClientIo);
     let (mut b, _) = Batch::decode_from_wal_block(slice, schema, false)?;
     b.downgrade();
     Ok(b)
@@ -1757,6 +1831,361 @@ async fn handle_get_indices(shared: &Rc<Shared>, peer: &Peer, client_id: u64, ta
     peer.send_buffer_or_close(buf).await;
 }
 
+/// Every process's metrics, after refreshing the master gauges that are cheaper
+/// to read at report time than to maintain on the hot path.
+fn stats_snapshot(shared: &Shared) -> Vec<metrics::Sample> {
+    metrics::gauge_set(Gauge::SalUsedBytes, shared.disp().sal_used_bytes() as i64);
+    let lag = shared.lsn_alloc.published().saturating_sub(shared.last_tick_lsn.get());
+    metrics::gauge_set(Gauge::ViewLagLsn, lag as i64);
+    metrics::gauge_set(Gauge::ProfilerRunning, profile::running() as i64);
+    metrics::snapshot()
+}
+
+/// GET_STATS: one row per metric and process (see `stats_schema_desc`),
+/// shipped with its own schema block like GET_INDICES.
+async fn handle_get_stats(shared: &Rc<Shared>, peer: &Peer, client_id: u64) {
+    let desc = stats_schema_desc();
+    let schema_block = ipc::build_schema_wire_block(&desc, &STATS_COL_NAMES[..], 0, 0);
+    let mut bb = BatchBuilder::new(desc);
+    for (seq, s) in stats_snapshot(shared).iter().enumerate() {
+        bb.begin_row(seq as u128, 1);
+        bb.put_string(s.name);
+        bb.put_string(&s.process);
+        bb.put_u64(s.kind as u64);
+        bb.put_u64(s.value as u64);
+        for v in [s.sum, s.p50, s.p90, s.p99, s.max] {
+            bb.put_u64(v);
+        }
+        bb.end_row();
+    }
+    let batch = bb.finish();
+    let result = if batch.count > 0 { Some(&batch) } else { None };
+    let buf = encode_response_buffer(
+        0,
+        client_id,
+        result,
+        STATUS_OK,
+        b"",
+        Some(schema_block.as_slice()),
+        0,
+        0,
+    );
+    peer.send_buffer_or_close(buf).await;
+}
+
+/// GET_STATS with a profiler selector: start (clear and switch on) or stop
+/// the CPU-zone profiler in every process, then reply with what it holds, one
+/// folded stack per row (see `zone_profile_schema_desc`).
+async fn handle_zone_profile(peer: &Peer, client_id: u64, selector: u64) {
+    match selector {
+        gnitz_wire::STATS_PROFILE_START => profile::start(),
+        gnitz_wire::STATS_PROFILE_STOP => profile::stop(),
+        gnitz_wire::STATS_PROFILE_DUMP => {}
+        _ => {
+            let msg = format!("GET_STATS: unknown selector {selector}");
+            send_error(peer, 0, client_id, msg.as_bytes()).await;
+            return;
+        }
+    }
+    let desc = zone_profile_schema_desc();
+    let schema_block = ipc::build_schema_wire_block(&desc, &ZONE_PROFILE_COL_NAMES[..], 0, 0);
+    let mut bb = BatchBuilder::new(desc);
+    for (seq, f) in profile::snapshot().iter().enumerate() {
+        bb.begin_row(seq as u128, 1);
+        bb.put_string(&f.process);
+        bb.put_string(&f.stack);
+        bb.put_u64(f.cpu_ns);
+        bb.put_u64(f.calls);
+        bb.end_row();
+    }
+    let batch = bb.finish();
+    let result = if batch.count > 0 { Some(&batch) } else { None };
+    let buf = encode_response_buffer(
+        0,
+        client_id,
+        result,
+        STATUS_OK,
+        b"",
+        Some(schema_block.as_slice()),
+        0,
+        0,
+    );
+    peer.send_buffer_or_close(buf).await;
+}
+
+/// GET_STATS with the trace selector: every span the processes' trace rings
+/// still hold, one per row (see `trace_span_schema_desc`).
+async fn handle_traces(peer: &Peer, client_id: u64) {
+    let desc = trace_span_schema_desc();
+    let schema_block = ipc::build_schema_wire_block(&desc, &TRACE_SPAN_COL_NAMES[..], 0, 0);
+    let mut bb = BatchBuilder::new(desc);
+    for (seq, s) in trace::snapshot().iter().enumerate() {
+        bb.begin_row(seq as u128, 1);
+        bb.put_u64(s.trace_id);
+        bb.put_string(&s.process);
+        bb.put_string(s.stage);
+        bb.put_u64(s.start_ns);
+        bb.put_u64(s.dur_ns);
+        bb.end_row();
+    }
+    let batch = bb.finish();
+    let result = if batch.count > 0 { Some(&batch) } else { None };
+    let buf = encode_response_buffer(
+        0,
+        client_id,
+        result,
+        STATUS_OK,
+        b"",
+        Some(schema_block.as_slice()),
+        0,
+        0,
+    );
+    peer.send_buffer_or_close(buf).await;
+}
+
+/// GET_STATS with the memory selector: the master's heap attribution — its
+/// catalog stores, unique-filter caches and batch-buffer pool — followed by
+/// every worker's (see `memory_schema_desc`).
+async fn handle_memory(shared: &Rc<Shared>, peer: &Peer, client_id: u64) {
+    let _g = shared.catalog_rwlock.read().await;
+    let workers = match MasterDispatcher::collect_worker_stats_async(
+        shared.dispatcher,
+        &shared.reactor,
+        &shared.sal_writer_excl,
+        0,
+        memory_schema_desc(),
+        gnitz_wire::STATS_MEMORY,
+    )
+    .await
+    {
+        Ok(b) => b,
+        Err(e) => {
+            send_error(peer, 0, client_id, e.as_bytes()).await;
+            return;
+        }
+    };
+    let mut lines = shared.cat().dag.memory_usage();
+    for (table_id, bytes) in shared.disp().unique_filter_memory() {
+        lines.push(MemoryLine {
+            relation_id: table_id,
+            component: "unique_filter",
+            pc: 0,
+            op: "",
+            bytes: bytes as u64,
+        });
+    }
+    lines.push(MemoryLine {
+        relation_id: 0,
+        component: "batch_pool",
+        pc: 0,
+        op: "",
+        bytes: batch_pool::pooled_bytes() as u64,
+    });
+
+    let desc = memory_schema_desc();
+    let schema_block = ipc::build_schema_wire_block(&desc, &MEMORY_COL_NAMES[..], 0, 0);
+    let mut bb = BatchBuilder::new(desc);
+    for (seq, l) in lines.iter().filter(|l| l.bytes > 0).enumerate() {
+        bb.begin_row(seq as u128, 1);
+        bb.put_string("master");
+        bb.put_u64(l.relation_id as u64);
+        bb.put_string(l.component);
+        bb.put_u64(l.pc as u64);
+        bb.put_string(l.op);
+        bb.put_u64(l.bytes);
+        bb.end_row();
+    }
+    let mut batch = bb.finish();
+    batch.append_mem_batch(&workers.as_mem_batch());
+    let result = if batch.count > 0 { Some(&batch) } else { None };
+    let buf = encode_response_buffer(
+        0,
+        client_id,
+        result,
+        STATUS_OK,
+        b"",
+        Some(schema_block.as_slice()),
+        0,
+        0,
+    );
+    peer.send_buffer_or_close(buf).await;
+}
+
+/// GET_STATS on a view (`EXPLAIN ANALYZE VIEW`): every worker's cumulative
+/// per-operator counters for the view's plan, one row per operator per worker
+/// (see `op_profile_schema_desc`), counted while the profiler ran. Pending
+/// ticks are drained first so the profile covers every write committed so far.
+async fn handle_view_profile(shared: &Rc<Shared>, peer: &Peer, client_id: u64, view_id: i64) {
+    let Some(_g) = drain_then_lock(shared, peer, client_id, view_id).await else {
+        return;
+    };
+    let is_view = shared
+        .cat()
+        .dag
+        .tables
+        .get(&view_id)
+        .is_some_and(|e| e.kind == RelationKind::View);
+    if !is_view {
+        let msg = format!("EXPLAIN ANALYZE: relation {view_id} is not a view");
+        send_error(peer, view_id, client_id, msg.as_bytes()).await;
+        return;
+    }
+    let result = MasterDispatcher::collect_worker_stats_async(
+        shared.dispatcher,
+        &shared.reactor,
+        &shared.sal_writer_excl,
+        view_id,
+        op_profile_schema_desc(),
+        0,
+    )
+    .await;
+    match result {
+        Ok(batch) => {
+            let desc = op_profile_schema_desc();
+            let schema_block = ipc::build_schema_wire_block(&desc, &OP_PROFILE_COL_NAMES[..], 0, 0);
+            let data = if batch.count > 0 { Some(&batch) } else { None };
+            let buf = encode_response_buffer(
+                view_id,
+                client_id,
+                data,
+                STATUS_OK,
+                b"",
+                Some(schema_block.as_slice()),
+                0,
+                0,
+            );
+            peer.send_buffer_or_close(buf).await;
+        }
+        Err(e) => send_error(peer, view_id, client_id, e.as_bytes()).await,
+    }
+}
+
+/// A scan of `VIEW_STATS_TAB`: one row per view, joining the master's LSN
+/// bookkeeping with every worker's tick counters. Deliberately does NOT drain
+/// pending ticks — the lag it reports is the lag a reader would otherwise see.
+///
+/// A view's `applied_lsn` is `last_tick_lsn` when none of its base tables has
+/// a commit newer than the last tick that drove it; otherwise it is the oldest
+/// such tick, and `lag_lsn` is how far the published LSN has run past it.
+async fn handle_view_stats(shared: &Rc<Shared>, peer: &Peer, client_id: u64) {
+    let target_id = VIEW_STATS_TAB_ID;
+    let _g = shared.catalog_rwlock.read().await;
+    let workers = match MasterDispatcher::collect_worker_stats_async(
+        shared.dispatcher,
+        &shared.reactor,
+        &shared.sal_writer_excl,
+        target_id,
+        view_tick_schema_desc(),
+        0,
+    )
+    .await
+    {
+        Ok(b) => b,
+        Err(e) => {
+            send_error(peer, target_id, client_id, e.as_bytes()).await;
+            return;
+        }
+    };
+    // Workers step every view in lockstep, so `ticks` agrees across them; the
+    // slowest worker bounds the tick, and emitted rows add up.
+    let mut ticks: FxHashMap<i64, ViewTickStats> = FxHashMap::default();
+    for i in 0..workers.count {
+        let w = ViewTickStats {
+            ticks: workers.read_payload_u64(i, 0),
+            last_tick_ns: workers.read_payload_u64(i, 1),
+            last_rows: workers.read_payload_u64(i, 2),
+            total_rows: workers.read_payload_u64(i, 3),
+        };
+        let t = ticks.entry(workers.get_pk(i) as i64).or_default();
+        t.ticks = t.ticks.max(w.ticks);
+        t.last_tick_ns = t.last_tick_ns.max(w.last_tick_ns);
+        t.last_rows += w.last_rows;
+        t.total_rows += w.total_rows;
+    }
+
+    let published = shared.lsn_alloc.published();
+    let last_tick = shared.last_tick_lsn.get();
+    let cat = shared.cat();
+    let mut views: Vec<i64> = cat
+        .dag
+        .tables
+        .iter()
+        .filter(|(_, e)| e.kind == RelationKind::View)
+        .map(|(&vid, _)| vid)
+        .collect();
+    views.sort_unstable();
+    let mut bb = BatchBuilder::new(VIEW_STATS_SCHEMA);
+    {
+        let commits = shared.table_commit_lsn.borrow();
+        let ticked = shared.table_tick_lsn.borrow();
+        for vid in views {
+            let applied = cat
+                .dag
+                .base_tables_reachable_from(vec![vid])
+                .into_iter()
+                .filter_map(|b| {
+                    let tick = ticked.get(&b).copied().unwrap_or(shared.boot_seed);
+                    let commit = commits.get(&b).copied().unwrap_or(shared.boot_seed);
+                    (commit > tick).then_some(tick)
+                })
+                .min();
+            let t = ticks.get(&vid).copied().unwrap_or_default();
+            bb.begin_row(vid as u64 as u128, 1);
+            bb.put_u64(applied.unwrap_or(last_tick));
+            bb.put_u64(applied.map_or(0, |a| published.saturating_sub(a)));
+            for v in [t.ticks, t.last_tick_ns, t.last_rows, t.total_rows] {
+                bb.put_u64(v);
+            }
+            bb.end_row();
+        }
+    }
+    let batch = bb.finish();
+    let names: Vec<&[u8]> = gnitz_wire::VIEW_STATS_TAB_COLS
+        .iter()
+        .map(|c| c.name.as_bytes())
+        .collect();
+    let schema_block = ipc::build_schema_wire_block(&VIEW_STATS_SCHEMA, &names, 0, target_id as u32);
+    let buf = encode_response_buffer(
+        target_id,
+        client_id,
+        if batch.count > 0 { Some(&batch) } else { None },
+        STATUS_OK,
+        b"",
+        Some(schema_block.as_slice()),
+        last_tick as u128,
+        ipc::wire_flags_set_schema_version(0, 1),
+    );
+    peer.send_buffer_or_close(buf).await;
+}
+
+/// Answer one scrape on the `--metrics-listen` socket: read the request head
+/// (every path gets the exposition), write an HTTP/1.0 response, close. A
+/// client that sends nothing within `METRICS_SCRAPE_TIMEOUT_MS` is dropped.
+async fn serve_metrics(shared: Rc<Shared>, fd: i32) {
+    let deadline = Instant::now() + Duration::from_millis(METRICS_SCRAPE_TIMEOUT_MS);
+    let got = match select2(
+        shared.reactor.recv_raw(fd, vec![0u8; 4096]),
+        shared.reactor.timer(deadline),
+    )
+    .await
+    {
+        Either::A((_, n)) => n > 0,
+        Either::B(()) => false,
+    };
+    if got {
+        let body = metrics::render_prometheus(&stats_snapshot(&shared));
+        let resp = format!(
+            "HTTP/1.0 200 OK\r\nContent-Type: text/plain; version=0.0.4\r\nContent-Length: {}\r\n\
+             Connection: close\r\n\r\n{body}",
+            body.len()
+        );
+        shared.reactor.send_raw(fd, Rc::new(resp.into_bytes())).await;
+    }
+    // SAFETY: accepted fd we own, never registered with the reactor; the
+    // dropped recv (if any) holds its own file reference until cancelled.
+    unsafe { libc::close(fd) };
+}
+
 /// Drain every pending view tick before a read, returning with NO catalog lock
 /// held. Views derive from source-table pushes through the DAG (IV.2), so a read
 /// must first flush any in-flight auto-tick.
@@ -2046,6 +2475,11 @@ async fn handle_system_scan(
         return;
     }
 
+    if target_id == VIEW_STATS_TAB_ID {
+        handle_view_stats(shared, peer, client_id).await;
+        return;
+    }
+
     // Empty SCAN for system tables — no DDL, no lock needed.
     let _g = shared.catalog_rwlock.read().await;
     let cat_ptr = shared.catalog;
@@ -2676,6 +3110,7 @@ fn encode_response_buffer(
     seek_pk: u128,
     flags: u64,
 ) -> PooledSendBuf {
+    let _z = profile::zone(Zone::ClientIo);
     let sz = ipc::wire_size(status, error_msg, None, None, result, prebuilt_schema, &[]);
     let total = 4 + sz;
     let mut inner = crate::storage::batch_pool::acquire_buf();
@@ -145,6 +145,7 @@ impl MasterDispatcher {
             client_id,
             prebuilt_schema_block,
             seek_pk_extra,
+            0,
         )
     }
 
@@ -180,6 +181,36 @@ impl MasterDispatcher {
         )
     }
 
+    /// Write one GET_STATS-flagged scan group for `target_id`, carrying
+    /// `expected` — the reply schema — as its schema block and `selector` in
+    /// `seek_col_idx`. Unlike `write_one_scan_group` it never consults the
+    /// catalog: `VIEW_STATS_TAB` and the target-0 reports have no `dag.tables`
+    /// entry to take a schema from.
+    pub(super) fn write_stats_group(
+        &mut self,
+        target_id: i64,
+        expected: &SchemaDescriptor,
+        selector: u64,
+        req_ids: &[u64],
+        unicast_worker: i32,
+    ) -> Result<(), String> {
+        self.write_group_with_req_ids(
+            target_id,
+            0,
+            gnitz_wire::FLAG_GET_STATS,
+            &[],
+            expected,
+            &[],
+            0,
+            selector,
+            req_ids,
+            unicast_worker,
+            0,
+            None,
+            &[],
+        )
+    }
+
     /// Encode batch once directly into SAL mmap, replicate to all workers.
     /// `lsn` is supplied by the caller: a DDL zone LSN (`broadcast_ddl`), the
     /// checkpoint generation (FlushEph round), or 0 for command-only groups.
@@ -487,6 +518,11 @@ impl MasterDispatcher {
         false
     }
 
+    /// Bytes of the SAL written since the last checkpoint reset.
+    pub(crate) fn sal_used_bytes(&self) -> u64 {
+        self.sal.cursor()
+    }
+
     /// Raw SAL relay-space threshold: at least 1/8 of the mmap still free.
     /// Seam-free — the boot backfill relay checks this directly because it
     /// must keep failing-on-low-space without observing the relay_loop test
@@ -1181,6 +1217,34 @@ impl MasterDispatcher {
         forward_scan_slots(reactor, peer, slots, req_ids, unicast).await
     }
 
+    /// Fan a GET_STATS-flagged scan group for `target_id` out to every worker
+    /// and concatenate their counter replies under `expected` — a view's
+    /// operator profile (`op_profile_schema_desc`, EXPLAIN ANALYZE), for
+    /// `VIEW_STATS_TAB` every view's tick counters (`view_tick_schema_desc`),
+    /// or for `target_id` 0 the report `selector` names (`STATS_MEMORY`).
+    /// Nothing is summed here. Broadcast even for a replicated view: each worker
+    /// runs its own copy of the circuit and reports its own timings.
+    pub(crate) async fn collect_worker_stats_async(
+        disp_ptr: *mut MasterDispatcher,
+        reactor: &crate::runtime::reactor::Reactor,
+        sal_excl: &Rc<AsyncMutex<()>>,
+        target_id: i64,
+        expected: SchemaDescriptor,
+        selector: u64,
+    ) -> Result<Batch, String> {
+        let (slots, req_ids, _lease) = dispatch_scan_fanout(disp_ptr, reactor, sal_excl, -1, |disp, rids, unicast| {
+            disp.write_stats_group(target_id, &expected, selector, rids, unicast)
+        })
+        .await?;
+        let mut out = Batch::with_schema(expected, 0);
+        drain_index_scan(slots, &req_ids, reactor, "worker stats", &expected, |mb, _| {
+            out.append_mem_batch(mb);
+            Ok(())
+        })
+        .await?;
+        Ok(out)
+    }
+
     /// Broadcast a DDL batch to every worker. `lsn` is the caller's zone
     /// LSN — one LSN across all broadcasts of a DDL so recovery can group
     /// them as an atomic zone.
@@ -1431,7 +1495,8 @@ impl MasterDispatcher {
     /// Commit N push batches as a single SAL group write. Called from
     /// the committer task. Returns (groups, req_ids, fsync_id) — the
     /// caller awaits fsync + per-worker req_ids separately so they can
-    /// `join!` them. `lsn` is supplied by the caller.
+    /// `join!` them. `lsn` is supplied by the caller; `trace_id` is the trace
+    /// context the workers record their apply under (0 = untraced).
     pub(crate) fn write_commit_group(
         &mut self,
         target_id: i64,
@@ -1439,6 +1504,7 @@ impl MasterDispatcher {
         batch: &Batch,
         mode: WireConflictMode,
         req_ids: &[u64],
+        trace_id: u64,
     ) -> Result<(), String> {
         let (schema, schema_block, wire_safe, wire_row_stride) = self.cached_schema_block(target_id);
         let nw = self.num_workers;
@@ -1461,6 +1527,7 @@ impl MasterDispatcher {
                 req_ids,
                 Some(schema_block.as_slice()),
                 Some((wire_safe, wire_row_stride)),
+                trace_id,
             )
         };
         if schema.replicated() {
@@ -1485,8 +1552,23 @@ impl MasterDispatcher {
         // One "slot" per worker with empty batch — each worker replies
         // after flushing its system tables and advancing its epoch.
         let refs: Vec<Option<&Batch>> = (0..self.num_workers).map(|_| None).collect();
-        self.sal
-            .write_group_direct(0, lsn, flags, 0, &refs, &schema, None, 0, 0, req_ids, -1, 0, None, &[])
+        self.sal.write_group_direct(
+            0,
+            lsn,
+            flags,
+            0,
+            &refs,
+            &schema,
+            None,
+            0,
+            0,
+            req_ids,
+            -1,
+            0,
+            None,
+            &[],
+            0,
+        )
     }
 
     /// Post-ACK checkpoint cleanup: flush system tables before resetting
@@ -1891,3 +1973,35 @@ mod checkpoint_finalize_tests {
         let _ = std::fs::remove_dir_all(&dir);
     }
 }
+
+#[cfg(test)]
+mod stats_group_tests {
+    use super::*;
+    use crate::catalog::VIEW_STATS_TAB_ID;
+    use crate::runtime::sal::{sal_read_group_header, SalWriter};
+    use crate::runtime::w2m::W2mReceiver;
+    use crate::test_support::SharedRegion;
+
+    /// A `VIEW_STATS_TAB` stats group is written with a null catalog — the
+    /// relation has no schema there, so a catalog lookup would panic — and
+    /// decodes on the worker side as a GET_STATS scan carrying the reply schema.
+    #[test]
+    fn view_stats_group_needs_no_catalog_schema() {
+        const SIZE: usize = 1 << 16;
+        let region = SharedRegion::new(SIZE);
+        let mut sal = SalWriter::new(region.ptr(), -1, SIZE as u64, vec![-1]);
+        sal.reset(0, 1);
+        let mut disp = MasterDispatcher::new(1, vec![0], std::ptr::null_mut(), sal, W2mReceiver::new(Vec::new()));
+        let expected = crate::schema::view_tick_schema_desc();
+        disp.write_stats_group(VIEW_STATS_TAB_ID, &expected, 0, &[42], -1)
+            .unwrap();
+
+        let msg = unsafe { sal_read_group_header(region.ptr(), 0, 0, None) }.expect("group written");
+        assert_eq!(msg.target_id as i64, VIEW_STATS_TAB_ID);
+        let data = unsafe { std::slice::from_raw_parts(msg.data_ptr, msg.data_size as usize) };
+        let wire = crate::runtime::wire::decode_wire(data).unwrap();
+        assert_ne!(wire.control.flags & gnitz_wire::FLAG_GET_STATS, 0);
+        assert_eq!(wire.control.request_id, 42);
+        assert_eq!(wire.schema.map(|s| s.num_columns()), Some(expected.num_columns()));
+    }
+}
@@ -2262,6 +2262,7 @@ impl MasterDispatcher {
                                     req_slice,
                                     None,
                                     None,
+                                    0,
                                 )
                             })?;
                         }
@@ -2370,6 +2371,7 @@ impl MasterDispatcher {
                     rids,
                     None,
                     None,
+                    0,
                 )
             })?;
             // The scatter batch is fully consumed by the synchronous
@@ -50,6 +50,20 @@ use super::preflight::{build_check_batch, build_check_batch_pkbuf, format_pk_val
 /// cases — one key type, one code path.
 pub(super) const UNIQUE_FILTER_CAP: usize = 1_000_000;
 
+/// Master-wide soft limit on filter memory from `GNITZ_UNIQUE_FILTER_BYTES`;
+/// missing, unparsable or zero means no limit. Over it, the largest warm
+/// filters are dropped after a commit's ingest and re-warm on their next use
+/// (`unique_filter_enforce_budget`).
+fn budget_bytes() -> usize {
+    static BUDGET: std::sync::OnceLock<usize> = std::sync::OnceLock::new();
+    *BUDGET.get_or_init(|| {
+        std::env::var("GNITZ_UNIQUE_FILTER_BYTES")
+            .ok()
+            .and_then(|s| s.parse::<usize>().ok())
+            .unwrap_or(0)
+    })
+}
+
 pub(super) struct UniqueFilter {
     /// The OPK leading-key spans known present in the index. A `PkBuf` holds the
     /// full composite span at any width, so a `UNIQUE (a, b)` whose span exceeds
@@ -85,6 +99,12 @@ impl UniqueFilter {
         }
     }
 
+    /// Estimated heap bytes of `values`: one `PkBuf` slot plus one control
+    /// byte per allocated bucket.
+    pub(super) fn heap_bytes(&self) -> usize {
+        self.values.capacity() * (std::mem::size_of::<PkBuf>() + 1)
+    }
+
     /// On overflow the set is cleared WHOLE, never truncated: a partial set
     /// would prove "absent" for a present key — a uniqueness hole.
     pub(super) fn insert(&mut self, key: PkBuf) {
@@ -231,6 +251,52 @@ impl MasterDispatcher {
             }
             extract_into_filter(filter, &mb, &d.spec);
         }
+        self.unique_filter_enforce_budget(budget_bytes());
+    }
+
+    /// Estimated filter heap bytes per table, by table id.
+    pub(crate) fn unique_filter_memory(&self) -> Vec<(i64, usize)> {
+        let mut per_table: FxHashMap<i64, usize> = FxHashMap::default();
+        for (&(table_id, _), f) in &self.unique_filters {
+            *per_table.entry(table_id).or_default() += f.heap_bytes();
+        }
+        let mut out: Vec<(i64, usize)> = per_table.into_iter().collect();
+        out.sort_unstable();
+        out
+    }
+
+    /// Drop the largest warm filters until the total fits `budget` (0 = no
+    /// limit). Dropping is always safe — a missing filter falls through to the
+    /// broadcast and re-warms lazily — but only warm ones go: a cold filter
+    /// belongs to a warmup in flight, whose scan would then finish into nothing.
+    pub(super) fn unique_filter_enforce_budget(&mut self, budget: usize) {
+        if budget == 0 {
+            return;
+        }
+        let mut total: usize = self.unique_filters.values().map(UniqueFilter::heap_bytes).sum();
+        if total <= budget {
+            return;
+        }
+        let mut warm: Vec<((i64, u64), usize)> = self
+            .unique_filters
+            .iter()
+            .filter(|(_, f)| f.warm && f.heap_bytes() > 0)
+            .map(|(&k, f)| (k, f.heap_bytes()))
+            .collect();
+        warm.sort_unstable_by_key(|&(k, bytes)| (std::cmp::Reverse(bytes), k));
+        for (key, bytes) in warm {
+            if total <= budget {
+                break;
+            }
+            self.unique_filters.remove(&key);
+            total -= bytes;
+            gnitz_debug!(
+                "unique filter ({}, {:#x}) evicted: {} bytes over budget",
+                key.0,
+                key.1,
+                bytes
+            );
+        }
     }
 
     /// Drop every filter entry for `table_id`. Called on flush errors
@@ -661,6 +727,34 @@ mod unique_filter_tests {
         assert!(!disp.unique_filter_all_absent(7, 0, &[span_u64(12345)]));
     }
 
+    /// Over budget, the largest warm filters go first and cold ones stay —
+    /// and an evicted filter only loses the shortcut, never proves absence.
+    #[test]
+    fn enforce_budget_evicts_largest_warm_filters() {
+        let mut disp = filter_dispatcher();
+        let keys = |n: u64| (0..n).map(span_u64).collect::<FxHashSet<PkBuf>>();
+        disp.unique_filter_seed(1, 0, keys(10), false);
+        disp.unique_filter_seed(2, 0, keys(1000), false);
+        let mut cold = UniqueFilter::new();
+        cold.values = keys(2000);
+        disp.unique_filters.insert((3, 0), cold);
+        let small = disp.unique_filters[&(1, 0)].heap_bytes();
+        let cold_bytes = disp.unique_filters[&(3, 0)].heap_bytes();
+
+        disp.unique_filter_enforce_budget(0);
+        assert_eq!(disp.unique_filters.len(), 3, "budget 0 is no limit");
+
+        disp.unique_filter_enforce_budget(small + cold_bytes);
+        assert!(
+            !disp.unique_filters.contains_key(&(2, 0)),
+            "largest warm filter evicted"
+        );
+        assert!(disp.unique_filters.contains_key(&(1, 0)));
+        assert!(disp.unique_filters.contains_key(&(3, 0)), "cold filter kept");
+        assert!(!disp.unique_filter_all_absent(2, 0, &[span_u64(5000)]));
+        assert_eq!(disp.unique_filter_memory(), vec![(1, small), (3, cold_bytes)],);
+    }
+
     // -- drain_index_scan unit tests ------------------------------------------
     //
     // Synthetic-train pattern: anonymous-mmap W2M rings (no fork), frames
@@ -8,16 +8,19 @@ use std::collections::{HashMap, VecDeque};
 use std::os::fd::{AsRawFd, OwnedFd};
 use std::rc::Rc;
 
-use crate::catalog::{CatalogEngine, FIRST_USER_TABLE_ID};
-use crate::query::ExchangeCallback;
+use crate::catalog::{CatalogEngine, FIRST_USER_TABLE_ID, VIEW_STATS_TAB_ID};
+use crate::foundation::metrics::{self, Counter, Hist};
+use crate::foundation::profile::{self, Zone};
+use crate::foundation::trace::{self, Stage};
+use crate::query::{ExchangeCallback, MemoryLine};
 use crate::runtime::sal::{
     SalMessageKind, SalReader, BACKFILL_DECISION_CHECKPOINT, BACKFILL_DECISION_STOP, BACKFILL_PAD_BIT, FLAG_EXCHANGE,
 };
 use crate::runtime::w2m::W2mWriter;
 use crate::runtime::w2m_ring;
 use crate::runtime::wire::{self as ipc, FLAG_CONTINUATION, FLAG_SCAN_LAST, STATUS_ERROR, STATUS_OK};
-use crate::schema::SchemaDescriptor;
-use crate::storage::{schema_wire_safe, Batch};
+use crate::schema::{memory_schema_desc, op_profile_schema_desc, view_tick_schema_desc, SchemaDescriptor};
+use crate::storage::{schema_wire_safe, Batch, BatchBuilder};
 use crate::storage::{BlobCacheGuard, FlushOutcome, FlushWork, PkBuf, StorageError, Table};
 
 // ---------------------------------------------------------------------------
@@ -209,6 +212,7 @@ struct WorkerExchangeCtx<'a> {
 
 impl<'a> ExchangeCallback for WorkerExchangeCtx<'a> {
     fn do_exchange(&mut self, view_id: i64, batch: &Batch, source_id: i64) -> Batch {
+        let _z = profile::zone(Zone::Exchange);
         self.worker
             .do_exchange_wait(view_id, batch, source_id, self.tick_request_id)
     }
@@ -817,6 +821,7 @@ impl WorkerProcess {
         let seek_col_idx = decoded.as_ref().map(|d| d.control.seek_col_idx).unwrap_or(0);
         let client_id = decoded.as_ref().map(|d| d.control.client_id).unwrap_or(0);
         let ctrl_wire_flags = decoded.as_ref().map(|d| d.control.flags).unwrap_or(0);
+        let trace_id = decoded.as_ref().map(|d| d.control.trace_id).unwrap_or(0);
         let client_version = gnitz_wire::wire_flags_get_schema_version(ctrl_wire_flags);
         // Wide-PK seek key tail (bytes 16..stride); empty for narrow PKs. Taken
         // (not cloned) — nothing reads the control block after this point — and
@@ -957,9 +962,14 @@ impl WorkerProcess {
             }
 
             SalMessageKind::Push => {
-                if let Some(batch) = batch {
-                    if batch.count > 0 {
-                        self.handle_push(target_id, batch, request_id)?;
+                // The span closes before the ACK, so it is recorded by the
+                // time the master can reply to a traced client.
+                {
+                    let _apply = trace::span_on(trace_id, target_id as u64, Stage::WorkerApply);
+                    if let Some(batch) = batch {
+                        if batch.count > 0 {
+                            self.handle_push(target_id, batch, request_id)?;
+                        }
                     }
                 }
                 self.send_ack(target_id as u64, request_id);
@@ -1042,6 +1052,31 @@ impl WorkerProcess {
                 Ok(())
             }
 
+            // EXPLAIN ANALYZE, the VIEW_STATS_TAB scan and the memory report
+            // ride a Scan group flagged GET_STATS: this worker's counters, not
+            // relation rows — every view's tick counters, its heap attribution
+            // (`target_id` 0), or view `target_id`'s operator profile.
+            SalMessageKind::Scan if ctrl_wire_flags & gnitz_wire::FLAG_GET_STATS != 0 => {
+                let (schema, result) = if target_id == VIEW_STATS_TAB_ID {
+                    let schema = view_tick_schema_desc();
+                    (schema, self.view_tick_batch(schema))
+                } else if target_id == 0 && seek_col_idx == gnitz_wire::STATS_MEMORY {
+                    let schema = memory_schema_desc();
+                    (schema, self.memory_batch(schema))
+                } else {
+                    let schema = op_profile_schema_desc();
+                    (schema, self.view_profile_batch(target_id, schema))
+                };
+                self.stream_batch_response(
+                    target_id as u64,
+                    Some(result),
+                    ReplySchema::OneOff(&schema),
+                    request_id,
+                    client_id,
+                    0,
+                )
+            }
+
             SalMessageKind::Scan => {
                 let (result, schema) = self.cat().scan_family(target_id)?;
                 // A multi-scan group carries FLAG_SCAN_FIFO_REPLY in its control
@@ -1110,9 +1145,14 @@ impl WorkerProcess {
                 self.worker_id, target_id
             ));
         }
-        let effective = self.cat().ingest_returning_effective(target_id, batch)?;
+        let effective = {
+            let _z = profile::zone(Zone::Apply);
+            self.cat().ingest_returning_effective(target_id, batch)?
+        };
+        metrics::add(Counter::RowsIngested, row_count as u64);
         buffer_pending_delta(&mut self.pending_deltas, target_id, effective);
         gnitz_debug!("W{} push tid={} rows={}", self.worker_id, target_id, row_count);
+        self.release_write_buffers();
         Ok(())
     }
 
@@ -1179,6 +1219,11 @@ impl WorkerProcess {
             self.cat().reset_view_output_for_rebuild(view_id)?;
             self.cat().invalid_views.remove(&view_id);
         }
+        // A view backfill (stop-the-world, unlike a transient drive) decides
+        // which shared arrangements the view's compile may attach.
+        if !yield_between_chunks {
+            self.cat().dag.backfill_source_begin(view_id, source_tid);
+        }
         let chunk_rows = self.cat().ddl_scan_chunk_rows;
         let has = self.cat().has_id(source_tid);
         // Needed to synthesize empty pad chunks. A missing source still pads.
@@ -1239,6 +1284,7 @@ impl WorkerProcess {
             // cluster abort, and restart re-derives the view.
             self.cat().dag.flush_view_or_abort(view_id);
         }
+        self.cat().dag.backfill_source_done(view_id, source_tid);
         Ok(())
     }
 
@@ -1409,6 +1455,93 @@ impl WorkerProcess {
         });
     }
 
+    /// This worker's live-tick counters for every view under
+    /// `view_tick_schema_desc`.
+    fn view_tick_batch(&mut self, schema: SchemaDescriptor) -> Batch {
+        let mut bb = BatchBuilder::new(schema);
+        for (vid, t) in self.cat().dag.view_tick_stats() {
+            bb.begin_row(vid as u64 as u128, 1);
+            for v in [t.ticks, t.last_tick_ns, t.last_rows, t.total_rows] {
+                bb.put_u64(v);
+            }
+            bb.end_row();
+        }
+        bb.finish()
+    }
+
+    /// This worker's `EXPLAIN ANALYZE` rows for `view_id` under
+    /// `op_profile_schema_desc`; empty when the view has no compiled plan here
+    /// (it has not ticked since boot or its last DDL).
+    fn view_profile_batch(&mut self, view_id: i64, schema: SchemaDescriptor) -> Batch {
+        let worker = self.worker_id as u64;
+        let mut bb = BatchBuilder::new(schema);
+        for (i, l) in self
+            .cat()
+            .dag
+            .view_profile(view_id)
+            .unwrap_or_default()
+            .iter()
+            .enumerate()
+        {
+            bb.begin_row(((worker << 32) | i as u64) as u128, 1);
+            bb.put_u64(worker);
+            bb.put_string(&l.phase);
+            bb.put_u64(l.pc as u64);
+            bb.put_u64(l.depth as u64);
+            bb.put_string(l.op);
+            for v in [
+                l.calls,
+                l.rows_in,
+                l.rows_out,
+                l.nanos,
+                l.seeks,
+                l.bytes_in,
+                l.bytes_out,
+            ] {
+                bb.put_u64(v);
+            }
+            bb.end_row();
+        }
+        bb.finish()
+    }
+
+    /// This worker's heap attribution under `memory_schema_desc`: the DAG's
+    /// per-relation lines, then the idle batch-buffer pool and the resident
+    /// block cache as relation 0.
+    fn memory_batch(&mut self, schema: SchemaDescriptor) -> Batch {
+        let process = self.worker_id as usize + 1;
+        let name = metrics::process_name(process);
+        let mut lines = self.cat().dag.memory_usage();
+        let pools = [
+            ("batch_pool", crate::storage::batch_pool::pooled_bytes() as u64),
+            (
+                "block_cache",
+                crate::storage::block_cache_stats().map_or(0, |c| c.resident_bytes as u64),
+            ),
+        ];
+        for (component, bytes) in pools {
+            lines.push(MemoryLine {
+                relation_id: 0,
+                component,
+                pc: 0,
+                op: "",
+                bytes,
+            });
+        }
+        let mut bb = BatchBuilder::new(schema);
+        for (i, l) in lines.iter().filter(|l| l.bytes > 0).enumerate() {
+            bb.begin_row((((process as u64) << 32) | i as u64) as u128, 1);
+            bb.put_string(&name);
+            bb.put_u64(l.relation_id as u64);
+            bb.put_string(l.component);
+            bb.put_u64(l.pc as u64);
+            bb.put_string(l.op);
+            bb.put_u64(l.bytes);
+            bb.end_row();
+        }
+        bb.finish()
+    }
+
     /// CREATE UNIQUE INDEX pre-flight, worker side: project every
     /// positive-weight, non-null row of this worker's committed partition of
     /// `owner_id` to the OPK leading-key span of `col_indices` (the same
@@ -1753,9 +1886,25 @@ impl WorkerProcess {
             worker: self,
             tick_request_id: request_id,
         };
-        unsafe { &mut *dag }.evaluate_dag_multi_worker(source_id, delta, &mut ctx);
+        let t0 = std::time::Instant::now();
+        {
+            let _z = profile::zone(Zone::Tick);
+            unsafe { &mut *dag }.evaluate_dag_multi_worker(source_id, delta, &mut ctx);
+        }
+        metrics::record_since(Hist::DagEvalNs, t0);
         // Apply DDL_SYNC messages deferred during exchange waits.
         self.dispatch_deferred();
+        self.release_write_buffers();
+    }
+
+    /// Spill the tables the write-buffer budget asked back. A failed spill only
+    /// leaves that memory resident — the request stays and the next sweep (or
+    /// the table's own next ingest) retries — so it is logged, not fatal.
+    fn release_write_buffers(&mut self) {
+        let dag = self.cat().get_dag_ptr();
+        if let Err(e) = unsafe { &mut *dag }.release_requested_write_buffers() {
+            gnitz_warn!("W{} write-buffer release failed: {}", self.worker_id, e);
+        }
     }
 
     fn shutdown(&mut self) -> ! {
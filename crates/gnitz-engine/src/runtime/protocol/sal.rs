@@ -776,6 +776,9 @@ impl SalWriter {
     /// `prebuilt_schema_block`: when `Some`, the bytes are copied into each
     /// slot's schema region instead of building one from `schema` + names.
     /// Mutually exclusive with `col_names_opt`; passing both is a bug.
+    ///
+    /// `trace_id`: the request-trace context stamped into every slot's control
+    /// block (0 = untraced).
     #[allow(clippy::too_many_arguments, clippy::needless_range_loop)]
     pub fn write_group_direct(
         &mut self,
@@ -793,6 +796,7 @@ impl SalWriter {
         client_id: u64,
         prebuilt_schema_block: Option<&[u8]>,
         seek_pk_extra: &[u8],
+        trace_id: u64,
     ) -> Result<(), String> {
         self.prefault_ahead();
         let nw = self.m2w_efds.len();
@@ -864,6 +868,9 @@ impl SalWriter {
                     seek_pk_extra,
                 );
                 debug_assert_eq!(written, wsz);
+                if trace_id != 0 {
+                    gnitz_wire::control::set_ctrl_trace_id(slot, trace_id, true);
+                }
                 off += align8(wsz);
             }
         }
@@ -931,6 +938,8 @@ impl SalWriter {
     /// schema. When `Some`, the values are reused directly so the function
     /// avoids the per-call column iteration; when `None`, they're computed
     /// inline. `wire_row_fixed_stride` is only meaningful when `wire_safe`.
+    /// `trace_id` is stamped into every slot's control block, as in
+    /// `write_group_direct`.
     #[allow(clippy::too_many_arguments)]
     pub fn scatter_wire_group(
         &mut self,
@@ -945,6 +954,7 @@ impl SalWriter {
         req_ids: &[u64],
         prebuilt_schema_block: Option<&[u8]>,
         wire_props: Option<(bool, u32)>,
+        trace_id: u64,
     ) -> Result<(), String> {
         self.prefault_ahead();
         let nw = self.m2w_efds.len();
@@ -990,6 +1000,7 @@ impl SalWriter {
                 0,
                 prebuilt_schema_block,
                 &[],
+                trace_id,
             );
         }
 
@@ -1068,6 +1079,9 @@ impl SalWriter {
                 &[],
                 false,
             );
+            if trace_id != 0 {
+                gnitz_wire::control::set_ctrl_trace_id(slot, trace_id, false);
+            }
 
             off += align8(wsz);
         }
@@ -134,6 +134,7 @@ mod tests {
                 seek_pk: source_id as u128,
                 seek_col_idx: 0,
                 request_id: 0,
+                trace_id: 0,
                 error_msg: Vec::new(),
                 seek_pk_extra: Vec::new(),
                 block_size: 0,
@@ -2048,6 +2048,7 @@ mod tests {
                 seek_pk: 0,
                 seek_col_idx: 0,
                 request_id: req_id,
+                trace_id: 0,
                 error_msg: Vec::new(),
                 seek_pk_extra: Vec::new(),
                 block_size: 0,
@@ -2668,6 +2669,7 @@ mod tests {
                 seek_pk: source_id as u128,
                 seek_col_idx: 0,
                 request_id: req_id,
+                trace_id: 0,
                 error_msg: Vec::new(),
                 seek_pk_extra: Vec::new(),
                 block_size: 0,
@@ -633,6 +633,7 @@ unsafe fn assert_footprint_exact(
                 &req_ids,
                 Some(block.as_slice()),
                 Some(props),
+                0,
             )
             .expect("group fits");
         let actual = (writer.cursor() - before) as usize;
@@ -189,6 +189,12 @@ pub struct SchemaDescriptor {
     /// replicated sources tracks its distribution at the circuit level, not here.
     /// Mutually exclusive with a non-default `dist_prefix_len` (DDL-enforced).
     replicated: bool,
+    /// `true` iff this is an **append-only** base table (`TABLE_TAB.flags`, see
+    /// `gnitz_wire::table_flags_append_only`): the master rejects every push that
+    /// would retract a row, so its deltas carry positive weights only. Like
+    /// `replicated`, set only on base-table schemas; the compiler derives
+    /// insert-only streams downstream of it at the circuit level.
+    append_only: bool,
     /// payload_mapping[ci] = dense payload index, or PAYLOAD_MAPPING_PK_SENTINEL:
     /// PK columns hold the sentinel, payload columns hold their dense payload
     /// slot. Lets call sites that need this byte read it directly via
@@ -348,6 +354,7 @@ impl SchemaDescriptor {
             // Distribution is a base-table property set via `with_replicated`
             // after decoding `TABLE_TAB.flags`; every constructor defaults it off.
             replicated: false,
+            append_only: false,
             payload_mapping,
             payload_to_ci,
             payload_cmp,
@@ -366,6 +373,14 @@ impl SchemaDescriptor {
         self
     }
 
+    /// Return a copy of this schema marked append-only. Used by the catalog DDL
+    /// hook after decoding `gnitz_wire::table_flags_append_only`.
+    #[inline]
+    pub const fn with_append_only(mut self, append_only: bool) -> Self {
+        self.append_only = append_only;
+        self
+    }
+
     pub const fn minimal_u64() -> Self {
         Self::new(&[SchemaColumn::new(type_code::U64, 0)], &[0])
     }
@@ -471,6 +486,15 @@ impl SchemaDescriptor {
         self.replicated
     }
 
+    /// True iff this is an append-only base table — its pushes are insertions
+    /// of new keys only. Consulted by the master's write gate and by the circuit
+    /// compiler, which picks the retraction-free operator variants for views
+    /// reading only such tables.
+    #[inline]
+    pub const fn append_only(&self) -> bool {
+        self.append_only
+    }
+
     /// True iff the PK is a single signed column (I8/I16/I32/I64). Its OPK
     /// encoding flips the sign bit of the leading byte, so the `extend_pk` /
     /// `set_pk_at` u128 fast paths — which write right-aligned big-endian bytes
@@ -1523,6 +1547,87 @@ pub(crate) fn index_meta_schema_desc() -> SchemaDescriptor {
 }
 pub(crate) const INDEX_META_COL_NAMES: [&[u8]; 2] = [b"cols", b"is_unique"];
 
+/// Wire schema for the GET_STATS reply: a row-sequence PK, then
+/// `(name, process, kind, value, sum, p50, p90, p99, max)`. `kind` is
+/// 0 counter / 1 gauge / 2 histogram; a histogram's `value` is its count.
+pub(crate) fn stats_schema_desc() -> SchemaDescriptor {
+    let u64c = SchemaColumn::new(type_code::U64, 0);
+    let i64c = SchemaColumn::new(type_code::I64, 0);
+    let strc = SchemaColumn::new(type_code::STRING, 0);
+    SchemaDescriptor::new(&[u64c, strc, strc, u64c, i64c, u64c, u64c, u64c, u64c, u64c], &[0])
+}
+pub(crate) const STATS_COL_NAMES: [&[u8]; 10] = [
+    b"seq", b"name", b"process", b"kind", b"value", b"sum", b"p50", b"p90", b"p99", b"max",
+];
+
+/// Wire schema for a profiler GET_STATS reply: a row-sequence PK, then
+/// `(process, stack, cpu_ns, calls)` — one folded stack per row, `stack` the
+/// `;`-joined zone path below `process` (see `foundation::profile`).
+pub(crate) fn zone_profile_schema_desc() -> SchemaDescriptor {
+    let u64c = SchemaColumn::new(type_code::U64, 0);
+    let strc = SchemaColumn::new(type_code::STRING, 0);
+    SchemaDescriptor::new(&[u64c, strc, strc, u64c, u64c], &[0])
+}
+pub(crate) const ZONE_PROFILE_COL_NAMES: [&[u8]; 5] = [b"seq", b"process", b"stack", b"cpu_ns", b"calls"];
+
+/// Wire schema for a trace GET_STATS reply: a row-sequence PK, then
+/// `(trace_id, process, stage, start_ns, dur_ns)` — one span of a sampled
+/// request per row (see `foundation::trace`).
+pub(crate) fn trace_span_schema_desc() -> SchemaDescriptor {
+    let u64c = SchemaColumn::new(type_code::U64, 0);
+    let strc = SchemaColumn::new(type_code::STRING, 0);
+    SchemaDescriptor::new(&[u64c, u64c, strc, strc, u64c, u64c], &[0])
+}
+pub(crate) const TRACE_SPAN_COL_NAMES: [&[u8]; 6] = [b"seq", b"trace_id", b"process", b"stage", b"start_ns", b"dur_ns"];
+
+/// Wire schema for a memory GET_STATS reply: a `(process << 32 | line)` PK,
+/// then `(process, relation_id, component, pc, op, bytes)` — one heap
+/// attribution per row (see `DagEngine::memory_usage`). Process-wide pools
+/// carry `relation_id` 0.
+pub(crate) fn memory_schema_desc() -> SchemaDescriptor {
+    let u64c = SchemaColumn::new(type_code::U64, 0);
+    let strc = SchemaColumn::new(type_code::STRING, 0);
+    SchemaDescriptor::new(&[u64c, strc, u64c, strc, u64c, strc, u64c], &[0])
+}
+pub(crate) const MEMORY_COL_NAMES: [&[u8]; 7] =
+    [b"seq", b"process", b"relation_id", b"component", b"pc", b"op", b"bytes"];
+
+/// Wire schema for a view's `EXPLAIN ANALYZE` profile (GET_STATS with
+/// `target_id` = the view): a `(worker << 32 | line)` PK, then
+/// `(worker, phase, pc, depth, op, calls, rows_in, rows_out, time_ns, seeks,
+/// bytes_in, bytes_out)` — one row per operator per worker, in each worker's
+/// display order (see `DagEngine::view_profile`).
+pub(crate) fn op_profile_schema_desc() -> SchemaDescriptor {
+    let u64c = SchemaColumn::new(type_code::U64, 0);
+    let strc = SchemaColumn::new(type_code::STRING, 0);
+    let mut cols = [u64c; 13];
+    cols[2] = strc;
+    cols[5] = strc;
+    SchemaDescriptor::new(&cols, &[0])
+}
+pub(crate) const OP_PROFILE_COL_NAMES: [&[u8]; 13] = [
+    b"seq",
+    b"worker",
+    b"phase",
+    b"pc",
+    b"depth",
+    b"op",
+    b"calls",
+    b"rows_in",
+    b"rows_out",
+    b"time_ns",
+    b"seeks",
+    b"bytes_in",
+    b"bytes_out",
+];
+
+/// Wire schema for one worker's live-tick counters (a GET_STATS-flagged scan
+/// of `VIEW_STATS_TAB`): PK `view_id`, then `(ticks, last_tick_ns, last_rows,
+/// total_rows)` — `DagEngine::view_tick_stats`, one row per view.
+pub(crate) fn view_tick_schema_desc() -> SchemaDescriptor {
+    SchemaDescriptor::new(&[SchemaColumn::new(type_code::U64, 0); 5], &[0])
+}
+
 /// Build the schema for a `gather_family` result: the PK columns of `schema`
 /// (in pk-list order, so the packed PK round-trips identically) followed by
 /// the projected columns in `project` order as payload. `project` must list
@@ -0,0 +1,390 @@
+//! Optional per-worker block cache for shard PK seeks.
+//!
+//! Shards are read through their `mmap`, so residency is otherwise left to the
+//! kernel page cache: a compaction or backfill scan streams every page of its
+//! inputs through it and pushes the hot seek working set out. This cache holds
+//! copies of fixed-size PK-region blocks under a byte budget the engine owns,
+//! so the seek path (`MappedShard::find_lower_bound_bytes`, which backs
+//! `ReadCursor::seek_bytes` and the point-lookup probe) stays memory-resident
+//! regardless of what the scans did to the page cache.
+//!
+//! Admission is TinyLFU: a 4-bit-saturating count-min sketch records the access
+//! frequency of every requested block (cached or not) and periodically halves
+//! itself so old popularity fades. A missed block only displaces the CLOCK
+//! victim when its estimated frequency is strictly higher, so a one-pass scan
+//! (frequency 1 per block) can never flush blocks that are seeked repeatedly.
+//!
+//! Only the seek path consults the cache. Sequential consumers — compaction's
+//! merge over `to_unified`, cursor walks and their galloping `advance_to`, and
+//! the backfill scans built on them — read the mmap directly and bypass it.
+//!
+//! Disabled unless `GNITZ_BLOCK_CACHE_BYTES` is a positive byte count. The
+//! cache is thread-local; workers are single-threaded processes, so the
+//! budget applies per worker.
+
+use std::cell::RefCell;
+use std::hash::BuildHasher;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::OnceLock;
+
+use rustc_hash::{FxBuildHasher, FxHashMap};
+
+/// Bytes of PK region per cached block (rounded down to whole rows).
+pub(super) const BLOCK_BYTES: usize = 4096;
+
+/// Sketch counters saturate here (4-bit counters, stored one per byte).
+const SKETCH_MAX: u8 = 15;
+/// Counter rows in the count-min sketch.
+const SKETCH_DEPTH: usize = 4;
+/// Increments per cached block between halvings of the sketch.
+const SKETCH_SAMPLE_FACTOR: usize = 10;
+
+/// Per-worker budget from `GNITZ_BLOCK_CACHE_BYTES`; 0 (the default, also for
+/// an unparsable value) disables the cache.
+fn budget_bytes() -> usize {
+    static BUDGET: OnceLock<usize> = OnceLock::new();
+    *BUDGET.get_or_init(|| {
+        std::env::var("GNITZ_BLOCK_CACHE_BYTES")
+            .ok()
+            .and_then(|s| s.parse::<usize>().ok())
+            .unwrap_or(0)
+    })
+}
+
+/// `(shard cache id, block index)`.
+type BlockKey = (u64, u64);
+
+/// Counters for one worker's block cache since process start.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub struct BlockCacheStats {
+    pub hits: u64,
+    pub misses: u64,
+    /// Missed blocks the admission policy let in.
+    pub admitted: u64,
+    /// Missed blocks turned away because the CLOCK victim was more popular.
+    pub rejected: u64,
+    pub evicted: u64,
+    pub resident_bytes: usize,
+    pub budget_bytes: usize,
+}
+
+impl BlockCacheStats {
+    /// Fraction of lookups served from the cache; 0.0 before the first lookup.
+    pub fn hit_ratio(&self) -> f64 {
+        let total = self.hits + self.misses;
+        if total == 0 {
+            0.0
+        } else {
+            self.hits as f64 / total as f64
+        }
+    }
+}
+
+/// Count-min sketch with periodic aging — the TinyLFU frequency estimator.
+struct FrequencySketch {
+    counters: Vec<u8>,
+    width_mask: usize,
+    additions: usize,
+    sample: usize,
+    hasher: FxBuildHasher,
+}
+
+impl FrequencySketch {
+    fn new(capacity_blocks: usize) -> Self {
+        // ~4 counters per cached block keeps collisions between the hot set
+        // and scan traffic rare; the floor covers tiny budgets.
+        let width = (capacity_blocks * 4).max(1024).next_power_of_two();
+        FrequencySketch {
+            counters: vec![0; width * SKETCH_DEPTH],
+            width_mask: width - 1,
+            additions: 0,
+            sample: capacity_blocks.max(1) * SKETCH_SAMPLE_FACTOR,
+            hasher: FxBuildHasher,
+        }
+    }
+
+    /// One counter index per sketch row, from independent-enough slices of a
+    /// single 64-bit hash (re-mixed per row).
+    fn indices(&self, key: BlockKey) -> [usize; SKETCH_DEPTH] {
+        let mut x = self.hasher.hash_one(key);
+        let width = self.width_mask + 1;
+        std::array::from_fn(|row| {
+            x = x.wrapping_mul(0x9E37_79B9_7F4A_7C15).rotate_left(31);
+            row * width + (x as usize & self.width_mask)
+        })
+    }
+
+    fn increment(&mut self, key: BlockKey) {
+        for i in self.indices(key) {
+            let c = &mut self.counters[i];
+            *c = (*c + 1).min(SKETCH_MAX);
+        }
+        self.additions += 1;
+        if self.additions >= self.sample {
+            for c in &mut self.counters {
+                *c >>= 1;
+            }
+            self.additions /= 2;
+        }
+    }
+
+    fn estimate(&self, key: BlockKey) -> u8 {
+        self.indices(key)
+            .into_iter()
+            .map(|i| self.counters[i])
+            .min()
+            .unwrap_or(0)
+    }
+}
+
+struct Slot {
+    key: BlockKey,
+    block: Box<[u8]>,
+    referenced: bool,
+}
+
+/// TinyLFU-admitted, CLOCK-evicted map from block key to block bytes.
+pub(super) struct BlockCache {
+    budget: usize,
+    resident: usize,
+    slots: Vec<Slot>,
+    index: FxHashMap<BlockKey, usize>,
+    hand: usize,
+    sketch: FrequencySketch,
+    hits: u64,
+    misses: u64,
+    admitted: u64,
+    rejected: u64,
+    evicted: u64,
+}
+
+impl BlockCache {
+    pub(super) fn new(budget: usize) -> Self {
+        BlockCache {
+            budget,
+            resident: 0,
+            slots: Vec::new(),
+            index: FxHashMap::default(),
+            hand: 0,
+            sketch: FrequencySketch::new(budget / BLOCK_BYTES),
+            hits: 0,
+            misses: 0,
+            admitted: 0,
+            rejected: 0,
+            evicted: 0,
+        }
+    }
+
+    /// Run `f` over the cached block for `key`, or over `mapped` (the same
+    /// bytes, read from the mmap) on a miss. A missed block is offered to the
+    /// admission policy and copied only if admitted, so probes that lose to
+    /// the residents cost no allocation.
+    pub(super) fn with_block<R>(&mut self, key: BlockKey, mapped: &[u8], f: impl FnOnce(&[u8]) -> R) -> R {
+        self.sketch.increment(key);
+        if let Some(&i) = self.index.get(&key) {
+            self.hits += 1;
+            let slot = &mut self.slots[i];
+            slot.referenced = true;
+            return f(&slot.block);
+        }
+        self.misses += 1;
+        self.admit(key, mapped);
+        f(mapped)
+    }
+
+    fn admit(&mut self, key: BlockKey, block: &[u8]) {
+        let len = block.len();
+        if len > self.budget {
+            self.rejected += 1;
+            return;
+        }
+        while self.resident + len > self.budget {
+            let victim = self.clock_victim();
+            if self.sketch.estimate(key) <= self.sketch.estimate(self.slots[victim].key) {
+                self.rejected += 1;
+                return;
+            }
+            self.remove(victim);
+            self.evicted += 1;
+        }
+        self.index.insert(key, self.slots.len());
+        self.slots.push(Slot {
+            key,
+            block: Box::from(block),
+            referenced: false,
+        });
+        self.resident += len;
+        self.admitted += 1;
+    }
+
+    /// Advance the hand to the first unreferenced slot, clearing reference
+    /// bits on the way. Terminates within one sweep. Callers guarantee at
+    /// least one slot (the budget is exceeded only while something is resident).
+    fn clock_victim(&mut self) -> usize {
+        loop {
+            if self.hand >= self.slots.len() {
+                self.hand = 0;
+            }
+            let slot = &mut self.slots[self.hand];
+            if !slot.referenced {
+                return self.hand;
+            }
+            slot.referenced = false;
+            self.hand += 1;
+        }
+    }
+
+    fn remove(&mut self, i: usize) {
+        let slot = self.slots.swap_remove(i);
+        self.index.remove(&slot.key);
+        self.resident -= slot.block.len();
+        if let Some(moved) = self.slots.get(i) {
+            self.index.insert(moved.key, i);
+        }
+    }
+
+    /// Drop every block of a shard that is being unmapped. Its id is never
+    /// reused, so the blocks could only linger as dead weight.
+    pub(super) fn forget_shard(&mut self, shard_id: u64) {
+        let mut i = self.slots.len();
+        while i > 0 {
+            i -= 1;
+            if self.slots[i].key.0 == shard_id {
+                self.remove(i);
+            }
+        }
+    }
+
+    pub(super) fn stats(&self) -> BlockCacheStats {
+        BlockCacheStats {
+            hits: self.hits,
+            misses: self.misses,
+            admitted: self.admitted,
+            rejected: self.rejected,
+            evicted: self.evicted,
+            resident_bytes: self.resident,
+            budget_bytes: self.budget,
+        }
+    }
+}
+
+thread_local! {
+    static BLOCK_CACHE: RefCell<Option<BlockCache>> = const { RefCell::new(None) };
+}
+
+/// Source of shard cache ids. Process-wide, so ids stay unique however many
+/// threads open shards (unit tests do); each cache only ever sees its own.
+static NEXT_SHARD_ID: AtomicU64 = AtomicU64::new(0);
+
+/// Run `f` against this worker's cache, creating it on first use. `None` when
+/// the cache is disabled (or unavailable during thread teardown / re-entry),
+/// in which case the caller reads the mmap directly.
+pub(super) fn with_cache<R>(f: impl FnOnce(&mut BlockCache) -> R) -> Option<R> {
+    let budget = budget_bytes();
+    if budget == 0 {
+        return None;
+    }
+    BLOCK_CACHE
+        .try_with(|c| {
+            let mut slot = c.try_borrow_mut().ok()?;
+            Some(f(slot.get_or_insert_with(|| BlockCache::new(budget))))
+        })
+        .ok()
+        .flatten()
+}
+
+/// A fresh id keying one opened shard's blocks.
+pub(super) fn next_shard_id() -> u64 {
+    NEXT_SHARD_ID.fetch_add(1, Ordering::Relaxed)
+}
+
+/// Evict a shard's blocks from this worker's cache (no-op when disabled).
+pub(super) fn forget_shard(shard_id: u64) {
+    let _ = BLOCK_CACHE.try_with(|c| {
+        if let Ok(mut slot) = c.try_borrow_mut() {
+            if let Some(cache) = slot.as_mut() {
+                cache.forget_shard(shard_id);
+            }
+        }
+    });
+}
+
+/// This worker's cache counters, or `None` when the cache is disabled.
+pub fn block_cache_stats() -> Option<BlockCacheStats> {
+    with_cache(|c| c.stats())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// Probe `key`, whose mapped bytes are all `fill`; returns the first byte
+    /// the cache handed back.
+    fn touch(c: &mut BlockCache, key: BlockKey, fill: u8) -> u8 {
+        c.with_block(key, &[fill; BLOCK_BYTES], |b| b[0])
+    }
+
+    #[test]
+    fn hit_after_admitted_miss() {
+        let mut c = BlockCache::new(4 * BLOCK_BYTES);
+        assert_eq!(touch(&mut c, (1, 7), 7), 7);
+        // A hit serves the cached copy, not the mapped bytes.
+        for _ in 0..2 {
+            assert_eq!(touch(&mut c, (1, 7), 0), 7);
+        }
+        let s = c.stats();
+        assert_eq!((s.hits, s.misses, s.admitted), (2, 1, 1));
+        assert_eq!(s.resident_bytes, BLOCK_BYTES);
+    }
+
+    #[test]
+    fn scan_does_not_displace_hot_blocks() {
+        let mut c = BlockCache::new(4 * BLOCK_BYTES);
+        // Hot set: four blocks seeked repeatedly.
+        for _ in 0..8 {
+            for b in 0..4 {
+                touch(&mut c, (1, b), b as u8);
+            }
+        }
+        // A one-pass scan over cold blocks.
+        for b in 0..30 {
+            touch(&mut c, (2, b), 0xEE);
+        }
+        let before = c.stats().hits;
+        for b in 0..4 {
+            touch(&mut c, (1, b), b as u8);
+        }
+        assert_eq!(c.stats().hits - before, 4, "hot blocks survived the scan");
+        assert_eq!(c.stats().rejected, 30);
+        assert!(c.stats().resident_bytes <= 4 * BLOCK_BYTES);
+    }
+
+    #[test]
+    fn frequent_newcomer_replaces_cold_resident() {
+        let mut c = BlockCache::new(2 * BLOCK_BYTES);
+        touch(&mut c, (1, 0), 0);
+        touch(&mut c, (1, 1), 1);
+        // (1, 2) is requested often enough to out-score a resident block.
+        for _ in 0..4 {
+            touch(&mut c, (1, 2), 2);
+        }
+        assert!(c.index.contains_key(&(1, 2)));
+        assert_eq!(c.stats().evicted, 1);
+        assert_eq!(c.stats().resident_bytes, 2 * BLOCK_BYTES);
+    }
+
+    #[test]
+    fn forget_shard_drops_only_its_blocks() {
+        let mut c = BlockCache::new(8 * BLOCK_BYTES);
+        for b in 0..3 {
+            touch(&mut c, (1, b), 1);
+            touch(&mut c, (2, b), 2);
+        }
+        c.forget_shard(1);
+        assert_eq!(c.stats().resident_bytes, 3 * BLOCK_BYTES);
+        for (key, &i) in &c.index {
+            assert_eq!(key.0, 2);
+            assert_eq!(c.slots[i].key, *key);
+        }
+    }
+}
@@ -56,6 +56,8 @@ pub(super) fn find_guard_for_key(guard_keys: &[u128], key: u128) -> usize {
 /// `emit_empty_guards` decides a guard with no survivors: `false` skips it
 /// (multi-target — an empty guard must not register an L1 shard); `true` still
 /// writes its 0-row shard (single-target — the caller owes exactly one file).
+/// `prefix_filter_len` is forwarded to every output's `ShardWriteOpts`, so a
+/// secondary-index family keeps its key-prefix filter across compactions.
 ///
 /// Returns `(guard_key, path)` per written shard in increasing guard-index order.
 /// On an overlong path or a write error, every shard already written this call is
@@ -65,6 +67,7 @@ pub(super) fn compact_routed(
     guard_keys: &[u128],
     schema: &SchemaDescriptor,
     can_tag_pk_unique: bool,
+    prefix_filter_len: u8,
     emit_empty_guards: bool,
     mut name_for: impl FnMut(u128) -> String,
 ) -> Result<Vec<(u128, String)>, StorageError> {
@@ -155,6 +158,7 @@ pub(super) fn compact_routed(
             durable: true, // compaction outputs must survive a crash on their own
             flags: checkers.as_ref().map_or(0, |c| c[g].flags()),
             pack_ints: true,
+            prefix_filter_len,
         };
         if let Err(e) = batch.write_as_shard(&cpath, schema, opts) {
             unlink_written(&out);
@@ -178,9 +182,18 @@ pub fn compact_shards(
     output_file: &CStr,
     schema: &SchemaDescriptor,
     can_tag_pk_unique: bool,
+    prefix_filter_len: u8,
 ) -> Result<(), StorageError> {
     let path = output_file.to_str().unwrap_or("").to_string();
-    compact_routed(input_files, &[0], schema, can_tag_pk_unique, true, |_| path.clone())?;
+    compact_routed(
+        input_files,
+        &[0],
+        schema,
+        can_tag_pk_unique,
+        prefix_filter_len,
+        true,
+        |_| path.clone(),
+    )?;
     Ok(())
 }
 
@@ -197,12 +210,21 @@ pub fn merge_and_route(
     level_num: u32,
     compact_seq: u64,
     can_tag_pk_unique: bool,
+    prefix_filter_len: u8,
 ) -> Result<Vec<(u128, String)>, StorageError> {
     let dir = output_dir.to_str().unwrap_or("").to_string();
-    compact_routed(input_files, guard_keys, schema, can_tag_pk_unique, false, move |gk| {
-        format!(
-            "{dir}/{}",
-            super::super::naming::compact_shard_name(table_id, compact_seq, level_num as usize, gk)
-        )
-    })
+    compact_routed(
+        input_files,
+        guard_keys,
+        schema,
+        can_tag_pk_unique,
+        prefix_filter_len,
+        false,
+        move |gk| {
+            format!(
+                "{dir}/{}",
+                super::super::naming::compact_shard_name(table_id, compact_seq, level_num as usize, gk)
+            )
+        },
+    )
 }
@@ -103,7 +103,7 @@ mod tests {
         let cs1 = std::ffi::CString::new(s1.to_str().unwrap()).unwrap();
         let cs2 = std::ffi::CString::new(s2.to_str().unwrap()).unwrap();
         let cout = std::ffi::CString::new(out.to_str().unwrap()).unwrap();
-        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false).unwrap();
+        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false, 0).unwrap();
 
         // Compaction output packs the eligible payload.
         assert_eq!(
@@ -125,7 +125,7 @@ mod tests {
         // Re-compaction of a packed input (decode → merge → re-encode).
         let out2 = dir.join("merged2.db");
         let cout2 = std::ffi::CString::new(out2.to_str().unwrap()).unwrap();
-        compact_shards(&[cout.as_c_str()], &cout2, &schema, false).unwrap();
+        compact_shards(&[cout.as_c_str()], &cout2, &schema, false, 0).unwrap();
         assert_eq!(
             payload_encoding(out2.to_str().unwrap()),
             ENCODING_FOR,
@@ -168,7 +168,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         // Read back merged shard
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
@@ -207,7 +207,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         // Key 2 should be eliminated (net weight = 0)
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
@@ -233,7 +233,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
         assert_eq!(merged.count, 3);
@@ -272,7 +272,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs: [&CStr; 0] = [];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         // Output shard should exist with 0 rows
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
@@ -303,7 +303,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
         assert_eq!(merged.count, 0);
@@ -320,7 +320,7 @@ mod tests {
         let schema = make_test_schema();
         let cdir = std::ffi::CString::new("/tmp").unwrap();
         let guards: [u128; 0] = [];
-        let _ = merge_and_route(&[], &cdir, &guards, &schema, 0, 1, 0, false);
+        let _ = merge_and_route(&[], &cdir, &guards, &schema, 0, 1, 0, false, 0);
     }
 
     #[test]
@@ -343,7 +343,7 @@ mod tests {
         // order-preserving pack_pk_be space as the router's sort key, so derive
         // them from the OPK bytes of the boundary values (not native u128s).
         let guards: [u128; 2] = [pack_pk_be(&0u64.to_be_bytes()), pack_pk_be(&100u64.to_be_bytes())];
-        let guard_outputs = merge_and_route(&inputs, &cdir, &guards, &schema, 0, 1, 99, false).unwrap();
+        let guard_outputs = merge_and_route(&inputs, &cdir, &guards, &schema, 0, 1, 99, false, 0).unwrap();
         assert_eq!(guard_outputs.len(), 2); // both guards should have rows
 
         // Guard 0 should have keys 10, 50
@@ -388,7 +388,7 @@ mod tests {
         fs::create_dir_all(&blocker).unwrap();
 
         let cdir = std::ffi::CString::new(dir.to_str().unwrap()).unwrap();
-        let rc = merge_and_route(&inputs, &cdir, &guards, &schema, 0, 1, 99, false);
+        let rc = merge_and_route(&inputs, &cdir, &guards, &schema, 0, 1, 99, false, 0);
 
         assert!(rc.is_err(), "expected failure, got {rc:?}");
         let guard0_file = dir.join("shard_0_99_L1_G0.db");
@@ -434,7 +434,7 @@ mod tests {
         let output = dir.join("merged.db");
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
         let inputs = [cpath.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
         assert_eq!(merged.count, 3);
@@ -487,7 +487,7 @@ mod tests {
         let output = dir.join("merged.db");
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
         let inputs = [cpath.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
         assert_eq!(merged.count, 2);
@@ -576,7 +576,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str(), cs3.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let rows = read_3col_shard(output.to_str().unwrap(), &schema);
         assert_eq!(rows.len(), 1, "expected 1 surviving row, got {rows:?}");
@@ -626,7 +626,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str(), cs3.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let rows = read_3col_shard(output.to_str().unwrap(), &schema);
         assert_eq!(
@@ -674,7 +674,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str(), cs3.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let rows = read_3col_shard(output.to_str().unwrap(), &schema);
         assert_eq!(rows.len(), 2, "expected 2 surviving rows, got {rows:?}");
@@ -721,7 +721,7 @@ mod tests {
         let inputs: Vec<_> = cstrs.iter().map(|c| c.as_c_str()).collect();
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let rows = read_3col_shard(output.to_str().unwrap(), &schema);
         assert_eq!(
@@ -761,7 +761,7 @@ mod tests {
         let inputs = [cs1.as_c_str(), cs2.as_c_str()];
 
         let guard_keys: Vec<u128> = vec![0]; // single guard
-        let guard_outputs = merge_and_route(&inputs, &cdir, &guard_keys, &schema, 99, 1, 1, false).unwrap();
+        let guard_outputs = merge_and_route(&inputs, &cdir, &guard_keys, &schema, 99, 1, 1, false, 0).unwrap();
         assert!(!guard_outputs.is_empty(), "merge_and_route should produce output");
 
         let rows = read_3col_shard(&guard_outputs[0].1, &schema);
@@ -793,7 +793,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false)
+        compact_shards(&inputs, &cout, &schema, false, 0)
             .expect("compact with checksums enabled must succeed for valid data");
 
         let merged = MappedShard::open(&cout, &schema, true).unwrap();
@@ -830,7 +830,7 @@ mod tests {
         let cout = std::ffi::CString::new(output.to_str().unwrap()).unwrap();
 
         let inputs = [cs1.as_c_str(), cs2.as_c_str()];
-        compact_shards(&inputs, &cout, &schema, false).unwrap();
+        compact_shards(&inputs, &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, true).unwrap();
         assert_eq!(merged.count, 10000);
@@ -866,7 +866,7 @@ mod tests {
         let inputs = [cs1.as_c_str()];
 
         let guard_keys: Vec<u128> = vec![200]; // single guard at key 200
-        let guard_outputs = merge_and_route(&inputs, &cdir, &guard_keys, &schema, 42, 2, 1, false).unwrap();
+        let guard_outputs = merge_and_route(&inputs, &cdir, &guard_keys, &schema, 42, 2, 1, false, 0).unwrap();
         assert!(!guard_outputs.is_empty(), "merge_and_route should produce output");
 
         let cpath = std::ffi::CString::new(guard_outputs[0].1.as_str()).unwrap();
@@ -968,7 +968,7 @@ mod tests {
         let cs1 = std::ffi::CString::new(s1.to_str().unwrap()).unwrap();
         let cs2 = std::ffi::CString::new(s2.to_str().unwrap()).unwrap();
         let cout = std::ffi::CString::new(dir.join("merged.db").to_str().unwrap()).unwrap();
-        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false).unwrap();
+        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
         // (2,3) cancels (+1 -1 = 0). The cross-shard duplicate must fold, which
@@ -1017,7 +1017,7 @@ mod tests {
         let cs1 = std::ffi::CString::new(s1.to_str().unwrap()).unwrap();
         let cs2 = std::ffi::CString::new(s2.to_str().unwrap()).unwrap();
         let cout = std::ffi::CString::new(dir.join("merged.db").to_str().unwrap()).unwrap();
-        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false).unwrap();
+        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
         assert_eq!(merged.count, 4);
@@ -1074,7 +1074,7 @@ mod tests {
         let cs1 = std::ffi::CString::new(s1.to_str().unwrap()).unwrap();
         let cs2 = std::ffi::CString::new(s2.to_str().unwrap()).unwrap();
         let cout = std::ffi::CString::new(dir.join("merged.db").to_str().unwrap()).unwrap();
-        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false).unwrap();
+        compact_shards(&[cs1.as_c_str(), cs2.as_c_str()], &cout, &schema, false, 0).unwrap();
 
         let merged = MappedShard::open(&cout, &schema, false).unwrap();
         assert_eq!(merged.count, 2, "prefix-colliding distinct wide PKs must not fold");
@@ -1246,7 +1246,7 @@ mod tests {
         let cnew = std::ffi::CString::new(out_new.to_str().unwrap()).unwrap();
         let cold = std::ffi::CString::new(out_old.to_str().unwrap()).unwrap();
 
-        compact_shards(&inputs, &cnew, schema, can_tag).unwrap();
+        compact_shards(&inputs, &cnew, schema, can_tag, 0).unwrap();
         oracle_compact_row_at_a_time(&inputs, &cold, schema, can_tag);
 
         let (uniq_new, rows_new) = decode_diff_shard(out_new.to_str().unwrap(), schema);
@@ -1442,7 +1442,7 @@ mod tests {
         let cdir = std::ffi::CString::new(dir.to_str().unwrap()).unwrap();
         // table_id=7, level_num=1, compact_seq=42 → routed shards are named by the
         // destination guard *key*: shard_7_42_L1_G{guard_keys[g]}.db.
-        let routed = merge_and_route(&inputs, &cdir, &guard_keys, &schema, 7, 1, 42, true).unwrap();
+        let routed = merge_and_route(&inputs, &cdir, &guard_keys, &schema, 7, 1, 42, true, 0).unwrap();
         let oracle = oracle_merge_and_route_row_at_a_time(&inputs, &dir, &guard_keys, &schema, true);
 
         // Only the populated guards (0 and 3) produce output, in increasing-g order.
@@ -92,6 +92,11 @@ impl MemTable {
         self.runs.push(Rc::new(batch));
         self.maybe_inline_consolidate();
     }
+    /// Bytes held by the memtable's runs (what `should_flush` compares).
+    pub fn runs_bytes(&self) -> usize {
+        self.runs_bytes
+    }
+
     pub fn should_flush(&self) -> bool {
         self.runs_bytes > self.max_bytes * 3 / 4
     }
@@ -1,9 +1,11 @@
 //! L3 storage LSM — the on-disk half of the storage subsystem: mmap'd shard
-//! readers (`shard_reader`), the in-memory shard index + compaction trigger
+//! readers (`shard_reader`) and their optional seek-block cache
+//! (`block_cache`), the in-memory shard index + compaction trigger
 //! (`shard_index`), the N-way compaction kernel (`compact`), the MemTable
 //! (`memtable`), the opaque read cursor (`read_cursor`), the manifest serde
 //! (`manifest`), the filename grammar (`naming`), and the `Table` /
-//! `PartitionedTable` facades. The pure byte codecs (`wal`, `shard_file`,
+//! `PartitionedTable` facades, plus the per-worker budget shared by every
+//! table's heap write state (`write_buffer`). The pure byte codecs (`wal`, `shard_file`,
 //! `layout`) live one layer down in `repr/`.
 //!
 //! `lsm/` has **no outward facade of its own** — `storage/mod.rs` curates the
@@ -15,12 +17,14 @@
 //! move under `lsm/`.
 
 // Re-exported from storage/mod.rs.
+pub(super) mod block_cache;
 pub(super) mod index_gather;
 pub(super) mod manifest;
 pub(super) mod partitioned_table;
 pub(super) mod read_cursor;
 pub(super) mod spill;
 pub(super) mod table;
+pub(super) mod write_buffer;
 
 // LSM-internal only (`shard_reader` is storage-visible: the repr codec tests
 // round-trip written shards through `MappedShard`).
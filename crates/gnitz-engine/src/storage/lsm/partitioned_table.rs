@@ -13,12 +13,13 @@ use super::columnar;
 use super::error::StorageError;
 use super::read_cursor::{self, ReadCursor};
 use super::shard_reader::MappedShard;
-use super::table::{self, RecoverySource, Table};
+use super::table::{self, AmplificationReport, RecoverySource, Table};
 #[cfg(test)]
 use super::table::{FlushOutcome, FlushWork};
 #[cfg(test)]
 use crate::schema::key::{partition_for_key, partition_for_pk_bytes};
 use crate::schema::SchemaDescriptor;
+use gnitz_wire::CompactionOptions;
 
 thread_local! {
     /// Reused per-partition scatter index buffers for `ingest_owned_batch`.
@@ -133,6 +134,23 @@ impl PartitionedTable {
         }
     }
 
+    /// Apply the relation's compaction policy to every partition.
+    pub fn set_compaction_options(&mut self, opts: CompactionOptions) {
+        for t in &mut self.tables {
+            t.set_compaction_options(opts);
+        }
+    }
+
+    /// Write/read amplification summed over every partition (see
+    /// [`AmplificationReport::absorb`]).
+    pub fn amplification(&self) -> AmplificationReport {
+        let mut report = AmplificationReport::default();
+        for t in &self.tables {
+            report.absorb(&t.amplification());
+        }
+        report
+    }
+
     /// True for a replicated store — one child holding the whole local dataset
     /// at partition 0 (a replicated base table or replicated-derived view). The
     /// bootstrap trim exempts these so partition 0 is never dropped on a worker
@@ -329,6 +347,10 @@ impl PartitionedTable {
         &mut self.tables
     }
 
+    pub fn partitions(&self) -> &[Table] {
+        &self.tables
+    }
+
     pub fn current_lsn(&self) -> u64 {
         self.tables.iter().map(|t| t.current_lsn()).max().unwrap_or(0)
     }
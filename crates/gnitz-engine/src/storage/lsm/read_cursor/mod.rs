@@ -34,6 +34,17 @@ thread_local! {
 /// exercise chunk boundaries.
 pub(crate) const DDL_SCAN_CHUNK_ROWS: usize = 65_536;
 
+/// Rows per `MADV_WILLNEED` window a shard source advises ahead of a
+/// sequential walk; the next window is issued once half of this one is
+/// consumed, so the reads stay in flight ahead of the merge.
+const READAHEAD_ROWS: usize = 16_384;
+
+/// Rows a shard source must be walked past its last reposition before it
+/// counts as a scan and starts reading ahead. Point lookups and short
+/// prefix walks (seek, then a few `advance`s) stay below it and never pay
+/// for a window they would not read.
+const READAHEAD_DETECT_ROWS: usize = 64;
+
 // ---------------------------------------------------------------------------
 // CursorState — per-source position tracker (struct-of-arrays pair to
 // `sources`).  Splitting source from state lets the borrow checker see
@@ -46,17 +57,65 @@ struct CursorState {
     /// Cached so `is_valid()` and `estimated_length()` work on
     /// `&[CursorState]` alone, without a parallel borrow of `&[CursorSource]`.
     count: usize,
+    /// Row whose arrival by `advance` issues the next readahead window;
+    /// `usize::MAX` once the source is advised to its end, and always for an
+    /// in-memory `Batch` source (nothing to page in).
+    readahead_at: usize,
+    /// End (exclusive) of the rows already advised.
+    readahead_end: usize,
 }
 
 impl CursorState {
+    fn new(src: &CursorSource, count: usize) -> Self {
+        let mut state = CursorState {
+            position: 0,
+            count,
+            readahead_at: usize::MAX,
+            readahead_end: 0,
+        };
+        state.reset_readahead(src);
+        state
+    }
+
     #[inline]
     fn is_valid(&self) -> bool {
         self.position < self.count
     }
 
-    fn advance(&mut self) {
+    #[inline]
+    fn advance(&mut self, src: &CursorSource) {
         if self.is_valid() {
             self.position += 1;
+            if self.position >= self.readahead_at {
+                self.read_ahead(src);
+            }
+        }
+    }
+
+    /// Advise the next window past `position` (skipping rows an earlier
+    /// window already covered) and arm the trigger halfway into it.
+    #[cold]
+    fn read_ahead(&mut self, src: &CursorSource) {
+        let CursorSource::Shard(shard) = src else {
+            self.readahead_at = usize::MAX;
+            return;
+        };
+        let end = self.position.saturating_add(READAHEAD_ROWS).min(self.count);
+        shard.prefetch_rows(self.readahead_end.max(self.position), end);
+        self.readahead_end = end;
+        self.readahead_at = if end == self.count {
+            usize::MAX
+        } else {
+            self.position + READAHEAD_ROWS / 2
+        };
+    }
+
+    /// Re-arm scan detection after `position` jumped: readahead resumes only
+    /// once the consumer has walked `READAHEAD_DETECT_ROWS` from here.
+    fn reset_readahead(&mut self, src: &CursorSource) {
+        if let CursorSource::Shard(_) = src {
+            self.readahead_end = self.position;
+            self.readahead_at = self.position.saturating_add(READAHEAD_DETECT_ROWS);
         }
     }
 
@@ -64,14 +123,21 @@ impl CursorState {
     /// `pk_stride` OPK bytes.
     fn seek_bytes(&mut self, src: &CursorSource, key: &[u8]) {
         self.position = src.find_lower_bound_bytes(key);
+        self.reset_readahead(src);
     }
 
     /// Galloping forward seek to the first row whose OPK bytes are `>= key`,
     /// seeded at the live `position`. Forward-only and position-owned, so a
     /// stale or non-monotone hint is unrepresentable — equals `seek_bytes`'s
     /// landing index for any key, only cheaper when the boundary moves forward.
+    /// A landing inside the already-advised window keeps the readahead going
+    /// (a co-group merge galloping over short gaps is still a scan).
     fn advance_to(&mut self, src: &CursorSource, key: &[u8]) {
-        self.position = src.advance_to(key, self.position);
+        let from = self.position;
+        self.position = src.advance_to(key, from);
+        if self.position < from || self.position > self.readahead_end {
+            self.reset_readahead(src);
+        }
     }
 }
 
@@ -112,6 +178,9 @@ pub struct ReadCursor {
     pub current_null_word: u64,
     current_entry_idx: usize,
     current_row: usize,
+    /// Repositioning seeks (`seek_bytes` / `advance_to`) served so far — the
+    /// per-operator trace-seek count `EXPLAIN ANALYZE` reports.
+    seeks: u64,
 }
 
 /// Row comparator alias for the monomorphized `_with` variants.  `Copy` lets
@@ -197,6 +266,7 @@ impl ReadCursor {
             current_null_word: 0,
             current_entry_idx: 0,
             current_row: 0,
+            seeks: 0,
         };
         cursor.drive();
         cursor
@@ -228,8 +298,9 @@ impl ReadCursor {
     pub fn rewind(&mut self) {
         #[cfg(test)]
         REWIND_CALLS.with(|c| c.set(c.get() + 1));
-        for state in self.states.iter_mut() {
+        for (src, state) in self.sources.iter().zip(self.states.iter_mut()) {
             state.position = 0;
+            state.reset_readahead(src);
         }
         self.rebuild_and_drive();
     }
@@ -240,6 +311,7 @@ impl ReadCursor {
     /// heap via `compare_pk_ordering` over the full OPK bytes, so this
     /// survives `pk_stride > 16` where the u128 `seek` cannot.
     pub fn seek_bytes(&mut self, key: &[u8]) {
+        self.seeks += 1;
         for (src, state) in self.sources.iter().zip(self.states.iter_mut()) {
             state.seek_bytes(src, key);
         }
@@ -266,6 +338,7 @@ impl ReadCursor {
     /// not a from-scratch `Θ(num_sources)` rebuild + its two Vec allocations on
     /// every step.
     pub fn advance_to(&mut self, key: &[u8]) {
+        self.seeks += 1;
         // Strictly-forward seek on a live multi-source cursor: maintain the loser
         // tree in place instead of rebuilding it. The boundary is strict — `key`
         // must be > the current emitted PK. At `key == current_pk` the lower bound
@@ -378,6 +451,12 @@ impl ReadCursor {
         self.valid && self.current_pk_eq(key) && self.current_weight > 0
     }
 
+    /// Number of repositioning seeks this cursor has served.
+    #[inline]
+    pub fn seeks(&self) -> u64 {
+        self.seeks
+    }
+
     /// PK region of the current row as raw bytes, without copying. The single PK
     /// accessor for any width — correct for compound/wide PKs.
     pub fn current_pk_bytes(&self) -> &[u8] {
@@ -513,6 +592,22 @@ impl ReadCursor {
         self.walk_to_positive_with_prefix(prefix)
     }
 
+    /// Whether any source may hold a row whose PK begins with `prefix` (the OPK
+    /// image of the leading PK column(s), or a whole `pk_stride` key). `false`
+    /// is definitive, so a prober can skip the seek — and the per-source
+    /// gallop plus merge re-drive it costs — for a key no run holds. Position-
+    /// independent and non-mutating: the cursor stays where it was.
+    pub fn may_contain_prefix(&self, prefix: &[u8]) -> bool {
+        let stride = self.schema.pk_stride() as usize;
+        let mut key = [0u8; crate::schema::MAX_PK_BYTES];
+        let copy_len = prefix.len().min(stride);
+        key[..copy_len].copy_from_slice(&prefix[..copy_len]);
+        let prefix = &prefix[..copy_len];
+        self.sources
+            .iter()
+            .any(|s| s.may_contain_prefix(prefix, &key[..stride]))
+    }
+
     /// Visit every positive-weight row whose PK begins with `prefix`, invoking
     /// `f(&*self)` at each (the callback reads the committed `current_*` row
     /// state; it must not re-enter the cursor). The seek/advance/walk loop the
@@ -560,7 +655,7 @@ impl ReadCursor {
     #[inline]
     fn pre_step_single(&mut self) {
         if matches!(self.mode, SourceMode::Single) {
-            self.states[0].advance();
+            self.states[0].advance(&self.sources[0]);
         }
     }
 
@@ -631,7 +726,7 @@ impl ReadCursor {
             heap,
             less,
             |src| {
-                states[src].advance();
+                states[src].advance(&sources[src]);
                 states[src].is_valid().then(|| states[src].position as u32)
             },
             same_pk,
@@ -749,7 +844,7 @@ impl ReadCursor {
             // test — by construction it is the group's first row (mirrors
             // `drive_merge`'s group-open, which skips the first-row test).
             let mut net = sources[ex_src].get_weight(ex_row);
-            states[ex_src].advance();
+            states[ex_src].advance(&sources[ex_src]);
 
             // Fold one head's run into `net`: accumulate every remaining row equal
             // to the exemplar `(ex_pk, payload)` and advance past it. Applied to
@@ -765,7 +860,7 @@ impl ReadCursor {
                         break;
                     }
                     *net += sources[s].get_weight(pos);
-                    states[s].advance();
+                    states[s].advance(&sources[s]);
                 }
             };
             fold_run(ex_src, &mut net);
@@ -938,17 +1033,17 @@ pub(crate) fn create_read_cursor(
 
     for batch in batches {
         if batch.count > 0 {
-            let count = batch.count;
-            sources.push(CursorSource::Batch(Rc::clone(batch)));
-            states.push(CursorState { position: 0, count });
+            let src = CursorSource::Batch(Rc::clone(batch));
+            states.push(CursorState::new(&src, batch.count));
+            sources.push(src);
         }
     }
 
     for shard in shard_arcs {
         if shard.count > 0 {
-            let count = shard.count;
-            sources.push(CursorSource::Shard(Rc::clone(shard)));
-            states.push(CursorState { position: 0, count });
+            let src = CursorSource::Shard(Rc::clone(shard));
+            states.push(CursorState::new(&src, shard.count));
+            sources.push(src);
         }
     }
 
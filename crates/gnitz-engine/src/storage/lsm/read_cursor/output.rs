@@ -212,8 +212,10 @@ impl ReadCursor {
             CursorSource::Shard(s) => s.slice_to_owned_batch(start, row_count, schema),
         };
 
-        // Advance position past the drained rows
+        // Advance position past the drained rows (the shard slice copy advised
+        // its own range, so detection restarts from the new position).
         self.states[0].position = start + row_count;
+        self.states[0].reset_readahead(&self.sources[0]);
         self.drive();
         Some(batch)
     }
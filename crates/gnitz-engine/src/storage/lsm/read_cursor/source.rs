@@ -44,6 +44,19 @@ impl CursorSource {
         }
     }
 
+    /// Whether this source may hold a PK beginning with `prefix`; `padded` is
+    /// `prefix` zero-extended to the full stride. A batch answers exactly with
+    /// one in-memory lower bound; a shard consults its key range and filters.
+    pub(super) fn may_contain_prefix(&self, prefix: &[u8], padded: &[u8]) -> bool {
+        match self {
+            CursorSource::Batch(b) => {
+                let idx = b.find_lower_bound_bytes(padded);
+                idx < b.count && b.get_pk_bytes(idx).starts_with(prefix)
+            }
+            CursorSource::Shard(s) => s.may_contain_prefix(prefix),
+        }
+    }
+
     /// Build a `UnifiedSource` view backed by either a `MemBatch`'s flat data
     /// buffer (always Raw regions) or a `MappedShard`'s mmap (Raw or Constant
     /// regions, indexed by payload position).
@@ -1023,6 +1023,30 @@ fn write_test_shard_u64(
     Rc::new(MappedShard::open(&cpath, schema, false).unwrap())
 }
 
+/// `may_contain_prefix` answers from every source without moving the cursor:
+/// a key held only by the in-memory batch, or only by the shard, is reported;
+/// a key neither holds is rejected (the batch exactly, the shard by key range
+/// or XOR8), so the co-group skip can drop it without a seek.
+#[test]
+fn may_contain_prefix_consults_every_source() {
+    let dir = tempfile::tempdir().unwrap();
+    let schema = make_schema_u128_i64();
+    let shard = write_test_shard(&dir, &schema, 0, &[(10, 1, 0), (20, 1, 0), (30, 1, 0)], 0);
+    let batch = make_batch(&[(15, 1, 0)]);
+    let mut cursor = create_read_cursor(&[batch], &[shard], schema);
+    cursor.seek_bytes(&20u128.to_be_bytes());
+    for pk in [10u128, 15, 20, 30] {
+        assert!(cursor.may_contain_prefix(&pk.to_be_bytes()), "pk {pk}");
+    }
+    assert!(!cursor.may_contain_prefix(&5u128.to_be_bytes()));
+    assert!(!cursor.may_contain_prefix(&40u128.to_be_bytes()));
+    assert_eq!(
+        cursor.current_pk_bytes(),
+        20u128.to_be_bytes(),
+        "probe must not move the cursor"
+    );
+}
+
 /// The PkUnique drive path (all sources flagged `is_pk_unique`, payload
 /// comparison skipped) and the payload path (same bytes, flag cleared) must
 /// produce identical output on contract-satisfying unique-PK data. Only the
@@ -2206,3 +2230,44 @@ fn count_range_raw_does_not_reposition() {
     assert_eq!(counted.current_pk_bytes(), plain.current_pk_bytes());
     assert_eq!(scan_all(&mut counted), scan_all(&mut plain));
 }
+
+/// Readahead bookkeeping on a shard source: a sequential walk advises windows
+/// all the way to the end, a seek re-arms scan detection at the landing row,
+/// and a point lookup (seek + a few advances) never issues a window. Output is
+/// unaffected either way.
+#[test]
+fn shard_readahead_windows_follow_the_scan() {
+    crate::foundation::posix_io::raise_fd_limit_for_tests();
+    let dir = tempfile::tempdir().unwrap();
+    let schema = make_schema_u128_i64();
+    let n = READAHEAD_ROWS * 2 + 100;
+    let rows: Vec<(u128, i64, i64)> = (0..n as u128).map(|i| (i * 2, 1, i as i64)).collect();
+    let shard = write_test_shard(&dir, &schema, 0, &rows, 0);
+
+    let mut cursor = create_read_cursor(&[], &[Rc::clone(&shard)], schema);
+    assert_eq!(cursor.states[0].readahead_at, READAHEAD_DETECT_ROWS);
+    assert_eq!(scan_all(&mut cursor).len(), n);
+    assert_eq!(cursor.states[0].readahead_end, n);
+    assert_eq!(cursor.states[0].readahead_at, usize::MAX);
+
+    let mut cursor = create_read_cursor(&[], &[shard], schema);
+    cursor.seek_bytes(&2000u128.to_be_bytes());
+    assert_eq!(cursor.current_key_narrow(), 2000);
+    let landed = cursor.states[0].position;
+    assert_eq!(cursor.states[0].readahead_end, landed);
+    for _ in 0..4 {
+        cursor.advance();
+    }
+    assert_eq!(
+        cursor.states[0].readahead_end, landed,
+        "point walk stays below detection"
+    );
+    for _ in 0..READAHEAD_DETECT_ROWS {
+        cursor.advance();
+    }
+    assert!(cursor.states[0].readahead_end > landed + READAHEAD_DETECT_ROWS);
+    assert_eq!(
+        cursor.current_key_narrow(),
+        2000 + 2 * (4 + READAHEAD_DETECT_ROWS as u128)
+    );
+}
@@ -11,9 +11,13 @@ use super::super::compact;
 use super::super::error::StorageError;
 use super::super::shard_reader::MappedShard;
 use super::{
-    to_cstrings, FLSMLevel, ShardEntry, ShardIndex, GUARD_FILE_THRESHOLD, L0_COMPACT_THRESHOLD, L1_TARGET_FILES,
-    LMAX_FILE_THRESHOLD, MAX_LEVELS,
+    to_cstrings, AmplificationReport, FLSMLevel, ShardEntry, ShardIndex, GUARD_FILE_THRESHOLD, L0_COMPACT_THRESHOLD,
+    L1_TARGET_FILES, LMAX_FILE_THRESHOLD, MAX_LEVELS, TIERED_GUARD_FILE_THRESHOLD, TIERED_L0_COMPACT_THRESHOLD,
+    TIERED_L1_TARGET_FILES,
 };
+use crate::foundation::metrics::{self, Counter, Gauge, Hist};
+use crate::foundation::profile::{self, Zone};
+use gnitz_wire::{CompactionOptions, CompactionStrategy};
 
 impl ShardIndex {
     /// Enable `SHARD_FLAG_PK_UNIQUE` tagging for compacted shards.
@@ -27,6 +31,73 @@ impl ShardIndex {
         self.can_tag_pk_unique
     }
 
+    /// Embed a key-prefix filter over the leading `len` OPK bytes in every
+    /// shard written from now on (zero disables it).
+    pub fn set_prefix_filter_len(&mut self, len: u8) {
+        self.prefix_filter_len = len;
+    }
+
+    /// Key-prefix filter width for flushed shards (see `set_prefix_filter_len`).
+    pub(in crate::storage) fn prefix_filter_len(&self) -> u8 {
+        self.prefix_filter_len
+    }
+
+    /// Install the table's compaction policy (`WITH (compaction = …,
+    /// l0_trigger = …)`). Applies from the next `should_compact` check on; runs
+    /// already in the levels are not rewritten to match.
+    pub fn set_compaction_options(&mut self, opts: CompactionOptions) {
+        self.compaction = opts;
+    }
+
+    /// L0 run count above which `should_compact` fires: the table's explicit
+    /// `l0_trigger`, else the strategy default.
+    pub(super) fn l0_trigger(&self) -> usize {
+        match (self.compaction.l0_trigger, self.compaction.strategy) {
+            (0, CompactionStrategy::Tiered) => TIERED_L0_COMPACT_THRESHOLD,
+            (0, _) => L0_COMPACT_THRESHOLD,
+            (t, _) => t as usize,
+        }
+    }
+
+    /// Files a guard of `level_idx` may hold before `compact_one_guard` folds
+    /// it. Tiered keeps a small tier even at Lmax.
+    pub(super) fn guard_file_threshold(&self, level_idx: usize) -> usize {
+        let is_lmax = Self::level_num(level_idx) == MAX_LEVELS - 1;
+        match (self.compaction.strategy, is_lmax) {
+            (CompactionStrategy::Tiered, true) => GUARD_FILE_THRESHOLD,
+            (CompactionStrategy::Tiered, false) => TIERED_GUARD_FILE_THRESHOLD,
+            (_, true) => LMAX_FILE_THRESHOLD,
+            (_, false) => GUARD_FILE_THRESHOLD,
+        }
+    }
+
+    /// L1 file count above which the fullest L1 guard folds down into L2.
+    /// `None` for time-windowed: each L1 guard is a window, and a closed
+    /// window is never rewritten again.
+    fn l1_target_files(&self) -> Option<usize> {
+        match self.compaction.strategy {
+            CompactionStrategy::Leveled => Some(L1_TARGET_FILES),
+            CompactionStrategy::Tiered => Some(TIERED_L1_TARGET_FILES),
+            CompactionStrategy::TimeWindowed => None,
+        }
+    }
+
+    /// Snapshot of the index's write/read amplification.
+    pub fn amplification(&self) -> AmplificationReport {
+        let runs_per_lookup = self.l0.len()
+            + self
+                .levels
+                .iter()
+                .map(|l| l.guards.iter().map(|g| g.entries.len()).max().unwrap_or(0))
+                .sum::<usize>();
+        AmplificationReport {
+            flushed_bytes: self.flushed_bytes,
+            compacted_bytes: self.compacted_bytes,
+            compactions: self.compactions,
+            runs_per_lookup,
+        }
+    }
+
     pub(super) fn all_entries(&self) -> impl Iterator<Item = &ShardEntry> {
         self.l0.iter().chain(
             self.levels
@@ -41,7 +112,9 @@ impl ShardIndex {
 
     pub fn add_shard(&mut self, path: &str, max_lsn: u64) -> Result<(), StorageError> {
         let entry = ShardEntry::open(path, &self.schema, max_lsn)?;
+        self.flushed_bytes += entry.shard.data().len() as u64;
         self.l0.push(entry);
+        metrics::gauge_add(Gauge::L0Runs, 1);
         self.sort_l0();
         Ok(())
     }
@@ -60,7 +133,7 @@ impl ShardIndex {
 
     /// Derived, not cached: the L0 tier crossed its compaction threshold.
     pub fn should_compact(&self) -> bool {
-        self.l0.len() > L0_COMPACT_THRESHOLD
+        self.l0.len() > self.l0_trigger()
     }
 
     /// Record a shard file written unsynced (spill or barrier fold) so the next
@@ -166,7 +239,13 @@ impl ShardIndex {
     /// Open every just-compacted output shard. On any failure, unlink all
     /// outputs so a failed compaction leaves no orphan on disk for the running
     /// session; callers mutate index state only after every open succeeded.
-    fn open_outputs(&self, outputs: &[(u128, String)], max_lsn: u64) -> Result<Vec<(u128, ShardEntry)>, StorageError> {
+    /// A successful open is one finished compaction: its output bytes are
+    /// charged to the write-amplification counters.
+    fn open_outputs(
+        &mut self,
+        outputs: &[(u128, String)],
+        max_lsn: u64,
+    ) -> Result<Vec<(u128, ShardEntry)>, StorageError> {
         let mut opened = Vec::with_capacity(outputs.len());
         for (gk, filename) in outputs {
             match ShardEntry::open(filename, &self.schema, max_lsn) {
@@ -179,10 +258,17 @@ impl ShardIndex {
                 }
             }
         }
+        let bytes = opened.iter().map(|(_, e)| e.shard.data().len() as u64).sum::<u64>();
+        self.compactions += 1;
+        self.compacted_bytes += bytes;
+        metrics::inc(Counter::Compactions);
+        metrics::add(Counter::CompactedBytes, bytes);
         Ok(opened)
     }
 
     pub fn run_compact(&mut self) -> Result<(), StorageError> {
+        let t0 = std::time::Instant::now();
+        let _z = profile::zone(Zone::Compaction);
         let compact_seq = self.next_compact_seq();
         let l0_filenames: Vec<String> = self.l0.iter().map(|e| e.filename.clone()).collect();
         let l0_max_lsn = self.l0.iter().map(|e| e.max_lsn).max().unwrap_or(0);
@@ -203,6 +289,7 @@ impl ShardIndex {
             1,
             compact_seq,
             self.can_tag_pk_unique,
+            self.prefix_filter_len,
         )?;
 
         self.commit_l0_to_l1(&guard_outputs, l0_max_lsn)?;
@@ -211,13 +298,13 @@ impl ShardIndex {
 
         self.compact_guards_if_needed()?;
 
-        if !self.levels.is_empty() {
-            let l1_count = self.levels[0].total_file_count();
-            if l1_count > L1_TARGET_FILES {
+        if let (Some(level), Some(target)) = (self.levels.first(), self.l1_target_files()) {
+            if level.total_file_count() > target {
                 self.compact_guard_vertical()?;
             }
         }
 
+        metrics::record_since(Hist::CompactionNs, t0);
         Ok(())
     }
 
@@ -231,7 +318,11 @@ impl ShardIndex {
             // Below-first-guard keys saturate to bucket 0 on both routing paths
             // (`find_guard_for_key` write, `find_guard_idx` read), so the raw
             // guard keys need no 0-anchor.
-            self.levels[0].guards.iter().map(|g| g.guard_key).collect()
+            let mut keys: Vec<u128> = self.levels[0].guards.iter().map(|g| g.guard_key).collect();
+            if self.compaction.strategy == CompactionStrategy::TimeWindowed {
+                self.extend_time_windows(&mut keys);
+            }
+            keys
         } else {
             // The guard space is the order-preserving `pack_pk_be` image of
             // the OPK pk_min bytes (a 16-byte prefix for wide PKs, the whole
@@ -258,6 +349,34 @@ impl ShardIndex {
         }
     }
 
+    /// Time-windowed compaction: open a new L1 guard (window) at each L0 run
+    /// whose rows all lie past the newest window's data, instead of routing
+    /// them into the newest window and re-folding it on every merge. The new key
+    /// must exceed the newest guard's `pk_max` image so every row already in
+    /// that guard keeps routing to it.
+    fn extend_time_windows(&self, keys: &mut Vec<u128>) {
+        let Some(newest) = self.levels[0].guards.last() else {
+            return;
+        };
+        let mut bound = newest
+            .entries
+            .iter()
+            .filter(|e| !e.is_empty())
+            .map(|e| crate::schema::key::pack_pk_be(e.pk_max.pk_bytes()))
+            .max()
+            .unwrap_or(newest.guard_key);
+        for e in &self.l0 {
+            if e.is_empty() {
+                continue;
+            }
+            let pk = crate::schema::key::pack_pk_be(e.pk_min.pk_bytes());
+            if pk > bound {
+                keys.push(pk);
+                bound = pk;
+            }
+        }
+    }
+
     fn commit_l0_to_l1(&mut self, guard_outputs: &[(u128, String)], max_lsn: u64) -> Result<(), StorageError> {
         self.ensure_level(1);
 
@@ -266,6 +385,7 @@ impl ShardIndex {
         let new_entries = self.open_outputs(guard_outputs, max_lsn)?;
 
         // All opens succeeded — safe to mutate state.
+        metrics::gauge_add(Gauge::L0Runs, -(self.l0.len() as i64));
         self.l0.clear();
         for (gk, entry) in new_entries {
             self.levels[0].get_or_create_guard(gk).entries.push(entry);
@@ -275,11 +395,7 @@ impl ShardIndex {
 
     pub(super) fn compact_guards_if_needed(&mut self) -> Result<(), StorageError> {
         for li in 0..self.levels.len() {
-            let threshold = if Self::level_num(li) == MAX_LEVELS - 1 {
-                LMAX_FILE_THRESHOLD
-            } else {
-                GUARD_FILE_THRESHOLD
-            };
+            let threshold = self.guard_file_threshold(li);
             self.compact_overfull_guards(li, threshold)?;
         }
         Ok(())
@@ -317,7 +433,13 @@ impl ShardIndex {
         let input_cstrs: Vec<&CStr> = input_cstrings.iter().map(|c| c.as_c_str()).collect();
         let out_cstr = super::super::cstr(out_path.as_str())?;
 
-        if let Err(e) = compact::compact_shards(&input_cstrs, &out_cstr, &self.schema, self.can_tag_pk_unique) {
+        if let Err(e) = compact::compact_shards(
+            &input_cstrs,
+            &out_cstr,
+            &self.schema,
+            self.can_tag_pk_unique,
+            self.prefix_filter_len,
+        ) {
             let _ = fs::remove_file(&out_path);
             return Err(e);
         }
@@ -415,6 +537,7 @@ impl ShardIndex {
             DEST_IDX as u32 + 1,
             compact_seq,
             self.can_tag_pk_unique,
+            self.prefix_filter_len,
         )?;
 
         let opened = self.open_outputs(&guard_outputs, vert_max_lsn)?;
@@ -430,8 +553,9 @@ impl ShardIndex {
             self.levels[dest_idx].get_or_create_guard(gk).entries.push(entry);
         }
 
-        // L2 is Lmax − 1 (MAX_LEVELS = 3), so its guards fold to one file.
-        self.compact_overfull_guards(dest_idx, LMAX_FILE_THRESHOLD)?;
+        // L2 is Lmax − 1 (MAX_LEVELS = 3), so its guards fold to the Lmax
+        // budget (one file, unless tiered).
+        self.compact_overfull_guards(dest_idx, self.guard_file_threshold(dest_idx))?;
 
         Ok(())
     }
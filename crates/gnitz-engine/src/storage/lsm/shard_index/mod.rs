@@ -16,6 +16,7 @@ use super::xor8;
 use crate::schema::key::PkBuf;
 use crate::schema::key::{compare_pk_bytes, pk_bytes_eq};
 use crate::schema::SchemaDescriptor;
+use gnitz_wire::CompactionOptions;
 
 mod index;
 mod persist;
@@ -36,6 +37,49 @@ const GUARD_FILE_THRESHOLD: usize = 4;
 const LMAX_FILE_THRESHOLD: usize = 1;
 const L1_TARGET_FILES: usize = 16;
 
+// Size-tiered variants of the thresholds above: every tier tolerates twice the
+// runs before a merge, and the deepest level keeps a tier of
+// `GUARD_FILE_THRESHOLD` runs instead of folding to one file.
+const TIERED_L0_COMPACT_THRESHOLD: usize = 2 * L0_COMPACT_THRESHOLD;
+const TIERED_GUARD_FILE_THRESHOLD: usize = 2 * GUARD_FILE_THRESHOLD;
+const TIERED_L1_TARGET_FILES: usize = 4 * L1_TARGET_FILES;
+
+/// Cumulative write/read amplification of one shard index (or, via
+/// [`AmplificationReport::absorb`], of every partition of a relation) since it
+/// was opened. Write amplification is measured in shard bytes: every byte a
+/// flush lands in L0 is counted once as `flushed_bytes`, and again under
+/// `compacted_bytes` each time a compaction rewrites it. Read amplification is
+/// the worst-case count of on-disk runs a point lookup may probe right now (every
+/// L0 run plus the fullest guard of each level); the XOR8 filters cut the
+/// runs actually *read*, not the runs consulted.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub struct AmplificationReport {
+    pub flushed_bytes: u64,
+    pub compacted_bytes: u64,
+    pub compactions: u64,
+    pub runs_per_lookup: usize,
+}
+
+impl AmplificationReport {
+    /// Bytes written to disk per byte flushed (`1.0` before any compaction;
+    /// `0.0` for an index that never flushed).
+    pub fn write_amplification(&self) -> f64 {
+        if self.flushed_bytes == 0 {
+            return 0.0;
+        }
+        (self.flushed_bytes + self.compacted_bytes) as f64 / self.flushed_bytes as f64
+    }
+
+    /// Fold another partition's report in: byte counters sum, and the read
+    /// amplification is the worst partition's (a lookup probes one partition).
+    pub fn absorb(&mut self, other: &AmplificationReport) {
+        self.flushed_bytes += other.flushed_bytes;
+        self.compacted_bytes += other.compacted_bytes;
+        self.compactions += other.compactions;
+        self.runs_per_lookup = self.runs_per_lookup.max(other.runs_per_lookup);
+    }
+}
+
 fn to_cstrings(strings: &[String]) -> Result<Vec<CString>, StorageError> {
     strings.iter().map(|f| super::super::cstr(f.as_str())).collect()
 }
@@ -184,6 +228,26 @@ pub struct ShardIndex {
     /// `compact_shards` / `merge_and_route` so compacted output shards
     /// are tagged correctly. Defaults to `false` (conservative).
     can_tag_pk_unique: bool,
+    /// OPK byte width of the key-prefix filter flushed and compacted shards
+    /// embed (`ShardWriteOpts::prefix_filter_len`); zero = none. Set for
+    /// secondary-index families to their indexed-value span.
+    prefix_filter_len: u8,
+    /// Per-table compaction policy, decoded from `TABLE_TAB.flags` by the
+    /// catalog. Defaults to leveled with the historical thresholds.
+    compaction: CompactionOptions,
+    /// Shard bytes landed in L0 by `add_shard` (flushes and spills).
+    flushed_bytes: u64,
+    /// Shard bytes written by compaction outputs, across all levels.
+    compacted_bytes: u64,
+    /// Number of `run_compact` rounds and guard folds executed.
+    compactions: u64,
+}
+
+/// Retire this index's L0 runs from the process-wide compaction-debt gauge.
+impl Drop for ShardIndex {
+    fn drop(&mut self) {
+        crate::foundation::metrics::gauge_add(crate::foundation::metrics::Gauge::L0Runs, -(self.l0.len() as i64));
+    }
 }
 
 impl ShardIndex {
@@ -198,6 +262,11 @@ impl ShardIndex {
             pending_deletions: Vec::new(),
             unsynced: Vec::new(),
             can_tag_pk_unique: false,
+            prefix_filter_len: 0,
+            compaction: CompactionOptions::default(),
+            flushed_bytes: 0,
+            compacted_bytes: 0,
+            compactions: 0,
         }
     }
 }
@@ -210,6 +279,7 @@ mod tests {
     use crate::foundation::posix_io::raise_fd_limit_for_tests;
     use crate::schema::{type_code, SchemaColumn, SchemaDescriptor};
     use crate::test_support::make_schema_u64_i64;
+    use gnitz_wire::CompactionStrategy;
 
     /// Synthetic 2-column compound PK schema: (U64, U64) PK + I64
     /// payload. 16-byte PK region, but the column-aware comparison
@@ -470,6 +540,125 @@ mod tests {
         }
     }
 
+    #[test]
+    fn test_compaction_policy_thresholds() {
+        raise_fd_limit_for_tests();
+        let dir = tempfile::tempdir().unwrap();
+        let schema = make_schema_u64_i64();
+        let mut idx = ShardIndex::new(42, dir.path().to_str().unwrap(), schema);
+        idx.set_compaction_options(CompactionOptions {
+            strategy: CompactionStrategy::Tiered,
+            l0_trigger: 0,
+        });
+
+        // Tiered tolerates twice the leveled L0 run count.
+        for i in 0..=TIERED_L0_COMPACT_THRESHOLD as u64 {
+            assert!(!idx.should_compact(), "tiered compacted early at {i} L0 runs");
+            let path = write_test_shard(dir.path(), &format!("t{i}.db"), &[i + 1], &[i as i64]);
+            idx.add_shard(&path, i + 1).unwrap();
+        }
+        assert!(idx.should_compact());
+
+        // Tiered guards hold up to TIERED_GUARD_FILE_THRESHOLD files before a fold.
+        assert_eq!(idx.guard_file_threshold(0), TIERED_GUARD_FILE_THRESHOLD);
+        assert_eq!(idx.guard_file_threshold(MAX_LEVELS - 2), GUARD_FILE_THRESHOLD);
+
+        // An explicit trigger overrides the strategy default.
+        idx.set_compaction_options(CompactionOptions {
+            strategy: CompactionStrategy::Leveled,
+            l0_trigger: 20,
+        });
+        assert!(!idx.should_compact());
+        assert_eq!(idx.guard_file_threshold(MAX_LEVELS - 2), LMAX_FILE_THRESHOLD);
+    }
+
+    #[test]
+    fn test_time_windowed_opens_new_windows() {
+        raise_fd_limit_for_tests();
+        let dir = tempfile::tempdir().unwrap();
+        let schema = make_schema_u64_i64();
+        let mut idx = ShardIndex::new(42, dir.path().to_str().unwrap(), schema);
+        idx.set_compaction_options(CompactionOptions {
+            strategy: CompactionStrategy::TimeWindowed,
+            l0_trigger: 0,
+        });
+
+        // Two rounds of monotonically increasing ("time-ordered") keys.
+        let mut all_pks = Vec::new();
+        for round in 0..2u64 {
+            for i in 0..5u64 {
+                let pk = round * 1000 + (i + 1) * 10;
+                let path = write_test_shard(dir.path(), &format!("w{round}_{i}.db"), &[pk, pk + 1], &[1, 2]);
+                idx.add_shard(&path, round * 5 + i + 1).unwrap();
+                all_pks.extend([pk, pk + 1]);
+            }
+            assert!(idx.should_compact());
+            let before: Vec<String> = idx.levels.first().map_or(Vec::new(), |l| {
+                l.guards
+                    .iter()
+                    .flat_map(|g| g.entries.iter().map(|e| e.filename.clone()))
+                    .collect()
+            });
+            idx.run_compact().unwrap();
+
+            // The second round lands in new windows past the first round's
+            // data; every file of the first round's windows survives untouched.
+            let after: Vec<&str> = idx.levels[0]
+                .guards
+                .iter()
+                .flat_map(|g| g.entries.iter().map(|e| e.filename.as_str()))
+                .collect();
+            for f in &before {
+                assert!(after.contains(&f.as_str()), "closed window file {f} was rewritten");
+            }
+        }
+        assert_eq!(idx.levels[0].guards.len(), 10, "one window per time-ordered L0 run");
+        assert_eq!(idx.levels.len(), 1, "time-windowed never folds L1 into L2");
+
+        for pk in all_pks {
+            let mut found = false;
+            idx.find_pk(pk as u128, &mut |_, _| found = true);
+            assert!(found, "key {pk} lost after windowed compaction");
+        }
+    }
+
+    #[test]
+    fn test_amplification_report() {
+        raise_fd_limit_for_tests();
+        let dir = tempfile::tempdir().unwrap();
+        let schema = make_schema_u64_i64();
+        let mut idx = ShardIndex::new(42, dir.path().to_str().unwrap(), schema);
+        assert_eq!(idx.amplification(), AmplificationReport::default());
+
+        let mut flushed = 0u64;
+        for i in 0..5u64 {
+            let path = write_test_shard(dir.path(), &format!("a{i}.db"), &[i + 1], &[i as i64]);
+            flushed += std::fs::metadata(&path).unwrap().len();
+            idx.add_shard(&path, i + 1).unwrap();
+        }
+        let report = idx.amplification();
+        assert_eq!(report.flushed_bytes, flushed);
+        assert_eq!(report.runs_per_lookup, 5, "every L0 run is probed");
+        assert_eq!(report.write_amplification(), 1.0);
+
+        idx.run_compact().unwrap();
+        let report = idx.amplification();
+        assert_eq!(report.flushed_bytes, flushed);
+        assert!(report.compacted_bytes > 0);
+        assert!(report.compactions >= 1);
+        assert!(report.write_amplification() > 1.0);
+        assert_eq!(report.runs_per_lookup, 1, "one run per guard after the L0→L1 merge");
+
+        // Partition reports sum bytes and keep the worst read amplification.
+        let mut total = AmplificationReport {
+            runs_per_lookup: 3,
+            ..AmplificationReport::default()
+        };
+        total.absorb(&report);
+        assert_eq!(total.flushed_bytes, flushed);
+        assert_eq!(total.runs_per_lookup, 3);
+    }
+
     #[test]
     fn test_compact_guard_vertical_failure_leaves_index_unchanged() {
         raise_fd_limit_for_tests();
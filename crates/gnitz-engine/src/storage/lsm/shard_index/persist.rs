@@ -8,6 +8,7 @@ use std::ffi::CStr;
 use super::super::error::StorageError;
 use super::super::manifest::{self, ManifestEntryRaw, ManifestHeader, PreparedManifest};
 use super::{ShardEntry, ShardIndex, MAX_LEVELS};
+use crate::foundation::metrics::{self, Gauge};
 
 /// Basename of a shard's full path — its manifest identity. Shard files always
 /// live flat in the table's `output_dir`, which `load_manifest` re-prepends.
@@ -71,6 +72,7 @@ impl ShardIndex {
 
             if raw.level == 0 {
                 self.l0.push(entry);
+                metrics::gauge_add(Gauge::L0Runs, 1);
             } else {
                 // Bound the level before `ensure_level`: a corrupted manifest
                 // with an arbitrary level would otherwise allocate thousands of
@@ -7,6 +7,7 @@
 use std::ptr;
 
 use super::super::batch::FIXED_REGION_BYTES;
+use super::super::block_cache;
 use super::super::merge::{ColPtr, UnifiedSource};
 use super::super::xor8;
 use super::{MappedShard, PackedRegion, PayloadRegion, ScalarRegion, WeightRegion};
@@ -238,6 +239,29 @@ impl MappedShard {
         }
     }
 
+    /// Whether any row of this shard may have a PK beginning with the OPK bytes
+    /// `prefix` (`1 ..= pk_stride` bytes). `false` is exact: the prefix lies
+    /// outside the shard's key range, or the filter built over exactly this
+    /// many leading bytes rejects it — the full-PK XOR8 for a whole key, the
+    /// key-prefix XOR8 for a secondary-index value. Any other width answers
+    /// from the key range alone.
+    pub fn may_contain_prefix(&self, prefix: &[u8]) -> bool {
+        if self.count == 0 {
+            return false;
+        }
+        let n = prefix.len();
+        if prefix < &self.get_pk_bytes(0)[..n] || prefix > &self.get_pk_bytes(self.count - 1)[..n] {
+            return false;
+        }
+        if n == self.pk_stride as usize {
+            return self.xor8_may_contain(xor8::fingerprint(prefix));
+        }
+        match &self.prefix_filter {
+            Some((len, filter)) if *len as usize == n => xor8::may_contain(filter, xor8::fingerprint(prefix)),
+            _ => true,
+        }
+    }
+
     /// Test-only u128 oracle that cross-checks `find_lower_bound_bytes` (the
     /// production path): binary search for the first row where PK >= key.
     /// Returns `count` if no such row exists.
@@ -270,12 +294,68 @@ impl MappedShard {
     /// First row whose OPK bytes are `>= key`. After the OPK-at-rest flip this
     /// is a raw `memcmp` binary search — correct at every PK width with no
     /// schema dependency. `key` must be exactly `pk_stride` OPK bytes.
+    ///
+    /// A Raw PK region is searched through the worker's block cache when one
+    /// is configured (see [`Self::cached_lower_bound`]); otherwise, and for a
+    /// Constant region (nothing to page in), straight over the mmap.
     pub fn find_lower_bound_bytes(&self, key: &[u8]) -> usize {
+        if let ScalarRegion::Raw { offset, .. } = self.pk {
+            if self.count > 0 {
+                if let Some(idx) = block_cache::with_cache(|c| self.cached_lower_bound(c, offset, key)) {
+                    return idx;
+                }
+            }
+        }
         let stride = self.pk_stride as usize;
         let cp = self.pk_col_ptr();
         super::super::columnar::lower_bound_opk(self.count, key, stride, |i| unsafe { cp.row(i, stride) })
     }
 
+    /// [`Self::find_lower_bound_bytes`] over cached copies of the Raw PK region
+    /// at `pk_offset`, cut into whole-row blocks of about `BLOCK_BYTES`. A
+    /// binary search over the blocks' first keys picks the one block that can
+    /// hold the bound, then the row search runs inside it — the upper probes
+    /// are shared by every seek, so they are exactly the blocks TinyLFU keeps.
+    pub(in crate::storage::lsm) fn cached_lower_bound(
+        &self,
+        cache: &mut block_cache::BlockCache,
+        pk_offset: usize,
+        key: &[u8],
+    ) -> usize {
+        let stride = self.pk_stride as usize;
+        let rows = (block_cache::BLOCK_BYTES / stride).max(1);
+        let n_blocks = self.count.div_ceil(rows);
+        let data = self.data();
+        // Block `b`'s bytes in the mmap; the cache copies them only on admission.
+        let mapped = |b: usize| {
+            let lo = pk_offset + b * rows * stride;
+            let hi = pk_offset + ((b + 1) * rows).min(self.count) * stride;
+            &data[lo..hi]
+        };
+        // First block whose leading key is `>= key`; the bound is in the block
+        // before it, or is row 0.
+        let (mut lo, mut hi) = (0usize, n_blocks);
+        while lo < hi {
+            let mid = lo + (hi - lo) / 2;
+            if cache.with_block((self.cache_id, mid as u64), mapped(mid), |blk| &blk[..stride] < key) {
+                lo = mid + 1;
+            } else {
+                hi = mid;
+            }
+        }
+        if lo == 0 {
+            return 0;
+        }
+        let b = lo - 1;
+        // `n` past the block's last row is the next block's first row (or
+        // `count`), which is exactly the bound when every row here is `< key`.
+        b * rows
+            + cache.with_block((self.cache_id, b as u64), mapped(b), |blk| {
+                let n = blk.len() / stride;
+                super::super::columnar::lower_bound_opk(n, key, stride, |i| &blk[i * stride..i * stride + stride])
+            })
+    }
+
     /// Galloping forward lower bound seeded at `hint` (the caller's live
     /// position): `O(log gap)` when the boundary is just ahead, `O(1)` when it
     /// IS the hint, never worse than `find_lower_bound_bytes`. Byte-identical
@@ -313,6 +393,9 @@ impl MappedShard {
         if row_count == 0 {
             return Batch::empty_with_schema(schema);
         }
+        // The copies below stream every region of the slice front to back; put
+        // all of their reads in flight up front rather than fault page by page.
+        self.prefetch_rows(start, start + row_count);
 
         let shard = self.data();
 
@@ -410,6 +493,42 @@ impl MappedShard {
         self.slice_to_owned_batch(0, self.count, schema)
     }
 
+    /// `MADV_WILLNEED` over the bytes rows `[start, end)` occupy in every
+    /// mmap-backed region, so the kernel has a sequential reader's next window
+    /// in flight before the reader faults on it. Raw regions are addressed
+    /// proportionally (`size × row / count`): exact for the fixed-width regions,
+    /// and a close estimate for the blob arena, which writers fill in row
+    /// order. Constant regions and FoR-packed payloads (decoded in one pass on
+    /// first touch) have nothing to read ahead. Best-effort.
+    pub(crate) fn prefetch_rows(&self, start: usize, end: usize) {
+        let end = end.min(self.count);
+        if start >= end {
+            return;
+        }
+        let at = |size: usize, row: usize| (size as u128 * row as u128 / self.count as u128) as usize;
+        let span = |offset: usize, size: usize| {
+            let lo = at(size, start);
+            self.mmap.advise(offset + lo, at(size, end) - lo, libc::MADV_WILLNEED);
+        };
+        if let ScalarRegion::Raw { offset, size } = self.pk {
+            span(offset, size);
+        }
+        match self.weight {
+            WeightRegion::Raw { offset } => span(offset, self.count * 8),
+            WeightRegion::TwoValue { bitvec_off, .. } => span(bitvec_off, self.count.div_ceil(8)),
+            WeightRegion::Constant { .. } => {}
+        }
+        if let ScalarRegion::Raw { offset, size } = self.null_bmp {
+            span(offset, size);
+        }
+        for region in &self.col_regions {
+            if let PayloadRegion::Scalar(ScalarRegion::Raw { offset, size }) = *region {
+                span(offset, size);
+            }
+        }
+        span(self.blob_off, self.blob_len);
+    }
+
     /// Derive a `UnifiedSource` view over this shard: each `ScalarRegion` becomes
     /// a `(base, stride)` `ColPtr` into the shard's mmap, with `Constant` regions
     /// mapped to `stride == 0` so `base.add(ri * stride) == base` reads the same
@@ -95,16 +95,27 @@ pub struct MappedShard {
     pub(crate) blob_len: usize,
     /// XOR8 membership filter (loaded from embedded header data).
     xor8_filter: Option<Xor8>,
+    /// `(prefix_len, filter)`: XOR8 over the leading `prefix_len` OPK bytes of
+    /// every row, present on secondary-index family shards.
+    prefix_filter: Option<(u8, Xor8)>,
     /// Physical byte width of each PK value on disk (8 for U64, 16 for U128/String).
     pub(crate) pk_stride: u8,
     /// True when `SHARD_FLAG_PK_UNIQUE` is set: this shard contains at most one
     /// positive-weight row per PK. When all cursor sources carry this flag, the
     /// payload comparator can be skipped on a cross-source PK tie.
     pub(crate) is_pk_unique: bool,
+    /// Process-unique id keying this shard's blocks in the worker's
+    /// [`block_cache`](super::block_cache); never reused after the shard drops.
+    cache_id: u64,
 }
 
-// MappedShard does not implement Drop — the owned `mmap: Mmap` field handles
-// `munmap` automatically when the shard is dropped.
+// The owned `mmap: Mmap` field handles `munmap`; Drop only releases the
+// shard's seek blocks, which would otherwise sit in the cache until evicted.
+impl Drop for MappedShard {
+    fn drop(&mut self) {
+        super::block_cache::forget_shard(self.cache_id);
+    }
+}
 
 #[cfg(test)]
 mod tests {
@@ -790,6 +801,36 @@ mod tests {
         }
     }
 
+    #[test]
+    fn cached_lower_bound_matches_find_lower_bound() {
+        raise_fd_limit_for_tests();
+        let dir = tempfile::tempdir().unwrap();
+        // 1000 16-byte keys span four cache blocks, the last one partial.
+        let pks: Vec<u128> = (0..1000u128).map(|i| i * 7 + 3).collect();
+        let vals: Vec<i64> = (0..pks.len() as i64).collect();
+        let path = build_test_shard_u128(dir.path(), "u128_cached.db", &pks, &vals);
+        let schema = u128_pk_schema();
+        let cpath = std::ffi::CString::new(path).unwrap();
+        let shard = MappedShard::open(&cpath, &schema, false).unwrap();
+        let ScalarRegion::Raw { offset, .. } = shard.pk else {
+            panic!("expected Raw PK region");
+        };
+        let probes: Vec<u128> = [0, 3, 4, 1795, 1796, 1797, 6995, 6996, u128::MAX]
+            .into_iter()
+            .chain((0..1000u128).map(|i| i * 7 + 5))
+            .collect();
+        // A one-block budget forces the admission/eviction paths as well.
+        for budget in [super::super::block_cache::BLOCK_BYTES, 1 << 20] {
+            let mut cache = super::super::block_cache::BlockCache::new(budget);
+            for &probe in &probes {
+                let got = shard.cached_lower_bound(&mut cache, offset, &probe.to_be_bytes());
+                assert_eq!(got, shard.find_lower_bound(probe), "budget={budget} probe={probe}");
+            }
+            let stats = cache.stats();
+            assert!(stats.hits > 0 && stats.resident_bytes <= budget);
+        }
+    }
+
     #[test]
     fn find_lower_bound_bytes_wide_pk_distinct() {
         // Wide PK (3xU64 all-PK, stride 24). Distinct PKs keep the shard PK
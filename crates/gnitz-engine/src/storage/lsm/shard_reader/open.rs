@@ -89,6 +89,11 @@ impl MappedShard {
 
         // Validate checksums
         if validate_checksums {
+            // A validating open is a whole-file pass followed by a front-to-back
+            // merge: compaction's input path, the only production caller. Let the
+            // kernel read ahead aggressively and drop pages behind, so a large
+            // compaction neither stalls on faults nor evicts the seek working set.
+            mmap.advise(0, file_size, libc::MADV_SEQUENTIAL);
             for e in &entries {
                 if e.size > 0 && xxh::checksum(&data[e.offset..e.offset + e.size]) != e.checksum {
                     return Err(StorageError::ChecksumMismatch);
@@ -234,6 +239,16 @@ impl MappedShard {
             None
         };
 
+        // The key-prefix filter is the file's last section (zero offset = the
+        // writer built none). A malformed section only loses the pruning.
+        let prefix_off = read_u64_le(data, OFF_PREFIX_XOR8_OFFSET) as usize;
+        let prefix_len = data[OFF_PREFIX_FILTER_LEN];
+        let prefix_filter = if prefix_off > 0 && prefix_len > 0 && prefix_off < file_size {
+            xor8::deserialize(&data[prefix_off..file_size]).map(|f| (prefix_len, f))
+        } else {
+            None
+        };
+
         // Read the flags byte written at OFF_FLAGS (byte 56). The `file_size`
         // guard is a defensive backstop; a well-formed shard always carries it.
         let is_pk_unique = file_size > OFF_FLAGS && (data[OFF_FLAGS] & SHARD_FLAG_PK_UNIQUE != 0);
@@ -248,8 +263,10 @@ impl MappedShard {
             blob_off,
             blob_len,
             xor8_filter,
+            prefix_filter,
             pk_stride,
             is_pk_unique,
+            cache_id: super::super::block_cache::next_shard_id(),
         })
     }
 }
@@ -18,6 +18,7 @@ use super::super::error::StorageError;
 use super::super::manifest::PreparedManifest;
 use super::super::memtable;
 use super::super::shard_file::{self, PkUniqueChecker};
+use super::super::write_buffer;
 use super::{FlushOutcome, FlushWork, InMemRun, RecoverySource, Table, INMEM_CEILING, INMEM_COMPACT_THRESHOLD};
 use crate::foundation::posix_io::{fdatasync_eintr, fsync_eintr, open_owned};
 
@@ -196,6 +197,7 @@ impl Table {
 
         if !self.in_memory_l0.is_empty() {
             self.persist_l0_run()?;
+            write_buffer::report(self.buffer_id, self.table_id, self.write_buffer_bytes());
         } else if !force_publish && !self.shard_index.has_unsynced() && !self.shard_index.has_pending_deletions() {
             // Nothing ingested since the last checkpoint, no unpublished spills,
             // and nothing compacted — the SAL covers it (base round only).
@@ -268,6 +270,7 @@ impl Table {
                 durable: false, // unsynced; the barrier sweep fdatasyncs it by path
                 flags: flush_flags,
                 pack_ints: false, // L0 spill/checkpoint shards stay plain (no FoR packing)
+                prefix_filter_len: self.shard_index.prefix_filter_len(),
             },
         );
         drop(dirfd);
@@ -316,6 +319,58 @@ impl Table {
         self.open_dirfd()
     }
 
+    // ------------------------------------------------------------------
+    // Worker write-buffer budget
+    // ------------------------------------------------------------------
+
+    /// Heap bytes of this table's write state: memtable runs plus the RAM tier.
+    pub(super) fn write_buffer_bytes(&self) -> usize {
+        self.memtable.runs_bytes() + self.in_memory_bytes()
+    }
+
+    /// Report the write state to the worker's budget manager after an ingest.
+    /// If the manager wants this table's memory back, release it before
+    /// returning — the ingest that pushed the worker over budget waits for
+    /// the spill instead of growing the heap further.
+    pub(super) fn account_write_buffer(&mut self) -> Result<(), StorageError> {
+        if write_buffer::report(self.buffer_id, self.table_id, self.write_buffer_bytes())
+            && self.release_write_buffer()?
+        {
+            write_buffer::record_release(true);
+        }
+        Ok(())
+    }
+
+    /// The worker sweep's entry point: release this table's write state if the
+    /// budget manager has asked for it, else do nothing.
+    pub fn release_write_buffer_if_requested(&mut self) -> Result<(), StorageError> {
+        if write_buffer::is_wanted(self.buffer_id) && self.release_write_buffer()? {
+            write_buffer::record_release(false);
+        }
+        Ok(())
+    }
+
+    /// Spill the memtable and RAM tier as one folded, unsynced shard — the
+    /// ceiling spill's commit path, minus the ceiling — and report the emptied
+    /// buffer. Returns `false` when the release must wait: spill shards are
+    /// named by `current_lsn`, and a shard at this LSN was already written
+    /// since the last ingest. The request is then deferred; the next ingest
+    /// (which bumps the LSN) reports again and may be asked anew.
+    fn release_write_buffer(&mut self) -> Result<bool, StorageError> {
+        self.fold_memtable_into_l0();
+        self.compact_in_memory();
+        if !self.in_memory_l0.is_empty() {
+            if self.shard_index.max_lsn() + 1 >= self.current_lsn {
+                write_buffer::defer(self.buffer_id);
+                return Ok(false);
+            }
+            self.persist_l0_run()?;
+            self.compact_if_needed()?;
+        }
+        write_buffer::report(self.buffer_id, self.table_id, self.write_buffer_bytes());
+        Ok(true)
+    }
+
     // ------------------------------------------------------------------
     // In-memory run set bounding + spill
     // ------------------------------------------------------------------
@@ -17,10 +17,12 @@ use super::error::StorageError;
 use super::manifest::PreparedManifest;
 use super::memtable::{self, MemTable};
 use super::read_cursor::{self, ReadCursor};
+pub use super::shard_index::AmplificationReport;
 use super::shard_index::ShardIndex;
 use super::shard_reader::MappedShard;
 use crate::schema::key::pack_pk_be;
 use crate::schema::SchemaDescriptor;
+use gnitz_wire::CompactionOptions;
 
 /// Fold `in_memory_l0` once it exceeds this many runs. Each fold re-merges the
 /// whole net-state window into one run, so the per-tick flush amplification is
@@ -43,7 +45,9 @@ const INMEM_COMPACT_THRESHOLD: usize = 16;
 /// state still exceeds it, the run set spills to a shard file. Bounds heap at
 /// this value per table at all times. The aggregate un-spilled RAM across the
 /// cluster is bounded by the un-checkpointed SAL tail: every ingested byte
-/// flows through the fsynced SAL, and a spill frees the RAM.
+/// flows through the fsynced SAL, and a spill frees the RAM. Within one worker
+/// the sum over its tables is also capped by the write-buffer budget
+/// (`write_buffer`), which spills the coldest/largest tables first.
 const INMEM_CEILING: usize = 4 * 1024 * 1024;
 
 // ---------------------------------------------------------------------------
@@ -244,6 +248,17 @@ pub struct Table {
     /// exercised without ingesting megabytes. `None` in production.
     #[cfg(test)]
     inmem_ceiling_override: Option<usize>,
+
+    /// This table's slot in the worker's write-buffer budget
+    /// ([`write_buffer`](super::write_buffer)); released on drop.
+    buffer_id: u64,
+}
+
+// The manager only holds numbers; dropping the table returns its share.
+impl Drop for Table {
+    fn drop(&mut self) {
+        super::write_buffer::forget(self.buffer_id);
+    }
 }
 
 mod flush;
@@ -322,6 +337,7 @@ impl Table {
             in_memory_l0: Vec::new(),
             #[cfg(test)]
             inmem_ceiling_override: None,
+            buffer_id: super::write_buffer::next_buffer_id(),
         };
 
         if load_shards {
@@ -350,6 +366,32 @@ impl Table {
         self.shard_index.enable_pk_unique_tagging();
     }
 
+    /// Embed a key-prefix XOR8 over the leading `len` OPK bytes in this
+    /// table's flushed and compacted shards — the secondary-index families,
+    /// whose lookups probe by indexed value. Zero (the default) disables it.
+    pub fn set_prefix_filter_len(&mut self, len: u8) {
+        self.shard_index.set_prefix_filter_len(len);
+    }
+
+    /// Select the on-disk compaction policy (the table's `WITH (compaction =
+    /// …)` option). The RAM tier's own fold (`INMEM_COMPACT_THRESHOLD`) is
+    /// policy-independent.
+    pub fn set_compaction_options(&mut self, opts: CompactionOptions) {
+        self.shard_index.set_compaction_options(opts);
+    }
+
+    /// Write/read amplification of this table's on-disk shards.
+    pub fn amplification(&self) -> AmplificationReport {
+        self.shard_index.amplification()
+    }
+
+    /// Heap bytes of the write state as `(memtable, ram_tier)`: the memtable's
+    /// sorted runs and the un-spilled `in_memory_l0` runs. Mapped shards are
+    /// page cache, not heap, and are not counted.
+    pub fn heap_bytes(&self) -> (usize, usize) {
+        (self.memtable.runs_bytes(), self.in_memory_bytes())
+    }
+
     // ------------------------------------------------------------------
     // Ingest
     // ------------------------------------------------------------------
@@ -376,7 +418,7 @@ impl Table {
         if self.memtable.should_flush() {
             self.flush_to_ram()?;
         }
-        Ok(())
+        self.account_write_buffer()
     }
 
     /// Ingest a borrowed Batch, copying it exactly once: an unconsolidated
@@ -1831,6 +1873,56 @@ mod tests {
         }
     }
 
+    /// Two tables share one small worker budget. Crossing it asks the larger
+    /// table back: the sweep spills its whole write state to a shard (rows
+    /// stay readable), and a table that is itself the victim spills inside
+    /// its own ingest (a stall) instead of growing past the budget.
+    #[test]
+    fn write_buffer_budget_spills_largest_table() {
+        use super::super::write_buffer;
+        let dir = tempfile::tempdir().unwrap();
+        let schema = make_schema_u64_i64();
+        let mut a = new_table(
+            &dir.path().join("wb_a"),
+            schema,
+            7300,
+            1 << 20,
+            RecoverySource::SalReplay,
+        );
+        let mut b = new_table(
+            &dir.path().join("wb_b"),
+            schema,
+            7301,
+            1 << 20,
+            RecoverySource::SalReplay,
+        );
+        let rows = |lo: u64, n: u64| -> Vec<(u64, i64, i64)> { (lo..lo + n).map(|k| (k, 1, k as i64)).collect() };
+        let per_row = {
+            let probe = make_batch(&rows(0, 1));
+            probe.total_bytes()
+        };
+        write_buffer::install_for_test(per_row * 30);
+
+        a.ingest_owned_batch(make_batch(&rows(0, 20))).unwrap();
+        b.ingest_owned_batch(make_batch(&rows(0, 15))).unwrap();
+        assert!(write_buffer::is_wanted(a.buffer_id), "the larger table is asked back");
+        assert!(!write_buffer::is_wanted(b.buffer_id));
+        assert!(a.write_buffer_bytes() > 0, "a quiet table waits for the sweep");
+
+        a.release_write_buffer_if_requested().unwrap();
+        assert_eq!(a.write_buffer_bytes(), 0);
+        assert!(!a.all_shard_arcs().is_empty(), "released rows live in a shard");
+        for k in 0..20u128 {
+            assert!(a.has_pk(k), "row {k} survives the release");
+        }
+
+        b.ingest_owned_batch(make_batch(&rows(100, 20))).unwrap();
+        assert_eq!(b.write_buffer_bytes(), 0, "the victim's own ingest spilled it");
+        let stats = write_buffer::write_buffer_stats();
+        assert_eq!((stats.swept, stats.stalls), (1, 1));
+        assert_eq!(stats.used_bytes, 0);
+    }
+
     /// Spill unification (SalReplay): a ceiling breach spills to
     /// `shard_{tid}_{lsn}.db` (the unified naming), registered with
     /// `max_lsn == current_lsn - 1`. Two spills land at distinct `current_lsn`
@@ -0,0 +1,371 @@
+//! Per-worker write-buffer manager: one memory budget shared by every table's
+//! heap-resident write state (memtable runs + the RAM tier `in_memory_l0`).
+//!
+//! Each `Table` caps its own heap at `INMEM_CEILING`, but a worker hosts
+//! thousands of tables once reduce traces, index circuits and join traces are
+//! counted, so the per-table cap alone does not bound the worker. Every table
+//! reports its buffered bytes here after each ingest and flush; when the sum
+//! crosses the budget the manager picks tables to release, coldest first and
+//! largest first within equal coldness, until the projected total falls back
+//! under the low watermark.
+//!
+//! Release is cooperative: the manager only owns numbers. A requested table
+//! spills its RAM tier on its next report (the ingest that pushed the worker
+//! over budget pays for the spill before it returns — the stall), and the
+//! worker sweeps the registered relations after each push/tick so a table that
+//! has gone quiet is released without waiting for its next write. A table that
+//! cannot spill yet withdraws its request and sits out victim selection until
+//! it reports again, so an unsatisfiable request never keeps the sweep running.
+//!
+//! `GNITZ_WRITE_BUFFER_BYTES` sets the server-wide budget; the default is a
+//! quarter of `available_memory_bytes()`. Each worker process gets an equal
+//! share of it (`write_buffer_attach_worker` resizes the manager post-fork).
+//! The manager is thread-local; workers are single-threaded processes.
+
+use std::cell::{Cell, RefCell};
+use std::sync::OnceLock;
+
+use rustc_hash::{FxHashMap, FxHashSet};
+
+/// A table not reported in this many manager reports counts as cold.
+const COLD_REPORTS: u64 = 256;
+
+/// Release down to `budget * LOW_WATERMARK_NUM / LOW_WATERMARK_DEN`, so one
+/// crossing spills enough to absorb the next few ingests without re-triggering.
+const LOW_WATERMARK_NUM: usize = 3;
+const LOW_WATERMARK_DEN: usize = 4;
+
+/// Server-wide budget from `GNITZ_WRITE_BUFFER_BYTES`; a missing, unparsable
+/// or zero value falls back to a quarter of the available memory.
+fn total_budget_bytes() -> usize {
+    static BUDGET: OnceLock<usize> = OnceLock::new();
+    *BUDGET.get_or_init(|| {
+        std::env::var("GNITZ_WRITE_BUFFER_BYTES")
+            .ok()
+            .and_then(|s| s.parse::<usize>().ok())
+            .filter(|&b| b > 0)
+            .unwrap_or_else(|| (crate::foundation::posix_io::available_memory_bytes() / 4).max(1))
+    })
+}
+
+/// This process's share of the server-wide budget: one worker's slice. The
+/// master and single-process mode see a worker count of 1 and keep it whole.
+fn budget_bytes() -> usize {
+    (total_budget_bytes() / crate::foundation::worker_ctx::num_workers().max(1) as usize).max(1)
+}
+
+/// One worker's write-buffer accounting since process start.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub struct WriteBufferStats {
+    pub budget_bytes: usize,
+    pub used_bytes: usize,
+    /// Registered tables currently holding buffered bytes.
+    pub tables: usize,
+    /// Releases the manager asked for.
+    pub requested: u64,
+    /// Releases performed by the writing table itself, inside its ingest.
+    pub stalls: u64,
+    /// Releases performed by the worker's sweep over quiet tables.
+    pub swept: u64,
+}
+
+struct Entry {
+    table_id: u32,
+    bytes: usize,
+    /// Manager report counter at this table's last report.
+    touched: u64,
+}
+
+pub(super) struct WriteBufferManager {
+    budget: usize,
+    entries: FxHashMap<u64, Entry>,
+    used: usize,
+    clock: u64,
+    /// Tables asked to release, with the bytes they held when asked.
+    wanted: FxHashMap<u64, usize>,
+    wanted_bytes: usize,
+    /// Tables that could not release when asked; skipped by victim selection
+    /// until their next report.
+    deferred: FxHashSet<u64>,
+    stats: WriteBufferStats,
+}
+
+impl WriteBufferManager {
+    pub(super) fn new(budget: usize) -> Self {
+        WriteBufferManager {
+            budget,
+            entries: FxHashMap::default(),
+            used: 0,
+            clock: 0,
+            wanted: FxHashMap::default(),
+            wanted_bytes: 0,
+            deferred: FxHashSet::default(),
+            stats: WriteBufferStats::default(),
+        }
+    }
+
+    /// Record that buffer `id` (owned by `table_id`) now holds `bytes`, and
+    /// pick release victims if the worker is over budget.
+    pub(super) fn report(&mut self, id: u64, table_id: u32, bytes: usize) {
+        self.clock += 1;
+        let clock = self.clock;
+        self.deferred.remove(&id);
+        let prev = match self.entries.get_mut(&id) {
+            Some(e) => {
+                e.touched = clock;
+                std::mem::replace(&mut e.bytes, bytes)
+            }
+            None => {
+                if bytes == 0 {
+                    return;
+                }
+                self.entries.insert(
+                    id,
+                    Entry {
+                        table_id,
+                        bytes,
+                        touched: clock,
+                    },
+                );
+                0
+            }
+        };
+        self.used = self.used - prev + bytes;
+        if bytes == 0 {
+            self.entries.remove(&id);
+            self.unwant(id);
+        }
+        if self.used - self.wanted_bytes.min(self.used) > self.budget {
+            self.select_victims();
+        }
+    }
+
+    /// Drop buffer `id` (its table was dropped).
+    pub(super) fn forget(&mut self, id: u64) {
+        if let Some(e) = self.entries.remove(&id) {
+            self.used -= e.bytes;
+        }
+        self.unwant(id);
+        self.deferred.remove(&id);
+    }
+
+    /// Withdraw buffer `id`'s request: it cannot release until its next ingest,
+    /// which reports it and makes it a candidate again. Meanwhile other tables
+    /// are picked in its place.
+    pub(super) fn defer(&mut self, id: u64) {
+        self.unwant(id);
+        self.deferred.insert(id);
+        if self.used - self.wanted_bytes.min(self.used) > self.budget {
+            self.select_victims();
+        }
+    }
+
+    fn unwant(&mut self, id: u64) {
+        if let Some(b) = self.wanted.remove(&id) {
+            self.wanted_bytes -= b;
+        }
+    }
+
+    /// Ask the coldest, then largest, unrequested tables to release until the
+    /// projected usage is under the low watermark.
+    fn select_victims(&mut self) {
+        let target = self.budget / LOW_WATERMARK_DEN * LOW_WATERMARK_NUM;
+        let clock = self.clock;
+        let mut candidates: Vec<(bool, usize, u64)> = self
+            .entries
+            .iter()
+            .filter(|(id, _)| !self.wanted.contains_key(id) && !self.deferred.contains(id))
+            .map(|(&id, e)| (clock - e.touched >= COLD_REPORTS, e.bytes, id))
+            .collect();
+        candidates.sort_unstable_by(|a, b| b.cmp(a));
+        for (_, bytes, id) in candidates {
+            if self.used - self.wanted_bytes.min(self.used) <= target {
+                break;
+            }
+            self.wanted.insert(id, bytes);
+            self.wanted_bytes += bytes;
+            self.stats.requested += 1;
+        }
+    }
+
+    /// Whether buffer `id` has been asked to release. The request stays until
+    /// the table reports an empty buffer, is deferred, or is forgotten.
+    pub(super) fn is_wanted(&self, id: u64) -> bool {
+        self.wanted.contains_key(&id)
+    }
+
+    pub(super) fn has_requests(&self) -> bool {
+        !self.wanted.is_empty()
+    }
+
+    pub(super) fn stats(&self) -> WriteBufferStats {
+        WriteBufferStats {
+            budget_bytes: self.budget,
+            used_bytes: self.used,
+            tables: self.entries.len(),
+            ..self.stats
+        }
+    }
+
+    /// The `n` largest buffers as `(table_id, bytes)`, largest first.
+    pub(super) fn largest(&self, n: usize) -> Vec<(u32, usize)> {
+        let mut all: Vec<(u32, usize)> = self.entries.values().map(|e| (e.table_id, e.bytes)).collect();
+        all.sort_unstable_by(|a, b| b.1.cmp(&a.1).then(a.0.cmp(&b.0)));
+        all.truncate(n);
+        all
+    }
+}
+
+thread_local! {
+    static MANAGER: RefCell<Option<WriteBufferManager>> = const { RefCell::new(None) };
+    static NEXT_BUFFER_ID: Cell<u64> = const { Cell::new(1) };
+}
+
+fn with_manager<R>(f: impl FnOnce(&mut WriteBufferManager) -> R) -> R {
+    MANAGER.with(|m| {
+        f(m.borrow_mut()
+            .get_or_insert_with(|| WriteBufferManager::new(budget_bytes())))
+    })
+}
+
+/// A fresh buffer id for a newly opened table.
+pub(super) fn next_buffer_id() -> u64 {
+    NEXT_BUFFER_ID.with(|c| {
+        let id = c.get();
+        c.set(id + 1);
+        id
+    })
+}
+
+/// Report buffer `id`'s current size; returns whether it should release now.
+pub(super) fn report(id: u64, table_id: u32, bytes: usize) -> bool {
+    with_manager(|m| {
+        m.report(id, table_id, bytes);
+        m.is_wanted(id)
+    })
+}
+
+pub(super) fn forget(id: u64) {
+    MANAGER.with(|m| {
+        if let Some(m) = m.borrow_mut().as_mut() {
+            m.forget(id);
+        }
+    });
+}
+
+/// Buffer `id` was asked to release but cannot yet; see
+/// [`WriteBufferManager::defer`].
+pub(super) fn defer(id: u64) {
+    with_manager(|m| m.defer(id));
+}
+
+pub(super) fn is_wanted(id: u64) -> bool {
+    MANAGER.with(|m| m.borrow().as_ref().is_some_and(|m| m.is_wanted(id)))
+}
+
+/// Count one completed release, inline (`stall`) or by the worker's sweep.
+pub(super) fn record_release(stall: bool) {
+    with_manager(|m| {
+        if stall {
+            m.stats.stalls += 1;
+        } else {
+            m.stats.swept += 1;
+        }
+    });
+}
+
+/// Whether any table has an outstanding release request — the worker's cue to
+/// sweep its relations.
+pub fn write_buffer_has_requests() -> bool {
+    MANAGER.with(|m| m.borrow().as_ref().is_some_and(|m| m.has_requests()))
+}
+
+/// Size this process's manager to one worker's share of the budget. Called by
+/// each forked worker once its rank is latched: a manager the master built
+/// before the fork is inherited with the master's whole budget.
+pub fn write_buffer_attach_worker() {
+    with_manager(|m| m.budget = budget_bytes());
+}
+
+/// This worker's write-buffer accounting.
+pub fn write_buffer_stats() -> WriteBufferStats {
+    with_manager(|m| m.stats())
+}
+
+/// This worker's `n` largest table write buffers as `(table_id, bytes)`.
+pub fn write_buffer_largest(n: usize) -> Vec<(u32, usize)> {
+    with_manager(|m| m.largest(n))
+}
+
+/// Test helper: give this thread a fresh manager with `budget` bytes.
+#[cfg(test)]
+pub(super) fn install_for_test(budget: usize) {
+    MANAGER.with(|m| *m.borrow_mut() = Some(WriteBufferManager::new(budget)));
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn under_budget_requests_nothing() {
+        let mut m = WriteBufferManager::new(1000);
+        m.report(1, 10, 400);
+        m.report(2, 20, 500);
+        assert!(!m.has_requests());
+        assert_eq!(m.stats().used_bytes, 900);
+        assert_eq!(m.largest(1), vec![(20, 500)]);
+    }
+
+    /// Crossing the budget asks the largest table first and stops once the
+    /// projected usage is under the 3/4 low watermark.
+    #[test]
+    fn over_budget_requests_largest_until_low_watermark() {
+        let mut m = WriteBufferManager::new(1000);
+        m.report(1, 10, 300);
+        m.report(2, 20, 500);
+        m.report(3, 30, 250);
+        assert!(m.is_wanted(2));
+        assert!(!m.is_wanted(1) && !m.is_wanted(3), "1050 - 500 is already under 750");
+        assert_eq!(m.stats().requested, 1);
+        // Releasing clears the request and the usage.
+        m.report(2, 20, 0);
+        assert!(!m.has_requests());
+        assert_eq!(m.stats().used_bytes, 550);
+    }
+
+    /// A table that has not reported for `COLD_REPORTS` reports is released
+    /// before a larger table that is still being written.
+    #[test]
+    fn cold_tables_release_before_hot_ones() {
+        let mut m = WriteBufferManager::new(1000);
+        m.report(1, 10, 200);
+        for _ in 0..COLD_REPORTS {
+            m.report(2, 20, 600);
+        }
+        m.report(2, 20, 900);
+        assert!(m.is_wanted(1), "cold table goes first");
+        assert!(m.is_wanted(2), "1100 - 200 is still over the watermark");
+        m.forget(1);
+        m.forget(2);
+        assert_eq!(m.stats().used_bytes, 0);
+        assert!(!m.has_requests());
+    }
+
+    /// A victim that cannot release withdraws its request, another table is
+    /// asked instead, and the deferred one is a candidate again once it reports.
+    #[test]
+    fn deferred_release_clears_the_request() {
+        let mut m = WriteBufferManager::new(1000);
+        m.report(1, 10, 300);
+        m.report(2, 20, 800);
+        assert!(m.is_wanted(2) && !m.is_wanted(1));
+        m.defer(2);
+        assert!(!m.is_wanted(2));
+        assert!(m.is_wanted(1), "the next candidate is asked in its place");
+        m.defer(1);
+        assert!(!m.has_requests(), "nothing left that can release");
+        m.report(2, 20, 900);
+        assert!(m.is_wanted(2), "a fresh report makes it a candidate again");
+    }
+}
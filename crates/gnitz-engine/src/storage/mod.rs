@@ -24,9 +24,13 @@ pub use crate::schema::key::{partition_for_key, partition_for_pk_bytes};
 pub use batch::{write_to_batch, Batch};
 pub use batch_wire::decode_mem_batch_from_wal_block;
 pub use error::StorageError;
+pub use lsm::block_cache::block_cache_stats;
 pub use lsm::partitioned_table::{partition_range, PartitionedTable, Routing, NUM_PARTITIONS};
+pub use lsm::write_buffer::{
+    write_buffer_attach_worker, write_buffer_has_requests, write_buffer_largest, write_buffer_stats,
+};
 
-pub use lsm::table::{FlushOutcome, FlushWork, RecoverySource, Table};
+pub use lsm::table::{AmplificationReport, FlushOutcome, FlushWork, RecoverySource, Table};
 pub use merge::MemBatch;
 pub use scatter::{scatter_copy, scatter_multi_source};
 
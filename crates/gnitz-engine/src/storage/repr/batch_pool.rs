@@ -51,6 +51,24 @@ pub(crate) fn recycle_buf(mut buf: Vec<u8>) {
     });
 }
 
+/// Capacity bytes held idle in this thread's pool.
+pub(crate) fn pooled_bytes() -> usize {
+    BUF_POOL
+        .try_with(|p| {
+            let pool = p.take();
+            let bytes = pool.iter().map(Vec::capacity).sum();
+            p.set(pool);
+            bytes
+        })
+        .unwrap_or(0)
+}
+
+/// Free every pooled buffer. Called under memory pressure: the pool refills
+/// from the next batches dropped.
+pub(crate) fn trim() {
+    let _ = BUF_POOL.try_with(|p| drop(p.take()));
+}
+
 /// A pooled send buffer that returns itself to the pool on drop.
 pub(crate) struct PooledSendBuf(pub(crate) Vec<u8>);
 
@@ -123,4 +141,15 @@ mod tests {
         }
         assert_eq!(count, MAX_POOLED);
     }
+
+    #[test]
+    fn trim_empties_pool_and_pooled_bytes_counts_capacity() {
+        drain_pool();
+        recycle_buf(Vec::with_capacity(1000));
+        recycle_buf(Vec::with_capacity(24));
+        assert!(pooled_bytes() >= 1024);
+        trim();
+        assert_eq!(pooled_bytes(), 0);
+        assert_eq!(acquire_buf().capacity(), 0, "trimmed pool must be empty");
+    }
 }
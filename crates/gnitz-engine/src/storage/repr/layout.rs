@@ -10,7 +10,9 @@ pub(crate) const OFF_MAGIC: usize = 0;
 pub(crate) const OFF_VERSION: usize = 8;
 pub(crate) const OFF_ROW_COUNT: usize = 16;
 pub(crate) const OFF_DIR_OFFSET: usize = 24;
-// Bytes [32,40) reserved (zero).
+/// Offset of the optional key-prefix XOR8 section (zero = absent). The
+/// section is the last thing in the file, so its size is `file_size - offset`.
+pub(crate) const OFF_PREFIX_XOR8_OFFSET: usize = 32;
 pub(crate) const OFF_XOR8_OFFSET: usize = 40;
 pub(crate) const OFF_XOR8_SIZE: usize = 48;
 
@@ -25,9 +27,13 @@ pub(crate) const ENCODING_TWO_VALUE: u8 = 0x02;
 pub(crate) const ENCODING_FOR: u8 = 0x03;
 
 /// Byte offset of the one-byte flags field in the shard header.
-/// Bytes [57,64) are reserved (zero).
 pub(crate) const OFF_FLAGS: usize = 56;
 
+/// Byte offset of the key-prefix filter's prefix length (OPK bytes of the
+/// leading PK columns it was built over; zero when the shard carries none).
+/// Bytes [58,64) are reserved (zero).
+pub(crate) const OFF_PREFIX_FILTER_LEN: usize = 57;
+
 /// Shard header flag: at most one positive-weight row per PK key in this shard.
 /// Only set for base-table shards that pass `PkUniqueChecker`; never set for
 /// intermediate views, secondary index tables, or shards containing retractions.
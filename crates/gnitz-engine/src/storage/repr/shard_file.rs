@@ -398,6 +398,27 @@ fn build_xor8_from_pk_region(pk_bytes: &[u8], stride: usize) -> Option<Xor8> {
     xor8::build(keys)
 }
 
+/// Build the key-prefix filter: an XOR8 over the leading `prefix_len` OPK bytes
+/// of every row. The sorted PK region keeps equal prefixes adjacent, so the same
+/// predecessor skip as [`build_xor8_from_pk_region`] shrinks a secondary-index
+/// family (many source PKs per indexed value) to one key per distinct value.
+fn build_prefix_xor8_from_pk_region(pk_bytes: &[u8], stride: usize, prefix_len: usize) -> Option<Xor8> {
+    if pk_bytes.is_empty() || prefix_len == 0 || prefix_len > stride {
+        return None;
+    }
+    let mut keys: Vec<u64> = Vec::new();
+    let mut prev: Option<&[u8]> = None;
+    for chunk in pk_bytes.chunks_exact(stride) {
+        let prefix = &chunk[..prefix_len];
+        if prev == Some(prefix) {
+            continue;
+        }
+        prev = Some(prefix);
+        keys.push(xxh::hash_u128(xor8::fingerprint(prefix)));
+    }
+    xor8::build(keys)
+}
+
 /// Per-call policy for the shard writers ([`write_shard_streaming`] /
 /// `Batch::write_as_shard`).
 ///
@@ -407,11 +428,16 @@ fn build_xor8_from_pk_region(pk_bytes: &[u8], stride: usize) -> Option<Xor8> {
 /// `flags` is the persisted `OFF_FLAGS` header byte (`SHARD_FLAG_PK_UNIQUE`).
 /// `pack_ints` enables FoR (`ENCODING_FOR`) on eligible integer payload
 /// regions — set only by compaction; L0 spill/checkpoint writers stay raw.
+/// `prefix_filter_len` (OPK bytes, zero = none) additionally embeds an XOR8
+/// over each row's leading PK bytes — set for secondary-index families, whose
+/// lookups probe by the indexed value alone (a strict PK prefix the full-PK
+/// filter cannot answer).
 #[derive(Clone, Copy, Default)]
 pub struct ShardWriteOpts {
     pub durable: bool,
     pub flags: u8,
     pub pack_ints: bool,
+    pub prefix_filter_len: u8,
 }
 
 /// Write the .tmp shard, then fdatasync (if `opts.durable`), close, and rename
@@ -527,6 +553,14 @@ fn write_shard_streaming_inner(
         None
     };
 
+    // A prefix as wide as the PK would just duplicate the full-PK filter.
+    let prefix_len = opts.prefix_filter_len as usize;
+    let prefix_filter = if row_count > 0 && prefix_len < schema.pk_stride() as usize {
+        build_prefix_xor8_from_pk_region(regions[REG_PK], schema.pk_stride() as usize, prefix_len)
+    } else {
+        None
+    };
+
     // --- Phase 3: compute offsets ---
     let dir_size = num_regions * DIR_ENTRY_SIZE;
     let dir_offset = HEADER_SIZE;
@@ -542,11 +576,17 @@ fn write_shard_streaming_inner(
     let xor8_data = xor8_filter.as_ref().map(xor8::serialize);
     let xor8_offset = if xor8_data.is_some() { align64(data_end) } else { 0 };
     let xor8_size = xor8_data.as_ref().map_or(0, |d| d.len());
-    let total_size = if xor8_data.is_some() {
+    let filters_end = if xor8_data.is_some() {
         xor8_offset + xor8_size
     } else {
         data_end
     };
+    let prefix_data = prefix_filter.as_ref().map(xor8::serialize);
+    let prefix_offset = if prefix_data.is_some() { align64(filters_end) } else { 0 };
+    let total_size = match &prefix_data {
+        Some(d) => prefix_offset + d.len(),
+        None => filters_end,
+    };
 
     // --- Phase 4: build header + directory buffer ---
     let hdr_dir_size = HEADER_SIZE + dir_size;
@@ -582,6 +622,10 @@ fn write_shard_streaming_inner(
     write_u64_le(&mut hdr_buf, OFF_XOR8_OFFSET, xor8_offset as u64);
     write_u64_le(&mut hdr_buf, OFF_XOR8_SIZE, xor8_size as u64);
     hdr_buf[OFF_FLAGS] = opts.flags;
+    if prefix_data.is_some() {
+        write_u64_le(&mut hdr_buf, OFF_PREFIX_XOR8_OFFSET, prefix_offset as u64);
+        hdr_buf[OFF_PREFIX_FILTER_LEN] = opts.prefix_filter_len;
+    }
 
     let tmp_name = super::super::cstr_with_tmp_suffix(basename)?;
 
@@ -615,6 +659,10 @@ fn write_shard_streaming_inner(
             crate::foundation::posix_io::pwrite_all_fd(fd.as_raw_fd(), data, xor8_offset as libc::off_t)
                 .map_err(|_| abort())?;
         }
+        if let Some(ref data) = prefix_data {
+            crate::foundation::posix_io::pwrite_all_fd(fd.as_raw_fd(), data, prefix_offset as libc::off_t)
+                .map_err(|_| abort())?;
+        }
 
         Ok((fd, tmp_name))
     }
@@ -863,6 +911,73 @@ mod tests {
         }
     }
 
+    /// A compound `(U64, U64)` PK written with `prefix_filter_len = 8` carries
+    /// a key-prefix filter over the leading column: every stored value answers
+    /// `true`, values outside the key range answer `false`, and absent in-range
+    /// values are rejected up to XOR8's false-positive rate. A full-width probe
+    /// still goes through the PK filter.
+    #[test]
+    fn prefix_filter_roundtrip_compound_pk() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("prefix.db");
+        let cpath = std::ffi::CString::new(path.to_str().unwrap()).unwrap();
+        let schema = SchemaDescriptor::new(
+            &[
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::U64, 0),
+                SchemaColumn::new(type_code::I64, 0),
+            ],
+            &[0, 1],
+        );
+        // Leading values 0, 10, 20, … each with three suffix rows.
+        let rows: Vec<(u64, u64)> = (0..200u64).flat_map(|v| (0..3u64).map(move |s| (v * 10, s))).collect();
+        let pk_bytes: Vec<u8> = rows
+            .iter()
+            .flat_map(|&(a, b)| a.to_be_bytes().into_iter().chain(b.to_be_bytes()))
+            .collect();
+        let weights = vec![1i64; rows.len()];
+        let nulls = vec![0u64; rows.len()];
+        let vals: Vec<i64> = (0..rows.len() as i64).collect();
+        let blob: Vec<u8> = vec![];
+        let regions: Vec<&[u8]> = vec![
+            &pk_bytes,
+            as_le_bytes(&weights),
+            as_le_bytes(&nulls),
+            as_le_bytes(&vals),
+            &blob,
+        ];
+        let opts = ShardWriteOpts {
+            prefix_filter_len: 8,
+            ..Default::default()
+        };
+        write_shard_streaming(libc::AT_FDCWD, &cpath, rows.len() as u32, &regions, &schema, opts).unwrap();
+        let image = std::fs::read(&path).unwrap();
+        assert!(read_u64_le(&image, OFF_PREFIX_XOR8_OFFSET) > 0);
+        assert_eq!(image[OFF_PREFIX_FILTER_LEN], 8);
+
+        let shard = MappedShard::open(&cpath, &schema, true).unwrap();
+        for v in 0..200u64 {
+            assert!(
+                shard.may_contain_prefix(&(v * 10).to_be_bytes()),
+                "stored value {}",
+                v * 10
+            );
+        }
+        assert!(!shard.may_contain_prefix(&2000u64.to_be_bytes()), "above the key range");
+        let rejected = (0..200u64)
+            .filter(|v| !shard.may_contain_prefix(&(v * 10 + 5).to_be_bytes()))
+            .count();
+        assert!(
+            rejected >= 190,
+            "prefix filter rejected only {rejected}/200 absent values"
+        );
+
+        let mut full = [0u8; 16];
+        full[..8].copy_from_slice(&10u64.to_be_bytes());
+        full[8..].copy_from_slice(&2u64.to_be_bytes());
+        assert!(shard.may_contain_prefix(&full));
+    }
+
     /// Pins every `(region role → encoding)` pair the writer can emit to today's
     /// behavior. A shard has one weight and one null_bmp region, so one shard can
     /// pin at most one weight and one null encoding; three shards choreograph all
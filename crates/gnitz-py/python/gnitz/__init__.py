@@ -1,7 +1,7 @@
 from gnitz._native import (
     GnitzError, GnitzConflictError, ExprBuilder, ExprProgram, Row, ScanResult, RustBatch,
     ColumnDef, Schema, ZSetBatch, CircuitBuilder, Circuit, GnitzClient,
-    SCHEMA_TAB, TABLE_TAB, VIEW_TAB, COL_TAB, IDX_TAB, DEP_TAB, SEQ_TAB,
+    SCHEMA_TAB, TABLE_TAB, VIEW_TAB, COL_TAB, IDX_TAB, DEP_TAB, SEQ_TAB, VIEW_STATS_TAB,
     FIRST_USER_TABLE_ID, FIRST_USER_SCHEMA_ID, unpack_pk_cols,
 )
 from gnitz._types import TypeCode
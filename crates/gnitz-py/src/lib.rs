@@ -1493,7 +1493,20 @@ impl PyGnitzClient {
         // The Python binding stays single-PK; compound PKs are reached through
         // SQL DDL. Partitioned, default distribution; no inline UNIQUE surface.
         let c = client!(self);
-        to_py_err(py.allow_threads(|| c.create_table(schema_name, table_name, &cols, &pk, unique_pk, false, 0, &[])))
+        to_py_err(py.allow_threads(|| {
+            c.create_table(
+                schema_name,
+                table_name,
+                &cols,
+                &pk,
+                unique_pk,
+                false,
+                false,
+                0,
+                Default::default(),
+                &[],
+            )
+        }))
     }
 
     pub fn drop_table(&mut self, py: Python<'_>, schema_name: &str, table_name: &str) -> PyResult<()> {
@@ -1613,6 +1626,132 @@ impl PyGnitzClient {
         Ok(PyTuple::new(py, [tid_obj, py_schema])?.into_any().unbind())
     }
 
+    /// stats() -> list[dict]: the server's metrics, one dict per metric and
+    /// process (`name`, `process`, `kind`, `value`, and for histograms `sum`,
+    /// `p50`, `p90`, `p99`, `max`).
+    pub fn stats(&mut self, py: Python<'_>) -> PyResult<Py<PyList>> {
+        let c = client!(self);
+        let samples = to_py_err(py.allow_threads(|| c.stats()))?;
+        let list = PyList::empty(py);
+        for s in samples {
+            let dict = PyDict::new(py);
+            dict.set_item("name", s.name)?;
+            dict.set_item("process", s.process)?;
+            let kind = match s.kind {
+                gnitz_core::MetricKind::Counter => "counter",
+                gnitz_core::MetricKind::Gauge => "gauge",
+                gnitz_core::MetricKind::Histogram => "histogram",
+            };
+            dict.set_item("kind", kind)?;
+            dict.set_item("value", s.value)?;
+            if s.kind == gnitz_core::MetricKind::Histogram {
+                for (k, v) in [
+                    ("sum", s.sum),
+                    ("p50", s.p50),
+                    ("p90", s.p90),
+                    ("p99", s.p99),
+                    ("max", s.max),
+                ] {
+                    dict.set_item(k, v)?;
+                }
+            }
+            list.append(dict)?;
+        }
+        Ok(list.unbind())
+    }
+
+    /// profile(action="dump") -> list[dict]: the server's CPU-zone profiler.
+    /// `"start"` clears every process's profile and starts timing zones,
+    /// `"stop"` stops them, `"dump"` only reads. Returns one dict per folded
+    /// stack (`process`, `stack`, `cpu_ns`, `calls`, and `folded`: the line
+    /// `flamegraph.pl` reads, in microseconds).
+    #[pyo3(signature = (action = "dump"))]
+    pub fn profile(&mut self, py: Python<'_>, action: &str) -> PyResult<Py<PyList>> {
+        let action = match action {
+            "dump" => gnitz_core::ProfileAction::Dump,
+            "start" => gnitz_core::ProfileAction::Start,
+            "stop" => gnitz_core::ProfileAction::Stop,
+            other => {
+                return Err(pyo3::exceptions::PyValueError::new_err(format!(
+                    "profile action must be 'dump', 'start' or 'stop', got {other:?}"
+                )))
+            }
+        };
+        let c = client!(self);
+        let stacks = to_py_err(py.allow_threads(|| c.profile(action)))?;
+        let list = PyList::empty(py);
+        for s in stacks {
+            let dict = PyDict::new(py);
+            dict.set_item("folded", s.folded())?;
+            dict.set_item("process", s.process)?;
+            dict.set_item("stack", s.stack)?;
+            dict.set_item("cpu_ns", s.cpu_ns)?;
+            dict.set_item("calls", s.calls)?;
+            list.append(dict)?;
+        }
+        Ok(list.unbind())
+    }
+
+    /// set_tracing(every): trace every `every`-th push, scan and seek this
+    /// connection sends; 0 turns tracing off.
+    pub fn set_tracing(&mut self, every: u32) -> PyResult<()> {
+        client!(self).set_tracing(every);
+        Ok(())
+    }
+
+    /// last_trace_id() -> int | None: the trace id of the most recent sampled
+    /// request.
+    pub fn last_trace_id(&mut self) -> PyResult<Option<u64>> {
+        Ok(client!(self).last_trace_id())
+    }
+
+    /// traces() -> list[dict]: the spans the server holds for sampled
+    /// requests, one dict per span (`trace_id`, `process`, `stage`,
+    /// `start_ns`, `dur_ns`), ordered by trace id and start time.
+    pub fn traces(&mut self, py: Python<'_>) -> PyResult<Py<PyList>> {
+        let c = client!(self);
+        let spans = to_py_err(py.allow_threads(|| c.traces()))?;
+        let list = PyList::empty(py);
+        for s in spans {
+            let dict = PyDict::new(py);
+            dict.set_item("trace_id", s.trace_id)?;
+            dict.set_item("process", s.process)?;
+            dict.set_item("stage", s.stage)?;
+            dict.set_item("start_ns", s.start_ns)?;
+            dict.set_item("dur_ns", s.dur_ns)?;
+            list.append(dict)?;
+        }
+        Ok(list.unbind())
+    }
+
+    /// trace_events() -> str: the server's trace spans as Chrome trace-event
+    /// JSON, for `chrome://tracing` or Perfetto.
+    pub fn trace_events(&mut self, py: Python<'_>) -> PyResult<String> {
+        let c = client!(self);
+        let spans = to_py_err(py.allow_threads(|| c.traces()))?;
+        Ok(gnitz_core::chrome_trace_json(&spans))
+    }
+
+    /// memory() -> list[dict]: heap bytes by process, relation and component,
+    /// one dict per attribution (`process`, `relation_id`, `component`, `pc`,
+    /// `op`, `bytes`), the master's first.
+    pub fn memory(&mut self, py: Python<'_>) -> PyResult<Py<PyList>> {
+        let c = client!(self);
+        let usage = to_py_err(py.allow_threads(|| c.memory()))?;
+        let list = PyList::empty(py);
+        for m in usage {
+            let dict = PyDict::new(py);
+            dict.set_item("process", m.process)?;
+            dict.set_item("relation_id", m.relation_id)?;
+            dict.set_item("component", m.component)?;
+            dict.set_item("pc", m.pc)?;
+            dict.set_item("op", m.op)?;
+            dict.set_item("bytes", m.bytes)?;
+            list.append(dict)?;
+        }
+        Ok(list.unbind())
+    }
+
     /// scan(target_id, include_hidden=False) -> ScanResult
     #[pyo3(signature = (target_id, include_hidden = false))]
     pub fn scan(&mut self, py: Python<'_>, target_id: u64, include_hidden: bool) -> PyResult<Py<PyScanResult>> {
@@ -2577,6 +2716,7 @@ fn _native(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add("IDX_TAB", gnitz_wire::IDX_TAB)?;
     m.add("DEP_TAB", gnitz_wire::DEP_TAB)?;
     m.add("SEQ_TAB", gnitz_wire::SEQ_TAB)?;
+    m.add("VIEW_STATS_TAB", gnitz_wire::VIEW_STATS_TAB)?;
     m.add("FIRST_USER_TABLE_ID", gnitz_wire::FIRST_USER_TABLE_ID)?;
     m.add("FIRST_USER_SCHEMA_ID", gnitz_wire::FIRST_USER_SCHEMA_ID)?;
     m.add_function(wrap_pyfunction!(unpack_pk_cols, m)?)?;
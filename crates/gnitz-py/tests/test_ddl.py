@@ -141,3 +141,49 @@ def test_ddl_txn_frame_all_single_family_ops(client):
             client.drop_schema(sn)
         except Exception:
             pass
+
+
+@pytest.mark.parametrize("strategy", ["leveled", "tiered", "time_windowed"])
+def test_create_table_with_compaction_policy(client, strategy):
+    """WITH (compaction = …, l0_trigger = …) is accepted for every strategy and
+    the table reads and writes like any other (the policy only changes when and
+    how its shards are merged)."""
+    sn = "s" + _uid()
+    client.create_schema(sn)
+    try:
+        client.execute_sql(
+            "CREATE TABLE ev (ts BIGINT NOT NULL PRIMARY KEY, v BIGINT NOT NULL) "
+            f"WITH (compaction = '{strategy}', l0_trigger = 2)",
+            schema_name=sn,
+        )
+        for i in range(1, 6):
+            client.execute_sql(f"INSERT INTO ev VALUES ({i}, {i * 10})", schema_name=sn)
+        tid, _ = client.resolve_table(sn, "ev")
+        rows = sorted((r["ts"], r["v"]) for r in client.scan(tid) if r.weight > 0)
+        assert rows == [(i, i * 10) for i in range(1, 6)]
+    finally:
+        try:
+            client.execute_sql("DROP TABLE ev", schema_name=sn)
+        except Exception:
+            pass
+        client.drop_schema(sn)
+
+
+@pytest.mark.parametrize("option", [
+    "compaction = 'universal'",
+    "compaction = 1",
+    "l0_trigger = 0",
+    "l0_trigger = 256",
+    "l0_trigger = 'many'",
+])
+def test_create_table_bad_compaction_option_rejected(client, option):
+    sn = "s" + _uid()
+    client.create_schema(sn)
+    try:
+        with pytest.raises(gnitz.GnitzError):
+            client.execute_sql(
+                f"CREATE TABLE t (a BIGINT NOT NULL PRIMARY KEY) WITH ({option})",
+                schema_name=sn,
+            )
+    finally:
+        client.drop_schema(sn)
@@ -0,0 +1,32 @@
+"""Memory accounting: heap bytes by process, relation and component via `client.memory()`."""
+from uuid import uuid4
+
+
+def test_memory_attributes_tables_and_view_operators(client):
+    sn = "mem" + uuid4().hex[:8]
+    client.create_schema(sn)
+    try:
+        client.execute_sql("CREATE TABLE t (id BIGINT NOT NULL PRIMARY KEY, g BIGINT, v BIGINT)", schema_name=sn)
+        client.execute_sql("CREATE VIEW s AS SELECT g, SUM(v) AS total FROM t GROUP BY g", schema_name=sn)
+        rows = ", ".join(f"({i}, {i % 7}, {i})" for i in range(1000))
+        client.execute_sql(f"INSERT INTO t VALUES {rows}", schema_name=sn)
+        client.execute_sql("SELECT * FROM s", schema_name=sn)
+        tid = client.resolve_table(sn, "t")[0]
+        vid = client.resolve_table(sn, "s")[0]
+
+        usage = client.memory()
+        assert all(u["bytes"] > 0 for u in usage)
+        assert {u["process"] for u in usage} >= {"master", "worker0"}
+
+        table_bytes = sum(
+            u["bytes"]
+            for u in usage
+            if u["relation_id"] == tid and u["process"].startswith("worker") and u["component"] in ("memtable", "ram_tier")
+        )
+        assert table_bytes > 0
+        ops = [u for u in usage if u["relation_id"] == vid and u["component"] == "operator"]
+        assert ops and all(u["op"] for u in ops)
+    finally:
+        for sql in ("DROP VIEW s", "DROP TABLE t"):
+            client.execute_sql(sql, schema_name=sn)
+        client.drop_schema(sn)
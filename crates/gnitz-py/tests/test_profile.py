@@ -0,0 +1,49 @@
+"""CPU-zone profiler: toggled and dumped through `client.profile()`."""
+from uuid import uuid4
+
+import pytest
+
+
+def test_profile_attributes_cpu_to_subsystems(client):
+    sn = "pf" + uuid4().hex[:8]
+    client.create_schema(sn)
+    try:
+        client.execute_sql("CREATE TABLE t (id BIGINT NOT NULL PRIMARY KEY, g BIGINT, v BIGINT)", schema_name=sn)
+        client.execute_sql("CREATE VIEW s AS SELECT g, SUM(v) AS total FROM t GROUP BY g", schema_name=sn)
+        client.profile("start")
+        for base in range(0, 2000, 500):
+            rows = ", ".join(f"({i}, {i % 7}, {i})" for i in range(base, base + 500))
+            client.execute_sql(f"INSERT INTO t VALUES {rows}", schema_name=sn)
+        client.execute_sql("SELECT * FROM s", schema_name=sn)
+        stacks = client.profile("stop")
+
+        paths = {(s["process"], s["stack"]) for s in stacks}
+        assert ("master", "client_io") in paths
+        assert ("master", "commit") in paths
+        worker = {stack for process, stack in paths if process.startswith("worker")}
+        assert "tick" in worker
+        assert "apply" in worker and "commit" not in worker
+        assert any(stack.startswith("tick;") and stack.endswith("reduce") for stack in worker)
+
+        for s in stacks:
+            assert s["calls"] > 0
+            head, value = s["folded"].rsplit(" ", 1)
+            assert head == f'{s["process"]};{s["stack"]}'
+            assert int(value) == s["cpu_ns"] // 1000
+
+        # Stopped: a dump reads the same profile, and new work adds nothing.
+        client.execute_sql("INSERT INTO t VALUES (-1, 0, 0)", schema_name=sn)
+        assert client.profile() == stacks
+        # Start clears what was collected.
+        client.profile("start")
+        assert all(s["calls"] < 10 for s in client.profile("stop"))
+    finally:
+        client.profile("stop")
+        for sql in ("DROP VIEW s", "DROP TABLE t"):
+            client.execute_sql(sql, schema_name=sn)
+        client.drop_schema(sn)
+
+
+def test_profile_rejects_unknown_action(client):
+    with pytest.raises(ValueError):
+        client.profile("flush")
@@ -0,0 +1,37 @@
+"""GET_STATS: server counters, gauges and histograms through `client.stats()`."""
+from uuid import uuid4
+
+
+def _by(stats, name, process="master"):
+    return next(s for s in stats if s["name"] == name and s["process"] == process)
+
+
+def test_stats_track_commits_ticks_and_requests(client):
+    sn = "st" + uuid4().hex[:8]
+    client.create_schema(sn)
+    try:
+        client.execute_sql("CREATE TABLE t (id BIGINT NOT NULL PRIMARY KEY, v BIGINT)", schema_name=sn)
+        client.execute_sql("CREATE VIEW w AS SELECT id, v FROM t WHERE v > 0", schema_name=sn)
+        before = client.stats()
+        client.execute_sql("INSERT INTO t VALUES (1, 1), (2, 2), (3, -1)", schema_name=sn)
+        client.execute_sql("SELECT * FROM w", schema_name=sn)
+        after = client.stats()
+
+        assert _by(after, "commit_rows")["value"] >= _by(before, "commit_rows")["value"] + 3
+        assert _by(after, "ticks")["value"] > _by(before, "ticks")["value"]
+        assert _by(after, "requests")["value"] > _by(before, "requests")["value"]
+        assert _by(after, "open_connections")["value"] >= 1
+
+        req = _by(after, "request_ns")
+        assert req["kind"] == "histogram"
+        assert req["value"] > 0
+        assert 0 < req["p50"] <= req["p99"] <= req["max"]
+
+        kinds = {s["kind"] for s in after}
+        assert kinds == {"counter", "gauge", "histogram"}
+        # Workers report their own series; each metric also has a master row.
+        assert {s["name"] for s in after if s["process"] == "master"} >= {"ticks", "l0_runs", "tick_ns"}
+    finally:
+        for sql in ("DROP VIEW w", "DROP TABLE t"):
+            client.execute_sql(sql, schema_name=sn)
+        client.drop_schema(sn)
@@ -0,0 +1,41 @@
+"""Request tracing: sampled requests' stage spans via `client.traces()`."""
+import json
+from uuid import uuid4
+
+
+def test_traced_insert_reports_every_commit_stage(client):
+    sn = "tr" + uuid4().hex[:8]
+    client.create_schema(sn)
+    try:
+        client.execute_sql("CREATE TABLE t (id BIGINT NOT NULL PRIMARY KEY, v BIGINT)", schema_name=sn)
+        client.set_tracing(1)
+        client.execute_sql("INSERT INTO t VALUES (1, 10), (2, 20)", schema_name=sn)
+        trace_id = client.last_trace_id()
+        client.set_tracing(0)
+        assert trace_id
+
+        spans = [s for s in client.traces() if s["trace_id"] == trace_id]
+        stages = {(s["process"], s["stage"]) for s in spans}
+        for stage in ("request", "enqueue", "sal_write", "fsync", "reply"):
+            assert ("master", stage) in stages
+        assert any(p.startswith("worker") and st == "worker_apply" for p, st in stages)
+        # Stages nest inside the master's request span on the shared clock.
+        req = next(s for s in spans if s["process"] == "master" and s["stage"] == "request")
+        for s in spans:
+            assert req["start_ns"] <= s["start_ns"]
+            assert s["start_ns"] + s["dur_ns"] <= req["start_ns"] + req["dur_ns"]
+
+        events = json.loads(client.trace_events())["traceEvents"]
+        mine = [e for e in events if e["ph"] == "X" and e["args"]["trace_id"] == f"{trace_id:016x}"]
+        assert {e["name"] for e in mine} >= {"request", "sal_write", "worker_apply"}
+        assert any(e["ph"] == "M" and e["args"]["name"] == "master" for e in events)
+
+        # Untraced requests leave no spans behind.
+        before = len(client.traces())
+        client.execute_sql("INSERT INTO t VALUES (3, 30)", schema_name=sn)
+        assert client.last_trace_id() == trace_id
+        assert len(client.traces()) == before
+    finally:
+        client.set_tracing(0)
+        client.execute_sql("DROP TABLE t", schema_name=sn)
+        client.drop_schema(sn)
@@ -71,18 +71,30 @@ pub(crate) fn fn_name_is(f: &sqlparser::ast::Function, name: &str) -> bool {
     single_fn_name(f).is_some_and(|n| n.eq_ignore_ascii_case(name))
 }
 
-/// The `AggFunc` a function name denotes (`count`, `sum`, `min`, `max`, `avg`),
-/// matched case-insensitively without allocating; `None` for any other name.
+/// The `AggFunc` a function name denotes (`count`, `sum`, `min`, `max`, `avg`,
+/// the `var_*` / `stddev_*` family, `approx_count_distinct`,
+/// `approx_percentile`), matched case-insensitively without allocating; `None`
+/// for any other name. `variance` and `stddev` are the sample forms, as in
+/// PostgreSQL. `approx_percentile` maps to a placeholder quantile the binder
+/// replaces with the call's literal argument.
 /// The single name→aggregate map: the binder's `bind_function` dispatches the
 /// argument shape from it (COUNT(*) vs COUNT(x)), and the dispatch walkers use
 /// it to detect an aggregate — an aggregate added here reaches them all at once.
 pub(crate) fn agg_func_from_name(name: &str) -> Option<AggFunc> {
-    const NAMES: [(&str, AggFunc); 5] = [
+    const NAMES: [(&str, AggFunc); 13] = [
         ("count", AggFunc::Count),
         ("sum", AggFunc::Sum),
         ("min", AggFunc::Min),
         ("max", AggFunc::Max),
         ("avg", AggFunc::Avg),
+        ("var_pop", AggFunc::VarPop),
+        ("var_samp", AggFunc::VarSamp),
+        ("variance", AggFunc::VarSamp),
+        ("stddev_pop", AggFunc::StddevPop),
+        ("stddev_samp", AggFunc::StddevSamp),
+        ("stddev", AggFunc::StddevSamp),
+        ("approx_count_distinct", AggFunc::ApproxCountDistinct),
+        ("approx_percentile", AggFunc::ApproxPercentile(0)),
     ];
     NAMES
         .into_iter()
@@ -127,7 +139,7 @@ fn expr_has_aggregate(e: &sqlparser::ast::Expr) -> bool {
 
 /// The direct operand subexpressions of `e` — the node set the structural
 /// binder recurses through (binary/unary ops, parens, BETWEEN, IS [NOT] NULL,
-/// IN lists) plus function-call arguments. Subquery nodes contribute no
+/// IN lists, LIKE) plus function-call arguments. Subquery nodes contribute no
 /// operands: no walker may silently descend into a subquery. The single
 /// definition behind the crate's expression walkers (`expr_has_aggregate`,
 /// HAVING aggregate collection, EXISTS correlation side-counting), so a node
@@ -141,6 +153,7 @@ pub(crate) fn expr_operands(e: &sqlparser::ast::Expr) -> Vec<&sqlparser::ast::Ex
         }
         Expr::Between { expr, low, high, .. } => vec![expr, low, high],
         Expr::InList { expr, list, .. } => std::iter::once(expr.as_ref()).chain(list).collect(),
+        Expr::Like { expr, pattern, .. } => vec![expr, pattern],
         // CASE operands: the optional operand, every WHEN condition + result, and
         // the optional ELSE — the node set `bind_structural`'s Case arm recurses
         // through, so a subquery or column ref inside a branch stays visible to
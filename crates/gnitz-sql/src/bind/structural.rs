@@ -5,7 +5,7 @@ use crate::ast_util::{
 };
 use crate::error::GnitzSqlError;
 use crate::ir::{AggFunc, BinOp, BoundExpr, UnaryOp};
-use crate::types::is_min_max_orderable;
+use crate::types::{is_integer_type, is_min_max_orderable, is_wide_int};
 use gnitz_core::Schema;
 use sqlparser::ast::{
     BinaryOperator, CaseWhen, Expr, Function, FunctionArg, FunctionArgExpr, FunctionArguments, UnaryOperator, Value,
@@ -206,6 +206,44 @@ pub(crate) fn bind_structural<L: LeafBinder>(expr: &Expr, leaf: &L) -> Result<Bo
                 chain
             })
         }
+        // `col [NOT] LIKE 'pattern'`. The engine classifies the pattern itself,
+        // so the binder only fixes the shape: a column on the left, a string
+        // literal on the right, no ESCAPE clause (`\` is the fixed escape).
+        Expr::Like {
+            negated,
+            expr: e,
+            pattern,
+            escape_char,
+            ..
+        } => {
+            if escape_char.is_some() {
+                return Err(GnitzSqlError::Unsupported(
+                    "LIKE ... ESCAPE is not supported; '\\' is the escape character".into(),
+                ));
+            }
+            let BoundExpr::ColRef(col) = bind_structural(e, leaf)? else {
+                return Err(GnitzSqlError::Unsupported(
+                    "LIKE requires a column on the left-hand side".into(),
+                ));
+            };
+            let BoundExpr::LitStr(pattern) = bind_structural(pattern, leaf)? else {
+                return Err(GnitzSqlError::Unsupported(
+                    "LIKE requires a string literal pattern".into(),
+                ));
+            };
+            let trailing_escapes = pattern.bytes().rev().take_while(|&b| b == b'\\').count();
+            if trailing_escapes % 2 == 1 {
+                return Err(GnitzSqlError::Bind(format!(
+                    "LIKE pattern {pattern:?} ends with an unfinished escape"
+                )));
+            }
+            let like = BoundExpr::Like { col, pattern };
+            Ok(if *negated {
+                BoundExpr::UnaryOp(UnaryOp::Not, Box::new(like))
+            } else {
+                like
+            })
+        }
         // Subquery placement is the leaf's decision: the mark builder binds the
         // node to its branch constant; every other leaf keeps the default
         // placement rejection (HAVING, DML, a direct SELECT, …).
@@ -395,13 +433,27 @@ impl LeafBinder for SingleTable<'_> {
                     "COUNT: unsupported argument form".to_string(),
                 ))
             }
-            AggFunc::Sum | AggFunc::Min | AggFunc::Max | AggFunc::Avg => {
+            AggFunc::Sum
+            | AggFunc::Min
+            | AggFunc::Max
+            | AggFunc::Avg
+            | AggFunc::VarPop
+            | AggFunc::VarSamp
+            | AggFunc::StddevPop
+            | AggFunc::StddevSamp => {
                 let name = match agg_func {
                     AggFunc::Sum => "sum",
                     AggFunc::Min => "min",
                     AggFunc::Max => "max",
                     AggFunc::Avg => "avg",
-                    AggFunc::Count | AggFunc::CountNonNull => unreachable!(),
+                    AggFunc::VarPop => "var_pop",
+                    AggFunc::VarSamp => "var_samp",
+                    AggFunc::StddevPop => "stddev_pop",
+                    AggFunc::StddevSamp => "stddev_samp",
+                    AggFunc::Count
+                    | AggFunc::CountNonNull
+                    | AggFunc::ApproxCountDistinct
+                    | AggFunc::ApproxPercentile(_) => unreachable!(),
                 };
                 if let FunctionArguments::List(list) = &func.args {
                     if list.args.len() == 1 {
@@ -435,6 +487,45 @@ impl LeafBinder for SingleTable<'_> {
                     "{name}: requires exactly one column argument"
                 )))
             }
+            AggFunc::ApproxCountDistinct => match function_positional_args(func, "APPROX_COUNT_DISTINCT")?[..] {
+                [inner] => Ok(BoundExpr::AggCall {
+                    func: agg_func,
+                    arg: Some(Box::new(bind_structural(inner, self)?)),
+                }),
+                _ => Err(GnitzSqlError::Unsupported(
+                    "APPROX_COUNT_DISTINCT: requires exactly one column argument".to_string(),
+                )),
+            },
+            AggFunc::ApproxPercentile(_) => {
+                let [inner, q] = function_positional_args(func, "APPROX_PERCENTILE")?[..] else {
+                    return Err(GnitzSqlError::Unsupported(
+                        "APPROX_PERCENTILE: requires a column and a quantile literal".to_string(),
+                    ));
+                };
+                let q = match bind_structural(q, self)? {
+                    BoundExpr::LitFloat(f) => f,
+                    BoundExpr::LitInt(i) => i as f64,
+                    _ => f64::NAN,
+                };
+                if !(0.0..=1.0).contains(&q) {
+                    return Err(GnitzSqlError::Unsupported(
+                        "APPROX_PERCENTILE: the quantile must be a numeric literal between 0 and 1".to_string(),
+                    ));
+                }
+                let bound = bind_structural(inner, self)?;
+                let arg_ty = bound.infer_type(self.schema);
+                if !(is_integer_type(arg_ty) || arg_ty.is_float()) || is_wide_int(arg_ty) {
+                    return Err(GnitzSqlError::Unsupported(format!(
+                        "APPROX_PERCENTILE: not supported on {arg_ty:?} columns"
+                    )));
+                }
+                Ok(BoundExpr::AggCall {
+                    // Permyriad resolution: the wire and engine carry the
+                    // quantile in `0..=10000`.
+                    func: AggFunc::ApproxPercentile((q * 10_000.0).round() as u16),
+                    arg: Some(Box::new(bound)),
+                })
+            }
         }
     }
     fn bind_null_test(&self, inner: &Expr, want_null: bool) -> Result<BoundExpr, GnitzSqlError> {
@@ -663,6 +754,38 @@ mod tests {
         assert_unsupported(bind_single_table(&empty, &f), "empty list");
     }
 
+    /// `c [NOT] LIKE 'lit'` binds to `Like` (under `Not` when negated); an ESCAPE
+    /// clause, a non-column operand, a non-literal pattern, and a dangling
+    /// trailing `\` are rejected at bind.
+    #[test]
+    fn test_bind_like() {
+        let s = schema_with_val(TypeCode::String);
+        match bind_single_table(&parse("c LIKE 'a%'"), &s).unwrap() {
+            BoundExpr::Like { col, pattern } => assert_eq!((col, pattern.as_str()), (1, "a%")),
+            other => panic!("expected Like, got {other:?}"),
+        }
+        assert!(matches!(
+            bind_single_table(&parse("c NOT LIKE '%a'"), &s).unwrap(),
+            BoundExpr::UnaryOp(UnaryOp::Not, inner) if matches!(*inner, BoundExpr::Like { col: 1, .. })
+        ));
+        assert_unsupported(bind_single_table(&parse("c LIKE 'a!%' ESCAPE '!'"), &s), "ESCAPE");
+        assert_unsupported(bind_single_table(&parse("'abc' LIKE 'a%'"), &s), "column");
+        assert_unsupported(bind_single_table(&parse("c LIKE c"), &s), "literal pattern");
+        // Set the pattern directly: the dialect's literal unescaping is not under test.
+        let with_pattern = |p: &str| {
+            let mut e = parse("c LIKE 'x'");
+            if let Expr::Like { pattern, .. } = &mut e {
+                if let Expr::Value(v) = pattern.as_mut() {
+                    v.value = Value::SingleQuotedString(p.into());
+                }
+            }
+            bind_single_table(&e, &s)
+        };
+        assert!(matches!(with_pattern(r"a\"), Err(GnitzSqlError::Bind(_))));
+        assert!(with_pattern(r"a\\").is_ok());
+        assert!(with_pattern(r"a\%").is_ok());
+    }
+
     /// Subquery expressions outside the supported placements get the targeted
     /// message, not the generic catch-all — while the mark leaf binds the same
     /// nodes to its branch constant.
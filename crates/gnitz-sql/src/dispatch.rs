@@ -14,6 +14,56 @@ use crate::SqlResult;
 use crate::{dml, plan};
 use gnitz_core::{ClientError, GnitzClient};
 use sqlparser::ast::Statement;
+use sqlparser::dialect::Dialect;
+use sqlparser::keywords::Keyword;
+use sqlparser::tokenizer::{Token, Tokenizer};
+
+/// The target of an `EXPLAIN ANALYZE VIEW [schema.]name` statement: `None` for
+/// any other SQL. sqlparser reads `EXPLAIN ANALYZE VIEW` as a table-describe
+/// and drops the `ANALYZE`, so the statement is recognised on its tokens before
+/// parsing; anything that does not match exactly goes to the parser as usual.
+pub(crate) fn explain_analyze_target(dialect: &dyn Dialect, sql: &str) -> Option<(Option<String>, String)> {
+    let tokens = Tokenizer::new(dialect, sql).tokenize().ok()?;
+    let mut it = tokens
+        .into_iter()
+        .filter(|t| !matches!(t, Token::Whitespace(_) | Token::EOF));
+    for kw in [Keyword::EXPLAIN, Keyword::ANALYZE, Keyword::VIEW] {
+        match it.next() {
+            Some(Token::Word(w)) if w.keyword == kw && w.quote_style.is_none() => {}
+            _ => return None,
+        }
+    }
+    let Some(Token::Word(first)) = it.next() else {
+        return None;
+    };
+    let mut rest: Vec<Token> = it.collect();
+    if rest.last() == Some(&Token::SemiColon) {
+        rest.pop();
+    }
+    match rest.as_slice() {
+        [] => Some((None, first.value)),
+        [Token::Period, Token::Word(name)] => Some((Some(first.value), name.value.clone())),
+        _ => None,
+    }
+}
+
+/// `EXPLAIN ANALYZE VIEW`: a read of the view's runtime counters, so it runs
+/// under the same transaction rule as any other non-DML statement.
+pub(crate) fn execute_explain_analyze(
+    client: &mut GnitzClient,
+    schema_name: &str,
+    target: &(Option<String>, String),
+) -> Result<SqlResult, GnitzSqlError> {
+    if client.txn_active() {
+        return Err(GnitzSqlError::Unsupported(
+            "this statement is not allowed inside a transaction".to_string(),
+        ));
+    }
+    let (schema, name) = target;
+    let schema_name = schema.as_deref().unwrap_or(schema_name);
+    let mut binder = Binder::new(schema_name);
+    plan::explain_analyze_view(client, &mut binder, name)
+}
 
 /// Inside a transaction, only DML and transaction control may run. Everything
 /// else — today's DDL, and every statement added later — is rejected by default:
@@ -90,6 +140,19 @@ pub(crate) fn execute_statement(
             reject_unhonored_create_view_clauses(cv, "CREATE VIEW")?;
             plan::execute_create_view(client, schema_name, cv, &mut binder)
         }
+        // Only `EXPLAIN CREATE VIEW` is planned; `EXPLAIN ANALYZE` of a statement
+        // would have to run it, and the other statements have no plan worth
+        // showing. `EXPLAIN ANALYZE VIEW v` never gets here: `SqlPlanner::execute`
+        // routes it to `execute_explain_analyze` before parsing.
+        Statement::Explain { statement, analyze, .. } => match statement.as_ref() {
+            Statement::CreateView(cv) if !*analyze => {
+                reject_unhonored_create_view_clauses(cv, "EXPLAIN CREATE VIEW")?;
+                plan::explain_create_view(client, cv, &mut binder)
+            }
+            _ => Err(GnitzSqlError::Unsupported(
+                "only EXPLAIN CREATE VIEW and EXPLAIN ANALYZE VIEW are supported".to_string(),
+            )),
+        },
         Statement::Insert(insert) => {
             reject_unhonored_insert_clauses(insert, "INSERT")?;
             dml::execute_insert(client, schema_name, insert, &mut binder)
@@ -112,3 +175,23 @@ pub(crate) fn execute_statement(
         ))),
     }
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use sqlparser::dialect::GenericDialect;
+
+    #[test]
+    fn explain_analyze_target_matches_only_the_view_form() {
+        let t = |sql: &str| explain_analyze_target(&GenericDialect {}, sql);
+        assert_eq!(t("EXPLAIN ANALYZE VIEW v"), Some((None, "v".to_string())));
+        assert_eq!(
+            t("explain  analyze view s1.v ;"),
+            Some((Some("s1".to_string()), "v".to_string()))
+        );
+        assert_eq!(t("EXPLAIN VIEW v"), None);
+        assert_eq!(t("EXPLAIN ANALYZE SELECT * FROM v"), None);
+        assert_eq!(t("EXPLAIN ANALYZE VIEW v; SELECT 1"), None);
+        assert_eq!(t("EXPLAIN ANALYZE VIEW a.b.c"), None);
+    }
+}
@@ -42,6 +42,7 @@ pub(crate) fn execute_select(
         HonoredQueryClauses {
             with: true,
             ordering_sink: true,
+            top_k: false,
         },
         "direct SELECT",
     )?;
@@ -198,6 +198,11 @@ impl BoundExprBackend for InterpBackend<'_> {
         Ok(Some(match op {
             UnaryOp::Neg => v.wrapping_neg(),
             UnaryOp::Not => (v == 0) as i64,
+            UnaryOp::Sqrt => {
+                return Err(GnitzSqlError::Unsupported(
+                    "square root in residual filter not supported".to_string(),
+                ))
+            }
         }))
     }
 
@@ -211,6 +216,12 @@ impl BoundExprBackend for InterpBackend<'_> {
         Ok(Some(if want_null { is_null as i64 } else { !is_null as i64 }))
     }
 
+    fn like(&mut self, _c: usize, _pattern: &str) -> Result<Self::Out, GnitzSqlError> {
+        Err(GnitzSqlError::Unsupported(
+            "LIKE in WHERE predicate not supported; use CREATE VIEW".to_string(),
+        ))
+    }
+
     fn agg_call(&mut self) -> Result<Self::Out, GnitzSqlError> {
         Err(GnitzSqlError::Unsupported(
             "aggregate functions not allowed in this context".to_string(),
@@ -296,6 +307,10 @@ impl BoundExprBackend for ThinProbe<'_> {
         Ok(())
     }
 
+    fn like(&mut self, _c: usize, _pattern: &str) -> Result<(), GnitzSqlError> {
+        Err(GnitzSqlError::Unsupported("LIKE".to_string()))
+    }
+
     fn agg_call(&mut self) -> Result<(), GnitzSqlError> {
         Err(GnitzSqlError::Unsupported("aggregate call".to_string()))
     }
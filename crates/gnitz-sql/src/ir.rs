@@ -8,6 +8,13 @@ pub(crate) enum AggFunc {
     Min,
     Max,
     Avg,
+    ApproxCountDistinct,
+    /// The quantile travels in permyriad (`0..=10000`), as on the wire.
+    ApproxPercentile(u16),
+    VarPop,
+    VarSamp,
+    StddevPop,
+    StddevSamp,
 }
 
 #[derive(Clone, Debug)]
@@ -24,6 +31,12 @@ pub(crate) enum BoundExpr {
     UnaryOp(UnaryOp, Box<BoundExpr>),
     IsNull(usize),
     IsNotNull(usize),
+    /// `col LIKE pattern`: a string/blob column against a literal pattern
+    /// (`%`, `_`, `\` escape). NOT LIKE binds as `Not(Like)`.
+    Like {
+        col: usize,
+        pattern: String,
+    },
     AggCall {
         func: AggFunc,
         arg: Option<Box<BoundExpr>>,
@@ -75,9 +88,15 @@ impl BoundExpr {
             }
             BoundExpr::UnaryOp(UnaryOp::Neg, inner) => inner.infer_type(schema),
             BoundExpr::UnaryOp(UnaryOp::Not, _) => TypeCode::I64,
-            BoundExpr::IsNull(_) | BoundExpr::IsNotNull(_) => TypeCode::I64,
+            BoundExpr::UnaryOp(UnaryOp::Sqrt, _) => TypeCode::F64,
+            BoundExpr::IsNull(_) | BoundExpr::IsNotNull(_) | BoundExpr::Like { .. } => TypeCode::I64,
             BoundExpr::AggCall { func, arg } => match func {
-                AggFunc::Avg => TypeCode::F64,
+                AggFunc::Avg
+                | AggFunc::ApproxPercentile(_)
+                | AggFunc::VarPop
+                | AggFunc::VarSamp
+                | AggFunc::StddevPop
+                | AggFunc::StddevSamp => TypeCode::F64,
                 AggFunc::Min | AggFunc::Max => {
                     if let Some(inner) = arg {
                         inner.infer_type(schema)
@@ -122,6 +141,9 @@ pub(crate) enum BinOp {
 pub(crate) enum UnaryOp {
     Neg,
     Not,
+    /// Float square root. Not a SQL surface: only the HAVING binding of
+    /// STDDEV_* builds it, over its finalized variance.
+    Sqrt,
 }
 
 #[cfg(test)]
@@ -75,6 +75,12 @@ impl<'a> SqlPlanner<'a> {
     /// cross-statement state — so the next statement sees this one's DDL writes.
     pub fn execute(&mut self, sql: &str) -> Result<Vec<SqlResult>, GnitzSqlError> {
         let dialect = GenericDialect {};
+        if let Some(target) = dispatch::explain_analyze_target(&dialect, sql) {
+            self.client.begin_catalog_snapshot();
+            let r = dispatch::execute_explain_analyze(self.client, &self.schema_name, &target);
+            self.client.end_catalog_snapshot();
+            return r.map(|res| vec![res]);
+        }
         let stmts = Parser::parse_sql(&dialect, sql)?;
         // If THIS call opens a transaction (was inactive at entry) and then errors
         // with the transaction still open, roll it back before returning —
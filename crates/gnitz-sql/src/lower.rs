@@ -27,6 +27,8 @@ pub(crate) trait BoundExprBackend {
     fn unop(&mut self, op: UnaryOp, inner: &BoundExpr) -> Result<Self::Out, GnitzSqlError>;
     /// `IS NULL` (`want_null = true`) and `IS NOT NULL` (`want_null = false`).
     fn null_test(&mut self, col: usize, want_null: bool) -> Result<Self::Out, GnitzSqlError>;
+    /// `col LIKE pattern` over a string/blob column.
+    fn like(&mut self, col: usize, pattern: &str) -> Result<Self::Out, GnitzSqlError>;
     fn agg_call(&mut self) -> Result<Self::Out, GnitzSqlError>;
     /// Searched CASE. Receives its branches (`(condition, result)` taken in order)
     /// and optional ELSE *unevaluated*, driving the recursion via
@@ -54,6 +56,7 @@ pub(crate) fn lower_bound_expr<B: BoundExprBackend>(
         BoundExpr::UnaryOp(op, inner) => backend.unop(*op, inner),
         BoundExpr::IsNull(c) => backend.null_test(*c, true),
         BoundExpr::IsNotNull(c) => backend.null_test(*c, false),
+        BoundExpr::Like { col, pattern } => backend.like(*col, pattern),
         BoundExpr::AggCall { .. } => backend.agg_call(),
         BoundExpr::Case { branches, else_ } => backend.case(branches, else_.as_deref()),
     }
@@ -147,6 +150,57 @@ fn try_compile_string_cmp(
     Ok(None)
 }
 
+/// Collect the leaves of an `OR`-tree, left to right.
+fn flatten_disjuncts<'e>(e: &'e BoundExpr, out: &mut Vec<&'e BoundExpr>) {
+    match e {
+        BoundExpr::BinOp(l, BinOp::Or, r) => {
+            flatten_disjuncts(l, out);
+            flatten_disjuncts(r, out);
+        }
+        _ => out.push(e),
+    }
+}
+
+/// `s = 'a' OR s = 'b' OR …` — the shape `s IN ('a', 'b', …)` binds to — over
+/// one string/blob column lowers to a single hashed membership test instead of
+/// a chain of per-literal compares. `None` when any disjunct is something else
+/// (another column, a non-equality, a non-string operand).
+/// The OR chain and the set agree on NULL: a NULL cell makes both NULL.
+fn try_compile_string_in(left: &BoundExpr, right: &BoundExpr, schema: &Schema, eb: &mut ExprBuilder) -> Option<u32> {
+    let mut leaves = Vec::new();
+    flatten_disjuncts(left, &mut leaves);
+    flatten_disjuncts(right, &mut leaves);
+    let mut col = None;
+    let mut members = Vec::with_capacity(leaves.len());
+    for leaf in leaves {
+        let (c, s) = match leaf {
+            BoundExpr::BinOp(l, BinOp::Eq, r) => match (l.as_ref(), r.as_ref()) {
+                (BoundExpr::ColRef(c), BoundExpr::LitStr(s)) | (BoundExpr::LitStr(s), BoundExpr::ColRef(c)) => (*c, s),
+                _ => return None,
+            },
+            _ => return None,
+        };
+        if *col.get_or_insert(c) != c {
+            return None;
+        }
+        members.push(s);
+    }
+    let col = col?;
+    if !schema.columns[col].type_code.is_german_string() || members.len() > u16::MAX as usize {
+        return None;
+    }
+    // The run's start must fit the operand word's 16 bits too; a pool that
+    // large leaves one orphan constant behind and takes the OR chain.
+    let first = eb.add_const_string(members[0].clone());
+    if first > u16::MAX as u32 {
+        return None;
+    }
+    for s in &members[1..] {
+        eb.add_const_string((*s).clone());
+    }
+    Some(eb.str_col_in_consts(col, first, members.len() as u32))
+}
+
 /// Lowers a `BoundExpr` to `ExprProgram` opcodes for the server-side circuit.
 /// `Out = (result_reg, is_float)`, where `is_float` indicates the register holds
 /// an f64 bit-pattern rather than a plain i64.
@@ -258,6 +312,11 @@ impl BoundExprBackend for OpcodeBackend<'_> {
         if let Some(result) = try_compile_string_cmp(left, &op, right, self.schema, self.eb)? {
             return Ok(result);
         }
+        if matches!(op, BinOp::Or) {
+            if let Some(reg) = try_compile_string_in(left, right, self.schema, self.eb) {
+                return Ok((reg, false));
+            }
+        }
 
         let (mut l, l_float) = lower_bound_expr(left, self)?;
         let (mut r, r_float) = lower_bound_expr(right, self)?;
@@ -321,6 +380,10 @@ impl BoundExprBackend for OpcodeBackend<'_> {
                 }
             }
             UnaryOp::Not => Ok((self.eb.bool_not(a), false)),
+            UnaryOp::Sqrt => {
+                let a = if a_float { a } else { self.eb.int_to_float(a) };
+                Ok((self.eb.float_sqrt(a), true))
+            }
         }
     }
 
@@ -332,6 +395,18 @@ impl BoundExprBackend for OpcodeBackend<'_> {
         }
     }
 
+    fn like(&mut self, col: usize, pattern: &str) -> Result<Self::Out, GnitzSqlError> {
+        let tc = self.schema.columns[col].type_code;
+        if !tc.is_german_string() {
+            return Err(GnitzSqlError::Unsupported(format!(
+                "LIKE requires a string/blob column; {:?} is {tc:?}",
+                self.schema.columns[col].name,
+            )));
+        }
+        let const_idx = self.eb.add_const_string(pattern.to_string());
+        Ok((self.eb.str_col_like_const(col, const_idx), false))
+    }
+
     fn agg_call(&mut self) -> Result<Self::Out, GnitzSqlError> {
         Err(GnitzSqlError::Unsupported(
             "aggregate function not allowed in expression context".to_string(),
@@ -617,4 +692,77 @@ mod tests {
             "expected Unsupported, got {err:?}"
         );
     }
+
+    fn str_eq(col: usize, lit: &str) -> BoundExpr {
+        BoundExpr::BinOp(
+            Box::new(BoundExpr::ColRef(col)),
+            BinOp::Eq,
+            Box::new(BoundExpr::LitStr(lit.to_string())),
+        )
+    }
+
+    fn or(l: BoundExpr, r: BoundExpr) -> BoundExpr {
+        BoundExpr::BinOp(Box::new(l), BinOp::Or, Box::new(r))
+    }
+
+    /// LIKE lowers to one opcode carrying the raw pattern; a non-string column
+    /// is rejected.
+    #[test]
+    fn like_lowers_to_str_col_like_const() {
+        let schema = str_schema();
+        let like = BoundExpr::Like {
+            col: 1,
+            pattern: "ab%".to_string(),
+        };
+        let mut eb = ExprBuilder::new();
+        let c = eb.add_const_string("ab%".to_string());
+        let reg = eb.str_col_like_const(1, c);
+        assert_eq!(compile_bound_expr_to_program(&like, &schema).unwrap(), eb.build(reg));
+
+        let on_int = BoundExpr::Like {
+            col: 2,
+            pattern: "%".to_string(),
+        };
+        assert!(matches!(
+            compile_bound_expr_to_program(&on_int, &string_int_schema()),
+            Err(GnitzSqlError::Unsupported(_))
+        ));
+    }
+
+    /// An OR chain of string equalities on one column (what `s IN (…)` binds to)
+    /// collapses into a single hashed IN-list over a consecutive constant run,
+    /// whichever side each literal is written on.
+    #[test]
+    fn string_or_chain_lowers_to_in_list() {
+        let schema = str_schema();
+        let flipped = BoundExpr::BinOp(
+            Box::new(BoundExpr::LitStr("c".to_string())),
+            BinOp::Eq,
+            Box::new(BoundExpr::ColRef(1)),
+        );
+        let chain = or(or(str_eq(1, "a"), str_eq(1, "b")), flipped);
+        let mut eb = ExprBuilder::new();
+        let first = eb.add_const_string("a".to_string());
+        eb.add_const_string("b".to_string());
+        eb.add_const_string("c".to_string());
+        let reg = eb.str_col_in_consts(1, first, 3);
+        assert_eq!(compile_bound_expr_to_program(&chain, &schema).unwrap(), eb.build(reg));
+    }
+
+    /// A chain mixing columns, or with a non-equality disjunct, keeps the
+    /// per-literal comparisons.
+    #[test]
+    fn mixed_or_chain_keeps_comparisons() {
+        let schema = str_schema();
+        let like = BoundExpr::Like {
+            col: 1,
+            pattern: "z%".to_string(),
+        };
+        use gnitz_wire::{EXPR_BOOL_OR, EXPR_STR_COL_IN_CONST};
+        for chain in [or(str_eq(1, "a"), str_eq(2, "b")), or(str_eq(1, "a"), like)] {
+            let ops = opcodes(&compile_bound_expr_to_program(&chain, &schema).unwrap());
+            assert!(!ops.contains(&EXPR_STR_COL_IN_CONST), "{chain:?} must not fold");
+            assert!(ops.contains(&EXPR_BOOL_OR));
+        }
+    }
 }
@@ -161,13 +161,24 @@ fn resolve_fk_target(
     Ok((ref_tid, ref_col_idx as u64, parent_col_type))
 }
 
-/// Extract the `REPLICATED` table property from a `CREATE TABLE … WITH (…)`
-/// option list. Surface: `CREATE TABLE t (…) WITH (replicated = true)`. A
-/// replicated table keeps a full copy on every worker (broadcast writes,
-/// single-source reads). Only the `replicated` key is recognized; any other
-/// `WITH` option is rejected so a typo cannot be silently ignored (gnitz has no
-/// other table-level `WITH` options today).
-fn parse_replicated_option(table_options: &CreateTableOptions) -> Result<bool, GnitzSqlError> {
+/// The table-level `CREATE TABLE … WITH (…)` properties gnitz honors.
+#[derive(Default)]
+struct TableOptions {
+    replicated: bool,
+    append_only: bool,
+    compaction: gnitz_core::CompactionOptions,
+}
+
+/// Extract the table properties from a `CREATE TABLE … WITH (…)` option list.
+/// Surface: `CREATE TABLE t (…) WITH (replicated = true, append_only = true,
+/// compaction = 'tiered', l0_trigger = 8)`. A replicated table keeps a full copy
+/// on every worker (broadcast writes, single-source reads); an append-only table
+/// accepts only inserts of new keys, which lets views over it drop their
+/// retraction bookkeeping; `compaction` picks the LSM strategy
+/// (`'leveled'` — the default — `'tiered'`, or `'time_windowed'`) and
+/// `l0_trigger` the L0 run count above which a compaction fires. Any other
+/// `WITH` option is rejected so a typo cannot be silently ignored.
+fn parse_table_options(table_options: &CreateTableOptions) -> Result<TableOptions, GnitzSqlError> {
     // Only the `WITH (...)` form carries gnitz options. `OPTIONS(...)`,
     // space-separated, and `TBLPROPERTIES` are vendor metadata accepted as no-ops
     // (matching the pre-0.62 handling of the separate `options`/`table_properties`
@@ -176,20 +187,38 @@ fn parse_replicated_option(table_options: &CreateTableOptions) -> Result<bool, G
         CreateTableOptions::With(opts) => opts,
         _ => &[],
     };
-    let mut replicated = false;
+    let mut out = TableOptions::default();
     for opt in with_options {
         match opt {
             SqlOption::KeyValue { key, value } if key.value.eq_ignore_ascii_case("replicated") => {
-                let Expr::Value(ValueWithSpan {
-                    value: Value::Boolean(b),
-                    ..
-                }) = value
-                else {
-                    return Err(GnitzSqlError::Plan(
-                        "WITH (replicated = …) expects a boolean (true/false)".into(),
-                    ));
+                out.replicated = bool_option(value, "replicated")?;
+            }
+            SqlOption::KeyValue { key, value } if key.value.eq_ignore_ascii_case("append_only") => {
+                out.append_only = bool_option(value, "append_only")?;
+            }
+            SqlOption::KeyValue { key, value } if key.value.eq_ignore_ascii_case("compaction") => {
+                let strategy = match value {
+                    Expr::Value(ValueWithSpan {
+                        value: Value::SingleQuotedString(name),
+                        ..
+                    }) => gnitz_core::CompactionStrategy::from_name(name),
+                    _ => None,
+                };
+                out.compaction.strategy = strategy.ok_or_else(|| {
+                    GnitzSqlError::Plan("WITH (compaction = …) expects 'leveled', 'tiered', or 'time_windowed'".into())
+                })?;
+            }
+            SqlOption::KeyValue { key, value } if key.value.eq_ignore_ascii_case("l0_trigger") => {
+                // `l0_trigger` rides in one flags byte; 0 is reserved for "strategy default".
+                let trigger = match value {
+                    Expr::Value(ValueWithSpan {
+                        value: Value::Number(n, _),
+                        ..
+                    }) => n.parse::<u8>().ok().filter(|&t| t >= 1),
+                    _ => None,
                 };
-                replicated = *b;
+                out.compaction.l0_trigger = trigger
+                    .ok_or_else(|| GnitzSqlError::Plan("WITH (l0_trigger = …) expects an integer in 1..=255".into()))?;
             }
             other => {
                 return Err(GnitzSqlError::Plan(format!(
@@ -198,7 +227,20 @@ fn parse_replicated_option(table_options: &CreateTableOptions) -> Result<bool, G
             }
         }
     }
-    Ok(replicated)
+    Ok(out)
+}
+
+/// A boolean `WITH (name = true|false)` option value.
+fn bool_option(value: &Expr, name: &str) -> Result<bool, GnitzSqlError> {
+    match value {
+        Expr::Value(ValueWithSpan {
+            value: Value::Boolean(b),
+            ..
+        }) => Ok(*b),
+        _ => Err(GnitzSqlError::Plan(format!(
+            "WITH ({name} = …) expects a boolean (true/false)"
+        ))),
+    }
 }
 
 pub(crate) fn execute_create_table(
@@ -506,12 +548,18 @@ pub(crate) fn execute_create_table(
         0
     };
 
-    // Phase 7 — REPLICATED (full copy on every worker), via `WITH (replicated = true)`.
+    // Phase 7 — `WITH (…)` table options: the compaction policy and APPEND_ONLY
+    // (both stored as-is in the flags word) and REPLICATED (full copy on every
+    // worker).
     // Mutually exclusive with CLUSTER BY: a hash-distribution prefix is meaningless
     // when every worker already holds the whole table. The flags packing cannot make
     // the conflict unrepresentable (replicated is a boolean bit, k a byte), so reject
     // it here.
-    let replicated = parse_replicated_option(&create.table_options)?;
+    let TableOptions {
+        replicated,
+        append_only,
+        compaction,
+    } = parse_table_options(&create.table_options)?;
     if replicated && dist_prefix_len != 0 {
         return Err(GnitzSqlError::Plan(
             "REPLICATED and CLUSTER BY are mutually exclusive: a replicated table keeps \
@@ -579,7 +627,9 @@ pub(crate) fn execute_create_table(
             &pk_indices,
             true,
             replicated,
+            append_only,
             dist_prefix_len,
+            compaction,
             &unique_indexes,
         )
         .map_err(GnitzSqlError::Exec)?;
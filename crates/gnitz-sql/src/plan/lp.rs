@@ -42,6 +42,17 @@ pub(crate) enum Rel {
         out_cols: Vec<ColumnDef>,
         pk_arity: usize,
     },
+    /// Incremental top-K over a linear view (`view::top_k`): per group of
+    /// `group_cols`, the first `limit` rows by `order_col`. Both index `input`'s
+    /// output columns; the output keeps `input`'s columns and PK.
+    TopK {
+        input: Box<Rel>,
+        group_cols: Vec<usize>,
+        order_col: usize,
+        desc: bool,
+        nulls_first: bool,
+        limit: u64,
+    },
 }
 
 /// Lower a linear (filter/map) CREATE VIEW body to `Project(Filter?(Source))`:
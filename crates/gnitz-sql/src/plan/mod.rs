@@ -10,4 +10,4 @@ pub(crate) mod validate;
 mod view;
 
 pub(crate) use ddl::{execute_create_index, execute_create_table, execute_drop};
-pub(crate) use view::{compile_query_to_circuit, execute_create_view};
+pub(crate) use view::{compile_query_to_circuit, execute_create_view, explain_analyze_view, explain_create_view};
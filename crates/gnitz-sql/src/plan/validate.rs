@@ -295,6 +295,11 @@ pub(crate) struct HonoredQueryClauses {
     /// sub-form with its own message; when `true` this guard leaves `order_by` and `limit_clause`
     /// to the caller.
     pub ordering_sink: bool,
+    /// The site plans `ORDER BY … LIMIT n [BY …]` as an incremental top-K
+    /// (`view::top_k`), which owns the rejection of every other ordering form.
+    /// Honored only by CREATE VIEW; when `true` this guard leaves `order_by` and
+    /// `limit_clause` to that parser.
+    pub top_k: bool,
 }
 
 impl HonoredQueryClauses {
@@ -303,6 +308,7 @@ impl HonoredQueryClauses {
     pub const NONE: Self = HonoredQueryClauses {
         with: false,
         ordering_sink: false,
+        top_k: false,
     };
 }
 
@@ -342,10 +348,11 @@ pub(crate) fn reject_unhonored_query_clauses(
     if !honored.with && with.is_some() {
         return Err(reject("WITH (CTE)"));
     }
-    if !honored.ordering_sink && limit_clause.is_some() {
+    let ordering_honored = honored.ordering_sink || honored.top_k;
+    if !ordering_honored && limit_clause.is_some() {
         return Err(reject("LIMIT/OFFSET"));
     }
-    if !honored.ordering_sink && order_by.is_some() {
+    if !ordering_honored && order_by.is_some() {
         return Err(reject("ORDER BY"));
     }
     if fetch.is_some() {
@@ -717,7 +724,7 @@ pub(crate) fn reject_unhonored_rollback_clauses(
 /// Reject every `CREATE TABLE` envelope clause `execute_create_table` does not consume. `name`,
 /// `columns`, `constraints`, `cluster_by`, `table_options` are consumed (column/constraint contents
 /// are further guarded by [`reject_unhonored_column_options`] / [`reject_unhonored_table_constraints`];
-/// `table_options` carries the `WITH (replicated = …)` option, parsed by `parse_replicated_option`).
+/// `table_options` carries the `WITH (replicated = …, compaction = …)` options, parsed by `parse_table_options`).
 /// Rejected: `query` (CTAS), `temporary`/`global` (silent permanent table), `like`/`clone` (empty
 /// table, ignoring the template), `on_commit`, `primary_key` (silently substitutes the PK), and
 /// `partition_of`/`for_values` (silently creates a standalone table instead of a partition child). The
@@ -733,7 +740,7 @@ pub(crate) fn reject_unhonored_create_table_clauses(
 ) -> Result<(), GnitzSqlError> {
     let sqlparser::ast::CreateTable {
         // Consumed (column/constraint contents further guarded by the column-option and table-constraint guards;
-        // `table_options` carries `WITH (replicated = …)`).
+        // `table_options` carries `WITH (replicated = …, compaction = …)`).
         name: _,
         columns: _,
         constraints: _,
@@ -826,8 +833,8 @@ pub(crate) fn reject_unhonored_create_table_clauses(
     Ok(())
 }
 
-/// Reject every `CREATE VIEW` clause `execute_create_view` does not consume (`name`, `query`).
-/// `materialized` is accepted — a gnitz view is already incrementally materialized. `temporary`
+/// Reject every `CREATE VIEW` clause `execute_create_view` does not consume (`name`, `query`,
+/// `options`). `materialized` is accepted — a gnitz view is already incrementally materialized. `temporary`
 /// (silent permanent view), `to` (silently ignored target), and `columns` (output aliases dropped →
 /// wrong view schema) are rejected. `or_alter`/`or_replace`/`if_not_exists` drop loudly; implement
 /// later. `with_no_schema_binding` parses but is a no-op optimizer hint; the rest cannot populate
@@ -847,7 +854,7 @@ pub(crate) fn reject_unhonored_create_view_clauses(
         with_no_schema_binding: _, // no-op optimizer hint
         secure: _,                 // Snowflake SECURE modifier: no result impact
         copy_grants: _,            // Snowflake COPY GRANTS: no result impact
-        options: _,
+        options: _,                // WITH (join_strategy = …): parsed by `create_view_envelope`
         cluster_by: _,
         comment: _,
         params: _, // cannot populate under GenericDialect
@@ -0,0 +1,332 @@
+//! Delta-query compilation of a multi-way INNER equi-join
+//! (`WITH (join_strategy = 'delta')`).
+//!
+//! The default chain plan materializes every intermediate `h_k = r_0 ⋈ … ⋈ r_k`
+//! as a hidden view and keeps it as a join trace, so a view over `n` relations
+//! stores `n - 2` intermediates on top of the base arrangements. The delta plan
+//! keeps only the base arrangements: each relation's delta walks the other
+//! relations' traces in turn,
+//!
+//! ```text
+//! Δ(r_0 ⋈ … ⋈ r_{n-1}) = Σ_i  Δr_i ⋈ z⁻¹(I(r_0)) ⋈ … ⋈ z⁻¹(I(r_{n-1}))   (j ≠ i)
+//! ```
+//!
+//! which is exact under single-source-per-epoch (only one `Δr_i` is non-empty
+//! per tick, so every other trace is stable while it is probed). Nothing but
+//! the view itself is materialized.
+//!
+//! Scope: the relations must share one join key — every equi conjunct links two
+//! columns of the same key class, and every relation has exactly one column in
+//! each class (a star or chain on `k`, or a compound key threaded through every
+//! relation). Each relation then reindexes once, its input scatter already
+//! places every probe on the key's worker, and every term stays local. A plan
+//! whose delta path re-keys between probes would need one exchange per hop,
+//! which the circuit compiler does not support; such joins keep the chain plan.
+
+use crate::ast_util::flatten_conjuncts;
+use crate::bind::{AliasMap, ResolvedRelation};
+use crate::error::GnitzSqlError;
+use crate::plan::validate::reject_column_overflow;
+use crate::plan::view::join::{
+    build_join_view_projection, collect_live_from_expr, collect_live_from_projection, is_identity_projection,
+    join_pk_coldefs, prune_schema, side_target_tcs, LiveNames,
+};
+use crate::plan::view::predicates::{
+    build_reindex_program_keep, build_residual_filter_prog, extract_join_predicates, null_gate,
+};
+use crate::plan::view::EmitPieces;
+use gnitz_core::{CircuitBuilder, ColumnDef, Schema, TypeCode};
+use sqlparser::ast::{Expr, SelectItem};
+use std::collections::HashSet;
+use std::rc::Rc;
+
+fn unsupported(what: &str) -> GnitzSqlError {
+    GnitzSqlError::Unsupported(format!("join_strategy = 'delta' {what}; use the default join strategy"))
+}
+
+/// Find with path halving over a flat parent array.
+fn find(parent: &mut [usize], mut x: usize) -> usize {
+    while parent[x] != x {
+        parent[x] = parent[parent[x]];
+        x = parent[x];
+    }
+    x
+}
+
+/// Group the equi pairs (global column indices into the concatenated relation
+/// layout, with each pair's common type) into key classes, in order of first
+/// appearance. Returns each class's members and its type, or `None` when two
+/// pairs of one class disagree on the common type.
+fn key_classes(n_cols: usize, pairs: &[(usize, usize, TypeCode)]) -> Option<Vec<(Vec<usize>, TypeCode)>> {
+    let mut parent: Vec<usize> = (0..n_cols).collect();
+    for &(a, b, _) in pairs {
+        let (ra, rb) = (find(&mut parent, a), find(&mut parent, b));
+        parent[ra] = rb;
+    }
+    let mut roots: Vec<usize> = Vec::new();
+    let mut classes: Vec<(Vec<usize>, TypeCode)> = Vec::new();
+    for &(a, _, tc) in pairs {
+        let root = find(&mut parent, a);
+        match roots.iter().position(|&r| r == root) {
+            Some(ci) if classes[ci].1 != tc => return None,
+            Some(_) => {}
+            None => {
+                roots.push(root);
+                classes.push((Vec::new(), tc));
+            }
+        }
+    }
+    for col in 0..n_cols {
+        let root = find(&mut parent, col);
+        if let Some(ci) = roots.iter().position(|&r| r == root) {
+            classes[ci].0.push(col);
+        }
+    }
+    Some(classes)
+}
+
+/// Emit the delta-query circuit for the INNER join of `rels` (`(alias, tid,
+/// base schema)` in FROM order) under `ons` (one ON per step) and the optional
+/// WHERE, returning the view's pieces and the `EXPLAIN CREATE VIEW` note. The
+/// output layout is the chain's: the `_join_pk` slots (one per key class), then
+/// each relation's referenced columns in FROM order.
+pub(super) fn emit_delta_join(
+    view_id: u64,
+    projection: &[SelectItem],
+    selection: Option<&Expr>,
+    rels: &[(String, u64, Rc<Schema>)],
+    ons: &[&Expr],
+) -> Result<(EmitPieces, String), GnitzSqlError> {
+    let n = rels.len();
+    for i in 1..n {
+        let (alias, tid, _) = &rels[i];
+        if rels[..i].iter().any(|(a, _, _)| a.eq_ignore_ascii_case(alias)) {
+            return Err(GnitzSqlError::Unsupported(format!(
+                "duplicate relation alias '{alias}' in a multi-way join"
+            )));
+        }
+        if rels[..i].iter().any(|(_, t, _)| t == tid) {
+            return Err(unsupported(&format!(
+                "does not support a self-join ('{alias}' repeats an earlier relation)"
+            )));
+        }
+    }
+
+    // Unpruned layout: relation r's columns at `offsets[r]` of the concatenation.
+    let mut offsets = vec![0usize];
+    for (r, (_, _, sch)) in rels.iter().enumerate() {
+        offsets.push(offsets[r] + sch.columns.len());
+    }
+    let rel_of = |col: usize| offsets.partition_point(|&o| o <= col) - 1;
+
+    // Each step's ON classified against the relations joined so far, exactly
+    // as the chain's step would see it; equi pairs are kept as global column
+    // indices, everything else becomes a post-join filter conjunct.
+    let mut pairs: Vec<(usize, usize, TypeCode)> = Vec::new();
+    let mut residual: Vec<Expr> = Vec::new();
+    for (step, on) in ons.iter().enumerate() {
+        let r = step + 1;
+        let prefix = Schema {
+            columns: rels[..r]
+                .iter()
+                .flat_map(|(_, _, s)| s.columns.iter().cloned())
+                .collect(),
+            pk_cols: Vec::new(),
+        };
+        let alias_map: AliasMap = rels[..=r]
+            .iter()
+            .zip(&offsets)
+            .map(|((alias, tid, sch), &off)| {
+                (
+                    alias.to_ascii_lowercase(),
+                    ResolvedRelation {
+                        table_id: *tid,
+                        schema: Rc::clone(sch),
+                        col_offset: off,
+                    },
+                )
+            })
+            .collect();
+        let (left_cols, right_cols, tcs, range, rest) = extract_join_predicates(on, &prefix, &rels[r].2, &alias_map)?;
+        if range.is_some() {
+            return Err(unsupported("supports equi-joins only, not a range/band conjunct"));
+        }
+        for ((l, rc), tc) in left_cols.into_iter().zip(right_cols).zip(tcs) {
+            pairs.push((l, offsets[r] + rc, tc));
+        }
+        residual.extend(rest);
+    }
+    if let Some(where_expr) = selection {
+        let mut leaves = Vec::new();
+        flatten_conjuncts(where_expr, &mut leaves);
+        residual.extend(leaves.into_iter().cloned());
+    }
+
+    // One key for all: every class holds exactly one column of every relation.
+    let classes = key_classes(offsets[n], &pairs)
+        .ok_or_else(|| unsupported("requires the columns of each join key to share one type"))?;
+    let shared_key = classes.iter().all(|(members, _)| {
+        members.len() == n && (0..n).all(|r| members.iter().filter(|&&c| rel_of(c) == r).count() == 1)
+    });
+    if !shared_key {
+        return Err(unsupported(
+            "requires every relation to join on the same key (each equi conjunct must link \
+             columns of one key shared by all relations)",
+        ));
+    }
+    let k = classes.len();
+    let class_tcs: Vec<TypeCode> = classes.iter().map(|(_, tc)| *tc).collect();
+    let key_cols: Vec<Vec<usize>> = (0..n)
+        .map(|r| {
+            classes
+                .iter()
+                .map(|(members, _)| members.iter().find(|&&c| rel_of(c) == r).unwrap() - offsets[r])
+                .collect()
+        })
+        .collect();
+
+    // Keep only the columns the projection and the filter read; a relation that
+    // keeps nothing still carries its column 0 (see `emit_join`).
+    let visible: Vec<(String, Rc<Schema>)> = rels
+        .iter()
+        .map(|(a, _, sch)| (a.to_ascii_lowercase(), Rc::clone(sch)))
+        .collect();
+    let mut live = LiveNames::new();
+    collect_live_from_projection(projection, &visible, &mut live);
+    for e in &residual {
+        collect_live_from_expr(e, &visible, &mut live);
+    }
+    let empty = HashSet::new();
+    let keep: Vec<Vec<usize>> = visible
+        .iter()
+        .map(|(alias, sch)| {
+            let names = live.get(alias).unwrap_or(&empty);
+            let kept: Vec<usize> = (0..sch.columns.len())
+                .filter(|&c| names.contains(&sch.columns[c].name.to_ascii_lowercase()))
+                .collect();
+            if kept.is_empty() && !sch.columns.is_empty() {
+                vec![0]
+            } else {
+                kept
+            }
+        })
+        .collect();
+
+    let mut out_cols: Vec<ColumnDef> = join_pk_coldefs(&class_tcs);
+    let mut alias_map = AliasMap::with_capacity(n);
+    let mut widths = Vec::with_capacity(n);
+    for ((alias, tid, sch), kept) in rels.iter().zip(&keep) {
+        let pruned = prune_schema(sch, kept);
+        let col_offset = out_cols.len() - k;
+        out_cols.extend(pruned.columns.iter().cloned());
+        widths.push(pruned.columns.len());
+        alias_map.insert(
+            alias.to_ascii_lowercase(),
+            ResolvedRelation {
+                table_id: *tid,
+                schema: Rc::new(pruned),
+                col_offset,
+            },
+        );
+    }
+    let width: usize = widths.iter().sum();
+    reject_column_overflow("JOIN view output", k + width)?;
+
+    // One NULL-gated reindex and one trace per relation, keyed by the shared
+    // key — the only state the plan keeps.
+    let mut cb = CircuitBuilder::new(view_id, 0); // no single primary source
+    let mut reindexed = Vec::with_capacity(n);
+    for (r, (_, tid, sch)) in rels.iter().enumerate() {
+        let input = cb.input_delta_tagged(*tid);
+        let (gated, _) = null_gate(&mut cb, input, &key_cols[r], sch)?;
+        let tcs = side_target_tcs(&key_cols[r], sch, &class_tcs);
+        reindexed.push(cb.map_reindex(gated, &key_cols[r], &tcs, build_reindex_program_keep(sch, &keep[r])));
+    }
+    let traces: Vec<gnitz_core::NodeId> = reindexed.iter().map(|&ri| cb.integrate_trace(ri)).collect();
+
+    // Term i: Δr_i probes every other trace in FROM order. A join's output is
+    // keyed by its delta side's key, so the next probe needs no re-key; each
+    // term is then reordered onto the canonical FROM-order payload.
+    let mut merged: Option<gnitz_core::NodeId> = None;
+    for i in 0..n {
+        let mut node = reindexed[i];
+        let mut at = vec![0usize; n];
+        at[i] = k;
+        let mut next = k + widths[i];
+        for j in (0..n).filter(|&j| j != i) {
+            node = cb.join_with_trace_node(node, traces[j]); // … ⋈ z^{-1}(I(r_j))
+            at[j] = next;
+            next += widths[j];
+        }
+        let canonical: Vec<usize> = (0..n).flat_map(|j| at[j]..at[j] + widths[j]).collect();
+        let term = if is_identity_projection(&canonical, width, k) {
+            node
+        } else {
+            cb.map(node, &canonical)
+        };
+        merged = Some(match merged {
+            Some(acc) => cb.union(acc, term),
+            None => term,
+        });
+    }
+    let merged = merged.expect("a delta join has at least two relations");
+
+    let merged = if residual.is_empty() {
+        merged
+    } else {
+        let merged_schema = Schema {
+            columns: out_cols.clone(),
+            pk_cols: (0..k).collect(),
+        };
+        let prog = build_residual_filter_prog(&residual, &alias_map, &merged_schema, k)?;
+        cb.filter(merged, Some(prog))
+    };
+
+    let (final_cols, final_projection) = build_join_view_projection(
+        projection,
+        &alias_map,
+        &out_cols[..k],
+        width,
+        k,
+        |idx| out_cols[k + idx].clone(),
+        "JOIN view",
+    )?;
+    let sink_input = if is_identity_projection(&final_projection, width, k) {
+        merged
+    } else {
+        cb.map(merged, &final_projection)
+    };
+    cb.sink(sink_input);
+
+    let names: Vec<&str> = rels.iter().map(|(a, _, _)| a.as_str()).collect();
+    let note = format!(
+        "join strategy: delta — {} probe each other's arrangements ({n} traces, no intermediate segments)",
+        names.join(" ⋈ ")
+    );
+    let view_pk: Vec<u32> = (0..k as u32).collect();
+    Ok(((cb.build(), final_cols, view_pk), note))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// `a.k = b.k AND b.k = d.k` over three 2-column relations (k at column 0)
+    /// forms one class holding one column of each relation.
+    #[test]
+    fn key_classes_merge_a_star_into_one_class() {
+        let pairs = [(0, 2, TypeCode::I64), (2, 4, TypeCode::I64)];
+        let classes = key_classes(6, &pairs).unwrap();
+        assert_eq!(classes, vec![(vec![0, 2, 4], TypeCode::I64)]);
+    }
+
+    /// Two unrelated keys stay two classes, in first-appearance order; a class
+    /// whose pairs disagree on the common type is rejected.
+    #[test]
+    fn key_classes_keep_distinct_keys_apart_and_reject_mixed_types() {
+        let pairs = [(1, 3, TypeCode::I64), (0, 2, TypeCode::I32)];
+        let classes = key_classes(4, &pairs).unwrap();
+        assert_eq!(classes, vec![(vec![1, 3], TypeCode::I64), (vec![0, 2], TypeCode::I32)]);
+        assert!(key_classes(6, &[(0, 2, TypeCode::I64), (2, 4, TypeCode::I32)]).is_none());
+    }
+}
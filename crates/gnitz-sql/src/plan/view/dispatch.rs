@@ -3,8 +3,8 @@
 //! `plan/view` that knows about all the others.
 
 use crate::ast_util::{
-    body_is_grouped, collect_column_refs, collect_projection_column_refs, count_subqueries, extract_name,
-    extract_relation_name, extract_table_factor_name, flatten_conjuncts, is_bare_wildcard_projection,
+    body_is_grouped, collect_column_refs, collect_projection_column_refs, count_subqueries, expr_usize_literal,
+    extract_name, extract_relation_name, extract_table_factor_name, flatten_conjuncts, is_bare_wildcard_projection,
     projection_item_expr,
 };
 use crate::bind::Binder;
@@ -14,12 +14,13 @@ use crate::plan::validate::{
     plain_select_body, reject_unhonored_query_clauses, reject_unhonored_select_clauses, unsupported_clause,
     validate_user_name, HonoredClauses, HonoredQueryClauses,
 };
-use crate::plan::view::{exists, group_by, join, scalar, set_op, simple, EmitPieces, ViewChain};
+use crate::plan::view::top_k::{self, TopKClause};
+use crate::plan::view::{exists, group_by, join, scalar, set_op, simple, EmitPieces, JoinStrategy, ViewChain};
 use crate::SqlResult;
-use gnitz_core::{ColumnDef, GnitzClient, PlannedView, Schema};
+use gnitz_core::{BatchAppender, ColumnDef, GnitzClient, PlannedView, Schema, TypeCode, ZSetBatch};
 use sqlparser::ast::{
-    Expr, GroupByExpr, Ident, Query, Select, SelectItem, SetExpr, SetOperator, SetQuantifier, TableFactor,
-    UnaryOperator, WildcardAdditionalOptions,
+    CreateViewOptions, Expr, GroupByExpr, Ident, Query, Select, SelectItem, SetExpr, SetOperator, SetQuantifier,
+    SqlOption, TableFactor, UnaryOperator, Value, ValueWithSpan, WildcardAdditionalOptions,
 };
 use std::collections::HashSet;
 use std::rc::Rc;
@@ -30,35 +31,271 @@ pub(crate) fn execute_create_view(
     cv: &sqlparser::ast::CreateView,
     binder: &mut Binder<'_>,
 ) -> Result<SqlResult, GnitzSqlError> {
-    let query: &Query = &cv.query;
+    let (view_name, sql_text, options, top_k) = create_view_envelope(cv)?;
+
+    // Compile the body into a durable chain (real `alloc_table_id` ids), then
+    // commit it atomically. `build_query_segments` owns every shape rule; CREATE
+    // VIEW adds only the durable id origin and the `create_view_chain` commit.
+    let mut chain = ViewChain::new();
+    options.apply(&mut chain);
+    let final_vid = build_query_segments(client, &cv.query, top_k, binder, &mut chain, view_name, sql_text)?;
+    client
+        .create_view_chain(schema_name, chain.segments)
+        .map_err(GnitzSqlError::Exec)?;
+    Ok(SqlResult::ViewCreated { view_id: final_vid })
+}
+
+/// `EXPLAIN CREATE VIEW`: plan the view exactly as CREATE VIEW would — same
+/// shape rules, same cost-based join order — but commit nothing. The plan comes
+/// back as rows `(line, plan)`: one per segment (hidden segments in dependency
+/// order under their provisional names, then the view), followed by the
+/// planner's notes.
+pub(crate) fn explain_create_view(
+    client: &mut GnitzClient,
+    cv: &sqlparser::ast::CreateView,
+    binder: &mut Binder<'_>,
+) -> Result<SqlResult, GnitzSqlError> {
+    let (view_name, sql_text, options, top_k) = create_view_envelope(cv)?;
+    let mut chain = ViewChain::new_explain();
+    options.apply(&mut chain);
+    build_query_segments(client, &cv.query, top_k, binder, &mut chain, view_name, sql_text)?;
+
+    let mut lines: Vec<String> = chain
+        .segments
+        .iter()
+        .map(|seg| {
+            let cols: Vec<&str> = seg
+                .output_columns
+                .iter()
+                .filter(|c| !c.is_hidden)
+                .map(|c| c.name.as_str())
+                .collect();
+            format!(
+                "{}: {} operators, columns ({})",
+                seg.name,
+                seg.circuit.nodes.len(),
+                cols.join(", ")
+            )
+        })
+        .collect();
+    lines.append(&mut chain.notes);
+
+    Ok(plan_rows(&lines))
+}
+
+/// `EXPLAIN ANALYZE VIEW`: the view's compiled circuit with the counters every
+/// worker has kept while the profiler ran since it last compiled the plan, as
+/// `(line, plan)` rows. Each
+/// operator is one line, indented under the operator that consumes it and
+/// summed across workers; `time` is the total, `slowest` the busiest worker's
+/// share. Hidden chain segments are profiled under their own names.
+pub(crate) fn explain_analyze_view(
+    client: &mut GnitzClient,
+    binder: &mut Binder<'_>,
+    name: &str,
+) -> Result<SqlResult, GnitzSqlError> {
+    let (vid, _) = binder.resolve(client, name)?;
+    let ops = client.explain_analyze(vid).map_err(GnitzSqlError::Exec)?;
+
+    // Workers share the plan shape, so (phase, pc) names one operator; the
+    // first worker's tree order is kept.
+    struct Row {
+        phase: String,
+        pc: u32,
+        depth: u32,
+        op: String,
+        calls: u64,
+        rows_in: u64,
+        rows_out: u64,
+        time_ns: u64,
+        slowest_ns: u64,
+        seeks: u64,
+        bytes_in: u64,
+        bytes_out: u64,
+    }
+    let mut rows: Vec<Row> = Vec::new();
+    let mut workers = HashSet::new();
+    for op in ops {
+        workers.insert(op.worker);
+        let at = rows.iter().position(|r| r.phase == op.phase && r.pc == op.pc);
+        let r = match at {
+            Some(i) => &mut rows[i],
+            None => {
+                rows.push(Row {
+                    phase: op.phase,
+                    pc: op.pc,
+                    depth: op.depth,
+                    op: op.op,
+                    calls: 0,
+                    rows_in: 0,
+                    rows_out: 0,
+                    time_ns: 0,
+                    slowest_ns: 0,
+                    seeks: 0,
+                    bytes_in: 0,
+                    bytes_out: 0,
+                });
+                rows.last_mut().unwrap()
+            }
+        };
+        r.calls += op.calls;
+        r.rows_in += op.rows_in;
+        r.rows_out += op.rows_out;
+        r.time_ns += op.time_ns;
+        r.slowest_ns = r.slowest_ns.max(op.time_ns);
+        r.seeks += op.seeks;
+        r.bytes_in += op.bytes_in;
+        r.bytes_out += op.bytes_out;
+    }
+
+    // The counters only advance while the profiler runs; say so when it is
+    // off, or an idle-looking plan reads as one that processed nothing.
+    let profiling = client
+        .stats()
+        .map_err(GnitzSqlError::Exec)?
+        .iter()
+        .any(|m| m.name == "profiler_running" && m.process == "master" && m.value > 0);
+    let ms = |ns: u64| ns as f64 / 1e6;
+    let mut lines = vec![format!(
+        "{name}: {} workers, counters while profiling since last compile",
+        workers.len()
+    )];
+    if !profiling {
+        lines.push("profiler is off: counters are not advancing (start it to collect)".to_string());
+    }
+    let mut phase = "";
+    for r in &rows {
+        if r.phase == "exchange" {
+            lines.push(format!(
+                "exchange  (rounds={}, rows sent={} recv={}, bytes sent={} recv={})",
+                r.calls, r.rows_out, r.rows_in, r.bytes_out, r.bytes_in
+            ));
+            phase = "exchange";
+            continue;
+        }
+        if r.phase != phase {
+            lines.push(format!("{}:", r.phase));
+            phase = &r.phase;
+        }
+        lines.push(format!(
+            "{}{}  (calls={}, rows in={} out={}, time={:.3}ms slowest={:.3}ms, seeks={})",
+            "  ".repeat(r.depth as usize + 1),
+            r.op,
+            r.calls,
+            r.rows_in,
+            r.rows_out,
+            ms(r.time_ns),
+            ms(r.slowest_ns),
+            r.seeks
+        ));
+    }
+
+    Ok(plan_rows(&lines))
+}
+
+/// An EXPLAIN result: one `(line, plan)` row per text line.
+fn plan_rows(lines: &[String]) -> SqlResult {
+    let schema = Schema {
+        columns: vec![
+            ColumnDef::new("line", TypeCode::U64, false),
+            ColumnDef::new("plan", TypeCode::String, false),
+        ],
+        pk_cols: vec![0],
+    };
+    let mut batch = ZSetBatch::new(&schema);
+    let mut app = BatchAppender::new(&mut batch, &schema);
+    for (i, line) in lines.iter().enumerate() {
+        app.add_row(i as u128, 1).str_val(line);
+    }
+    SqlResult::Rows { schema, batch }
+}
+
+/// The CREATE VIEW envelope shared by CREATE and EXPLAIN: the validated view
+/// name, the statement's SQL text, its `WITH (…)` options and its top-K clause.
+/// `WITH` is honored (inlined later by `inline_ctes`), and `ORDER BY … LIMIT`
+/// only in the top-K form `top_k::parse_top_k` accepts; every other tail
+/// clause (OFFSET, FETCH, FOR UPDATE/SHARE, FOR XML/JSON, SETTINGS, FORMAT) has
+/// no incremental-view semantics and would otherwise be silently dropped.
+fn create_view_envelope(
+    cv: &sqlparser::ast::CreateView,
+) -> Result<(String, String, ViewOptions, Option<TopKClause>), GnitzSqlError> {
     let view_name = extract_name(&cv.name, "CREATE VIEW")?;
     validate_user_name(&view_name)?;
-
-    // The CREATE VIEW envelope honors only `WITH` (inlined just below by `inline_ctes`); every
-    // other tail clause (ORDER BY, LIMIT/OFFSET, FETCH, FOR UPDATE/SHARE, FOR XML/JSON, SETTINGS,
-    // FORMAT) has no incremental-view semantics and would otherwise be silently dropped.
     reject_unhonored_query_clauses(
-        query,
+        &cv.query,
         HonoredQueryClauses {
             with: true,
+            top_k: true,
             ..HonoredQueryClauses::NONE
         },
         "CREATE VIEW",
     )?;
-
+    let top_k = top_k::parse_top_k(&cv.query)?;
+    let options = parse_view_options(&cv.options)?;
     // `CreateView`'s `Display` is exactly what `Statement::CreateView` delegates
     // to, so this is the statement's full SQL text.
-    let sql_text = format!("{cv}");
+    Ok((view_name, format!("{cv}"), options, top_k))
+}
 
-    // Compile the body into a durable chain (real `alloc_table_id` ids), then
-    // commit it atomically. `build_query_segments` owns every shape rule; CREATE
-    // VIEW adds only the durable id origin and the `create_view_chain` commit.
-    let mut chain = ViewChain::new();
-    let final_vid = build_query_segments(client, query, binder, &mut chain, view_name, sql_text)?;
-    client
-        .create_view_chain(schema_name, chain.segments)
-        .map_err(GnitzSqlError::Exec)?;
-    Ok(SqlResult::ViewCreated { view_id: final_vid })
+/// The properties a `CREATE VIEW v WITH (…) AS …` option list sets.
+#[derive(Default)]
+struct ViewOptions {
+    join_strategy: JoinStrategy,
+    retention: Option<u64>,
+}
+
+impl ViewOptions {
+    fn apply(self, chain: &mut ViewChain) {
+        chain.join_strategy = self.join_strategy;
+        chain.retention = self.retention;
+    }
+}
+
+/// Extract the view properties from a `CREATE VIEW v WITH (…) AS …` option
+/// list. Surface: `join_strategy = 'chain' | 'delta'` — how a multi-way INNER
+/// join in the body is planned (`JoinStrategy`) — and `retention = n`, the
+/// state horizon of a windowed aggregate (`window`). Any other option is
+/// rejected so a typo cannot be silently ignored.
+fn parse_view_options(options: &CreateViewOptions) -> Result<ViewOptions, GnitzSqlError> {
+    let opts: &[SqlOption] = match options {
+        CreateViewOptions::With(opts) | CreateViewOptions::Options(opts) => opts,
+        CreateViewOptions::None => &[],
+    };
+    let mut parsed = ViewOptions::default();
+    for opt in opts {
+        match opt {
+            SqlOption::KeyValue { key, value } if key.value.eq_ignore_ascii_case("retention") => {
+                let n = expr_usize_literal(value, "WITH (retention = …)")?;
+                if n == 0 {
+                    return Err(GnitzSqlError::Plan("WITH (retention = …) must be positive".into()));
+                }
+                parsed.retention = Some(n as u64);
+            }
+            SqlOption::KeyValue { key, value } if key.value.eq_ignore_ascii_case("join_strategy") => {
+                parsed.join_strategy = match value {
+                    Expr::Value(ValueWithSpan {
+                        value: Value::SingleQuotedString(name),
+                        ..
+                    }) if name.eq_ignore_ascii_case("chain") => JoinStrategy::Chain,
+                    Expr::Value(ValueWithSpan {
+                        value: Value::SingleQuotedString(name),
+                        ..
+                    }) if name.eq_ignore_ascii_case("delta") => JoinStrategy::Delta,
+                    _ => {
+                        return Err(GnitzSqlError::Plan(
+                            "WITH (join_strategy = …) expects 'chain' or 'delta'".into(),
+                        ))
+                    }
+                };
+            }
+            other => {
+                return Err(GnitzSqlError::Plan(format!(
+                    "unsupported CREATE VIEW option in WITH (…): {other:?}"
+                )))
+            }
+        }
+    }
+    Ok(parsed)
 }
 
 /// Compile one query body into a chain of `PlannedView` segments (hidden
@@ -68,11 +305,13 @@ pub(crate) fn execute_create_view(
 /// transient) is the only difference between the two callers; CTE inlining,
 /// derived-table compilation, the ANY/ALL rewrite, shape classification, and the
 /// per-shape emit are shared verbatim. Does NOT reject unhonored tail clauses —
-/// its callers own that (CREATE VIEW rejects ORDER BY/LIMIT before calling; the
-/// transient path rejects them in `execute_select`).
+/// its callers own that (CREATE VIEW parses ORDER BY/LIMIT into `top_k` before
+/// calling; the transient path hands them to the ordering sink in
+/// `execute_select` and passes `None`).
 fn build_query_segments(
     client: &mut GnitzClient,
     query: &Query,
+    top_k: Option<TopKClause>,
     binder: &mut Binder<'_>,
     chain: &mut ViewChain,
     final_name: String,
@@ -94,6 +333,19 @@ fn build_query_segments(
     // Classify the final body's shape once (the load-bearing precedence the old
     // guard ladder encoded), then emit its circuit pieces.
     let shape = ViewShape::classify(query)?;
+    if top_k.is_some() && !matches!(shape, ViewShape::Simple(_)) {
+        return Err(GnitzSqlError::Unsupported(
+            "CREATE VIEW: ORDER BY … LIMIT is supported only over a single-table filter/map body".to_string(),
+        ));
+    }
+    // The retention is the final reduce's; a hidden CTE/derived-table reduce
+    // never sees it.
+    let retention = chain.retention.take();
+    if retention.is_some() && !matches!(shape, ViewShape::GroupBy(_)) {
+        return Err(GnitzSqlError::Plan(
+            "WITH (retention = …) requires a GROUP BY TUMBLE(…) / HOP(…) window".to_string(),
+        ));
+    }
     let final_vid = chain.owner_vid(client)?;
     let (circuit, out_cols, pk_cols) = match shape {
         ViewShape::SetOp {
@@ -115,7 +367,9 @@ fn build_query_segments(
             let inp = resolve_operator_input(client, binder, select, chain, "SELECT DISTINCT")?;
             set_op::emit_distinct_pieces(final_vid, &inp.select, inp.src)?
         }
-        ViewShape::GroupBy(select) => emit_bounded_group_by(client, binder, final_vid, select, chain, "GROUP BY")?,
+        ViewShape::GroupBy(select) => {
+            emit_bounded_group_by(client, binder, final_vid, select, chain, retention, "GROUP BY")?
+        }
         // Any join FROM — 2-way, N-way, or self-referential — plans as a left-deep
         // chain; intermediate segments and self-join pass-through wrappers land on
         // `chain`, and the final step is emitted with `final_vid`.
@@ -123,6 +377,10 @@ fn build_query_segments(
         ViewShape::Simple(select) => {
             // Linear filter/map view: lower to `Project(Filter?(Source))`, then emit.
             let rel = crate::plan::lp::lower_linear(client, binder, select)?;
+            let rel = match top_k {
+                Some(clause) => top_k::lower_top_k(rel, clause)?,
+                None => rel,
+            };
             simple::emit_linear(final_vid, rel)?
         }
         ViewShape::Subquery {
@@ -193,6 +451,7 @@ pub(crate) fn compile_query_to_circuit(
     build_query_segments(
         client,
         query,
+        None,
         binder,
         &mut chain,
         "__adhoc_transient".to_string(),
@@ -582,7 +841,7 @@ fn compile_hidden_body(
     let is_plain_join = !from.joins.is_empty() && !grouped;
     chain.add_segment(client, |client, chain, vid| {
         let (circuit, mut cols, pk) = if grouped {
-            emit_bounded_group_by(client, binder, vid, select, chain, ctx)?
+            emit_bounded_group_by(client, binder, vid, select, chain, None, ctx)?
         } else if is_plain_join {
             join::plan_join_chain(client, binder, vid, select, chain)?
         } else {
@@ -640,6 +899,7 @@ fn emit_bounded_group_by(
     vid: u64,
     select: &Select,
     chain: &mut ViewChain,
+    retention: Option<u64>,
     ctx: &str,
 ) -> Result<EmitPieces, GnitzSqlError> {
     let inp = resolve_operator_input(client, binder, select, chain, ctx)?;
@@ -649,7 +909,7 @@ fn emit_bounded_group_by(
         (inp.src.0, &inp.src.1),
         inp.src_is_catalog,
     )?;
-    group_by::emit_group_by_pieces(client, vid, &inp.select, inp.src, bound)
+    group_by::emit_group_by_pieces(client, vid, &inp.select, inp.src, bound, retention)
 }
 
 /// What [`resolve_operator_input`] resolved: the source relation, the `Select` the
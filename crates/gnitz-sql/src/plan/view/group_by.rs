@@ -6,15 +6,17 @@
 use crate::ast_util::{expr_operands, single_relation_col_name};
 use crate::bind::{bind_single_table, bind_structural, find_unique_column, fold_null_test, LeafBinder, SingleTable};
 use crate::error::GnitzSqlError;
-use crate::ir::{AggFunc, BinOp, BoundExpr};
+use crate::ir::{AggFunc, BinOp, BoundExpr, UnaryOp};
 use crate::lower::compile_filter_program;
 use crate::plan::validate::{
     reject_duplicate_column_names, reject_float_key, reject_unhonored_select_clauses, HonoredClauses,
 };
-use crate::plan::view::EmitPieces;
+use crate::plan::view::{window, EmitPieces};
 use crate::types::{is_integer_type, is_min_max_orderable, is_wide_int};
 use gnitz_core::{CircuitBuilder, ColumnDef, ExprBuilder, GnitzClient, ReduceOutKey, Schema, TypeCode};
-use gnitz_wire::{AGG_COUNT, AGG_COUNT_NON_NULL, AGG_MAX, AGG_MIN, AGG_SUM, AGG_SUM_ZERO};
+use gnitz_wire::{
+    AGG_APPROX_COUNT_DISTINCT, AGG_COUNT, AGG_COUNT_NON_NULL, AGG_MAX, AGG_MIN, AGG_SUM, AGG_SUM_SQ, AGG_SUM_ZERO,
+};
 use sqlparser::ast::{Expr, GroupByExpr, SelectItem};
 
 /// Tracks how a user-level aggregate maps to reduce agg_specs.
@@ -45,22 +47,38 @@ impl AggMapping {
 
 /// How an aggregate's value column is finalized — which also fixes how many
 /// physical specs `push_agg_specs` emits and how the SELECT projection / HAVING
-/// binding read the result. `Avg` and `NullfillSum` each carry a hidden
-/// COUNT_NON_NULL companion at `specs_start + 1`: their null-ness derives from
-/// `companion == 0`, never the value column's saturating `has_value` bit.
-/// `Direct` is a single spec copied straight through.
+/// binding read the result. `Avg`, `NullfillSum` and `Variance` each carry a
+/// hidden COUNT_NON_NULL companion at `specs_start + 1`: their null-ness derives
+/// from the companion, never the value column's saturating `has_value` bit.
+/// `Variance` adds a SUM_SQ at `specs_start + 2`. `Direct` is a single spec
+/// copied straight through.
 #[derive(Clone, Copy)]
 enum AggShape {
     Direct,
     Avg,
     NullfillSum,
+    /// VAR_* (`stddev: false`) / STDDEV_* over `(SUM, COUNT_NON_NULL, SUM_SQ)`;
+    /// `sample` divides by `n − 1`, so a one-row group is NULL too.
+    Variance {
+        sample: bool,
+        stddev: bool,
+    },
 }
 
 impl AggShape {
     /// True iff a hidden COUNT_NON_NULL companion sits at `specs_start + 1` and
-    /// carries this aggregate's null-ness (AVG and nullable-source SUM).
+    /// carries this aggregate's null-ness (AVG, nullable-source SUM, VAR/STDDEV).
     fn has_count_companion(self) -> bool {
-        matches!(self, AggShape::Avg | AggShape::NullfillSum)
+        matches!(self, AggShape::Avg | AggShape::NullfillSum | AggShape::Variance { .. })
+    }
+
+    /// The companion count below which the aggregate renders NULL: 2 for the
+    /// sample variance family (`n − 1 = 0` divides by zero), else 1.
+    fn min_non_null_count(self) -> i64 {
+        match self {
+            AggShape::Variance { sample: true, .. } => 2,
+            _ => 1,
+        }
     }
 }
 
@@ -76,17 +94,21 @@ struct AggSpec {
 }
 
 /// The aggregate output type, via the single shared planner/engine rule
-/// (`gnitz_wire::agg_output_type`). AVG is planner-lowered (SUM/COUNT + a
-/// finalize divide) before the wire and always produces F64. A source-less
+/// (`gnitz_wire::agg_output_type`). AVG and VAR/STDDEV are planner-lowered
+/// (linear specs + a finalize) before the wire and always produce F64. A source-less
 /// aggregate (COUNT) passes I64, which the rule maps to its own default arms.
 pub(crate) fn agg_result_type(func: AggFunc, src_col: Option<usize>, schema: &Schema) -> TypeCode {
     let wire_func = match func {
-        AggFunc::Avg => return TypeCode::F64,
+        AggFunc::Avg | AggFunc::VarPop | AggFunc::VarSamp | AggFunc::StddevPop | AggFunc::StddevSamp => {
+            return TypeCode::F64
+        }
         AggFunc::Count => gnitz_core::AggFunc::Count,
         AggFunc::CountNonNull => gnitz_core::AggFunc::CountNonNull,
         AggFunc::Sum => gnitz_core::AggFunc::Sum,
         AggFunc::Min => gnitz_core::AggFunc::Min,
         AggFunc::Max => gnitz_core::AggFunc::Max,
+        AggFunc::ApproxCountDistinct => gnitz_core::AggFunc::ApproxCountDistinct,
+        AggFunc::ApproxPercentile(q) => gnitz_core::AggFunc::ApproxPercentile(q),
     };
     let src_tc = match src_col {
         Some(c) => schema.columns[c].type_code as u8,
@@ -107,16 +129,26 @@ pub(crate) fn agg_result_type(func: AggFunc, src_col: Option<usize>, schema: &Sc
 /// * COUNT / COUNT_NON_NULL are always a concrete integer (`empty_renders_zero`);
 /// * a Direct SUM is only reached for a non-nullable source (a nullable source
 ///   routes to `NullfillSum`), so it always has a value;
-/// * MIN / MAX render NULL only for an all-NULL group, i.e. a nullable source.
+/// * MIN / MAX render NULL only for an all-NULL group, i.e. a nullable source;
+/// * APPROX_COUNT_DISTINCT estimates a count (`0` when empty);
+/// * APPROX_PERCENTILE renders NULL when no value lands in the sketch — an
+///   all-NULL group, or an all-NaN one over a float source.
 ///
 /// Mirrors `emit.rs`'s null-bit rule (`is_untouched() && !empty_renders_zero()`).
-/// AVG is never `Direct` (it always carries a COUNT_NON_NULL companion).
+/// AVG and VAR/STDDEV are never `Direct` (they always carry a COUNT_NON_NULL
+/// companion).
 fn direct_agg_nullable(agg_func: AggFunc, arg_col: Option<usize>, is_global: bool, schema: &Schema) -> bool {
     match agg_func {
-        AggFunc::Count | AggFunc::CountNonNull => false,
+        AggFunc::Count | AggFunc::CountNonNull | AggFunc::ApproxCountDistinct => false,
         AggFunc::Sum => is_global,
+        AggFunc::ApproxPercentile(_) => {
+            let src = &schema.columns[arg_col.unwrap()];
+            is_global || src.is_nullable || src.type_code.is_float()
+        }
         AggFunc::Min | AggFunc::Max => is_global || schema.columns[arg_col.unwrap()].is_nullable,
-        AggFunc::Avg => unreachable!("AVG is never AggShape::Direct"),
+        AggFunc::Avg | AggFunc::VarPop | AggFunc::VarSamp | AggFunc::StddevPop | AggFunc::StddevSamp => {
+            unreachable!("{agg_func:?} is never AggShape::Direct")
+        }
     }
 }
 
@@ -162,13 +194,16 @@ fn group_col_reduce_pos(
 /// informational in a single-source context — see `bind_single_table`).
 /// `bound` narrows the initial full-source backfill scan to a secondary-index
 /// range. A physical access hint only: the WHERE below is emitted verbatim either
-/// way, so the bound never changes what the view contains.
+/// way, so the bound never changes what the view contains. `retention` is the
+/// view's `WITH (retention = n)`, honored only by a windowed grouping (see
+/// `window`).
 pub(crate) fn emit_group_by_pieces(
     client: &mut GnitzClient,
     view_id: u64,
     select: &sqlparser::ast::Select,
     source: (u64, std::rc::Rc<Schema>),
     bound: Option<gnitz_wire::ScanBound>,
+    retention: Option<u64>,
 ) -> Result<EmitPieces, GnitzSqlError> {
     // Grouped views consume FROM, WHERE, GROUP BY, HAVING, and the projection; reject every
     // other clause (PREWHERE, TOP, QUALIFY, …) so a dropped clause is a clean error.
@@ -181,7 +216,7 @@ pub(crate) fn emit_group_by_pieces(
         },
         "CREATE VIEW",
     )?;
-    let (source_tid, source_schema) = source;
+    let (source_tid, table_schema) = source;
     // A reduce directly over a REPLICATED source must run shard-free on every
     // worker (`reduce_multi_local`): the full copy is already on every worker, so
     // a sharded reduce would scatter W identical copies into each group owner and
@@ -206,8 +241,26 @@ pub(crate) fn emit_group_by_pieces(
             ))
         }
     };
+    // A TUMBLE/HOP window groups the relation the window map produces: the
+    // source plus a computed `window_start` column, over which every group,
+    // aggregate, and HAVING column below resolves. The WHERE still binds against
+    // the table, since it runs ahead of the map.
+    let window = window::parse_window(group_exprs, &table_schema)?;
+    if retention.is_some() && window.is_none() {
+        return Err(GnitzSqlError::Plan(
+            "WITH (retention = …) requires a GROUP BY TUMBLE(…) / HOP(…) window".to_string(),
+        ));
+    }
+    let source_schema = match &window {
+        Some(w) => std::rc::Rc::new(w.windowed_schema(&table_schema)),
+        None => table_schema.clone(),
+    };
     let mut group_col_indices: Vec<usize> = Vec::new();
     for ge in group_exprs {
+        if let Some(w) = window.as_ref().filter(|w| std::ptr::eq(ge, w.expr)) {
+            group_col_indices.push(w.start_col(&table_schema));
+            continue;
+        }
         // Bare or qualified (`t.g`) single-relation reference — the qualifier
         // carries no disambiguating information over the single grouped source,
         // matching HAVING and the projection (`bind_single_table`).
@@ -245,6 +298,15 @@ pub(crate) fn emit_group_by_pieces(
             }
         };
 
+        // The window expression itself (`SELECT TUMBLE(ts, 60), …`) projects the
+        // window column; `window_start` by name resolves like any column.
+        if let Some(w) = window.as_ref().filter(|w| expr == w.expr) {
+            select_items.push(GroupBySelectItem::GroupCol {
+                src_col: w.start_col(&table_schema),
+                name: alias.unwrap_or_else(|| window::WINDOW_START.to_string()),
+            });
+            continue;
+        }
         let bound = bind_single_table(expr, &source_schema)?;
         match &bound {
             BoundExpr::ColRef(col_idx) => {
@@ -270,6 +332,12 @@ pub(crate) fn emit_group_by_pieces(
                         AggFunc::Min => "_min",
                         AggFunc::Max => "_max",
                         AggFunc::Avg => "_avg",
+                        AggFunc::ApproxCountDistinct => "_approx_count_distinct",
+                        AggFunc::ApproxPercentile(_) => "_approx_percentile",
+                        AggFunc::VarPop => "_var_pop",
+                        AggFunc::VarSamp => "_var_samp",
+                        AggFunc::StddevPop => "_stddev_pop",
+                        AggFunc::StddevSamp => "_stddev_samp",
                     };
                     format!("{prefix}{idx}")
                 });
@@ -323,7 +391,7 @@ pub(crate) fn emit_group_by_pieces(
     //     two-phase decision below; the companion never changes linearity.)
     let all_linear = agg_specs
         .iter()
-        .all(|s| matches!(s.op, AGG_COUNT | AGG_SUM | AGG_COUNT_NON_NULL));
+        .all(|s| matches!(s.op, AGG_COUNT | AGG_SUM | AGG_COUNT_NON_NULL | AGG_SUM_SQ));
     if !agg_specs.iter().any(|s| s.op == AGG_COUNT) {
         // Route through push_agg_specs — the single source of truth for spec
         // layout and out_type — rather than hand-rolling the COUNT spec. The
@@ -392,14 +460,18 @@ pub(crate) fn emit_group_by_pieces(
     // narrowed. (A wholly-constant WHERE elides the node, but cannot co-occur with
     // a bound: it has no `col OP literal` conjunct for a candidate to come from.)
     let filtered = if let Some(where_expr) = &select.selection {
-        let pred = bind_single_table(where_expr, &source_schema)?;
-        match compile_filter_program(&pred, &source_schema)? {
+        let pred = bind_single_table(where_expr, &table_schema)?;
+        match compile_filter_program(&pred, &table_schema)? {
             Some(p) => cb.filter(inp, Some(p)),
             None => inp,
         }
     } else {
         inp
     };
+    let filtered = match &window {
+        Some(w) => w.emit(&mut cb, filtered, &table_schema),
+        None => filtered,
+    };
 
     // REDUCE — always use multi-agg path.
     //
@@ -433,12 +505,18 @@ pub(crate) fn emit_group_by_pieces(
     // Float SUM (and AVG over a float, whose SUM component is float) is excluded:
     // IEEE-754 addition is non-associative, so summing per-worker partials would make
     // the result depend on the worker count — those keep the deterministic funnel.
+    // SUM_SQ is F64 for every source (an integer Σx² overflows i64), and squares
+    // past 2^53 round, so VAR/STDDEV keep the funnel too.
     // `two_phase ⊆ global_ground`: it is the distributable refinement of the
     // ungrouped (empty group set) case, so it reuses that predicate.
     let two_phase = global_ground
         && !source_replicated
         && all_linear
-        && !agg_specs.iter().any(|s| s.op == AGG_SUM && s.out_type.is_float());
+        && !agg_specs.iter().any(|s| match s.op {
+            AGG_SUM => s.out_type.is_float(),
+            AGG_SUM_SQ => true,
+            _ => false,
+        });
     let reduced = if two_phase {
         // Phase 1 — per-worker local partial. No ExchangeShard, global_ground = false
         // (a worker with no local rows contributes no partial, never a ground row).
@@ -461,7 +539,7 @@ pub(crate) fn emit_group_by_pieces(
                 let merge = match *op {
                     AGG_COUNT | AGG_COUNT_NON_NULL => AGG_SUM_ZERO,
                     AGG_SUM => AGG_SUM,
-                    _ => unreachable!("two_phase implies all-linear, integer specs"),
+                    _ => unreachable!("two_phase implies COUNT / integer SUM specs"),
                 };
                 // Local output column `1 + i` holds local agg `i` (col 0 is _group_pk).
                 (merge, 1 + i)
@@ -471,13 +549,25 @@ pub(crate) fn emit_group_by_pieces(
         cb.reduce_multi(local, &[], &combine_specs, true, ReduceOutKey::SyntheticFold)
     } else if source_replicated {
         // Shard-free: every worker reduces its full local copy to the same global
-        // aggregate (no ExchangeShard ⇒ no gather barrier, no N-fold sum).
-        cb.reduce_multi_local(filtered, &reduce_group_cols, &circuit_specs, global_ground, out_key)
+        // aggregate (no ExchangeShard ⇒ no gather barrier, no N-fold sum). Each
+        // worker sees every row, so a retention's watermark agrees everywhere.
+        let input = match (&window, retention) {
+            (Some(w), Some(horizon)) => w.retain(&mut cb, filtered, &table_schema, horizon),
+            _ => filtered,
+        };
+        cb.reduce_multi_local(input, &reduce_group_cols, &circuit_specs, global_ground, out_key)
+    } else if let (Some(w), Some(horizon)) = (&window, retention) {
+        // A retention expires rows after the exchange, so each group is judged
+        // by the one worker that reduces it.
+        let sharded = cb.shard(filtered, &reduce_group_cols);
+        let retained = w.retain(&mut cb, sharded, &table_schema, horizon);
+        cb.reduce_multi_local(retained, &reduce_group_cols, &circuit_specs, global_ground, out_key)
     } else {
         cb.reduce_multi(filtered, &reduce_group_cols, &circuit_specs, global_ground, out_key)
     };
 
-    // 6. Post-reduce MAP: project group cols + compute aggregates (AVG = SUM/COUNT)
+    // 6. Post-reduce MAP: project group cols + compute aggregates (AVG = SUM/COUNT,
+    //    VAR/STDDEV from SUM, COUNT and SUM_SQ)
     //    Reduce output: [pk, (group_cols...), agg0, agg1, ...]
     //    MAP inherits PK from input; ExprProgram writes payload columns only.
     //    Natural-PK group cols are part of that inherited PK region — the alias
@@ -592,6 +682,43 @@ pub(crate) fn emit_group_by_pieces(
                         // NULL (div-by-zero), hence the blanket-nullable output.
                         post_map_eb.emit_col(gated, payload_idx);
                     }
+                    AggShape::Variance { sample, stddev } => {
+                        // M2 = Σx² − (Σx)²/n, divided by n (VAR_POP) or n − 1
+                        // (VAR_SAMP). Both divides go NULL on a zero divisor, so an
+                        // empty group — and a one-row group for the sample forms —
+                        // renders NULL, hence the blanket-nullable output.
+                        let sq_col = agg_col_offset + m.specs_start + 2;
+                        let float_src = m.arg_is_float(&source_schema);
+                        let mut load_f = |col: usize| {
+                            if float_src {
+                                post_map_eb.load_col_float(col)
+                            } else {
+                                let r = post_map_eb.load_col_int(col);
+                                post_map_eb.int_to_float(r)
+                            }
+                        };
+                        let sum_f = load_f(sum_col);
+                        // Σx² is an F64 column whatever the source type.
+                        let sq_f = post_map_eb.load_col_float(sq_col);
+                        let cnt_reg = post_map_eb.load_col_int(cnt_col);
+                        let n_f = post_map_eb.int_to_float(cnt_reg);
+                        let sum_2 = post_map_eb.float_mul(sum_f, sum_f);
+                        let sum_2_n = post_map_eb.float_div(sum_2, n_f);
+                        let m2 = post_map_eb.float_sub(sq_f, sum_2_n);
+                        let denom = if sample {
+                            let one = post_map_eb.load_const(1.0f64.to_bits() as i64);
+                            post_map_eb.float_sub(n_f, one)
+                        } else {
+                            n_f
+                        };
+                        let var = post_map_eb.float_div(m2, denom);
+                        // Cancellation can leave a constant group a hair below zero.
+                        let zero = post_map_eb.load_const(0);
+                        let below = post_map_eb.fcmp_lt(var, zero);
+                        let var = post_map_eb.select(below, zero, var);
+                        let out = if stddev { post_map_eb.float_sqrt(var) } else { var };
+                        post_map_eb.emit_col(out, payload_idx);
+                    }
                     AggShape::Direct => {
                         // Direct aggregate: single spec copied straight through,
                         // raw null bit included (set by emit.rs only for an
@@ -727,7 +854,13 @@ fn push_agg_specs(
     if let Some(c) = arg_col {
         let tc = schema.columns[c].type_code;
         match agg_func {
-            AggFunc::Sum | AggFunc::Avg => {
+            AggFunc::Sum
+            | AggFunc::Avg
+            | AggFunc::ApproxPercentile(_)
+            | AggFunc::VarPop
+            | AggFunc::VarSamp
+            | AggFunc::StddevPop
+            | AggFunc::StddevSamp => {
                 if !(is_integer_type(tc) || tc.is_float()) || is_wide_int(tc) {
                     return Err(GnitzSqlError::Bind(format!(
                         "{agg_func:?} is not supported on column type {tc:?} ('{}')",
@@ -743,7 +876,8 @@ fn push_agg_specs(
                     )));
                 }
             }
-            AggFunc::Count | AggFunc::CountNonNull => {}
+            // The distinct sketch hashes any column type.
+            AggFunc::Count | AggFunc::CountNonNull | AggFunc::ApproxCountDistinct => {}
         }
     }
     let mut push = |op: u64, func: AggFunc, col: usize| {
@@ -796,6 +930,40 @@ fn push_agg_specs(
             push(AGG_COUNT_NON_NULL, AggFunc::CountNonNull, c);
             AggShape::Avg
         }
+        // VAR/STDDEV keep the linear (Σx, n, Σx²) triple and finalize after the
+        // reduce, so they ride the linear fold (but not the two-phase global path:
+        // the F64 Σx² partials would not combine exactly).
+        AggFunc::VarPop | AggFunc::VarSamp | AggFunc::StddevPop | AggFunc::StddevSamp => {
+            let c = arg_col.unwrap();
+            push(AGG_SUM, AggFunc::Sum, c);
+            push(AGG_COUNT_NON_NULL, AggFunc::CountNonNull, c);
+            agg_specs.push(AggSpec {
+                op: AGG_SUM_SQ,
+                col: c,
+                out_type: TypeCode::from_validated_u8(gnitz_core::agg_output_type(
+                    gnitz_core::AggFunc::SumSquares,
+                    schema.columns[c].type_code as u8,
+                )),
+            });
+            AggShape::Variance {
+                sample: matches!(agg_func, AggFunc::VarSamp | AggFunc::StddevSamp),
+                stddev: matches!(agg_func, AggFunc::StddevPop | AggFunc::StddevSamp),
+            }
+        }
+        // The sketches are non-linear (maintained through the value index), so a
+        // reduce carrying one never takes the two-phase global path.
+        AggFunc::ApproxCountDistinct => {
+            push(AGG_APPROX_COUNT_DISTINCT, agg_func, arg_col.unwrap());
+            AggShape::Direct
+        }
+        AggFunc::ApproxPercentile(q) => {
+            push(
+                gnitz_core::AggFunc::ApproxPercentile(q).as_u64(),
+                agg_func,
+                arg_col.unwrap(),
+            );
+            AggShape::Direct
+        }
     })
 }
 
@@ -818,10 +986,10 @@ fn append_agg_mapping(
     let start = agg_specs.len();
     let shape = push_agg_specs(agg_func, arg_col, source_schema, agg_specs)?;
     let output_nullable = match shape {
-        // AVG's and nullable-SUM's null-ness lives in the COUNT_NON_NULL
-        // companion (the finalize renders NULL via div-by-zero), so their
-        // outputs keep the blanket nullable mark.
-        AggShape::Avg | AggShape::NullfillSum => true,
+        // AVG's, nullable-SUM's and VAR/STDDEV's null-ness lives in the
+        // COUNT_NON_NULL companion (the finalize renders NULL via div-by-zero),
+        // so their outputs keep the blanket nullable mark.
+        AggShape::Avg | AggShape::NullfillSum | AggShape::Variance { .. } => true,
         AggShape::Direct => direct_agg_nullable(agg_func, arg_col, is_global, source_schema),
     };
     agg_mappings.push(AggMapping {
@@ -885,6 +1053,39 @@ struct HavingCtx<'a> {
     agg_col_offset: usize,
 }
 
+/// HAVING's reading of a VAR/STDDEV aggregate: the same moment finalize the
+/// post-reduce MAP emits, as a bound expression over the `(SUM, COUNT, SUM_SQ)`
+/// reduce columns. The float divides go NULL on a zero divisor, matching the
+/// projected value's NULL rows.
+fn variance_having_expr(sum_col: usize, cnt_col: usize, sq_col: usize, sample: bool, stddev: bool) -> BoundExpr {
+    let bin = |l: BoundExpr, op: BinOp, r: BoundExpr| BoundExpr::BinOp(Box::new(l), op, Box::new(r));
+    let as_float = |c: usize| bin(BoundExpr::ColRef(c), BinOp::Mul, BoundExpr::LitFloat(1.0));
+    let sum_2_n = bin(
+        bin(as_float(sum_col), BinOp::Mul, as_float(sum_col)),
+        BinOp::Div,
+        BoundExpr::ColRef(cnt_col),
+    );
+    let m2 = bin(as_float(sq_col), BinOp::Sub, sum_2_n);
+    let denom = if sample {
+        bin(BoundExpr::ColRef(cnt_col), BinOp::Sub, BoundExpr::LitInt(1))
+    } else {
+        BoundExpr::ColRef(cnt_col)
+    };
+    let var = bin(m2, BinOp::Div, denom);
+    let clamped = BoundExpr::Case {
+        branches: vec![(
+            bin(var.clone(), BinOp::Lt, BoundExpr::LitFloat(0.0)),
+            BoundExpr::LitFloat(0.0),
+        )],
+        else_: Some(Box::new(var)),
+    };
+    if stddev {
+        BoundExpr::UnaryOp(UnaryOp::Sqrt, Box::new(clamped))
+    } else {
+        clamped
+    }
+}
+
 /// Resolve a HAVING aggregate function reference to its reduce `AggMapping`, or a
 /// Bind error naming the unresolved aggregate. Shared by the value-position binder
 /// (`bind_having_expr`) and the IS [NOT] NULL binder (`bind_having_null_test`) so
@@ -994,6 +1195,13 @@ impl LeafBinder for Having<'_> {
                     )),
                 ))
             }
+            AggShape::Variance { sample, stddev } => Ok(variance_having_expr(
+                sum_col,
+                cnt_col,
+                ctx.agg_col_offset + m.specs_start + 2,
+                sample,
+                stddev,
+            )),
             AggShape::Direct => Ok(BoundExpr::ColRef(sum_col)),
         }
     }
@@ -1014,14 +1222,14 @@ impl LeafBinder for Having<'_> {
                 let m = resolve_having_mapping(func, self.ctx)?;
                 let val_col = self.ctx.agg_col_offset + m.specs_start;
                 if m.shape.has_count_companion() {
-                    // Nullable SUM / AVG: NULL ⇔ COUNT_NON_NULL companion (at
-                    // specs_start + 1) is 0 — the same gate the SELECT
-                    // projection applies.
-                    let bop = if want_null { BinOp::Eq } else { BinOp::Ne };
+                    // Nullable SUM / AVG / VAR: NULL ⇔ the COUNT_NON_NULL
+                    // companion (at specs_start + 1) is below the shape's
+                    // minimum — the same gate the SELECT projection applies.
+                    let bop = if want_null { BinOp::Lt } else { BinOp::Ge };
                     Ok(BoundExpr::BinOp(
                         Box::new(BoundExpr::ColRef(val_col + 1)),
                         bop,
-                        Box::new(BoundExpr::LitInt(0)),
+                        Box::new(BoundExpr::LitInt(m.shape.min_non_null_count())),
                     ))
                 } else {
                     // Direct aggregate: the value column's raw null bit is
@@ -1078,6 +1286,14 @@ mod tests {
         assert!(matches!(try_push(AggFunc::Min, Some(4)), Err(GnitzSqlError::Bind(_)))); // MIN(str)
         assert!(matches!(try_push(AggFunc::Max, Some(2)), Err(GnitzSqlError::Bind(_))));
         // MAX(blob)
+        assert!(matches!(
+            try_push(AggFunc::ApproxPercentile(5_000), Some(4)),
+            Err(GnitzSqlError::Bind(_))
+        )); // APPROX_PERCENTILE(str)
+        assert!(matches!(
+            try_push(AggFunc::VarPop, Some(4)),
+            Err(GnitzSqlError::Bind(_))
+        )); // VAR_POP(str)
     }
 
     #[test]
@@ -1087,6 +1303,24 @@ mod tests {
         assert!(try_push(AggFunc::Min, Some(1)).is_ok()); // MIN(i64)
         assert!(try_push(AggFunc::Count, None).is_ok()); // COUNT(*)
         assert!(try_push(AggFunc::CountNonNull, Some(2)).is_ok()); // COUNT(blob) — presence only
+        assert!(try_push(AggFunc::ApproxCountDistinct, Some(4)).is_ok()); // hashes any type
+        assert!(try_push(AggFunc::ApproxPercentile(9_900), Some(1)).is_ok());
+        assert!(try_push(AggFunc::StddevSamp, Some(1)).is_ok()); // STDDEV_SAMP(i64)
+    }
+
+    /// VAR/STDDEV plan as the linear `(SUM, COUNT_NON_NULL, SUM_SQ)` triple, and
+    /// only the sample forms need two non-null rows before rendering a value.
+    #[test]
+    fn push_agg_specs_variance_moment_triple() {
+        let mut specs = Vec::new();
+        let shape = push_agg_specs(AggFunc::VarSamp, Some(1), &schema(), &mut specs).unwrap();
+        let ops: Vec<u64> = specs.iter().map(|s| s.op).collect();
+        assert_eq!(ops, vec![AGG_SUM, AGG_COUNT_NON_NULL, AGG_SUM_SQ]);
+        assert_eq!(specs[2].out_type, TypeCode::F64);
+        assert!(shape.has_count_companion());
+        assert_eq!(shape.min_non_null_count(), 2);
+        let pop = try_push(AggFunc::StddevPop, Some(1)).unwrap();
+        assert_eq!(pop.min_non_null_count(), 1);
     }
 
     /// SUM over a U64 source is typed U64 (bit pattern is the correct unsigned
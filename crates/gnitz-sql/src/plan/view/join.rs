@@ -5,24 +5,26 @@
 
 use crate::ast_util::{
     collect_column_refs, collect_projection_column_refs, extract_table_name_and_alias, flatten_conjuncts,
-    is_wildcard_projection, WildcardRewrite,
+    is_wildcard_projection, projection_item_expr, WildcardRewrite,
 };
 use crate::bind::{resolve_qualified_column, resolve_unqualified_column, AliasMap, Binder, ResolvedRelation};
 use crate::error::GnitzSqlError;
 use crate::plan::validate::{
     reject_column_overflow, reject_duplicate_column_names, reject_unhonored_select_clauses, HonoredClauses,
 };
+use crate::plan::view::delta_join;
+use crate::plan::view::join_order::{self, EquiEdge, JoinOrder, RelStats};
 use crate::plan::view::predicates::{
     build_reindex_program, build_reindex_program_keep, build_residual_filter_prog, converse_rel,
     extract_join_predicates, multi_null_filter_prog, null_gate, pure_range_m_output_cols, schema_type_codes,
     RangeConjunct,
 };
-use crate::plan::view::{EmitPieces, ViewChain};
+use crate::plan::view::{EmitPieces, JoinStrategy, ViewChain};
 use gnitz_core::{
     CircuitBuilder, ColumnDef, ExprBuilder, FixedInt, GnitzClient, RangeRel, ReduceOutKey, Schema, TypeCode,
 };
 use gnitz_wire::{AGG_MAX, AGG_MIN};
-use sqlparser::ast::{Expr, Ident, JoinConstraint, JoinOperator, SelectItem};
+use sqlparser::ast::{BinaryOperator, Expr, Ident, JoinConstraint, JoinOperator, SelectItem};
 use std::collections::{HashMap, HashSet};
 use std::rc::Rc;
 
@@ -298,9 +300,10 @@ struct LoweredJoin {
 }
 
 /// The ON expression and type of one join step. Each step supports
-/// INNER / LEFT / RIGHT / FULL, left-deep in syntactic order (no reordering),
-/// so `a LEFT JOIN b JOIN c` is `(a LEFT JOIN b) JOIN c` — each step's emit is the
-/// standard 2-way emit, outer null-fill included.
+/// INNER / LEFT / RIGHT / FULL, left-deep in syntactic order (only an all-INNER
+/// chain is reordered, by `cost_based_order`), so `a LEFT JOIN b JOIN c` is
+/// `(a LEFT JOIN b) JOIN c` — each step's emit is the standard 2-way emit, outer
+/// null-fill included.
 ///
 /// sqlparser 0.56 spells the bare/`OUTER` forms as separate variants
 /// (`Left`/`LeftOuter`, `Right`/`RightOuter`); FULL has only `FullOuter`.
@@ -365,7 +368,7 @@ type Provenance = Vec<(String, Rc<Schema>, usize)>;
 /// so it maps cleanly onto each segment's already-pruned schema — names survive
 /// pruning, indices do not. The chain pre-pass builds one per intermediate
 /// segment; `live_columns_projection` reads it.
-type LiveNames = HashMap<String, HashSet<String>>;
+pub(super) type LiveNames = HashMap<String, HashSet<String>>;
 
 /// Resolve `qual`/`name` against the aliases visible at a reference site and mark
 /// it live: a qualified `q.c` marks `q`'s column `c`; a bare `c` marks it in every
@@ -386,7 +389,7 @@ fn mark_live(qual: Option<&str>, name: &str, visible: &[(String, Rc<Schema>)], l
 
 /// Mark live every column referenced by `expr`, resolving each `(qualifier, name)`
 /// against `visible` via `mark_live`.
-fn collect_live_from_expr(expr: &Expr, visible: &[(String, Rc<Schema>)], live: &mut LiveNames) {
+pub(super) fn collect_live_from_expr(expr: &Expr, visible: &[(String, Rc<Schema>)], live: &mut LiveNames) {
     let mut refs: Vec<(Option<&str>, &str)> = Vec::new();
     collect_column_refs(expr, &mut refs);
     for (qual, name) in refs {
@@ -397,7 +400,11 @@ fn collect_live_from_expr(expr: &Expr, visible: &[(String, Rc<Schema>)], live: &
 /// Mark live every column the final projection references (over all aliases). A
 /// wildcard (`*` / `tbl.*`) marks every column of every alias — the degenerate
 /// no-pruning case that keeps a `SELECT *` chain byte-identical to today.
-fn collect_live_from_projection(projection: &[SelectItem], aliases: &[(String, Rc<Schema>)], live: &mut LiveNames) {
+pub(super) fn collect_live_from_projection(
+    projection: &[SelectItem],
+    aliases: &[(String, Rc<Schema>)],
+    live: &mut LiveNames,
+) {
     let mut refs: Vec<(Option<&str>, &str)> = Vec::new();
     if collect_projection_column_refs(projection, &mut refs) {
         for (qual, name) in refs {
@@ -478,16 +485,137 @@ struct JoinStep<'a> {
     right_base_schema: Rc<Schema>,
 }
 
+/// Choose the relation order of an all-INNER chain by estimated cost
+/// (`join_order`). `rels` is the chain in FROM order as `(alias, tid, base
+/// schema)`, seed first, and `ons` its steps' ON clauses. Returns the new order
+/// and, per step of it, the ON that step evaluates: every ON conjunct moves to
+/// the first step at which all the relations it references have joined (for
+/// INNER joins, ON conjuncts and their placement are interchangeable). `None`
+/// keeps FROM order — when it is already cheapest, when the statistics cannot
+/// order it (FROM order not equi-connected, e.g. a band step; more than
+/// `MAX_REORDER_RELATIONS`), or when a reference does not resolve to exactly
+/// one relation, leaving the emit loop to raise its usual error. The decision
+/// is recorded in `chain.notes` for `EXPLAIN CREATE VIEW`.
+fn cost_based_order(
+    client: &mut GnitzClient,
+    chain: &mut ViewChain,
+    rels: &[(String, u64, Rc<Schema>)],
+    ons: &[&Expr],
+) -> Result<Option<(Vec<usize>, Vec<Expr>)>, GnitzSqlError> {
+    let n = rels.len();
+    let visible: Vec<(String, Rc<Schema>)> = rels
+        .iter()
+        .map(|(a, _, sch)| (a.to_ascii_lowercase(), Rc::clone(sch)))
+        .collect();
+    if n > join_order::MAX_REORDER_RELATIONS || (1..n).any(|i| visible[..i].iter().any(|(a, _)| *a == visible[i].0)) {
+        return Ok(None);
+    }
+    let mut conjuncts: Vec<&Expr> = Vec::new();
+    for &on in ons {
+        flatten_conjuncts(on, &mut conjuncts);
+    }
+    let mut conjunct_rels: Vec<Vec<usize>> = Vec::with_capacity(conjuncts.len());
+    for c in &conjuncts {
+        let mut refs: Vec<(Option<&str>, &str)> = Vec::new();
+        collect_column_refs(c, &mut refs);
+        let mut rs = Vec::with_capacity(refs.len());
+        for (qual, name) in refs {
+            let Some((r, _)) = join_order::resolve_column(qual, name, &visible) else {
+                return Ok(None);
+            };
+            rs.push(r);
+        }
+        conjunct_rels.push(rs);
+    }
+    let edges: Vec<EquiEdge> = conjuncts
+        .iter()
+        .filter_map(|c| join_order::equi_edge(c, &visible))
+        .collect();
+    let from_order: Vec<usize> = (0..n).collect();
+    if !join_order::is_connected(&from_order, &edges) {
+        return Ok(None);
+    }
+
+    // One statistics aggregate per distinct relation id (a self-join's aliases
+    // share it), over the union of the columns any alias of it joins on.
+    let mut by_tid: HashMap<u64, RelStats> = HashMap::new();
+    for (tid, sch) in rels.iter().map(|(_, tid, sch)| (*tid, sch)) {
+        if by_tid.contains_key(&tid) {
+            continue;
+        }
+        let mut key_cols: Vec<usize> = edges
+            .iter()
+            .flat_map(|e| [e.a, e.b])
+            .filter(|&(r, _)| rels[r].1 == tid)
+            .map(|(_, c)| c)
+            .collect();
+        key_cols.sort_unstable();
+        key_cols.dedup();
+        by_tid.insert(tid, join_order::read_rel_stats(client, tid, sch, &key_cols)?);
+    }
+    let stats: Vec<RelStats> = rels.iter().map(|(_, tid, _)| by_tid[tid].clone()).collect();
+
+    let (Some(from), Some(best)) = (
+        join_order::estimate(&from_order, &stats, &edges),
+        join_order::best_order(&stats, &edges),
+    ) else {
+        return Ok(None);
+    };
+    let describe = |o: &JoinOrder| {
+        let names: Vec<&str> = o.order.iter().map(|&r| rels[r].0.as_str()).collect();
+        let rows: Vec<String> = o.intermediates.iter().map(|r| format!("{r:.0}")).collect();
+        format!("{} (est. intermediate rows [{}])", names.join(" ⋈ "), rows.join(", "))
+    };
+    if best.cost >= from.cost {
+        chain
+            .notes
+            .push(format!("join order: {} — FROM order kept", describe(&from)));
+        return Ok(None);
+    }
+    chain.notes.push(format!(
+        "join order: {} — reordered from {}",
+        describe(&best),
+        describe(&from)
+    ));
+
+    let mut pos = vec![0usize; n];
+    for (k, &r) in best.order.iter().enumerate() {
+        pos[r] = k;
+    }
+    let mut step_conjuncts: Vec<Vec<Expr>> = vec![Vec::new(); n - 1];
+    for (c, rs) in conjuncts.iter().zip(&conjunct_rels) {
+        let last = rs.iter().map(|&r| pos[r]).max().unwrap_or(0);
+        step_conjuncts[last.max(1) - 1].push((*c).clone());
+    }
+    let step_ons = step_conjuncts
+        .into_iter()
+        .map(|cs| {
+            cs.into_iter()
+                .reduce(|l, r| Expr::BinaryOp {
+                    left: Box::new(l),
+                    op: BinaryOperator::And,
+                    right: Box::new(r),
+                })
+                .expect("a connected order joins every step through an equi conjunct")
+        })
+        .collect();
+    Ok(Some((best.order, step_ons)))
+}
+
 /// Plan a join FROM (`from[0].joins.len() >= 1`) as a left-deep chain of 2-way
 /// join steps, reusing the standard join emitter unchanged. Each intermediate
 /// `h_i = h_{i-1} ⋈ r_i` is a hidden view pushed onto `chain` (pre-allocated id,
 /// live columns projected); the final step is emitted with `emit_vid`, the
 /// user's projection, and the top-level WHERE (`classify_join_where`). A single
-/// join is the degenerate case: no intermediates, one emit. Original table
-/// aliases are tracked through a *provenance* map — alias → (accumulator, column
-/// offset) — so a later `ON`/projection/WHERE reference to `a.x` resolves to the
-/// accumulated hidden view's physical column with no name rewriting. Returns the
-/// final pieces.
+/// join is the degenerate case: no intermediates, one emit. An all-INNER chain
+/// of three or more relations is first reordered by `cost_based_order`; a chain
+/// with an OUTER step keeps FROM order. Under `JoinStrategy::Delta` a join of
+/// three or more relations is instead emitted as one delta query
+/// (`delta_join`). Original table aliases are tracked
+/// through a *provenance* map — alias → (accumulator, column offset) — so a
+/// later `ON`/projection/WHERE reference to `a.x` resolves to the accumulated
+/// hidden view's physical column with no name rewriting. Returns the final
+/// pieces.
 pub(crate) fn plan_join_chain(
     client: &mut GnitzClient,
     binder: &mut Binder<'_>,
@@ -509,11 +637,13 @@ pub(crate) fn plan_join_chain(
     debug_assert!(n_joins >= 1, "plan_join_chain requires a join");
 
     // The leftmost relation seeds the accumulator.
-    let (left_name, left_alias) = extract_table_name_and_alias(&from.relation, "CREATE VIEW JOIN")?;
+    let (left_name, mut left_alias) = extract_table_name_and_alias(&from.relation, "CREATE VIEW JOIN")?;
     let (mut acc_tid, mut acc_schema) = binder.resolve(client, &left_name)?;
 
     // Resolve every join step once — ON + join type, right alias, right base
     // (tid, schema) — for the liveness pre-pass and the emit loop below.
+    // `reordered_ons` owns the redistributed ON clauses of a cost-based order.
+    let reordered_ons: Vec<Expr>;
     let mut steps: Vec<JoinStep<'_>> = Vec::with_capacity(n_joins);
     for join in &from.joins {
         let (on, join_type) = join_on_and_type(join)?;
@@ -528,6 +658,66 @@ pub(crate) fn plan_join_chain(
         });
     }
 
+    // `join_strategy = 'delta'`: no intermediates at all — every relation's
+    // delta probes the others' traces directly (`delta_join`).
+    if chain.join_strategy == JoinStrategy::Delta && n_joins > 1 {
+        if steps.iter().any(|s| s.join_type != JoinType::Inner) {
+            return Err(GnitzSqlError::Unsupported(
+                "join_strategy = 'delta' supports INNER joins only; use the default join strategy".into(),
+            ));
+        }
+        let mut rels = vec![(left_alias, acc_tid, acc_schema)];
+        rels.extend(
+            steps
+                .iter()
+                .map(|s| (s.right_alias.clone(), s.right_base_tid, Rc::clone(&s.right_base_schema))),
+        );
+        let ons: Vec<&Expr> = steps.iter().map(|s| s.on).collect();
+        let (pieces, note) =
+            delta_join::emit_delta_join(emit_vid, &select.projection, select.selection.as_ref(), &rels, &ons)?;
+        if !is_wildcard_projection(&select.projection) {
+            reject_duplicate_column_names(&pieces.1, "join view")?;
+        }
+        chain.notes.push(note);
+        return Ok(pieces);
+    }
+
+    // An all-INNER chain is order-free: reorder its relations by estimated
+    // intermediate size, so the hidden segments below materialize the cheap
+    // prefixes. A wildcard projection expands in relation order, so it pins
+    // FROM order (the view's column order must not depend on statistics).
+    if chain.cost_based_joins
+        && n_joins > 1
+        && steps.iter().all(|s| s.join_type == JoinType::Inner)
+        && select.projection.iter().all(|p| projection_item_expr(p).is_some())
+    {
+        let mut rels = vec![(left_alias.clone(), acc_tid, Rc::clone(&acc_schema))];
+        rels.extend(
+            steps
+                .iter()
+                .map(|s| (s.right_alias.clone(), s.right_base_tid, Rc::clone(&s.right_base_schema))),
+        );
+        let ons: Vec<&Expr> = steps.iter().map(|s| s.on).collect();
+        if let Some((order, new_ons)) = cost_based_order(client, chain, &rels, &ons)? {
+            reordered_ons = new_ons;
+            (left_alias, acc_tid, acc_schema) = rels[order[0]].clone();
+            steps = order[1..]
+                .iter()
+                .zip(&reordered_ons)
+                .map(|(&r, on)| {
+                    let (right_alias, right_base_tid, right_base_schema) = rels[r].clone();
+                    JoinStep {
+                        on,
+                        join_type: JoinType::Inner,
+                        right_alias,
+                        right_base_tid,
+                        right_base_schema,
+                    }
+                })
+                .collect();
+        }
+    }
+
     // ── Liveness pre-pass (chains only — a 2-way join emits no intermediate
     // segment, so there is nothing to prune). Collect the column references of each
     // step's ON (visible = aliases 0..=that step's right relation), the final
@@ -757,7 +947,7 @@ fn equi_keep_combined(projection: &[SelectItem], j: &LoweredJoin) -> Result<Vec<
 /// A schema pruned to its `keep` columns (ascending source order), payload-only —
 /// `pk_cols` is dropped (empty), since the pruned schema drives output-layout
 /// derivation and name resolution, never a PK region.
-fn prune_schema(schema: &Schema, keep: &[usize]) -> Schema {
+pub(super) fn prune_schema(schema: &Schema, keep: &[usize]) -> Schema {
     Schema {
         columns: keep.iter().map(|&i| schema.columns[i].clone()).collect(),
         pk_cols: Vec::new(),
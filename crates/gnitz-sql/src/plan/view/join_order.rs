@@ -0,0 +1,297 @@
+//! Cost-based relation order for an all-INNER multi-way join chain.
+//!
+//! `plan_join_chain` materializes every intermediate `h_k = r_0 ⋈ … ⋈ r_k` of
+//! its left-deep chain as a hidden view, and the next step keeps `h_k` as a join
+//! trace. Those intermediates are the chain's storage *and* its incremental
+//! cost: a delta on any relation joined before step `k` flows through `h_k`,
+//! and a delta joined after it probes `h_k`'s trace. So the order is chosen to
+//! minimize the summed estimated cardinality of the intermediates — the final
+//! step's output is the view itself and is the same under every order.
+//!
+//! Estimates use the textbook containment model: `|R ⋈ S|` on `R.x = S.y` is
+//! `|R|·|S| / max(V(R.x), V(S.y))`, with independent selectivities multiplied
+//! across the equi conjuncts that connect the relation being added to the
+//! joined prefix. Under that model a prefix's cardinality depends only on its
+//! relation *set*, so a subset DP over left-deep orders finds the optimum
+//! exactly. Only orders that add each relation through at least one equi
+//! conjunct are considered — a cross product is never introduced.
+
+use crate::error::GnitzSqlError;
+use gnitz_core::{CircuitBuilder, ColData, ColumnDef, GnitzClient, ReduceOutKey, Schema, TypeCode};
+use gnitz_wire::{AGG_APPROX_COUNT_DISTINCT, AGG_COUNT};
+use sqlparser::ast::{BinaryOperator, Expr};
+use std::rc::Rc;
+
+/// Largest chain (in relations) the subset DP orders; a longer chain keeps its
+/// FROM order. `2^n · n` states — trivial at 12.
+pub(super) const MAX_REORDER_RELATIONS: usize = 12;
+
+/// One equi conjunct `rels[a].col_a = rels[b].col_b` between two distinct
+/// relations of the chain, by relation index and column index.
+#[derive(Clone, Copy, Debug, PartialEq, Eq)]
+pub(super) struct EquiEdge {
+    pub a: (usize, usize),
+    pub b: (usize, usize),
+}
+
+/// Row count and per-column distinct-value counts of one relation, as read at
+/// plan time. `distinct[c]` is only meaningful for columns some edge joins on;
+/// the rest are left at `rows` (never consulted).
+#[derive(Clone, Debug, PartialEq)]
+pub(super) struct RelStats {
+    pub rows: f64,
+    pub distinct: Vec<f64>,
+}
+
+/// A chosen relation order with its estimated intermediate cardinalities
+/// (`intermediates[k]` = rows of the prefix of `k + 2` relations, for the
+/// `n - 2` materialized intermediates) and their sum.
+#[derive(Clone, Debug, PartialEq)]
+pub(super) struct JoinOrder {
+    pub order: Vec<usize>,
+    pub intermediates: Vec<f64>,
+    pub cost: f64,
+}
+
+/// Resolve a column reference to `(relation index, column index)` against the
+/// chain's `(lowercased alias, base schema)` list. `None` when the reference is
+/// unknown or an unqualified name is ambiguous — the caller then keeps FROM
+/// order, so the emitter raises its usual binding error.
+pub(super) fn resolve_column(qual: Option<&str>, name: &str, rels: &[(String, Rc<Schema>)]) -> Option<(usize, usize)> {
+    let mut found = None;
+    for (ri, (alias, sch)) in rels.iter().enumerate() {
+        if qual.is_some_and(|q| !alias.eq_ignore_ascii_case(q)) {
+            continue;
+        }
+        if let Some(ci) = sch.columns.iter().position(|c| c.name.eq_ignore_ascii_case(name)) {
+            if found.is_some() {
+                return None;
+            }
+            found = Some((ri, ci));
+        }
+    }
+    found
+}
+
+/// The `(qualifier, name)` of a bare or `alias.col` column reference, looking
+/// through parentheses.
+fn column_ref(expr: &Expr) -> Option<(Option<&str>, &str)> {
+    match expr {
+        Expr::Nested(inner) => column_ref(inner),
+        Expr::Identifier(id) => Some((None, id.value.as_str())),
+        Expr::CompoundIdentifier(parts) if parts.len() == 2 => {
+            Some((Some(parts[0].value.as_str()), parts[1].value.as_str()))
+        }
+        _ => None,
+    }
+}
+
+/// The equi edge a conjunct contributes, if it is `col = col` across two
+/// distinct relations.
+pub(super) fn equi_edge(conjunct: &Expr, rels: &[(String, Rc<Schema>)]) -> Option<EquiEdge> {
+    let Expr::BinaryOp {
+        left,
+        op: BinaryOperator::Eq,
+        right,
+    } = conjunct
+    else {
+        return None;
+    };
+    let (lq, ln) = column_ref(left)?;
+    let (rq, rn) = column_ref(right)?;
+    let a = resolve_column(lq, ln, rels)?;
+    let b = resolve_column(rq, rn, rels)?;
+    (a.0 != b.0).then_some(EquiEdge { a, b })
+}
+
+/// Read `schema`'s row count and the distinct counts of `key_cols` from one
+/// global aggregate over `tid`, run server-side as a transient: `COUNT(*)` and
+/// an `APPROX_COUNT_DISTINCT` sketch per key column. The relation never leaves
+/// the server — one row comes back however large it is — and the sketch skips
+/// SQL NULLs, which never match an equi-join. A distinct estimate is capped at
+/// the row count it cannot exceed. Only a table's lone PK column is unique by
+/// construction and is not sketched; a column of a compound PK repeats.
+pub(super) fn read_rel_stats(
+    client: &mut GnitzClient,
+    tid: u64,
+    schema: &Schema,
+    key_cols: &[usize],
+) -> Result<RelStats, GnitzSqlError> {
+    let sketched: Vec<usize> = key_cols.iter().copied().filter(|&c| schema.pk_cols != [c]).collect();
+    let mut specs: Vec<(u64, usize)> = vec![(AGG_COUNT, 0)];
+    specs.extend(sketched.iter().map(|&c| (AGG_APPROX_COUNT_DISTINCT, c)));
+    // COUNT and the distinct sketch are both I64 (`agg_output_type`).
+    let mut columns = vec![ColumnDef::new("_group_pk", TypeCode::U128, false).hidden()];
+    columns.push(ColumnDef::new("_rows", TypeCode::I64, false));
+    columns.extend(
+        sketched
+            .iter()
+            .map(|c| ColumnDef::new(format!("_distinct_{c}"), TypeCode::I64, false)),
+    );
+    let out_schema = Schema::from_parts(columns, vec![0])
+        .map_err(|e| GnitzSqlError::Plan(format!("join statistics schema is invalid: {e}")))?;
+
+    let mut cb = CircuitBuilder::new(1, tid);
+    let inp = cb.input_delta();
+    let reduced = cb.reduce_multi(inp, &[], &specs, true, ReduceOutKey::SyntheticFold);
+    cb.sink(reduced);
+    let batch = client.run_query(cb.build(), &out_schema).map_err(GnitzSqlError::Exec)?;
+
+    let cell = |ci: usize| -> f64 {
+        match (&batch.columns[ci], batch.live_rows().next()) {
+            (ColData::Fixed(buf), Some(r)) => i64::from_le_bytes(buf[r * 8..r * 8 + 8].try_into().unwrap()) as f64,
+            _ => 0.0,
+        }
+    };
+    let rows = cell(1);
+    let mut distinct = vec![rows; schema.columns.len()];
+    for (i, &c) in sketched.iter().enumerate() {
+        distinct[c] = cell(2 + i).min(rows);
+    }
+    Ok(RelStats { rows, distinct })
+}
+
+/// Estimated rows of the join of relation set `set` (a bitmask over `stats`):
+/// the product of its row counts times one `1 / max(V, V')` per edge inside the
+/// set. Floored at one row so a sparse estimate never zeroes a whole branch.
+fn set_rows(set: usize, stats: &[RelStats], edges: &[EquiEdge]) -> f64 {
+    let mut rows: f64 = (0..stats.len())
+        .filter(|i| set & (1 << i) != 0)
+        .map(|i| stats[i].rows)
+        .product();
+    for e in edges {
+        if set & (1 << e.a.0) != 0 && set & (1 << e.b.0) != 0 {
+            let v = stats[e.a.0].distinct[e.a.1].max(stats[e.b.0].distinct[e.b.1]).max(1.0);
+            rows /= v;
+        }
+    }
+    rows.max(1.0)
+}
+
+/// Whether relation `r` is joined to the relations of `set` by some edge.
+fn connects(r: usize, set: usize, edges: &[EquiEdge]) -> bool {
+    edges
+        .iter()
+        .any(|e| (e.a.0 == r && set & (1 << e.b.0) != 0) || (e.b.0 == r && set & (1 << e.a.0) != 0))
+}
+
+/// Whether every relation of `order` after the first joins the prefix before
+/// it through an equi edge — the only orders this module costs.
+pub(super) fn is_connected(order: &[usize], edges: &[EquiEdge]) -> bool {
+    let mut set = 0usize;
+    order.iter().enumerate().all(|(k, &r)| {
+        let ok = k == 0 || connects(r, set, edges);
+        set |= 1 << r;
+        ok
+    })
+}
+
+/// Cost `order`, or `None` if it is not connected (`is_connected`).
+pub(super) fn estimate(order: &[usize], stats: &[RelStats], edges: &[EquiEdge]) -> Option<JoinOrder> {
+    if !is_connected(order, edges) {
+        return None;
+    }
+    let n = order.len();
+    let mut set = 1usize << order[0];
+    let mut intermediates = Vec::with_capacity(n.saturating_sub(2));
+    for (k, &r) in order.iter().enumerate().skip(1) {
+        set |= 1 << r;
+        if k < n - 1 {
+            intermediates.push(set_rows(set, stats, edges));
+        }
+    }
+    Some(JoinOrder {
+        order: order.to_vec(),
+        cost: intermediates.iter().sum(),
+        intermediates,
+    })
+}
+
+/// The connected left-deep order of least estimated cost. `best[S]` is the
+/// cheapest way to build the prefix set `S`; extending it by `r` adds `S ∪ {r}`'s
+/// rows unless that is the full set (the view itself). Candidates are tried in
+/// ascending index order and only a strictly cheaper one replaces the incumbent,
+/// so ties resolve toward FROM order. `None` when no connected order exists or
+/// the chain exceeds `MAX_REORDER_RELATIONS`.
+pub(super) fn best_order(stats: &[RelStats], edges: &[EquiEdge]) -> Option<JoinOrder> {
+    let n = stats.len();
+    if !(2..=MAX_REORDER_RELATIONS).contains(&n) {
+        return None;
+    }
+    let full = (1usize << n) - 1;
+    // (cost, last relation added) per reachable set.
+    let mut best: Vec<Option<(f64, usize)>> = vec![None; full + 1];
+    for r in 0..n {
+        best[1 << r] = Some((0.0, r));
+    }
+    for set in 1..=full {
+        let Some((cost, _)) = best[set] else { continue };
+        for r in 0..n {
+            if set & (1 << r) != 0 || !connects(r, set, edges) {
+                continue;
+            }
+            let next = set | (1 << r);
+            let add = if next == full {
+                0.0
+            } else {
+                set_rows(next, stats, edges)
+            };
+            if best[next].is_none_or(|(c, _)| cost + add < c) {
+                best[next] = Some((cost + add, r));
+            }
+        }
+    }
+    best[full]?;
+    let mut order = Vec::with_capacity(n);
+    let mut set = full;
+    while set != 0 {
+        let (_, r) = best[set]?;
+        order.push(r);
+        set &= !(1 << r);
+    }
+    order.reverse();
+    estimate(&order, stats, edges)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn stats(rows: f64, distinct: &[f64]) -> RelStats {
+        RelStats {
+            rows,
+            distinct: distinct.to_vec(),
+        }
+    }
+
+    fn edge(a: (usize, usize), b: (usize, usize)) -> EquiEdge {
+        EquiEdge { a, b }
+    }
+
+    /// A chain of a huge fact table, a mid-size dimension and a tiny, selective
+    /// one: FROM order joins the two large relations first; the DP starts from
+    /// the selective pair instead.
+    #[test]
+    fn best_order_joins_selective_pair_first() {
+        // 0: fact(1e6 rows, fk_a over 1e3 values, fk_b over 1e5 values)
+        // 1: a(1e3 rows, pk), 2: b(10 rows, pk) — `b` filters fact to 1e-4.
+        let s = vec![stats(1e6, &[1e6, 1e3, 1e5]), stats(1e3, &[1e3]), stats(10.0, &[10.0])];
+        let edges = vec![edge((0, 1), (1, 0)), edge((0, 2), (2, 0))];
+        let from = estimate(&[0, 1, 2], &s, &edges).unwrap();
+        let best = best_order(&s, &edges).unwrap();
+        assert_eq!(from.intermediates, vec![1e6]);
+        assert_eq!(best.order, vec![0, 2, 1]);
+        assert_eq!(best.intermediates, vec![100.0]);
+        assert!(best.cost < from.cost);
+    }
+
+    /// Equal-cost orders keep FROM order; a disconnected graph has no order.
+    #[test]
+    fn best_order_ties_keep_from_order_and_rejects_cross_products() {
+        let s = vec![stats(100.0, &[100.0]), stats(100.0, &[100.0]), stats(100.0, &[100.0])];
+        let chain = vec![edge((0, 0), (1, 0)), edge((1, 0), (2, 0))];
+        assert_eq!(best_order(&s, &chain).unwrap().order, vec![0, 1, 2]);
+        assert!(estimate(&[0, 2, 1], &s, &chain).is_none(), "0 and 2 share no edge");
+        assert!(best_order(&s, &[edge((0, 0), (1, 0))]).is_none());
+    }
+}
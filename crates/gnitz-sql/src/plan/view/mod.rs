@@ -3,16 +3,20 @@
 //! `group_by`, `set_op`, and `simple` cover the remaining shapes. Only
 //! `execute_create_view` is exposed; everything else is internal to the cluster.
 
+mod delta_join;
 mod dispatch;
 mod exists;
 mod group_by;
 mod join;
+mod join_order;
 mod predicates;
 mod scalar;
 mod set_op;
 mod simple;
+mod top_k;
+mod window;
 
-pub(crate) use dispatch::{compile_query_to_circuit, execute_create_view};
+pub(crate) use dispatch::{compile_query_to_circuit, execute_create_view, explain_analyze_view, explain_create_view};
 
 use crate::error::GnitzSqlError;
 use gnitz_core::{Circuit, ColumnDef, GnitzClient, PlannedView, Schema};
@@ -45,6 +49,31 @@ pub(crate) struct ViewChain {
     /// server-side). Both modes flow through `mint_id`, so the segment/owner
     /// invariants are identical; only the id origin differs.
     next_local_id: Option<u64>,
+    /// Whether a multi-way INNER join may read its relations' row and key
+    /// distinct counts (one server-side aggregate each) and reorder itself by
+    /// estimated cost.
+    /// Worth it for a view that lives on; off for the ad-hoc transient path.
+    cost_based_joins: bool,
+    /// Planner decisions worth surfacing, one line each — what
+    /// `EXPLAIN CREATE VIEW` prints after the segment list.
+    pub notes: Vec<String>,
+    /// The view's `WITH (join_strategy = …)`, applied to every multi-way join
+    /// the chain plans.
+    pub join_strategy: JoinStrategy,
+    /// The view's `WITH (retention = …)`: the state horizon of its windowed
+    /// aggregate, taken by the final segment's reduce.
+    pub retention: Option<u64>,
+}
+
+/// How a multi-way INNER join is planned. A two-relation join is the same
+/// circuit under either.
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq)]
+pub(crate) enum JoinStrategy {
+    /// Left-deep chain of 2-way joins, each intermediate a hidden view.
+    #[default]
+    Chain,
+    /// One delta query over the base relations' traces (`delta_join`).
+    Delta,
 }
 
 impl ViewChain {
@@ -53,6 +82,10 @@ impl ViewChain {
             owner_vid: None,
             segments: Vec::new(),
             next_local_id: None,
+            cost_based_joins: true,
+            notes: Vec::new(),
+            join_strategy: JoinStrategy::Chain,
+            retention: None,
         }
     }
 
@@ -63,6 +96,20 @@ impl ViewChain {
             owner_vid: None,
             segments: Vec::new(),
             next_local_id: Some(1),
+            cost_based_joins: false,
+            notes: Vec::new(),
+            join_strategy: JoinStrategy::Chain,
+            retention: None,
+        }
+    }
+
+    /// A chain for `EXPLAIN CREATE VIEW`: planned exactly like CREATE VIEW
+    /// (cost-based join order included) but with local provisional ids, since
+    /// nothing is committed.
+    pub fn new_explain() -> Self {
+        ViewChain {
+            cost_based_joins: true,
+            ..Self::new_transient()
         }
     }
 
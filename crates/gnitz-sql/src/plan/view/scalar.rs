@@ -617,7 +617,7 @@ fn build_correlated_join(
         // Unbounded: `sub.inner_tid`'s catalog provenance is not established here
         // (the synthesized `Select` is built inside a `move` closure, with no binder
         // in reach), and a bound may only be extracted for a catalog-issued id.
-        group_by::emit_group_by_pieces(client, vid, &g_select, source, None)
+        group_by::emit_group_by_pieces(client, vid, &g_select, source, None, None)
     })?;
     binder.cache_alias(&seg_alias, (g_vid, g_schema), false)?;
 
@@ -699,7 +699,7 @@ fn build_uncorrelated_join(
         // Unbounded: `sub.inner_tid`'s catalog provenance is not established here
         // (the synthesized `Select` is built inside a `move` closure, with no binder
         // in reach), and a bound may only be extracted for a catalog-issued id.
-        group_by::emit_group_by_pieces(client, vid, &g_select, source, None)
+        group_by::emit_group_by_pieces(client, vid, &g_select, source, None, None)
     })?;
     binder.cache_alias(&seg_alias, (g_vid, g_schema), false)?;
 
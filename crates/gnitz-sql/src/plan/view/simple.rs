@@ -34,7 +34,19 @@ pub(crate) fn emit_linear_sharded(view_id: u64, rel: Rel) -> Result<EmitPieces,
 
 fn emit_linear_opts(view_id: u64, rel: Rel, shard: bool) -> Result<EmitPieces, GnitzSqlError> {
     // A lowered linear view is rooted at a Project (lowering appends one
-    // unconditionally), over an optional Filter, over one Source.
+    // unconditionally) — under an optional TopK — over an optional Filter, over
+    // one Source.
+    let (top_k, rel) = match rel {
+        Rel::TopK {
+            input,
+            group_cols,
+            order_col,
+            desc,
+            nulls_first,
+            limit,
+        } => (Some((group_cols, order_col, desc, nulls_first, limit)), *input),
+        other => (None, other),
+    };
     let Rel::Project {
         input,
         items,
@@ -117,6 +129,14 @@ fn emit_linear_opts(view_id: u64, rel: Rel, shard: bool) -> Result<EmitPieces, G
         filtered
     };
 
+    // The top-K shards by its group columns itself, and keeps the view's schema.
+    let out_node = match top_k {
+        Some((group_cols, order_col, desc, nulls_first, limit)) => {
+            cb.top_k(out_node, &group_cols, order_col, desc, nulls_first, limit)
+        }
+        None => out_node,
+    };
+
     let sink_input = if shard {
         cb.shard(out_node, &(0..k).collect::<Vec<_>>())
     } else {
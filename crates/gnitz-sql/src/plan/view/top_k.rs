@@ -0,0 +1,165 @@
+//! `CREATE VIEW … ORDER BY c [ASC|DESC] [NULLS FIRST|LAST] LIMIT n [BY g, …]`:
+//! the incrementally maintained top-K. The view holds, per group of the `BY`
+//! columns (one global group without `BY`), the first `n` rows of the body in
+//! `c`'s order, ties broken by the view's PK then payload — the direct-SELECT
+//! sink's order, with its NULL defaults. The engine's TOP_K operator keeps it
+//! current per delta instead of re-sorting the body.
+//!
+//! `LIMIT n BY g` (the ClickHouse per-group form `GenericDialect` parses) is
+//! the surface for `ROW_NUMBER() OVER (PARTITION BY g ORDER BY c) <= n`: the
+//! planner has no window functions. Only a linear (filter/map) body is
+//! supported, and every name resolves against its output columns.
+
+use crate::ast_util::{expr_usize_literal, single_relation_col_name};
+use crate::error::GnitzSqlError;
+use crate::plan::lp::Rel;
+use gnitz_core::ColumnDef;
+use sqlparser::ast::{LimitClause, OrderByKind, Query};
+
+/// A parsed top-K clause, names not yet resolved.
+pub(crate) struct TopKClause {
+    order_col: String,
+    desc: bool,
+    nulls_first: bool,
+    limit: u64,
+    by: Vec<String>,
+}
+
+fn unsupported(what: &str) -> GnitzSqlError {
+    GnitzSqlError::Unsupported(format!("{what} is not supported in CREATE VIEW ORDER BY … LIMIT"))
+}
+
+/// The view's top-K clause, or `None` when the query has neither ORDER BY nor
+/// LIMIT. A view keeps no row order, so ORDER BY without LIMIT is rejected, and
+/// LIMIT without ORDER BY would keep an arbitrary subset. OFFSET, a second key,
+/// and a positional or computed key reject too.
+pub(crate) fn parse_top_k(query: &Query) -> Result<Option<TopKClause>, GnitzSqlError> {
+    let (order_by, limit_clause) = match (&query.order_by, &query.limit_clause) {
+        (None, None) => return Ok(None),
+        (Some(ob), Some(lc)) => (ob, lc),
+        (Some(_), None) => {
+            return Err(GnitzSqlError::Unsupported(
+                "CREATE VIEW: ORDER BY requires a LIMIT (a view keeps no row order)".to_string(),
+            ))
+        }
+        (None, Some(_)) => {
+            return Err(GnitzSqlError::Unsupported(
+                "CREATE VIEW: LIMIT requires an ORDER BY".to_string(),
+            ))
+        }
+    };
+    let (limit, limit_by) = match limit_clause {
+        LimitClause::LimitOffset {
+            limit: Some(limit),
+            offset: None,
+            limit_by,
+        } => (limit, limit_by),
+        LimitClause::LimitOffset { limit: None, .. } => return Err(unsupported("OFFSET without LIMIT")),
+        _ => return Err(unsupported("OFFSET")),
+    };
+    let limit = expr_usize_literal(limit, "LIMIT")? as u64;
+    if limit == 0 {
+        return Err(GnitzSqlError::Unsupported(
+            "CREATE VIEW: LIMIT must be positive".to_string(),
+        ));
+    }
+    let by = limit_by
+        .iter()
+        .map(|e| {
+            single_relation_col_name(e)
+                .map(str::to_string)
+                .ok_or_else(|| unsupported("a LIMIT … BY expression"))
+        })
+        .collect::<Result<Vec<_>, _>>()?;
+
+    if order_by.interpolate.is_some() {
+        return Err(unsupported("ORDER BY ... INTERPOLATE"));
+    }
+    let exprs = match &order_by.kind {
+        OrderByKind::Expressions(e) => e,
+        OrderByKind::All(_) => return Err(unsupported("ORDER BY ALL")),
+    };
+    let [obe] = exprs.as_slice() else {
+        return Err(unsupported("more than one ORDER BY key"));
+    };
+    if obe.with_fill.is_some() {
+        return Err(unsupported("ORDER BY ... WITH FILL"));
+    }
+    let order_col = single_relation_col_name(&obe.expr)
+        .ok_or_else(|| unsupported("an ORDER BY key other than a column name"))?
+        .to_string();
+    let asc = obe.options.asc.unwrap_or(true);
+    Ok(Some(TopKClause {
+        order_col,
+        desc: !asc,
+        // Absolute default, as in the direct-SELECT sink: ASC → NULLS LAST,
+        // DESC → NULLS FIRST.
+        nulls_first: obe.options.nulls_first.unwrap_or(!asc),
+        limit,
+        by,
+    }))
+}
+
+fn resolve(out_cols: &[ColumnDef], name: &str, role: &str) -> Result<usize, GnitzSqlError> {
+    out_cols
+        .iter()
+        .position(|c| c.name.eq_ignore_ascii_case(name))
+        .ok_or_else(|| GnitzSqlError::Bind(format!("CREATE VIEW {role}: unknown column '{name}'")))
+}
+
+/// Wrap a lowered linear view in its top-K. The engine keys its order index
+/// `BY columns ‖ NULL rank ‖ order value ‖ view PK`, so the `BY` columns must
+/// be non-nullable PK-eligible integers, the order column a ≤8-byte integer or
+/// float, and the whole key must fit the composite-PK budget — checked here so
+/// the user gets a named error rather than the compiler's rejection.
+pub(crate) fn lower_top_k(rel: Rel, clause: TopKClause) -> Result<Rel, GnitzSqlError> {
+    let Rel::Project { out_cols, pk_arity, .. } = &rel else {
+        unreachable!("a lowered linear view is rooted at a Project");
+    };
+    let order_col = resolve(out_cols, &clause.order_col, "ORDER BY")?;
+    let order_def = &out_cols[order_col];
+    let order_tc = order_def.type_code;
+    if !(gnitz_wire::is_fixed_int(order_tc as u8) || order_tc.is_float()) {
+        return Err(GnitzSqlError::Unsupported(format!(
+            "CREATE VIEW ORDER BY … LIMIT: column '{}' of type {order_tc:?} cannot order a top-K \
+             (must be an integer of at most 8 bytes or a float)",
+            order_def.name
+        )));
+    }
+    let mut group_cols = Vec::with_capacity(clause.by.len());
+    for name in &clause.by {
+        let ci = resolve(out_cols, name, "LIMIT … BY")?;
+        let col = &out_cols[ci];
+        if col.is_nullable || !col.type_code.is_pk_eligible() {
+            return Err(GnitzSqlError::Unsupported(format!(
+                "CREATE VIEW LIMIT … BY: column '{}' must be a NOT NULL integer, U128 or UUID column",
+                col.name
+            )));
+        }
+        if !group_cols.contains(&ci) {
+            group_cols.push(ci);
+        }
+    }
+    let group_stride: usize = group_cols.iter().map(|&c| out_cols[c].type_code.wire_stride()).sum();
+    let pk_stride: usize = out_cols[..*pk_arity].iter().map(|c| c.type_code.wire_stride()).sum();
+    // group ‖ NULL-rank byte ‖ order-encoded u64 ‖ view PK.
+    let key_bytes = group_stride + 1 + 8 + pk_stride;
+    if group_cols.len() + 2 + pk_arity > gnitz_core::MAX_PK_COLUMNS
+        || group_cols.len() + 2 + out_cols.len() > gnitz_core::MAX_COLUMNS
+        || key_bytes > gnitz_core::MAX_PK_BYTES
+    {
+        return Err(GnitzSqlError::Unsupported(
+            "CREATE VIEW ORDER BY … LIMIT: the LIMIT … BY columns plus the view's primary key are too wide \
+             for the top-K order index"
+                .to_string(),
+        ));
+    }
+    Ok(Rel::TopK {
+        input: Box::new(rel),
+        group_cols,
+        order_col,
+        desc: clause.desc,
+        nulls_first: clause.nulls_first,
+        limit: clause.limit,
+    })
+}
@@ -0,0 +1,272 @@
+//! `GROUP BY TUMBLE(ts, width)` / `HOP(ts, slide, size)`: time-bucketed
+//! aggregation. The window is a computed grouping column, `window_start`,
+//! appended to each row by a compute map ahead of the reduce — one map for a
+//! tumbling window, one per overlapping window (`size / slide`) unioned for a
+//! hopping one. Everything downstream is the ordinary grouped reduce over that
+//! widened relation, so every aggregate works per window unchanged.
+//!
+//! gnitz has no TIMESTAMP/INTERVAL types: the time column is an integer
+//! (epoch seconds, millis, … — the unit is the user's) and the widths are
+//! integer literals in the same unit. A row whose time is NULL belongs to no
+//! window and is dropped.
+//!
+//! `WITH (retention = n)` bounds the state: a RETAIN operator ahead of the
+//! reduce expires every row whose window starts more than `n` below the newest
+//! window start seen, retracting it from the reduce — so a closed window's
+//! state and its view row are deleted, and compaction reclaims them. The
+//! watermark is per worker, so the RETAIN sits after the reduce's exchange
+//! (see [`Window::retain`]): every row of a group then meets one watermark.
+
+use crate::ast_util::{expr_usize_literal, fn_name_is, function_positional_args, single_relation_col_name};
+use crate::bind::find_unique_column;
+use crate::error::GnitzSqlError;
+use crate::types::is_integer_type;
+use gnitz_core::{CircuitBuilder, ColumnDef, ExprBuilder, NodeId, Schema, TypeCode};
+use sqlparser::ast::Expr;
+
+/// The name of the computed window column.
+pub(crate) const WINDOW_START: &str = "window_start";
+
+/// The most windows a HOP row may fall in: each is one compute map in the
+/// circuit.
+const MAX_HOP_OVERLAP: i64 = 64;
+
+/// A parsed `TUMBLE` / `HOP` grouping. A tumbling window is a hop whose slide
+/// equals its size.
+pub(crate) struct Window<'a> {
+    /// The GROUP BY expression, matched verbatim against the SELECT list.
+    pub expr: &'a Expr,
+    /// The time column in the source schema.
+    ts_col: usize,
+    slide: i64,
+    size: i64,
+}
+
+fn window_err(msg: impl std::fmt::Display) -> GnitzSqlError {
+    GnitzSqlError::Unsupported(format!("GROUP BY TUMBLE/HOP: {msg}"))
+}
+
+/// The window among `group_exprs`, or `None` when there is none. At most one
+/// window per GROUP BY; its time column must be an integer column other than
+/// U64 or a 128-bit type, so every window start fits the I64 `window_start`
+/// column.
+pub(crate) fn parse_window<'a>(group_exprs: &'a [Expr], source: &Schema) -> Result<Option<Window<'a>>, GnitzSqlError> {
+    let mut found: Option<Window<'a>> = None;
+    for ge in group_exprs {
+        let Expr::Function(f) = ge else { continue };
+        let name = if fn_name_is(f, "tumble") {
+            "TUMBLE"
+        } else if fn_name_is(f, "hop") {
+            "HOP"
+        } else {
+            continue;
+        };
+        if found.is_some() {
+            return Err(window_err("at most one window per GROUP BY"));
+        }
+        let args = function_positional_args(f, name)?;
+        let (ts, slide, size) = match (name, &args[..]) {
+            ("TUMBLE", [ts, width]) => {
+                let w = width_literal(width, "TUMBLE width")?;
+                (ts, w, w)
+            }
+            ("HOP", [ts, slide, size]) => (ts, width_literal(slide, "HOP slide")?, width_literal(size, "HOP size")?),
+            _ => {
+                return Err(window_err(format_args!(
+                    "{name} takes (time_column, {})",
+                    if name == "TUMBLE" { "width" } else { "slide, size" }
+                )))
+            }
+        };
+        if size % slide != 0 {
+            return Err(window_err("HOP size must be a multiple of its slide"));
+        }
+        if size / slide > MAX_HOP_OVERLAP {
+            return Err(window_err(format_args!(
+                "HOP size may span at most {MAX_HOP_OVERLAP} slides"
+            )));
+        }
+        let col_name =
+            single_relation_col_name(ts).ok_or_else(|| window_err("the time argument must be a column reference"))?;
+        let ts_col = find_unique_column(&source.columns, col_name)?
+            .ok_or_else(|| GnitzSqlError::Bind(format!("GROUP BY {name}: column '{col_name}' not found")))?;
+        let tc = source.columns[ts_col].type_code;
+        if !is_integer_type(tc) || matches!(tc, TypeCode::U64 | TypeCode::U128 | TypeCode::I128) {
+            return Err(window_err(format_args!(
+                "time column '{col_name}' must be an integer column that fits I64 (got {tc:?})"
+            )));
+        }
+        found = Some(Window {
+            expr: ge,
+            ts_col,
+            slide,
+            size,
+        });
+    }
+    if found.is_some() && find_unique_column(&source.columns, WINDOW_START)?.is_some() {
+        return Err(window_err(format_args!(
+            "the source already has a column named '{WINDOW_START}'"
+        )));
+    }
+    Ok(found)
+}
+
+/// A positive integer width literal, capped so `(ts % w) + w` cannot overflow.
+fn width_literal(e: &Expr, what: &str) -> Result<i64, GnitzSqlError> {
+    let w = expr_usize_literal(e, what)?;
+    if w == 0 || w as u64 > (i64::MAX / 2) as u64 {
+        return Err(window_err(format_args!("{what} must be positive and at most 2^62")));
+    }
+    Ok(w as i64)
+}
+
+impl Window<'_> {
+    /// The relation the grouped reduce sees: `source`'s PK columns (in PK
+    /// order), its other columns, then `window_start` — the compute map's output
+    /// layout, where the PK region leads and the payload follows.
+    pub(crate) fn windowed_schema(&self, source: &Schema) -> Schema {
+        let mut columns: Vec<ColumnDef> = source.pk_cols.iter().map(|&c| source.columns[c].clone()).collect();
+        columns.extend(
+            (0..source.columns.len())
+                .filter(|c| !source.is_pk_col(*c))
+                .map(|c| source.columns[c].clone()),
+        );
+        columns.push(ColumnDef::new(WINDOW_START, TypeCode::I64, false));
+        Schema {
+            columns,
+            pk_cols: (0..source.pk_cols.len()).collect(),
+        }
+    }
+
+    /// The `window_start` column's index in [`windowed_schema`](Self::windowed_schema).
+    pub(crate) fn start_col(&self, source: &Schema) -> usize {
+        source.columns.len()
+    }
+
+    /// Emit the windowing pipeline over `input` (rows of `source`): drop
+    /// NULL-time rows and append each row's window start(s). Returns the
+    /// windowed relation the reduce groups.
+    pub(crate) fn emit(&self, cb: &mut CircuitBuilder, input: NodeId, source: &Schema) -> NodeId {
+        let mut node = input;
+        if source.columns[self.ts_col].is_nullable {
+            let mut eb = ExprBuilder::new();
+            let keep = eb.is_not_null(self.ts_col);
+            node = cb.filter(node, Some(eb.build(keep)));
+        }
+
+        let payload: Vec<usize> = (0..source.columns.len()).filter(|c| !source.is_pk_col(*c)).collect();
+        let mut out_cols: Vec<(TypeCode, bool)> = payload
+            .iter()
+            .map(|&c| (source.columns[c].type_code, source.columns[c].is_nullable))
+            .collect();
+        out_cols.push((TypeCode::I64, false));
+
+        // One branch per window a row falls in: the j-th starts `j` slides before
+        // the row's latest window. The branches differ in `window_start`, so their
+        // union holds each (row, window) pair exactly once.
+        let mut windowed: Option<NodeId> = None;
+        for j in 0..self.size / self.slide {
+            let mut eb = ExprBuilder::new();
+            for (i, &c) in payload.iter().enumerate() {
+                eb.copy_col(source.columns[c].type_code as u32, c as u32, i as u32);
+            }
+            // Floor to the slide grid; the double modulo keeps it a floor for a
+            // negative time.
+            let ts = eb.load_col_int(self.ts_col);
+            let w = eb.load_const(self.slide);
+            let r = eb.modulo(ts, w);
+            let r = eb.add(r, w);
+            let r = eb.modulo(r, w);
+            let mut start = eb.sub(ts, r);
+            if j > 0 {
+                let back = eb.load_const(j * self.slide);
+                start = eb.sub(start, back);
+            }
+            eb.emit_col(start, payload.len() as u32);
+            let branch = cb.map_compute(node, eb.build(0), &out_cols);
+            windowed = Some(match windowed {
+                Some(acc) => cb.union(acc, branch),
+                None => branch,
+            });
+        }
+        windowed.expect("a window spans at least one slide")
+    }
+
+    /// Expire closed windows of `windowed` (the [`emit`](Self::emit) output)
+    /// `horizon` below the newest window start. `windowed` must already be
+    /// partitioned by the reduce's group columns: the RETAIN watermark is kept
+    /// per worker, and ahead of the exchange one group's rows would be judged
+    /// against whichever worker's watermark their source partition reached.
+    pub(crate) fn retain(&self, cb: &mut CircuitBuilder, windowed: NodeId, source: &Schema, horizon: u64) -> NodeId {
+        cb.retain(windowed, self.start_col(source), horizon)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use sqlparser::dialect::GenericDialect;
+    use sqlparser::parser::Parser;
+
+    fn schema() -> Schema {
+        Schema {
+            columns: vec![
+                ColumnDef::new("v", TypeCode::I64, true),
+                ColumnDef::new("id", TypeCode::U64, false),
+                ColumnDef::new("ts", TypeCode::I64, true),
+                ColumnDef::new("big", TypeCode::U64, false),
+            ],
+            pk_cols: vec![1],
+        }
+    }
+
+    fn group_exprs(sql: &str) -> Vec<Expr> {
+        let stmt = Parser::parse_sql(&GenericDialect {}, &format!("SELECT 1 FROM t GROUP BY {sql}")).unwrap();
+        let sqlparser::ast::Statement::Query(q) = &stmt[0] else {
+            unreachable!()
+        };
+        let sqlparser::ast::SetExpr::Select(s) = q.body.as_ref() else {
+            unreachable!()
+        };
+        match &s.group_by {
+            sqlparser::ast::GroupByExpr::Expressions(e, _) => e.clone(),
+            _ => unreachable!(),
+        }
+    }
+
+    #[test]
+    fn parse_window_shapes_and_layout() {
+        let s = schema();
+        let exprs = group_exprs("v, TUMBLE(ts, 60)");
+        let w = parse_window(&exprs, &s).unwrap().unwrap();
+        assert_eq!((w.ts_col, w.slide, w.size), (2, 60, 60));
+        // PK first, then the payload in order, then the window column.
+        let ws = w.windowed_schema(&s);
+        let names: Vec<&str> = ws.columns.iter().map(|c| c.name.as_str()).collect();
+        assert_eq!(names, ["id", "v", "ts", "big", WINDOW_START]);
+        assert_eq!(ws.pk_cols, vec![0]);
+        assert_eq!(w.start_col(&s), 4);
+
+        let exprs = group_exprs("hop(ts, 10, 30)");
+        let w = parse_window(&exprs, &s).unwrap().unwrap();
+        assert_eq!((w.slide, w.size), (10, 30));
+        assert!(parse_window(&group_exprs("v"), &s).unwrap().is_none());
+    }
+
+    #[test]
+    fn parse_window_rejects_bad_shapes() {
+        let s = schema();
+        for bad in [
+            "TUMBLE(ts, 0)",
+            "TUMBLE(ts, -5)",
+            "TUMBLE(ts)",
+            "TUMBLE(ts + 1, 60)",
+            "TUMBLE(big, 60)",
+            "HOP(ts, 7, 30)",
+            "HOP(ts, 1, 65)",
+            "TUMBLE(ts, 60), HOP(ts, 10, 30)",
+        ] {
+            assert!(parse_window(&group_exprs(bad), &s).is_err(), "{bad} should be rejected");
+        }
+    }
+}
@@ -0,0 +1,89 @@
+#![cfg(feature = "integration")]
+
+//! `CREATE TABLE ... WITH (append_only = true)`: the server rejects deletes,
+//! updates and PK overwrites, and views over the table take the insert-only
+//! MIN/MAX and DISTINCT paths.
+
+use gnitz_test_harness::ServerHandle;
+
+mod common;
+use common::*;
+
+const EVENTS: &str =
+    "CREATE TABLE e (id BIGINT NOT NULL PRIMARY KEY, g BIGINT NOT NULL, v BIGINT) WITH (append_only = true)";
+
+#[test]
+fn test_append_only_minmax_and_distinct_views() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, EVENTS);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW m AS SELECT g, MIN(v) AS lo, MAX(v) AS hi, COUNT(*) AS n FROM e GROUP BY g",
+    );
+    exec(&mut client, &sn, "CREATE VIEW d AS SELECT DISTINCT g FROM e");
+    let rows = |c: &mut gnitz_core::GnitzClient| payload_rows(c, &sn, "m", &["g", "lo", "hi", "n"]);
+
+    exec(&mut client, &sn, "INSERT INTO e VALUES (1, 1, 5), (2, 1, 8), (3, 2, 4)");
+    assert_eq!(rows(&mut client), vec![vec![1, 5, 8, 2], vec![2, 4, 4, 1]]);
+
+    // Each later tick folds into the stored extremes.
+    exec(&mut client, &sn, "INSERT INTO e VALUES (4, 1, 3), (5, 2, 9)");
+    assert_eq!(rows(&mut client), vec![vec![1, 3, 8, 3], vec![2, 4, 9, 2]]);
+    exec(&mut client, &sn, "INSERT INTO e VALUES (6, 1, 6), (7, 3, 0)");
+    assert_eq!(
+        rows(&mut client),
+        vec![vec![1, 3, 8, 4], vec![2, 4, 9, 2], vec![3, 0, 0, 1]]
+    );
+    assert_eq!(
+        payload_rows(&mut client, &sn, "d", &["g"]),
+        vec![vec![1], vec![2], vec![3]]
+    );
+}
+
+#[test]
+fn test_append_only_rejects_retractions() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, EVENTS);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW c AS SELECT g, COUNT(*) AS n FROM e GROUP BY g",
+    );
+    exec(&mut client, &sn, "INSERT INTO e VALUES (1, 1, 5), (2, 1, 8)");
+
+    for sql in [
+        "DELETE FROM e WHERE id = 1",
+        "UPDATE e SET v = 0 WHERE id = 2",
+        "INSERT INTO e VALUES (1, 1, 7)",
+        "INSERT INTO e VALUES (2, 2, 7) ON CONFLICT (id) DO UPDATE SET v = 7",
+    ] {
+        assert!(try_exec(&mut client, &sn, sql).is_err(), "{sql} should be rejected");
+    }
+    // DO NOTHING drops the conflicting row client-side; the rest still lands.
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO e VALUES (1, 1, 7), (3, 2, 1) ON CONFLICT (id) DO NOTHING",
+    );
+    assert_eq!(
+        payload_rows(&mut client, &sn, "c", &["g", "n"]),
+        vec![vec![1, 2], vec![2, 1]]
+    );
+
+    // The option takes a boolean.
+    assert!(try_exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE x (id BIGINT NOT NULL PRIMARY KEY) WITH (append_only = 3)"
+    )
+    .is_err());
+}
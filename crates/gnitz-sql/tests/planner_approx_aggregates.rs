@@ -0,0 +1,134 @@
+#![cfg(feature = "integration")]
+
+//! APPROX_COUNT_DISTINCT / APPROX_PERCENTILE: sketch aggregates that stay
+//! correct under deletes (the retracted rows leave the estimate).
+
+use gnitz_sql::GnitzSqlError;
+use gnitz_test_harness::ServerHandle;
+
+mod common;
+use common::*;
+
+/// `(g, users, p50)` per group, sorted by `g`.
+fn sketch_rows(client: &mut gnitz_core::GnitzClient, sn: &str) -> Vec<(i64, i64, f64)> {
+    payload_rows(client, sn, "v", &["g", "users", "p50"])
+        .into_iter()
+        .map(|r| (r[0], r[1], f64::from_bits(r[2] as u64)))
+        .collect()
+}
+
+fn assert_close(got: f64, want: f64) {
+    assert!((got - want).abs() <= want.abs() * 0.011, "estimate {got}, want ≈{want}");
+}
+
+#[test]
+fn test_approx_aggregates_track_inserts_and_deletes() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE e (id BIGINT NOT NULL PRIMARY KEY, g BIGINT NOT NULL, user_id BIGINT NOT NULL, \
+         latency BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW v AS SELECT g, APPROX_COUNT_DISTINCT(user_id) AS users, \
+         APPROX_PERCENTILE(latency, 0.5) AS p50 FROM e GROUP BY g",
+    );
+    // Group 1: 60 events from 20 users, latencies 1..=60. Group 2: one event.
+    let values: Vec<String> = (1..=60).map(|i| format!("({i}, 1, {}, {i})", i % 20)).collect();
+    exec(
+        &mut client,
+        &sn,
+        &format!("INSERT INTO e VALUES {}, (100, 2, 7, 500)", values.join(", ")),
+    );
+    let rows = sketch_rows(&mut client, &sn);
+    assert_eq!(rows.len(), 2);
+    assert!((rows[0].1 - 20).abs() <= 2, "distinct users {}", rows[0].1);
+    assert_close(rows[0].2, 30.0);
+    assert_eq!(rows[1].1, 1);
+    assert_close(rows[1].2, 500.0);
+
+    // Dropping the slow half moves the median; every user still has an event.
+    exec(&mut client, &sn, "DELETE FROM e WHERE latency > 30 AND g = 1");
+    let rows = sketch_rows(&mut client, &sn);
+    assert!((rows[0].1 - 20).abs() <= 2, "distinct users {}", rows[0].1);
+    assert_close(rows[0].2, 15.0);
+
+    // Dropping half the users halves the distinct count.
+    exec(&mut client, &sn, "DELETE FROM e WHERE user_id >= 10 AND g = 1");
+    let rows = sketch_rows(&mut client, &sn);
+    assert!((rows[0].1 - 10).abs() <= 1, "distinct users {}", rows[0].1);
+
+    // An emptied group disappears rather than rendering a stale estimate.
+    exec(&mut client, &sn, "DELETE FROM e WHERE g = 2");
+    assert_eq!(sketch_rows(&mut client, &sn).len(), 1);
+}
+
+#[test]
+fn test_approx_count_distinct_global_and_strings() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE w (id BIGINT NOT NULL PRIMARY KEY, word VARCHAR NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW d AS SELECT APPROX_COUNT_DISTINCT(word) AS n FROM w",
+    );
+    let distinct = |c: &mut gnitz_core::GnitzClient| payload_rows(c, &sn, "d", &["n"]);
+    assert_eq!(distinct(&mut client), vec![vec![0]]);
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO w VALUES (1, 'a fairly long word'), (2, 'a fairly long word'), (3, 'b'), (4, 'c')",
+    );
+    assert_eq!(distinct(&mut client), vec![vec![3]]);
+    exec(&mut client, &sn, "DELETE FROM w WHERE id <= 2");
+    assert_eq!(distinct(&mut client), vec![vec![2]]);
+}
+
+#[test]
+fn test_approx_percentile_rejections() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE r (id BIGINT NOT NULL PRIMARY KEY, g BIGINT NOT NULL, name VARCHAR, v BIGINT)",
+    );
+    for (sql, want) in [
+        (
+            "CREATE VIEW x1 AS SELECT g, APPROX_PERCENTILE(v, 1.5) AS p FROM r GROUP BY g",
+            "between 0 and 1",
+        ),
+        (
+            "CREATE VIEW x2 AS SELECT g, APPROX_PERCENTILE(v) AS p FROM r GROUP BY g",
+            "quantile literal",
+        ),
+        (
+            "CREATE VIEW x3 AS SELECT g, APPROX_PERCENTILE(name, 0.5) AS p FROM r GROUP BY g",
+            "not supported",
+        ),
+    ] {
+        let msg = match try_exec(&mut client, &sn, sql).unwrap_err() {
+            GnitzSqlError::Unsupported(m) | GnitzSqlError::Bind(m) => m,
+            other => format!("{other:?}"),
+        };
+        assert!(msg.contains(want), "{sql}: expected {want:?}, got: {msg}");
+    }
+}
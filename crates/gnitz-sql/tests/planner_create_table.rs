@@ -542,7 +542,18 @@ fn test_create_view_with_nullable_first_column_rejected() {
         ColumnDef::new("v", TypeCode::I64, true),
     ];
     let src_tid = client
-        .create_table(&sn, "src", &cols, &[0u32], true, false, 0, &[])
+        .create_table(
+            &sn,
+            "src",
+            &cols,
+            &[0u32],
+            true,
+            false,
+            false,
+            0,
+            Default::default(),
+            &[],
+        )
         .unwrap();
 
     // Manually construct a SCAN→SINK circuit and try to register a view whose
@@ -0,0 +1,59 @@
+#![cfg(feature = "integration")]
+
+//! `EXPLAIN ANALYZE VIEW`: the view's operator tree with the per-operator
+//! counters the workers have kept while the profiler ran.
+
+use gnitz_core::{ColData, ProfileAction};
+use gnitz_sql::SqlResult;
+use gnitz_test_harness::ServerHandle;
+
+mod common;
+use common::*;
+
+fn plan_lines(client: &mut gnitz_core::GnitzClient, sn: &str, sql: &str) -> Vec<String> {
+    match try_exec(client, sn, sql).unwrap().pop().unwrap() {
+        SqlResult::Rows { batch, .. } => match &batch.columns[1] {
+            ColData::Strings(v) => v.iter().map(|s| s.clone().unwrap()).collect(),
+            c => panic!("plan column is not a string column: {c:?}"),
+        },
+        r => panic!("EXPLAIN ANALYZE VIEW returns rows, got {r:?}"),
+    }
+}
+
+#[test]
+fn test_explain_analyze_view_counts_rows() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE t (id BIGINT NOT NULL PRIMARY KEY, v BIGINT NOT NULL)",
+    );
+    exec(&mut client, &sn, "CREATE VIEW w AS SELECT id, v FROM t WHERE v > 0");
+    // Ticks run while the profiler is stopped are not counted.
+    exec(&mut client, &sn, "INSERT INTO t VALUES (9, 9)");
+    exec(&mut client, &sn, "DELETE FROM t WHERE id = 9");
+    assert!(payload_rows(&mut client, &sn, "w", &["v"]).is_empty());
+    client.profile(ProfileAction::Start).unwrap();
+    exec(&mut client, &sn, "INSERT INTO t VALUES (1, 1), (2, 2), (3, -1)");
+    // A read syncs the view, so the tick that fed it has run.
+    assert_eq!(payload_rows(&mut client, &sn, "w", &["v"]), vec![vec![1], vec![2]]);
+    client.profile(ProfileAction::Stop).unwrap();
+
+    let plan = plan_lines(&mut client, &sn, "EXPLAIN ANALYZE VIEW w");
+    assert!(plan[0].starts_with("w: "), "{plan:?}");
+    assert!(plan[1].starts_with("profiler is off"), "{plan:?}");
+    let filter = plan
+        .iter()
+        .find(|l| l.trim_start().starts_with("Filter"))
+        .unwrap_or_else(|| panic!("no Filter line in {plan:?}"));
+    assert!(filter.contains("rows in=3 out=2"), "{filter}");
+
+    // Schema-qualified, and a base table is refused.
+    let qualified = plan_lines(&mut client, &sn, &format!("EXPLAIN ANALYZE VIEW {sn}.w"));
+    assert_eq!(qualified.len(), plan.len());
+    assert!(try_exec(&mut client, &sn, "EXPLAIN ANALYZE VIEW t").is_err());
+}
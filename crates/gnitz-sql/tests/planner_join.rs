@@ -1,5 +1,6 @@
 #![cfg(feature = "integration")]
 
+use gnitz_core::GnitzClient;
 use gnitz_sql::{GnitzSqlError, SqlPlanner};
 use gnitz_test_harness::ServerHandle;
 use gnitz_wire::{
@@ -436,6 +437,66 @@ fn test_join_composite_two_pair_inner_data() {
     );
 }
 
+/// Two identical equijoin views share one arrangement per side. Dropping one
+/// and restarting (which invalidates every compiled plan) must leave the other
+/// re-attached to the full history, not to an empty private trace.
+#[test]
+fn test_join_shared_arrangement_survives_drop_and_recompile() {
+    let mut srv = match ServerHandle::start_n(2) {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE a (id BIGINT NOT NULL PRIMARY KEY, k BIGINT NOT NULL, av BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE b (id BIGINT NOT NULL PRIMARY KEY, k BIGINT NOT NULL, bv BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO a (id, k, av) VALUES (1, 10, 1), (2, 20, 2)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO b (id, k, bv) VALUES (1, 10, 11), (2, 20, 22)",
+    );
+    let join = "SELECT a.id, a.av, b.bv FROM a JOIN b ON a.k = b.k";
+    exec(&mut client, &sn, &format!("CREATE VIEW v1 AS {join}"));
+    exec(&mut client, &sn, &format!("CREATE VIEW v2 AS {join}"));
+    exec(&mut client, &sn, "INSERT INTO b (id, k, bv) VALUES (3, 10, 33)");
+    let expected = vec![vec![1, 1, 11], vec![1, 1, 33], vec![2, 2, 22]];
+    assert_eq!(payload_rows(&mut client, &sn, "v2", &["id", "av", "bv"]), expected);
+
+    exec(&mut client, &sn, "DROP VIEW v1");
+    exec(&mut client, &sn, "INSERT INTO a (id, k, av) VALUES (3, 20, 3)");
+    srv.restart();
+    let mut client = GnitzClient::connect(&srv.sock_path).unwrap();
+    // Each side's delta now joins against the other side's pre-restart rows.
+    exec(&mut client, &sn, "INSERT INTO a (id, k, av) VALUES (4, 10, 4)");
+    exec(&mut client, &sn, "INSERT INTO b (id, k, bv) VALUES (4, 20, 44)");
+    assert_eq!(
+        payload_rows(&mut client, &sn, "v2", &["id", "av", "bv"]),
+        vec![
+            vec![1, 1, 11],
+            vec![1, 1, 33],
+            vec![2, 2, 22],
+            vec![2, 2, 44],
+            vec![3, 3, 22],
+            vec![3, 3, 44],
+            vec![4, 4, 11],
+            vec![4, 4, 33],
+        ],
+        "the surviving view's join sees both sides' full history"
+    );
+}
+
 // ── Equijoin views over compound / wide-PK source tables ─────────────────────
 //
 // The output PK of an equijoin view is never the source PK — it is the synthetic
@@ -2288,3 +2349,262 @@ fn test_pure_range_full_wide_gets_purerange_message() {
         e => panic!("expected Unsupported, got {e:?}"),
     }
 }
+
+/// Cost-based join order. FROM order joins the fact table to the unselective
+/// dimension `a` first (a 100-row intermediate); the statistics show `b` keeps
+/// 2 of `f.b_id`'s 50 values, so the chain joins `b` first (a 4-row
+/// intermediate). `EXPLAIN CREATE VIEW` reports the decision without creating
+/// anything, and the reordered view holds exactly the FROM-order result.
+#[test]
+fn test_explain_create_view_reorders_join_chain() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    let mut p = SqlPlanner::new(&mut client, &sn);
+    p.execute("CREATE TABLE jo_f (id BIGINT NOT NULL PRIMARY KEY, a_id BIGINT NOT NULL, b_id BIGINT NOT NULL)")
+        .unwrap();
+    p.execute("CREATE TABLE jo_a (id BIGINT NOT NULL PRIMARY KEY, x BIGINT NOT NULL)")
+        .unwrap();
+    p.execute("CREATE TABLE jo_b (id BIGINT NOT NULL PRIMARY KEY, y BIGINT NOT NULL)")
+        .unwrap();
+    let f_rows: Vec<String> = (1..=100).map(|i| format!("({i}, {i}, {})", i % 50)).collect();
+    p.execute(&format!("INSERT INTO jo_f VALUES {}", f_rows.join(", ")))
+        .unwrap();
+    let a_rows: Vec<String> = (1..=100).map(|i| format!("({i}, {i})")).collect();
+    p.execute(&format!("INSERT INTO jo_a VALUES {}", a_rows.join(", ")))
+        .unwrap();
+    p.execute("INSERT INTO jo_b VALUES (0, 10), (1, 11)").unwrap();
+
+    let view = "CREATE VIEW jo_v AS SELECT jo_f.id AS fid, jo_a.x AS ax, jo_b.y AS bval \
+                FROM jo_f JOIN jo_a ON jo_f.a_id = jo_a.id JOIN jo_b ON jo_f.b_id = jo_b.id";
+    let plan: Vec<String> = match p.execute(&format!("EXPLAIN {view}")).unwrap().pop().unwrap() {
+        gnitz_sql::SqlResult::Rows { batch, .. } => match &batch.columns[1] {
+            gnitz_core::ColData::Strings(v) => v.iter().map(|s| s.clone().unwrap()).collect(),
+            c => panic!("plan column is not a string column: {c:?}"),
+        },
+        _ => panic!("EXPLAIN CREATE VIEW returns rows"),
+    };
+    let note = plan
+        .iter()
+        .find(|l| l.starts_with("join order:"))
+        .unwrap_or_else(|| panic!("no join-order note in {plan:?}"));
+    assert!(
+        note.starts_with("join order: jo_f ⋈ jo_b ⋈ jo_a (est. intermediate rows [4])"),
+        "{note}"
+    );
+    assert!(
+        note.contains("reordered from jo_f ⋈ jo_a ⋈ jo_b (est. intermediate rows [100])"),
+        "{note}"
+    );
+    assert!(
+        client.resolve_table_or_view_id(&sn, "jo_v").is_err(),
+        "EXPLAIN creates nothing"
+    );
+
+    let mut p = SqlPlanner::new(&mut client, &sn);
+    p.execute(view).unwrap();
+    match p.execute("SELECT fid, ax, bval FROM jo_v").unwrap().pop().unwrap() {
+        gnitz_sql::SqlResult::Rows { batch, .. } => {
+            let n: i64 = (0..batch.len()).map(|r| batch.weights[r]).sum();
+            assert_eq!(n, 4, "f rows 1, 50, 51, 100 match a b row");
+        }
+        _ => panic!("SELECT returns rows"),
+    }
+}
+
+/// A column of a compound PK repeats, so its distinct count is measured rather
+/// than taken as the row count: `cp.k` holds 2 values over 40 rows, making
+/// `cp ⋈ d` a 40-row intermediate (not the 2 rows a "PK column is unique"
+/// shortcut would estimate).
+#[test]
+fn test_explain_join_order_measures_compound_pk_column() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    let mut p = SqlPlanner::new(&mut client, &sn);
+    p.execute("CREATE TABLE cp (k BIGINT NOT NULL, seq BIGINT NOT NULL, v BIGINT NOT NULL, PRIMARY KEY (k, seq))")
+        .unwrap();
+    p.execute("CREATE TABLE d (id BIGINT NOT NULL PRIMARY KEY, x BIGINT NOT NULL)")
+        .unwrap();
+    p.execute("CREATE TABLE e (id BIGINT NOT NULL PRIMARY KEY, y BIGINT NOT NULL)")
+        .unwrap();
+    let cp_rows: Vec<String> = (1..=40)
+        .map(|i| format!("({}, {}, {i})", i % 2 + 1, (i + 1) / 2))
+        .collect();
+    p.execute(&format!("INSERT INTO cp VALUES {}", cp_rows.join(", ")))
+        .unwrap();
+    p.execute("INSERT INTO d VALUES (1, 10), (2, 20)").unwrap();
+    let e_rows: Vec<String> = (1..=20).map(|i| format!("({i}, {i})")).collect();
+    p.execute(&format!("INSERT INTO e VALUES {}", e_rows.join(", ")))
+        .unwrap();
+
+    let plan: Vec<String> = match p
+        .execute(
+            "EXPLAIN CREATE VIEW cp_v AS SELECT cp.v, d.x, e.y FROM cp JOIN d ON cp.k = d.id JOIN e ON e.id = cp.seq",
+        )
+        .unwrap()
+        .pop()
+        .unwrap()
+    {
+        gnitz_sql::SqlResult::Rows { batch, .. } => match &batch.columns[1] {
+            gnitz_core::ColData::Strings(v) => v.iter().map(|s| s.clone().unwrap()).collect(),
+            c => panic!("plan column is not a string column: {c:?}"),
+        },
+        _ => panic!("EXPLAIN CREATE VIEW returns rows"),
+    };
+    let note = plan
+        .iter()
+        .find(|l| l.starts_with("join order:"))
+        .unwrap_or_else(|| panic!("no join-order note in {plan:?}"));
+    assert!(
+        note.starts_with("join order: cp ⋈ d ⋈ e (est. intermediate rows [40])"),
+        "{note}"
+    );
+}
+
+/// `WITH (join_strategy = 'delta')` compiles a three-way star on one key into a
+/// single circuit over the base traces — no hidden intermediate, one trace and
+/// two probes per relation — and maintains it under inserts and deletes on
+/// every input.
+#[test]
+fn test_delta_join_strategy_three_way_star() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE dj_a (pk BIGINT NOT NULL PRIMARY KEY, k BIGINT NOT NULL, av BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE dj_b (pk BIGINT NOT NULL PRIMARY KEY, k BIGINT NOT NULL, bv BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE dj_d (pk BIGINT NOT NULL PRIMARY KEY, k BIGINT NOT NULL, dv BIGINT NOT NULL)",
+    );
+    exec(&mut client, &sn, "INSERT INTO dj_a VALUES (1, 1, 10), (2, 2, 20)");
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO dj_b VALUES (1, 1, 100), (2, 2, 200), (3, 3, 300)",
+    );
+
+    let view = "CREATE VIEW dj_v WITH (join_strategy = 'delta') AS \
+                SELECT dj_a.k AS k, dj_a.av AS av, dj_b.bv AS bv, dj_d.dv AS dv \
+                FROM dj_a JOIN dj_b ON dj_a.k = dj_b.k JOIN dj_d ON dj_b.k = dj_d.k";
+    let plan: Vec<String> = match try_exec(&mut client, &sn, &format!("EXPLAIN {view}"))
+        .unwrap()
+        .pop()
+        .unwrap()
+    {
+        gnitz_sql::SqlResult::Rows { batch, .. } => match &batch.columns[1] {
+            gnitz_core::ColData::Strings(v) => v.iter().map(|s| s.clone().unwrap()).collect(),
+            c => panic!("plan column is not a string column: {c:?}"),
+        },
+        _ => panic!("EXPLAIN CREATE VIEW returns rows"),
+    };
+    assert_eq!(plan.iter().filter(|l| l.contains("operators")).count(), 1, "{plan:?}");
+    assert!(
+        plan.iter()
+            .any(|l| l.starts_with("join strategy: delta — dj_a ⋈ dj_b ⋈ dj_d")),
+        "{plan:?}"
+    );
+
+    exec(&mut client, &sn, view);
+    let vid = client.resolve_table_or_view_id(&sn, "dj_v").unwrap().0;
+    let nodes = scan_circuit_nodes(&mut client);
+    assert_eq!(opcode_node_count(nodes.as_ref(), vid, OPCODE_INTEGRATE_TRACE), 3);
+    assert_eq!(opcode_node_count(nodes.as_ref(), vid, OPCODE_JOIN_DELTA_TRACE), 6);
+
+    let cols = ["k", "av", "bv", "dv"];
+    assert!(
+        payload_rows(&mut client, &sn, "dj_v", &cols).is_empty(),
+        "dj_d is empty"
+    );
+    exec(&mut client, &sn, "INSERT INTO dj_d VALUES (1, 1, 1000), (2, 3, 3000)");
+    assert_eq!(
+        payload_rows(&mut client, &sn, "dj_v", &cols),
+        vec![vec![1, 10, 100, 1000]]
+    );
+    exec(&mut client, &sn, "INSERT INTO dj_a VALUES (3, 3, 30), (4, 1, 40)");
+    exec(&mut client, &sn, "INSERT INTO dj_b VALUES (4, 1, 101)");
+    assert_eq!(
+        payload_rows(&mut client, &sn, "dj_v", &cols),
+        vec![
+            vec![1, 10, 100, 1000],
+            vec![1, 10, 101, 1000],
+            vec![1, 40, 100, 1000],
+            vec![1, 40, 101, 1000],
+            vec![3, 30, 300, 3000],
+        ]
+    );
+    exec(&mut client, &sn, "DELETE FROM dj_b WHERE pk = 1");
+    exec(&mut client, &sn, "DELETE FROM dj_d WHERE pk = 2");
+    assert_eq!(
+        payload_rows(&mut client, &sn, "dj_v", &cols),
+        vec![vec![1, 10, 101, 1000], vec![1, 40, 101, 1000]]
+    );
+}
+
+/// The delta strategy needs one key shared by every relation; a chain that
+/// re-keys between steps, or an unknown strategy, is rejected at plan time.
+#[test]
+fn test_delta_join_strategy_rejects_unshared_key() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE dk_f (id BIGINT NOT NULL PRIMARY KEY, a_id BIGINT NOT NULL, b_id BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE dk_a (id BIGINT NOT NULL PRIMARY KEY, x BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE dk_b (id BIGINT NOT NULL PRIMARY KEY, y BIGINT NOT NULL)",
+    );
+    let body = "SELECT dk_f.id AS fid, dk_a.x AS ax, dk_b.y AS by_y \
+                FROM dk_f JOIN dk_a ON dk_f.a_id = dk_a.id JOIN dk_b ON dk_f.b_id = dk_b.id";
+    let err = try_exec(
+        &mut client,
+        &sn,
+        &format!("CREATE VIEW dk_v WITH (join_strategy = 'delta') AS {body}"),
+    )
+    .unwrap_err();
+    assert!(
+        matches!(&err, GnitzSqlError::Unsupported(m) if m.contains("same key")),
+        "{err:?}"
+    );
+    let err = try_exec(
+        &mut client,
+        &sn,
+        &format!("CREATE VIEW dk_v WITH (join_strategy = 'wcoj') AS {body}"),
+    )
+    .unwrap_err();
+    assert!(
+        matches!(&err, GnitzSqlError::Plan(m) if m.contains("join_strategy")),
+        "{err:?}"
+    );
+    exec(
+        &mut client,
+        &sn,
+        &format!("CREATE VIEW dk_v WITH (join_strategy = 'chain') AS {body}"),
+    );
+}
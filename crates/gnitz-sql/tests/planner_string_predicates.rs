@@ -0,0 +1,113 @@
+#![cfg(feature = "integration")]
+
+//! `LIKE` / `NOT LIKE` and string `IN (...)` filters in views: each pattern
+//! class (exact, prefix, suffix, substring, `_`/interior `%`), long
+//! out-of-line strings, and NULL.
+
+use gnitz_test_harness::ServerHandle;
+
+mod common;
+use common::*;
+
+const NAMES: &str = "CREATE TABLE n (id BIGINT NOT NULL PRIMARY KEY, name VARCHAR, b BIGINT)";
+
+fn ids(client: &mut gnitz_core::GnitzClient, sn: &str, view: &str) -> Vec<i64> {
+    payload_rows(client, sn, view, &["id"])
+        .into_iter()
+        .map(|r| r[0])
+        .collect()
+}
+
+#[test]
+fn test_like_pattern_classes() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, NAMES);
+    let views = [
+        ("exact", "name LIKE 'apple'"),
+        ("pre", "name LIKE 'app%'"),
+        ("suf", "name LIKE '%le'"),
+        ("sub", "name LIKE '%ppl%'"),
+        ("gen", "name LIKE 'a_p%e'"),
+        ("notpre", "name NOT LIKE 'app%'"),
+        ("long", "name LIKE '%quick brown%'"),
+    ];
+    for (v, pred) in views {
+        exec(
+            &mut client,
+            &sn,
+            &format!("CREATE VIEW {v} AS SELECT id FROM n WHERE {pred}"),
+        );
+    }
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO n VALUES (1, 'apple', 0), (2, 'application', 0), (3, 'maple', 0), \
+         (4, 'grape', 0), (5, NULL, 0), (6, 'the quick brown fox jumps', 0), \
+         (7, '50% off', 0), (8, '500 units', 0), (9, 'ample', 0)",
+    );
+    assert_eq!(ids(&mut client, &sn, "exact"), vec![1]);
+    assert_eq!(ids(&mut client, &sn, "pre"), vec![1, 2]);
+    assert_eq!(ids(&mut client, &sn, "suf"), vec![1, 3, 9]);
+    assert_eq!(ids(&mut client, &sn, "sub"), vec![1, 2]);
+    assert_eq!(ids(&mut client, &sn, "gen"), vec![1, 9]);
+    // NOT LIKE over NULL is NULL: row 5 stays out.
+    assert_eq!(ids(&mut client, &sn, "notpre"), vec![3, 4, 6, 7, 8, 9]);
+    assert_eq!(ids(&mut client, &sn, "long"), vec![6]);
+
+    exec(&mut client, &sn, "UPDATE n SET name = 'apply' WHERE id = 4");
+    exec(&mut client, &sn, "DELETE FROM n WHERE id = 1");
+    assert_eq!(ids(&mut client, &sn, "pre"), vec![2, 4]);
+    assert_eq!(ids(&mut client, &sn, "suf"), vec![3, 9]);
+}
+
+#[test]
+fn test_string_in_list() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, NAMES);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW i AS SELECT id FROM n \
+         WHERE name IN ('red', 'green', 'a considerably longer member string')",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW ni AS SELECT id FROM n WHERE name NOT IN ('red', 'green')",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO n VALUES (1, 'red', 0), (2, 'blue', 0), (3, 'green', 0), (4, NULL, 0), \
+         (5, 'a considerably longer member string', 0), (6, 'a considerably longer member strinG', 0), \
+         (7, 'redd', 0), (8, '', 0)",
+    );
+    assert_eq!(ids(&mut client, &sn, "i"), vec![1, 3, 5]);
+    assert_eq!(ids(&mut client, &sn, "ni"), vec![2, 5, 6, 7, 8]);
+}
+
+#[test]
+fn test_like_rejections() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, NAMES);
+    for sql in [
+        "CREATE VIEW x AS SELECT id FROM n WHERE b LIKE '1%'",
+        "CREATE VIEW x AS SELECT id FROM n WHERE name LIKE 'a!%' ESCAPE '!'",
+        "CREATE VIEW x AS SELECT id FROM n WHERE name LIKE name",
+        "CREATE VIEW x AS SELECT id FROM n WHERE name ILIKE 'a%'",
+    ] {
+        assert!(try_exec(&mut client, &sn, sql).is_err(), "{sql} should be rejected");
+    }
+}
@@ -0,0 +1,174 @@
+#![cfg(feature = "integration")]
+
+//! Incremental top-K views: `CREATE VIEW … ORDER BY c LIMIT n [BY g]`.
+
+use gnitz_sql::GnitzSqlError;
+use gnitz_test_harness::ServerHandle;
+use gnitz_wire::{OPCODE_EXCHANGE_SHARD, OPCODE_FILTER, OPCODE_TOP_K};
+
+mod common;
+use common::*;
+
+fn assert_rejects(client: &mut gnitz_core::GnitzClient, sn: &str, sql: &str, want: &str) {
+    let err = try_exec(client, sn, sql).unwrap_err();
+    let msg = match &err {
+        GnitzSqlError::Unsupported(m) | GnitzSqlError::Bind(m) | GnitzSqlError::Plan(m) => m.clone(),
+        other => format!("{other:?}"),
+    };
+    assert!(msg.contains(want), "expected error containing {want:?}, got: {msg}");
+}
+
+/// A global top-3 by score: one TOP_K behind its shard, the WHERE still a
+/// filter; inserts evict, deletes refill from below the cut, and an update that
+/// drops a row out of the top pulls the next one in.
+#[test]
+fn test_global_top_k_tracks_inserts_deletes_updates() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE s (id BIGINT NOT NULL PRIMARY KEY, score BIGINT NOT NULL, live BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW top3 AS SELECT id, score FROM s WHERE live = 1 ORDER BY score DESC LIMIT 3",
+    );
+    let vid = client.resolve_table_or_view_id(&sn, "top3").unwrap().0;
+    let nodes = scan_circuit_nodes(&mut client);
+    assert_eq!(opcode_node_count(nodes.as_ref(), vid, OPCODE_TOP_K), 1);
+    assert_eq!(opcode_node_count(nodes.as_ref(), vid, OPCODE_EXCHANGE_SHARD), 1);
+    assert_eq!(opcode_node_count(nodes.as_ref(), vid, OPCODE_FILTER), 1);
+
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO s VALUES (1, 10, 1), (2, 50, 1), (3, 30, 1), (4, 40, 1), (5, 99, 0)",
+    );
+    let top = |c: &mut gnitz_core::GnitzClient| payload_rows(c, &sn, "top3", &["score", "id"]);
+    assert_eq!(top(&mut client), vec![vec![30, 3], vec![40, 4], vec![50, 2]]);
+
+    exec(&mut client, &sn, "INSERT INTO s VALUES (6, 45, 1)");
+    assert_eq!(top(&mut client), vec![vec![40, 4], vec![45, 6], vec![50, 2]]);
+
+    exec(&mut client, &sn, "DELETE FROM s WHERE id = 2");
+    assert_eq!(top(&mut client), vec![vec![30, 3], vec![40, 4], vec![45, 6]]);
+
+    exec(&mut client, &sn, "UPDATE s SET score = 5 WHERE id = 4");
+    assert_eq!(top(&mut client), vec![vec![10, 1], vec![30, 3], vec![45, 6]]);
+
+    // Flipping the filter admits a row straight into first place.
+    exec(&mut client, &sn, "UPDATE s SET live = 1 WHERE id = 5");
+    assert_eq!(top(&mut client), vec![vec![30, 3], vec![45, 6], vec![99, 5]]);
+}
+
+/// `LIMIT n BY g` keeps n rows per group, ties on the order value broken by PK.
+#[test]
+fn test_per_group_top_k() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE g (id BIGINT NOT NULL PRIMARY KEY, grp BIGINT NOT NULL, v BIGINT)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW low2 AS SELECT id, grp, v FROM g ORDER BY v ASC LIMIT 2 BY grp",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO g VALUES (1, 1, 7), (2, 1, 3), (3, 1, 3), (4, 1, 1), (5, 2, 8), (6, 2, 9), (7, 2, 2)",
+    );
+    let rows = |c: &mut gnitz_core::GnitzClient| payload_rows(c, &sn, "low2", &["grp", "v", "id"]);
+    assert_eq!(
+        rows(&mut client),
+        vec![vec![1, 1, 4], vec![1, 3, 2], vec![2, 2, 7], vec![2, 8, 5]]
+    );
+
+    // Group 1 loses its minimum and id 3 — the PK-later of the tie at 3 — fills
+    // the slot. Group 2 is untouched.
+    exec(&mut client, &sn, "DELETE FROM g WHERE id = 4");
+    assert_eq!(
+        rows(&mut client),
+        vec![vec![1, 3, 2], vec![1, 3, 3], vec![2, 2, 7], vec![2, 8, 5]]
+    );
+}
+
+#[test]
+fn test_top_k_rejections() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE r (id BIGINT NOT NULL PRIMARY KEY, k BIGINT, name VARCHAR NOT NULL, v BIGINT NOT NULL)",
+    );
+    let c = &mut client;
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x1 AS SELECT id, v FROM r ORDER BY v",
+        "requires a LIMIT",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x2 AS SELECT id, v FROM r LIMIT 3",
+        "requires an ORDER BY",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x3 AS SELECT id, v FROM r ORDER BY v LIMIT 3 OFFSET 1",
+        "OFFSET",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x4 AS SELECT id, v FROM r ORDER BY v, id LIMIT 3",
+        "more than one",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x5 AS SELECT id, v FROM r ORDER BY v LIMIT 0",
+        "positive",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x6 AS SELECT id, name FROM r ORDER BY name LIMIT 3",
+        "cannot order",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x7 AS SELECT id, k, v FROM r ORDER BY v LIMIT 3 BY k",
+        "NOT NULL",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x8 AS SELECT id, v FROM r ORDER BY zz LIMIT 3",
+        "unknown column",
+    );
+    assert_rejects(
+        c,
+        &sn,
+        "CREATE VIEW x9 AS SELECT v, COUNT(*) AS n FROM r GROUP BY v ORDER BY n LIMIT 3",
+        "single-table filter/map",
+    );
+}
@@ -0,0 +1,201 @@
+#![cfg(feature = "integration")]
+
+//! VAR_POP / VAR_SAMP / STDDEV_POP / STDDEV_SAMP: finalized from linear
+//! (Σx, n, Σx²) moments, so inserts and deletes both refold incrementally.
+
+use gnitz_test_harness::ServerHandle;
+use gnitz_wire::OPCODE_REDUCE;
+
+mod common;
+use common::*;
+
+/// `(g, [avg, var_pop, var_samp, stddev_pop, stddev_samp])` per group, sorted by
+/// `g`; a NULL cell reads as `None`.
+fn moment_rows(client: &mut gnitz_core::GnitzClient, sn: &str, view: &str) -> Vec<(i64, Vec<Option<f64>>)> {
+    let (schema, batch) = read_view(client, sn, view);
+    let g = col_idx(&schema, "g");
+    let mut rows: Vec<(i64, Vec<Option<f64>>)> = (0..batch.len())
+        .map(|r| {
+            let vals = ["a", "vp", "vs", "sp", "ss"]
+                .iter()
+                .map(|name| {
+                    let ci = col_idx(&schema, name);
+                    if is_null_at(&batch, ci - schema.pk_cols.len(), r) {
+                        None
+                    } else {
+                        Some(f64_at(&batch, ci, r))
+                    }
+                })
+                .collect();
+            (cell_i64(&schema, &batch, g, r), vals)
+        })
+        .collect();
+    rows.sort_by_key(|r| r.0);
+    rows
+}
+
+fn assert_moments(got: &[Option<f64>], want: [Option<f64>; 5]) {
+    for (g, w) in got.iter().zip(want) {
+        match (g, w) {
+            (Some(g), Some(w)) => assert!((g - w).abs() < 1e-9, "got {got:?}, want {want:?}"),
+            (None, None) => {}
+            _ => panic!("got {got:?}, want {want:?}"),
+        }
+    }
+}
+
+#[test]
+fn test_variance_aggregates_track_inserts_and_deletes() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE m (id BIGINT NOT NULL PRIMARY KEY, g BIGINT NOT NULL, x BIGINT)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW v AS SELECT g, AVG(x) AS a, VAR_POP(x) AS vp, VAR_SAMP(x) AS vs, \
+         STDDEV_POP(x) AS sp, STDDEV(x) AS ss FROM m GROUP BY g",
+    );
+    // Group 1: {2, 4, 4, 4, 5, 5, 7, 9} — mean 5, M2 = 32. Group 2: one row.
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO m VALUES (1, 1, 2), (2, 1, 4), (3, 1, 4), (4, 1, 4), (5, 1, 5), (6, 1, 5), \
+         (7, 1, 7), (8, 1, 9), (9, 2, 10), (10, 2, NULL)",
+    );
+    let rows = moment_rows(&mut client, &sn, "v");
+    assert_eq!(rows.len(), 2);
+    let samp = 32.0f64 / 7.0;
+    assert_moments(
+        &rows[0].1,
+        [Some(5.0), Some(4.0), Some(samp), Some(2.0), Some(samp.sqrt())],
+    );
+    // One non-null row: the population forms are 0, the sample forms NULL.
+    assert_moments(&rows[1].1, [Some(10.0), Some(0.0), None, Some(0.0), None]);
+
+    // Retracting 2 and 9 leaves {4, 4, 4, 5, 5, 7}: mean 29/6, M2 = 6.833….
+    exec(&mut client, &sn, "DELETE FROM m WHERE id IN (1, 8)");
+    let rows = moment_rows(&mut client, &sn, "v");
+    let mean = 29.0f64 / 6.0;
+    let m2: f64 = [4.0, 4.0, 4.0, 5.0, 5.0, 7.0]
+        .iter()
+        .map(|x| (x - mean) * (x - mean))
+        .sum();
+    assert_moments(
+        &rows[0].1,
+        [
+            Some(mean),
+            Some(m2 / 6.0),
+            Some(m2 / 5.0),
+            Some((m2 / 6.0).sqrt()),
+            Some((m2 / 5.0).sqrt()),
+        ],
+    );
+
+    // A group whose only non-null row is retracted survives on its NULL row and
+    // renders NULL throughout.
+    exec(&mut client, &sn, "DELETE FROM m WHERE id = 9");
+    let rows = moment_rows(&mut client, &sn, "v");
+    assert_moments(&rows[1].1, [None, None, None, None, None]);
+}
+
+#[test]
+fn test_variance_global_and_having() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE h (id BIGINT NOT NULL PRIMARY KEY, g BIGINT NOT NULL, x DOUBLE NOT NULL)",
+    );
+    exec(&mut client, &sn, "CREATE VIEW tot AS SELECT VAR_POP(x) AS vp FROM h");
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW spread AS SELECT g, COUNT(*) AS n FROM h GROUP BY g HAVING STDDEV_POP(x) > 1.5",
+    );
+    let total = |c: &mut gnitz_core::GnitzClient| {
+        let (schema, batch) = read_view(c, &sn, "tot");
+        let ci = col_idx(&schema, "vp");
+        assert_eq!(batch.len(), 1);
+        (!is_null_at(&batch, ci - schema.pk_cols.len(), 0)).then(|| f64_at(&batch, ci, 0))
+    };
+    // The empty source's ground row is NULL, not a 0/0 artefact.
+    assert_eq!(total(&mut client), None);
+
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO h VALUES (1, 1, 1.0), (2, 1, 5.0), (3, 2, 2.0), (4, 2, 3.0)",
+    );
+    // Global {1, 5, 2, 3}: mean 2.75, M2 = 8.75.
+    assert!((total(&mut client).unwrap() - 8.75 / 4.0).abs() < 1e-9);
+    // Group 1 has σ = 2, group 2 has σ = 0.5.
+    assert_eq!(payload_rows(&mut client, &sn, "spread", &["g", "n"]), vec![vec![1, 2]]);
+
+    exec(&mut client, &sn, "UPDATE h SET x = 9.0 WHERE id = 4");
+    assert_eq!(
+        payload_rows(&mut client, &sn, "spread", &["g", "n"]),
+        vec![vec![1, 2], vec![2, 2]]
+    );
+}
+
+/// BIGINT values past √i64::MAX: Σx² exceeds `i64::MAX`, so it is carried as an
+/// F64 — grouped and global views both see the true variance
+/// rather than a wrapped square sum.
+#[test]
+fn test_variance_of_large_integers_does_not_wrap() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE TABLE big (id BIGINT NOT NULL PRIMARY KEY, g BIGINT NOT NULL, x BIGINT NOT NULL)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW bg AS SELECT g, VAR_POP(x) AS vp FROM big GROUP BY g",
+    );
+    exec(&mut client, &sn, "CREATE VIEW bt AS SELECT VAR_POP(x) AS vp FROM big");
+    // The F64 Σx² partials would not combine exactly, so the global variance
+    // keeps the single-reduce funnel instead of the two-phase plan.
+    let vid = client.resolve_table_or_view_id(&sn, "bt").unwrap().0;
+    let nodes = scan_circuit_nodes(&mut client);
+    assert_eq!(opcode_node_count(nodes.as_ref(), vid, OPCODE_REDUCE), 1);
+    let var_pop = |c: &mut gnitz_core::GnitzClient, view: &str| {
+        let (schema, batch) = read_view(c, &sn, view);
+        let ci = col_idx(&schema, "vp");
+        assert_eq!(batch.len(), 1);
+        f64_at(&batch, ci, 0)
+    };
+    let assert_close = |got: f64, want: f64| {
+        assert!(((got - want) / want).abs() < 1e-9, "got {got}, want {want}");
+    };
+
+    // {3·10⁹, 5·10⁹}: Σx² = 3.4·10¹⁹ > i64::MAX; mean 4·10⁹, VAR_POP 10¹⁸.
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO big VALUES (1, 1, 3000000000), (2, 1, 5000000000)",
+    );
+    assert_close(var_pop(&mut client, "bg"), 1e18);
+    assert_close(var_pop(&mut client, "bt"), 1e18);
+
+    // Adding 4·10⁹ keeps the mean; M2 stays 2·10¹⁸ over three rows.
+    exec(&mut client, &sn, "INSERT INTO big VALUES (3, 1, 4000000000)");
+    assert_close(var_pop(&mut client, "bg"), 2e18 / 3.0);
+    assert_close(var_pop(&mut client, "bt"), 2e18 / 3.0);
+}
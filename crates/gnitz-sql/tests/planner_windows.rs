@@ -0,0 +1,171 @@
+#![cfg(feature = "integration")]
+
+//! `GROUP BY TUMBLE(ts, w)` / `HOP(ts, slide, size)` windowed aggregation and
+//! the `WITH (retention = n)` state horizon.
+
+use gnitz_test_harness::ServerHandle;
+
+mod common;
+use common::*;
+
+const EVENTS: &str = "CREATE TABLE e (id BIGINT NOT NULL PRIMARY KEY, ts BIGINT, v BIGINT NOT NULL)";
+
+#[test]
+fn test_tumble_counts_and_sums_per_window() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, EVENTS);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW w AS SELECT TUMBLE(ts, 60) AS ws, COUNT(*) AS n, SUM(v) AS s \
+         FROM e GROUP BY TUMBLE(ts, 60)",
+    );
+    // A negative time floors into the window below zero; a NULL time is in none.
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO e VALUES (1, 0, 1), (2, 59, 2), (3, 60, 3), (4, -1, 4), (5, NULL, 5)",
+    );
+    let rows = |c: &mut gnitz_core::GnitzClient| payload_rows(c, &sn, "w", &["ws", "n", "s"]);
+    assert_eq!(rows(&mut client), vec![vec![-60, 1, 4], vec![0, 2, 3], vec![60, 1, 3]]);
+
+    exec(&mut client, &sn, "DELETE FROM e WHERE id = 2");
+    assert_eq!(rows(&mut client), vec![vec![-60, 1, 4], vec![0, 1, 1], vec![60, 1, 3]]);
+
+    // Moving a row moves it between windows; the emptied window disappears.
+    exec(&mut client, &sn, "UPDATE e SET ts = 125 WHERE id = 3");
+    assert_eq!(rows(&mut client), vec![vec![-60, 1, 4], vec![0, 1, 1], vec![120, 1, 3]]);
+}
+
+#[test]
+fn test_hop_assigns_rows_to_overlapping_windows() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, EVENTS);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW h AS SELECT window_start, COUNT(*) AS n FROM e GROUP BY HOP(ts, 10, 30)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW hv AS SELECT v, window_start, SUM(ts) AS t FROM e WHERE v > 0 GROUP BY v, HOP(ts, 10, 20)",
+    );
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO e VALUES (1, 5, 1), (2, 25, 1), (3, 7, 0)",
+    );
+    // ts 5 and 7 fall in [-20, 10), [-10, 20), [0, 30); ts 25 in [0, 30),
+    // [10, 40), [20, 50).
+    assert_eq!(
+        payload_rows(&mut client, &sn, "h", &["window_start", "n"]),
+        vec![vec![-20, 2], vec![-10, 2], vec![0, 3], vec![10, 1], vec![20, 1]]
+    );
+    assert_eq!(
+        payload_rows(&mut client, &sn, "hv", &["v", "window_start", "t"]),
+        vec![vec![1, -10, 5], vec![1, 0, 5], vec![1, 10, 25], vec![1, 20, 25]]
+    );
+
+    exec(&mut client, &sn, "DELETE FROM e WHERE id = 1");
+    assert_eq!(
+        payload_rows(&mut client, &sn, "h", &["window_start", "n"]),
+        vec![vec![-20, 1], vec![-10, 1], vec![0, 2], vec![10, 1], vec![20, 1]]
+    );
+}
+
+#[test]
+fn test_retention_expires_closed_windows() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, EVENTS);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW r WITH (retention = 100) AS SELECT TUMBLE(ts, 60) AS ws, COUNT(*) AS n \
+         FROM e GROUP BY TUMBLE(ts, 60)",
+    );
+    let rows = |c: &mut gnitz_core::GnitzClient| payload_rows(c, &sn, "r", &["ws", "n"]);
+
+    // Newest window 120: window 0 is more than 100 behind and never appears.
+    exec(
+        &mut client,
+        &sn,
+        "INSERT INTO e VALUES (1, 0, 1), (2, 70, 1), (3, 130, 1)",
+    );
+    assert_eq!(rows(&mut client), vec![vec![60, 1], vec![120, 1]]);
+
+    // Window 240 closes 60 and 120, deleting their rows.
+    exec(&mut client, &sn, "INSERT INTO e VALUES (4, 250, 1)");
+    assert_eq!(rows(&mut client), vec![vec![240, 1]]);
+
+    // A late row for a closed window is dropped; one within the horizon lands.
+    exec(&mut client, &sn, "INSERT INTO e VALUES (5, 65, 1), (6, 200, 1)");
+    assert_eq!(rows(&mut client), vec![vec![180, 1], vec![240, 1]]);
+    // Deleting a row whose window already closed changes nothing.
+    exec(&mut client, &sn, "DELETE FROM e WHERE id = 2");
+    assert_eq!(rows(&mut client), vec![vec![180, 1], vec![240, 1]]);
+}
+
+/// On several workers the watermark is per worker, so the RETAIN runs after the
+/// reduce's exchange: every row of one window meets the same watermark, and a
+/// late window is kept or expired whole, never split by source partition.
+#[test]
+fn test_retention_judges_each_window_on_one_worker() {
+    let srv = match ServerHandle::start_n(4) {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, EVENTS);
+    exec(
+        &mut client,
+        &sn,
+        "CREATE VIEW r WITH (retention = 100) AS SELECT TUMBLE(ts, 60) AS ws, COUNT(*) AS n \
+         FROM e GROUP BY TUMBLE(ts, 60)",
+    );
+    exec(&mut client, &sn, "INSERT INTO e VALUES (1, 250, 1)");
+    let late: Vec<String> = (2..18).map(|id| format!("({id}, 70, 1)")).collect();
+    exec(&mut client, &sn, &format!("INSERT INTO e VALUES {}", late.join(", ")));
+
+    let rows = payload_rows(&mut client, &sn, "r", &["ws", "n"]);
+    assert!(
+        rows == vec![vec![240, 1]] || rows == vec![vec![60, 16], vec![240, 1]],
+        "window 60 must be wholly expired or wholly kept: {rows:?}"
+    );
+}
+
+#[test]
+fn test_window_rejections() {
+    let srv = match ServerHandle::start() {
+        Some(s) => s,
+        None => return,
+    };
+    let (mut client, sn) = make_planner(&srv);
+    exec(&mut client, &sn, EVENTS);
+    for sql in [
+        // Retention needs a window to expire.
+        "CREATE VIEW x WITH (retention = 10) AS SELECT v, COUNT(*) AS n FROM e GROUP BY v",
+        "CREATE VIEW x WITH (retention = 10) AS SELECT id, v FROM e",
+        "CREATE VIEW x WITH (retention = 0) AS SELECT TUMBLE(ts, 5), COUNT(*) FROM e GROUP BY TUMBLE(ts, 5)",
+        // Window shape.
+        "CREATE VIEW x AS SELECT COUNT(*) FROM e GROUP BY TUMBLE(ts, 0)",
+        "CREATE VIEW x AS SELECT COUNT(*) FROM e GROUP BY HOP(ts, 7, 30)",
+        "CREATE VIEW x AS SELECT COUNT(*) FROM e GROUP BY TUMBLE(ts, 5), HOP(ts, 5, 10)",
+        // A non-window expression still needs GROUP BY or an aggregate.
+        "CREATE VIEW x AS SELECT ts, COUNT(*) FROM e GROUP BY TUMBLE(ts, 5)",
+    ] {
+        assert!(try_exec(&mut client, &sn, sql).is_err(), "{sql} should be rejected");
+    }
+}
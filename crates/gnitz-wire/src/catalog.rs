@@ -133,6 +133,24 @@ pub const SEQ_TAB_COLS: &[WireSysCol] = &[
     col("next_val", TypeCode::U64, false),
 ];
 
+// Per-view freshness, one row per materialised view. Read-only and computed by
+// the master on every scan — no store, no COL_TAB rows, not a catalog family.
+pub const VIEW_STATS_TAB_COLS: &[WireSysCol] = &[
+    col("view_id", TypeCode::U64, false),
+    // Every commit at or below this LSN is reflected in the view.
+    col("applied_lsn", TypeCode::U64, false),
+    // Committed LSNs the view has yet to apply: `published - applied_lsn` while
+    // a source has an unticked commit, else 0.
+    col("lag_lsn", TypeCode::U64, false),
+    // Live tick evaluations since boot (or since the view was created).
+    col("ticks", TypeCode::U64, false),
+    // Wall time of the latest evaluation, slowest worker.
+    col("last_tick_ns", TypeCode::U64, false),
+    // Rows (Z-set entries) the latest evaluation emitted, all workers.
+    col("last_rows", TypeCode::U64, false),
+    col("total_rows", TypeCode::U64, false),
+];
+
 // Circuit catalog tables use a real compound primary key `(view_id, sub)`
 // instead of hand-packing both halves into one U128 column. `sub` is the
 // per-view secondary key (node_id, an (dst_node,dst_port) pack, or a
@@ -177,6 +195,7 @@ pub const COL_TAB: u64 = 4;
 pub const IDX_TAB: u64 = 5;
 pub const DEP_TAB: u64 = 6;
 pub const SEQ_TAB: u64 = 7;
+pub const VIEW_STATS_TAB: u64 = 8;
 pub const CIRCUIT_NODES_TAB: u64 = 11;
 pub const CIRCUIT_EDGES_TAB: u64 = 12;
 pub const CIRCUIT_NODE_COLUMNS_TAB: u64 = 13;
@@ -497,10 +516,13 @@ pub fn unpack_pk_cols(packed: u64) -> PkColList {
 // TABLE_TAB.flags layout — the single source of truth shared by the gnitz-core
 // writer and the gnitz-engine reader, so the bit packing cannot drift.
 //
-//   bit 0        unique_pk (TABLE_FLAG_UNIQUE_PK)
-//   bit 1        replicated (TABLE_FLAG_REPLICATED) — full copy on every worker
-//   bits [2..8)  reserved for future boolean flags
-//   bits [8..16) distribution prefix length k (0 = default = full PK)
+//   bit 0         unique_pk (TABLE_FLAG_UNIQUE_PK)
+//   bit 1         replicated (TABLE_FLAG_REPLICATED) — full copy on every worker
+//   bit 2         append_only (TABLE_FLAG_APPEND_ONLY) — insertions only
+//   bits [3..8)   reserved for future boolean flags
+//   bits [8..16)  distribution prefix length k (0 = default = full PK)
+//   bits [16..24) compaction strategy (`CompactionStrategy`, 0 = leveled)
+//   bits [24..32) L0 compaction trigger (0 = the strategy's default)
 //
 // `k` is byte-aligned (not bit-1-adjacent) so the boolean flag bits [1..8)
 // stay free for future flags without colliding with `k`. `replicated` and a
@@ -516,6 +538,10 @@ const TABLE_FLAG_UNIQUE_PK: u64 = 1;
 /// copy (writes broadcast, reads single-source). Mutually exclusive with a
 /// non-default `dist_prefix_len` (enforced at DDL, not by this packing).
 const TABLE_FLAG_REPLICATED: u64 = 1 << 1;
+/// Bit 2: the table is **append-only** — the write path rejects retractions and
+/// PK-conflicting inserts, so every row ever pushed is still live and views over
+/// it may skip their retraction machinery.
+const TABLE_FLAG_APPEND_ONLY: u64 = 1 << 2;
 /// Bit position of the distribution-prefix-length byte in `TABLE_TAB.flags`.
 const TABLE_FLAG_DIST_SHIFT: u32 = 8;
 /// Mask for the distribution-prefix-length byte (one byte: 0..=255). An
@@ -523,14 +549,98 @@ const TABLE_FLAG_DIST_SHIFT: u32 = 8;
 /// byte is deliberate headroom.
 const TABLE_FLAG_DIST_MASK: u64 = 0xFF;
 
+/// Bit position of the compaction-strategy byte in `TABLE_TAB.flags`.
+const TABLE_FLAG_COMPACTION_SHIFT: u32 = 16;
+/// Bit position of the L0-trigger byte in `TABLE_TAB.flags`.
+const TABLE_FLAG_L0_TRIGGER_SHIFT: u32 = 24;
+
+/// Per-table LSM compaction strategy, persisted in byte 2 of `TABLE_TAB.flags`.
+/// Discriminant 0 = `Leveled`, so every pre-existing flags word decodes to the
+/// policy the shard index always ran.
+#[repr(u8)]
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq)]
+pub enum CompactionStrategy {
+    /// Read-optimized FLSM: few files per guard, L1 folded down into L2 once it
+    /// passes its target file count. The historical (and default) behavior.
+    #[default]
+    Leveled = 0,
+    /// Write-optimized: L0 and each guard tolerate more sorted runs before a
+    /// merge, and the deepest level keeps a small tier of runs instead of
+    /// folding to one file. Fewer rewrites per ingested byte, more runs probed
+    /// per lookup.
+    Tiered = 1,
+    /// For append-mostly tables whose PK leads with a time-ordered column: the
+    /// L1 guards then partition the key space into time windows, and no
+    /// vertical L1→L2 merge ever rewrites a closed window again.
+    TimeWindowed = 2,
+}
+
+impl CompactionStrategy {
+    #[inline]
+    pub const fn as_u8(self) -> u8 {
+        self as u8
+    }
+
+    /// Unknown bytes decode as `Leveled` so a flags word written by a newer
+    /// client still opens under the conservative default.
+    #[inline]
+    pub const fn from_u8(v: u8) -> Self {
+        match v {
+            1 => CompactionStrategy::Tiered,
+            2 => CompactionStrategy::TimeWindowed,
+            _ => CompactionStrategy::Leveled,
+        }
+    }
+
+    /// Parse the SQL spelling (`WITH (compaction = '…')`), case-insensitively.
+    pub fn from_name(name: &str) -> Option<Self> {
+        if name.eq_ignore_ascii_case("leveled") {
+            Some(CompactionStrategy::Leveled)
+        } else if name.eq_ignore_ascii_case("tiered") {
+            Some(CompactionStrategy::Tiered)
+        } else if name.eq_ignore_ascii_case("time_windowed") {
+            Some(CompactionStrategy::TimeWindowed)
+        } else {
+            None
+        }
+    }
+
+    pub const fn name(self) -> &'static str {
+        match self {
+            CompactionStrategy::Leveled => "leveled",
+            CompactionStrategy::Tiered => "tiered",
+            CompactionStrategy::TimeWindowed => "time_windowed",
+        }
+    }
+}
+
+/// The per-table compaction options carried in `TABLE_TAB.flags`. `l0_trigger`
+/// is the L0 run count above which a compaction fires; `0` defers to the
+/// strategy's default, so `CompactionOptions::default()` packs to zero bits.
+#[derive(Debug, Clone, Copy, Default, PartialEq, Eq)]
+pub struct CompactionOptions {
+    pub strategy: CompactionStrategy,
+    pub l0_trigger: u8,
+}
+
 /// Pack the persisted `TABLE_TAB.flags` u64 from its logical fields. With
-/// `replicated == false` and `dist_prefix_len == 0` (the default = full PK) this
-/// is byte-identical to the pre-distribution-key encoding `unique_pk as u64`.
+/// `replicated == append_only == false`, `dist_prefix_len == 0` (the default =
+/// full PK) and default compaction options this is byte-identical to the
+/// pre-distribution-key encoding `unique_pk as u64`.
 #[inline]
-pub fn pack_table_flags(unique_pk: bool, replicated: bool, dist_prefix_len: usize) -> u64 {
+pub fn pack_table_flags(
+    unique_pk: bool,
+    replicated: bool,
+    append_only: bool,
+    dist_prefix_len: usize,
+    compaction: CompactionOptions,
+) -> u64 {
     (((dist_prefix_len as u64) & TABLE_FLAG_DIST_MASK) << TABLE_FLAG_DIST_SHIFT)
+        | ((compaction.strategy.as_u8() as u64) << TABLE_FLAG_COMPACTION_SHIFT)
+        | ((compaction.l0_trigger as u64) << TABLE_FLAG_L0_TRIGGER_SHIFT)
         | if unique_pk { TABLE_FLAG_UNIQUE_PK } else { 0 }
         | if replicated { TABLE_FLAG_REPLICATED } else { 0 }
+        | if append_only { TABLE_FLAG_APPEND_ONLY } else { 0 }
 }
 
 /// Decode the `unique_pk` bit from `TABLE_TAB.flags`.
@@ -545,6 +655,12 @@ pub fn table_flags_replicated(flags: u64) -> bool {
     flags & TABLE_FLAG_REPLICATED != 0
 }
 
+/// Decode the `append_only` bit from `TABLE_TAB.flags`.
+#[inline]
+pub fn table_flags_append_only(flags: u64) -> bool {
+    flags & TABLE_FLAG_APPEND_ONLY != 0
+}
+
 /// Decode the distribution prefix length `k` from `TABLE_TAB.flags`. `0` means
 /// "default = full PK"; the schema constructor normalizes that to `k = |PK|`.
 #[inline]
@@ -552,6 +668,15 @@ pub fn table_flags_dist_prefix(flags: u64) -> usize {
     ((flags >> TABLE_FLAG_DIST_SHIFT) & TABLE_FLAG_DIST_MASK) as usize
 }
 
+/// Decode the compaction options from `TABLE_TAB.flags` (bytes 2 and 3).
+#[inline]
+pub fn table_flags_compaction(flags: u64) -> CompactionOptions {
+    CompactionOptions {
+        strategy: CompactionStrategy::from_u8((flags >> TABLE_FLAG_COMPACTION_SHIFT) as u8),
+        l0_trigger: (flags >> TABLE_FLAG_L0_TRIGGER_SHIFT) as u8,
+    }
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -611,26 +736,72 @@ mod tests {
     fn table_flags_roundtrip() {
         // Default (not replicated, k = 0 = full PK) is byte-identical to the old
         // `unique_pk as u64`.
-        assert_eq!(pack_table_flags(false, false, 0), 0);
-        assert_eq!(pack_table_flags(true, false, 0), 1);
-        // k rides in byte 1; the unique and replicated bits are untouched.
+        assert_eq!(
+            pack_table_flags(false, false, false, 0, CompactionOptions::default()),
+            0
+        );
+        assert_eq!(pack_table_flags(true, false, false, 0, CompactionOptions::default()), 1);
+        // k rides in byte 1; the boolean bits are untouched.
         for &uniq in &[false, true] {
             for &repl in &[false, true] {
-                for k in 0..=PK_LIST_MAX_COLS {
-                    let f = pack_table_flags(uniq, repl, k);
-                    assert_eq!(table_flags_dist_prefix(f), k);
-                    assert_eq!(table_flags_unique(f), uniq);
-                    assert_eq!(table_flags_replicated(f), repl);
+                for &append in &[false, true] {
+                    for k in 0..=PK_LIST_MAX_COLS {
+                        let f = pack_table_flags(uniq, repl, append, k, CompactionOptions::default());
+                        assert_eq!(table_flags_dist_prefix(f), k);
+                        assert_eq!(table_flags_unique(f), uniq);
+                        assert_eq!(table_flags_replicated(f), repl);
+                        assert_eq!(table_flags_append_only(f), append);
+                    }
                 }
             }
         }
-        // `replicated` is bit 1; reserved bits [2..8) stay clear of the k byte.
-        assert_eq!(pack_table_flags(true, true, 0) & 0xFF, 0b11);
-        assert_eq!(pack_table_flags(true, true, 2) >> TABLE_FLAG_DIST_SHIFT, 2);
+        // `replicated` is bit 1, `append_only` bit 2; reserved bits [3..8) stay
+        // clear of the k byte.
+        assert_eq!(
+            pack_table_flags(true, true, false, 0, CompactionOptions::default()) & 0xFF,
+            0b11
+        );
+        assert_eq!(
+            pack_table_flags(true, false, true, 0, CompactionOptions::default()) & 0xFF,
+            0b101
+        );
         assert_eq!(
-            pack_table_flags(true, true, 2) & 0xFC,
+            pack_table_flags(true, true, true, 2, CompactionOptions::default()) >> TABLE_FLAG_DIST_SHIFT,
+            2
+        );
+        assert_eq!(
+            pack_table_flags(true, true, true, 2, CompactionOptions::default()) & 0xF8,
             0,
-            "reserved bits [2..8) are free"
+            "reserved bits [3..8) are free"
+        );
+    }
+
+    #[test]
+    fn table_flags_compaction_roundtrip() {
+        for strategy in [
+            CompactionStrategy::Leveled,
+            CompactionStrategy::Tiered,
+            CompactionStrategy::TimeWindowed,
+        ] {
+            for l0_trigger in [0u8, 1, 8, 255] {
+                let opts = CompactionOptions { strategy, l0_trigger };
+                let f = pack_table_flags(true, false, false, 2, opts);
+                assert_eq!(table_flags_compaction(f), opts);
+                // The lower fields are untouched by the compaction bytes.
+                assert!(table_flags_unique(f));
+                assert!(!table_flags_replicated(f));
+                assert_eq!(table_flags_dist_prefix(f), 2);
+            }
+            assert_eq!(CompactionStrategy::from_name(strategy.name()), Some(strategy));
+        }
+        // A pre-existing flags word decodes as the leveled default.
+        assert_eq!(table_flags_compaction(0b11), CompactionOptions::default());
+        // An unknown strategy byte falls back to leveled.
+        assert_eq!(CompactionStrategy::from_u8(0x7f), CompactionStrategy::Leveled);
+        assert_eq!(
+            CompactionStrategy::from_name("TIERED"),
+            Some(CompactionStrategy::Tiered)
         );
+        assert_eq!(CompactionStrategy::from_name("universal"), None);
     }
 }
@@ -39,6 +39,18 @@ pub const OPCODE_PARTITION_FILTER: u64 = 33;
 /// (PK, payload)'s net weight to `[0, i64::MAX]` (vs DISTINCT's `[-1, 1]`). The
 /// bag preset for EXCEPT ALL / INTERSECT ALL; shares DISTINCT's engine body.
 pub const OPCODE_POSITIVE_PART: u64 = 34;
+/// Incremental top-K per group: keeps each group's `limit` first rows under one
+/// order column (ties broken by PK, then payload) and emits the change to that
+/// set, in the input's schema. The ORDER BY … LIMIT view operator.
+pub const OPCODE_TOP_K: u64 = 35;
+/// MAP sub-variant: expression program whose payload schema travels with the
+/// node (type code + nullability per output column) instead of being the
+/// view's, so a mid-circuit map can append computed columns.
+pub const OPCODE_MAP_COMPUTE: u64 = 36;
+/// Watermark retention on one order-encodable integer column: drops rows that
+/// fall behind the column's running maximum by more than a horizon and retracts
+/// the rows it passed earlier once they do. The window-expiry operator.
+pub const OPCODE_RETAIN: u64 = 37;
 
 // ---------------------------------------------------------------------------
 // Circuit-layer type aliases
@@ -74,6 +86,9 @@ pub const NODE_COL_KIND_RANGE_JOIN: u64 = 7; // JOIN_DELTA_TRACE_RANGE params (v
 pub const NODE_COL_KIND_GLOBAL_GROUND: u64 = 8; // REDUCE global-aggregate ground discriminator (value1=bool)
 pub const NODE_COL_KIND_REDUCE_OUT_KEY: u64 = 9; // REDUCE output-key kind (value1=ReduceOutKey); absent ⇒ SyntheticFold
 pub const NODE_COL_KIND_SCAN_BOUND: u64 = 10; // SCAN_DELTA backfill-scan index column list (value1=col_idx, position=key order)
+pub const NODE_COL_KIND_TOP_K: u64 = 11; // TOP_K params (pos 0: value1=order col, value2=limit; pos 1: value1=desc, value2=nulls_first)
+pub const NODE_COL_KIND_MAP_OUT: u64 = 12; // MAP_COMPUTE payload columns (value1=type code, value2=nullable, position=payload order)
+pub const NODE_COL_KIND_RETAIN: u64 = 13; // RETAIN params (value1=column, value2=horizon)
 
 // ---------------------------------------------------------------------------
 // Aggregate function IDs
@@ -89,25 +104,47 @@ pub const AGG_COUNT_NON_NULL: u64 = 5;
 /// per-worker partial COUNT/COUNT_NON_NULL columns with this — a plain `Sum` would
 /// render their empty value as NULL instead of `0`.
 pub const AGG_SUM_ZERO: u64 = 6;
+/// Counting-HyperLogLog distinct estimate. Retraction-aware: the sketch state is
+/// a Z-set of `(register, rank)` cells, so a deleted row cancels its own cell.
+pub const AGG_APPROX_COUNT_DISTINCT: u64 = 7;
+/// Log-bucket (DDSketch-style) quantile estimate. The func id occupies the low
+/// byte of the spec's `value1`; the requested quantile rides above it in
+/// permyriad (`0..=10000`), so one spec row still carries the whole aggregate.
+pub const AGG_APPROX_PERCENTILE: u64 = 8;
+/// `Σ value²` — `Sum`'s fold over the squared value, NULL identity. With SUM and
+/// COUNT_NON_NULL it is the linear state behind VAR_* / STDDEV_*: the variance is
+/// finalized from the three after the reduce.
+pub const AGG_SUM_SQ: u64 = 9;
+/// Mask selecting the func id out of a packed agg-spec `value1`.
+pub const AGG_FUNC_ID_MASK: u64 = 0xFF;
+/// Largest quantile an `AGG_APPROX_PERCENTILE` spec may carry (q = 1.0).
+pub const AGG_PERCENTILE_PERMYRIAD_MAX: u16 = 10_000;
 
 // ---------------------------------------------------------------------------
 // Typed circuit-node representation (shared between gnitz-core and gnitz-engine)
 // ---------------------------------------------------------------------------
 
-/// Aggregate function discriminant. Values match the `AGG_*` wire constants.
+/// Aggregate function discriminant. Values match the `AGG_*` wire constants;
+/// `ApproxPercentile` carries its quantile in permyriad, packed above the id.
 #[derive(Clone, Copy, Debug, PartialEq, Eq)]
-#[repr(u64)]
 pub enum AggFunc {
-    Count = AGG_COUNT,
-    Sum = AGG_SUM,
-    Min = AGG_MIN,
-    Max = AGG_MAX,
-    CountNonNull = AGG_COUNT_NON_NULL,
-    SumZero = AGG_SUM_ZERO,
+    Count,
+    Sum,
+    Min,
+    Max,
+    CountNonNull,
+    SumZero,
+    ApproxCountDistinct,
+    ApproxPercentile(u16),
+    SumSquares,
 }
 
 impl AggFunc {
     pub fn from_wire(v: u64) -> Option<Self> {
+        let arg = v >> 8;
+        if v & AGG_FUNC_ID_MASK == AGG_APPROX_PERCENTILE {
+            return (arg <= AGG_PERCENTILE_PERMYRIAD_MAX as u64).then_some(AggFunc::ApproxPercentile(arg as u16));
+        }
         match v {
             AGG_COUNT => Some(AggFunc::Count),
             AGG_SUM => Some(AggFunc::Sum),
@@ -115,11 +152,23 @@ impl AggFunc {
             AGG_MAX => Some(AggFunc::Max),
             AGG_COUNT_NON_NULL => Some(AggFunc::CountNonNull),
             AGG_SUM_ZERO => Some(AggFunc::SumZero),
+            AGG_APPROX_COUNT_DISTINCT => Some(AggFunc::ApproxCountDistinct),
+            AGG_SUM_SQ => Some(AggFunc::SumSquares),
             _ => None,
         }
     }
     pub fn as_u64(self) -> u64 {
-        self as u64
+        match self {
+            AggFunc::Count => AGG_COUNT,
+            AggFunc::Sum => AGG_SUM,
+            AggFunc::Min => AGG_MIN,
+            AggFunc::Max => AGG_MAX,
+            AggFunc::CountNonNull => AGG_COUNT_NON_NULL,
+            AggFunc::SumZero => AGG_SUM_ZERO,
+            AggFunc::ApproxCountDistinct => AGG_APPROX_COUNT_DISTINCT,
+            AggFunc::ApproxPercentile(permyriad) => AGG_APPROX_PERCENTILE | (permyriad as u64) << 8,
+            AggFunc::SumSquares => AGG_SUM_SQ,
+        }
     }
 }
 
@@ -148,12 +197,18 @@ impl AggFunc {
 /// correctly (like MIN/MAX preserving their source type). A narrow unsigned
 /// source (U8/U16/U32) still widens to I64 (its sum stays < 2^63, so signed
 /// order is correct). AVG is planner-lowered (SUM/COUNT + finalize divide)
-/// before the wire and never reaches this rule.
+/// before the wire and never reaches this rule. The sketch estimates are typed
+/// by what they estimate: APPROX_COUNT_DISTINCT → I64, APPROX_PERCENTILE → F64
+/// (a bucket midpoint, not a stored row value, whatever the source type).
+/// SUM_SQ is F64 for every source: an integer square outgrows an i64 from
+/// |x| ≈ 3·10⁹ on, and the VAR/STDDEV finalize reads it as a float anyway.
 pub const fn agg_output_type(func: AggFunc, src_tc: u8) -> u8 {
     use crate::types::type_code;
     let is_float = src_tc == type_code::F32 || src_tc == type_code::F64;
     match func {
-        AggFunc::Count | AggFunc::CountNonNull | AggFunc::SumZero => type_code::I64,
+        AggFunc::Count | AggFunc::CountNonNull | AggFunc::SumZero | AggFunc::ApproxCountDistinct => type_code::I64,
+        AggFunc::ApproxPercentile(_) => type_code::F64,
+        AggFunc::SumSquares => type_code::F64,
         AggFunc::Sum => {
             if is_float {
                 type_code::F64
@@ -305,6 +360,16 @@ pub enum MapKind {
     /// collapsing). Deduplicating set-ops (UNION/EXCEPT/INTERSECT) use 0 on both
     /// sides; UNION ALL uses 0 on the left and 1 on the right.
     HashRow(Vec<u16>, Vec<u8>, u8),
+    /// Expression map with a self-described output. The output keeps the input's
+    /// PK region; its payload is `out_cols` — `(type code, nullable)` per payload
+    /// column, in order — written by `program`'s COPY_COL / EMIT instructions.
+    /// Unlike a plain `Expression` map (whose output is the view's schema) this
+    /// can sit anywhere in a circuit and append computed columns, e.g. a window
+    /// start ahead of a REDUCE.
+    Compute {
+        program: Vec<u8>,
+        out_cols: Vec<(u8, bool)>,
+    },
 }
 
 /// A secondary-index range bound for a `ScanDelta`'s backfill scan: the index's
@@ -369,6 +434,27 @@ pub enum OpNode {
         out_key: ReduceOutKey,
     },
     Join(JoinKind),
+    /// `OPCODE_TOP_K = 35`. Per group of `group_cols` (one global group when
+    /// empty), the first `limit` rows ordered by `order_col` — descending when
+    /// `desc`, with NULLs first when `nulls_first` — then by PK and payload.
+    /// Multiplicity counts: a row of weight 3 fills three of the `limit` slots.
+    /// Output rows keep the input schema and PK.
+    TopK {
+        group_cols: Vec<u16>,
+        order_col: u16,
+        desc: bool,
+        nulls_first: bool,
+        limit: u64,
+    },
+    /// `OPCODE_RETAIN = 37`. Watermark retention over integer column `col`: the
+    /// watermark is the largest `col` value seen, and a row whose `col` lies more
+    /// than `horizon` below it is expired — dropped on arrival, retracted if it
+    /// was passed earlier. Rows with a NULL `col` always pass. Output rows keep
+    /// the input schema and PK.
+    Retain {
+        col: u16,
+        horizon: u64,
+    },
     /// `OPCODE_INTEGRATE = 7`. Primary INTEGRATE: writes to view storage.
     IntegrateSink,
     /// `OPCODE_INTEGRATE_TRACE = 25`. Accumulates Z-set for join trace.
@@ -486,6 +572,14 @@ pub fn encode_op_node(op: OpNode) -> (NodeFields, Vec<NodeColumnPayload>) {
             kind_rows.push((NODE_COL_KIND_BRANCH_ID, 0, branch_id as u64, 0));
             ((OPCODE_MAP_HASH_ROW, None, None), kind_rows)
         }
+        OpNode::Map(MapKind::Compute { program, out_cols }) => {
+            let kind_rows = out_cols
+                .iter()
+                .enumerate()
+                .map(|(i, &(tc, nullable))| (NODE_COL_KIND_MAP_OUT, i as u16, tc as u64, nullable as u64))
+                .collect();
+            ((OPCODE_MAP_COMPUTE, None, Some(program)), kind_rows)
+        }
         OpNode::Negate => ((OPCODE_NEGATE, None, None), Vec::new()),
         OpNode::Union => ((OPCODE_UNION, None, None), Vec::new()),
         OpNode::Distinct => ((OPCODE_DISTINCT, None, None), Vec::new()),
@@ -516,6 +610,22 @@ pub fn encode_op_node(op: OpNode) -> (NodeFields, Vec<NodeColumnPayload>) {
             }
             ((OPCODE_REDUCE, None, None), kind_rows)
         }
+        OpNode::TopK {
+            group_cols,
+            order_col,
+            desc,
+            nulls_first,
+            limit,
+        } => {
+            let mut kind_rows = encode_col_list(NODE_COL_KIND_GROUP, group_cols);
+            kind_rows.push((NODE_COL_KIND_TOP_K, 0, order_col as u64, limit));
+            kind_rows.push((NODE_COL_KIND_TOP_K, 1, desc as u64, nulls_first as u64));
+            ((OPCODE_TOP_K, None, None), kind_rows)
+        }
+        OpNode::Retain { col, horizon } => (
+            (OPCODE_RETAIN, None, None),
+            vec![(NODE_COL_KIND_RETAIN, 0, col as u64, horizon)],
+        ),
         OpNode::Join(JoinKind::DeltaTrace) => ((OPCODE_JOIN_DELTA_TRACE, None, None), Vec::new()),
         OpNode::Join(JoinKind::DeltaTraceRange { n_eq, rel }) => (
             (OPCODE_JOIN_DELTA_TRACE_RANGE, None, None),
@@ -624,6 +734,23 @@ pub fn decode_op_node(
             })?;
             OpNode::Map(MapKind::HashRow(proj_cols, target_tcs, branch_id))
         }
+        OPCODE_MAP_COMPUTE => {
+            let program = expr_blob.ok_or_else(|| "MAP_COMPUTE missing expr_program blob".to_string())?;
+            // The declared payload drives the engine's output schema directly, so
+            // an unknown type code is rejected here rather than laid out.
+            let out_cols = cols
+                .iter()
+                .filter(|c| c.kind == NODE_COL_KIND_MAP_OUT)
+                .map(|c| {
+                    u8::try_from(c.value1)
+                        .ok()
+                        .filter(|&tc| crate::TypeCode::try_from_u8(tc).is_some())
+                        .map(|tc| (tc, c.value2 != 0))
+                        .ok_or_else(|| format!("MAP_COMPUTE unknown output type code {}", c.value1))
+                })
+                .collect::<Result<Vec<_>, _>>()?;
+            OpNode::Map(MapKind::Compute { program, out_cols })
+        }
         OPCODE_NEGATE => OpNode::Negate,
         OPCODE_UNION => OpNode::Union,
         OPCODE_DISTINCT => OpNode::Distinct,
@@ -657,6 +784,36 @@ pub fn decode_op_node(
                 out_key,
             }
         }
+        OPCODE_TOP_K => {
+            // Both param rows are mandatory and a zero limit is meaningless; reject
+            // either at this trust boundary rather than maintaining an empty set.
+            let param = |pos: u16| {
+                cols.iter()
+                    .find(|c| c.kind == NODE_COL_KIND_TOP_K && c.position == pos)
+                    .ok_or_else(|| format!("TOP_K missing param row {pos}"))
+            };
+            let (order, flags) = (param(0)?, param(1)?);
+            if order.value2 == 0 {
+                return Err("TOP_K limit must be positive".to_string());
+            }
+            OpNode::TopK {
+                group_cols: collect_cols(NODE_COL_KIND_GROUP),
+                order_col: order.value1 as u16,
+                desc: flags.value1 != 0,
+                nulls_first: flags.value2 != 0,
+                limit: order.value2,
+            }
+        }
+        OPCODE_RETAIN => {
+            let row = cols
+                .iter()
+                .find(|c| c.kind == NODE_COL_KIND_RETAIN)
+                .ok_or_else(|| "RETAIN missing param row".to_string())?;
+            OpNode::Retain {
+                col: row.value1 as u16,
+                horizon: row.value2,
+            }
+        }
         OPCODE_JOIN_DELTA_TRACE => OpNode::Join(JoinKind::DeltaTrace),
         OPCODE_JOIN_DELTA_TRACE_RANGE => {
             // n_eq + rel ride in a single NODE_COL_KIND_RANGE_JOIN row. Reject a
@@ -791,6 +948,30 @@ mod tests {
         assert!(err.contains("unknown rel"), "got: {err}");
     }
 
+    /// Every agg func round-trips through its wire id, the percentile's quantile
+    /// included; an out-of-range quantile or stray high bits on a plain id are
+    /// rejected rather than truncated.
+    #[test]
+    fn agg_func_wire_roundtrip() {
+        for f in [
+            AggFunc::Count,
+            AggFunc::Sum,
+            AggFunc::Min,
+            AggFunc::Max,
+            AggFunc::CountNonNull,
+            AggFunc::SumZero,
+            AggFunc::ApproxCountDistinct,
+            AggFunc::ApproxPercentile(0),
+            AggFunc::ApproxPercentile(9_900),
+            AggFunc::ApproxPercentile(AGG_PERCENTILE_PERMYRIAD_MAX),
+            AggFunc::SumSquares,
+        ] {
+            assert_eq!(AggFunc::from_wire(f.as_u64()), Some(f));
+        }
+        assert_eq!(AggFunc::from_wire(AGG_APPROX_PERCENTILE | 10_001 << 8), None);
+        assert_eq!(AggFunc::from_wire(AGG_SUM | 1 << 8), None);
+    }
+
     /// The partition-filter opcode decodes to the payload-free node.
     #[test]
     fn decode_partition_filter() {
@@ -824,6 +1005,56 @@ mod tests {
             .contains("source_table"));
     }
 
+    /// A top-K node round-trips its group list (in order), order column, flags
+    /// and limit; a zero limit or a missing param row is rejected.
+    #[test]
+    fn top_k_roundtrips_and_rejects_bad_params() {
+        let node = OpNode::TopK {
+            group_cols: vec![4, 2],
+            order_col: 3,
+            desc: true,
+            nulls_first: false,
+            limit: 10,
+        };
+        assert_eq!(roundtrip(node.clone()).unwrap(), node);
+        let zero = OpNode::TopK {
+            group_cols: Vec::new(),
+            order_col: 1,
+            desc: false,
+            nulls_first: true,
+            limit: 0,
+        };
+        assert!(roundtrip(zero).unwrap_err().contains("limit must be positive"));
+        let err = decode_op_node(OPCODE_TOP_K, None, None, &[]).unwrap_err();
+        assert!(err.contains("missing param row"), "got: {err}");
+    }
+
+    /// A compute map round-trips its blob and declared payload (type code and
+    /// nullability, in order); an unknown type code is rejected.
+    #[test]
+    fn map_compute_roundtrips_and_rejects_unknown_type() {
+        let node = OpNode::Map(MapKind::Compute {
+            program: vec![1, 2, 3],
+            out_cols: vec![(crate::type_code::I64, true), (crate::type_code::STRING, false)],
+        });
+        assert_eq!(roundtrip(node.clone()).unwrap(), node);
+        let bad = OpNode::Map(MapKind::Compute {
+            program: vec![1],
+            out_cols: vec![(200, false)],
+        });
+        assert!(roundtrip(bad).unwrap_err().contains("unknown output type code"));
+    }
+
+    /// A retain node round-trips its column and horizon; a missing param row is
+    /// rejected.
+    #[test]
+    fn retain_roundtrips_and_rejects_missing_params() {
+        let node = OpNode::Retain { col: 3, horizon: 3600 };
+        assert_eq!(roundtrip(node.clone()).unwrap(), node);
+        let err = decode_op_node(OPCODE_RETAIN, None, None, &[]).unwrap_err();
+        assert!(err.contains("missing param row"), "got: {err}");
+    }
+
     /// Re-decode an encoded node through the row bundle `encode_op_node` produces.
     fn roundtrip(op: OpNode) -> Result<OpNode, String> {
         let ((opcode, src_tab, blob), rows) = encode_op_node(op);
@@ -5,7 +5,7 @@
 //! indices, payload indices, and null-bit positions live here so the two
 //! implementations cannot drift.
 //!
-//! Schema (10 columns, pk_index = 0):
+//! Schema (11 columns, pk_index = 0):
 //!   col  0: msg_idx       U64   (PK placeholder; always 0)
 //!   col  1: status        U64
 //!   col  2: client_id     U64
@@ -14,8 +14,14 @@
 //!   col  5: seek_pk       U128
 //!   col  6: seek_col_idx  U64
 //!   col  7: request_id    U64    -- reactor reply-routing key
-//!   col  8: error_msg     STRING (nullable)
-//!   col  9: seek_pk_extra BLOB   (nullable) -- PK region bytes 16.. for a wide PK
+//!   col  8: trace_id      U64    -- request-trace context; 0 = untraced
+//!   col  9: error_msg     STRING (nullable)
+//!   col 10: seek_pk_extra BLOB   (nullable) -- PK region bytes 16.. for a wide PK
+//!
+//! Adding or moving a column changes the region count every peer checks, so
+//! it bumps `WIRE_PROTOCOL_VERSION` and mismatched peers part at HELLO. The
+//! decoder still reads the pre-`trace_id` layout (10 columns): control blocks
+//! also sit in the SAL, which must replay across an upgrade.
 //!
 //! Reserved request_id values:
 //!   0          -- "unsolicited"/"untagged" (pre-reactor reply path)
@@ -38,6 +44,7 @@ const CONTROL_COLS: &[WireSysCol] = &[
     col("seek_pk", TypeCode::U128, false),
     col("seek_col_idx", TypeCode::U64, false),
     col("request_id", TypeCode::U64, false),
+    col("trace_id", TypeCode::U64, false),
     col("error_msg", TypeCode::String, true),
     col("seek_pk_extra", TypeCode::Blob, true),
 ];
@@ -56,6 +63,7 @@ const COL_FLAGS: usize = col_index("flags");
 const COL_SEEK_PK: usize = col_index("seek_pk");
 const COL_SEEK_COL_IDX: usize = col_index("seek_col_idx");
 const COL_REQUEST_ID: usize = col_index("request_id");
+const COL_TRACE_ID: usize = col_index("trace_id");
 const COL_ERROR_MSG: usize = col_index("error_msg");
 const COL_SEEK_PK_EXTRA: usize = col_index("seek_pk_extra");
 
@@ -72,6 +80,7 @@ const PAYLOAD_FLAGS: usize = payload_index(COL_FLAGS);
 const PAYLOAD_SEEK_PK: usize = payload_index(COL_SEEK_PK);
 const PAYLOAD_SEEK_COL_IDX: usize = payload_index(COL_SEEK_COL_IDX);
 const PAYLOAD_REQUEST_ID: usize = payload_index(COL_REQUEST_ID);
+const PAYLOAD_TRACE_ID: usize = payload_index(COL_TRACE_ID);
 const PAYLOAD_ERROR_MSG: usize = payload_index(COL_ERROR_MSG);
 const PAYLOAD_SEEK_PK_EXTRA: usize = payload_index(COL_SEEK_PK_EXTRA);
 
@@ -98,10 +107,17 @@ const REGION_FLAGS: usize = 3 + PAYLOAD_FLAGS;
 const REGION_SEEK_PK: usize = 3 + PAYLOAD_SEEK_PK;
 const REGION_SEEK_COL_IDX: usize = 3 + PAYLOAD_SEEK_COL_IDX;
 const REGION_REQUEST_ID: usize = 3 + PAYLOAD_REQUEST_ID;
+const REGION_TRACE_ID: usize = 3 + PAYLOAD_TRACE_ID;
 const REGION_ERROR_MSG: usize = 3 + PAYLOAD_ERROR_MSG;
 const REGION_SEEK_PK_EXTRA: usize = 3 + PAYLOAD_SEEK_PK_EXTRA;
 const REGION_BLOB: usize = NUM_REGIONS - 1;
 
+/// Region count of a control block laid out before `trace_id` joined the
+/// schema: one payload column fewer, every region after it one lower. Still
+/// decoded (with `trace_id` 0) so the SAL a previous binary left behind
+/// replays after an upgrade.
+const NUM_REGIONS_PRE_TRACE: usize = NUM_REGIONS - 1;
+
 // ---------------------------------------------------------------------------
 // Control-block codec — the one encoder/decoder both ends run.
 //
@@ -158,6 +174,7 @@ const OFF_FLAGS: usize = ctrl_region_offset(REGION_FLAGS);
 const OFF_SEEK_PK: usize = ctrl_region_offset(REGION_SEEK_PK);
 const OFF_SEEK_COL_IDX: usize = ctrl_region_offset(REGION_SEEK_COL_IDX);
 const OFF_REQUEST_ID: usize = ctrl_region_offset(REGION_REQUEST_ID);
+const OFF_TRACE_ID: usize = ctrl_region_offset(REGION_TRACE_ID);
 const OFF_ERROR_MSG: usize = ctrl_region_offset(REGION_ERROR_MSG);
 const OFF_SEEK_PK_EXTRA: usize = ctrl_region_offset(REGION_SEEK_PK_EXTRA);
 
@@ -281,6 +298,18 @@ pub fn encode_ctrl_block(
     total
 }
 
+/// Stamp `trace_id` into the control block at the head of `block`. The
+/// encoder leaves it 0 (untraced); a sender that samples a request for tracing
+/// patches it afterwards, re-stamping the body checksum when `checksum` says
+/// the block carries one.
+pub fn set_ctrl_trace_id(block: &mut [u8], trace_id: u64, checksum: bool) {
+    block[OFF_TRACE_ID..OFF_TRACE_ID + 8].copy_from_slice(&trace_id.to_le_bytes());
+    if checksum {
+        let n = read_u32_le(block, WAL_OFF_SIZE) as usize;
+        crate::wal::stamp_checksum(block, n);
+    }
+}
+
 /// Decoded control fields from a wire message.
 pub struct DecodedControl {
     pub status: u32,
@@ -290,6 +319,9 @@ pub struct DecodedControl {
     pub seek_pk: u128,
     pub seek_col_idx: u64,
     pub request_id: u64,
+    /// Request-trace context (0 = untraced): set by a client that samples the
+    /// request, and by the master on the SAL groups that carry it to workers.
+    pub trace_id: u64,
     pub error_msg: Vec<u8>,
     /// PK region bytes `16..` for a wide PK; empty for `pk_stride <= 16`.
     /// Read by the worker SEEK dispatch to reconstruct the full wide-PK key.
@@ -328,8 +360,7 @@ fn read_u128_region(data: &[u8], r: usize) -> Result<u128, &'static str> {
 /// data_size: u32) at `WAL_HEADER_SIZE + region * 8`. For a 1-row control
 /// block every u64 region is exactly 8 bytes, so the fields index directly.
 pub fn peek_control_block(data: &[u8]) -> Result<DecodedControl, &'static str> {
-    let dir_end = WAL_HEADER_SIZE + NUM_REGIONS * 8;
-    if data.len() < dir_end {
+    if data.len() < WAL_HEADER_SIZE {
         return Err("control block too small");
     }
 
@@ -343,8 +374,16 @@ pub fn peek_control_block(data: &[u8]) -> Result<DecodedControl, &'static str> {
     if read_u32_le(data, WAL_OFF_COUNT) != 1 {
         return Err("control block must have exactly 1 row");
     }
-    if read_u32_le(data, WAL_OFF_NUM_REGIONS) as usize != NUM_REGIONS {
-        return Err("control block wrong region count");
+    // `shift`: how far the columns after `trace_id` (and their null bits) sit
+    // below their current position — 1 in a pre-trace block, which has none.
+    let num_regions = read_u32_le(data, WAL_OFF_NUM_REGIONS) as usize;
+    let shift = match num_regions {
+        NUM_REGIONS => 0,
+        NUM_REGIONS_PRE_TRACE => 1,
+        _ => return Err("control block wrong region count"),
+    };
+    if data.len() < WAL_HEADER_SIZE + num_regions * 8 {
+        return Err("control block too small");
     }
 
     let null_bmp = read_u64_region(data, REGION_NULL_BMP)?;
@@ -355,9 +394,14 @@ pub fn peek_control_block(data: &[u8]) -> Result<DecodedControl, &'static str> {
     let seek_pk = read_u128_region(data, REGION_SEEK_PK)?;
     let seek_col_idx = read_u64_region(data, REGION_SEEK_COL_IDX)?;
     let request_id = read_u64_region(data, REGION_REQUEST_ID)?;
+    let trace_id = if shift == 0 {
+        read_u64_region(data, REGION_TRACE_ID)?
+    } else {
+        0
+    };
 
-    let error_is_null = (null_bmp & NULL_BIT_ERROR_MSG) != 0;
-    let seek_extra_is_null = (null_bmp & NULL_BIT_SEEK_PK_EXTRA) != 0;
+    let error_is_null = (null_bmp & (NULL_BIT_ERROR_MSG >> shift)) != 0;
+    let seek_extra_is_null = (null_bmp & (NULL_BIT_SEEK_PK_EXTRA >> shift)) != 0;
 
     // error_msg and seek_pk_extra each own a 16-byte German-string struct in
     // their own fixed region but spill overflow (>12B) into the shared blob
@@ -365,7 +409,7 @@ pub fn peek_control_block(data: &[u8]) -> Result<DecodedControl, &'static str> {
     // non-null. When both are null (the universal case) skip the lookup
     // entirely, preserving the hot-path fast case.
     let blob: &[u8] = if !error_is_null || !seek_extra_is_null {
-        let (blob_off, blob_sz) = crate::wal::dir_entry(data, REGION_BLOB);
+        let (blob_off, blob_sz) = crate::wal::dir_entry(data, REGION_BLOB - shift);
         if blob_sz > 0 && blob_off.saturating_add(blob_sz) <= data.len() {
             &data[blob_off..blob_off + blob_sz]
         } else {
@@ -389,7 +433,7 @@ pub fn peek_control_block(data: &[u8]) -> Result<DecodedControl, &'static str> {
         Vec::new()
     } else {
         read_german(
-            REGION_ERROR_MSG,
+            REGION_ERROR_MSG - shift,
             "error_msg region out of bounds",
             "error_msg string offset out of bounds",
         )?
@@ -399,7 +443,7 @@ pub fn peek_control_block(data: &[u8]) -> Result<DecodedControl, &'static str> {
         Vec::new()
     } else {
         read_german(
-            REGION_SEEK_PK_EXTRA,
+            REGION_SEEK_PK_EXTRA - shift,
             "seek_pk_extra region out of bounds",
             "seek_pk_extra string offset out of bounds",
         )?
@@ -414,6 +458,7 @@ pub fn peek_control_block(data: &[u8]) -> Result<DecodedControl, &'static str> {
         seek_pk,
         seek_col_idx,
         request_id,
+        trace_id,
         error_msg,
         seek_pk_extra,
         block_size,
@@ -442,6 +487,7 @@ mod tests {
         assert_eq!(dec.seek_col_idx, 5);
         assert_eq!(dec.request_id, 6);
         assert_eq!(dec.status, 7);
+        assert_eq!(dec.trace_id, 0);
         assert!(dec.error_msg.is_empty());
         assert!(dec.seek_pk_extra.is_empty());
         assert_eq!(dec.block_size, n);
@@ -467,6 +513,76 @@ mod tests {
         assert_eq!(dec.block_size, n);
     }
 
+    /// A stamped trace id decodes back, and a re-stamped checksum still
+    /// verifies — including over a block with a blob spill.
+    #[test]
+    fn trace_id_stamp_roundtrips() {
+        let err = b"an error message long enough to spill into the blob";
+        let mut buf = vec![0u8; ctrl_block_size(err.len(), 0)];
+        let n = encode_ctrl_block(&mut buf, 0, 1, 2, 3, 4u128, 5, 6, 7, err, b"");
+        crate::wal::stamp_checksum(&mut buf, n);
+        set_ctrl_trace_id(&mut buf, 0xDEAD_BEEF, true);
+        let dec = peek_control_block(&buf).expect("decode traced");
+        assert_eq!(dec.trace_id, 0xDEAD_BEEF);
+        assert_eq!((dec.request_id, dec.error_msg.as_slice()), (6, &err[..]));
+        let mut offs = [0u64; crate::MAX_WIRE_REGIONS];
+        let mut sizes = [0u32; crate::MAX_WIRE_REGIONS];
+        crate::wal::validate_and_parse(&buf, &mut offs, &mut sizes, true).expect("checksum re-stamped");
+    }
+
+    /// Re-lay `block` as the pre-`trace_id` binary wrote it: the trace region
+    /// dropped, every later region and null bit moved down one.
+    fn strip_trace_column(block: &[u8]) -> Vec<u8> {
+        let body_start = WAL_HEADER_SIZE + NUM_REGIONS_PRE_TRACE * 8;
+        let mut dir = Vec::new();
+        let mut body = Vec::new();
+        for r in (0..NUM_REGIONS).filter(|&r| r != REGION_TRACE_ID) {
+            let (off, sz) = crate::wal::dir_entry(block, r);
+            let mut bytes = block[off..off + sz].to_vec();
+            if r == REGION_NULL_BMP {
+                let nb = read_u64_le(&bytes, 0);
+                let low = nb & ((1u64 << PAYLOAD_TRACE_ID) - 1);
+                let moved = (nb >> (PAYLOAD_TRACE_ID + 1)) << PAYLOAD_TRACE_ID;
+                bytes.copy_from_slice(&(low | moved).to_le_bytes());
+            }
+            dir.extend_from_slice(&((body_start + body.len()) as u32).to_le_bytes());
+            dir.extend_from_slice(&(sz as u32).to_le_bytes());
+            body.extend_from_slice(&bytes);
+        }
+        let mut out = block[..WAL_HEADER_SIZE].to_vec();
+        out.extend_from_slice(&dir);
+        out.extend_from_slice(&body);
+        let total = out.len() as u32;
+        out[WAL_OFF_NUM_REGIONS..WAL_OFF_NUM_REGIONS + 4]
+            .copy_from_slice(&(NUM_REGIONS_PRE_TRACE as u32).to_le_bytes());
+        out[WAL_OFF_SIZE..WAL_OFF_SIZE + 4].copy_from_slice(&total.to_le_bytes());
+        out
+    }
+
+    /// A control block from before `trace_id` (as a SAL written by the previous
+    /// binary holds) decodes field for field, untraced.
+    #[test]
+    fn peek_reads_pre_trace_layout() {
+        let err = b"an error message long enough to spill into the blob";
+        let extra = b"and a wide-pk-extra tail that spills as well";
+        for (e, x) in [(&b""[..], &b""[..]), (&err[..], &extra[..]), (&b"short"[..], &b""[..])] {
+            let mut buf = vec![0u8; ctrl_block_size(e.len(), x.len())];
+            let n = encode_ctrl_block(&mut buf, 0, 1, 2, 3, 4u128, 5, 6, 7, e, x);
+            set_ctrl_trace_id(&mut buf[..n], 0xDEAD_BEEF, false);
+            let legacy = strip_trace_column(&buf[..n]);
+            assert_eq!(legacy.len(), n - 16, "one directory entry and one 8-byte region fewer");
+            let dec = peek_control_block(&legacy).expect("decode pre-trace");
+            assert_eq!(dec.trace_id, 0);
+            assert_eq!(
+                (dec.status, dec.client_id, dec.target_id, dec.flags, dec.seek_pk),
+                (7, 2, 1, 3, 4u128)
+            );
+            assert_eq!((dec.seek_col_idx, dec.request_id), (5, 6));
+            assert_eq!((dec.error_msg.as_slice(), dec.seek_pk_extra.as_slice()), (e, x));
+            assert_eq!(dec.block_size, legacy.len());
+        }
+    }
+
     /// A corrupted long-string blob offset must surface an error, not panic.
     #[test]
     fn peek_rejects_oob_error_msg_offset() {
@@ -38,7 +38,8 @@ pub const EXPR_COPY_COL: u32 = 34;
 /// Three register sources — `cond`, `a`, `b` — packed into two operand words:
 /// `cond` occupies word `a1` alone, while `a`/`b` are packed as the low/high 16
 /// bits of word `a2`. This is the only opcode that packs two registers into one
-/// word (LOAD_CONST packs a 64-bit *value*, not registers; see the decode site
+/// word (LOAD_CONST packs a 64-bit *value*, STR_COL_IN_CONST a const-pool run,
+/// neither registers; see the decode site
 /// in `gnitz-engine`'s `program.rs`). Rows where `cond` is non-NULL and truthy
 /// take `a`'s value + null bit; all other rows (false **or NULL** cond) take
 /// `b`'s. Carries a value, never a boolean classification.
@@ -46,12 +47,24 @@ pub const EXPR_SELECT: u32 = 35;
 /// Materialize a NULL value: `[EXPR_LOAD_NULL, dst, 0, 0]` — value 0, null bit
 /// set for every row. Backs `CASE` without `ELSE` (→ `ELSE NULL`) and `NULLIF`.
 pub const EXPR_LOAD_NULL: u32 = 36;
+/// IEEE square root of a float register: `[EXPR_FLOAT_SQRT, dst, a, 0]`. A
+/// negative operand yields NaN, as `f64::sqrt` does.
+pub const EXPR_FLOAT_SQRT: u32 = 37;
 pub const EXPR_STR_COL_EQ_CONST: u32 = 40;
 pub const EXPR_STR_COL_LT_CONST: u32 = 41;
 pub const EXPR_STR_COL_LE_CONST: u32 = 42;
 pub const EXPR_STR_COL_EQ_COL: u32 = 43;
 pub const EXPR_STR_COL_LT_COL: u32 = 44;
 pub const EXPR_STR_COL_LE_COL: u32 = 45;
+/// SQL `LIKE`: `[EXPR_STR_COL_LIKE_CONST, dst, col, const_idx]`, the constant
+/// being the raw pattern (`%` any run, `_` one character, `\` escapes the next
+/// byte). The engine classifies the pattern once and runs the cheapest kernel
+/// that decides it — exact, prefix, suffix, substring, or the general matcher.
+pub const EXPR_STR_COL_LIKE_CONST: u32 = 46;
+/// String IN-list: `[EXPR_STR_COL_IN_CONST, dst, col, first | (count << 16)]`
+/// — true iff the column equals one of the `count` constants starting at
+/// `first`. The two indices are packed with [`encode_str_in_operands`].
+pub const EXPR_STR_COL_IN_CONST: u32 = 47;
 
 // ---------------------------------------------------------------------------
 // Blob framing constants and operand packing
@@ -87,6 +100,17 @@ pub const fn decode_select_operands(w: u32) -> (u16, u16) {
     ((w & 0xFFFF) as u16, (w >> 16) as u16)
 }
 
+/// `EXPR_STR_COL_IN_CONST` packs its const-pool run — the first index and the
+/// count — as the low and high 16 bits of its second operand word.
+#[inline]
+pub const fn encode_str_in_operands(first: u32, count: u32) -> u32 {
+    (first & 0xFFFF) | ((count & 0xFFFF) << 16)
+}
+#[inline]
+pub const fn decode_str_in_operands(w: u32) -> (u16, u16) {
+    ((w & 0xFFFF) as u16, (w >> 16) as u16)
+}
+
 /// A decoded expr blob. `code` and the string bytes are copied out of the input.
 #[derive(Debug, Clone, PartialEq, Eq)]
 pub struct ExprBlob {
@@ -340,4 +364,14 @@ mod tests {
             }
         }
     }
+
+    #[test]
+    fn str_in_operands_round_trip() {
+        for (first, count) in [(0u32, 1u32), (3, 2), (0xFFFF, 0xFFFF), (17, 300)] {
+            assert_eq!(
+                decode_str_in_operands(encode_str_in_operands(first, count)),
+                (first as u16, count as u16)
+            );
+        }
+    }
 }
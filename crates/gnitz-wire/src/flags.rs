@@ -190,6 +190,33 @@ pub const FLAG_BATCH_CONSOLIDATED: u64 = 1 << 51;
 /// for why FLAG_CONTINUATION cannot carry this meaning.
 pub const FLAG_SCAN_LAST: u64 = 1 << 53;
 
+/// GET_STATS request flag. Client→master; the master answers the metrics
+/// itself and fans the per-worker reports (view profile, VIEW_STATS_TAB,
+/// memory) out as SAL `Scan` groups carrying this flag. Every high bit is
+/// allocated, so it **deliberately aliases `FLAG_SCAN_LAST`**, disambiguated
+/// by direction exactly like `FLAG_SCAN_FIFO_REPLY`: as `FLAG_SCAN_LAST`, bit
+/// 53 is only ever set by a worker on W2M frames (the scan-chunk terminator)
+/// and stripped before any reply leaves the master. On the way in — client
+/// frames and master-written SAL groups — nothing else sets it, and the
+/// worker's dispatch tests it in a `Scan` arm ahead of the ordinary scan, so a
+/// stats group never reaches the scan path and a plain scan never looks like
+/// one. Kept out of the `high_flags` guard below for the same reason.
+pub const FLAG_GET_STATS: u64 = FLAG_SCAN_LAST;
+
+/// What a `target_id = 0` GET_STATS asks for, carried in `seek_col_idx` (an
+/// older client sends 0 and gets the metrics it always did). The profiler
+/// selectors answer with the folded CPU-zone stacks of every process; START
+/// first clears them and turns zone timing on, STOP turns it off. TRACES
+/// answers with the recorded spans of sampled (traced) requests. MEMORY
+/// answers with the heap bytes every process attributes to each relation,
+/// operator and subsystem.
+pub const STATS_METRICS: u64 = 0;
+pub const STATS_PROFILE_DUMP: u64 = 1;
+pub const STATS_PROFILE_START: u64 = 2;
+pub const STATS_PROFILE_STOP: u64 = 3;
+pub const STATS_TRACES: u64 = 4;
+pub const STATS_MEMORY: u64 = 5;
+
 // ---------------------------------------------------------------------------
 // Wire-level packed fields: bits 16-39 of wire_flags
 // ---------------------------------------------------------------------------
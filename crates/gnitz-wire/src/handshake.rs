@@ -34,6 +34,13 @@ pub const MAX_FRAME_PAYLOAD_CLIENT: usize = 256 * 1024 * 1024; // 256 MB
 // the fd. The length prefix alone discriminates: 8 ⇒ HELLO, 20 ⇒ ACK, anything
 // else ⇒ control block. Magic checks remain as defence-in-depth.
 
+/// Wire protocol version carried in HELLO; the server rejects any other with a
+/// STATUS_ERROR naming both versions. Bumped whenever the control-block or
+/// frame layout changes, independently of the on-disk `WAL_FORMAT_VERSION`
+/// (which earlier peers sent here, as 6). 7: the control block gained the
+/// `trace_id` column.
+pub const WIRE_PROTOCOL_VERSION: u16 = 7;
+
 /// Magic value carried in HELLO and ACK frames. ASCII "GNTZ" interpreted
 /// as a little-endian u32. Defence-in-depth on top of the length-prefix
 /// discriminant; a peer sending a control block first cannot collide because